@@ -0,0 +1,77 @@
+"""Binary float32 embedding column on every *_embeddings table.
+
+Revision ID: 034_embedding_vec_binary
+Revises: 033_user_sessions
+Create Date: 2026-10-16
+
+Context:
+  The 5 embedding tables (transcript/summary/flashcard/quiz/chat) store their
+  1024-dim mistral-embed vectors as JSON text (~20 KB/row). Every search
+  decodes that JSON per row and the tables are ~4x larger than the raw data.
+
+This migration:
+  - adds ``embedding_vec`` (BYTEA / BLOB, nullable) — raw float32 little-endian
+    bytes, decoded zero-copy with ``numpy.frombuffer`` (``search.vector_codec``);
+  - drops NOT NULL on ``embedding_json`` so new rows only write the binary
+    column (``EMBEDDING_JSON_DUAL_WRITE=true`` keeps writing both).
+
+Backfill (no Mistral call, pure re-encoding of the existing JSON)::
+
+    cd backend && python -m scripts.reembed_progressive --backfill-binary
+    cd backend && python -m scripts.reembed_progressive --backfill-binary --drop-json
+
+Readers fall back to ``embedding_json`` while ``embedding_vec`` is NULL, so the
+backfill can run online after the deploy.
+
+Convention DeepSight Alembic : migration idempotente (inspector checks).
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "034_embedding_vec_binary"
+down_revision: Union[str, None] = "033_user_sessions"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EMBEDDING_TABLES = (
+    "transcript_embeddings",
+    "summary_embeddings",
+    "flashcard_embeddings",
+    "quiz_embeddings",
+    "chat_embeddings",
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+
+    for table in EMBEDDING_TABLES:
+        if table not in existing_tables:
+            continue
+        columns = {c["name"] for c in inspector.get_columns(table)}
+        with op.batch_alter_table(table) as batch:
+            if "embedding_vec" not in columns:
+                batch.add_column(sa.Column("embedding_vec", sa.LargeBinary(), nullable=True))
+            batch.alter_column("embedding_json", existing_type=sa.Text(), nullable=True)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+
+    for table in EMBEDDING_TABLES:
+        if table not in existing_tables:
+            continue
+        # Rows written binary-only cannot satisfy NOT NULL again : drop them
+        # (they will be re-embedded by the regular pipeline).
+        op.execute(sa.text(f"DELETE FROM {table} WHERE embedding_json IS NULL"))
+        with op.batch_alter_table(table) as batch:
+            batch.alter_column("embedding_json", existing_type=sa.Text(), nullable=False)
+            batch.drop_column("embedding_vec")
@@ -0,0 +1,62 @@
+"""chunk_analysis_cache — cache adressé par contenu des analyses LLM par chunk.
+
+Revision ID: 035_chunk_analysis_cache
+Revises: 034_embedding_vec_binary
+Create Date: 2026-10-16
+
+Context:
+  ``videos.long_video_analyzer.analyze_chunks_parallel`` et
+  ``videos.chunking.process_video_chunks`` repassaient chaque chunk dans
+  Mistral à chaque ré-analyse (autre mode, autre langue, autre utilisateur,
+  retry après échec partiel).
+
+This migration crée ``chunk_analysis_cache`` (L2 persistant de
+``videos.chunk_cache``, Redis servant de L1) :
+  - ``cache_key`` sha256(kind, version de prompt, modèle, langue, mode,
+    hash du texte, hash du contexte de prompt) ;
+  - ``payload`` JSON de l'analyse (ChunkAnalysis ou digest) ;
+  - ``hit_count`` pour suivre la réutilisation ;
+  - ``expires_at`` indexé pour la purge.
+
+Convention DeepSight Alembic : migration idempotente (inspector checks).
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "035_chunk_analysis_cache"
+down_revision: Union[str, None] = "034_embedding_vec_binary"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "chunk_analysis_cache" in inspector.get_table_names():
+        return
+
+    op.create_table(
+        "chunk_analysis_cache",
+        sa.Column("cache_key", sa.String(64), primary_key=True),
+        sa.Column("kind", sa.String(32), nullable=False),
+        sa.Column("model_used", sa.String(50), nullable=False),
+        sa.Column("payload", sa.Text, nullable=False),
+        sa.Column("hit_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.now()),
+        sa.Column("expires_at", sa.DateTime, nullable=False),
+    )
+    op.create_index("ix_chunk_analysis_cache_expires", "chunk_analysis_cache", ["expires_at"])
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "chunk_analysis_cache" not in inspector.get_table_names():
+        return
+
+    op.drop_index("ix_chunk_analysis_cache_expires", "chunk_analysis_cache")
+    op.drop_table("chunk_analysis_cache")
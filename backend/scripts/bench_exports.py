@@ -0,0 +1,149 @@
+"""Benchmark du débit d'exports (exports/s) et de la latence de l'event loop.
+
+``--clients`` coroutines demandent en boucle des exports ``--format`` de
+``--docs`` résumés distincts (taille ``--summary-kb``), et compare :
+
+  * ``inline`` — l'ancien chemin : ``export_summary`` appelé dans le handler async ;
+  * ``pool``   — ``exports.engine`` sans cache réutilisable (chaque requête est un
+                 miss : seul le rendu hors event loop est mesuré) ;
+  * ``cached`` — ``exports.engine`` avec cache disque chaud (exports répétés).
+
+Pendant chaque mode, une sonde mesure le retard de l'event loop (tick de 10 ms) :
+c'est ce que subissent les autres requêtes du même worker uvicorn.
+
+Usage (chemin de fichier, pas ``-m`` : les process spawn ré-importent ``__main__``
+et ``src/scripts`` masquerait ``backend/scripts``)::
+
+    cd backend && python scripts/bench_exports.py
+    cd backend && python scripts/bench_exports.py --format docx --workers 4 --clients 16
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Path hack pour rendre `src/` importable depuis backend/scripts/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core import cpu_pool  # noqa: E402
+from exports import engine  # noqa: E402
+from exports.service import export_summary  # noqa: E402
+
+PARAGRAPH = (
+    "## Section\n\nLe **contenu** analysé aborde plusieurs points [00:42] avec des "
+    "nuances, des sources et des chiffres clés (42 %, 1,5 Md€).\n\n- point un\n- point deux\n\n"
+)
+
+
+def _kwargs(doc: int, summary_kb: int) -> dict:
+    body = PARAGRAPH * max(1, summary_kb * 1024 // len(PARAGRAPH))
+    return dict(
+        title=f"Benchmark export {doc}",
+        channel="Bench",
+        category="science",
+        mode="standard",
+        summary=f"# Document {doc}\n\n{body}",
+        video_url="https://youtube.com/watch?v=bench",
+        duration=1800,
+        thumbnail_url=None,
+        entities=None,
+        reliability_score=75,
+        created_at=datetime(2026, 1, 1),
+        flashcards=None,
+        sources=None,
+        pdf_export_type="full",
+        user_plan="free",
+        user_language="fr",
+    )
+
+
+async def _loop_lag_probe(stop: asyncio.Event, lags: list) -> None:
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lags.append(time.perf_counter() - t0 - 0.01)
+
+
+async def _run(mode: str, fmt: str, clients: int, docs: int, summary_kb: int, duration_s: float) -> dict:
+    done = 0
+    seq = 0
+    latencies: list = []
+    lags: list = []
+    stop = asyncio.Event()
+    deadline = time.perf_counter() + duration_s
+
+    async def client() -> None:
+        nonlocal done, seq
+        while time.perf_counter() < deadline:
+            seq += 1
+            kwargs = _kwargs(seq % docs, summary_kb)
+            t0 = time.perf_counter()
+            if mode == "inline":
+                export_summary(format=fmt, **kwargs)
+            else:
+                # pool : user_id unique par requête → jamais de hit, rendu à chaque fois
+                user_id = seq if mode == "pool" else 1
+                await engine.render_export(user_id=user_id, format=fmt, **kwargs)
+            latencies.append(time.perf_counter() - t0)
+            done += 1
+
+    if mode == "cached":  # réchauffe le cache
+        for doc in range(docs):
+            await engine.render_export(user_id=1, format=fmt, **_kwargs(doc, summary_kb))
+
+    probe = asyncio.ensure_future(_loop_lag_probe(stop, lags))
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    wall = time.perf_counter() - t0
+    stop.set()
+    await probe
+    latencies.sort()
+    lags.sort()
+    return {
+        "exports_s": done / wall,
+        "p50_ms": latencies[len(latencies) // 2] * 1e3 if latencies else 0.0,
+        "p99_ms": latencies[max(0, int(len(latencies) * 0.99) - 1)] * 1e3 if latencies else 0.0,
+        "lag_max_ms": lags[-1] * 1e3 if lags else 0.0,
+    }
+
+
+async def _main(fmt: str, workers: int, clients: int, docs: int, summary_kb: int, duration_s: float) -> None:
+    cpu_pool.CPU_POOL_WORKERS = workers
+    with tempfile.TemporaryDirectory() as tmp:
+        engine.EXPORT_CACHE_DIR = Path(tmp)
+        # Démarre les process workers avant de mesurer (spawn + imports)
+        await asyncio.gather(*(engine.render_export(user_id=0, format=fmt, **_kwargs(0, 1)) for _ in range(workers)))
+
+        print(f"{fmt}, {workers} process workers, {clients} clients, {docs} docs de {summary_kb} KB, {duration_s:.1f}s")
+        print(f"{'mode':>7} {'exports/s':>10} {'/worker':>8} {'p50 ms':>8} {'p99 ms':>8} {'lag max ms':>11}")
+        try:
+            for mode in ("inline", "pool", "cached"):
+                r = await _run(mode, fmt, clients, docs, summary_kb, duration_s)
+                per_worker = r["exports_s"] / (workers if mode == "pool" else 1)
+                print(
+                    f"{mode:>7} {r['exports_s']:>10.1f} {per_worker:>8.1f} {r['p50_ms']:>8.1f} "
+                    f"{r['p99_ms']:>8.1f} {r['lag_max_ms']:>11.1f}"
+                )
+        finally:
+            cpu_pool.shutdown_cpu_pool()
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Benchmark exports/sec per worker.")
+    p.add_argument("--format", default="pdf", choices=sorted(engine.BINARY_FORMATS))
+    p.add_argument("--workers", type=int, default=2)
+    p.add_argument("--clients", type=int, default=8)
+    p.add_argument("--docs", type=int, default=20)
+    p.add_argument("--summary-kb", type=int, default=8)
+    p.add_argument("--duration", type=float, default=5.0)
+    return p
+
+
+if __name__ == "__main__":
+    args = _build_parser().parse_args()
+    asyncio.run(_main(args.format, args.workers, args.clients, args.docs, args.summary_kb, args.duration))
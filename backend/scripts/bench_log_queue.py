@@ -0,0 +1,144 @@
+"""Benchmark du blocage de l'event loop par les logs sous analyses concurrentes.
+
+Simule ``--analyses`` analyses concurrentes qui loggent par rafales (une rafale
+par chunk, puis un ``await`` réseau simulé), comme ``analyze_chunks_parallel`` /
+``_get_transcript_with_timestamps_inner``, et compare :
+
+  * ``print``  — l'ancien ``print(..., flush=True)`` : write + flush synchrones ;
+  * ``sync``   — ``logging.StreamHandler`` + ``JSONFormatter`` dans l'appelant ;
+  * ``queue``  — ``core.logging`` : ``ContextQueueHandler`` + thread listener.
+
+Le sink est un fichier temporaire ; ``--flush-latency-us`` ajoute une latence à
+chaque flush pour reproduire un stdout en pipe saturé (driver de logs Docker
+lent sous charge). Mesures : temps passé dans les appels de log (bloquant pour
+la loop) et retard d'une tâche sentinelle qui se réveille toutes les 1 ms.
+
+Usage::
+
+    cd backend && python -m scripts.bench_log_queue
+    cd backend && python -m scripts.bench_log_queue --analyses 50 --chunks 40 --flush-latency-us 500
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Path hack pour rendre `src/` importable depuis backend/scripts/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core.logging import JSONFormatter, _install_queue_handler, flush_logs  # noqa: E402
+
+LINES_PER_CHUNK = 5
+TICK_S = 0.001
+
+
+class SlowSink:
+    """Fichier texte dont chaque flush coûte ``flush_latency_s`` (pipe saturé)."""
+
+    def __init__(self, flush_latency_s: float):
+        self._file = tempfile.TemporaryFile("w+", encoding="utf-8")
+        self.flush_latency_s = flush_latency_s
+
+    def write(self, text: str) -> int:
+        return self._file.write(text)
+
+    def flush(self) -> None:
+        self._file.flush()
+        if self.flush_latency_s:
+            time.sleep(self.flush_latency_s)
+
+
+def _emitter(mode: str, sink: SlowSink):
+    if mode == "print":
+
+        def emit(message: str) -> None:
+            with contextlib.redirect_stdout(sink):
+                print(message, flush=True)
+
+        return emit
+
+    target = logging.getLogger(f"bench.{mode}")
+    target.handlers = []
+    target.setLevel(logging.INFO)
+    target.propagate = False
+    handler = logging.StreamHandler(sink)
+    handler.setFormatter(JSONFormatter())
+    target.addHandler(handler)
+    if mode == "queue":
+        _install_queue_handler(target)
+    return target.info
+
+
+async def _run(mode: str, analyses: int, chunks: int, flush_latency_s: float) -> dict:
+    sink = SlowSink(flush_latency_s)
+    emit = _emitter(mode, sink)
+    blocked: list = []
+    lags: list = []
+    done = asyncio.Event()
+
+    async def sentinel() -> None:
+        while not done.is_set():
+            t0 = time.perf_counter()
+            await asyncio.sleep(TICK_S)
+            lags.append(max(0.0, time.perf_counter() - t0 - TICK_S) * 1000)
+
+    async def analysis(n: int) -> None:
+        for chunk in range(chunks):
+            t0 = time.perf_counter()
+            for line in range(LINES_PER_CHUNK):
+                emit(f"🔍 [Chunk {chunk + 1}/{chunks}] analysis={n} step={line} words=1200")
+            blocked.append(time.perf_counter() - t0)
+            await asyncio.sleep(0.002)  # appel Mistral / Supadata simulé
+
+    watcher = asyncio.create_task(sentinel())
+    t0 = time.perf_counter()
+    await asyncio.gather(*(analysis(n) for n in range(analyses)))
+    wall = time.perf_counter() - t0
+    done.set()
+    await watcher
+    drain_t0 = time.perf_counter()
+    if mode == "queue":
+        flush_logs(timeout=120.0)
+    drain = time.perf_counter() - drain_t0
+
+    lags.sort()
+    return {
+        "blocked_ms": sum(blocked) * 1000,
+        "lag_p50": statistics.median(lags) if lags else 0.0,
+        "lag_p99": lags[int(len(lags) * 0.99) - 1] if len(lags) > 1 else 0.0,
+        "lag_max": lags[-1] if lags else 0.0,
+        "wall_s": wall,
+        "drain_s": drain,
+    }
+
+
+def main(analyses: int, chunks: int, flush_latency_us: float) -> None:
+    lines = analyses * chunks * LINES_PER_CHUNK
+    print(f"{analyses} analyses × {chunks} chunks × {LINES_PER_CHUNK} lignes = {lines} logs, flush +{flush_latency_us:.0f}µs")
+    print(f"{'mode':>6} {'blocked ms':>11} {'lag p50':>8} {'lag p99':>8} {'lag max':>8} {'wall s':>7} {'drain s':>8}")
+    for mode in ("print", "sync", "queue"):
+        r = asyncio.run(_run(mode, analyses, chunks, flush_latency_us / 1e6))
+        print(
+            f"{mode:>6} {r['blocked_ms']:>11.1f} {r['lag_p50']:>8.2f} {r['lag_p99']:>8.2f} "
+            f"{r['lag_max']:>8.2f} {r['wall_s']:>7.2f} {r['drain_s']:>8.2f}"
+        )
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Benchmark event-loop blocking caused by logging.")
+    p.add_argument("--analyses", type=int, default=20)
+    p.add_argument("--chunks", type=int, default=20)
+    p.add_argument("--flush-latency-us", type=float, default=200.0)
+    return p
+
+
+if __name__ == "__main__":
+    args = _build_parser().parse_args()
+    main(analyses=args.analyses, chunks=args.chunks, flush_latency_us=args.flush_latency_us)
@@ -0,0 +1,170 @@
+"""Benchmark du débit de vérifications de rate limit (checks/s).
+
+``--clients`` coroutines appellent le limiteur en boucle sur ``--keys`` clés
+(distribution zipf-like : la clé 0 reçoit la moitié du trafic, comme une IP
+derrière un NAT ou un client API agressif), et compare :
+
+  * ``zset``     — l'ancien ``middleware.rate_limiter.RedisBackend`` : pipeline
+                   ZREMRANGEBYSCORE/ZCOUNT/ZADD/EXPIRE, + ZREM et ZRANGE sur refus ;
+  * ``lua``      — ``core.rate_limit_engine`` : un EVAL atomique par vérification ;
+  * ``prefetch`` — idem avec pré-fetch local des jetons sur les clés chaudes.
+
+Redis est fakeredis en process ; ``--rtt-us`` ajoute une latence par aller-retour
+pour reproduire un Redis managé (Railway/Upstash : 300-1500 µs). ``--redis-url``
+mesure contre un vrai serveur (clés préfixées, nettoyées en fin de run).
+
+Usage::
+
+    cd backend && python -m scripts.bench_rate_limiter
+    cd backend && python -m scripts.bench_rate_limiter --clients 64 --rtt-us 800
+    cd backend && python -m scripts.bench_rate_limiter --redis-url redis://localhost:6379/0
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Path hack pour rendre `src/` importable depuis backend/scripts/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core.rate_limit_engine import RateLimitEngine, RateRule  # noqa: E402
+
+LIMIT_PER_MINUTE = 100_000  # assez haut pour mesurer le chemin "autorisé"
+
+
+class RttRedis:
+    """Client Redis dont chaque aller-retour coûte ``rtt_s`` (compte les round trips)."""
+
+    def __init__(self, client, rtt_s: float):
+        self._client = client
+        self.rtt_s = rtt_s
+        self.round_trips = 0
+
+    async def _wait(self) -> None:
+        self.round_trips += 1
+        if self.rtt_s:
+            await asyncio.sleep(self.rtt_s)
+
+    def pipeline(self):
+        outer = self
+        pipe = self._client.pipeline()
+
+        class _Pipe:
+            def __getattr__(self, name):
+                return getattr(pipe, name)
+
+            async def execute(self):
+                await outer._wait()
+                return await pipe.execute()
+
+        return _Pipe()
+
+    def __getattr__(self, name):
+        method = getattr(self._client, name)
+
+        async def call(*args, **kwargs):
+            await self._wait()
+            return await method(*args, **kwargs)
+
+        return call
+
+
+async def _zset_check(redis, key: str, limit: int, window_seconds: int) -> bool:
+    """Copie de l'ancien RedisBackend.check_and_increment (référence)."""
+    now = time.time()
+    window_start = now - window_seconds
+    pipe = redis.pipeline()
+    pipe.zremrangebyscore(key, 0, window_start)
+    pipe.zcount(key, window_start, now)
+    pipe.zadd(key, {f"{now}:{random.random()}": now})
+    pipe.expire(key, window_seconds + 1)
+    results = await pipe.execute()
+    if results[1] >= limit:
+        await redis.zrem(key, str(now))
+        await redis.zrange(key, 0, 0, withscores=True)
+        return False
+    return True
+
+
+def _pick_key(keys: int) -> str:
+    return "hot" if keys == 1 or random.random() < 0.5 else f"k{random.randrange(1, keys)}"
+
+
+async def _run(mode: str, redis: RttRedis, clients: int, keys: int, duration_s: float, run_id: str) -> dict:
+    engine = RateLimitEngine(redis=redis, prefetch=mode == "prefetch")
+    rules = (RateRule("minute", LIMIT_PER_MINUTE, 60),)
+    checks = 0
+    latencies: list = []
+    deadline = time.perf_counter() + duration_s
+
+    async def client() -> None:
+        nonlocal checks
+        while time.perf_counter() < deadline:
+            key = f"bench:{run_id}:{mode}:{_pick_key(keys)}"
+            t0 = time.perf_counter()
+            if mode == "zset":
+                await _zset_check(redis, key, LIMIT_PER_MINUTE, 60)
+            else:
+                await engine.hit(key, rules)
+            latencies.append(time.perf_counter() - t0)
+            checks += 1
+
+    redis.round_trips = 0
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    wall = time.perf_counter() - t0
+    latencies.sort()
+    return {
+        "checks_s": checks / wall,
+        "p50_us": latencies[len(latencies) // 2] * 1e6,
+        "p99_us": latencies[int(len(latencies) * 0.99) - 1] * 1e6,
+        "rt_per_check": redis.round_trips / checks if checks else 0.0,
+        "prefetch_hits": engine.counters["prefetch_hits"],
+    }
+
+
+async def _main(clients: int, keys: int, duration_s: float, rtt_us: float, redis_url: str) -> None:
+    if redis_url:
+        import redis.asyncio as aioredis
+
+        raw = aioredis.from_url(redis_url)
+    else:
+        import fakeredis.aioredis as fakeredis_async
+
+        raw = fakeredis_async.FakeRedis()
+    redis = RttRedis(raw, rtt_us / 1e6)
+    run_id = f"{int(time.time())}"
+
+    target = redis_url or f"fakeredis +{rtt_us:.0f}µs/RT"
+    print(f"{clients} clients, {keys} clés, {duration_s:.1f}s par mode — {target}")
+    print(f"{'mode':>9} {'checks/s':>10} {'p50 µs':>9} {'p99 µs':>9} {'RT/check':>9} {'prefetch':>9}")
+    try:
+        for mode in ("zset", "lua", "prefetch"):
+            r = await _run(mode, redis, clients, keys, duration_s, run_id)
+            print(
+                f"{mode:>9} {r['checks_s']:>10.0f} {r['p50_us']:>9.0f} {r['p99_us']:>9.0f} "
+                f"{r['rt_per_check']:>9.2f} {r['prefetch_hits']:>9}"
+            )
+    finally:
+        async for key in raw.scan_iter(match=f"*bench:{run_id}:*"):
+            await raw.delete(key)
+        await raw.aclose()
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Benchmark rate limiter checks/sec.")
+    p.add_argument("--clients", type=int, default=32)
+    p.add_argument("--keys", type=int, default=100)
+    p.add_argument("--duration", type=float, default=2.0)
+    p.add_argument("--rtt-us", type=float, default=500.0)
+    p.add_argument("--redis-url", default="")
+    return p
+
+
+if __name__ == "__main__":
+    args = _build_parser().parse_args()
+    asyncio.run(_main(args.clients, args.keys, args.duration, args.rtt_us, args.redis_url))
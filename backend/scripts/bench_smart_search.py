@@ -0,0 +1,108 @@
+"""Benchmark de ``videos.smart_search.search_relevant_passages`` sur transcripts longs.
+
+Compare, sur des transcripts synthétiques de 2h à 6h (~150 mots/minute, au-delà
+de SMART_SEARCH_THRESHOLD_WORDS) :
+
+  * ``legacy``  — l'ancien scoring ``calculate_bm25_score`` passage par passage
+                  (re-normalise tous les passages pour chaque terme) ;
+  * ``cold``    — ``search_relevant_passages`` avec construction de l'index ;
+  * ``warm``    — idem, index déjà en cache (tours de chat suivants).
+
+Usage::
+
+    cd backend && python -m scripts.bench_smart_search
+    cd backend && python -m scripts.bench_smart_search --hours 2 4 6 --queries 20
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import random
+import statistics
+import time
+from pathlib import Path
+
+# Chargé par chemin : `videos/__init__` importe tout le router FastAPI
+_SPEC = importlib.util.spec_from_file_location(
+    "smart_search", Path(__file__).resolve().parent.parent / "src" / "videos" / "smart_search.py"
+)
+smart_search = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(smart_search)
+
+WORDS_PER_MINUTE = 150
+VOCABULARY = [
+    "photosynthese", "chlorophylle", "inflation", "banques", "monnaie", "volcan", "magma",
+    "eruption", "football", "stade", "arbitre", "algorithme", "reseau", "neurone", "climat",
+    "ocean", "glacier", "energie", "nucleaire", "solaire", "histoire", "empire", "revolution",
+    "economie", "marche", "politique", "election", "democratie", "medecine", "vaccin", "virus",
+] + [f"terme{i}" for i in range(2000)]
+FILLER = ["le", "la", "de", "et", "un", "une", "est", "dans", "pour", "avec", "que", "qui"]
+QUESTIONS = [
+    "Pourquoi l'inflation fait-elle monter les taux des banques ?",
+    "Comment fonctionne la photosynthèse et la chlorophylle ?",
+    "Que dit la vidéo sur le volcan et le magma ?",
+    "Quel est le rôle de l'algorithme et du réseau de neurones ?",
+    "Parle-moi du climat, des glaciers et de l'océan.",
+]
+
+
+def _transcript(hours: float, rng: random.Random) -> str:
+    words = []
+    for i in range(int(hours * 60 * WORDS_PER_MINUTE)):
+        words.append(rng.choice(VOCABULARY) if rng.random() < 0.4 else rng.choice(FILLER))
+        if i % 18 == 17:
+            words[-1] += "."
+    return " ".join(words)
+
+
+def _legacy_search(question: str, transcript: str, duration: int) -> list:
+    query_terms = smart_search.extract_question_keywords(question)
+    passages = smart_search.split_into_passages(transcript, duration)
+    scored = []
+    for passage in passages:
+        score, matched = smart_search.calculate_bm25_score(query_terms, passage, passages)
+        if matched:
+            passage.relevance_score = score
+            scored.append(passage)
+    scored.sort(key=lambda p: p.relevance_score, reverse=True)
+    return scored[: smart_search.MAX_RELEVANT_PASSAGES]
+
+
+def _timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, nargs="+", default=[2, 4, 6])
+    parser.add_argument("--queries", type=int, default=10)
+    parser.add_argument("--legacy-queries", type=int, default=2, help="legacy est lent : peu d'itérations")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    print(f"{'hours':>5} {'words':>8} {'passages':>8} {'legacy ms':>10} {'cold ms':>9} {'warm p50':>9} {'speedup':>8}")
+    for hours in args.hours:
+        transcript = _transcript(hours, rng)
+        duration = int(hours * 3600)
+        smart_search.clear_index_cache()
+
+        legacy = statistics.median(
+            _timed(_legacy_search, QUESTIONS[i % len(QUESTIONS)], transcript, duration)
+            for i in range(args.legacy_queries)
+        )
+        cold = _timed(smart_search.search_relevant_passages, QUESTIONS[0], transcript, duration)
+        warm = statistics.median(
+            _timed(smart_search.search_relevant_passages, QUESTIONS[i % len(QUESTIONS)], transcript, duration)
+            for i in range(args.queries)
+        )
+        passages = len(smart_search.get_transcript_index(transcript, duration).passages)
+        print(
+            f"{hours:>5g} {len(transcript.split()):>8} {passages:>8} {legacy:>10.1f} {cold:>9.1f} "
+            f"{warm:>9.2f} {legacy / warm:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark de latence de requête pour ``search.vector_index``.
+
+Compare, sur un corpus synthétique de vecteurs 1024-dim :
+
+  * ``legacy``  — l'ancien chemin ``search_similar`` : ``json.loads`` par ligne
+                  + ``_cosine_similarity`` pure-Python (mesuré sur un échantillon
+                  puis extrapolé au-delà de 10k lignes, sinon trop lent) ;
+  * ``flat``    — ``TranscriptVectorIndex`` matmul NumPy + argpartition ;
+  * ``hnsw``    — idem en mode ANN (si ``hnswlib`` est installé).
+
+Usage::
+
+    cd backend && python -m scripts.bench_vector_index
+    cd backend && python -m scripts.bench_vector_index --sizes 10000 100000 1000000 --queries 50
+
+Mémoire : 1M chunks × 1024 dims × float32 ≈ 4 Go pour la matrice seule.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Path hack pour rendre `src/` importable depuis backend/scripts/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import numpy as np  # noqa: E402
+
+from search.embedding_service import EMBEDDING_DIMENSION, _cosine_similarity  # noqa: E402
+from search.vector_index import HNSWLIB_AVAILABLE, IndexedChunk, TranscriptVectorIndex  # noqa: E402
+
+CATEGORIES = ["science", "tech", "history", "music", "news", "education", None]
+LEGACY_SAMPLE = 2000
+BUILD_BATCH = 50_000
+
+
+def _build(size: int, mode: str, rng: np.random.Generator) -> TranscriptVectorIndex:
+    index = TranscriptVectorIndex(dim=EMBEDDING_DIMENSION, mode=mode)
+    for start in range(0, size, BUILD_BATCH):
+        n = min(BUILD_BATCH, size - start)
+        vectors = rng.standard_normal((n, EMBEDDING_DIMENSION), dtype=np.float32)
+        chunks = [
+            IndexedChunk(
+                row_id=start + i + 1,
+                video_id=f"vid{(start + i) // 20}",
+                chunk_index=(start + i) % 20,
+                text_preview=None,
+                video_title=None,
+                video_channel=None,
+                thumbnail_url=None,
+                category=CATEGORIES[(start + i) % len(CATEGORIES)],
+            )
+            for i in range(n)
+        ]
+        index.add(chunks, vectors)
+    index._build_hnsw()
+    return index
+
+
+def _time_ms(fn, repeats: int) -> tuple[float, float]:
+    samples = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1 if len(samples) > 1 else 0]
+
+
+def _bench_legacy(size: int, rng: np.random.Generator) -> float:
+    """Latence extrapolée du scan JSON + cosine pure-Python sur ``size`` lignes."""
+    sample = min(size, LEGACY_SAMPLE)
+    rows = [json.dumps(v.tolist()) for v in rng.standard_normal((sample, EMBEDDING_DIMENSION), dtype=np.float32)]
+    query = rng.standard_normal(EMBEDDING_DIMENSION).tolist()
+    t0 = time.perf_counter()
+    for raw in rows:
+        _cosine_similarity(query, json.loads(raw))
+    return (time.perf_counter() - t0) * 1000 * size / sample
+
+
+def main(sizes: list[int], queries: int, limit: int) -> None:
+    rng = np.random.default_rng(42)
+    modes = ["flat"] + (["hnsw"] if HNSWLIB_AVAILABLE else [])
+    print(f"{'size':>10} {'mode':>8} {'p50 ms':>10} {'p95 ms':>10} {'p50 cat ms':>11}")
+    for size in sizes:
+        print(f"{size:>10} {'legacy':>8} {_bench_legacy(size, rng):>10.1f} {'-':>10} {'-':>11}  (extrapolated)")
+        for mode in modes:
+            index = _build(size, mode, rng)
+            qs = rng.standard_normal((queries, EMBEDDING_DIMENSION), dtype=np.float32)
+            it = iter(qs)
+            p50, p95 = _time_ms(lambda: index.search(next(it), limit=limit), queries)
+            it = iter(qs)
+            p50_cat, _ = _time_ms(lambda: index.search(next(it), limit=limit, category="science"), queries)
+            print(f"{size:>10} {mode:>8} {p50:>10.2f} {p95:>10.2f} {p50_cat:>11.2f}")
+            del index
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Benchmark TranscriptVectorIndex query latency.")
+    p.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    p.add_argument("--queries", type=int, default=50)
+    p.add_argument("--limit", type=int, default=10)
+    return p
+
+
+if __name__ == "__main__":
+    args = _build_parser().parse_args()
+    main(sizes=args.sizes, queries=args.queries, limit=args.limit)
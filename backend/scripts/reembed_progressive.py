@@ -20,6 +20,11 @@ Usage:
     cd backend && python -m scripts.reembed_progressive --dry-run
     cd backend && python -m scripts.reembed_progressive --limit 500
 
+Binary backfill (alembic 034) — re-encodes ``embedding_json`` into the
+``embedding_vec`` float32 column of all 5 embedding tables, no API call:
+    cd backend && python -m scripts.reembed_progressive --backfill-binary
+    cd backend && python -m scripts.reembed_progressive --backfill-binary --drop-json
+
 Safety:
     Embedding dimension is asserted equal to
     ``embedding_service.EMBEDDING_DIMENSION`` (1024). If a future model bump
@@ -35,7 +40,7 @@ import logging
 import sys
 from typing import Optional
 
-from sqlalchemy import select, update
+from sqlalchemy import delete, select, update
 
 # Make ``backend/src`` importable when the script is invoked from
 # ``backend/`` directly (``python -m scripts.reembed_progressive``).
@@ -44,12 +49,20 @@ _BACKEND_SRC = os.path.join(os.path.dirname(__file__), "..", "src")
 if os.path.isdir(_BACKEND_SRC) and _BACKEND_SRC not in sys.path:
     sys.path.insert(0, os.path.abspath(_BACKEND_SRC))
 
-from db.database import async_session_maker, TranscriptEmbedding  # noqa: E402
+from db.database import (  # noqa: E402
+    async_session_maker,
+    ChatEmbedding,
+    FlashcardEmbedding,
+    QuizEmbedding,
+    SummaryEmbedding,
+    TranscriptEmbedding,
+)
 from search.embedding_service import (  # noqa: E402
     EMBEDDING_DIMENSION,
     MODEL_VERSION_TAG,
     generate_embeddings_batch,
 )
+from search.vector_codec import embedding_columns, encode_embedding  # noqa: E402
 
 logger = logging.getLogger("reembed_progressive")
 logging.basicConfig(
@@ -63,6 +76,8 @@ BATCH_SIZE: int = 100  # how many chunks selected per DB pass
 EMBED_API_BATCH: int = 10  # how many texts per Mistral API call (max 10)
 SLEEP_BETWEEN_BATCHES: float = 2.0  # seconds — Mistral courtesy throttle
 MODEL_VERSION_TARGET: str = MODEL_VERSION_TAG  # SSOT from embedding_service
+BACKFILL_BATCH_SIZE: int = 500  # rows re-encoded per DB pass (no API call)
+EMBEDDING_MODELS = (TranscriptEmbedding, SummaryEmbedding, FlashcardEmbedding, QuizEmbedding, ChatEmbedding)
 
 
 async def _select_outdated_chunk_ids(
@@ -98,7 +113,7 @@ async def _persist_embeddings(
     pairs: list[tuple[int, Optional[list[float]]]],
     target: str,
 ) -> int:
-    """Update embedding_json + model_version for each (id, vector). Returns count updated."""
+    """Update embedding_vec (+ legacy json) + model_version for each (id, vector). Returns count updated."""
     updated = 0
     for chunk_id, vector in pairs:
         if vector is None:
@@ -114,7 +129,7 @@ async def _persist_embeddings(
         await session.execute(
             update(TranscriptEmbedding)
             .where(TranscriptEmbedding.id == chunk_id)
-            .values(embedding_json=json.dumps(vector), model_version=target)
+            .values(**embedding_columns(vector), model_version=target)
         )
         updated += 1
     if updated:
@@ -178,6 +193,62 @@ async def reembed_batch(target: str = MODEL_VERSION_TARGET, dry_run: bool = Fals
         return await _persist_embeddings(session, results, target)
 
 
+async def backfill_binary_batch(model, drop_json: bool = False, dry_run: bool = False) -> int:
+    """Re-encode one batch of ``model`` rows whose ``embedding_vec`` is NULL.
+
+    Returns the number of rows processed (0 when the table is done).
+    """
+    async with async_session_maker() as session:
+        stmt = (
+            select(model.id, model.embedding_json)
+            .where(model.embedding_vec.is_(None), model.embedding_json.is_not(None))
+            .order_by(model.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        )
+        rows = (await session.execute(stmt)).all()
+        if not rows or dry_run:
+            return len(rows)
+
+        for row_id, raw in rows:
+            try:
+                vector = json.loads(raw)
+            except (json.JSONDecodeError, TypeError):
+                vector = None
+            if not vector or len(vector) != EMBEDDING_DIMENSION:
+                # Unusable row: delete so the regular pipeline re-embeds it.
+                logger.warning("[BACKFILL] %s id=%s has invalid JSON — deleting", model.__tablename__, row_id)
+                await session.execute(delete(model).where(model.id == row_id))
+                continue
+            values = {"embedding_vec": encode_embedding(vector)}
+            if drop_json:
+                values["embedding_json"] = None
+            await session.execute(update(model).where(model.id == row_id).values(**values))
+        await session.commit()
+        return len(rows)
+
+
+async def backfill_binary(drop_json: bool, dry_run: bool) -> None:
+    for model in EMBEDDING_MODELS:
+        total = 0
+        while True:
+            n = await backfill_binary_batch(model, drop_json=drop_json, dry_run=dry_run)
+            total += n
+            if n == 0 or dry_run:
+                break
+        logger.info("[BACKFILL] %s: %d rows %s", model.__tablename__, total, "to convert" if dry_run else "converted")
+    if drop_json and not dry_run:
+        # Also clear JSON on rows that were already binary (dual-write period).
+        async with async_session_maker() as session:
+            for model in EMBEDDING_MODELS:
+                await session.execute(
+                    update(model)
+                    .where(model.embedding_vec.is_not(None), model.embedding_json.is_not(None))
+                    .values(embedding_json=None)
+                )
+            await session.commit()
+        logger.info("[BACKFILL] Legacy embedding_json cleared — run VACUUM FULL to reclaim space")
+
+
 async def main(target: str, max_rows: Optional[int], dry_run: bool) -> None:
     total = 0
     while True:
@@ -213,9 +284,22 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Count rows that would be updated without calling the API or writing.",
     )
+    p.add_argument(
+        "--backfill-binary",
+        action="store_true",
+        help="Re-encode embedding_json into embedding_vec on all embedding tables (no API call).",
+    )
+    p.add_argument(
+        "--drop-json",
+        action="store_true",
+        help="With --backfill-binary: also NULL the legacy embedding_json column.",
+    )
     return p
 
 
 if __name__ == "__main__":
     args = _build_parser().parse_args()
-    asyncio.run(main(target=args.target, max_rows=args.limit, dry_run=args.dry_run))
+    if args.backfill_binary:
+        asyncio.run(backfill_binary(drop_json=args.drop_json, dry_run=args.dry_run))
+    else:
+        asyncio.run(main(target=args.target, max_rows=args.limit, dry_run=args.dry_run))
@@ -715,6 +715,39 @@ async def get_proxy_usage(
     }
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# 🩺 PROVIDER HEALTH — Circuits partagés (transcripts, instances, LLM, TTS, TikTok)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+@router.get("/providers/health")
+async def get_providers_health(admin: User = Depends(get_current_admin)):
+    """État des circuits providers (lecture seule).
+
+    Réponse :
+        {
+            "source": "redis" | "local",   # "local" = vue de ce worker (Redis absent)
+            "providers": [
+                {
+                    "provider": "llm:mistral:mistral-small-2603",
+                    "state": "closed" | "open" | "half_open",
+                    "failure_rate": float,      # sur la fenêtre glissante
+                    "window_calls": int,
+                    "window_failures": int,
+                    "trips": int,               # ouvertures consécutives (cooldown exponentiel)
+                    "retry_in_s": float,
+                    "latency_ewma_ms": float | None,
+                    "probe_in_flight": bool,    # source "redis" uniquement
+                },
+                ...
+            ]
+        }
+    """
+    from core.provider_health import get_provider_health_snapshot
+
+    return await get_provider_health_snapshot()
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # 💬 COMMUNITY TAKE CACHE INVALIDATION (Spec 2026-05-17)
 # ═══════════════════════════════════════════════════════════════════════════════
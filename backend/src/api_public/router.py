@@ -13,12 +13,11 @@ from sqlalchemy import select, update
 from pydantic import BaseModel, Field
 from typing import Optional, List, Literal
 from datetime import datetime, timedelta
-from collections import defaultdict
 import hashlib
-import time
 import asyncio
 
 from core.logging import logger
+from core.rate_limit_engine import RateRule, rate_limit_engine
 from db.database import get_session, User
 from exports.markdown_builder import build_markdown_export, slug_for_summary
 
@@ -48,10 +47,10 @@ router = APIRouter(prefix="/api/v1")
 # 🔐 AUTHENTIFICATION API KEY
 # ═══════════════════════════════════════════════════════════════════════════════
 
-# Rate limiting en mémoire (pour production: utiliser Redis)
-_rate_limits: dict = defaultdict(lambda: {"count": 0, "reset_time": 0, "daily_count": 0, "daily_reset": ""})
+# Rate limiting partagé par tous les workers (core.rate_limit_engine, clé api:{user_id})
 _RATE_LIMIT_PER_MINUTE = 60
 _RATE_LIMIT_PER_DAY = 1000
+_RATE_RULES = (RateRule("minute", _RATE_LIMIT_PER_MINUTE, 60), RateRule("day", _RATE_LIMIT_PER_DAY, 86400))
 
 
 def hash_api_key(api_key: str) -> str:
@@ -59,47 +58,30 @@ def hash_api_key(api_key: str) -> str:
     return hashlib.sha256(api_key.encode()).hexdigest()
 
 
-def check_rate_limit(user_id: int) -> tuple[bool, dict]:
+async def check_rate_limit(user_id: int) -> tuple[bool, dict]:
     """
-    Vérifie le rate limiting pour un utilisateur.
+    Vérifie le rate limiting pour un utilisateur (minute + 24h glissantes,
+    un seul aller-retour Redis). Une requête refusée ne consomme rien.
     Retourne (allowed, info)
     """
-    now = time.time()
-    today = datetime.utcnow().strftime("%Y-%m-%d")
-    limits = _rate_limits[user_id]
-
-    # Reset minute counter si nécessaire
-    if now > limits["reset_time"]:
-        limits["count"] = 0
-        limits["reset_time"] = now + 60
-
-    # Reset daily counter si nouveau jour
-    if limits["daily_reset"] != today:
-        limits["daily_count"] = 0
-        limits["daily_reset"] = today
-
-    # Check limits
-    if limits["count"] >= _RATE_LIMIT_PER_MINUTE:
-        return False, {
-            "error": "rate_limit_exceeded",
-            "message": f"Rate limit exceeded: {_RATE_LIMIT_PER_MINUTE} requests per minute",
-            "retry_after": int(limits["reset_time"] - now),
-        }
-
-    if limits["daily_count"] >= _RATE_LIMIT_PER_DAY:
+    decision = await rate_limit_engine.hit(f"api:{user_id}", _RATE_RULES)
+
+    if not decision.allowed:
+        if decision.rule == "minute":
+            return False, {
+                "error": "rate_limit_exceeded",
+                "message": f"Rate limit exceeded: {_RATE_LIMIT_PER_MINUTE} requests per minute",
+                "retry_after": decision.retry_after_s,
+            }
         return False, {
             "error": "daily_limit_exceeded",
             "message": f"Daily limit exceeded: {_RATE_LIMIT_PER_DAY} requests per day",
-            "resets_at": f"{today}T00:00:00Z",
+            "retry_after": decision.retry_after_s,
         }
 
-    # Increment counters
-    limits["count"] += 1
-    limits["daily_count"] += 1
-
     return True, {
-        "requests_remaining": _RATE_LIMIT_PER_MINUTE - limits["count"],
-        "daily_remaining": _RATE_LIMIT_PER_DAY - limits["daily_count"],
+        "requests_remaining": decision.remaining_by_rule["minute"],
+        "daily_remaining": decision.remaining_by_rule["day"],
     }
 
 
@@ -164,7 +146,7 @@ async def get_api_user(
         )
 
     # Check rate limits
-    allowed, rate_info = check_rate_limit(user.id)
+    allowed, rate_info = await check_rate_limit(user.id)
     if not allowed:
         raise HTTPException(status_code=429, detail=rate_info)
 
@@ -950,16 +932,16 @@ async def get_usage_stats(request: Request, user: User = Depends(get_api_user)):
     📊 Statistiques d'utilisation de l'API.
     """
     rate_info = getattr(request.state, "rate_info", {})
-    limits = _rate_limits.get(user.id, {})
+    daily_count = _RATE_LIMIT_PER_DAY - rate_info.get("daily_remaining", _RATE_LIMIT_PER_DAY)
 
     return UsageStats(
         today={
-            "requests": limits.get("daily_count", 0),
+            "requests": daily_count,
             "limit": _RATE_LIMIT_PER_DAY,
             "remaining": rate_info.get("daily_remaining", _RATE_LIMIT_PER_DAY),
         },
         this_month={
-            "estimated_requests": limits.get("daily_count", 0) * 30,
+            "estimated_requests": daily_count * 30,
             "note": "Monthly stats available in dashboard",
         },
         rate_limits={
@@ -7,6 +7,7 @@
 ║  ✅ Vérification des tokens blacklistés                                            ║
 ║  ✅ Rate limiting intégré                                                           ║
 ║  ✅ Validation stricte des permissions                                              ║
+║  ✅ Principal cache par jti (user + session sans requête DB sur hit)               ║
 ╚════════════════════════════════════════════════════════════════════════════════════╝
 """
 
@@ -14,15 +15,16 @@ import os
 import logging
 from typing import Callable, Optional
 
-from fastapi import Depends, HTTPException, Request, status
+from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordBearer, HTTPBearer, HTTPAuthorizationCredentials
 import jwt  # PyJWT (Wave 1 Step 5 migration from python-jose, CVE-2024-33664/33663)
 from jwt.exceptions import ExpiredSignatureError, PyJWTError as JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import core.config as _core_config
-from db.database import get_session, User
+from db.database import async_session_maker, get_session, User
 from .service import verify_token_with_flow, get_user_by_id, validate_session_token, validate_session_v2
+from .principal_cache import load_principal, principal_cache_key, store_principal
 
 
 def _jwt_config() -> dict:
@@ -98,6 +100,65 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=Fals
 http_bearer = HTTPBearer(auto_error=False)
 
 
+async def _load_authenticated_user(session: AsyncSession, user_id: int, payload: dict, auth_flow: str) -> User:
+    """Charge l'utilisateur du token et valide sa session (2 requêtes DB).
+
+    Lève les 401 de get_current_user ; appelé seulement sur miss du principal cache.
+    """
+    user = await get_user_by_id(session, user_id)
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail={"code": "user_not_found", "message": "User account not found."},
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # 🆕 Wave 1 Step 4 — Validation session selon le flow décidé par feature_flags.
+    # V1 legacy : validate_session_token (User.session_token unique partagé).
+    # V2 :        validate_session_v2 (UserSession lookup via jti).
+    if auth_flow == "v2":
+        jti = payload.get("jti")
+        if not jti:
+            # Token V2 décidé par le feature flag mais pas de jti dans le payload
+            # → token V1 émis avant l'enrollment dans le bucket. On rejette pour
+            # forcer un re-login propre (et émettre un token V2 cette fois).
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail={
+                    "code": "session_upgrade_required",
+                    "message": "Your session needs to be upgraded. Please log in again.",
+                },
+                headers={"WWW-Authenticate": "Bearer", "X-Session-Invalid": "true"},
+            )
+        is_valid_session = await validate_session_v2(session, jti)
+        if not is_valid_session:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail={
+                    "code": "session_expired",
+                    "message": "Your session has expired. You may have logged in from another device.",
+                },
+                headers={"WWW-Authenticate": "Bearer", "X-Session-Invalid": "true"},
+            )
+    else:
+        # Flow legacy V1 : validation session_token classique.
+        session_token = payload.get("session")
+        if session_token:
+            is_valid_session = await validate_session_token(session, user_id, session_token)
+            if not is_valid_session:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail={
+                        "code": "session_expired",
+                        "message": "Your session has expired. You may have logged in from another device.",
+                    },
+                    headers={"WWW-Authenticate": "Bearer", "X-Session-Invalid": "true"},
+                )
+
+    return user
+
+
 async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(http_bearer),
     token: Optional[str] = Depends(oauth2_scheme),
@@ -163,56 +224,12 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = await get_user_by_id(session, user_id)
-
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail={"code": "user_not_found", "message": "User account not found."},
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-    # 🆕 Wave 1 Step 4 — Validation session selon le flow décidé par feature_flags.
-    # V1 legacy : validate_session_token (User.session_token unique partagé).
-    # V2 :        validate_session_v2 (UserSession lookup via jti).
-    if auth_flow == "v2":
-        jti = payload.get("jti")
-        if not jti:
-            # Token V2 décidé par le feature flag mais pas de jti dans le payload
-            # → token V1 émis avant l'enrollment dans le bucket. On rejette pour
-            # forcer un re-login propre (et émettre un token V2 cette fois).
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail={
-                    "code": "session_upgrade_required",
-                    "message": "Your session needs to be upgraded. Please log in again.",
-                },
-                headers={"WWW-Authenticate": "Bearer", "X-Session-Invalid": "true"},
-            )
-        is_valid_session = await validate_session_v2(session, jti)
-        if not is_valid_session:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail={
-                    "code": "session_expired",
-                    "message": "Your session has expired. You may have logged in from another device.",
-                },
-                headers={"WWW-Authenticate": "Bearer", "X-Session-Invalid": "true"},
-            )
-    else:
-        # Flow legacy V1 : validation session_token classique.
-        session_token = payload.get("session")
-        if session_token:
-            is_valid_session = await validate_session_token(session, user_id, session_token)
-            if not is_valid_session:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail={
-                        "code": "session_expired",
-                        "message": "Your session has expired. You may have logged in from another device.",
-                    },
-                    headers={"WWW-Authenticate": "Bearer", "X-Session-Invalid": "true"},
-                )
+    # 🪪 Principal cache : user + session déjà validés pour ce jti, sans DB
+    principal_key = principal_cache_key(user_id, auth_flow, payload, actual_token)
+    user, generation = await load_principal(session, user_id, principal_key)
+    if user is None:
+        user = await _load_authenticated_user(session, user_id, payload, auth_flow)
+        await store_principal(principal_key, user, generation, payload.get("exp"))
 
     # 🔒 Rate limiting (optionnel à ce niveau, plus strict dans les endpoints sensibles)
     # Admin exempt du rate limiting auth-level (protection DDoS reste au niveau Caddy)
@@ -272,27 +289,43 @@ async def get_current_user_optional(
     except (ValueError, TypeError):
         return None
 
-    user = await get_user_by_id(session, user_id)
+    principal_key = principal_cache_key(user_id, auth_flow, payload, actual_token)
+    user, generation = await load_principal(session, user_id, principal_key)
+    if user is not None:
+        return user
 
-    if not user:
-        return None
-
-    if auth_flow == "v2":
-        jti = payload.get("jti")
-        if not jti:
-            # Pas de jti sur un user bucketé V2 → token V1 obsolète → reject silencieux.
-            return None
-        is_valid_session = await validate_session_v2(session, jti)
-        if not is_valid_session:
+    try:
+        user = await _load_authenticated_user(session, user_id, payload, auth_flow)
+    except HTTPException as exc:
+        if exc.status_code == status.HTTP_401_UNAUTHORIZED:
             return None
-    else:
-        # Flow legacy V1.
-        session_token = payload.get("session")
-        if session_token:
-            is_valid_session = await validate_session_token(session, user_id, session_token)
-            if not is_valid_session:
-                return None
+        raise
+
+    await store_principal(principal_key, user, generation, payload.get("exp"))
+    return user
 
+
+async def get_current_user_sse(
+    token: Optional[str] = Query(None, description="JWT via ?token= : EventSource ne peut pas envoyer de header"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(http_bearer),
+    bearer_token: Optional[str] = Depends(oauth2_scheme),
+) -> User:
+    """
+    🔐 Utilisateur courant pour les flux SSE longue durée.
+
+    Mêmes vérifications que get_current_user_optional (blacklist, session,
+    principal cache), avec le token accepté en query param en dernier recours.
+    La session DB est ouverte le temps de l'authentification seulement : un flux
+    de 30 min ne monopolise pas une connexion du pool.
+    """
+    async with async_session_maker() as session:
+        user = await get_current_user_optional(credentials, bearer_token or token, session)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail={"code": "not_authenticated", "message": "Authentication required. Please log in."},
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
@@ -0,0 +1,235 @@
+"""
+╔════════════════════════════════════════════════════════════════════════════════════╗
+║  🪪 PRINCIPAL CACHE — Utilisateur authentifié résolu sans aller-retour DB           ║
+╠════════════════════════════════════════════════════════════════════════════════════╣
+║  Entrée = snapshot des colonnes User + session déjà validée, clé par               ║
+║  user_id + flow + jti (V2) ou hash du token (V1). TTL court, plafonné à l'exp      ║
+║  du JWT.                                                                           ║
+║                                                                                    ║
+║  Invalidation par génération : chaque user a un jeton de génération dans           ║
+║  core.cache, une entrée n'est servie que si elle a été remplie sous la             ║
+║  génération courante. Logout, révocation, changement de plan — et plus             ║
+║  largement toute écriture ORM commitée sur User/UserSession — la renouvellent.     ║
+║  core.cache propage la nouvelle valeur aux L1 des autres workers (pub/sub).        ║
+╚════════════════════════════════════════════════════════════════════════════════════╝
+
+Usage (cf auth.dependencies.get_current_user):
+    key = principal_cache_key(user_id, auth_flow, payload, token)
+    user, generation = await load_principal(session, user_id, key)
+    if user is None:
+        user = ...  # get_user_by_id + validation de session
+        await store_principal(key, user, generation, payload.get("exp"))
+
+Les écritures Core (``update(User)...``) ne passent pas par les events ORM :
+appeler ``await invalidate_principal(user_id)`` après leur commit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import Date, DateTime, event
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+
+from core.cache import cache_service
+from core.logging import logger
+from db.database import User, UserSession
+
+PRINCIPAL_CACHE_ENABLED = os.environ.get("AUTH_PRINCIPAL_CACHE_ENABLED", "true").lower() == "true"
+PRINCIPAL_TTL_S = int(os.environ.get("AUTH_PRINCIPAL_CACHE_TTL_S", "30"))
+# La génération doit survivre à toute entrée remplie avant son renouvellement
+GENERATION_TTL_S = PRINCIPAL_TTL_S * 4 + 60
+
+_ENTRY_PREFIX = "auth_principal"
+_GENERATION_PREFIX = "auth_principal_gen"
+_SESSION_INFO_KEY = "principal_cache_user_ids"
+
+_counters = {"hits": 0, "misses": 0, "stale": 0, "stores": 0, "invalidations": 0}
+_pending: set = set()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# 🔑 CLÉS & SNAPSHOT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def principal_cache_key(user_id: int, auth_flow: str, payload: dict, token: str) -> str:
+    """Clé d'entrée : le jti identifie la session V2 ; en V1 on hashe le token."""
+    session_ref = payload.get("jti") if auth_flow == "v2" else None
+    if not session_ref:
+        session_ref = hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+    return f"{_ENTRY_PREFIX}:{user_id}:{auth_flow}:{session_ref}"
+
+
+def _generation_key(user_id: int) -> str:
+    return f"{_GENERATION_PREFIX}:{user_id}"
+
+
+def _temporal_columns() -> Dict[str, type]:
+    columns = {}
+    for attr in sa_inspect(User).column_attrs:
+        column_type = attr.columns[0].type
+        if isinstance(column_type, DateTime):
+            columns[attr.key] = datetime
+        elif isinstance(column_type, Date):
+            columns[attr.key] = date
+    return columns
+
+
+_TEMPORAL_COLUMNS = _temporal_columns()
+
+
+def _snapshot(user: User) -> Optional[Dict[str, Any]]:
+    """Colonnes chargées du User, sérialisables JSON. None si une colonne manque
+    (expirée après flush, différée...) : l'objet restauré ne doit jamais lazy-load."""
+    state = sa_inspect(user, raiseerr=False)
+    if state is None or state.identity is None:
+        return None
+    loaded = state.dict
+    data: Dict[str, Any] = {}
+    for attr in state.mapper.column_attrs:
+        if attr.key not in loaded:
+            return None
+        value = loaded[attr.key]
+        if attr.key in _TEMPORAL_COLUMNS and value is not None:
+            value = value.isoformat()
+        data[attr.key] = value
+    return data
+
+
+def _restore(session: AsyncSession, data: Dict[str, Any]) -> User:
+    """User persistant rattaché à ``session`` sans SELECT.
+
+    Si la session a déjà cet utilisateur en identity map, c'est lui qu'on rend
+    (il est au moins aussi frais que le snapshot).
+    """
+    sync_session = session.sync_session
+    existing = sync_session.identity_map.get(identity_key(User, data["id"]))
+    if existing is not None:
+        return existing
+
+    values = dict(data)
+    for key, kind in _TEMPORAL_COLUMNS.items():
+        if values.get(key) is not None:
+            values[key] = kind.fromisoformat(values[key])
+    user = User(**values)
+    make_transient_to_detached(user)
+    sync_session.add(user)
+    return user
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# 📥 LECTURE / ÉCRITURE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+async def load_principal(session: AsyncSession, user_id: int, key: str) -> Tuple[Optional[User], str]:
+    """Retourne ``(user, génération)`` ; ``user`` est None sur miss ou entrée périmée.
+
+    La génération est lue AVANT la requête DB du caller : une invalidation
+    survenant pendant celle-ci rend l'entrée stockée ensuite inutilisable.
+    """
+    if not PRINCIPAL_CACHE_ENABLED:
+        return None, ""
+    entry, generation = await asyncio.gather(cache_service.get(key), cache_service.get(_generation_key(user_id)))
+    generation = generation or "0"
+    if entry is None:
+        _counters["misses"] += 1
+        return None, generation
+    if entry.get("gen") != generation:
+        _counters["stale"] += 1
+        return None, generation
+    try:
+        user = _restore(session, entry["user"])
+    except Exception as e:
+        logger.warning("Principal cache restore failed", error=str(e)[:120])
+        _counters["misses"] += 1
+        return None, generation
+    _counters["hits"] += 1
+    return user, generation
+
+
+async def store_principal(key: str, user: User, generation: str, token_exp: Optional[float] = None) -> None:
+    """Met en cache un principal dont la session vient d'être validée."""
+    if not PRINCIPAL_CACHE_ENABLED or not generation:
+        return
+    ttl = PRINCIPAL_TTL_S
+    if token_exp:
+        ttl = min(ttl, int(token_exp - time.time()))
+    if ttl <= 0:
+        return
+    data = _snapshot(user)
+    if data is None:
+        return
+    if await cache_service.set(key, {"gen": generation, "user": data}, ttl=ttl):
+        _counters["stores"] += 1
+
+
+async def invalidate_principal(user_id: int) -> None:
+    """Renouvelle la génération du user : toutes ses entrées deviennent périmées."""
+    await cache_service.set(_generation_key(user_id), uuid.uuid4().hex, ttl=GENERATION_TTL_S)
+    _counters["invalidations"] += 1
+
+
+async def _invalidate_many(user_ids: Iterable[int]) -> None:
+    for user_id in user_ids:
+        await invalidate_principal(user_id)
+
+
+def get_principal_cache_stats() -> dict:
+    lookups = _counters["hits"] + _counters["misses"] + _counters["stale"]
+    return {
+        "enabled": PRINCIPAL_CACHE_ENABLED,
+        "ttl_s": PRINCIPAL_TTL_S,
+        **_counters,
+        "hit_rate": round(_counters["hits"] / lookups, 3) if lookups else 0.0,
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# 🔔 INVALIDATION SUR COMMIT (events ORM)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(db_session: Session, flush_context) -> None:
+    """Note les users dont la ligne User ou une UserSession a changé dans ce flush."""
+    user_ids = None
+    for obj in (*db_session.dirty, *db_session.deleted):
+        if isinstance(obj, User):
+            user_id = sa_inspect(obj).dict.get("id")
+        elif isinstance(obj, UserSession):
+            user_id = sa_inspect(obj).dict.get("user_id")
+        else:
+            continue
+        if user_id is not None:
+            if user_ids is None:
+                user_ids = db_session.info.setdefault(_SESSION_INFO_KEY, set())
+            user_ids.add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(db_session: Session) -> None:
+    user_ids = db_session.info.pop(_SESSION_INFO_KEY, None)
+    if not user_ids:
+        return
+    try:
+        task = asyncio.get_running_loop().create_task(_invalidate_many(user_ids))
+    except RuntimeError:
+        return  # pas de loop (code sync pur) : le TTL borne l'obsolescence
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_users(db_session: Session) -> None:
+    db_session.info.pop(_SESSION_INFO_KEY, None)
@@ -245,6 +245,7 @@ async def delete_account(
     # Purge des fichiers user-specific R2 AVANT cascade DELETE PG.
     # Best-effort: si R2 est indisponible on continue (Article 17 prioritaire).
     try:
+        from share.og_cache import R2_OG_PREFIX
         from storage.r2 import delete_objects_by_prefix
         from tts.audio_summary import R2_AUDIO_PREFIX
 
@@ -254,6 +255,8 @@ async def delete_account(
         objects_deleted = 0
         for sid in summary_ids:
             objects_deleted += await delete_objects_by_prefix(f"{R2_AUDIO_PREFIX}/{sid}/")
+        if summary_ids:  # un partage (et son image OG) part toujours d'une analyse
+            objects_deleted += await delete_objects_by_prefix(f"{R2_OG_PREFIX}/{user_id}/")
 
         _logger.info(
             "R2 purge during account deletion: user_id=%s summaries=%d objects_deleted=%d",
@@ -268,6 +271,14 @@ async def delete_account(
             exc,
         )
 
+    # Artefacts d'export en cache disque (exports.engine) — best-effort aussi
+    try:
+        from exports.engine import purge_user_exports
+
+        await purge_user_exports(user_id)
+    except Exception as exc:
+        _logger.error("Export cache purge failed during account deletion: user_id=%s error=%s", user_id, exc)
+
     # Invalider la session avant suppression
     await invalidate_user_session(session, current_user.id)
 
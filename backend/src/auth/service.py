@@ -49,6 +49,7 @@ from core.config import JWT_CONFIG, GOOGLE_OAUTH_CONFIG, APPLE_OAUTH_CONFIG, EMA
 from core.logging import logger
 from billing.plan_config import get_limits
 from db.database import User, ChatQuota, WebSearchUsage, UserSession, hash_password, verify_password
+from .principal_cache import invalidate_principal
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🔑 SESSION TOKEN FUNCTIONS
@@ -109,6 +110,7 @@ async def invalidate_user_session(session: AsyncSession, user_id: int) -> None:
     """Invalide la session de l'utilisateur (déconnexion)"""
     await session.execute(update(User).where(User.id == user_id).values(session_token=None))
     await session.commit()
+    await invalidate_principal(user_id)
     print(f"🚪 Session invalidated for user {user_id}", flush=True)
 
 
@@ -20,14 +20,24 @@ Toutes les données disponibles sont assemblées :
   - Fact-check (résultats, score fiabilité)
   - Enrichissement web (sources, deep research)
   - Entités extraites
+
+Cache (v5.0) : le RichContext assemblé est mis en cache par résumé
+(core.cache, clé versionnée + empreinte des champs du Summary) pour éviter
+de relire TranscriptCache/TranscriptCacheChunk et de re-parser les JSON à
+chaque tour de chat. ``invalidate_rich_context`` purge l'entrée quand le
+résumé est mis à jour / enrichi. ``record_prompt_prefix`` suit la
+réutilisation du préfixe statique des prompts (cache de prompt provider).
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
-from dataclasses import dataclass, field
-from typing import Optional
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -74,6 +84,36 @@ MAX_ENRICHMENT_CHARS = 4_000
 MAX_ENTITIES_CHARS = 1_500
 MAX_ACADEMIC_PAPERS = 5
 
+# Cache du RichContext par résumé
+RICH_CONTEXT_CACHE_ENABLED = os.environ.get("RICH_CONTEXT_CACHE_ENABLED", "true").lower() == "true"
+RICH_CONTEXT_CACHE_TTL_S = int(os.environ.get("RICH_CONTEXT_CACHE_TTL_S", "3600"))
+RICH_CONTEXT_CACHE_VERSION = 1  # À incrémenter si RichContext ou son assemblage change
+PROMPT_PREFIX_TTL_S = int(os.environ.get("CHAT_PROMPT_PREFIX_TTL_S", "86400"))
+
+# Champs du Summary lus par build_rich_context → empreinte de l'entrée de cache
+_FINGERPRINT_FIELDS = (
+    "video_id",
+    "video_title",
+    "video_channel",
+    "video_duration",
+    "video_upload_date",
+    "platform",
+    "category",
+    "video_url",
+    "tags",
+    "summary_content",
+    "full_digest",
+    "transcript_context",
+    "structured_index",
+    "fact_check_result",
+    "reliability_score",
+    "enrichment_sources",
+    "enrichment_data",
+    "entities_extracted",
+)
+_METRIC_FIELDS = ("cache_hits", "cache_misses", "hit_us", "miss_us", "prefix_hits", "prefix_misses")
+_local_metrics: dict[str, int] = dict.fromkeys(_METRIC_FIELDS, 0)
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # Dataclass de sortie
@@ -120,6 +160,13 @@ class RichContext:
     # Debug
     total_chars: int = 0
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "RichContext":
+        """Reconstruit un RichContext depuis ``asdict`` (entrée de cache)."""
+        known = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        known["academic_papers"] = [dict(p) for p in known.get("academic_papers") or []]
+        return cls(**known)
+
     def format_for_voice(self, language: str = "fr") -> str:
         """Formate le contexte complet pour le system prompt vocal ElevenLabs.
 
@@ -202,7 +249,45 @@ async def build_rich_context(
 
     Returns:
         RichContext prêt à être formaté pour voice ou chat
+
+    Le résultat est servi depuis le cache tant que l'empreinte du Summary
+    (et la version du cache) n'a pas changé.
     """
+    started = time.perf_counter()
+    use_cache = RICH_CONTEXT_CACHE_ENABLED and summary.id is not None
+    key = _rich_context_cache_key(summary.id, include_transcript, include_academic)
+    fingerprint = summary_fingerprint(summary)
+
+    if use_cache:
+        cached = await _cache_get(key)
+        if isinstance(cached, dict) and cached.get("fingerprint") == fingerprint:
+            try:
+                ctx = RichContext.from_dict(cached["context"])
+            except (KeyError, TypeError) as e:
+                logger.warning("rich_context cache entry unreadable: %s", e)
+            else:
+                await _incr_metric("cache_hits")
+                await _incr_metric("hit_us", _elapsed_us(started))
+                return ctx
+
+    ctx = await _assemble_rich_context(
+        summary, db, include_transcript=include_transcript, include_academic=include_academic
+    )
+    if use_cache:
+        await _cache_set(key, {"fingerprint": fingerprint, "context": asdict(ctx)})
+    await _incr_metric("cache_misses")
+    await _incr_metric("miss_us", _elapsed_us(started))
+    return ctx
+
+
+async def _assemble_rich_context(
+    summary: Summary,
+    db: AsyncSession,
+    *,
+    include_transcript: bool,
+    include_academic: bool,
+) -> RichContext:
+    """Assemblage complet (DB + parsing) — chemin froid de build_rich_context."""
     ctx = RichContext()
 
     # ── Métadonnées ─────────────────────────────────────────────────────
@@ -234,13 +319,15 @@ async def build_rich_context(
 
     # ── Transcript : stratégie adaptative ───────────────────────────────
     if include_transcript:
+        # Une seule lecture TranscriptCache + chunks, partagée par les deux usages
+        cached_transcript = await _get_full_transcript_from_cache(summary.video_id, db)
         ctx.transcript, ctx.transcript_strategy, ctx.transcript_total_chars = await _load_transcript_adaptive(
-            summary, db
+            summary, db, full_transcript=cached_transcript
         )
         # 🆕 v4.0: Stocker le transcript complet pour recherche per-question
         if ctx.transcript_strategy != "full":
-            # Charger le transcript complet non tronqué pour la recherche
-            full_raw = await _get_full_transcript_from_cache(summary.video_id, db)
+            # Transcript complet non tronqué pour la recherche
+            full_raw = cached_transcript
             if not full_raw and summary.transcript_context:
                 full_raw = summary.transcript_context
             ctx.full_transcript = full_raw or ctx.transcript
@@ -316,6 +403,126 @@ async def build_rich_context(
     return ctx
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# Cache du RichContext & métriques
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def _rich_context_cache_key(summary_id: Optional[int], include_transcript: bool, include_academic: bool) -> str:
+    flags = f"{int(bool(include_transcript))}{int(bool(include_academic))}"
+    return f"rich_context:v{RICH_CONTEXT_CACHE_VERSION}:{summary_id}:{flags}"
+
+
+def summary_fingerprint(summary: Summary) -> str:
+    """Empreinte des champs du Summary qui alimentent le RichContext."""
+    digest = hashlib.sha256()
+    for name in _FINGERPRINT_FIELDS:
+        value = getattr(summary, name, None)
+        digest.update(("" if value is None else str(value)).encode("utf-8", "replace"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()[:32]
+
+
+async def _cache_get(key: str) -> Any:
+    try:
+        from core.cache import cache_service
+
+        return await cache_service.get(key)
+    except Exception as e:
+        logger.warning("rich_context cache read failed: %s", e)
+        return None
+
+
+async def _cache_set(key: str, value: Any) -> None:
+    try:
+        from core.cache import cache_service
+
+        await cache_service.set(key, value, ttl=RICH_CONTEXT_CACHE_TTL_S)
+    except Exception as e:
+        logger.warning("rich_context cache write failed: %s", e)
+
+
+async def invalidate_rich_context(summary_id: int) -> None:
+    """Purge le RichContext en cache d'un résumé (à appeler après update/enrich)."""
+    try:
+        from core.cache import cache_service
+
+        for include_transcript in (True, False):
+            for include_academic in (True, False):
+                await cache_service.delete(_rich_context_cache_key(summary_id, include_transcript, include_academic))
+    except Exception as e:
+        logger.warning("rich_context invalidation failed for summary %s: %s", summary_id, e)
+
+
+async def record_prompt_prefix(prefix_key: str, prefix: str) -> bool:
+    """
+    Compare le préfixe statique du prompt au tour précédent (même ``prefix_key``).
+
+    Returns:
+        True si le préfixe est identique octet pour octet (cache de prompt réutilisable)
+    """
+    digest = hashlib.sha256(prefix.encode("utf-8", "replace")).hexdigest()
+    key = f"chat_prefix:{prefix_key}"
+    previous = await _cache_get(key)
+    try:
+        from core.cache import cache_service
+
+        await cache_service.set(key, digest, ttl=PROMPT_PREFIX_TTL_S)
+    except Exception as e:
+        logger.warning("prompt prefix record failed: %s", e)
+    reused = previous == digest
+    await _incr_metric("prefix_hits" if reused else "prefix_misses")
+    return reused
+
+
+def _elapsed_us(started: float) -> int:
+    return int((time.perf_counter() - started) * 1_000_000)
+
+
+async def _incr_metric(name: str, amount: int = 1) -> None:
+    _local_metrics[name] += amount
+    try:
+        from core.cache import cache_service
+
+        if cache_service.is_redis:
+            await cache_service.backend.redis.incrby(f"deepsight:stats:chat_context:{name}", amount)
+    except Exception as e:
+        logger.debug(f"chat_context metrics error for {name}: {e}")
+
+
+async def get_chat_context_metrics() -> dict[str, Any]:
+    """Hit rate du cache RichContext, temps de build moyens et réutilisation du préfixe."""
+    counters = dict(_local_metrics)
+    scope = "process"
+    try:
+        from core.cache import cache_service
+
+        if cache_service.is_redis:
+            values = await cache_service.backend.redis.mget(
+                [f"deepsight:stats:chat_context:{name}" for name in _METRIC_FIELDS]
+            )
+            counters = {name: int(value or 0) for name, value in zip(_METRIC_FIELDS, values)}
+            scope = "cluster"
+    except Exception as e:
+        logger.debug(f"chat_context metrics read error: {e}")
+
+    hits, misses = counters["cache_hits"], counters["cache_misses"]
+    prefix_hits, prefix_misses = counters["prefix_hits"], counters["prefix_misses"]
+    return {
+        "scope": scope,
+        "cache_hits": hits,
+        "cache_misses": misses,
+        "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+        "avg_build_ms_hit": round(counters["hit_us"] / hits / 1000, 2) if hits else 0.0,
+        "avg_build_ms_miss": round(counters["miss_us"] / misses / 1000, 2) if misses else 0.0,
+        "prefix_hits": prefix_hits,
+        "prefix_misses": prefix_misses,
+        "prefix_reuse_rate": (
+            round(prefix_hits / (prefix_hits + prefix_misses), 3) if prefix_hits + prefix_misses else 0.0
+        ),
+    }
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # Chargement adaptatif du transcript
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -324,15 +531,21 @@ async def build_rich_context(
 async def _load_transcript_adaptive(
     summary: Summary,
     db: AsyncSession,
+    *,
+    full_transcript: Optional[str] = None,
 ) -> tuple[str, str, int]:
     """
     Charge le transcript avec une stratégie adaptative selon la taille.
 
+    ``full_transcript`` : transcript déjà lu depuis TranscriptCache (évite une
+    seconde requête) ; None → lecture ici.
+
     Returns:
         (transcript_text, strategy, total_chars_original)
     """
     # 1. Essayer de récupérer le transcript complet depuis TranscriptCache
-    full_transcript = await _get_full_transcript_from_cache(summary.video_id, db)
+    if full_transcript is None:
+        full_transcript = await _get_full_transcript_from_cache(summary.video_id, db)
 
     # 2. Fallback : utiliser transcript_context du Summary
     if not full_transcript and summary.transcript_context:
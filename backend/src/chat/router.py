@@ -48,7 +48,7 @@ try:
     V4_AVAILABLE = True
 except ImportError:
     V4_AVAILABLE = False
-    print("⚠️ [CHAT ROUTER] v4.0 functions not available, using legacy", flush=True)
+    logger.warning("⚠️ [CHAT ROUTER] v4.0 functions not available, using legacy")
 
 router = APIRouter()
 
@@ -154,7 +154,7 @@ async def ask_question_v4(
     - Pro: Enrichissement complet avec sources
     - Expert: Analyse exhaustive multi-sources
     """
-    print(f"💬 [CHAT v4.0] Question from user {current_user.id} (plan: {current_user.plan})", flush=True)
+    logger.info(f"💬 [CHAT v4.0] Question from user {current_user.id} (plan: {current_user.plan})")
 
     # 🛡️ Phase 2 — Mistral moderation (log_only par défaut, fail-open)
     moderation = await moderate_text(request.question)
@@ -251,7 +251,7 @@ async def _ask_question_legacy(request: ChatRequest, current_user: User, session
     if request.use_web_search:
         # L'utilisateur a explicitement demandé la recherche web
         use_perplexity = True
-        print("🌐 [CHAT] Web search: user requested", flush=True)
+        logger.info("🌐 [CHAT] Web search: user requested")
     elif should_search:
         # La détection automatique suggère une recherche
         # Mais on ne l'active que si l'utilisateur est Pro/Expert ET a du quota
@@ -261,13 +261,13 @@ async def _ask_question_legacy(request: ChatRequest, current_user: User, session
             if can_search:
                 # Auto-enrichissement pour Pro/Expert quand c'est pertinent
                 use_perplexity = True
-                print(f"🌐 [CHAT] Web search: auto-triggered ({trigger_reason})", flush=True)
+                logger.info(f"🌐 [CHAT] Web search: auto-triggered ({trigger_reason})")
             else:
                 web_search_suggested = True
-                print("💡 [CHAT] Web search suggested but quota exhausted", flush=True)
+                logger.info("💡 [CHAT] Web search suggested but quota exhausted")
         else:
             web_search_suggested = True
-            print("💡 [CHAT] Web search suggested but not available for plan", flush=True)
+            logger.info("💡 [CHAT] Web search suggested but not available for plan")
 
     # Exécuter la recherche Perplexity si décidé
     if use_perplexity:
@@ -280,7 +280,7 @@ async def _ask_question_legacy(request: ChatRequest, current_user: User, session
             if web_search_result:
                 await increment_web_search_usage(session, current_user.id)
                 web_search_used = True
-                print(f"✅ [CHAT] Perplexity: {len(web_search_result)} chars", flush=True)
+                logger.info(f"✅ [CHAT] Perplexity: {len(web_search_result)} chars")
 
     # Construire le contexte
     transcript = summary.transcript_context or ""
@@ -622,7 +622,7 @@ async def ask_question_by_path(
     🆕 v4.1: Route alternative POST /api/chat/{summary_id}
     Compatible avec le frontend qui envoie {question, use_web_search, mode}
     """
-    print(f"💬 [CHAT v4.1] POST /{summary_id} from user {current_user.id}", flush=True)
+    logger.info(f"💬 [CHAT v4.1] POST /{summary_id} from user {current_user.id}")
 
     question = request_body.question
     use_web_search = request_body.use_web_search
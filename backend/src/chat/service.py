@@ -13,6 +13,7 @@
 import asyncio
 import json
 import logging
+import os
 import httpx
 from datetime import datetime, date
 from typing import Optional, List, Dict, Any, Tuple, AsyncGenerator
@@ -21,12 +22,25 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.database import ChatMessage, ChatQuota, Summary, User, WebSearchUsage
 from core.config import get_mistral_key
+from core.http_client import provider_client
 from billing.plan_config import get_limits
+from core.llm_limiter import llm_limiter
 from core.llm_provider import llm_complete
 from videos.web_search_provider import web_search_and_synthesize, WebSearchResult
 
 logger = logging.getLogger(__name__)
 
+# Agencement du prompt chat :
+#   - "legacy"        : consignes + contexte tronqué (4K) mêlés à la question
+#   - "stable_prefix" : message system = consignes + contexte statique du résumé,
+#                       identique octet pour octet d'un tour à l'autre (cache de
+#                       prompt côté provider) ; tout ce qui varie par tour
+#                       (format, passages, historique, question) va dans le message user.
+PROMPT_LAYOUT_LEGACY = "legacy"
+PROMPT_LAYOUT_STABLE_PREFIX = "stable_prefix"
+CHAT_PROMPT_LAYOUT = os.environ.get("CHAT_PROMPT_LAYOUT", PROMPT_LAYOUT_STABLE_PREFIX)
+STABLE_PREFIX_MAX_CONTEXT = 50_000  # = chat.context_builder.MAX_CONTEXT_CHAT
+
 
 def _history_text_from_chat_history(chat_history: Optional[List[Dict]]) -> str:
     """Legacy fallback: build history_text from a List[Dict] chat_history.
@@ -97,14 +111,14 @@ async def search_semantic_scholar(
                             }
                         )
 
-                print(f"📚 [SCHOLAR] Found {len(results)} papers for '{query}'", flush=True)
+                logger.info(f"📚 [SCHOLAR] Found {len(results)} papers for '{query}'")
                 return results
             else:
-                print(f"⚠️ [SCHOLAR] API error: {response.status_code}", flush=True)
+                logger.warning(f"⚠️ [SCHOLAR] API error: {response.status_code}")
                 return []
 
     except Exception as e:
-        print(f"❌ [SCHOLAR] Error: {e}", flush=True)
+        logger.error(f"❌ [SCHOLAR] Error: {e}")
         return []
 
 
@@ -124,7 +138,7 @@ try:
     ENRICHMENT_AVAILABLE = True
 except ImportError:
     ENRICHMENT_AVAILABLE = False
-    print("⚠️ [CHAT] Web enrichment not available", flush=True)
+    logger.warning("⚠️ [CHAT] Web enrichment not available")
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -284,7 +298,7 @@ async def save_chat_message(
 
     except Exception as e:
         # ⚠️ Fallback: Les nouvelles colonnes n'existent pas encore
-        print(f"⚠️ [save_chat_message] Fallback to basic columns: {e}", flush=True)
+        logger.warning(f"⚠️ [save_chat_message] Fallback to basic columns: {e}")
         await session.rollback()
 
         try:
@@ -301,7 +315,7 @@ async def save_chat_message(
             row = result.fetchone()
             saved_id = row[0] if row else 0
         except Exception as e2:
-            print(f"❌ [save_chat_message] Error: {e2}", flush=True)
+            logger.error(f"❌ [save_chat_message] Error: {e2}")
             await session.rollback()
             return 0
 
@@ -401,7 +415,7 @@ async def get_chat_history(
     except Exception as e:
         # ⚠️ Fallback: Les nouvelles colonnes n'existent pas encore
         # Utiliser une requête SQL brute avec uniquement les colonnes de base
-        print(f"⚠️ [chat_history] Fallback to basic columns: {e}", flush=True)
+        logger.warning(f"⚠️ [chat_history] Fallback to basic columns: {e}")
 
         # ⚠️ IMPORTANT: Rollback la transaction échouée avant de continuer
         await session.rollback()
@@ -431,7 +445,7 @@ async def get_chat_history(
 
             return history
         except Exception as e2:
-            print(f"❌ [chat_history] Error: {e2}", flush=True)
+            logger.error(f"❌ [chat_history] Error: {e2}")
             await session.rollback()
             return []
 
@@ -515,10 +529,16 @@ def build_chat_prompt(
     video_upload_date: str = "",
     *,
     history_text: Optional[str] = None,
+    prompt_layout: str = PROMPT_LAYOUT_LEGACY,
 ) -> Tuple[str, str]:
     """
     Construit le prompt pour le chat.
 
+    ``prompt_layout=PROMPT_LAYOUT_STABLE_PREFIX`` : ``summary`` est traité
+    comme le contexte statique de la vidéo (placé en entier dans le message
+    system, sans rien qui dépende de la question) et ``transcript`` comme
+    les passages propres au tour (placés dans le message user).
+
     🆕 v6.1 (Spec merge voice ↔ chat 2026-04-29, Task 7):
     Accepte désormais ``history_text`` (str) déjà formaté par
     ``voice.context_builder.build_unified_context_block`` (target='chat',
@@ -686,6 +706,17 @@ Structure:
 
     response_guide = response_guide_fr if lang == "fr" else response_guide_en
 
+    # Préfixe stable : la consigne de format dépend de la question → message user
+    stable_prefix = prompt_layout == PROMPT_LAYOUT_STABLE_PREFIX
+    turn_guide = ""
+    if stable_prefix:
+        turn_guide = response_guide
+        response_guide = (
+            "📌 FORMAT : suis la consigne de format donnée avec chaque question."
+            if lang == "fr"
+            else "📌 FORMAT: follow the format instruction given with each question."
+        )
+
     # Construire le contexte temporel pour le chat
     if video_upload_date:
         from videos.analysis import _format_video_age
@@ -818,6 +849,18 @@ History:{history_text}
 
 Question: {question}"""
 
+    if stable_prefix:
+        is_fr = lang == "fr"
+        context = summary[:STABLE_PREFIX_MAX_CONTEXT] if summary else ("Non disponible" if is_fr else "Not available")
+        system_prompt = f"{system_prompt}\n{'CONTEXTE DE LA VIDÉO' if is_fr else 'VIDEO CONTEXT'} :\n{context}\n"
+        turn_parts = [turn_guide]
+        if transcript_truncated:
+            label = "Passages pertinents du transcript" if is_fr else "Relevant transcript passages"
+            turn_parts.append(f"{label} :\n{transcript_truncated}")
+        turn_parts.append(f"{'Historique' if is_fr else 'History'} :{history_text}")
+        turn_parts.append(f"Question : {question}" if is_fr else f"Question: {question}")
+        user_prompt = "\n\n".join(turn_parts)
+
     return system_prompt, user_prompt
 
 
@@ -834,12 +877,17 @@ async def generate_chat_response(
     video_upload_date: str = "",
     *,
     history_text: Optional[str] = None,
+    prompt_layout: str = PROMPT_LAYOUT_LEGACY,
+    prefix_key: Optional[str] = None,
 ) -> Optional[str]:
     """Génère une réponse de chat intelligente et adaptée avec Mistral.
 
     🆕 v6.1 (Task 7) : préfère ``history_text`` (bloc unifié pré-rendu via
     ``build_unified_context_block``) si fourni. Sinon, retombe sur
     ``chat_history[-6:]`` pour compat ascendante.
+
+    ``prefix_key`` (ex. ``"<summary_id>:<mode>"``) : suivi de la réutilisation
+    du message system d'un tour à l'autre (métriques de cache de prompt).
     """
     api_key = api_key or get_mistral_key()
     if not api_key:
@@ -855,7 +903,12 @@ async def generate_chat_response(
         lang,
         video_upload_date=video_upload_date,
         history_text=history_text,
+        prompt_layout=prompt_layout,
     )
+    if prefix_key:
+        from chat.context_builder import record_prompt_prefix
+
+        await record_prompt_prefix(prefix_key, system_prompt)
 
     # ═══════════════════════════════════════════════════════════════════════════════
     # 🧠 TOKENS ADAPTATIFS selon le type de question
@@ -926,7 +979,8 @@ async def generate_chat_response(
 
     mistral_response: Optional[str] = None
     try:
-        async with httpx.AsyncClient() as client:
+        # Chat = classe "interactive" : prioritaire sur les pipelines batch (core.llm_limiter)
+        async with llm_limiter.slot(f"mistral:{model}", "interactive") as slot, provider_client("mistral") as client:
             response = await client.post(
                 "https://api.mistral.ai/v1/chat/completions",
                 headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
@@ -941,14 +995,15 @@ async def generate_chat_response(
                 },
                 timeout=60,
             )
+            slot.observe(response.status_code)
 
             if response.status_code == 200:
                 mistral_response = response.json()["choices"][0]["message"]["content"].strip()
             else:
-                print(f"❌ Chat API error: {response.status_code}", flush=True)
+                logger.error(f"❌ Chat API error: {response.status_code}")
 
     except Exception as e:
-        print(f"❌ Chat generation error: {e}", flush=True)
+        logger.error(f"❌ Chat generation error: {e}")
 
     # Mistral primary OK → post-process et retour
     if mistral_response:
@@ -973,6 +1028,7 @@ async def generate_chat_response(
         max_tokens=max_tokens,
         temperature=0.7,
         timeout=60,
+        priority="interactive",
     )
 
     if fallback_result and fallback_result.content:
@@ -1028,7 +1084,7 @@ async def generate_chat_response_stream(
     max_tokens = {"accessible": 800, "standard": 1200, "expert": 2000}.get(mode, 1200)
 
     try:
-        async with httpx.AsyncClient() as client:
+        async with llm_limiter.slot(f"mistral:{model}", "interactive") as slot, provider_client("mistral") as client:
             async with client.stream(
                 "POST",
                 "https://api.mistral.ai/v1/chat/completions",
@@ -1045,6 +1101,7 @@ async def generate_chat_response_stream(
                 },
                 timeout=120,
             ) as response:
+                slot.observe(response.status_code)
                 async for line in response.aiter_lines():
                     if line.startswith("data: "):
                         data = line[6:]
@@ -1075,6 +1132,8 @@ async def generate_chat_response_v4(
     video_upload_date: str = "",
     *,
     history_text: Optional[str] = None,
+    prompt_layout: str = PROMPT_LAYOUT_LEGACY,
+    prefix_key: Optional[str] = None,
 ) -> Tuple[str, List[Dict[str, str]], bool]:
     """
     🆕 v5.0: Génère une réponse chat avec FACT-CHECKING INTELLIGENT.
@@ -1095,16 +1154,18 @@ async def generate_chat_response_v4(
         lang: Langue
         model: Modèle Mistral
         web_search_requested: Si l'utilisateur a demandé explicitement une recherche web
+        prompt_layout: Agencement du prompt (PROMPT_LAYOUT_LEGACY | PROMPT_LAYOUT_STABLE_PREFIX)
+        prefix_key: Clé de suivi de la réutilisation du préfixe statique
 
     Returns:
         Tuple[response, sources, web_search_used]
     """
-    print(f"💬 [CHAT v5.0] Generating response for plan: {user_plan}", flush=True)
+    logger.info(f"💬 [CHAT v5.0] Generating response for plan: {user_plan}")
 
     # 🆕 v5.0: Détecter si la question nécessite un fact-checking critique
     needs_fact_check = _needs_critical_fact_check(question)
     if needs_fact_check:
-        print("⚠️ [CHAT v5.0] Critical fact-check needed for question", flush=True)
+        logger.warning("⚠️ [CHAT v5.0] Critical fact-check needed for question")
 
     # 1. Générer la réponse de base avec Mistral
     base_response = await generate_chat_response(
@@ -1118,12 +1179,14 @@ async def generate_chat_response_v4(
         model=model,
         video_upload_date=video_upload_date,
         history_text=history_text,
+        prompt_layout=prompt_layout,
+        prefix_key=prefix_key,
     )
 
     if not base_response:
         return "Désolé, je n'ai pas pu générer de réponse.", [], False
 
-    print(f"✅ [CHAT v5.0] Base response: {len(base_response)} chars", flush=True)
+    logger.info(f"✅ [CHAT v5.0] Base response: {len(base_response)} chars")
 
     # 2. Enrichir avec Perplexity si disponible et autorisé
     sources = []
@@ -1140,7 +1203,7 @@ async def generate_chat_response_v4(
             # L'utilisateur a demandé explicitement une recherche web
             if enrichment_level != EnrichmentLevel.NONE:
                 should_enrich = True
-                print("🌐 [CHAT v5.0] Web search requested by user", flush=True)
+                logger.info("🌐 [CHAT v5.0] Web search requested by user")
 
         # 🆕 v5.0: Fact-checking automatique pour questions critiques
         elif needs_fact_check:
@@ -1148,16 +1211,16 @@ async def generate_chat_response_v4(
             # Pro a accès au fact-checking
             if user_plan in ["pro"]:
                 should_enrich = True
-                print("🔍 [CHAT v5.0] Critical fact-check triggered (pro plan)", flush=True)
+                logger.info("🔍 [CHAT v5.0] Critical fact-check triggered (pro plan)")
             else:
                 # Free: pas de fact-checking, mais on ajoute un avertissement
-                print("⚠️ [CHAT v5.0] Fact-check needed but not available for free plan", flush=True)
+                logger.warning("⚠️ [CHAT v5.0] Fact-check needed but not available for free plan")
 
         # Enrichissement automatique standard pour Pro
         elif enrichment_level in [EnrichmentLevel.FULL, EnrichmentLevel.DEEP]:
             should_enrich = _should_auto_enrich_chat(question, video_title)
             if should_enrich:
-                print(f"🌐 [CHAT v5.0] Auto-enrichment triggered for {enrichment_level.value}", flush=True)
+                logger.info(f"🌐 [CHAT v5.0] Auto-enrichment triggered for {enrichment_level.value}")
 
         if should_enrich:
             try:
@@ -1178,17 +1241,17 @@ async def generate_chat_response_v4(
                     base_response = enriched_response
                     web_search_used = True
                     fact_checked = True
-                    print(f"✅ [CHAT v5.0] Enriched with {len(sources)} sources", flush=True)
+                    logger.info(f"✅ [CHAT v5.0] Enriched with {len(sources)} sources")
 
             except Exception as e:
-                print(f"⚠️ [CHAT v5.0] Enrichment failed: {e}", flush=True)
+                logger.warning(f"⚠️ [CHAT v5.0] Enrichment failed: {e}")
 
     # 🆕 v5.0: Ajouter un avertissement si fact-check nécessaire mais non effectué
     if needs_fact_check and not fact_checked:
         disclaimer = _get_fact_check_disclaimer(lang, user_plan)
         if disclaimer:
             base_response = f"{base_response}\n\n{disclaimer}"
-            print("⚠️ [CHAT v5.0] Added fact-check disclaimer", flush=True)
+            logger.warning("⚠️ [CHAT v5.0] Added fact-check disclaimer")
 
     return base_response, sources, web_search_used
 
@@ -1481,7 +1544,7 @@ async def search_with_perplexity(question: str, context: str, lang: str = "fr")
             return result.content
         return None
     except Exception as e:
-        print(f"❌ [WEB_SEARCH] Chat search error: {e}", flush=True)
+        logger.error(f"❌ [WEB_SEARCH] Chat search error: {e}")
         return None
 
 
@@ -1571,6 +1634,10 @@ async def process_chat_message_v4(
     model = plan_limits.get("default_model", "mistral-small-2603")
 
     # 5.5 🆕 Assembler le contexte riche (transcript complet + fact-check + enrichment)
+    #     v5.4 : RichContext servi depuis le cache par résumé ; en layout
+    #     "stable_prefix", le contexte formaté est le préfixe statique du prompt
+    #     et seuls les passages propres à la question passent en transcript.
+    stable_prefix = CHAT_PROMPT_LAYOUT == PROMPT_LAYOUT_STABLE_PREFIX
     try:
         from chat.context_builder import build_rich_context
 
@@ -1580,21 +1647,21 @@ async def process_chat_message_v4(
         # Les vidéos MICRO/SHORT utilisent le transcript complet tel quel
         if rich_ctx.video_tier in ("medium", "long", "extended", "marathon") and rich_ctx.full_transcript:
             enriched_transcript = rich_ctx.search_relevant_passages(question, lang=summary.lang or "fr")
-            print(
-                f"🔍 [CHAT v5.3] Per-question chunk search for {rich_ctx.video_tier.upper()} video: {len(enriched_transcript)} chars",
-                flush=True,
+            logger.info(
+                f"🔍 [CHAT v5.3] Per-question chunk search for {rich_ctx.video_tier.upper()} video: {len(enriched_transcript)} chars"
             )
+        elif stable_prefix and rich_ctx.transcript:
+            enriched_transcript = ""  # Déjà dans format_for_chat (section transcript)
         else:
             enriched_transcript = rich_ctx.transcript or summary.transcript_context or ""
 
         # Assembler un contexte étendu pour le summary (analyse + digest + fact-check + enrichment)
         enriched_summary = rich_ctx.format_for_chat(language=summary.lang or "fr", mode=mode)
-        print(
-            f"🧠 [CHAT v5.2] Rich context: tier={rich_ctx.video_tier}, transcript={rich_ctx.transcript_strategy} ({len(enriched_transcript)} chars), context={len(enriched_summary)} chars",
-            flush=True,
+        logger.info(
+            f"🧠 [CHAT v5.2] Rich context: tier={rich_ctx.video_tier}, transcript={rich_ctx.transcript_strategy} ({len(enriched_transcript)} chars), context={len(enriched_summary)} chars"
         )
     except Exception as e:
-        print(f"⚠️ [CHAT v5.1] Rich context fallback: {e}", flush=True)
+        logger.warning(f"⚠️ [CHAT v5.1] Rich context fallback: {e}")
         enriched_transcript = summary.transcript_context or ""
         enriched_summary = summary.summary_content or ""
 
@@ -1612,6 +1679,8 @@ async def process_chat_message_v4(
         web_search_requested=web_search,
         video_upload_date=summary.video_upload_date or "",
         history_text=history_text,
+        prompt_layout=CHAT_PROMPT_LAYOUT,
+        prefix_key=f"{summary_id}:{mode}" if stable_prefix else None,
     )
 
     # 7. Déterminer le niveau d'enrichissement AVANT de sauvegarder
@@ -23,6 +23,8 @@ import uuid
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 from fastapi.websockets import WebSocketState
 
+from core.logging import logger
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # 📊 TYPES & ENUMS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -137,7 +139,7 @@ class ConnectionManager:
             },
         )
 
-        print(f"🔌 [WS] Connected: user={user_id}, summary={summary_id}, session={session_id}", flush=True)
+        logger.info("🔌 [WS] Connected", user_id=user_id, summary_id=summary_id, session_id=session_id)
         return session
 
     async def disconnect(self, session_id: str):
@@ -156,7 +158,7 @@ class ConnectionManager:
                     if not self.summary_sessions[session.summary_id]:
                         del self.summary_sessions[session.summary_id]
 
-                print(f"🔌 [WS] Disconnected: session={session_id}", flush=True)
+                logger.info("🔌 [WS] Disconnected", session_id=session_id)
 
     async def send_message(self, session_id: str, message: Dict[str, Any]):
         """Envoie un message à une session spécifique"""
@@ -166,7 +168,7 @@ class ConnectionManager:
                 await session.websocket.send_json(message)
                 session.update_activity()
             except Exception as e:
-                print(f"❌ [WS] Send error: {e}", flush=True)
+                logger.error(f"❌ [WS] Send error: {e}")
                 await self.disconnect(session_id)
 
     async def send_token(self, session_id: str, token: str, message_id: str):
@@ -212,7 +214,7 @@ class ConnectionManager:
             await self.disconnect(session_id)
 
         if stale_sessions:
-            print(f"🧹 [WS] Cleaned {len(stale_sessions)} stale sessions", flush=True)
+            logger.info(f"🧹 [WS] Cleaned {len(stale_sessions)} stale sessions")
 
 
 # Singleton
@@ -344,7 +346,7 @@ class ChatService:
             return message_id
 
         except Exception as e:
-            print(f"❌ [CHAT] Error: {e}", flush=True)
+            logger.error(f"❌ [CHAT] Error: {e}")
 
             await self.manager.send_message(
                 session.session_id,
@@ -430,7 +432,7 @@ class ChatService:
                     ],
                 }
         except Exception as e:
-            print(f"⚠️ [CHAT] Web enrichment failed: {e}", flush=True)
+            logger.warning(f"⚠️ [CHAT] Web enrichment failed: {e}")
 
         return None
 
@@ -441,9 +443,10 @@ class ChatService:
         web_context: Optional[str] = None,
     ):
         """Génère une réponse en streaming via Mistral"""
-        import httpx
         import os
 
+        from core.http_client import provider_client
+
         api_key = os.environ.get("MISTRAL_API_KEY")
         if not api_key:
             yield "Erreur: API Mistral non configurée"
@@ -470,7 +473,7 @@ Si tu cites des informations web, mentionne-le clairement."""
         messages.append({"role": "user", "content": user_message})
 
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with provider_client("mistral", timeout=60.0) as client:
                 async with client.stream(
                     "POST",
                     "https://api.mistral.ai/v1/chat/completions",
@@ -485,6 +488,7 @@ Si tu cites des informations web, mentionne-le clairement."""
                         "max_tokens": 2000,
                         "temperature": 0.7,
                     },
+                    timeout=60.0,
                 ) as response:
                     async for line in response.aiter_lines():
                         if line.startswith("data: "):
@@ -499,7 +503,7 @@ Si tu cites des informations web, mentionne-le clairement."""
                             except json.JSONDecodeError:
                                 continue
         except Exception as e:
-            print(f"❌ [CHAT] Generation error: {e}", flush=True)
+            logger.error(f"❌ [CHAT] Generation error: {e}")
             yield f"\n\n[Erreur de génération: {str(e)}]"
 
     async def _persist_messages(self, session: ChatSession, messages: List[ChatMessage]):
@@ -521,7 +525,7 @@ Si tu cites des informations web, mentionne-le clairement."""
                     db.add(db_msg)
                 await db.commit()
         except Exception as e:
-            print(f"⚠️ [CHAT] Persist error: {e}", flush=True)
+            logger.warning(f"⚠️ [CHAT] Persist error: {e}")
 
 
 # Singleton
@@ -661,7 +665,7 @@ async def websocket_chat(
     except WebSocketDisconnect:
         pass
     except Exception as e:
-        print(f"❌ [WS] Error: {e}", flush=True)
+        logger.error(f"❌ [WS] Error: {e}")
     finally:
         await manager.disconnect(session.session_id)
 
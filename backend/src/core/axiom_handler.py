@@ -241,22 +241,29 @@ class AxiomHandler(logging.Handler):
         from raw record attributes here.
         """
         # Best-effort: pull request context if the contextvars are populated
-        # by core.middleware.LoggingMiddleware. We import lazily to avoid
+        # by core.middleware.LoggingMiddleware. When core.logging routes records
+        # through its queue listener we run on that thread, so the context was
+        # captured on the record at emit time. We import lazily to avoid
         # circular imports at module load (axiom_handler ← logging ← config).
         request_id = ""
         user_id: Optional[int] = None
         user_email: Optional[str] = None
-        try:
-            from core.logging import request_id_var, user_id_var, user_email_var  # type: ignore
+        if getattr(record, "context_captured", False):
+            request_id = record.request_id
+            user_id = record.user_id
+            user_email = record.user_email
+        else:
+            try:
+                from core.logging import request_id_var, user_id_var, user_email_var  # type: ignore
 
-            request_id = request_id_var.get()
-            user_id = user_id_var.get()
-            user_email = user_email_var.get()
-        except Exception:  # noqa: BLE001
-            pass
+                request_id = request_id_var.get()
+                user_id = user_id_var.get()
+                user_email = user_email_var.get()
+            except Exception:  # noqa: BLE001
+                pass
 
         payload: Dict[str, Any] = {
-            "_time": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            "_time": datetime.fromtimestamp(record.created, timezone.utc).isoformat().replace("+00:00", "Z"),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -8,6 +8,9 @@
 ║  • ⏱️  TTL configurable par clé                                                     ║
 ║  • 🔑 Namespacing automatique des clés                                             ║
 ║  • 📊 Métriques de cache (hits/misses)                                             ║
+║  • 🛡️  Anti-stampede: single-flight par clé + verrou Redis inter-workers             ║
+║  • ♻️  Stale-while-revalidate (soft TTL / hard TTL) dans get_or_set                  ║
+║  • 🧊 Deux niveaux: L1 LRU in-process devant Redis (L2), invalidé par pub/sub      ║
 ╚════════════════════════════════════════════════════════════════════════════════════╝
 
 Usage:
@@ -25,13 +28,21 @@ Usage:
         factory=lambda: fetch_from_perplexity(query),
         ttl=3600  # 1h
     )
+
+    # Stale-while-revalidate: frais 10min, servi périmé jusqu'à 1h
+    # pendant qu'UN seul worker recalcule en arrière-plan
+    data = await cache_service.get_or_set(key, factory, ttl=3600, soft_ttl=600)
 """
 
 import os
 import json
 import hashlib
 import asyncio
-from typing import Optional, Any, Callable, TypeVar, Union
+import inspect
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, Any, Callable, Tuple, TypeVar, Union
 from datetime import datetime
 from dataclasses import dataclass
 
@@ -66,6 +77,23 @@ DEFAULT_TTLS = {
 # Taille max du cache in-memory (nombre d'entrées)
 MAX_CACHE_SIZE = int(os.environ.get("CACHE_MAX_SIZE", "10000"))
 
+# Single-flight inter-workers (get_or_set) :
+# - durée de vie du verrou Redis (borne un worker mort en plein calcul)
+# - attente max d'un worker non-propriétaire avant de calculer lui-même
+SINGLE_FLIGHT_LOCK_TTL = float(os.environ.get("CACHE_SINGLE_FLIGHT_LOCK_TTL", "30"))
+SINGLE_FLIGHT_WAIT = float(os.environ.get("CACHE_SINGLE_FLIGHT_WAIT", "15"))
+
+# L1 in-process devant Redis (TieredCacheBackend) :
+# - taille bornée (LRU) et TTL plafonné, qui borne aussi l'obsolescence d'un
+#   worker qui aurait raté un message d'invalidation pub/sub
+CACHE_L1_ENABLED = os.environ.get("CACHE_L1_ENABLED", "true").lower() == "true"
+CACHE_L1_MAX_SIZE = int(os.environ.get("CACHE_L1_MAX_SIZE", "2048"))
+CACHE_L1_MAX_TTL = float(os.environ.get("CACHE_L1_MAX_TTL", "30"))
+CACHE_INVALIDATION_CHANNEL = "deepsight:cache:invalidate"
+
+# Enveloppe stale-while-revalidate stockée à la place de la valeur brute
+_SWR_MARKER = "__swr__"
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 📊 MÉTRIQUES
@@ -81,6 +109,10 @@ class CacheStats:
     sets: int = 0
     deletes: int = 0
     errors: int = 0
+    coalesced: int = 0  # appels get_or_set rattachés à un calcul déjà en cours
+    lock_waits: int = 0  # attentes sur le verrou d'un autre worker
+    stale_served: int = 0  # valeurs périmées (soft TTL dépassé) servies
+    refreshes: int = 0  # recalculs effectifs de la factory
 
     @property
     def hit_rate(self) -> float:
@@ -94,6 +126,10 @@ class CacheStats:
             "sets": self.sets,
             "deletes": self.deletes,
             "errors": self.errors,
+            "coalesced": self.coalesced,
+            "lock_waits": self.lock_waits,
+            "stale_served": self.stale_served,
+            "refreshes": self.refreshes,
             "hit_rate": f"{self.hit_rate:.1f}%",
         }
 
@@ -122,6 +158,17 @@ class CacheBackend:
         """Supprime toutes les clés avec ce préfixe"""
         raise NotImplementedError
 
+    async def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        """
+        Verrou de calcul pour ``key`` ; retourne un jeton, ou None si un autre
+        worker le détient. Par défaut (backend local au process), le
+        single-flight in-process de CacheService suffit : toujours accordé.
+        """
+        return uuid.uuid4().hex
+
+    async def release_lock(self, key: str, token: str) -> None:
+        return None
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 💾 IN-MEMORY CACHE (Fallback)
@@ -230,6 +277,23 @@ class RedisCacheBackend(CacheBackend):
             logger.warning("Redis GET error", key=key, error=str(e))
             return None
 
+    async def get_with_ttl(self, key: str) -> Tuple[Optional[Any], float]:
+        """(valeur, TTL restant en secondes) en un seul aller-retour (GET + PTTL pipelinés).
+
+        TTL restant ≤ 0 si la clé n'expire pas ou n'existe pas.
+        """
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.get(self._full_key(key))
+            pipe.pttl(self._full_key(key))
+            value, remaining_ms = await pipe.execute()
+            if value is None:
+                return None, 0.0
+            return json.loads(value), (remaining_ms or 0) / 1000
+        except Exception as e:
+            logger.warning("Redis GET error", key=key, error=str(e))
+            return None, 0.0
+
     async def set(self, key: str, value: Any, ttl: int = 3600) -> bool:
         try:
             serialized = json.dumps(value, ensure_ascii=False, default=str)
@@ -264,6 +328,244 @@ class RedisCacheBackend(CacheBackend):
             logger.warning("Redis CLEAR PREFIX error", prefix=prefix, error=str(e))
             return 0
 
+    # Libère le verrou uniquement si on en est encore propriétaire (il a pu
+    # expirer puis être repris par un autre worker)
+    _RELEASE_LOCK_LUA = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+    def _lock_key(self, key: str) -> str:
+        return f"{self._prefix}lock:{key}"
+
+    async def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.redis.set(self._lock_key(key), token, nx=True, px=int(ttl * 1000))
+            return token if acquired else None
+        except Exception as e:
+            # Redis indisponible : on calcule plutôt que de bloquer
+            logger.warning("Redis LOCK error", key=key, error=str(e))
+            return token
+
+    async def release_lock(self, key: str, token: str) -> None:
+        try:
+            await self.redis.eval(self._RELEASE_LOCK_LUA, 1, self._lock_key(key), token)
+        except Exception as e:
+            logger.warning("Redis UNLOCK error", key=key, error=str(e))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# 🧊 TIERED CACHE (L1 in-process + L2 Redis)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TieredCacheBackend(CacheBackend):
+    """
+    L1 LRU/TTL in-process devant un ``RedisCacheBackend`` (L2).
+
+    Les lectures chaudes (user_quota, video_info...) sont servies sans
+    aller-retour Redis ni décodage JSON. Chaque écriture/suppression locale
+    est publiée sur ``CACHE_INVALIDATION_CHANNEL`` : les autres workers
+    retirent la clé (ou le préfixe) de leur L1.
+
+    Les valeurs du L1 sont partagées entre appelants, comme avec
+    ``InMemoryCacheBackend`` : ne pas les muter.
+    """
+
+    def __init__(
+        self,
+        l2: RedisCacheBackend,
+        maxsize: int = CACHE_L1_MAX_SIZE,
+        max_ttl: float = CACHE_L1_MAX_TTL,
+    ):
+        self.l2 = l2
+        self.maxsize = maxsize
+        self.max_ttl = max_ttl
+        self.node_id = uuid.uuid4().hex  # ignore ses propres messages pub/sub
+        self._l1: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._listener: Optional[asyncio.Task] = None
+        self.counters = {
+            "l1_hits": 0,
+            "l1_misses": 0,
+            "l2_hits": 0,
+            "l2_misses": 0,
+            "l1_evictions": 0,
+            "invalidations_sent": 0,
+            "invalidations_received": 0,
+        }
+
+    @property
+    def redis(self):
+        """Client Redis du L2 (utilisé directement par task_store, métriques...)"""
+        return self.l2.redis
+
+    @property
+    def size(self) -> int:
+        return len(self._l1)
+
+    # ── L1 ────────────────────────────────────────────────────────────────
+
+    def _l1_get(self, key: str) -> Optional[Any]:
+        entry = self._l1.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._l1[key]
+            return None
+        self._l1.move_to_end(key)
+        return value
+
+    def _l1_set(self, key: str, value: Any, ttl: float) -> None:
+        self._l1[key] = (time.monotonic() + min(ttl, self.max_ttl), value)
+        self._l1.move_to_end(key)
+        while len(self._l1) > self.maxsize:
+            self._l1.popitem(last=False)
+            self.counters["l1_evictions"] += 1
+
+    def _l1_evict(self, key: Optional[str] = None, prefix: Optional[str] = None) -> int:
+        if key is not None:
+            return 1 if self._l1.pop(key, None) is not None else 0
+        keys = [k for k in self._l1 if k.startswith(prefix or "")]
+        for k in keys:
+            del self._l1[k]
+        return len(keys)
+
+    # ── CacheBackend ──────────────────────────────────────────────────────
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self._l1_get(key)
+        if value is not None:
+            self.counters["l1_hits"] += 1
+            return value
+        self.counters["l1_misses"] += 1
+
+        # TTL restant lu avec la valeur (même aller-retour) : le L1 ne doit pas survivre à la clé L2
+        value, remaining = await self.l2.get_with_ttl(key)
+        if value is None:
+            self.counters["l2_misses"] += 1
+            return None
+        self.counters["l2_hits"] += 1
+        if remaining > 0:
+            self._l1_set(key, value, remaining)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int = 3600) -> bool:
+        ok = await self.l2.set(key, value, ttl)
+        if ok:
+            self._l1_set(key, value, ttl)
+        else:
+            self._l1_evict(key=key)
+        await self._publish({"key": key})
+        return ok
+
+    async def delete(self, key: str) -> bool:
+        self._l1_evict(key=key)
+        removed = await self.l2.delete(key)
+        await self._publish({"key": key})
+        return removed
+
+    async def exists(self, key: str) -> bool:
+        if self._l1_get(key) is not None:
+            return True
+        return await self.l2.exists(key)
+
+    async def clear_prefix(self, prefix: str) -> int:
+        self._l1_evict(prefix=prefix)
+        removed = await self.l2.clear_prefix(prefix)
+        await self._publish({"prefix": prefix})
+        return removed
+
+    async def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        return await self.l2.acquire_lock(key, ttl)
+
+    async def release_lock(self, key: str, token: str) -> None:
+        await self.l2.release_lock(key, token)
+
+    # ── Invalidation pub/sub ──────────────────────────────────────────────
+
+    async def _publish(self, message: dict) -> None:
+        try:
+            await self.redis.publish(CACHE_INVALIDATION_CHANNEL, json.dumps({"origin": self.node_id, **message}))
+            self.counters["invalidations_sent"] += 1
+        except Exception as e:
+            logger.warning("Cache invalidation publish error", error=str(e))
+
+    def handle_invalidation(self, data: str) -> None:
+        """Applique un message d'invalidation reçu d'un autre worker."""
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if message.get("origin") == self.node_id:
+            return
+        self.counters["invalidations_received"] += 1
+        if "prefix" in message:
+            self._l1_evict(prefix=message["prefix"])
+        elif "key" in message:
+            self._l1_evict(key=message["key"])
+
+    async def start(self) -> None:
+        """Démarre l'écoute des invalidations (appelé par init_redis)."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen(), name="cache-l1-invalidation")
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+                # Messages éventuellement manqués pendant la coupure
+                self._l1.clear()
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.handle_invalidation(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Cache invalidation listener error, resubscribing", error=str(e))
+                await asyncio.sleep(1.0)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, RuntimeError):
+                pass
+            self._listener = None
+        self._l1.clear()
+
+    def get_stats(self) -> dict:
+        c = self.counters
+        l1_total = c["l1_hits"] + c["l1_misses"]
+        l2_total = c["l2_hits"] + c["l2_misses"]
+        return {
+            "l1": {
+                "hits": c["l1_hits"],
+                "misses": c["l1_misses"],
+                "hit_rate": f"{(c['l1_hits'] / l1_total * 100) if l1_total else 0.0:.1f}%",
+                "size": len(self._l1),
+                "max_size": self.maxsize,
+                "evictions": c["l1_evictions"],
+            },
+            "l2": {
+                "hits": c["l2_hits"],
+                "misses": c["l2_misses"],
+                "hit_rate": f"{(c['l2_hits'] / l2_total * 100) if l2_total else 0.0:.1f}%",
+            },
+            "invalidations_sent": c["invalidations_sent"],
+            "invalidations_received": c["invalidations_received"],
+        }
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🎯 CACHE SERVICE (API Principale)
@@ -281,7 +583,7 @@ class CacheService:
         await cache_service.set("key", value, ttl=3600)
         value = await cache_service.get("key")
 
-        # Pattern cache-aside (get or compute)
+        # Pattern cache-aside (get or compute), protégé contre le stampede
         value = await cache_service.get_or_set(
             "expensive_computation",
             factory=compute_value,
@@ -304,6 +606,8 @@ class CacheService:
         self.backend: CacheBackend = InMemoryCacheBackend()
         self.stats = CacheStats()
         self._redis_available = False
+        # Calculs get_or_set en cours, par clé (single-flight in-process)
+        self._inflight: dict[str, asyncio.Task] = {}
 
     async def init_redis(self, redis_url: Optional[str] = None):
         """
@@ -321,9 +625,13 @@ class CacheService:
 
             client = redis_lib.from_url(redis_url, decode_responses=True)
             await client.ping()
-            self.backend = RedisCacheBackend(client)
+            if CACHE_L1_ENABLED:
+                self.backend = TieredCacheBackend(RedisCacheBackend(client))
+                await self.backend.start()
+            else:
+                self.backend = RedisCacheBackend(client)
             self._redis_available = True
-            logger.info("Redis backend initialized")
+            logger.info("Redis backend initialized", l1=CACHE_L1_ENABLED)
             return True
         except ImportError:
             logger.warning("redis package not installed, using in-memory cache")
@@ -336,19 +644,31 @@ class CacheService:
     def is_redis(self) -> bool:
         return self._redis_available
 
+    async def close(self):
+        """Arrête l'écoute des invalidations L1 (shutdown)."""
+        if hasattr(self.backend, "close"):
+            await self.backend.close()
+
     async def get(self, key: str) -> Optional[Any]:
         """Récupère une valeur du cache"""
+        value, _ = await self._get_entry(key)
+        if value is not None:
+            self.stats.hits += 1
+        else:
+            self.stats.misses += 1
+        return value
+
+    async def _get_entry(self, key: str) -> tuple[Optional[Any], bool]:
+        """Lit ``key`` sans compter les stats ; retourne ``(valeur, périmée)``."""
         try:
-            value = await self.backend.get(key)
-            if value is not None:
-                self.stats.hits += 1
-            else:
-                self.stats.misses += 1
-            return value
+            raw = await self.backend.get(key)
         except Exception as e:
             self.stats.errors += 1
             logger.warning("Cache GET error", error=str(e))
-            return None
+            return None, False
+        if isinstance(raw, dict) and raw.get(_SWR_MARKER) == 1:
+            return raw.get("v"), time.time() >= raw.get("fresh_until", 0)
+        return raw, False
 
     async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """
@@ -362,8 +682,7 @@ class CacheService:
         try:
             # Déterminer le TTL basé sur le préfixe si non spécifié
             if ttl is None:
-                prefix = key.split(":")[0] if ":" in key else "default"
-                ttl = DEFAULT_TTLS.get(prefix, DEFAULT_TTLS["default"])
+                ttl = self._default_ttl(key)
 
             result = await self.backend.set(key, value, ttl)
             if result:
@@ -385,38 +704,143 @@ class CacheService:
             self.stats.errors += 1
             return False
 
-    async def get_or_set(self, key: str, factory: Callable[[], T], ttl: Optional[int] = None) -> Optional[T]:
+    async def get_or_set(
+        self,
+        key: str,
+        factory: Callable[[], T],
+        ttl: Optional[int] = None,
+        *,
+        soft_ttl: Optional[int] = None,
+        single_flight: bool = True,
+    ) -> Optional[T]:
         """
         Pattern cache-aside: récupère du cache ou calcule et stocke.
 
+        Les misses concurrents sur une même clé n'exécutent la factory qu'une
+        fois : single-flight par clé dans le process, puis verrou Redis
+        (SET NX PX) entre workers — les autres attendent que la valeur
+        apparaisse dans le cache.
+
         Args:
             key: Clé de cache
             factory: Fonction (sync ou async) pour calculer la valeur si absente
-            ttl: Time-to-live en secondes
+            ttl: Time-to-live en secondes (hard TTL : expiration réelle)
+            soft_ttl: Si fourni, fraîcheur en secondes ; au-delà et jusqu'au
+                hard TTL, la valeur périmée est servie immédiatement et UN
+                recalcul est lancé en arrière-plan (stale-while-revalidate)
+            single_flight: False pour désactiver la coalescence
 
         Returns:
-            Valeur du cache ou calculée
+            Valeur du cache ou calculée (None si la factory échoue)
         """
-        # Essayer le cache d'abord
-        cached = await self.get(key)
-        if cached is not None:
-            return cached
+        value, stale = await self._get_entry(key)
+        if value is not None:
+            self.stats.hits += 1
+            if stale:
+                self.stats.stale_served += 1
+                self._start_fill(key, factory, ttl, soft_ttl, refresh=True)
+            return value
+
+        self.stats.misses += 1
+        if not single_flight:
+            return await self._compute_and_store(key, factory, ttl, soft_ttl)
+        return await asyncio.shield(self._start_fill(key, factory, ttl, soft_ttl))
+
+    def _start_fill(
+        self, key: str, factory: Callable, ttl: Optional[int], soft_ttl: Optional[int], refresh: bool = False
+    ) -> asyncio.Task:
+        """Rattache l'appelant au calcul en cours pour ``key`` ou en lance un."""
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            if not refresh:
+                self.stats.coalesced += 1
+            return task
+
+        # Tâche détachée : l'annulation d'un appelant (client déconnecté)
+        # n'interrompt pas le calcul attendu par les autres
+        task = loop.create_task(self._fill(key, factory, ttl, soft_ttl, refresh))
+        self._inflight[key] = task
+
+        def _done(t: asyncio.Task) -> None:
+            if self._inflight.get(key) is t:
+                del self._inflight[key]
+
+        task.add_done_callback(_done)
+        return task
+
+    async def _fill(
+        self, key: str, factory: Callable, ttl: Optional[int], soft_ttl: Optional[int], refresh: bool
+    ) -> Optional[Any]:
+        token = await self.backend.acquire_lock(key, SINGLE_FLIGHT_LOCK_TTL)
+        if token is None:
+            if refresh:
+                # Un autre worker rafraîchit déjà : la valeur périmée reste servie
+                return None
+            self.stats.lock_waits += 1
+            value, token = await self._wait_for_fill(key)
+            if value is not None:
+                return value
 
-        # Cache miss - calculer la valeur
         try:
-            if asyncio.iscoroutinefunction(factory):
-                value = await factory()
-            else:
-                value = factory()
+            if token is not None:
+                # Un autre worker a pu remplir la clé juste avant notre verrou
+                value, stale = await self._get_entry(key)
+                if value is not None and not stale:
+                    return value
+            return await self._compute_and_store(key, factory, ttl, soft_ttl)
+        finally:
+            if token is not None:
+                await self.backend.release_lock(key, token)
+
+    async def _wait_for_fill(self, key: str) -> tuple[Optional[Any], Optional[str]]:
+        """
+        Attend le calcul d'un autre worker : ``(valeur, None)`` dès qu'elle est
+        en cache, ``(None, jeton)`` si le verrou se libère sans valeur
+        (propriétaire en échec), ``(None, None)`` après SINGLE_FLIGHT_WAIT.
+        """
+        deadline = time.monotonic() + SINGLE_FLIGHT_WAIT
+        delay = 0.05
+        while time.monotonic() < deadline:
+            await asyncio.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+            delay = min(delay * 2, 0.5)
+            value, _ = await self._get_entry(key)
+            if value is not None:
+                return value, None
+            token = await self.backend.acquire_lock(key, SINGLE_FLIGHT_LOCK_TTL)
+            if token is not None:
+                return None, token
+        logger.warning("Cache single-flight wait timeout, computing locally", key=key)
+        return None, None
+
+    async def _compute_and_store(
+        self, key: str, factory: Callable, ttl: Optional[int], soft_ttl: Optional[int]
+    ) -> Optional[Any]:
+        try:
+            self.stats.refreshes += 1
+            value = factory()
+            # Couvre aussi les lambdas qui retournent une coroutine
+            if inspect.isawaitable(value):
+                value = await value
 
             if value is not None:
-                await self.set(key, value, ttl)
+                if soft_ttl is not None:
+                    ttl = ttl or self._default_ttl(key)
+                    envelope = {_SWR_MARKER: 1, "v": value, "fresh_until": time.time() + min(soft_ttl, ttl)}
+                    await self.set(key, envelope, ttl)
+                else:
+                    await self.set(key, value, ttl)
 
             return value
         except Exception as e:
             logger.warning("Cache factory error", key=key, error=str(e))
             return None
 
+    @staticmethod
+    def _default_ttl(key: str) -> int:
+        prefix = key.split(":")[0] if ":" in key else "default"
+        return DEFAULT_TTLS.get(prefix, DEFAULT_TTLS["default"])
+
     async def invalidate_prefix(self, prefix: str) -> int:
         """
         Invalide toutes les clés avec un préfixe donné.
@@ -428,8 +852,11 @@ class CacheService:
         """Retourne les statistiques du cache"""
         stats = self.stats.to_dict()
         stats["backend"] = "redis" if self._redis_available else "memory"
+        stats["inflight"] = len(self._inflight)
         if hasattr(self.backend, "size"):
             stats["size"] = self.backend.size
+        if hasattr(self.backend, "get_stats"):
+            stats["tiers"] = self.backend.get_stats()
         return stats
 
 
@@ -544,6 +971,7 @@ __all__ = [
     "make_cache_key",
     "hash_query",
     "CacheService",
+    "TieredCacheBackend",
     "DEFAULT_TTLS",
     "transcript_metrics",
     "TranscriptCacheMetrics",
@@ -0,0 +1,168 @@
+"""
+╔════════════════════════════════════════════════════════════════════════════════════╗
+║  🧮 CPU POOL — Rendus CPU-bound (PIL, exports) hors de l'event loop               ║
+╠════════════════════════════════════════════════════════════════════════════════════╣
+║  • ProcessPoolExecutor partagé (contexte spawn : pas de fork d'un process qui a   ║
+║    déjà des threads — listener de logs, pools httpx)                               ║
+║  • Process workers persistants : leurs caches (polices, fonds décodés) survivent  ║
+║    d'un rendu à l'autre                                                           ║
+║  • Concurrence bornée par worker uvicorn (CPU_POOL_WORKERS), file mesurée          ║
+║  • Fallback thread (asyncio.to_thread) si CPU_POOL_WORKERS=0 ou pool cassé         ║
+║  • get_cpu_pool_stats() : en cours, en attente, latences par type de tâche        ║
+╚════════════════════════════════════════════════════════════════════════════════════╝
+
+Usage:
+    from core.cpu_pool import run_cpu
+
+    png = await run_cpu(render_og_image, video_title=title, kind="og_image")
+
+La fonction et ses arguments doivent être picklables (fonction de module,
+pas de lambda ni de closure) ; elle est importée dans le process worker.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+from core.logging import logger
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Configuration
+# ═══════════════════════════════════════════════════════════════════════════════
+
+CPU_POOL_WORKERS = int(os.environ.get("CPU_POOL_WORKERS", str(min(2, os.cpu_count() or 1))))
+# Tâches recyclées par process worker (borne les fuites mémoire PIL / reportlab)
+CPU_POOL_MAX_TASKS_PER_CHILD = int(os.environ.get("CPU_POOL_MAX_TASKS_PER_CHILD", "500"))
+
+
+@dataclass
+class _KindStats:
+    completed: int = 0
+    failed: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+_semaphore_loop = None
+_in_flight = 0
+_waiting = 0
+_thread_fallbacks = 0
+_stats: Dict[str, _KindStats] = {}
+
+
+def _get_executor() -> Optional[ProcessPoolExecutor]:
+    global _executor
+    if CPU_POOL_WORKERS <= 0:
+        return None
+    if _executor is None:
+        kwargs: Dict[str, Any] = {"max_workers": CPU_POOL_WORKERS, "mp_context": multiprocessing.get_context("spawn")}
+        if CPU_POOL_MAX_TASKS_PER_CHILD > 0:
+            kwargs["max_tasks_per_child"] = CPU_POOL_MAX_TASKS_PER_CHILD
+        try:
+            _executor = ProcessPoolExecutor(**kwargs)
+        except TypeError:  # Python < 3.11 : pas de max_tasks_per_child
+            kwargs.pop("max_tasks_per_child", None)
+            _executor = ProcessPoolExecutor(**kwargs)
+    return _executor
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """Borne les tâches soumises par ce worker (une loop par worker ; une par test)."""
+    global _semaphore, _semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _semaphore is None or _semaphore_loop is not loop:
+        _semaphore = asyncio.Semaphore(max(1, CPU_POOL_WORKERS) * 2)
+        _semaphore_loop = loop
+    return _semaphore
+
+
+def _reset_broken_executor() -> None:
+    global _executor
+    broken, _executor = _executor, None
+    if broken is not None:
+        broken.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_cpu(fn: Callable[..., Any], *args: Any, kind: str = "default", **kwargs: Any) -> Any:
+    """Exécute ``fn(*args, **kwargs)`` dans le pool de process et retourne son résultat.
+
+    Les exceptions levées par ``fn`` sont propagées telles quelles. Si le pool
+    est cassé (worker tué par l'OOM killer...), il est recréé pour les appels
+    suivants et celui-ci repasse par un thread.
+    """
+    global _in_flight, _waiting, _thread_fallbacks
+    stats = _stats.setdefault(kind, _KindStats())
+    call = partial(fn, *args, **kwargs)
+
+    semaphore = _get_semaphore()
+    _waiting += 1
+    try:
+        await semaphore.acquire()
+    finally:
+        _waiting -= 1
+    _in_flight += 1
+    start = time.perf_counter()
+    try:
+        executor = _get_executor()
+        if executor is None:
+            _thread_fallbacks += 1
+            result = await asyncio.to_thread(call)
+        else:
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(executor, call)
+            except BrokenProcessPool as e:
+                logger.warning("CPU pool broken, recreating", kind=kind, error=str(e)[:120])
+                _reset_broken_executor()
+                _thread_fallbacks += 1
+                result = await asyncio.to_thread(call)
+    except Exception:
+        stats.failed += 1
+        raise
+    finally:
+        _in_flight -= 1
+        semaphore.release()
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    stats.completed += 1
+    stats.total_ms += elapsed_ms
+    stats.max_ms = max(stats.max_ms, elapsed_ms)
+    return result
+
+
+def shutdown_cpu_pool() -> None:
+    """Arrête les process workers (lifespan shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def get_cpu_pool_stats() -> dict:
+    return {
+        "mode": "process" if CPU_POOL_WORKERS > 0 else "thread",
+        "workers": CPU_POOL_WORKERS,
+        "started": _executor is not None,
+        "in_flight": _in_flight,
+        "waiting": _waiting,
+        "thread_fallbacks": _thread_fallbacks,
+        "kinds": {
+            kind: {
+                "completed": s.completed,
+                "failed": s.failed,
+                "avg_ms": round(s.total_ms / s.completed, 1) if s.completed else 0.0,
+                "max_ms": round(s.max_ms, 1),
+            }
+            for kind, s in _stats.items()
+        },
+    }
+
+
+__all__ = ["get_cpu_pool_stats", "run_cpu", "shutdown_cpu_pool"]
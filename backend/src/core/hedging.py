@@ -0,0 +1,278 @@
+"""
+╔════════════════════════════════════════════════════════════════════════════════════╗
+║  🏁 HEDGING — Requêtes couvertes sur une chaîne de providers équivalents          ║
+╠════════════════════════════════════════════════════════════════════════════════════╣
+║  • Le provider historiquement le plus rapide part seul                            ║
+║  • Le suivant est lancé après le p50 observé du meneur (p90 avant un payant)      ║
+║  • Un échec déclenche immédiatement le suivant                                    ║
+║  • Premier résultat valide gagnant, les autres sont annulés                       ║
+║  • Histogrammes de latence par provider → ordre + délais de hedge                 ║
+║  • Plafond de providers payants lancés par course                                 ║
+╚════════════════════════════════════════════════════════════════════════════════════╝
+
+Usage:
+    from core.hedging import HedgeCandidate, HedgingScheduler
+
+    hedger = HedgingScheduler("transcript", circuit_family="transcript")
+    outcome = await hedger.race(
+        [
+            HedgeCandidate("Supadata", "supadata", fetch_supadata, paid=True, expected_s=2),
+            HedgeCandidate("ytapi", "ytapi", fetch_ytapi, expected_s=3),
+        ],
+        accept=lambda r: bool(r and r[0]),
+        budget_s=60,
+    )
+    if outcome:
+        print(outcome.candidate.name, outcome.latency_s)
+"""
+
+import asyncio
+import bisect
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from core.logging import logger
+from core.provider_health import provider_health
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Configuration
+# ═══════════════════════════════════════════════════════════════════════════════
+
+HEDGE_MIN_DELAY_S = float(os.environ.get("HEDGE_MIN_DELAY_S", "0.3"))
+HEDGE_MAX_DELAY_S = float(os.environ.get("HEDGE_MAX_DELAY_S", "10"))
+HEDGE_MAX_PAID = int(os.environ.get("HEDGE_MAX_PAID", "1"))
+# Échantillons minimum avant de faire confiance à l'histogramme (sinon : expected_s)
+HEDGE_MIN_SAMPLES = int(os.environ.get("HEDGE_MIN_SAMPLES", "5"))
+
+# Bornes des buckets : 100ms → ~3 min, progression ×1.35
+_BUCKET_BOUNDS = tuple(round(0.1 * 1.35**i, 3) for i in range(26))
+
+
+class LatencyHistogram:
+    """Histogramme de latences (buckets log), à décroissance par moitié pour suivre la tendance."""
+
+    def __init__(self, max_samples: int = 500):
+        self.max_samples = max_samples
+        self.counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.total = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(_BUCKET_BOUNDS, seconds)] += 1
+        self.total += 1
+        if self.total >= self.max_samples:
+            self.counts = [c // 2 for c in self.counts]
+            self.total = sum(self.counts)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Borne haute du bucket contenant le quantile ``q`` (None si vide)."""
+        if not self.total:
+            return None
+        rank = q * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return _BUCKET_BOUNDS[min(i, len(_BUCKET_BOUNDS) - 1)]
+        return _BUCKET_BOUNDS[-1]
+
+
+@dataclass
+class HedgeCandidate:
+    name: str  # affichage / logs
+    key: str  # clé histogramme + circuit ``<circuit_family>:<key>``
+    call: Callable[[], Awaitable[Any]]
+    paid: bool = False
+    expected_s: float = 5.0  # a priori tant que l'histogramme est trop maigre
+
+
+@dataclass
+class HedgeOutcome:
+    candidate: HedgeCandidate
+    result: Any
+    latency_s: float  # depuis le lancement de ce candidat
+    elapsed_s: float  # depuis le début de la course
+    launched: List[str] = field(default_factory=list)
+
+
+@dataclass
+class _KeyStats:
+    launched: int = 0
+    hedged: int = 0  # lancé alors qu'un autre candidat était encore en vol
+    successes: int = 0
+    failures: int = 0
+    rejected: int = 0  # réponse valide mais refusée par ``accept`` (ex: pas de sous-titres)
+    cancelled: int = 0
+    skipped_paid: int = 0
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Scheduler
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_schedulers: Dict[str, "HedgingScheduler"] = {}
+
+
+class HedgingScheduler:
+    """Course couverte entre candidats ; apprend les latences de chaque provider."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        circuit_family: Optional[str] = None,
+        min_delay_s: float = HEDGE_MIN_DELAY_S,
+        max_delay_s: float = HEDGE_MAX_DELAY_S,
+        max_paid: int = HEDGE_MAX_PAID,
+    ):
+        self.name = name
+        self.circuit_family = circuit_family
+        self.min_delay_s = min_delay_s
+        self.max_delay_s = max_delay_s
+        self.max_paid = max_paid
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._stats: Dict[str, _KeyStats] = {}
+        _schedulers[name] = self
+
+    def histogram(self, key: str) -> LatencyHistogram:
+        hist = self._histograms.get(key)
+        if hist is None:
+            hist = self._histograms[key] = LatencyHistogram()
+        return hist
+
+    def estimate(self, candidate: HedgeCandidate, q: float = 0.5) -> float:
+        hist = self._histograms.get(candidate.key)
+        if hist is None or hist.total < HEDGE_MIN_SAMPLES:
+            return candidate.expected_s
+        return hist.quantile(q) or candidate.expected_s
+
+    def order(self, candidates: Sequence[HedgeCandidate]) -> List[HedgeCandidate]:
+        """Plus rapide (p50) d'abord ; à égalité, l'ordre déclaré."""
+        return sorted(candidates, key=self.estimate)
+
+    def hedge_delay(self, leader: HedgeCandidate, following: HedgeCandidate) -> float:
+        # Avant de payer un provider, on laisse au meneur jusqu'à son p90
+        delay = self.estimate(leader, 0.9 if following.paid else 0.5)
+        return min(self.max_delay_s, max(self.min_delay_s, delay))
+
+    async def _allowed(self, candidate: HedgeCandidate) -> bool:
+        if self.circuit_family is None:
+            return True
+        return await provider_health.allow(f"{self.circuit_family}:{candidate.key}")
+
+    def _record(self, candidate: HedgeCandidate, outcome: str, latency_s: float) -> None:
+        """``outcome`` : "ok" (accepté), "rejected" (répondu mais refusé) ou "error" (exception)."""
+        stats = self._stats.setdefault(candidate.key, _KeyStats())
+        if outcome == "ok":
+            stats.successes += 1
+            self.histogram(candidate.key).observe(latency_s)
+        elif outcome == "rejected":
+            stats.rejected += 1
+        else:
+            stats.failures += 1
+        if self.circuit_family is not None:
+            # Un résultat refusé (vidéo sans sous-titres) reste une réponse saine du provider :
+            # seul un échec d'appel compte contre son circuit
+            healthy = outcome != "error"
+            provider_health.record(f"{self.circuit_family}:{candidate.key}", healthy, latency_s if healthy else None)
+
+    async def race(
+        self,
+        candidates: Sequence[HedgeCandidate],
+        *,
+        accept: Callable[[Any], bool],
+        budget_s: float,
+    ) -> Optional[HedgeOutcome]:
+        """
+        Lance les candidats en hedging et retourne le premier résultat accepté
+        (``None`` si tous échouent ou si ``budget_s`` est écoulé). Les candidats
+        dont le circuit est ouvert sont sautés ; les perdants sont annulés.
+        """
+        queue = self.order(candidates)
+        started = time.monotonic()
+        deadline = started + budget_s
+        running: Dict[asyncio.Task, tuple] = {}
+        launched: List[str] = []
+        paid_launched = 0
+        next_launch = started
+        winner: Optional[HedgeOutcome] = None
+
+        try:
+            while winner is None:
+                now = time.monotonic()
+                if now >= deadline:
+                    break
+
+                # Lancer le candidat suivant si le délai de hedge est écoulé (ou si plus rien ne tourne)
+                while queue and (now >= next_launch or not running):
+                    candidate = queue.pop(0)
+                    if candidate.paid and paid_launched >= self.max_paid:
+                        self._stats.setdefault(candidate.key, _KeyStats()).skipped_paid += 1
+                        continue
+                    if not await self._allowed(candidate):
+                        logger.info("Hedge skip (circuit open)", provider=candidate.key)
+                        continue
+                    stats = self._stats.setdefault(candidate.key, _KeyStats())
+                    stats.launched += 1
+                    if running:
+                        stats.hedged += 1
+                    paid_launched += candidate.paid
+                    launched.append(candidate.key)
+                    task = asyncio.create_task(candidate.call())
+                    running[task] = (candidate, time.monotonic())
+                    if queue:
+                        next_launch = time.monotonic() + self.hedge_delay(candidate, queue[0])
+                    break
+
+                if not running:
+                    break  # plus rien en vol ni à lancer
+
+                timeout = deadline - time.monotonic()
+                if queue:
+                    timeout = min(timeout, max(0.0, next_launch - time.monotonic()))
+                done, _ = await asyncio.wait(running, timeout=max(0.0, timeout), return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    candidate, launched_at = running.pop(task)
+                    latency = time.monotonic() - launched_at
+                    try:
+                        result = task.result()
+                        ok = accept(result)
+                        outcome = "ok" if ok else "rejected"
+                    except Exception as e:
+                        logger.info("Hedge candidate failed", provider=candidate.key, error=f"{type(e).__name__}: {str(e)[:120]}")
+                        result, ok, outcome = None, False, "error"
+                    self._record(candidate, outcome, latency)
+                    if ok and winner is None:
+                        winner = HedgeOutcome(candidate, result, latency, time.monotonic() - started, launched)
+                    elif not ok:
+                        next_launch = time.monotonic()  # échec : le suivant part tout de suite
+        finally:
+            for task, (candidate, _) in running.items():
+                task.cancel()
+                self._stats.setdefault(candidate.key, _KeyStats()).cancelled += 1
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return winner
+
+    def get_stats(self) -> dict:
+        result = {}
+        for key in sorted(set(self._stats) | set(self._histograms)):
+            stats = self._stats.get(key, _KeyStats())
+            hist = self._histograms.get(key)
+            result[key] = {
+                **stats.__dict__,
+                "samples": hist.total if hist else 0,
+                "p50_s": hist.quantile(0.5) if hist else None,
+                "p90_s": hist.quantile(0.9) if hist else None,
+            }
+        return result
+
+
+def get_hedging_stats() -> dict:
+    return {name: scheduler.get_stats() for name, scheduler in _schedulers.items()}
+
+
+__all__ = ["HedgeCandidate", "HedgeOutcome", "HedgingScheduler", "LatencyHistogram", "get_hedging_stats"]
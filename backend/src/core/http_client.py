@@ -13,11 +13,16 @@
 ║  arXiv, Crossref, etc.) doivent partir directement depuis l'IP Hetzner.           ║
 ║                                                                                    ║
 ║  Voir docs/audits/2026-05-11-proxy-coverage.md pour le contexte complet.          ║
+║                                                                                    ║
+║  🤖 provider_client() — pools HTTP/2 par provider (Mistral, DeepSeek, OpenAI,     ║
+║  ElevenLabs) pour les appels LLM / embeddings / TTS, + get_pool_stats().          ║
 ╚════════════════════════════════════════════════════════════════════════════════════╝
 """
 
 import httpx
-from typing import Optional
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
 
 from core.logging import logger
 
@@ -82,6 +87,7 @@ async def close_http_client() -> None:
     Appelé au shutdown de FastAPI (lifespan).
     """
     global _client
+    await close_provider_clients()
     if _client is not None:
         await _client.aclose()
         _client = None
@@ -109,8 +115,6 @@ def get_http_client_optional() -> Optional[httpx.AsyncClient]:
 # Context Manager compatible — Drop-in replacement pour `async with httpx.AsyncClient() as client:`
 # ═══════════════════════════════════════════════════════════════════════════════
 
-from contextlib import asynccontextmanager
-
 
 @asynccontextmanager
 async def shared_http_client(**kwargs):
@@ -143,6 +147,208 @@ async def shared_http_client(**kwargs):
             yield fallback_client
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# 🤖 Provider pools — LLM / embeddings / TTS (HTTP/2, un pool par base URL)
+# ═══════════════════════════════════════════════════════════════════════════════
+#
+# Chaque appel Mistral / DeepSeek / OpenAI / ElevenLabs créait son propre
+# httpx.AsyncClient → handshake TCP+TLS vers l'API à chaque analyse / tour de
+# chat / embedding. On garde ici UN client par provider (base URL), en HTTP/2
+# (multiplexage : des dizaines de requêtes concurrentes sur quelques connexions),
+# avec des limites keep-alive et des timeouts propres au provider.
+#
+# Usage:
+#     from core.http_client import provider_client
+#
+#     async with provider_client("mistral", timeout=30.0) as client:
+#         resp = await client.post(MISTRAL_EMBED_URL, json=..., timeout=30.0)
+#
+# Pour les réponses streamées qui survivent au bloc (TTS) :
+#     client = get_provider_client("elevenlabs", timeout=60.0)
+#     ...
+#     await release_provider_client(client)  # no-op si client poolé
+#
+# Les pools ne sont actifs qu'après init_http_client() (lifespan FastAPI) ;
+# avant (tests, scripts), on retombe sur un client éphémère comme avant.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+@dataclass(frozen=True)
+class ProviderPoolConfig:
+    """Configuration du pool HTTP d'un provider."""
+
+    base_url: str
+    timeout: httpx.Timeout
+    limits: httpx.Limits
+    http2: bool = True
+
+
+PROVIDER_POOLS: Dict[str, ProviderPoolConfig] = {
+    "mistral": ProviderPoolConfig(
+        base_url="https://api.mistral.ai",
+        # read long : génération de synthèses (jusqu'à 180s côté llm_provider)
+        timeout=httpx.Timeout(connect=10.0, read=180.0, write=30.0, pool=15.0),
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=90.0),
+    ),
+    "deepseek": ProviderPoolConfig(
+        base_url="https://api.deepseek.com",
+        timeout=httpx.Timeout(connect=10.0, read=180.0, write=30.0, pool=15.0),
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=4, keepalive_expiry=30.0),
+    ),
+    "openai": ProviderPoolConfig(
+        base_url="https://api.openai.com",
+        timeout=httpx.Timeout(connect=10.0, read=60.0, write=15.0, pool=10.0),
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=4, keepalive_expiry=30.0),
+    ),
+    "elevenlabs": ProviderPoolConfig(
+        base_url="https://api.elevenlabs.io",
+        timeout=httpx.Timeout(connect=10.0, read=60.0, write=15.0, pool=10.0),
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=8, keepalive_expiry=60.0),
+    ),
+}
+
+
+@dataclass
+class _PoolCounters:
+    requests: int = 0
+    responses: int = 0
+    errors_4xx: int = 0
+    errors_5xx: int = 0
+    ephemeral_fallbacks: int = 0
+
+
+_provider_clients: Dict[str, httpx.AsyncClient] = {}
+_provider_counters: Dict[str, _PoolCounters] = {}
+
+
+def _counters(provider: str) -> _PoolCounters:
+    counters = _provider_counters.get(provider)
+    if counters is None:
+        counters = _provider_counters[provider] = _PoolCounters()
+    return counters
+
+
+def _event_hooks(provider: str) -> dict:
+    counters = _counters(provider)
+
+    async def on_request(request: httpx.Request) -> None:
+        counters.requests += 1
+
+    async def on_response(response: httpx.Response) -> None:
+        counters.responses += 1
+        if 400 <= response.status_code < 500:
+            counters.errors_4xx += 1
+        elif response.status_code >= 500:
+            counters.errors_5xx += 1
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+def _build_provider_client(provider: str) -> httpx.AsyncClient:
+    config = PROVIDER_POOLS[provider]
+    kwargs = dict(
+        base_url=config.base_url,
+        limits=config.limits,
+        timeout=config.timeout,
+        event_hooks=_event_hooks(provider),
+    )
+    try:
+        return httpx.AsyncClient(http2=config.http2, **kwargs)
+    except ImportError:
+        # Paquet `h2` absent (httpx sans l'extra [http2]) → HTTP/1.1 keep-alive
+        logger.warning(f"[HTTP_POOL] h2 not installed, {provider} pool falls back to HTTP/1.1")
+        return httpx.AsyncClient(**kwargs)
+
+
+def get_provider_client(provider: str, **kwargs) -> httpx.AsyncClient:
+    """Client poolé du provider, créé paresseusement.
+
+    Si les pools ne sont pas actifs (pas de lifespan : tests, scripts) ou si le
+    provider est inconnu, retourne un client ÉPHÉMÈRE construit avec ``kwargs``
+    — à libérer via :func:`release_provider_client`.
+    """
+    client = _provider_clients.get(provider)
+    if client is not None:
+        return client
+    if _client is None or provider not in PROVIDER_POOLS:
+        _counters(provider).ephemeral_fallbacks += 1
+        return httpx.AsyncClient(**kwargs)
+    client = _provider_clients[provider] = _build_provider_client(provider)
+    return client
+
+
+def _is_pooled(client: httpx.AsyncClient) -> bool:
+    return any(client is pooled for pooled in _provider_clients.values())
+
+
+async def release_provider_client(client: httpx.AsyncClient) -> None:
+    """Ferme le client s'il est éphémère ; no-op pour un client poolé."""
+    if _is_pooled(client):
+        return
+    await client.aclose()
+
+
+@asynccontextmanager
+async def provider_client(provider: str, **kwargs):
+    """Drop-in replacement pour `async with httpx.AsyncClient(...)` vers un provider.
+
+    Comme pour :func:`shared_http_client`, les timeouts spécifiques à l'appel
+    doivent être passés per-request (le client poolé a les timeouts du provider).
+    """
+    client = get_provider_client(provider, **kwargs)
+    if _is_pooled(client):
+        yield client
+        return
+    async with client as ephemeral:
+        yield ephemeral
+
+
+async def close_provider_clients() -> None:
+    """Ferme tous les pools providers (appelé par close_http_client)."""
+    clients = list(_provider_clients.values())
+    _provider_clients.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"[HTTP_POOL] close failed: {e}")
+
+
+def _connection_stats(client: httpx.AsyncClient) -> dict:
+    """Introspection best-effort du pool httpcore (connexions, requêtes en vol)."""
+    try:
+        pool = client._transport._pool  # type: ignore[attr-defined]
+        connections = list(pool.connections)
+        requests = list(pool._requests)
+    except AttributeError:
+        return {}
+    return {
+        "connections": len(connections),
+        "idle": sum(1 for c in connections if c.is_idle()),
+        "http2": sum(1 for c in connections if "HTTP/2" in c.info()),
+        "in_flight": len(requests),
+        "queued": sum(1 for r in requests if r.is_queued()),
+    }
+
+
+def get_pool_stats() -> dict:
+    """Utilisation des pools providers (pour /debug et le monitoring)."""
+    stats = {}
+    for provider in sorted(set(PROVIDER_POOLS) | set(_provider_counters)):
+        config = PROVIDER_POOLS.get(provider)
+        client = _provider_clients.get(provider)
+        entry = {
+            "pooled": client is not None,
+            "base_url": config.base_url if config else None,
+            "max_connections": config.limits.max_connections if config else None,
+            **asdict(_counters(provider)),
+        }
+        if client is not None:
+            entry.update(_connection_stats(client))
+        stats[provider] = entry
+    return stats
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🔌 Proxied client — YouTube / TikTok (Decodo residential proxy)
 # ═══════════════════════════════════════════════════════════════════════════════
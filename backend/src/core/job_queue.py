@@ -0,0 +1,628 @@
+"""
+╔════════════════════════════════════════════════════════════════════════════════════╗
+║  🧵 JOB QUEUE — Jobs durables, priorisés par plan et reprenables                   ║
+╠════════════════════════════════════════════════════════════════════════════════════╣
+║  • File Redis (ZSET) : ancienneté + décalage du plan (expert avant free, sans     ║
+║    famine : un job free finit toujours par passer devant)                          ║
+║  • Bail à expiration renouvelé par heartbeat : un worker tué (deploy, OOM) rend   ║
+║    ses jobs, repris ailleurs ; MAX_ATTEMPTS bails perdus → job abandonné           ║
+║    (hook on_abandoned rejoué à chaque passage du reaper tant qu'il échoue)         ║
+║  • Checkpoints par étape (transcript → chunks → synthesis → extras) : un job      ║
+║    repris saute les étapes déjà terminées                                          ║
+║  • Workers = boucles asyncio longue durée (JOB_WORKERS par process, par défaut    ║
+║    le budget initial du limiteur LLM), plus d'event loop créée par tâche          ║
+║  • Arrêt propre (lifespan) : les jobs en cours sont remis en tête de file          ║
+║  • Fallback in-memory (dev, tests, Redis down) : mêmes priorités, sans durabilité ║
+╚════════════════════════════════════════════════════════════════════════════════════╝
+
+Usage:
+    from core.job_queue import job_queue, get_checkpoint, save_checkpoint
+
+    job_queue.register("video_analysis", run_analysis, on_abandoned=fail_analysis)
+    await job_queue.enqueue("video_analysis", payload, job_id=task_id, plan=user.plan)
+
+    # Dans le handler (ou toute coroutine qu'il appelle) :
+    transcript = get_checkpoint("transcript")
+    if transcript is None:
+        transcript = await extract(...)
+        await save_checkpoint("transcript", transcript)
+"""
+
+import asyncio
+import heapq
+import statistics
+import itertools
+import json
+import os
+import time
+import uuid
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from core.llm_limiter import DEFAULT_POLICY
+from core.logging import logger
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Configuration
+# ═══════════════════════════════════════════════════════════════════════════════
+
+JOB_KEY_PREFIX = "deepsight:jobs"
+# Boucles par process uvicorn. Avant la file, BackgroundTasks lançait toutes les analyses
+# en parallèle et seul le limiteur LLM les bornait : on garde ce débit par défaut
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", str(int(DEFAULT_POLICY.initial_limit))))
+JOB_LEASE_S = float(os.environ.get("JOB_LEASE_S", "60"))
+HEARTBEAT_S = JOB_LEASE_S / 3
+POLL_INTERVAL_S = 1.0  # file vide : les enqueue du même process réveillent immédiatement
+MAX_ATTEMPTS = 3  # bails perdus avant abandon (job qui fait tomber son worker)
+JOB_TTL_S = 2 * 86400
+CHECKPOINT_FIELD_PREFIX = "step:"
+WAIT_SAMPLES = 200  # attentes en file récentes gardées pour stats()
+
+# Avance accordée dans la file selon le plan : un job expert passe devant les
+# jobs free des 3 dernières minutes, pas devant ceux qui attendent depuis plus
+PLAN_QUEUE_OFFSET_S = {"expert": 0.0, "pro": 60.0, "free": 180.0}
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+def plan_offset_s(plan: Optional[str]) -> float:
+    from billing.plan_config import normalize_plan_id
+
+    return PLAN_QUEUE_OFFSET_S.get(normalize_plan_id(plan or "free"), PLAN_QUEUE_OFFSET_S["free"])
+
+
+@dataclass
+class Job:
+    """Un job tel que lu par le worker qui l'exécute."""
+
+    id: str
+    kind: str
+    payload: Dict[str, Any]
+    score: float  # ms : enqueued_at + décalage du plan (plus petit = plus prioritaire)
+    attempts: int = 0
+    enqueued_at: float = 0.0  # s (epoch) : base du temps d'attente en file
+    checkpoints: Dict[str, Any] = field(default_factory=dict)
+    durable: bool = True  # False : file locale (pas de Redis), rien à persister
+    lease_lost: bool = False
+
+    @property
+    def resumed(self) -> bool:
+        """Reprise après un redémarrage ou un bail perdu (checkpoints éventuels)."""
+        return self.attempts > 1 or bool(self.checkpoints)
+
+
+@dataclass
+class _Registration:
+    handler: JobHandler
+    on_abandoned: Optional[JobHandler] = None
+
+
+# Job exécuté par la tâche courante (propagé aux sous-tâches créées depuis le handler)
+_current_job: ContextVar[Optional[Tuple["JobQueue", Job]]] = ContextVar("current_job", default=None)
+
+
+def current_job() -> Optional[Job]:
+    current = _current_job.get()
+    return current[1] if current else None
+
+
+def get_checkpoint(step: str) -> Optional[Any]:
+    """Résultat de ``step`` sauvegardé par une exécution précédente du job courant."""
+    job = current_job()
+    if job is None:
+        return None
+    value = job.checkpoints.get(step)
+    if value is not None:
+        _counters["checkpoint_hits"] += 1
+    return value
+
+
+async def save_checkpoint(step: str, value: Any) -> None:
+    """Persiste le résultat de ``step`` (no-op hors job). ``value`` doit être sérialisable JSON."""
+    current = _current_job.get()
+    if current is None:
+        return
+    queue, job = current
+    job.checkpoints[step] = value
+    await queue._store_checkpoint(job, step, value)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Scripts Lua (atomiques côté Redis)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# KEYS: queue, leases — ARGV: now_ms, lease_ms, job_key_prefix, worker
+# Retourne {job_id, attempts} ou nil si la file est vide (attempts 0 = job expiré)
+_CLAIM_LUA = """
+local popped = redis.call('ZPOPMIN', KEYS[1])
+if #popped == 0 then return nil end
+local id = popped[1]
+local key = ARGV[3] .. id
+if redis.call('EXISTS', key) == 0 then return {id, 0} end
+redis.call('ZADD', KEYS[2], tonumber(ARGV[1]) + tonumber(ARGV[2]), id)
+local attempts = redis.call('HINCRBY', key, 'attempts', 1)
+redis.call('HSET', key, 'status', 'running', 'worker', ARGV[4])
+return {id, attempts}
+"""
+
+# KEYS: queue, leases, abandoning — ARGV: now_ms, job_key_prefix, max_attempts, batch
+# Retourne {remis en file, abandonnés}. Les abandonnés restent dans ``abandoning``
+# jusqu'à ce que leur hook on_abandoned réussisse (voir JobQueue._abandon)
+_REAP_LUA = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[4]))
+local requeued, abandoned = {}, {}
+for _, id in ipairs(expired) do
+    redis.call('ZREM', KEYS[2], id)
+    local key = ARGV[2] .. id
+    if redis.call('EXISTS', key) == 1 then
+        if tonumber(redis.call('HGET', key, 'attempts') or '0') >= tonumber(ARGV[3]) then
+            redis.call('HSET', key, 'status', 'abandoned')
+            redis.call('ZADD', KEYS[3], ARGV[1], id)
+            table.insert(abandoned, id)
+        else
+            redis.call('ZADD', KEYS[1], redis.call('HGET', key, 'score'), id)
+            redis.call('HSET', key, 'status', 'queued')
+            table.insert(requeued, id)
+        end
+    end
+end
+return {requeued, abandoned}
+"""
+
+# KEYS: queue, leases, job — ARGV: job_id, score
+# Arrêt propre : remet le job en file sans compter la tentative (si le bail est encore à nous)
+_REQUEUE_LUA = """
+if redis.call('ZREM', KEYS[2], ARGV[1]) == 0 then return 0 end
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+redis.call('HINCRBY', KEYS[3], 'attempts', -1)
+redis.call('HSET', KEYS[3], 'status', 'queued')
+return 1
+"""
+
+
+_counters = {
+    "enqueued": 0,
+    "claimed": 0,
+    "completed": 0,
+    "failed": 0,
+    "resumed": 0,
+    "requeued_on_shutdown": 0,
+    "reclaimed": 0,
+    "abandoned": 0,
+    "abandon_hook_failures": 0,
+    "lost_leases": 0,
+    "checkpoints_saved": 0,
+    "checkpoint_hits": 0,
+    "redis_errors": 0,
+}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# File de jobs
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class JobQueue:
+    """File de jobs partagée via Redis quand il est disponible, workers asyncio longue durée."""
+
+    def __init__(self, redis: Any = None, workers: int = JOB_WORKERS):
+        self._redis_client = redis
+        self.workers = workers
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self._handlers: Dict[str, _Registration] = {}
+        self._workers: List[asyncio.Task] = []
+        self._reaper_task: Optional[asyncio.Task] = None
+        self._running: Dict[str, Job] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        # Fallback local : tas (score, seq, job_id) + jobs
+        self._local_heap: List[Tuple[float, int, str]] = []
+        self._local_jobs: Dict[str, Job] = {}
+        self._seq = itertools.count()
+        self._waits: deque = deque(maxlen=WAIT_SAMPLES)
+
+    # ─── Redis ─────────────────────────────────────────────────────────────────
+
+    @property
+    def redis(self) -> Any:
+        if self._redis_client is not None:
+            return self._redis_client
+        try:
+            from core.cache import cache_service
+        except ImportError:
+            return None
+        return getattr(cache_service.backend, "redis", None)
+
+    @staticmethod
+    def _keys() -> Tuple[str, str]:
+        return f"{JOB_KEY_PREFIX}:queue", f"{JOB_KEY_PREFIX}:leases"
+
+    @staticmethod
+    def _abandoning_key() -> str:
+        return f"{JOB_KEY_PREFIX}:abandoning"
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"{JOB_KEY_PREFIX}:job:{job_id}"
+
+    def _redis_failed(self, op: str, exc: Exception) -> None:
+        _counters["redis_errors"] += 1
+        if _counters["redis_errors"] == 1 or _counters["redis_errors"] % 100 == 0:
+            logger.warning("Job queue Redis error", op=op, error=str(exc)[:120])
+
+    # ─── API ───────────────────────────────────────────────────────────────────
+
+    def register(self, kind: str, handler: JobHandler, on_abandoned: Optional[JobHandler] = None) -> None:
+        """
+        ``handler(payload)`` exécute le job ; ``on_abandoned(payload)`` est appelé
+        quand le job a perdu MAX_ATTEMPTS bails (ex: libérer des crédits réservés).
+        """
+        self._handlers[kind] = _Registration(handler, on_abandoned)
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        job_id: Optional[str] = None,
+        plan: Optional[str] = None,
+    ) -> str:
+        job_id = job_id or uuid.uuid4().hex
+        now = time.time()
+        score = now * 1000 + plan_offset_s(plan) * 1000
+        _counters["enqueued"] += 1
+        redis = self.redis
+        if redis is not None:
+            try:
+                queue_key, _ = self._keys()
+                key = self._job_key(job_id)
+                pipe = redis.pipeline()
+                pipe.hset(
+                    key,
+                    mapping={
+                        "kind": kind,
+                        "payload": json.dumps(payload, ensure_ascii=False, default=str),
+                        "score": repr(score),
+                        "attempts": 0,
+                        "enqueued_at": repr(now),
+                        "status": "queued",
+                    },
+                )
+                pipe.expire(key, JOB_TTL_S)
+                pipe.zadd(queue_key, {job_id: score})
+                await pipe.execute()
+                self._wake()
+                return job_id
+            except Exception as e:
+                self._redis_failed("enqueue", e)
+        self._local_jobs[job_id] = Job(job_id, kind, payload, score, enqueued_at=now, durable=False)
+        heapq.heappush(self._local_heap, (score, next(self._seq), job_id))
+        self._wake()
+        return job_id
+
+    async def cancel(self, job_id: str) -> bool:
+        """Retire un job encore en file. False s'il a déjà démarré (annulation coopérative)."""
+        if self._local_jobs.pop(job_id, None) is not None:
+            return True
+        redis = self.redis
+        if redis is None:
+            return False
+        try:
+            if await redis.zrem(self._keys()[0], job_id):
+                await redis.delete(self._job_key(job_id))
+                return True
+        except Exception as e:
+            self._redis_failed("cancel", e)
+        return False
+
+    # ─── Cycle de vie ──────────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        """Démarre les boucles worker (+ le récupérateur de bails) dans la loop courante."""
+        if self._workers or self.workers <= 0:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        self._workers = [loop.create_task(self._worker(i), name=f"job-worker-{i}") for i in range(self.workers)]
+        self._reaper_task = loop.create_task(self._reaper(), name="job-reaper")
+        logger.info("Job queue started", workers=self.workers, mode="redis" if self.redis is not None else "local")
+
+    async def close(self) -> None:
+        """Arrêt (lifespan) : les jobs en cours sont interrompus et remis en file."""
+        self._stopping = True
+        tasks = [*self._workers, *([self._reaper_task] if self._reaper_task else [])]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._reaper_task = None
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    # ─── Workers ───────────────────────────────────────────────────────────────
+
+    async def _worker(self, index: int) -> None:
+        while not self._stopping:
+            self._wakeup.clear()  # avant le claim : un enqueue concurrent n'est pas manqué
+            try:
+                job = await self._claim()
+            except Exception as e:
+                logger.warning("Job claim failed", worker=index, error=str(e)[:120])
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), POLL_INTERVAL_S)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    async def _run(self, job: Job) -> None:
+        registration = self._handlers.get(job.kind)
+        if registration is None:
+            logger.error("No handler for job kind, dropping", kind=job.kind, job_id=job.id)
+            await self._finish(job, "failed")
+            return
+
+        _counters["claimed"] += 1
+        if job.attempts == 1 and job.enqueued_at:
+            self._waits.append(max(0.0, time.time() - job.enqueued_at))
+        if job.resumed:
+            _counters["resumed"] += 1
+            logger.info("Resuming job", job_id=job.id, kind=job.kind, attempt=job.attempts, steps=list(job.checkpoints))
+
+        token = _current_job.set((self, job))
+        try:
+            run = asyncio.ensure_future(registration.handler(job.payload))
+        finally:
+            _current_job.reset(token)
+        self._running[job.id] = job
+        heartbeat = asyncio.ensure_future(self._heartbeat(job, run))
+        try:
+            await run
+            await self._finish(job, "completed")
+        except asyncio.CancelledError:
+            if job.lease_lost:
+                # Un autre worker a repris le job (bail expiré) : on s'efface
+                return
+            # Arrêt du worker : interrompre le handler et rendre le job à la file
+            run.cancel()
+            await asyncio.gather(run, return_exceptions=True)
+            await self._requeue(job)
+            raise
+        except Exception as e:
+            logger.error("Job failed", job_id=job.id, kind=job.kind, error=str(e)[:300])
+            await self._finish(job, "failed")
+        finally:
+            heartbeat.cancel()
+            self._running.pop(job.id, None)
+
+    async def _heartbeat(self, job: Job, run: asyncio.Future) -> None:
+        redis = self.redis
+        if redis is None or not job.durable:
+            return
+        leases_key = self._keys()[1]
+        while not run.done():
+            await asyncio.sleep(HEARTBEAT_S)
+            try:
+                expires = int((time.time() + JOB_LEASE_S) * 1000)
+                renewed = await redis.zadd(leases_key, {job.id: expires}, xx=True, ch=True)
+            except Exception as e:
+                self._redis_failed("heartbeat", e)
+                continue
+            if not renewed and not run.done():
+                _counters["lost_leases"] += 1
+                logger.warning("Job lease lost, stopping local run", job_id=job.id)
+                job.lease_lost = True
+                run.cancel()
+                return
+
+    async def _reaper(self) -> None:
+        """Remet en file les jobs dont le bail a expiré (worker mort)."""
+        while not self._stopping:
+            await asyncio.sleep(HEARTBEAT_S)
+            try:
+                await self.reap()
+            except Exception as e:
+                self._redis_failed("reap", e)
+
+    async def reap(self) -> Tuple[List[str], List[str]]:
+        """Remet en file les bails expirés, abandonne les jobs au-delà de MAX_ATTEMPTS."""
+        redis = self.redis
+        if redis is None:
+            return [], []
+        requeued, abandoned = await redis.eval(
+            _REAP_LUA,
+            3,
+            *self._keys(),
+            self._abandoning_key(),
+            int(time.time() * 1000),
+            f"{JOB_KEY_PREFIX}:job:",
+            MAX_ATTEMPTS,
+            100,
+        )
+        requeued = [_text(i) for i in requeued]
+        abandoned = [_text(i) for i in abandoned]
+        if requeued:
+            _counters["reclaimed"] += len(requeued)
+            logger.warning("Jobs reclaimed from expired leases", count=len(requeued))
+            self._wake()
+        _counters["abandoned"] += len(abandoned)
+        for job_id in abandoned:
+            logger.error("Job abandoned after repeated lost leases", job_id=job_id)
+        # Nouveaux abandons + hooks en échec aux passages précédents
+        for job_id in await redis.zrange(self._abandoning_key(), 0, 99):
+            await self._abandon(_text(job_id))
+        return requeued, abandoned
+
+    async def _abandon(self, job_id: str) -> None:
+        """Appelle on_abandoned ; le job ne quitte ``abandoning`` que si le hook a réussi."""
+        job = await self._load(job_id, attempts=MAX_ATTEMPTS)
+        if job is None:
+            logger.error("Abandoned job expired before its hook succeeded", job_id=job_id)
+        else:
+            registration = self._handlers.get(job.kind)
+            if registration is not None and registration.on_abandoned is not None:
+                try:
+                    await registration.on_abandoned(job.payload)
+                except Exception as e:
+                    _counters["abandon_hook_failures"] += 1
+                    logger.error("Job abandon hook failed, retrying next pass", job_id=job_id, error=str(e)[:200])
+                    return
+        pipe = self.redis.pipeline()
+        pipe.zrem(self._abandoning_key(), job_id)
+        pipe.delete(self._job_key(job_id))
+        await pipe.execute()
+
+    # ─── Stockage ──────────────────────────────────────────────────────────────
+
+    async def _claim(self) -> Optional[Job]:
+        redis = self.redis
+        if redis is not None:
+            try:
+                claimed = await redis.eval(
+                    _CLAIM_LUA,
+                    2,
+                    *self._keys(),
+                    int(time.time() * 1000),
+                    int(JOB_LEASE_S * 1000),
+                    f"{JOB_KEY_PREFIX}:job:",
+                    self.worker_id,
+                )
+                if claimed:
+                    job_id, attempts = _text(claimed[0]), int(claimed[1])
+                    if attempts == 0:
+                        logger.warning("Queued job expired before running", job_id=job_id)
+                        return None
+                    return await self._load(job_id, attempts)
+            except Exception as e:
+                self._redis_failed("claim", e)
+        while self._local_heap:
+            _score, _seq, job_id = heapq.heappop(self._local_heap)
+            job = self._local_jobs.pop(job_id, None)
+            if job is not None:  # None : annulé pendant l'attente
+                job.attempts += 1
+                return job
+        return None
+
+    async def _load(self, job_id: str, attempts: int) -> Optional[Job]:
+        raw = {_text(k): v for k, v in (await self.redis.hgetall(self._job_key(job_id))).items()}
+        if not raw:
+            return None
+        checkpoints = {}
+        for name, value in raw.items():
+            if name.startswith(CHECKPOINT_FIELD_PREFIX):
+                checkpoints[name[len(CHECKPOINT_FIELD_PREFIX) :]] = json.loads(value)
+        return Job(
+            id=job_id,
+            kind=_text(raw["kind"]),
+            payload=json.loads(raw["payload"]),
+            score=float(raw["score"]),
+            attempts=attempts,
+            enqueued_at=float(raw.get("enqueued_at", 0.0)),
+            checkpoints=checkpoints,
+        )
+
+    async def _store_checkpoint(self, job: Job, step: str, value: Any) -> None:
+        _counters["checkpoints_saved"] += 1
+        redis = self.redis
+        if redis is None or not job.durable:
+            return
+        try:
+            await redis.hset(
+                self._job_key(job.id),
+                CHECKPOINT_FIELD_PREFIX + step,
+                json.dumps(value, ensure_ascii=False, default=str),
+            )
+        except Exception as e:
+            # Le job continue ; seule la reprise à cette étape est perdue
+            self._redis_failed("checkpoint", e)
+
+    async def _finish(self, job: Job, outcome: str) -> None:
+        _counters[outcome] += 1
+        redis = self.redis
+        if redis is None or not job.durable:
+            return
+        try:
+            pipe = redis.pipeline()
+            pipe.zrem(self._keys()[1], job.id)
+            pipe.delete(self._job_key(job.id))  # checkpoints (transcripts) libérés tout de suite
+            await pipe.execute()
+        except Exception as e:
+            self._redis_failed("finish", e)
+
+    async def _requeue(self, job: Job) -> None:
+        _counters["requeued_on_shutdown"] += 1
+        redis = self.redis
+        if redis is not None and job.durable:
+            try:
+                queue_key, leases_key = self._keys()
+                await redis.eval(_REQUEUE_LUA, 3, queue_key, leases_key, self._job_key(job.id), job.id, repr(job.score))
+                return
+            except Exception as e:
+                self._redis_failed("requeue", e)
+        job.attempts -= 1
+        self._local_jobs[job.id] = job
+        heapq.heappush(self._local_heap, (job.score, next(self._seq), job.id))
+
+    # ─── Observabilité ─────────────────────────────────────────────────────────
+
+    async def stats(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            **_counters,
+            "mode": "redis" if self.redis is not None else "local",
+            "workers": len([t for t in self._workers if not t.done()]),
+            "running": len(self._running),
+            "queued": len(self._local_jobs),
+            "queue_wait_s": _wait_stats(self._waits),
+        }
+        redis = self.redis
+        if redis is not None:
+            try:
+                queue_key, leases_key = self._keys()
+                result["queued"] = int(await redis.zcard(queue_key))
+                result["leased"] = int(await redis.zcard(leases_key))
+                result["abandoning"] = int(await redis.zcard(self._abandoning_key()))
+            except Exception as e:
+                self._redis_failed("stats", e)
+        return result
+
+
+def _wait_stats(waits: deque) -> Dict[str, Any]:
+    """Attente en file (enqueue → premier claim) des derniers jobs de ce process."""
+    if not waits:
+        return {"samples": 0, "avg": None, "p50": None, "p95": None, "max": None}
+    ordered = sorted(waits)
+    return {
+        "samples": len(ordered),
+        "avg": round(statistics.fmean(ordered), 3),
+        "p50": round(ordered[len(ordered) // 2], 3),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def _text(value: Any) -> str:
+    return value.decode() if isinstance(value, (bytes, bytearray)) else str(value)
+
+
+job_queue = JobQueue()
+
+
+async def get_job_queue_stats() -> Dict[str, Any]:
+    return await job_queue.stats()
+
+
+__all__ = [
+    "Job",
+    "JobQueue",
+    "current_job",
+    "get_checkpoint",
+    "get_job_queue_stats",
+    "job_queue",
+    "save_checkpoint",
+]
@@ -0,0 +1,475 @@
+"""
+╔════════════════════════════════════════════════════════════════════════════════════╗
+║  🚦 LLM LIMITER — Concurrence adaptative (AIMD) partagée entre workers            ║
+╠════════════════════════════════════════════════════════════════════════════════════╣
+║  • Une limite de requêtes en vol par modèle, commune au cluster (Redis)           ║
+║  • AIMD : +1/limite par succès, ×0.5 sur 429 / timeout / latence anormale         ║
+║  • Classes de priorité : interactive > standard > batch (part de la limite)       ║
+║  • Un appel interactive en attente bloque les nouvelles admissions batch          ║
+║  • Baux à expiration : un worker mort ne garde pas ses places                     ║
+║  • Fallback in-memory (dev, tests, Redis down) avec la même sémantique            ║
+╚════════════════════════════════════════════════════════════════════════════════════╝
+
+Remplace l'addition de sémaphores par process (MAX_CONCURRENT_DIGESTS,
+MAX_CONCURRENT_VIDEOS...) qui faisait croître le nombre de requêtes Mistral en vol
+avec le nombre de workers jusqu'aux tempêtes de 429.
+
+Usage:
+    from core.llm_limiter import llm_limiter, llm_priority
+
+    async with llm_limiter.slot("mistral:mistral-small-2603", priority="interactive") as slot:
+        response = await client.post(...)
+        slot.observe(response.status_code)
+
+    # Travail de fond : toutes les acquisitions du contexte (et des tâches
+    # créées depuis ce contexte) passent en batch
+    token = llm_priority.set("batch")
+    try:
+        ...
+    finally:
+        llm_priority.reset(token)
+"""
+
+import asyncio
+import os
+import random
+import time
+import uuid
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Optional
+
+from core.logging import logger
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Configuration
+# ═══════════════════════════════════════════════════════════════════════════════
+
+LIMITER_KEY_PREFIX = "deepsight:llm_limit"
+LLM_LIMITER_ENABLED = os.environ.get("LLM_LIMITER_ENABLED", "true").lower() == "true"
+
+PRIORITIES = ("interactive", "standard", "batch")
+
+# Priorité des appels LLM du contexte courant (chat → interactive, playlists → batch)
+llm_priority: ContextVar[str] = ContextVar("llm_priority", default="standard")
+
+
+@dataclass(frozen=True)
+class LimiterPolicy:
+    """Paramètres AIMD d'un modèle."""
+
+    initial_limit: float = float(os.environ.get("LLM_LIMIT_INITIAL", "8"))
+    min_limit: float = float(os.environ.get("LLM_LIMIT_MIN", "2"))
+    max_limit: float = float(os.environ.get("LLM_LIMIT_MAX", "32"))
+    backoff: float = 0.5  # décroissance multiplicative
+    decrease_cooldown_s: float = 2.0  # une seule décroissance par rafale de 429
+    slow_ratio: float = 2.5  # latence > ratio × EWMA → signal de saturation
+    slow_floor_s: float = 5.0  # ... seulement au-delà de ce plancher
+    ewma_alpha: float = 0.2
+    lease_ttl_s: float = 300.0  # > timeout max d'un appel LLM (180s)
+    # Part de la limite accessible à chaque classe
+    shares: Dict[str, float] = field(default_factory=lambda: {"interactive": 1.0, "standard": 0.8, "batch": 0.5})
+    # Attente max avant de passer outre (fail-open, compté dans les stats)
+    max_wait_s: Dict[str, float] = field(
+        default_factory=lambda: {"interactive": 15.0, "standard": 60.0, "batch": 300.0}
+    )
+
+
+DEFAULT_POLICY = LimiterPolicy()
+
+
+@dataclass
+class _LocalLimit:
+    """État local d'un modèle (autorité si Redis absent)."""
+
+    limit: float
+    leases: Dict[str, float] = field(default_factory=dict)  # token → expiration
+    waiters: Dict[str, float] = field(default_factory=dict)  # tokens interactive en attente
+    ewma_ms: Optional[float] = None
+    last_decrease: float = 0.0
+    decreases: int = 0
+
+
+@dataclass
+class _PriorityStats:
+    admitted: int = 0
+    waited: int = 0
+    wait_ms: float = 0.0
+    fail_open: int = 0
+    throttled: int = 0
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Scripts Lua (atomiques côté Redis)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# KEYS: state, leases, waiters — ARGV: now_ms, token, lease_ms, share, priority,
+#       initial_limit, waiter_ms
+# Retourne {admis (0/1), en vol, limite}
+_ACQUIRE_LUA = """
+local now = tonumber(ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+redis.call('ZREMRANGEBYSCORE', KEYS[3], '-inf', now)
+local limit = tonumber(redis.call('HGET', KEYS[1], 'limit') or ARGV[6])
+local in_flight = redis.call('ZCARD', KEYS[2])
+local cap = math.max(1, math.floor(limit * tonumber(ARGV[4])))
+local blocked = ARGV[5] == 'batch' and redis.call('ZCARD', KEYS[3]) > 0
+if in_flight < cap and not blocked then
+    redis.call('ZADD', KEYS[2], now + tonumber(ARGV[3]), ARGV[2])
+    redis.call('PEXPIRE', KEYS[2], ARGV[3])
+    redis.call('ZREM', KEYS[3], ARGV[2])
+    return {1, in_flight + 1, tostring(limit)}
+end
+if ARGV[5] == 'interactive' then
+    redis.call('ZADD', KEYS[3], now + tonumber(ARGV[7]), ARGV[2])
+    redis.call('PEXPIRE', KEYS[3], ARGV[7])
+end
+return {0, in_flight, tostring(limit)}
+"""
+
+# KEYS: state, leases, waiters — ARGV: token, now_ms, signal, latency_ms (-1 = inconnue),
+#       initial, min, max, backoff, cooldown_ms, alpha, slow_ratio, slow_floor_ms, ttl_ms
+# Retourne {limite, signal retenu}
+_RELEASE_LUA = """
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('ZREM', KEYS[3], ARGV[1])
+local now = tonumber(ARGV[2])
+local signal = ARGV[3]
+local latency = tonumber(ARGV[4])
+local limit = tonumber(redis.call('HGET', KEYS[1], 'limit') or ARGV[5])
+if signal == 'ok' and latency >= 0 then
+    local ewma = tonumber(redis.call('HGET', KEYS[1], 'ewma_ms'))
+    if ewma and latency > ewma * tonumber(ARGV[11]) and latency > tonumber(ARGV[12]) then
+        signal = 'slow'
+    end
+    if ewma then
+        local alpha = tonumber(ARGV[10])
+        ewma = alpha * latency + (1 - alpha) * ewma
+    else
+        ewma = latency
+    end
+    redis.call('HSET', KEYS[1], 'ewma_ms', tostring(ewma))
+end
+if signal == 'ok' then
+    limit = math.min(tonumber(ARGV[7]), limit + 1 / limit)
+elseif signal == 'throttled' or signal == 'slow' then
+    local last = tonumber(redis.call('HGET', KEYS[1], 'last_decrease') or '0')
+    if now - last >= tonumber(ARGV[9]) then
+        limit = math.max(tonumber(ARGV[6]), limit * tonumber(ARGV[8]))
+        redis.call('HSET', KEYS[1], 'last_decrease', ARGV[2])
+        redis.call('HINCRBY', KEYS[1], 'decreases', 1)
+    end
+end
+redis.call('HSET', KEYS[1], 'limit', tostring(limit))
+redis.call('PEXPIRE', KEYS[1], ARGV[13])
+return {tostring(limit), signal}
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Limiteur
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class LimiterSlot:
+    """Place obtenue pour un appel ; ``observe`` transmet le verdict au limiteur."""
+
+    def __init__(self, model: str, priority: str, token: Optional[str]):
+        self.model = model
+        self.priority = priority
+        self.token = token
+        self.started = time.monotonic()
+        self.status_code: Optional[int] = None
+        self.latency_s: Optional[float] = None
+
+    def observe(self, status_code: int) -> None:
+        """Statut HTTP de l'appel (pour un stream : à la réception des headers)."""
+        self.status_code = status_code
+        self.latency_s = time.monotonic() - self.started
+
+    def signal(self, exc: Optional[BaseException]) -> str:
+        if self.status_code == 429:
+            return "throttled"
+        if exc is not None:
+            # 429 remonté en exception (SDK) ou timeout = saturation ; autres erreurs = neutre
+            if getattr(exc, "status_code", None) == 429 or "Timeout" in type(exc).__name__:
+                return "throttled"
+            return "neutral"
+        if self.status_code is not None and 200 <= self.status_code < 300:
+            return "ok"
+        return "neutral"
+
+
+class AdaptiveLimiter:
+    """Limite AIMD par modèle, partagée via Redis quand il est disponible."""
+
+    def __init__(self, redis: Any = None, policy: LimiterPolicy = DEFAULT_POLICY, enabled: bool = LLM_LIMITER_ENABLED):
+        self._redis_client = redis
+        self.policy = policy
+        self.enabled = enabled
+        self._local: Dict[str, _LocalLimit] = {}
+        self._stats: Dict[str, Dict[str, _PriorityStats]] = {}
+        self._redis_errors = 0
+
+    # ─── Redis ─────────────────────────────────────────────────────────────────
+
+    @property
+    def redis(self) -> Any:
+        if self._redis_client is not None:
+            return self._redis_client
+        try:
+            from core.cache import cache_service
+        except ImportError:
+            return None
+        return getattr(cache_service.backend, "redis", None)
+
+    @staticmethod
+    def _keys(model: str) -> tuple:
+        base = f"{LIMITER_KEY_PREFIX}:{model}"
+        return base, f"{base}:leases", f"{base}:waiters"
+
+    def _redis_failed(self, op: str, exc: Exception) -> None:
+        self._redis_errors += 1
+        if self._redis_errors == 1 or self._redis_errors % 100 == 0:
+            logger.warning("LLM limiter Redis error, using local state", op=op, error=str(exc)[:120])
+
+    def reset(self) -> None:
+        """Oublie l'état local et les stats (tests). N'efface pas Redis."""
+        self._local.clear()
+        self._stats.clear()
+
+    # ─── Acquisition ───────────────────────────────────────────────────────────
+
+    @asynccontextmanager
+    async def slot(self, model: str, priority: Optional[str] = None) -> AsyncIterator[LimiterSlot]:
+        """Réserve une place pour ``model`` le temps du bloc, puis ajuste la limite."""
+        priority = priority or llm_priority.get()
+        if priority not in PRIORITIES:
+            priority = "standard"
+        token = await self.acquire(model, priority)
+        slot = LimiterSlot(model, priority, token)
+        try:
+            yield slot
+        except BaseException as exc:
+            await self.release(model, token, slot.signal(exc), slot.latency_s, priority)
+            raise
+        await self.release(model, token, slot.signal(None), slot.latency_s, priority)
+
+    async def acquire(self, model: str, priority: str = "standard") -> Optional[str]:
+        """
+        Attend une place. Retourne le jeton du bail, ou None si le limiteur est
+        désactivé ou si l'attente dépasse ``max_wait_s`` (on laisse passer).
+        """
+        if not self.enabled:
+            return None
+        policy = self.policy
+        stats = self._stats_for(model, priority)
+        token = uuid.uuid4().hex
+        started = time.monotonic()
+        deadline = started + policy.max_wait_s.get(priority, 60.0)
+        # Les appels interactifs repassent plus souvent (latence perçue)
+        max_poll = 0.1 if priority == "interactive" else 0.5
+        attempt = 0
+        while True:
+            if await self._try_acquire(model, token, priority):
+                waited = time.monotonic() - started
+                stats.admitted += 1
+                if attempt:
+                    stats.waited += 1
+                    stats.wait_ms += waited * 1000
+                return token
+            if time.monotonic() >= deadline:
+                stats.fail_open += 1
+                await self._drop_waiter(model, token)
+                logger.warning("LLM limiter wait exceeded, proceeding", model=model, priority=priority)
+                return None
+            attempt += 1
+            await asyncio.sleep(min(max_poll, 0.02 * 2**attempt) * random.uniform(0.5, 1.0))
+
+    async def release(
+        self,
+        model: str,
+        token: Optional[str],
+        signal: str,
+        latency_s: Optional[float] = None,
+        priority: str = "standard",
+    ) -> None:
+        """Libère le bail et applique le signal AIMD (ok / throttled / neutral)."""
+        if not self.enabled:
+            return
+        if signal == "throttled":
+            self._stats_for(model, priority).throttled += 1
+        if token is None and signal == "neutral":
+            return
+        latency_ms = latency_s * 1000 if latency_s is not None else None
+        redis = self.redis
+        if redis is not None:
+            policy = self.policy
+            try:
+                await redis.eval(
+                    _RELEASE_LUA,
+                    3,
+                    *self._keys(model),
+                    token or "",
+                    int(time.time() * 1000),
+                    signal,
+                    -1 if latency_ms is None else round(latency_ms, 3),
+                    policy.initial_limit,
+                    policy.min_limit,
+                    policy.max_limit,
+                    policy.backoff,
+                    int(policy.decrease_cooldown_s * 1000),
+                    policy.ewma_alpha,
+                    policy.slow_ratio,
+                    int(policy.slow_floor_s * 1000),
+                    int(policy.lease_ttl_s * 4 * 1000),
+                )
+                return
+            except Exception as e:
+                self._redis_failed("release", e)
+        self._release_local(model, token, signal, latency_ms, time.time())
+
+    async def _try_acquire(self, model: str, token: str, priority: str) -> bool:
+        policy = self.policy
+        share = policy.shares.get(priority, 1.0)
+        redis = self.redis
+        if redis is not None:
+            try:
+                admitted, _in_flight, _limit = await redis.eval(
+                    _ACQUIRE_LUA,
+                    3,
+                    *self._keys(model),
+                    int(time.time() * 1000),
+                    token,
+                    int(policy.lease_ttl_s * 1000),
+                    share,
+                    priority,
+                    policy.initial_limit,
+                    1000,  # un waiter non rafraîchi (appelant parti) expire vite
+                )
+                return int(admitted) == 1
+            except Exception as e:
+                self._redis_failed("acquire", e)
+        return self._try_acquire_local(model, token, priority, share, time.time())
+
+    async def _drop_waiter(self, model: str, token: str) -> None:
+        self._local_state(model).waiters.pop(token, None)
+        redis = self.redis
+        if redis is None:
+            return
+        try:
+            await redis.zrem(self._keys(model)[2], token)
+        except Exception as e:
+            self._redis_failed("drop_waiter", e)
+
+    # ─── État local ────────────────────────────────────────────────────────────
+
+    def _local_state(self, model: str) -> _LocalLimit:
+        state = self._local.get(model)
+        if state is None:
+            state = self._local[model] = _LocalLimit(limit=self.policy.initial_limit)
+        return state
+
+    def _stats_for(self, model: str, priority: str) -> _PriorityStats:
+        per_model = self._stats.setdefault(model, {})
+        stats = per_model.get(priority)
+        if stats is None:
+            stats = per_model[priority] = _PriorityStats()
+        return stats
+
+    def _try_acquire_local(self, model: str, token: str, priority: str, share: float, now: float) -> bool:
+        st = self._local_state(model)
+        for pool in (st.leases, st.waiters):
+            for key in [k for k, expires in pool.items() if expires <= now]:
+                del pool[key]
+        cap = max(1, int(st.limit * share))
+        blocked = priority == "batch" and bool(st.waiters)
+        if len(st.leases) < cap and not blocked:
+            st.leases[token] = now + self.policy.lease_ttl_s
+            st.waiters.pop(token, None)
+            return True
+        if priority == "interactive":
+            st.waiters[token] = now + 1.0
+        return False
+
+    def _release_local(
+        self, model: str, token: Optional[str], signal: str, latency_ms: Optional[float], now: float
+    ) -> None:
+        policy = self.policy
+        st = self._local_state(model)
+        if token:
+            st.leases.pop(token, None)
+            st.waiters.pop(token, None)
+        if signal == "ok" and latency_ms is not None:
+            ewma = st.ewma_ms
+            if ewma and latency_ms > ewma * policy.slow_ratio and latency_ms > policy.slow_floor_s * 1000:
+                signal = "slow"
+            st.ewma_ms = latency_ms if ewma is None else policy.ewma_alpha * latency_ms + (1 - policy.ewma_alpha) * ewma
+        if signal == "ok":
+            st.limit = min(policy.max_limit, st.limit + 1 / st.limit)
+        elif signal in ("throttled", "slow") and now - st.last_decrease >= policy.decrease_cooldown_s:
+            st.limit = max(policy.min_limit, st.limit * policy.backoff)
+            st.last_decrease = now
+            st.decreases += 1
+
+    # ─── Observabilité ─────────────────────────────────────────────────────────
+
+    async def snapshot(self) -> Dict[str, dict]:
+        """Limite, requêtes en vol et stats par priorité, pour chaque modèle vu."""
+        models = set(self._local) | set(self._stats)
+        result: Dict[str, dict] = {}
+        redis = self.redis
+        for model in sorted(models):
+            st = self._local_state(model)
+            entry = {
+                "limit": round(st.limit, 2),
+                "in_flight": len(st.leases),
+                "latency_ewma_ms": round(st.ewma_ms, 1) if st.ewma_ms else None,
+                "decreases": st.decreases,
+                "scope": "process",
+            }
+            if redis is not None:
+                try:
+                    state_key, leases_key, _ = self._keys(model)
+                    limit, ewma, decreases = await redis.hmget(state_key, "limit", "ewma_ms", "decreases")
+                    in_flight = await redis.zcount(leases_key, int(time.time() * 1000), "+inf")
+                    entry.update(
+                        limit=round(float(limit), 2) if limit else self.policy.initial_limit,
+                        in_flight=int(in_flight),
+                        latency_ewma_ms=round(float(ewma), 1) if ewma else None,
+                        decreases=int(decreases or 0),
+                        scope="cluster",
+                    )
+                except Exception as e:
+                    self._redis_failed("snapshot", e)
+            entry["priorities"] = {
+                priority: {
+                    "admitted": s.admitted,
+                    "waited": s.waited,
+                    "avg_wait_ms": round(s.wait_ms / s.waited, 1) if s.waited else 0.0,
+                    "fail_open": s.fail_open,
+                    "throttled": s.throttled,
+                }
+                for priority, s in sorted(self._stats.get(model, {}).items())
+            }
+            result[model] = entry
+        return result
+
+
+llm_limiter = AdaptiveLimiter()
+
+
+async def get_llm_limiter_snapshot() -> Dict[str, dict]:
+    return await llm_limiter.snapshot()
+
+
+__all__ = [
+    "AdaptiveLimiter",
+    "LimiterPolicy",
+    "LimiterSlot",
+    "PRIORITIES",
+    "get_llm_limiter_snapshot",
+    "llm_limiter",
+    "llm_priority",
+]
@@ -6,6 +6,10 @@ Fallback order:
   2. Other Mistral models (ascending tier)
   3. DeepSeek (last resort, non-EU)
 
+Every attempt first acquires a slot from core.llm_limiter (cluster-wide AIMD
+concurrency per model). ``priority`` ("interactive" | "standard" | "batch")
+defaults to the ``llm_priority`` context variable.
+
 Usage:
     from core.llm_provider import llm_complete, llm_complete_stream
 
@@ -30,12 +34,14 @@ Usage:
 
 import asyncio
 import json
-import time
 from dataclasses import dataclass
 from typing import Any, AsyncGenerator, Dict, List, Optional
 
 import httpx
 
+from core.http_client import get_provider_client, provider_client
+from core.llm_limiter import llm_limiter
+from core.provider_health import ProviderCircuit, provider_health
 from core.config import (
     get_mistral_key,
     get_deepseek_key,
@@ -51,6 +57,9 @@ from core.config import (
 MISTRAL_API_URL = "https://api.mistral.ai/v1/chat/completions"
 DEEPSEEK_API_URL = "https://api.deepseek.com/v1/chat/completions"
 
+# Pool HTTP (core.http_client.PROVIDER_POOLS) associé à chaque endpoint
+_POOL_BY_URL = {MISTRAL_API_URL: "mistral", DEEPSEEK_API_URL: "deepseek"}
+
 # Mistral models ordered by tier (ascending) for fallback
 MISTRAL_FALLBACK_ORDER = [
     "mistral-small-2603",
@@ -64,9 +73,6 @@ MAX_RETRIES_PER_MODEL = 1
 # Backoff base (seconds) — exponential: base * 2^attempt
 BACKOFF_BASE = 2.0
 
-# Global circuit breaker state per model
-_circuit_breakers: Dict[str, "CircuitBreaker"] = {}
-
 
 # =============================================================================
 # DATA CLASSES
@@ -87,39 +93,9 @@ class LLMResult:
     attempts: int = 1
 
 
-@dataclass
-class CircuitBreaker:
-    """Simple circuit breaker per model to avoid hammering a rate-limited model."""
-
-    failures: int = 0
-    last_failure: float = 0.0
-    cooldown: float = 30.0  # seconds to wait after consecutive failures
-
-    def is_open(self) -> bool:
-        """Returns True if circuit is open (model should be skipped)."""
-        if self.failures < 3:
-            return False
-        elapsed = time.time() - self.last_failure
-        if elapsed > self.cooldown:
-            # Reset after cooldown
-            self.failures = 0
-            return False
-        return True
-
-    def record_failure(self):
-        self.failures += 1
-        self.last_failure = time.time()
-        # Increase cooldown with more failures (max 5 min)
-        self.cooldown = min(300, 30 * (2 ** (self.failures - 3)))
-
-    def record_success(self):
-        self.failures = 0
-
-
-def _get_circuit_breaker(model: str) -> CircuitBreaker:
-    if model not in _circuit_breakers:
-        _circuit_breakers[model] = CircuitBreaker()
-    return _circuit_breakers[model]
+def _get_circuit_breaker(model: str) -> ProviderCircuit:
+    """Circuit per "provider:model", shared by every worker (core.provider_health)."""
+    return provider_health.circuit(f"llm:{model}")
 
 
 # =============================================================================
@@ -148,7 +124,7 @@ async def _call_api(
     }
     if json_mode:
         payload["response_format"] = {"type": "json_object"}
-    async with httpx.AsyncClient(timeout=timeout) as client:
+    async with provider_client(_POOL_BY_URL.get(url, url), timeout=timeout) as client:
         return await client.post(
             url,
             headers={
@@ -156,6 +132,7 @@ async def _call_api(
                 "Content-Type": "application/json",
             },
             json=payload,
+            timeout=timeout,
         )
 
 
@@ -168,8 +145,12 @@ async def _call_api_stream(
     temperature: float = 0.3,
     timeout: float = 180,
 ) -> httpx.Response:
-    """Low-level streaming HTTP call. Returns the response for iteration."""
-    client = httpx.AsyncClient(timeout=timeout)
+    """Low-level streaming HTTP call. Returns the response for iteration.
+
+    Le caller ferme la réponse puis ``release_provider_client(response._client)``
+    (no-op si le client vient du pool du provider).
+    """
+    client = get_provider_client(_POOL_BY_URL.get(url, url), timeout=timeout)
     response = await client.send(
         client.build_request(
             "POST",
@@ -185,6 +166,7 @@ async def _call_api_stream(
                 "temperature": temperature,
                 "stream": True,
             },
+            timeout=timeout,
         ),
         stream=True,
     )
@@ -250,6 +232,7 @@ async def llm_complete(
     allowed_models: Optional[List[str]] = None,
     disable_fallback: bool = False,
     json_mode: bool = False,
+    priority: Optional[str] = None,
 ) -> Optional[LLMResult]:
     """
     Call an LLM with automatic fallback on 429/5xx errors.
@@ -263,6 +246,7 @@ async def llm_complete(
         allowed_models: Restrict fallback to these Mistral models only
         disable_fallback: If True, only try the requested model
         json_mode: If True, request JSON-only output (sets response_format=json_object)
+        priority: Limiter class ("interactive" | "standard" | "batch"), default from llm_priority
 
     Returns:
         LLMResult with content and metadata, or None on total failure
@@ -292,7 +276,7 @@ async def llm_complete(
 
         # Check circuit breaker
         cb = _get_circuit_breaker(f"{provider}:{current_model}")
-        if cb.is_open():
+        if not await cb.allow():
             print(f"⚡ [LLM] Circuit breaker OPEN for {provider}:{current_model}, skipping", flush=True)
             continue
 
@@ -302,16 +286,18 @@ async def llm_complete(
                 if is_fallback and attempt == 0:
                     print(f"🔄 [LLM] Fallback → {provider}:{current_model}", flush=True)
 
-                response = await _call_api(
-                    url=url,
-                    api_key=api_key,
-                    model=current_model,
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                    timeout=timeout,
-                    json_mode=json_mode,
-                )
+                async with llm_limiter.slot(f"{provider}:{current_model}", priority) as slot:
+                    response = await _call_api(
+                        url=url,
+                        api_key=api_key,
+                        model=current_model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                        timeout=timeout,
+                        json_mode=json_mode,
+                    )
+                    slot.observe(response.status_code)
 
                 if response.status_code == 200:
                     data = response.json()
@@ -398,11 +384,13 @@ async def llm_complete_stream(
     timeout: float = 180,
     allowed_models: Optional[List[str]] = None,
     disable_fallback: bool = False,
+    priority: Optional[str] = None,
 ) -> AsyncGenerator[str, None]:
     """
     Stream LLM response with auto-fallback.
     Fallback happens BEFORE streaming starts (on connection error / 429).
     Once streaming begins on a model, that model is committed.
+    The limiter slot is held for the whole stream.
 
     Yields:
         Content chunks as strings
@@ -429,74 +417,77 @@ async def llm_complete_stream(
             continue
 
         cb = _get_circuit_breaker(f"{provider}:{current_model}")
-        if cb.is_open():
+        if not await cb.allow():
             continue
 
         try:
             if is_fallback:
                 print(f"🔄 [LLM-STREAM] Fallback → {provider}:{current_model}", flush=True)
 
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                async with client.stream(
-                    "POST",
-                    url,
-                    headers={
-                        "Authorization": f"Bearer {api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "model": current_model,
-                        "messages": messages,
-                        "max_tokens": max_tokens,
-                        "temperature": temperature,
-                        "stream": True,
-                    },
-                ) as response:
-                    if response.status_code == 429:
-                        cb.record_failure()
-                        print(
-                            f"⏳ [LLM-STREAM] {provider}:{current_model} 429, trying next...",
-                            flush=True,
-                        )
-                        await response.aread()  # consume body
-                        continue  # try next model
-
-                    if response.status_code >= 500:
-                        cb.record_failure()
-                        print(
-                            f"❌ [LLM-STREAM] {provider}:{current_model} {response.status_code}",
-                            flush=True,
-                        )
-                        await response.aread()
-                        continue
-
-                    if response.status_code != 200:
-                        body = await response.aread()
-                        print(
-                            f"❌ [LLM-STREAM] {provider}:{current_model} {response.status_code}: {body.decode()[:200]}",
-                            flush=True,
-                        )
-                        yield f"Error: API returned {response.status_code}"
-                        return
-
-                    # Success — stream chunks
-                    cb.record_success()
-                    if is_fallback:
-                        print(f"✅ [LLM-STREAM] Streaming from fallback {provider}:{current_model}", flush=True)
-
-                    async for line in response.aiter_lines():
-                        if line.startswith("data: "):
-                            data = line[6:]
-                            if data == "[DONE]":
-                                return
-                            try:
-                                chunk = json.loads(data)
-                                content = chunk["choices"][0]["delta"].get("content", "")
-                                if content:
-                                    yield content
-                            except (json.JSONDecodeError, KeyError, IndexError):
-                                continue
-                    return  # Stream completed successfully
+            async with llm_limiter.slot(f"{provider}:{current_model}", priority) as slot:
+                async with provider_client(provider, timeout=timeout) as client:
+                    async with client.stream(
+                        "POST",
+                        url,
+                        headers={
+                            "Authorization": f"Bearer {api_key}",
+                            "Content-Type": "application/json",
+                        },
+                        json={
+                            "model": current_model,
+                            "messages": messages,
+                            "max_tokens": max_tokens,
+                            "temperature": temperature,
+                            "stream": True,
+                        },
+                        timeout=timeout,
+                    ) as response:
+                        slot.observe(response.status_code)
+                        if response.status_code == 429:
+                            cb.record_failure()
+                            print(
+                                f"⏳ [LLM-STREAM] {provider}:{current_model} 429, trying next...",
+                                flush=True,
+                            )
+                            await response.aread()  # consume body
+                            continue  # try next model
+
+                        if response.status_code >= 500:
+                            cb.record_failure()
+                            print(
+                                f"❌ [LLM-STREAM] {provider}:{current_model} {response.status_code}",
+                                flush=True,
+                            )
+                            await response.aread()
+                            continue
+
+                        if response.status_code != 200:
+                            body = await response.aread()
+                            print(
+                                f"❌ [LLM-STREAM] {provider}:{current_model} {response.status_code}: {body.decode()[:200]}",
+                                flush=True,
+                            )
+                            yield f"Error: API returned {response.status_code}"
+                            return
+
+                        # Success — stream chunks
+                        cb.record_success()
+                        if is_fallback:
+                            print(f"✅ [LLM-STREAM] Streaming from fallback {provider}:{current_model}", flush=True)
+
+                        async for line in response.aiter_lines():
+                            if line.startswith("data: "):
+                                data = line[6:]
+                                if data == "[DONE]":
+                                    return
+                                try:
+                                    chunk = json.loads(data)
+                                    content = chunk["choices"][0]["delta"].get("content", "")
+                                    if content:
+                                        yield content
+                                except (json.JSONDecodeError, KeyError, IndexError):
+                                    continue
+                        return  # Stream completed successfully
 
         except httpx.TimeoutException:
             cb.record_failure()
@@ -1,18 +1,25 @@
 """
 ╔════════════════════════════════════════════════════════════════════════════════════╗
-║  📊 LOGGING MODULE v1.0 — Logging Structuré pour Deep Sight                        ║
+║  📊 LOGGING MODULE v1.1 — Logging Structuré pour Deep Sight                        ║
 ╠════════════════════════════════════════════════════════════════════════════════════╣
 ║  • Logs JSON structurés pour parsing facile                                        ║
 ║  • Contexte automatique (user_id, request_id, etc.)                               ║
 ║  • Niveaux: DEBUG, INFO, WARNING, ERROR, CRITICAL                                 ║
 ║  • Compatible avec Datadog, Grafana, ELK Stack                                    ║
+║  • v1.1: écriture hors event loop (QueueHandler + thread listener unique)         ║
+║  • v1.1: échantillonnage optionnel des logs DEBUG (LOG_DEBUG_SAMPLE_RATE)         ║
 ╚════════════════════════════════════════════════════════════════════════════════════╝
 """
 
 import os
 import sys
 import json
+import time
+import queue
+import atexit
 import logging
+import logging.handlers
+import threading
 import traceback
 from datetime import datetime
 from typing import Optional
@@ -38,6 +45,23 @@ ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
 SERVICE_NAME = "deepsight-api"
 VERSION = os.getenv("VERSION", "1.0.0")
 
+# Écriture asynchrone : l'appelant (event loop) ne fait qu'un put_nowait, le
+# formatage JSON et le write+flush stdout/Axiom ont lieu sur un thread dédié.
+LOG_QUEUE_ENABLED = os.getenv("LOG_QUEUE_ENABLED", "true").lower() == "true"
+LOG_QUEUE_MAXSIZE = int(os.getenv("LOG_QUEUE_MAXSIZE", "20000"))
+# Fraction des records DEBUG conservés (1.0 = tous) — bavardage par chunk/segment
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))
+
+
+def _record_context(record: logging.LogRecord) -> tuple:
+    """
+    Contexte de requête d'un record : capturé à l'émission quand il passe par
+    la file (le thread listener ne voit pas les ContextVar de l'appelant).
+    """
+    if getattr(record, "context_captured", False):
+        return record.request_id, record.user_id, record.user_email
+    return request_id_var.get(), user_id_var.get(), user_email_var.get()
+
 
 class JSONFormatter(logging.Formatter):
     """
@@ -58,7 +82,7 @@ class JSONFormatter(logging.Formatter):
 
     def format(self, record: logging.LogRecord) -> str:
         log_data = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": datetime.utcfromtimestamp(record.created).isoformat() + "Z",
             "level": record.levelname,
             "service": SERVICE_NAME,
             "environment": ENVIRONMENT,
@@ -68,15 +92,13 @@ class JSONFormatter(logging.Formatter):
         }
 
         # Ajouter le contexte de requête
-        request_id = request_id_var.get()
+        request_id, user_id, user_email = _record_context(record)
         if request_id:
             log_data["request_id"] = request_id
 
-        user_id = user_id_var.get()
         if user_id:
             log_data["user_id"] = user_id
 
-        user_email = user_email_var.get()
         if user_email:
             log_data["user_email"] = user_email
 
@@ -115,12 +137,11 @@ class ColoredFormatter(logging.Formatter):
         color = self.COLORS.get(record.levelname, self.RESET)
 
         # Format de base
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        timestamp = datetime.fromtimestamp(record.created).strftime("%H:%M:%S")
         level = f"{color}{self.BOLD}{record.levelname:8}{self.RESET}"
 
         # Contexte
-        request_id = request_id_var.get()
-        user_id = user_id_var.get()
+        request_id, user_id, _ = _record_context(record)
         ctx = ""
         if request_id:
             ctx += f" [{request_id[:8]}]"
@@ -143,6 +164,141 @@ class ColoredFormatter(logging.Formatter):
         return f"{timestamp} {level}{ctx} {message}{extra_str}{exc_str}"
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# 📬 FILE D'ATTENTE (QueueHandler + listener)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class DebugSamplingFilter(logging.Filter):
+    """
+    Ne garde qu'une fraction ``rate`` des records DEBUG (INFO+ passent tous).
+
+    Échantillonnage déterministe par crédit : rate=0.1 → exactement 1 record
+    DEBUG sur 10, sans tirage aléatoire.
+    """
+
+    def __init__(self, rate: float = LOG_DEBUG_SAMPLE_RATE):
+        super().__init__()
+        self.rate = max(0.0, min(1.0, rate))
+        self._credit = 0.0
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.rate >= 1.0:
+            return True
+        self._credit += self.rate
+        if self._credit >= 1.0:
+            self._credit -= 1.0
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler qui ne bloque jamais l'appelant :
+      • capture le contexte de requête (ContextVar) sur le record
+      • garde ``exc_info`` et ``extra_data`` (file in-process, pas de pickling)
+      • file pleine → record abandonné et compté, jamais d'attente
+    """
+
+    def __init__(self, log_queue: queue.Queue, sink: str):
+        super().__init__(log_queue)
+        self.sink = sink
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Message figé ici : les args peuvent muter une fois l'appel retourné
+        record.msg = record.getMessage()
+        record.args = None
+        record.request_id = request_id_var.get()
+        record.user_id = user_id_var.get()
+        record.user_email = user_email_var.get()
+        record.context_captured = True
+        record.sink = self.sink
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _LoggerRouter(logging.Handler):
+    """Handler unique du listener : renvoie chaque record aux sinks du logger qui l'a mis en file."""
+
+    def __init__(self):
+        super().__init__()
+        self.sinks: dict = {}
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        for handler in self.sinks.get(getattr(record, "sink", record.name), ()):
+            if record.levelno >= handler.level:
+                try:
+                    handler.handle(record)
+                except Exception:  # noqa: BLE001 — un sink cassé ne tue pas le thread
+                    pass
+        return True
+
+
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=LOG_QUEUE_MAXSIZE)
+_router = _LoggerRouter()
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handlers: list = []
+_listener_lock = threading.Lock()
+
+
+def _ensure_listener() -> None:
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            _listener = logging.handlers.QueueListener(_log_queue, _router)
+            _listener.start()
+            atexit.register(stop_log_listener)
+
+
+def _install_queue_handler(target: logging.Logger) -> None:
+    """Déplace les handlers de ``target`` derrière la file partagée."""
+    _router.sinks[target.name] = list(target.handlers)
+    handler = ContextQueueHandler(_log_queue, target.name)
+    handler.addFilter(DebugSamplingFilter())
+    target.handlers = [handler]
+    _queue_handlers.append(handler)
+    _ensure_listener()
+
+
+def flush_logs(timeout: float = 5.0) -> bool:
+    """Attend que le listener ait écrit tous les records en file (tests, shutdown)."""
+    deadline = time.monotonic() + timeout
+    while _log_queue.unfinished_tasks:
+        if _listener is None or time.monotonic() >= deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def stop_log_listener() -> None:
+    """Vide la file puis arrête le thread listener (atexit)."""
+    global _listener
+    with _listener_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def get_log_queue_stats() -> dict:
+    """Profondeur de file, records abandonnés (file pleine) et DEBUG échantillonnés."""
+    return {
+        "enabled": LOG_QUEUE_ENABLED,
+        "queue_depth": _log_queue.qsize(),
+        "queue_maxsize": LOG_QUEUE_MAXSIZE,
+        "dropped": sum(h.dropped for h in _queue_handlers),
+        "debug_sampled_out": sum(f.sampled_out for h in _queue_handlers for f in h.filters),
+        "listener_alive": _listener is not None,
+    }
+
+
 class DeepSightLogger:
     """
     Logger principal pour Deep Sight.
@@ -184,6 +340,11 @@ class DeepSightLogger:
             # de logging stdout/JSON reste 100% fonctionnelle.
             pass
 
+        # stdout + Axiom écrits par le thread listener : l'event loop ne paie
+        # plus qu'un put_nowait par log
+        if LOG_QUEUE_ENABLED:
+            _install_queue_handler(self._logger)
+
     def _log(self, level: int, message: str, exc_info: bool = False, **kwargs):
         """Log avec extras structurés."""
         record = self._logger.makeRecord(
@@ -356,6 +517,40 @@ db_logger = DeepSightLogger("deepsight.db")
 api_logger = DeepSightLogger("deepsight.api")
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# 🔌 LOGGERS STDLIB DES PACKAGES MÉTIER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Modules qui utilisent logging.getLogger(__name__) : sans handler, leurs INFO
+# étaient perdus. On les branche sur la même file et les mêmes formatters.
+STDLIB_LOGGER_NAMESPACES = ("chat", "transcripts", "videos")
+
+
+def install_stdlib_handlers(namespaces: tuple = STDLIB_LOGGER_NAMESPACES) -> None:
+    """
+    Ajoute un handler stdout (via la file si activée) aux loggers stdlib des
+    namespaces donnés. ``propagate`` reste à True : caplog & co continuent de
+    voir les records depuis la racine.
+    """
+    for name in namespaces:
+        target = logging.getLogger(name)
+        if target.handlers:
+            continue
+        target.setLevel(getattr(logging, LOG_LEVEL))
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setLevel(getattr(logging, LOG_LEVEL))
+        if LOG_FORMAT == "json" or ENVIRONMENT == "production":
+            handler.setFormatter(JSONFormatter())
+        else:
+            handler.setFormatter(ColoredFormatter())
+        target.addHandler(handler)
+        if LOG_QUEUE_ENABLED:
+            _install_queue_handler(target)
+
+
+install_stdlib_handlers()
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🎯 EXEMPLE D'UTILISATION
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -0,0 +1,256 @@
+"""
+╔════════════════════════════════════════════════════════════════════════════════════╗
+║  🎬 MEDIA PROCESS ENGINE — ffmpeg / ffprobe / yt-dlp sans bloquer l'event loop    ║
+╠════════════════════════════════════════════════════════════════════════════════════╣
+║  • asyncio.create_subprocess_exec : plus de subprocess.run dans un async def,     ║
+║    plus de run_in_executor ad hoc par module                                      ║
+║  • Concurrence bornée par outil (MEDIA_PROC_<TOOL>_CONCURRENCY)                   ║
+║  • stdin/stdout en pipe (ex: ffmpeg pipe:0 → pipe:1, sans fichiers temporaires)   ║
+║  • Timeout / annulation → kill du process (plus de ffmpeg orphelin)               ║
+║  • get_media_process_stats() : profondeur de file, en cours, latences par outil   ║
+╚════════════════════════════════════════════════════════════════════════════════════╝
+
+Usage:
+    from core.media_process import run_media_process, MediaProcessTimeout
+
+    result = await run_media_process(["ffprobe", "-v", "error", path], timeout=20)
+    if result.ok:
+        data = json.loads(result.text)
+
+    # Transcodage en pipe
+    result = await run_media_process(
+        ["ffmpeg", "-i", "pipe:0", "-f", "mp3", "pipe:1"], input=audio_bytes, timeout=120
+    )
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from core.logging import logger
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Configuration
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Process simultanés max par outil (par worker) — ffmpeg est CPU-bound,
+# yt-dlp surtout I/O (réseau via proxy)
+DEFAULT_CONCURRENCY = {
+    "ffmpeg": int(os.environ.get("MEDIA_PROC_FFMPEG_CONCURRENCY", "3")),
+    "ffprobe": int(os.environ.get("MEDIA_PROC_FFPROBE_CONCURRENCY", "8")),
+    "yt-dlp": int(os.environ.get("MEDIA_PROC_YTDLP_CONCURRENCY", "6")),
+}
+FALLBACK_CONCURRENCY = int(os.environ.get("MEDIA_PROC_DEFAULT_CONCURRENCY", "4"))
+
+
+class MediaProcessTimeout(asyncio.TimeoutError):
+    """Le process a dépassé son timeout et a été tué."""
+
+    def __init__(self, tool: str, timeout: float):
+        super().__init__(f"{tool} timed out after {timeout:.0f}s")
+        self.tool = tool
+        self.timeout = timeout
+
+
+@dataclass
+class ProcessResult:
+    """Résultat d'un process terminé (équivalent de subprocess.CompletedProcess)."""
+
+    returncode: int
+    stdout: bytes
+    stderr: bytes
+    wait_s: float = 0.0  # temps passé en file avant de lancer le process
+    run_s: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+    @property
+    def text(self) -> str:
+        return self.stdout.decode("utf-8", errors="replace")
+
+    @property
+    def stderr_text(self) -> str:
+        return self.stderr.decode("utf-8", errors="replace")
+
+
+@dataclass
+class _ToolStats:
+    queued: int = 0
+    running: int = 0
+    started: int = 0
+    completed: int = 0
+    failed: int = 0
+    timeouts: int = 0
+    cancelled: int = 0
+    max_queue_depth: int = 0
+    wait_s_sum: float = 0.0
+    run_s_sum: float = 0.0
+
+    def to_dict(self, limit: int) -> dict:
+        done = self.completed + self.failed
+        return {
+            "concurrency": limit,
+            "queue_depth": self.queued,
+            "running": self.running,
+            "max_queue_depth": self.max_queue_depth,
+            "started": self.started,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "avg_wait_ms": round(self.wait_s_sum / self.started * 1000, 1) if self.started else 0.0,
+            "avg_run_ms": round(self.run_s_sum / done * 1000, 1) if done else 0.0,
+        }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Engine
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class MediaProcessEngine:
+    """Lance les outils média en sous-process async, avec un sémaphore par outil."""
+
+    def __init__(self, concurrency: Optional[Dict[str, int]] = None, default_concurrency: int = FALLBACK_CONCURRENCY):
+        self.concurrency = dict(DEFAULT_CONCURRENCY if concurrency is None else concurrency)
+        self.default_concurrency = default_concurrency
+        self._stats: Dict[str, _ToolStats] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @staticmethod
+    def tool_name(cmd: Sequence[str]) -> str:
+        return Path(cmd[0]).name
+
+    def _limit(self, tool: str) -> int:
+        return max(1, self.concurrency.get(tool, self.default_concurrency))
+
+    def _semaphore(self, tool: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Nouvel event loop (tests, reload) : les sémaphores de l'ancien sont inutilisables
+            self._loop = loop
+            self._semaphores.clear()
+        sem = self._semaphores.get(tool)
+        if sem is None:
+            sem = self._semaphores[tool] = asyncio.Semaphore(self._limit(tool))
+        return sem
+
+    async def run(
+        self,
+        cmd: Sequence[str],
+        *,
+        timeout: float,
+        input: Optional[bytes] = None,
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+    ) -> ProcessResult:
+        """
+        Exécute ``cmd`` et retourne stdout/stderr (bytes).
+
+        Le timeout couvre l'exécution, pas l'attente en file. Au timeout ou à
+        l'annulation de l'appelant, le process est tué puis attendu (pas de zombie).
+
+        Raises:
+            MediaProcessTimeout: timeout dépassé (process tué)
+            FileNotFoundError: binaire absent
+        """
+        cmd = [str(part) for part in cmd]
+        tool = self.tool_name(cmd)
+        stats = self._stats.setdefault(tool, _ToolStats())
+        sem = self._semaphore(tool)
+
+        queued_at = time.monotonic()
+        stats.queued += 1
+        stats.max_queue_depth = max(stats.max_queue_depth, stats.queued)
+        try:
+            await sem.acquire()
+        finally:
+            stats.queued -= 1
+
+        started_at = time.monotonic()
+        stats.started += 1
+        stats.running += 1
+        stats.wait_s_sum += started_at - queued_at
+        proc = None
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd,
+                env=env,
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(input), timeout=timeout)
+            except asyncio.TimeoutError:
+                stats.timeouts += 1
+                stats.failed += 1
+                await self._kill(proc)
+                logger.warning("Media process timeout, killed", tool=tool, timeout=timeout)
+                raise MediaProcessTimeout(tool, timeout) from None
+            except asyncio.CancelledError:
+                stats.cancelled += 1
+                stats.failed += 1
+                await self._kill(proc)
+                raise
+
+            run_s = time.monotonic() - started_at
+            stats.run_s_sum += run_s
+            if proc.returncode == 0:
+                stats.completed += 1
+            else:
+                stats.failed += 1
+            return ProcessResult(proc.returncode, stdout or b"", stderr or b"", started_at - queued_at, run_s)
+        except (OSError, ValueError):
+            if proc is None:
+                stats.failed += 1
+            raise
+        finally:
+            stats.running -= 1
+            sem.release()
+
+    @staticmethod
+    async def _kill(proc: asyncio.subprocess.Process) -> None:
+        if proc.returncode is not None:
+            return
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            return
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=5)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            pass
+
+    def get_stats(self) -> dict:
+        return {tool: s.to_dict(self._limit(tool)) for tool, s in self._stats.items()}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Instance partagée
+# ═══════════════════════════════════════════════════════════════════════════════
+
+media_engine = MediaProcessEngine()
+
+
+async def run_media_process(
+    cmd: Sequence[str],
+    *,
+    timeout: float,
+    input: Optional[bytes] = None,
+    cwd: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+) -> ProcessResult:
+    """Raccourci vers ``media_engine.run``."""
+    return await media_engine.run(cmd, timeout=timeout, input=input, cwd=cwd, env=env)
+
+
+def get_media_process_stats() -> dict:
+    return media_engine.get_stats()
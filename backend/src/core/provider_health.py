@@ -0,0 +1,672 @@
+"""
+╔════════════════════════════════════════════════════════════════════════════════════╗
+║  🩺 PROVIDER HEALTH — Circuit breakers partagés entre workers (Redis)             ║
+╠════════════════════════════════════════════════════════════════════════════════════╣
+║  • Un seul registre pour tous les fallbacks : transcripts, instances              ║
+║    Invidious/Piped, modèles LLM, TTS, TikTok                                      ║
+║  • Fenêtre glissante (buckets) : ouverture sur taux d'échec, pas sur N échecs     ║
+║  • Half-open coordonné : un seul worker du cluster sonde le provider              ║
+║  • EWMA de latence par provider / instance → tri des instances                    ║
+║  • Fallback in-memory (dev, tests, Redis down) avec la même sémantique            ║
+║  • snapshot() : état exposé par GET /api/admin/providers/health                   ║
+╚════════════════════════════════════════════════════════════════════════════════════╝
+
+Les noms de providers sont de la forme ``<famille>:<id>`` (``llm:mistral:mistral-small-2603``,
+``instance:https://inv.nadeko.net``). La famille sélectionne la ``HealthPolicy``.
+
+Usage:
+    from core.provider_health import provider_health
+
+    cb = provider_health.circuit("transcript:supadata")
+    if await cb.allow():            # coordonné cluster (probe half-open unique)
+        started = time.monotonic()
+        try:
+            ...
+            cb.record_success(time.monotonic() - started)
+        except Exception:
+            cb.record_failure()
+
+    instances = provider_health.group("instance")
+    for url in await instances.order(INVIDIOUS_INSTANCES, by_latency=True):
+        ...
+
+Les méthodes synchrones (``can_execute``, ``record_*``) lisent/écrivent l'état local
+immédiatement et propagent vers Redis en tâche de fond : elles restent utilisables
+depuis du code sync (``is_available()``) sans ajouter de latence au chemin chaud.
+"""
+
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+from core.config import TRANSCRIPT_CONFIG
+from core.logging import logger
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Configuration
+# ═══════════════════════════════════════════════════════════════════════════════
+
+HEALTH_KEY_PREFIX = "deepsight:health"
+EWMA_ALPHA = float(os.environ.get("PROVIDER_HEALTH_EWMA_ALPHA", "0.3"))
+# Fréquence max de resynchronisation du miroir local depuis Redis (lectures sync)
+MIRROR_REFRESH_S = float(os.environ.get("PROVIDER_HEALTH_REFRESH_S", "2"))
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"  # Normal - provider actif
+    OPEN = "open"  # Provider désactivé temporairement
+    HALF_OPEN = "half_open"  # Sonde en cours
+
+
+@dataclass(frozen=True)
+class HealthPolicy:
+    """Seuils d'un circuit : fenêtre glissante, volume minimal, cooldown exponentiel."""
+
+    window_s: float = 300.0
+    buckets: int = 10
+    min_calls: int = 5  # volume minimal dans la fenêtre avant de juger le taux
+    failure_rate: float = 0.5
+    cooldown_s: float = 60.0
+    max_cooldown_s: float = 600.0  # le cooldown double à chaque sonde ratée
+    probe_timeout_s: float = 60.0  # une sonde sans verdict libère la place après ce délai
+
+    def cooldown_for(self, trips: int) -> float:
+        return min(self.max_cooldown_s, self.cooldown_s * (2 ** max(0, trips - 1)))
+
+
+DEFAULT_POLICY = HealthPolicy()
+
+
+@dataclass
+class _ProviderState:
+    """Miroir local d'un provider (autorité si Redis absent)."""
+
+    events: Deque[Tuple[float, bool]] = field(default_factory=deque)
+    state: CircuitState = CircuitState.CLOSED
+    opened_until: float = 0.0
+    trips: int = 0
+    probe_until: float = 0.0
+    ewma_ms: Optional[float] = None
+    last_failure: float = 0.0
+    window_successes: int = 0
+    window_failures: int = 0
+    synced_at: float = 0.0
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Scripts Lua (atomiques côté Redis)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# KEYS: state, window, providers, probe — ARGV: name, now_ms, bucket_ms, buckets, ok,
+#       latency_ms (-1 = inconnue), alpha, min_calls, failure_rate, cooldown_ms,
+#       max_cooldown_ms, ttl_ms
+_RECORD_LUA = """
+local now = tonumber(ARGV[2])
+local bucket_ms = tonumber(ARGV[3])
+local nb = tonumber(ARGV[4])
+local ok = ARGV[5] == '1'
+local bucket = math.floor(now / bucket_ms)
+redis.call('SADD', KEYS[3], ARGV[1])
+
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+local trips = tonumber(redis.call('HGET', KEYS[1], 'trips') or '0')
+local opened_until = tonumber(redis.call('HGET', KEYS[1], 'opened_until') or '0')
+
+local latency = tonumber(ARGV[6])
+if latency >= 0 then
+    local prev = tonumber(redis.call('HGET', KEYS[1], 'ewma_ms'))
+    if prev then
+        local alpha = tonumber(ARGV[7])
+        latency = alpha * latency + (1 - alpha) * prev
+    end
+    redis.call('HSET', KEYS[1], 'ewma_ms', tostring(latency))
+end
+
+if ok and state ~= 'closed' then
+    -- Sonde réussie : on repart d'une fenêtre vierge
+    redis.call('DEL', KEYS[2])
+    state, trips, opened_until = 'closed', 0, 0
+end
+redis.call('HINCRBY', KEYS[2], bucket .. (ok and ':s' or ':f'), 1)
+redis.call('PEXPIRE', KEYS[2], bucket_ms * (nb + 1))
+
+local s, f = 0, 0
+local fields = redis.call('HGETALL', KEYS[2])
+for i = 1, #fields, 2 do
+    local sep = string.find(fields[i], ':')
+    local b = tonumber(string.sub(fields[i], 1, sep - 1))
+    if b <= bucket - nb then
+        redis.call('HDEL', KEYS[2], fields[i])
+    elseif string.sub(fields[i], sep + 1) == 's' then
+        s = s + tonumber(fields[i + 1])
+    else
+        f = f + tonumber(fields[i + 1])
+    end
+end
+
+if not ok then
+    redis.call('HSET', KEYS[1], 'last_failure', ARGV[2])
+    local total = s + f
+    -- Sonde ratée, ou seuil atteint. Un échec tardif (circuit déjà ouvert) ne rallonge rien.
+    if state == 'half_open' or (state == 'closed' and total >= tonumber(ARGV[8]) and f / total >= tonumber(ARGV[9])) then
+        trips = trips + 1
+        local cooldown = math.floor(math.min(tonumber(ARGV[11]), tonumber(ARGV[10]) * 2 ^ (trips - 1)))
+        state, opened_until = 'open', now + cooldown
+    end
+end
+
+redis.call('HSET', KEYS[1], 'state', state, 'trips', trips, 'opened_until', opened_until)
+redis.call('PEXPIRE', KEYS[1], ARGV[12])
+if state ~= 'half_open' then
+    redis.call('DEL', KEYS[4])
+end
+return {state, tostring(opened_until), trips, s, f, redis.call('HGET', KEYS[1], 'ewma_ms') or ''}
+"""
+
+# KEYS: state, probe — ARGV: now_ms, probe_ttl_ms, token
+# Retourne 1 (fermé), 2 (ce worker est la sonde), 0 (refusé)
+_ALLOW_LUA = """
+local state = redis.call('HGET', KEYS[1], 'state')
+if not state or state == 'closed' then
+    return 1
+end
+local opened_until = tonumber(redis.call('HGET', KEYS[1], 'opened_until') or '0')
+if state == 'open' and tonumber(ARGV[1]) < opened_until then
+    return 0
+end
+if redis.call('SET', KEYS[2], ARGV[3], 'NX', 'PX', ARGV[2]) then
+    redis.call('HSET', KEYS[1], 'state', 'half_open')
+    return 2
+end
+return 0
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Registre
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class ProviderHealthRegistry:
+    """État de santé des providers, partagé via Redis quand il est disponible."""
+
+    def __init__(self, redis: Any = None):
+        self._redis_client = redis
+        self._policies: Dict[str, HealthPolicy] = {}
+        self._states: Dict[str, _ProviderState] = {}
+        self._circuits: Dict[str, "ProviderCircuit"] = {}
+        self._pending: Set[asyncio.Task] = set()
+        self._redis_errors = 0
+
+    # ─── Configuration ─────────────────────────────────────────────────────────
+
+    def configure(self, family: str, policy: HealthPolicy) -> None:
+        """Associe une politique à une famille de providers (préfixe avant ``:``)."""
+        self._policies[family] = policy
+
+    def policy_for(self, name: str) -> HealthPolicy:
+        return self._policies.get(name.split(":", 1)[0], DEFAULT_POLICY)
+
+    def circuit(self, name: str) -> "ProviderCircuit":
+        circuit = self._circuits.get(name)
+        if circuit is None:
+            circuit = self._circuits[name] = ProviderCircuit(self, name)
+        return circuit
+
+    def group(self, family: str, policy: Optional[HealthPolicy] = None) -> "ProviderGroup":
+        if policy is not None:
+            self.configure(family, policy)
+        return ProviderGroup(self, family)
+
+    def reset(self) -> None:
+        """Oublie l'état local (tests). N'efface pas Redis."""
+        self._states.clear()
+
+    # ─── Redis ─────────────────────────────────────────────────────────────────
+
+    @property
+    def redis(self) -> Any:
+        if self._redis_client is not None:
+            return self._redis_client
+        try:
+            from core.cache import cache_service
+        except ImportError:
+            return None
+        return getattr(cache_service.backend, "redis", None)
+
+    @staticmethod
+    def _key(name: str) -> str:
+        return f"{HEALTH_KEY_PREFIX}:{name}"
+
+    def _redis_failed(self, op: str, exc: Exception) -> None:
+        self._redis_errors += 1
+        if self._redis_errors == 1 or self._redis_errors % 100 == 0:
+            logger.warning("Provider health Redis error, using local state", op=op, error=str(exc)[:120])
+
+    def _spawn(self, coro) -> None:
+        try:
+            task = asyncio.get_running_loop().create_task(coro)
+        except RuntimeError:
+            coro.close()  # pas de loop (code sync pur) : l'état local suffit
+            return
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    # ─── État local ────────────────────────────────────────────────────────────
+
+    def _state(self, name: str) -> _ProviderState:
+        state = self._states.get(name)
+        if state is None:
+            state = self._states[name] = _ProviderState()
+        return state
+
+    def _prune(self, st: _ProviderState, policy: HealthPolicy, now: float) -> None:
+        while st.events and now - st.events[0][0] > policy.window_s:
+            st.events.popleft()
+        st.window_failures = sum(1 for _, ok in st.events if not ok)
+        st.window_successes = len(st.events) - st.window_failures
+
+    def _trip(self, name: str, st: _ProviderState, policy: HealthPolicy, now: float) -> None:
+        st.trips += 1
+        st.state = CircuitState.OPEN
+        st.opened_until = now + policy.cooldown_for(st.trips)
+        st.probe_until = 0.0
+        logger.warning(
+            "Provider circuit OPEN",
+            provider=name,
+            failures=st.window_failures,
+            calls=st.window_failures + st.window_successes,
+            cooldown_s=round(st.opened_until - now, 1),
+        )
+
+    def _record_local(self, name: str, ok: bool, latency_ms: Optional[float], now: float) -> None:
+        policy = self.policy_for(name)
+        st = self._state(name)
+        if latency_ms is not None:
+            st.ewma_ms = latency_ms if st.ewma_ms is None else EWMA_ALPHA * latency_ms + (1 - EWMA_ALPHA) * st.ewma_ms
+        if ok and st.state != CircuitState.CLOSED:
+            logger.info("Provider circuit CLOSED — service recovered", provider=name)
+            st.events.clear()
+            st.state, st.trips, st.opened_until, st.probe_until = CircuitState.CLOSED, 0, 0.0, 0.0
+        st.events.append((now, ok))
+        self._prune(st, policy, now)
+        if ok:
+            return
+        st.last_failure = now
+        total = st.window_failures + st.window_successes
+        if st.state == CircuitState.HALF_OPEN or (
+            st.state == CircuitState.CLOSED
+            and total >= policy.min_calls
+            and st.window_failures / total >= policy.failure_rate
+        ):
+            self._trip(name, st, policy, now)
+
+    def _allow_local(self, name: str, now: float, claim_probe: bool) -> bool:
+        st = self._states.get(name)
+        if st is None or st.state == CircuitState.CLOSED:
+            return True
+        if st.state == CircuitState.OPEN and now < st.opened_until:
+            return False
+        if not claim_probe:
+            return True
+        if st.probe_until > now:
+            return False  # sonde déjà en cours dans ce process
+        st.state = CircuitState.HALF_OPEN
+        st.probe_until = now + self.policy_for(name).probe_timeout_s
+        return True
+
+    def _adopt(self, name: str, state: str, opened_until_ms: float, trips: int, ewma: Any, now: float) -> None:
+        """Aligne le miroir local sur l'état cluster lu dans Redis."""
+        st = self._state(name)
+        st.state = CircuitState(state)
+        st.opened_until = opened_until_ms / 1000
+        st.trips = int(trips)
+        if ewma not in (None, ""):
+            st.ewma_ms = float(ewma)
+        st.synced_at = now
+
+    # ─── API ───────────────────────────────────────────────────────────────────
+
+    def can_execute(self, name: str) -> bool:
+        """Lecture sync du miroir local (pas de coordination de sonde)."""
+        now = time.time()
+        st = self._state(name)
+        if now - st.synced_at > MIRROR_REFRESH_S and self.redis is not None:
+            st.synced_at = now
+            self._spawn(self._refresh([name]))
+        return self._allow_local(name, now, claim_probe=False)
+
+    async def allow(self, name: str) -> bool:
+        """
+        Le provider peut-il être appelé ? En half-open, un seul appelant du cluster
+        obtient ``True`` (la sonde) jusqu'à son verdict ou ``probe_timeout_s``.
+        """
+        now = time.time()
+        redis = self.redis
+        if redis is None:
+            return self._allow_local(name, now, claim_probe=True)
+        key = self._key(name)
+        policy = self.policy_for(name)
+        try:
+            verdict = int(
+                await redis.eval(
+                    _ALLOW_LUA,
+                    2,
+                    key,
+                    f"{key}:probe",
+                    int(now * 1000),
+                    int(policy.probe_timeout_s * 1000),
+                    f"{os.getpid()}:{id(self)}",
+                )
+            )
+        except Exception as e:
+            self._redis_failed("allow", e)
+            return self._allow_local(name, now, claim_probe=True)
+        st = self._state(name)
+        st.synced_at = now
+        if verdict == 1:
+            if st.state != CircuitState.CLOSED:
+                st.state, st.opened_until = CircuitState.CLOSED, 0.0
+            return True
+        if verdict == 2:
+            st.state = CircuitState.HALF_OPEN
+            logger.info("Provider circuit HALF-OPEN — this worker probes", provider=name)
+            return True
+        if st.state == CircuitState.CLOSED:
+            st.state = CircuitState.OPEN
+        return False
+
+    def record(self, name: str, ok: bool, latency_s: Optional[float] = None) -> None:
+        """Enregistre un résultat : immédiat en local, propagé à Redis en tâche de fond."""
+        now = time.time()
+        latency_ms = latency_s * 1000 if latency_s is not None else None
+        self._record_local(name, ok, latency_ms, now)
+        if self.redis is not None:
+            self._spawn(self.record_shared(name, ok, latency_ms, now))
+
+    async def record_shared(self, name: str, ok: bool, latency_ms: Optional[float], now: float) -> None:
+        redis = self.redis
+        if redis is None:
+            return
+        key = self._key(name)
+        policy = self.policy_for(name)
+        bucket_ms = max(1, int(policy.window_s * 1000 / policy.buckets))
+        ttl_ms = int(max(policy.window_s, policy.max_cooldown_s) * 4 * 1000)
+        try:
+            state, opened_until, trips, _s, _f, ewma = await redis.eval(
+                _RECORD_LUA,
+                4,
+                key,
+                f"{key}:win",
+                f"{HEALTH_KEY_PREFIX}:providers",
+                f"{key}:probe",
+                name,
+                int(now * 1000),
+                bucket_ms,
+                policy.buckets,
+                "1" if ok else "0",
+                -1 if latency_ms is None else round(latency_ms, 3),
+                EWMA_ALPHA,
+                policy.min_calls,
+                policy.failure_rate,
+                int(policy.cooldown_s * 1000),
+                int(policy.max_cooldown_s * 1000),
+                ttl_ms,
+            )
+        except Exception as e:
+            self._redis_failed("record", e)
+            return
+        self._adopt(name, _decode(state), float(_decode(opened_until)), trips, _decode(ewma), now)
+
+    async def _refresh(self, names: Sequence[str]) -> None:
+        redis = self.redis
+        if redis is None or not names:
+            return
+        try:
+            pipe = redis.pipeline(transaction=False)
+            for name in names:
+                pipe.hmget(self._key(name), "state", "opened_until", "trips", "ewma_ms")
+            rows = await pipe.execute()
+        except Exception as e:
+            self._redis_failed("refresh", e)
+            return
+        now = time.time()
+        for name, (state, opened_until, trips, ewma) in zip(names, rows):
+            if state is None:
+                if name in self._states:
+                    self._states[name].synced_at = now
+                continue
+            self._adopt(name, _decode(state), float(_decode(opened_until) or 0), int(trips or 0), _decode(ewma), now)
+
+    async def order(
+        self, names: Sequence[str], *, by_latency: bool = False, shuffle: bool = False
+    ) -> List[str]:
+        """
+        Trie ``names`` pour un fallback : providers appelables d'abord (par EWMA de
+        latence croissante si ``by_latency``, latence inconnue en tête pour l'explorer),
+        circuits ouverts en dernier recours.
+        """
+        names = list(names)
+        await self._refresh(names)
+        if shuffle:
+            random.shuffle(names)
+        now = time.time()
+
+        def sort_key(name: str) -> Tuple[int, float]:
+            rank = 0 if self._allow_local(name, now, claim_probe=False) else 1
+            if not by_latency:
+                return rank, 0.0
+            st = self._states.get(name)
+            return rank, (st.ewma_ms or 0.0) if st is not None else 0.0
+
+        return sorted(names, key=sort_key)
+
+    def describe(self, name: str, now: Optional[float] = None) -> dict:
+        now = time.time() if now is None else now
+        st = self._state(name)
+        self._prune(st, self.policy_for(name), now)
+        calls = st.window_failures + st.window_successes
+        return {
+            "provider": name,
+            "state": st.state.value,
+            "failure_rate": round(st.window_failures / calls, 3) if calls else 0.0,
+            "window_calls": calls,
+            "window_failures": st.window_failures,
+            "trips": st.trips,
+            "retry_in_s": round(max(0.0, st.opened_until - now), 1) if st.state != CircuitState.CLOSED else 0.0,
+            "latency_ewma_ms": round(st.ewma_ms, 1) if st.ewma_ms is not None else None,
+        }
+
+    async def snapshot(self) -> dict:
+        """État de tous les providers connus (cluster si Redis, sinon ce worker)."""
+        names = set(self._states)
+        redis = self.redis
+        source = "local"
+        if redis is not None:
+            try:
+                shared = await self._snapshot_shared(redis)
+            except Exception as e:
+                self._redis_failed("snapshot", e)
+            else:
+                source = "redis"
+                for name in names - set(shared):
+                    shared[name] = self.describe(name)
+                return {"source": source, "providers": _sorted_providers(shared.values())}
+        return {"source": source, "providers": _sorted_providers(self.describe(n) for n in names)}
+
+    async def _snapshot_shared(self, redis: Any) -> Dict[str, dict]:
+        names = sorted(_decode(n) for n in await redis.smembers(f"{HEALTH_KEY_PREFIX}:providers"))
+        if not names:
+            return {}
+        pipe = redis.pipeline(transaction=False)
+        for name in names:
+            pipe.hgetall(self._key(name))
+            pipe.hgetall(f"{self._key(name)}:win")
+            pipe.exists(f"{self._key(name)}:probe")
+        rows = await pipe.execute()
+        now = time.time()
+        result: Dict[str, dict] = {}
+        for i, name in enumerate(names):
+            state_hash, window, probing = rows[3 * i], rows[3 * i + 1], rows[3 * i + 2]
+            if not state_hash:
+                continue  # expiré : plus d'appel depuis longtemps
+            state_hash = {_decode(k): _decode(v) for k, v in state_hash.items()}
+            policy = self.policy_for(name)
+            oldest = int(now * 1000 / max(1, int(policy.window_s * 1000 / policy.buckets))) - policy.buckets
+            s = f = 0
+            for field_name, count in window.items():
+                bucket, _, kind = _decode(field_name).partition(":")
+                if int(bucket) <= oldest:
+                    continue
+                if kind == "s":
+                    s += int(count)
+                else:
+                    f += int(count)
+            state = state_hash.get("state", "closed")
+            opened_until = float(state_hash.get("opened_until") or 0) / 1000
+            ewma = state_hash.get("ewma_ms")
+            result[name] = {
+                "provider": name,
+                "state": state,
+                "failure_rate": round(f / (s + f), 3) if s + f else 0.0,
+                "window_calls": s + f,
+                "window_failures": f,
+                "trips": int(state_hash.get("trips") or 0),
+                "retry_in_s": round(max(0.0, opened_until - now), 1) if state != "closed" else 0.0,
+                "latency_ewma_ms": round(float(ewma), 1) if ewma else None,
+                "probe_in_flight": bool(probing),
+            }
+        return result
+
+    async def close(self) -> None:
+        """Attend les écritures Redis en vol (shutdown)."""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+
+def _decode(value: Any) -> Any:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _sorted_providers(rows) -> List[dict]:
+    return sorted(rows, key=lambda r: r["provider"])
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Handles (API des anciens CircuitBreaker)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class ProviderCircuit:
+    """Circuit d'un provider — drop-in pour les anciens ``CircuitBreaker`` par module."""
+
+    def __init__(self, registry: ProviderHealthRegistry, name: str):
+        self.registry = registry
+        self.name = name
+
+    @property
+    def state(self) -> CircuitState:
+        return self.registry._state(self.name).state
+
+    @property
+    def failures(self) -> int:
+        return self.registry.describe(self.name)["window_failures"]
+
+    def can_execute(self) -> bool:
+        return self.registry.can_execute(self.name)
+
+    def is_open(self) -> bool:
+        return not self.registry.can_execute(self.name)
+
+    async def allow(self) -> bool:
+        return await self.registry.allow(self.name)
+
+    def record_success(self, latency_s: Optional[float] = None) -> None:
+        self.registry.record(self.name, True, latency_s)
+
+    def record_failure(self, latency_s: Optional[float] = None) -> None:
+        self.registry.record(self.name, False, latency_s)
+
+
+class ProviderGroup:
+    """Circuits d'une famille adressés par clé (méthodes d'extraction, instances)."""
+
+    def __init__(self, registry: ProviderHealthRegistry, family: str):
+        self.registry = registry
+        self.family = family
+
+    def _name(self, key: str) -> str:
+        return f"{self.family}:{key}"
+
+    def circuit(self, key: str) -> ProviderCircuit:
+        return self.registry.circuit(self._name(key))
+
+    def can_execute(self, key: str) -> bool:
+        return self.registry.can_execute(self._name(key))
+
+    async def allow(self, key: str) -> bool:
+        return await self.registry.allow(self._name(key))
+
+    def record_success(self, key: str, latency_s: Optional[float] = None) -> None:
+        self.registry.record(self._name(key), True, latency_s)
+
+    def record_failure(self, key: str, latency_s: Optional[float] = None) -> None:
+        self.registry.record(self._name(key), False, latency_s)
+
+    async def order(self, keys: Sequence[str], *, by_latency: bool = False, shuffle: bool = False) -> List[str]:
+        ordered = await self.registry.order(
+            [self._name(k) for k in keys], by_latency=by_latency, shuffle=shuffle
+        )
+        prefix_len = len(self.family) + 1
+        return [name[prefix_len:] for name in ordered]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Instance partagée + politiques par famille
+# ═══════════════════════════════════════════════════════════════════════════════
+
+provider_health = ProviderHealthRegistry()
+
+# Méthodes d'extraction de transcripts (youtube.py + ultra_resilient.py)
+provider_health.configure(
+    "transcript",
+    HealthPolicy(
+        min_calls=TRANSCRIPT_CONFIG.get("circuit_breaker_failure_threshold", 5),
+        cooldown_s=TRANSCRIPT_CONFIG.get("circuit_breaker_recovery_timeout", 300),
+        max_cooldown_s=2 * TRANSCRIPT_CONFIG.get("circuit_breaker_recovery_timeout", 300),
+        probe_timeout_s=180,
+    ),
+)
+# Instances Invidious / Piped : partagées par youtube.py et ultra_resilient.py
+provider_health.configure(
+    "instance",
+    HealthPolicy(
+        min_calls=TRANSCRIPT_CONFIG.get("instance_timeout_threshold", 3),
+        cooldown_s=TRANSCRIPT_CONFIG.get("health_check_interval", 600),
+        max_cooldown_s=3 * TRANSCRIPT_CONFIG.get("health_check_interval", 600),
+    ),
+)
+provider_health.configure("llm", HealthPolicy(min_calls=3, cooldown_s=30, max_cooldown_s=300, probe_timeout_s=180))
+provider_health.configure("tts", HealthPolicy(min_calls=3, cooldown_s=60, max_cooldown_s=600))
+provider_health.configure("stt", HealthPolicy(min_calls=3, cooldown_s=60, max_cooldown_s=600, probe_timeout_s=360))
+provider_health.configure("tiktok", HealthPolicy(min_calls=5, cooldown_s=300, max_cooldown_s=900))
+
+
+async def get_provider_health_snapshot() -> dict:
+    return await provider_health.snapshot()
+
+
+__all__ = [
+    "CircuitState",
+    "HealthPolicy",
+    "ProviderHealthRegistry",
+    "ProviderCircuit",
+    "ProviderGroup",
+    "provider_health",
+    "get_provider_health_snapshot",
+]
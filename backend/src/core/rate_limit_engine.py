@@ -0,0 +1,446 @@
+"""
+╔════════════════════════════════════════════════════════════════════════════════════╗
+║  🚦 RATE LIMIT ENGINE — Fenêtre glissante partagée entre workers (Redis + Lua)     ║
+╠════════════════════════════════════════════════════════════════════════════════════╣
+║  • Compteur de fenêtre glissante pondéré (fenêtre courante + précédente)           ║
+║  • Plusieurs règles par clé (burst 10s + minute, minute + jour...) vérifiées et    ║
+║    incrémentées en UN aller-retour Redis, atomique (script Lua)                    ║
+║  • Tout-ou-rien : une requête refusée ne consomme rien                             ║
+║  • Pré-fetch local de jetons pour les clés à fort QPS (lot borné, bail court)      ║
+║  • Fallback in-memory (dev, tests, Redis down) avec la même arithmétique           ║
+╚════════════════════════════════════════════════════════════════════════════════════╝
+
+Moteur commun de RateLimitMiddleware, de l'API publique (/api/v1), de
+core.security.check_rate_limit / check_ip_rate_limit et du GuestLimiter. Les
+compteurs ne dépendent pas de la limite : deux appelants peuvent lire la même
+clé avec des limites différentes (ex. check_rate_limit_for_auth, limite x2).
+
+Usage:
+    from core.rate_limit_engine import RateRule, rate_limit_engine
+
+    decision = await rate_limit_engine.hit(
+        "user:42", (RateRule("burst", 30, 10), RateRule("minute", 60, 60))
+    )
+    if not decision.allowed:
+        raise HTTPException(429, headers={"Retry-After": str(decision.retry_after_s)})
+
+    # Lecture sans consommer / enregistrement inconditionnel (quota a posteriori)
+    remaining = (await rate_limit_engine.peek("guest:1.2.3.4", rules)).remaining
+    await rate_limit_engine.hit("guest:1.2.3.4", rules, force=True)
+"""
+
+import math
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from core.logging import logger
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Configuration
+# ═══════════════════════════════════════════════════════════════════════════════
+
+RATE_LIMIT_KEY_PREFIX = "deepsight:rl"
+MAX_LOCAL_KEYS = int(os.environ.get("RATE_LIMIT_MAX_LOCAL_KEYS", "10000"))
+
+# Pré-fetch : au-delà de PREFETCH_MIN_QPS requêtes/s sur une clé dans ce worker,
+# on réserve un lot de jetons d'un coup et on les sert localement pendant
+# PREFETCH_TTL_S. Le lot est borné à PREFETCH_MAX_SHARE de la plus petite
+# limite : un worker ne peut pas accaparer la fenêtre. Les jetons non servis à
+# l'expiration du bail sont perdus (erreur du côté restrictif).
+PREFETCH_ENABLED = os.environ.get("RATE_LIMIT_PREFETCH_ENABLED", "true").lower() == "true"
+PREFETCH_MIN_QPS = float(os.environ.get("RATE_LIMIT_PREFETCH_MIN_QPS", "20"))
+PREFETCH_TTL_S = float(os.environ.get("RATE_LIMIT_PREFETCH_TTL_S", "0.5"))
+PREFETCH_MAX_BATCH = int(os.environ.get("RATE_LIMIT_PREFETCH_MAX_BATCH", "32"))
+PREFETCH_MAX_SHARE = float(os.environ.get("RATE_LIMIT_PREFETCH_MAX_SHARE", "0.1"))
+
+
+@dataclass(frozen=True)
+class RateRule:
+    """``limit`` requêtes par fenêtre glissante de ``window_s`` secondes."""
+
+    name: str
+    limit: int
+    window_s: float
+
+
+@dataclass
+class RateDecision:
+    """Résultat d'un ``hit`` / ``peek``."""
+
+    allowed: bool
+    limit: int  # limite de la règle la plus contraignante (moins de places restantes)
+    remaining: int  # places restantes sur cette règle
+    retry_after: float = 0.0  # secondes avant qu'une place se libère (si refusé)
+    reset_after: float = 0.0  # secondes avant la bascule de fenêtre de cette règle
+    rule: Optional[str] = None  # règle qui a refusé
+    remaining_by_rule: Dict[str, int] = field(default_factory=dict)
+    granted: int = 0  # jetons consommés par l'aller-retour partagé (lot de pré-fetch inclus)
+
+    @property
+    def retry_after_s(self) -> int:
+        """``retry_after`` arrondi pour les headers ``Retry-After`` (≥ 1)."""
+        return max(1, math.ceil(self.retry_after))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Script Lua (atomique côté Redis)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# KEYS: un hash par règle {index de fenêtre → compteur}
+# ARGV: now_ms, coût, force (0/1), puis (limite, fenêtre_ms) par règle
+# Retourne {accordé, retry_after_ms, reset_ms, règle refusante (0 = aucune), restant règle 1, ...}
+_SLIDING_WINDOW_LUA = """
+local now = tonumber(ARGV[1])
+local want = tonumber(ARGV[2])
+local force = ARGV[3] == '1'
+local granted = want
+local deny = 0
+local retry = 0
+local rules = {}
+for i = 1, #KEYS do
+    local limit = tonumber(ARGV[2 + 2 * i])
+    local window = tonumber(ARGV[3 + 2 * i])
+    local idx = math.floor(now / window)
+    local elapsed = now - idx * window
+    local counts = redis.call('HMGET', KEYS[i], idx, idx - 1)
+    local curr = tonumber(counts[1]) or 0
+    local prev = tonumber(counts[2]) or 0
+    local used = prev * (window - elapsed) / window + curr
+    rules[i] = {limit, window, idx, elapsed, used}
+    local fit = math.floor(limit - used + 1e-9)
+    if not force and want > 0 and fit < granted then
+        granted = math.max(fit, 0)
+        if fit < 1 then
+            if deny == 0 then deny = i end
+            local wait
+            if curr <= limit - 1 and prev > 0 then
+                wait = (window - elapsed) - (limit - 1 - curr) * window / prev
+            else
+                wait = (window - elapsed) + window * (1 - (limit - 1) / math.max(curr, 1))
+            end
+            retry = math.max(retry, wait)
+        end
+    end
+end
+if deny > 0 then granted = 0 end
+local out = {granted, math.ceil(retry), 0, deny}
+local reset = 0
+for i = 1, #KEYS do
+    local r = rules[i]
+    if granted > 0 then
+        redis.call('HINCRBY', KEYS[i], r[3], granted)
+        redis.call('HDEL', KEYS[i], r[3] - 2)
+        redis.call('PEXPIRE', KEYS[i], 2 * r[2] + 1000)
+    end
+    out[4 + i] = math.max(0, math.floor(r[1] - r[5] - granted + 1e-9))
+    reset = math.max(reset, r[2] - r[4])
+end
+out[3] = math.ceil(reset)
+return out
+"""
+
+
+def _sliding_window(
+    now_ms: float, want: int, force: bool, rules: Sequence[Tuple[int, float, int, int]]
+) -> Tuple[int, float, float, int, List[int]]:
+    """Même arithmétique que le script Lua, sur des compteurs déjà lus.
+
+    ``rules`` = (limite, fenêtre_ms, compteur courant, compteur précédent).
+    Retourne (accordé, retry_after_ms, reset_ms, règle refusante 1-based, restants).
+    """
+    granted = want
+    deny = 0
+    retry = 0.0
+    reset = 0.0
+    used_by_rule = []
+    for i, (limit, window, curr, prev) in enumerate(rules, start=1):
+        elapsed = now_ms - (now_ms // window) * window
+        used = prev * (window - elapsed) / window + curr
+        used_by_rule.append(used)
+        reset = max(reset, window - elapsed)
+        fit = math.floor(limit - used + 1e-9)
+        if not force and want > 0 and fit < granted:
+            granted = max(fit, 0)
+            if fit < 1:
+                deny = deny or i
+                if curr <= limit - 1 and prev > 0:
+                    wait = (window - elapsed) - (limit - 1 - curr) * window / prev
+                else:
+                    wait = (window - elapsed) + window * (1 - (limit - 1) / max(curr, 1))
+                retry = max(retry, wait)
+    if deny:
+        granted = 0
+    remaining = [max(0, math.floor(limit - used - granted + 1e-9)) for (limit, *_), used in zip(rules, used_by_rule)]
+    return granted, retry, reset, deny, remaining
+
+
+@dataclass
+class _Lease:
+    """Jetons pré-réservés pour une clé, servis sans aller-retour."""
+
+    tokens: int
+    expires_at: float
+    limit: int
+    remaining: int
+    reset_at: float
+    remaining_by_rule: Dict[str, int]
+
+
+@dataclass
+class _Rate:
+    """Débit local d'une clé sur la seconde en cours (décide du pré-fetch)."""
+
+    second: int = 0
+    count: int = 0
+    qps: float = 0.0
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Moteur
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class RateLimitEngine:
+    """
+    Limiteur à fenêtre glissante partagé par le cluster via Redis.
+
+    ``redis`` explicite (tests, bench) ou, par défaut, le client de
+    ``core.cache.cache_service`` résolu à chaque appel. Sans Redis (ou sur
+    erreur Redis) : mêmes calculs sur des compteurs locaux au process.
+    """
+
+    def __init__(self, redis=None, *, prefetch: bool = PREFETCH_ENABLED, max_local_keys: int = MAX_LOCAL_KEYS):
+        self._redis_client = redis
+        self.prefetch = prefetch
+        self.max_local_keys = max_local_keys
+        # clé Redis → {index de fenêtre: compteur}
+        self._local: "OrderedDict[str, Dict[int, int]]" = OrderedDict()
+        self._leases: Dict[str, _Lease] = {}
+        self._rates: "OrderedDict[str, _Rate]" = OrderedDict()
+        self._redis_errors = 0
+        self.counters = {
+            "checks": 0,
+            "allowed": 0,
+            "denied": 0,
+            "shared_calls": 0,
+            "prefetch_hits": 0,
+            "prefetched_tokens": 0,
+            "local_fallback": 0,
+        }
+
+    @property
+    def redis(self):
+        if self._redis_client is not None:
+            return self._redis_client
+        try:
+            from core.cache import cache_service
+        except ImportError:
+            return None
+        return getattr(cache_service.backend, "redis", None)
+
+    def attach_redis(self, client) -> None:
+        """Client Redis dédié (RateLimiter.init_redis / GuestLimiter.init_redis)."""
+        self._redis_client = client
+
+    @staticmethod
+    def _keys(key: str, rules: Sequence[RateRule]) -> List[str]:
+        return [f"{RATE_LIMIT_KEY_PREFIX}:{key}:{rule.name}" for rule in rules]
+
+    def _redis_failed(self, exc: Exception) -> None:
+        self._redis_errors += 1
+        if self._redis_errors == 1 or self._redis_errors % 100 == 0:
+            logger.warning("Rate limit engine Redis error, using local counters", error=str(exc)[:120])
+
+    def reset(self) -> None:
+        """Oublie compteurs locaux, baux et stats (tests). N'efface pas Redis."""
+        self._local.clear()
+        self._leases.clear()
+        self._rates.clear()
+        for name in self.counters:
+            self.counters[name] = 0
+
+    # ─── API ──────────────────────────────────────────────────────────────────
+
+    async def hit(self, key: str, rules: Sequence[RateRule], cost: int = 1, *, force: bool = False) -> RateDecision:
+        """
+        Consomme ``cost`` places sur toutes les ``rules`` de ``key`` si chacune
+        en a assez (sinon rien n'est consommé). ``force=True`` enregistre sans
+        vérifier (usage constaté après coup).
+        """
+        self.counters["checks"] += 1
+        if self.prefetch and cost == 1 and not force:
+            leased = self._take_leased(key)
+            if leased is not None:
+                self.counters["prefetch_hits"] += 1
+                self.counters["allowed"] += 1
+                return leased
+            want = self._prefetch_size(key, rules)
+        else:
+            want = cost
+
+        decision = await self._shared(key, rules, want, force)
+        if decision.allowed:
+            self.counters["allowed"] += 1
+            if decision.granted > cost:
+                self._store_lease(key, decision, decision.granted - cost)
+        else:
+            self.counters["denied"] += 1
+        return decision
+
+    async def peek(self, key: str, rules: Sequence[RateRule]) -> RateDecision:
+        """Places restantes sans rien consommer (``allowed`` = au moins une place)."""
+        decision = await self._shared(key, rules, 0, False)
+        decision.allowed = decision.remaining > 0
+        return decision
+
+    # ─── Aller-retour partagé ─────────────────────────────────────────────────
+
+    async def _shared(self, key: str, rules: Sequence[RateRule], want: int, force: bool) -> RateDecision:
+        now_ms = time.time() * 1000
+        keys = self._keys(key, rules)
+        redis = self.redis
+        result = None
+        if redis is not None:
+            args: List[Any] = [int(now_ms), want, 1 if force else 0]
+            for rule in rules:
+                args.extend((rule.limit, int(rule.window_s * 1000)))
+            try:
+                raw = await redis.eval(_SLIDING_WINDOW_LUA, len(keys), *keys, *args)
+                self.counters["shared_calls"] += 1
+                values = [int(v) for v in raw]
+                result = (values[0], values[1], values[2], values[3], values[4:])
+            except Exception as e:
+                self._redis_failed(e)
+        if result is None:
+            self.counters["local_fallback"] += 1
+            result = self._local_hit(keys, rules, now_ms, want, force)
+
+        granted, retry_ms, reset_ms, deny, remaining = result
+        binding = min(range(len(rules)), key=lambda i: remaining[i])
+        return RateDecision(
+            allowed=deny == 0,
+            limit=rules[binding].limit,
+            remaining=remaining[binding],
+            retry_after=retry_ms / 1000,
+            reset_after=reset_ms / 1000,
+            rule=rules[deny - 1].name if deny else None,
+            remaining_by_rule={rule.name: remaining[i] for i, rule in enumerate(rules)},
+            granted=granted,
+        )
+
+    def _local_hit(
+        self, keys: List[str], rules: Sequence[RateRule], now_ms: float, want: int, force: bool
+    ) -> Tuple[int, float, float, int, List[int]]:
+        state = []
+        for redis_key, rule in zip(keys, rules):
+            window = rule.window_s * 1000
+            idx = int(now_ms // window)
+            counts = self._local.get(redis_key, {})
+            state.append((rule.limit, window, counts.get(idx, 0), counts.get(idx - 1, 0)))
+        granted, retry, reset, deny, remaining = _sliding_window(now_ms, want, force, state)
+        if granted > 0:
+            for redis_key, (_, window, *_counts) in zip(keys, state):
+                idx = int(now_ms // window)
+                counts = self._local.get(redis_key)
+                if counts is None:
+                    counts = self._local[redis_key] = {}
+                else:
+                    self._local.move_to_end(redis_key)
+                counts[idx] = counts.get(idx, 0) + granted
+                for old in [i for i in counts if i < idx - 1]:
+                    del counts[old]
+            while len(self._local) > self.max_local_keys:
+                self._local.popitem(last=False)
+        return granted, retry, reset, deny, remaining
+
+    # ─── Pré-fetch local ──────────────────────────────────────────────────────
+
+    def _take_leased(self, key: str) -> Optional[RateDecision]:
+        lease = self._leases.get(key)
+        if lease is None:
+            return None
+        now = time.monotonic()
+        if lease.tokens <= 0 or lease.expires_at <= now:
+            del self._leases[key]
+            return None
+        lease.tokens -= 1
+        return RateDecision(
+            allowed=True,
+            limit=lease.limit,
+            remaining=lease.remaining + lease.tokens,
+            reset_after=max(0.0, lease.reset_at - now),
+            remaining_by_rule={name: left + lease.tokens for name, left in lease.remaining_by_rule.items()},
+        )
+
+    def _prefetch_size(self, key: str, rules: Sequence[RateRule]) -> int:
+        """1, ou un lot si la clé dépasse PREFETCH_MIN_QPS dans ce worker."""
+        now = time.monotonic()
+        second = int(now)
+        rate = self._rates.get(key)
+        if rate is None:
+            rate = self._rates[key] = _Rate(second=second)
+            while len(self._rates) > self.max_local_keys:
+                self._rates.popitem(last=False)
+        else:
+            self._rates.move_to_end(key)
+        if rate.second != second:
+            # Débit de la seconde écoulée (0 si la clé a été silencieuse plus longtemps)
+            rate.qps = rate.count if second - rate.second == 1 else 0.0
+            rate.second, rate.count = second, 0
+        rate.count += 1
+        qps = max(rate.qps, rate.count)
+        if qps < PREFETCH_MIN_QPS:
+            return 1
+        cap = int(min(rule.limit for rule in rules) * PREFETCH_MAX_SHARE)
+        return max(1, min(PREFETCH_MAX_BATCH, cap, math.ceil(qps * PREFETCH_TTL_S)))
+
+    def _store_lease(self, key: str, decision: RateDecision, tokens: int) -> None:
+        now = time.monotonic()
+        self.counters["prefetched_tokens"] += tokens
+        self._leases[key] = _Lease(
+            tokens=tokens,
+            expires_at=now + PREFETCH_TTL_S,
+            limit=decision.limit,
+            remaining=decision.remaining,
+            reset_at=now + decision.reset_after,
+            remaining_by_rule=dict(decision.remaining_by_rule),
+        )
+        # Réponse de l'appelant courant : ses jetons de lot ne sont pas des places perdues
+        decision.remaining += tokens
+        decision.remaining_by_rule = {name: left + tokens for name, left in decision.remaining_by_rule.items()}
+        if len(self._leases) > self.max_local_keys:
+            for stale in [k for k, lease in self._leases.items() if lease.expires_at <= now]:
+                del self._leases[stale]
+
+    # ─── Observabilité ────────────────────────────────────────────────────────
+
+    def get_stats(self) -> dict:
+        c = self.counters
+        return {
+            **c,
+            "denied_rate": round(c["denied"] / c["checks"], 4) if c["checks"] else 0.0,
+            "prefetch_hit_rate": round(c["prefetch_hits"] / c["checks"], 4) if c["checks"] else 0.0,
+            "redis_errors": self._redis_errors,
+            "local_keys": len(self._local),
+            "active_leases": len(self._leases),
+            "scope": "cluster" if self.redis is not None else "process",
+        }
+
+
+rate_limit_engine = RateLimitEngine()
+
+
+def get_rate_limit_stats() -> dict:
+    return rate_limit_engine.get_stats()
+
+
+__all__ = [
+    "RateDecision",
+    "RateLimitEngine",
+    "RateRule",
+    "get_rate_limit_stats",
+    "rate_limit_engine",
+]
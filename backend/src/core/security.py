@@ -23,6 +23,7 @@ from enum import Enum
 
 from db.database import User, CreditTransaction, Summary, ChatQuota, WebSearchUsage
 from billing.plan_config import get_limits
+from core.rate_limit_engine import RateRule, rate_limit_engine
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -98,12 +99,10 @@ CACHE_COOLDOWN_SECONDS = 2
 
 _user_locks: Dict[int, asyncio.Lock] = {}
 _credit_reservations: Dict[int, Dict[str, int]] = {}
-_rate_limits: Dict[int, Dict[str, Any]] = {}
 _token_blacklist: Dict[str, float] = {}
 _monthly_reset_cache: Dict[int, str] = {}
 
 # 🆕 IP-based rate limiting for unauthenticated requests
-_ip_rate_limits: Dict[str, Dict[str, Any]] = {}
 IP_RATE_LIMIT = {"requests_per_minute": 20, "burst": 10}  # Stricter for anonymous
 
 
@@ -133,131 +132,74 @@ def is_endpoint_exempt(endpoint: str) -> bool:
     return False
 
 
+def _rate_rules(requests_per_minute: int, burst: int) -> Tuple[RateRule, RateRule]:
+    """Burst sur 10s + limite à la minute, vérifiées ensemble par le moteur partagé."""
+    return RateRule("burst", burst, 10), RateRule("minute", requests_per_minute, 60)
+
+
 async def check_rate_limit(user_id: int, user_plan: str, endpoint: str = "") -> Tuple[bool, str, Dict[str, Any]]:
     """
     Vérifie et applique le rate limiting pour un utilisateur.
-    """
-    now = time.time()
 
+    Compteurs partagés par tous les workers (core.rate_limit_engine, clé
+    ``user:{id}``) ; une requête refusée ne consomme pas de quota.
+    """
     # Endpoints exemptés
     if is_endpoint_exempt(endpoint):
         return True, "exempt", {"exempt": True, "endpoint": endpoint}
 
     limits = RATE_LIMITS.get(user_plan, RATE_LIMITS["free"])
     max_requests = limits["requests_per_minute"]
-    burst = limits["burst"]
-
-    if user_id not in _rate_limits:
-        _rate_limits[user_id] = {
-            "count": 0,
-            "window_start": now,
-            "blocked_until": 0,
-            "burst_count": 0,
-            "burst_window": now,
-        }
-
-    rate_info = _rate_limits[user_id]
-
-    # Vérifier si bloqué
-    if rate_info["blocked_until"] > now:
-        wait_time = int(rate_info["blocked_until"] - now)
-        return (
-            False,
-            "rate_limit_blocked",
-            {
-                "blocked": True,
-                "wait_seconds": wait_time,
-                "message": f"Trop de requêtes. Réessayez dans {wait_time}s",
-                "retry_after": wait_time,
-            },
-        )
-
-    # Réinitialiser la fenêtre si expirée
-    if now - rate_info["window_start"] > 60:
-        rate_info["count"] = 0
-        rate_info["window_start"] = now
-
-    if now - rate_info["burst_window"] > 10:
-        rate_info["burst_count"] = 0
-        rate_info["burst_window"] = now
-
-    # Vérifier le burst
-    rate_info["burst_count"] += 1
-    if rate_info["burst_count"] > burst:
-        rate_info["blocked_until"] = now + 5
-        return (
-            False,
-            "burst_limit",
-            {
-                "blocked": True,
-                "wait_seconds": 5,
-                "message": "Trop de requêtes simultanées. Patientez 5 secondes.",
-                "retry_after": 5,
-            },
-        )
 
-    # Vérifier le rate limit global
-    rate_info["count"] += 1
-    if rate_info["count"] > max_requests:
-        rate_info["blocked_until"] = now + 30
+    decision = await rate_limit_engine.hit(f"user:{user_id}", _rate_rules(max_requests, limits["burst"]))
+    if not decision.allowed:
+        wait_time = decision.retry_after_s
+        if decision.rule == "burst":
+            return (
+                False,
+                "burst_limit",
+                {
+                    "blocked": True,
+                    "wait_seconds": wait_time,
+                    "message": f"Trop de requêtes simultanées. Patientez {wait_time} secondes.",
+                    "retry_after": wait_time,
+                },
+            )
         return (
             False,
             "rate_limit_exceeded",
             {
                 "blocked": True,
-                "wait_seconds": 30,
+                "wait_seconds": wait_time,
                 "message": f"Limite de {max_requests} requêtes/minute atteinte.",
-                "retry_after": 30,
+                "retry_after": wait_time,
             },
         )
 
-    remaining = max_requests - rate_info["count"]
     return (
         True,
         "ok",
-        {"remaining": remaining, "limit": max_requests, "reset_in": int(60 - (now - rate_info["window_start"]))},
+        {
+            "remaining": decision.remaining_by_rule["minute"],
+            "limit": max_requests,
+            "reset_in": int(decision.reset_after),
+        },
     )
 
 
 async def check_rate_limit_for_auth(user_id: int, user_plan: str) -> Tuple[bool, str, Dict[str, Any]]:
-    """Version allégée du rate limiting pour les endpoints d'authentification."""
-    now = time.time()
+    """Version allégée du rate limiting pour les endpoints d'authentification.
+
+    Ne refuse jamais : compte la requête sur les mêmes compteurs que
+    ``check_rate_limit``, avec des limites doublées pour le ``remaining``.
+    """
     limits = RATE_LIMITS.get(user_plan, RATE_LIMITS["free"])
     max_requests = limits["requests_per_minute"] * 2
-    limits["burst"] * 2
-
-    if user_id not in _rate_limits:
-        _rate_limits[user_id] = {
-            "count": 0,
-            "window_start": now,
-            "blocked_until": 0,
-            "burst_count": 0,
-            "burst_window": now,
-        }
-
-    rate_info = _rate_limits[user_id]
-
-    if rate_info["blocked_until"] > now:
-        wait_time = int(rate_info["blocked_until"] - now)
-        return (
-            False,
-            "rate_limit_blocked",
-            {"blocked": True, "wait_seconds": wait_time, "message": f"Trop de requêtes. Réessayez dans {wait_time}s"},
-        )
-
-    if now - rate_info["window_start"] > 60:
-        rate_info["count"] = 0
-        rate_info["window_start"] = now
-
-    if now - rate_info["burst_window"] > 10:
-        rate_info["burst_count"] = 0
-        rate_info["burst_window"] = now
 
-    rate_info["burst_count"] += 1
-    rate_info["count"] += 1
-
-    remaining = max(0, max_requests - rate_info["count"])
-    return True, "ok", {"remaining": remaining, "limit": max_requests}
+    decision = await rate_limit_engine.hit(
+        f"user:{user_id}", _rate_rules(max_requests, limits["burst"] * 2), force=True
+    )
+    return True, "ok", {"remaining": decision.remaining_by_rule["minute"], "limit": max_requests}
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -270,103 +212,51 @@ async def check_ip_rate_limit(ip_address: str, endpoint: str = "") -> Tuple[bool
     Rate limiting basé sur l'IP pour les requêtes non authentifiées.
     Plus strict que le rate limiting utilisateur.
     """
-    now = time.time()
-
     # Endpoints exemptés
     if is_endpoint_exempt(endpoint):
         return True, "exempt", {"exempt": True, "endpoint": endpoint}
 
     max_requests = IP_RATE_LIMIT["requests_per_minute"]
-    burst = IP_RATE_LIMIT["burst"]
 
     # Normaliser l'IP (supprimer port si présent)
     ip_key = ip_address.split(":")[0] if ":" in ip_address and not ip_address.startswith("[") else ip_address
 
-    if ip_key not in _ip_rate_limits:
-        _ip_rate_limits[ip_key] = {
-            "count": 0,
-            "window_start": now,
-            "blocked_until": 0,
-            "burst_count": 0,
-            "burst_window": now,
-        }
-
-    rate_info = _ip_rate_limits[ip_key]
-
-    # Vérifier si bloqué
-    if rate_info["blocked_until"] > now:
-        wait_time = int(rate_info["blocked_until"] - now)
-        return (
-            False,
-            "ip_rate_limit_blocked",
-            {
-                "blocked": True,
-                "wait_seconds": wait_time,
-                "message": f"Too many requests from your IP. Retry in {wait_time}s",
-                "retry_after": wait_time,
-            },
-        )
-
-    # Réinitialiser la fenêtre si expirée
-    if now - rate_info["window_start"] > 60:
-        rate_info["count"] = 0
-        rate_info["window_start"] = now
-
-    if now - rate_info["burst_window"] > 10:
-        rate_info["burst_count"] = 0
-        rate_info["burst_window"] = now
-
-    # Vérifier le burst
-    rate_info["burst_count"] += 1
-    if rate_info["burst_count"] > burst:
-        rate_info["blocked_until"] = now + 10  # 10s block pour IP
-        return (
-            False,
-            "ip_burst_limit",
-            {
-                "blocked": True,
-                "wait_seconds": 10,
-                "message": "Too many rapid requests. Wait 10 seconds.",
-                "retry_after": 10,
-            },
-        )
-
-    # Vérifier le rate limit global
-    rate_info["count"] += 1
-    if rate_info["count"] > max_requests:
-        rate_info["blocked_until"] = now + 60  # 60s block pour IP
+    decision = await rate_limit_engine.hit(f"ip:{ip_key}", _rate_rules(max_requests, IP_RATE_LIMIT["burst"]))
+    if not decision.allowed:
+        wait_time = decision.retry_after_s
+        if decision.rule == "burst":
+            return (
+                False,
+                "ip_burst_limit",
+                {
+                    "blocked": True,
+                    "wait_seconds": wait_time,
+                    "message": f"Too many rapid requests. Wait {wait_time} seconds.",
+                    "retry_after": wait_time,
+                },
+            )
         return (
             False,
             "ip_rate_limit_exceeded",
             {
                 "blocked": True,
-                "wait_seconds": 60,
+                "wait_seconds": wait_time,
                 "message": f"Rate limit of {max_requests} requests/minute exceeded.",
-                "retry_after": 60,
+                "retry_after": wait_time,
             },
         )
 
-    remaining = max_requests - rate_info["count"]
     return (
         True,
         "ok",
-        {"remaining": remaining, "limit": max_requests, "reset_in": int(60 - (now - rate_info["window_start"]))},
+        {
+            "remaining": decision.remaining_by_rule["minute"],
+            "limit": max_requests,
+            "reset_in": int(decision.reset_after),
+        },
     )
 
 
-def cleanup_expired_ip_limits():
-    """Nettoie les entrées IP expirées pour libérer la mémoire."""
-    now = time.time()
-    expired = [
-        ip
-        for ip, info in _ip_rate_limits.items()
-        if now - info["window_start"] > 300  # 5 minutes d'inactivité
-    ]
-    for ip in expired:
-        del _ip_rate_limits[ip]
-    return len(expired)
-
-
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🔐 GESTION DES TOKENS — Blocklist Redis-backed (Sprint C, 2026-05-21)
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -0,0 +1,309 @@
+"""
+╔════════════════════════════════════════════════════════════════════════════════════╗
+║  📣 TASK EVENTS — Progression des tâches poussée en SSE (Redis pub/sub)            ║
+╠════════════════════════════════════════════════════════════════════════════════════╣
+║  • Chaque flush de core.task_store.TaskStore publie l'état complet de la tâche     ║
+║    avec un event id croissant (µs, strictement monotone par tâche)                 ║
+║  • Un seul abonnement pub/sub par worker (canal deepsight:task-events), redistribué ║
+║    aux connexions SSE locales : le worker qui tient le client n'est pas forcément  ║
+║    celui qui exécute la tâche                                                      ║
+║  • Reprise via Last-Event-ID : l'événement est un snapshot, seul le dernier compte ║
+║    → rien à rejouer, on renvoie l'état courant s'il est plus récent               ║
+║  • Sans Redis : distribution locale directe (dev, tests)                           ║
+╚════════════════════════════════════════════════════════════════════════════════════╝
+
+Usage (cf videos.router.stream_task_events):
+    snapshot, event_id = await task_store.aget_snapshot(task_id)
+    ...  # 404 si absent ou pas à l'utilisateur
+    return StreamingResponse(
+        task_event_stream(task_store, task_id, snapshot, event_id, last_event_id),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+"""
+
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from core.logging import logger
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Configuration
+# ═══════════════════════════════════════════════════════════════════════════════
+
+TASK_EVENTS_CHANNEL = "deepsight:task-events"
+TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled"})
+HEARTBEAT_S = 15.0
+# Au-delà, le serveur ferme : EventSource se reconnecte avec Last-Event-ID
+MAX_STREAM_S = 30 * 60
+SUBSCRIBER_QUEUE_SIZE = 16
+LISTENER_READY_TIMEOUT_S = 2.0
+# Champs internes jamais envoyés au client
+PRIVATE_FIELDS = frozenset({"user_id"})
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # Disable nginx buffering
+}
+
+TaskEvent = Tuple[str, int, Dict[str, Any]]  # (task_id, event_id, snapshot)
+
+
+def next_event_id(previous: int = 0) -> int:
+    """Event id horodaté (µs) : croissant même après redémarrage du worker propriétaire."""
+    return max(previous + 1, time.time_ns() // 1000)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# 📡 BUS — pub/sub Redis → files locales des connexions SSE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TaskEventBus:
+    """Redistribue les snapshots de tâches aux abonnés de ce worker."""
+
+    def __init__(self):
+        self._redis = None
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._observers: List[Callable[[str, int, Dict[str, Any]], None]] = []
+        self._listener: Optional[asyncio.Task] = None
+        self._listener_ready: Optional[asyncio.Event] = None
+        self.counters = {"published": 0, "received": 0, "delivered": 0, "dropped": 0, "redis_errors": 0}
+
+    def attach_redis(self, redis_client) -> None:
+        self._redis = redis_client
+
+    def add_observer(self, callback: Callable[[str, int, Dict[str, Any]], None]) -> None:
+        """Callback synchrone appelé pour chaque événement reçu (ex: rafraîchir un cache local)."""
+        self._observers.append(callback)
+
+    # ── Publication ──
+
+    async def publish(self, events: List[TaskEvent]) -> None:
+        if not events:
+            return
+        self.counters["published"] += len(events)
+        if self._redis is not None:
+            try:
+                pipe = self._redis.pipeline()
+                for task_id, event_id, data in events:
+                    pipe.publish(TASK_EVENTS_CHANNEL, _encode(task_id, event_id, data))
+                await pipe.execute()
+                return  # Le listener de chaque worker (celui-ci compris) distribue
+            except Exception as e:
+                self.counters["redis_errors"] += 1
+                logger.warning("Task events publish failed, local delivery only", error=str(e)[:120])
+        for task_id, event_id, data in events:
+            self._dispatch(task_id, event_id, data)
+
+    def _dispatch(self, task_id: str, event_id: int, data: Dict[str, Any]) -> None:
+        self.counters["received"] += 1
+        for observer in self._observers:
+            try:
+                observer(task_id, event_id, data)
+            except Exception as e:
+                logger.debug("Task events observer failed", error=str(e)[:120])
+        for queue in self._subscribers.get(task_id, ()):
+            if queue.full():
+                # Snapshots : le plus ancien en attente est périmé, on le remplace
+                queue.get_nowait()
+                self.counters["dropped"] += 1
+            queue.put_nowait((event_id, data))
+            self.counters["delivered"] += 1
+
+    # ── Abonnement ──
+
+    @asynccontextmanager
+    async def subscribe(self, task_id: str) -> AsyncIterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(task_id, set()).add(queue)
+        try:
+            await self._ensure_listener()
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(task_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[task_id]
+
+    async def start(self) -> None:
+        """Démarre le listener dès le startup : les copies locales des TaskStore restent fraîches."""
+        await self._ensure_listener()
+
+    async def _ensure_listener(self) -> None:
+        if self._redis is None:
+            return
+        loop = asyncio.get_running_loop()
+        if self._listener is None or self._listener.done() or self._listener.get_loop() is not loop:
+            self._listener_ready = asyncio.Event()
+            self._listener = loop.create_task(self._listen(), name="task-events-listener")
+        try:
+            # Abonnement effectif avant de lire le snapshot : pas d'événement perdu entre les deux
+            await asyncio.wait_for(self._listener_ready.wait(), LISTENER_READY_TIMEOUT_S)
+        except asyncio.TimeoutError:
+            logger.warning("Task events listener not ready, relying on heartbeat resync")
+
+    async def _listen(self) -> None:
+        backoff = 0.5
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.subscribe(TASK_EVENTS_CHANNEL)
+                self._listener_ready.set()
+                backoff = 0.5
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    decoded = _decode(message.get("data"))
+                    if decoded is not None:
+                        self._dispatch(*decoded)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.counters["redis_errors"] += 1
+                logger.warning("Task events listener error, resubscribing", error=str(e)[:120])
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 10.0)
+            finally:
+                close_fn = getattr(pubsub, "aclose", None) or getattr(pubsub, "close", None)
+                try:
+                    result = close_fn() if close_fn else None
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception:
+                    pass
+
+    async def close(self) -> None:
+        """Arrête le listener (lifespan shutdown)."""
+        if self._listener is not None and not self._listener.done():
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._listener = None
+
+    def get_stats(self) -> dict:
+        return {
+            **self.counters,
+            "mode": "redis" if self._redis is not None else "local",
+            "listening": self._listener is not None and not self._listener.done(),
+            "subscribed_tasks": len(self._subscribers),
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+        }
+
+
+def _encode(task_id: str, event_id: int, data: Dict[str, Any]) -> str:
+    return json.dumps({"task_id": task_id, "id": event_id, "data": data}, ensure_ascii=False, default=str)
+
+
+def _decode(raw) -> Optional[TaskEvent]:
+    if isinstance(raw, (bytes, bytearray)):
+        raw = raw.decode("utf-8", errors="replace")
+    try:
+        message = json.loads(raw)
+        return message["task_id"], int(message["id"]), message["data"]
+    except (TypeError, ValueError, KeyError):
+        logger.warning("Task events: dropped malformed payload")
+        return None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# 🌊 SSE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def format_task_event(task_id: str, event_id: int, data: Dict[str, Any]) -> str:
+    payload = {k: v for k, v in data.items() if k not in PRIVATE_FIELDS}
+    payload["task_id"] = task_id
+    body = json.dumps(payload, ensure_ascii=False, default=str)
+    return f"id: {event_id}\nevent: progress\ndata: {body}\n\n"
+
+
+def parse_last_event_id(header: Optional[str], query: Optional[str] = None) -> int:
+    """Last-Event-ID (header envoyé par EventSource à la reconnexion) ou ?last_event_id=."""
+    for raw in (header, query):
+        if raw:
+            try:
+                return int(raw)
+            except ValueError:
+                pass
+    return 0
+
+
+async def task_event_stream(
+    store,
+    task_id: str,
+    snapshot: Dict[str, Any],
+    event_id: int,
+    last_event_id: int = 0,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    bus: Optional[TaskEventBus] = None,
+) -> AsyncIterator[str]:
+    """
+    Flux SSE d'une tâche : état courant (si plus récent que ``last_event_id``)
+    puis chaque mise à jour poussée, jusqu'à un statut terminal.
+
+    ``snapshot``/``event_id`` : état lu (et autorisé) par l'endpoint avant de
+    répondre. Un snapshot d'origine DB a l'event id 0.
+    """
+    bus = bus or task_events
+    deadline = time.monotonic() + MAX_STREAM_S
+    sent = last_event_id
+    yield "retry: 3000\n\n"
+
+    async with bus.subscribe(task_id) as queue:
+        # Relecture après abonnement : couvre une mise à jour publiée entre-temps
+        fresh, fresh_id = await store.aget_snapshot(task_id)
+        if fresh is not None and fresh_id > event_id:
+            snapshot, event_id = fresh, fresh_id
+
+        current: Optional[Tuple[int, Dict[str, Any]]] = (event_id, snapshot)
+        while True:
+            if current is not None:
+                eid, data = current
+                if eid > sent or (eid == 0 and sent == 0):
+                    yield format_task_event(task_id, eid, data)
+                    sent = max(sent, eid)
+                if data.get("status") in TERMINAL_STATUSES:
+                    yield "event: end\ndata: {}\n\n"
+                    return
+            if time.monotonic() > deadline:
+                return
+            try:
+                current = await asyncio.wait_for(queue.get(), HEARTBEAT_S)
+            except asyncio.TimeoutError:
+                if is_disconnected is not None and await is_disconnected():
+                    return
+                yield ": heartbeat\n\n"
+                # Filet de sécurité (listener reconnecté, message perdu) : une lecture / heartbeat
+                fresh, fresh_id = await store.aget_snapshot(task_id)
+                current = (fresh_id, fresh) if fresh is not None and fresh_id > sent else None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# 🌍 SINGLETON
+# ═══════════════════════════════════════════════════════════════════════════════
+
+task_events = TaskEventBus()
+
+
+def get_task_events_stats() -> dict:
+    return task_events.get_stats()
+
+
+__all__ = [
+    "SSE_HEADERS",
+    "TaskEventBus",
+    "format_task_event",
+    "get_task_events_stats",
+    "next_event_id",
+    "parse_last_event_id",
+    "task_event_stream",
+    "task_events",
+]
@@ -6,17 +6,18 @@
 ║  Redis partagées entre tous les workers Uvicorn.                                  ║
 ║                                                                                    ║
 ║  • TaskStore    — Proxy dict → Redis HASH (TTL 24h, flush batché 50ms)            ║
-║  • GuestLimiter — Redis ZSET par IP (fenêtre glissante 24h)                       ║
+║                   chaque flush publie l'état sur core.task_events (SSE)            ║
+║  • GuestLimiter — core.rate_limit_engine, clé guest:{ip} (fenêtre glissante 24h)  ║
 ║  • Fallback in-memory transparent si Redis indisponible                            ║
 ╚════════════════════════════════════════════════════════════════════════════════════╝
 """
 
 import json
-import time
 import asyncio
-from typing import Any, Dict, Optional, Set
+from typing import Any, Dict, Optional, Set, Tuple
 
 from core.logging import logger
+from core.task_events import TaskEventBus, next_event_id, task_events
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -61,23 +62,33 @@ class TaskStore:
     - Chaque mutation marque la clé "dirty" et schedule un flush Redis
       dans ~50ms, ce qui batch les écritures séquentielles.
     - aget() est la méthode async pour lire depuis Redis (cross-worker).
+    - Chaque flush publie l'état complet sur le bus d'événements (event id
+      croissant, stocké avec l'état sous EVENT_ID_FIELD) ; les autres workers
+      rafraîchissent leur copie locale à la réception.
     """
 
     TTL = 86400  # 24h — durée de vie d'une tâche
     FLUSH_DELAY = 0.05  # 50ms — fenêtre de batching
     PREFIX = "deepsight:task:"
+    EVENT_ID_FIELD = "_event_id"
 
-    def __init__(self):
+    def __init__(self, prefix: Optional[str] = None, events: Optional[TaskEventBus] = None):
+        if prefix:
+            self.PREFIX = prefix
         self._local: Dict[str, TaskStatusDict] = {}
+        self._event_ids: Dict[str, int] = {}
         self._redis = None
         self._dirty: Set[str] = set()
         self._flush_handle = None
+        self._events = events or task_events
+        self._events.add_observer(self._apply_event)
 
     async def init_redis(self, redis_client):
-        """Connecte le store au client Redis (appelé au startup)."""
+        """Connecte le store (et le bus d'événements) au client Redis (appelé au startup)."""
         self._redis = redis_client
         if redis_client:
-            logger.info("TaskStore Redis backend initialized")
+            self._events.attach_redis(redis_client)
+            logger.info("TaskStore Redis backend initialized", prefix=self.PREFIX)
 
     # ── Interface dict (synchrone, identique à l'ancien code) ──
 
@@ -112,15 +123,57 @@ class TaskStore:
             try:
                 raw = await self._redis.get(f"{self.PREFIX}{task_id}")
                 if raw:
-                    parsed = json.loads(raw)
-                    tracked = TaskStatusDict(task_id, self, parsed)
-                    self._local[task_id] = tracked
-                    return tracked
+                    return self._track_remote(task_id, json.loads(raw))
             except Exception as e:
                 logger.warning("TaskStore Redis GET failed", task_id=task_id, error=str(e))
 
         return None
 
+    async def aget_snapshot(self, task_id: str) -> Tuple[Optional[Dict[str, Any]], int]:
+        """
+        (état, event id) le plus frais connu : Redis d'abord (la copie locale
+        d'un worker qui n'exécute pas la tâche peut être en retard), sinon local.
+        """
+        if self._redis and task_id not in self._dirty:
+            try:
+                raw = await self._redis.get(f"{self.PREFIX}{task_id}")
+                if raw:
+                    parsed = json.loads(raw)
+                    event_id = int(parsed.get(self.EVENT_ID_FIELD) or 0)
+                    if event_id > self._event_ids.get(task_id, 0) or task_id not in self._local:
+                        tracked = self._track_remote(task_id, parsed)
+                        return dict(tracked), event_id
+            except Exception as e:
+                logger.warning("TaskStore Redis GET failed", task_id=task_id, error=str(e))
+
+        local = self._local.get(task_id)
+        if local is None:
+            return None, 0
+        return dict(local), self._event_ids.get(task_id, 0)
+
+    def _track_remote(self, task_id: str, parsed: Dict[str, Any]) -> TaskStatusDict:
+        """Installe un état lu/reçu d'un autre worker comme copie locale (sans le marquer dirty)."""
+        event_id = int(parsed.pop(self.EVENT_ID_FIELD, 0) or 0)
+        tracked = self._local.get(task_id)
+        if tracked is None:
+            tracked = TaskStatusDict(task_id, self, parsed)
+            self._local[task_id] = tracked
+        else:
+            # En place (méthodes de dict : pas de mark_dirty) — les références détenues restent valides
+            dict.clear(tracked)
+            dict.update(tracked, parsed)
+        self._event_ids[task_id] = max(event_id, self._event_ids.get(task_id, 0))
+        return tracked
+
+    def _apply_event(self, task_id: str, event_id: int, data: Dict[str, Any]) -> None:
+        """Observer du bus : rafraîchit une copie locale périmée (jamais celle qu'on écrit)."""
+        if task_id not in self._local or task_id in self._dirty:
+            return
+        if event_id <= self._event_ids.get(task_id, 0):
+            return  # Écho de notre propre flush, ou événement plus ancien
+        self._track_remote(task_id, dict(data))
+        self._event_ids[task_id] = event_id
+
     # ── Dirty tracking & flush batché ──
 
     def _mark_dirty(self, task_id: str):
@@ -129,9 +182,7 @@ class TaskStore:
         self._schedule_flush()
 
     def _schedule_flush(self):
-        """Schedule un flush dans FLUSH_DELAY secondes (debounce)."""
-        if self._redis is None:
-            return
+        """Schedule un flush dans FLUSH_DELAY secondes (debounce). Sans Redis : publication locale."""
         try:
             loop = asyncio.get_running_loop()
             if self._flush_handle is None or self._flush_handle.cancelled():
@@ -140,25 +191,34 @@ class TaskStore:
             pass  # Pas de loop active (tests unitaires, init)
 
     async def _flush(self):
-        """Flush toutes les clés dirty vers Redis en un pipeline."""
-        if not self._redis or not self._dirty:
+        """Flush toutes les clés dirty vers Redis en un pipeline, puis publie les états."""
+        if not self._dirty:
             return
 
         dirty_ids = list(self._dirty)
         self._dirty.clear()
         self._flush_handle = None
 
-        try:
-            pipe = self._redis.pipeline()
-            for task_id in dirty_ids:
-                data = self._local.get(task_id)
-                if data is not None:
+        events = []
+        for task_id in dirty_ids:
+            data = self._local.get(task_id)
+            if data is not None:
+                event_id = next_event_id(self._event_ids.get(task_id, 0))
+                self._event_ids[task_id] = event_id
+                events.append((task_id, event_id, dict(data)))
+
+        if self._redis and events:
+            try:
+                pipe = self._redis.pipeline()
+                for task_id, event_id, data in events:
                     key = f"{self.PREFIX}{task_id}"
-                    serialized = json.dumps(dict(data), ensure_ascii=False, default=str)
+                    serialized = json.dumps({**data, self.EVENT_ID_FIELD: event_id}, ensure_ascii=False, default=str)
                     pipe.setex(key, self.TTL, serialized)
-            await pipe.execute()
-        except Exception as e:
-            logger.warning("TaskStore Redis flush failed", error=str(e))
+                await pipe.execute()
+            except Exception as e:
+                logger.warning("TaskStore Redis flush failed", error=str(e))
+
+        await self._events.publish(events)
 
     async def force_flush(self):
         """Force un flush immédiat (utile pour les tests)."""
@@ -174,26 +234,25 @@ class GuestLimiter:
     """
     Rate limiter pour les analyses guest (3 par IP par 24h).
 
-    Utilise un Redis ZSET par IP:
-    - Score = timestamp Unix
-    - ZREMRANGEBYSCORE pour purger les entrées >24h
-    - ZCARD pour compter les analyses restantes
-
-    Fallback: dict in-memory (même comportement qu'avant).
+    Règle « day » de core.rate_limit_engine sur la clé ``guest:{ip}`` : fenêtre
+    glissante partagée par tous les workers (un script Lua par appel), même
+    fallback in-memory que les autres limiteurs. ``check`` lit sans consommer,
+    ``record`` compte l'analyse une fois réussie.
     """
 
-    PREFIX = "deepsight:guest:"
     WINDOW = 86400  # 24h
     MAX_ANALYSES = 3
 
-    def __init__(self):
-        self._local: Dict[str, list] = {}
-        self._redis = None
+    def __init__(self, engine=None):
+        from core.rate_limit_engine import RateRule, rate_limit_engine
+
+        self.engine = engine or rate_limit_engine
+        self._rules = (RateRule("day", self.MAX_ANALYSES, self.WINDOW),)
 
     async def init_redis(self, redis_client):
-        """Connecte le limiter au client Redis."""
-        self._redis = redis_client
+        """Connecte le moteur de rate limit au client Redis."""
         if redis_client:
+            self.engine.attach_redis(redis_client)
             logger.info("GuestLimiter Redis backend initialized")
 
     async def check(self, client_ip: str) -> tuple:
@@ -201,70 +260,17 @@ class GuestLimiter:
         Vérifie si l'IP peut analyser.
         Returns: (allowed: bool, used_count: int)
         """
-        now = time.time()
-        cutoff = now - self.WINDOW
-
-        if self._redis:
-            try:
-                key = f"{self.PREFIX}{client_ip}"
-                pipe = self._redis.pipeline()
-                pipe.zremrangebyscore(key, "-inf", cutoff)
-                pipe.zcard(key)
-                results = await pipe.execute()
-                count = results[1]
-                return count < self.MAX_ANALYSES, count
-            except Exception as e:
-                logger.warning("GuestLimiter Redis check failed", error=str(e))
-
-        # Fallback in-memory
-        timestamps = self._local.get(client_ip, [])
-        timestamps = [ts for ts in timestamps if now - ts < self.WINDOW]
-        self._local[client_ip] = timestamps
-        return len(timestamps) < self.MAX_ANALYSES, len(timestamps)
+        remaining = await self.get_remaining(client_ip)
+        return remaining > 0, self.MAX_ANALYSES - remaining
 
     async def record(self, client_ip: str):
         """Enregistre une analyse réussie pour cette IP."""
-        now = time.time()
-
-        if self._redis:
-            try:
-                key = f"{self.PREFIX}{client_ip}"
-                await self._redis.zadd(key, {str(now): now})
-                await self._redis.expire(key, self.WINDOW)
-                return
-            except Exception as e:
-                logger.warning("GuestLimiter Redis record failed", error=str(e))
-
-        # Fallback in-memory
-        if client_ip not in self._local:
-            self._local[client_ip] = []
-        self._local[client_ip].append(now)
+        await self.engine.hit(f"guest:{client_ip}", self._rules, force=True)
 
     async def get_remaining(self, client_ip: str) -> int:
         """Retourne le nombre d'analyses restantes pour cette IP."""
-        now = time.time()
-        cutoff = now - self.WINDOW
-
-        if self._redis:
-            try:
-                key = f"{self.PREFIX}{client_ip}"
-                await self._redis.zremrangebyscore(key, "-inf", cutoff)
-                count = await self._redis.zcard(key)
-                return max(0, self.MAX_ANALYSES - count)
-            except Exception as e:
-                logger.warning("GuestLimiter Redis remaining failed", error=str(e))
-
-        timestamps = self._local.get(client_ip, [])
-        timestamps = [ts for ts in timestamps if now - ts < self.WINDOW]
-        self._local[client_ip] = timestamps
-        return max(0, self.MAX_ANALYSES - len(timestamps))
-
-    def cleanup_local(self):
-        """Purge les IPs expirées du cache local (optionnel, Redis gère ses TTLs)."""
-        now = time.time()
-        expired = [ip for ip, timestamps in self._local.items() if all(now - ts > self.WINDOW for ts in timestamps)]
-        for ip in expired:
-            del self._local[ip]
+        decision = await self.engine.peek(f"guest:{client_ip}", self._rules)
+        return decision.remaining
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -272,4 +278,5 @@ class GuestLimiter:
 # ═══════════════════════════════════════════════════════════════════════════════
 
 task_store = TaskStore()
+playlist_task_store = TaskStore(prefix="deepsight:playlist_task:")
 guest_limiter = GuestLimiter()
@@ -23,6 +23,7 @@ from sqlalchemy import (
     CheckConstraint,
     text,
     JSON,
+    LargeBinary,
 )
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base, relationship
@@ -847,7 +848,8 @@ class TranscriptCacheChunk(Base):
 class TranscriptEmbedding(Base):
     """
     🔍 Vector embeddings for semantic search.
-    Stored as JSON text (no pgvector) for Railway compatibility.
+    Stored as raw float32 bytes in ``embedding_vec`` (no pgvector) for Railway
+    compatibility; ``embedding_json`` is the legacy text format (alembic 034).
     """
 
     __tablename__ = "transcript_embeddings"
@@ -857,7 +859,8 @@ class TranscriptEmbedding(Base):
         String(100), ForeignKey("transcript_cache.video_id", ondelete="CASCADE"), nullable=False, index=True
     )
     chunk_index = Column(Integer, nullable=False, default=0)
-    embedding_json = Column(Text, nullable=False)  # JSON array of 1024 floats (mistral-embed dim)
+    embedding_json = Column(Text, nullable=True)  # legacy JSON array (pre-034 rows)
+    embedding_vec = Column(LargeBinary, nullable=True)  # float32 LE, 4 × 1024 bytes (search.vector_codec)
     text_preview = Column(String(500))
     token_count = Column(Integer, default=0)
     # Mistral-First Phase 6 — track which embedding model produced this row,
@@ -957,7 +960,8 @@ class SummaryEmbedding(Base):
     )
     section_index = Column(Integer, nullable=False)
     section_ref = Column(String(100), nullable=True)  # ts ou anchor
-    embedding_json = Column(Text, nullable=False)  # JSON 1024 floats
+    embedding_json = Column(Text, nullable=True)  # legacy JSON 1024 floats (pre-034 rows)
+    embedding_vec = Column(LargeBinary, nullable=True)  # float32 LE (search.vector_codec)
     text_preview = Column(String(500))
     token_count = Column(Integer, default=0)
     model_version = Column(String(50), nullable=False, default="mistral-embed", server_default="mistral-embed")
@@ -994,7 +998,8 @@ class FlashcardEmbedding(Base):
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
     )
-    embedding_json = Column(Text, nullable=False)
+    embedding_json = Column(Text, nullable=True)  # legacy JSON (pre-034 rows)
+    embedding_vec = Column(LargeBinary, nullable=True)  # float32 LE (search.vector_codec)
     text_preview = Column(String(500))
     model_version = Column(String(50), nullable=False, default="mistral-embed", server_default="mistral-embed")
     created_at = Column(DateTime, default=func.now())
@@ -1027,7 +1032,8 @@ class QuizEmbedding(Base):
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
     )
-    embedding_json = Column(Text, nullable=False)
+    embedding_json = Column(Text, nullable=True)  # legacy JSON (pre-034 rows)
+    embedding_vec = Column(LargeBinary, nullable=True)  # float32 LE (search.vector_codec)
     text_preview = Column(String(500))
     model_version = Column(String(50), nullable=False, default="mistral-embed", server_default="mistral-embed")
     created_at = Column(DateTime, default=func.now())
@@ -1065,7 +1071,8 @@ class ChatEmbedding(Base):
         ForeignKey("chat_messages.id", ondelete="CASCADE"),
         nullable=True,
     )
-    embedding_json = Column(Text, nullable=False)
+    embedding_json = Column(Text, nullable=True)  # legacy JSON (pre-034 rows)
+    embedding_vec = Column(LargeBinary, nullable=True)  # float32 LE (search.vector_codec)
     text_preview = Column(String(500))
     token_count = Column(Integer, default=0)
     model_version = Column(String(50), nullable=False, default="mistral-embed", server_default="mistral-embed")
@@ -1092,6 +1099,26 @@ class ExplainPassageCache(Base):
     __table_args__ = (Index("ix_explain_cache_expires", "expires_at"),)
 
 
+class ChunkAnalysisCache(Base):
+    """Cache des analyses LLM par chunk — adressé par contenu (videos.chunk_cache).
+
+    Clé = sha256(kind, version de prompt, modèle, langue, mode, hash du texte,
+    hash du contexte de prompt) → partagé entre utilisateurs et ré-analyses.
+    """
+
+    __tablename__ = "chunk_analysis_cache"
+
+    cache_key = Column(String(64), primary_key=True)
+    kind = Column(String(32), nullable=False)  # "long_video_chunk" | "chunk_digest"
+    model_used = Column(String(50), nullable=False)
+    payload = Column(Text, nullable=False)  # JSON
+    hit_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=func.now())
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (Index("ix_chunk_analysis_cache_expires", "expires_at"),)
+
+
 class ChannelContext(Base):
     """
     📺 Cache du contexte de chaîne (YouTube/TikTok), cross-user.
@@ -2063,6 +2090,18 @@ async def run_schema_migrations():
         "ALTER TABLE transcript_embeddings ADD COLUMN IF NOT EXISTS model_version VARCHAR(50) NOT NULL DEFAULT 'mistral-embed'",
         "CREATE INDEX IF NOT EXISTS idx_transcript_embeddings_video ON transcript_embeddings(video_id)",
         "CREATE INDEX IF NOT EXISTS idx_transcript_embeddings_model_version ON transcript_embeddings(model_version)",
+        # Binary float32 embeddings (alembic 034) — embedding_json becomes legacy
+        "ALTER TABLE transcript_embeddings ADD COLUMN IF NOT EXISTS embedding_vec BYTEA",
+        "ALTER TABLE transcript_embeddings ALTER COLUMN embedding_json DROP NOT NULL",
+        # Same for the per-user embedding tables (created by create_all on fresh DBs, hence IF EXISTS)
+        "ALTER TABLE IF EXISTS summary_embeddings ADD COLUMN IF NOT EXISTS embedding_vec BYTEA",
+        "ALTER TABLE IF EXISTS summary_embeddings ALTER COLUMN embedding_json DROP NOT NULL",
+        "ALTER TABLE IF EXISTS flashcard_embeddings ADD COLUMN IF NOT EXISTS embedding_vec BYTEA",
+        "ALTER TABLE IF EXISTS flashcard_embeddings ALTER COLUMN embedding_json DROP NOT NULL",
+        "ALTER TABLE IF EXISTS quiz_embeddings ADD COLUMN IF NOT EXISTS embedding_vec BYTEA",
+        "ALTER TABLE IF EXISTS quiz_embeddings ALTER COLUMN embedding_json DROP NOT NULL",
+        "ALTER TABLE IF EXISTS chat_embeddings ADD COLUMN IF NOT EXISTS embedding_vec BYTEA",
+        "ALTER TABLE IF EXISTS chat_embeddings ALTER COLUMN embedding_json DROP NOT NULL",
         # 🆚 VideoComparison table (Mar 2026)
         """
         CREATE TABLE IF NOT EXISTS video_comparisons (
@@ -6,7 +6,6 @@
 ╚════════════════════════════════════════════════════════════════════════════════════╝
 """
 
-from .router import router
 from .service import (
     export_summary,
     get_available_formats,
@@ -18,6 +17,16 @@ from .service import (
 )
 from .pdf_generator import PDFGenerator, PDFExportType, generate_pdf, is_pdf_available, PDF_EXPORT_OPTIONS
 
+
+def __getattr__(name):
+    # Router chargé à la demande : il tire auth/billing, inutile (et circulaire)
+    # dans les process de rendu du pool qui importent seulement exports.service
+    if name == "router":
+        from .router import router
+
+        return router
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 __all__ = [
     "router",
     "export_summary",
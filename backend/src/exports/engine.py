@@ -0,0 +1,250 @@
+"""
+╔════════════════════════════════════════════════════════════════════════════════════╗
+║  📦 EXPORT ENGINE — Rendu PDF/DOCX/XLSX hors event loop + cache d'artefacts        ║
+╠════════════════════════════════════════════════════════════════════════════════════╣
+║  • Rendu dans core.cpu_pool (process workers bornés) : un gros PDF ne bloque plus  ║
+║    les autres requêtes du worker uvicorn                                           ║
+║  • Artefact adressé par contenu : hash(résumé + métadonnées rendues, format,       ║
+║    pdf_type, watermark oui/non, langue) — un export identique n'est rendu qu'une   ║
+║    fois                                                                            ║
+║  • Cache disque privé EXPORT_CACHE_DIR/{user_id}/{hash}.{ext}, LRU par mtime       ║
+║    borné en octets (EXPORT_CACHE_MAX_MB), partagé par les workers de l'hôte        ║
+║  • Renvoi en streaming depuis le disque (FileResponse)                             ║
+║  • txt/md/csv : rendu direct (microsecondes), ni pool ni cache                     ║
+╚════════════════════════════════════════════════════════════════════════════════════╝
+
+Les artefacts ne vont pas dans storage.r2 : son bucket (et le fallback local
+servi en StaticFiles) est public, les exports ne le sont pas.
+
+Usage (cf exports.router.export_analysis):
+    artifact = await render_export(user_id=user.id, format="pdf", **export_kwargs)
+    if artifact is None:
+        raise HTTPException(500, ...)
+    return artifact.response()
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from fastapi.responses import FileResponse, Response
+
+from core.cpu_pool import run_cpu
+from core.logging import logger
+
+from .service import clean_filename, export_summary
+from .watermark import _resolve_language, _should_apply_watermark
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Configuration
+# ═══════════════════════════════════════════════════════════════════════════════
+
+EXPORT_CACHE_DIR = Path(os.environ.get("EXPORT_CACHE_DIR", "/app/data/export-cache"))
+EXPORT_CACHE_MAX_BYTES = int(float(os.environ.get("EXPORT_CACHE_MAX_MB", "512")) * 1024 * 1024)
+# À incrémenter quand un rendu change (template PDF, styles DOCX...) : invalide le cache
+EXPORT_RENDER_VERSION = 1
+
+BINARY_FORMATS = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# Par chemin d'artefact (privé par utilisateur), pas par hash de contenu
+_inflight: Dict[Path, asyncio.Task] = {}
+_counters = {"hits": 0, "misses": 0, "renders": 0, "render_failures": 0, "evictions": 0, "cache_errors": 0}
+
+
+@dataclass
+class ExportArtifact:
+    """Export prêt à renvoyer : fichier du cache disque ou octets en mémoire."""
+
+    filename: str
+    mimetype: str
+    path: Optional[Path] = None
+    content: Optional[bytes] = None
+    cached: bool = False
+
+    def response(self) -> Response:
+        headers = {"X-Export-Cache": "hit" if self.cached else "miss"}
+        if self.path is not None:
+            return FileResponse(self.path, media_type=self.mimetype, filename=self.filename, headers=headers)
+        headers["Content-Disposition"] = f'attachment; filename="{self.filename}"'
+        return Response(content=self.content, media_type=self.mimetype, headers=headers)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Clé d'artefact
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def export_cache_key(format: str, kwargs: Dict[str, Any]) -> str:
+    """Hash de tout ce qui change les octets rendus.
+
+    Le plan n'entre que via « watermark oui/non » et la langue via sa forme
+    résolue : deux plans payants partagent le même artefact.
+    """
+    material = {k: v for k, v in kwargs.items() if k not in ("user_plan", "user_language")}
+    material.update(
+        v=EXPORT_RENDER_VERSION,
+        format=format,
+        watermark=_should_apply_watermark(kwargs.get("user_plan")),
+        language=_resolve_language(kwargs.get("user_language")),
+    )
+    payload = json.dumps(material, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:40]
+
+
+def _export_filename(format: str, title: str, pdf_export_type: str) -> str:
+    base = clean_filename(title or "", datetime.now().strftime("%Y%m%d"))
+    suffix = f"_{pdf_export_type}" if format == "pdf" and pdf_export_type != "full" else ""
+    return f"{base}{suffix}.{format}"
+
+
+def _cache_path(user_id: int, key: str, format: str) -> Path:
+    return EXPORT_CACHE_DIR / str(user_id) / f"{key}.{format}"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Cache disque (sync — appelé via asyncio.to_thread)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def _touch_if_exists(path: Path) -> bool:
+    """Marque l'artefact comme récemment utilisé (mtime = ordre LRU)."""
+    try:
+        os.utime(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _evict_lru(root: Path, max_bytes: int) -> int:
+    """Supprime les artefacts les moins récemment servis jusqu'à repasser sous ``max_bytes``."""
+    entries = []
+    total = 0
+    for path in root.glob("*/*"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+    evicted = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+            total -= size
+            evicted += 1
+        except FileNotFoundError:
+            pass
+    return evicted
+
+
+def _purge_user_sync(root: Path) -> int:
+    removed = 0
+    for path in root.glob("*"):
+        try:
+            path.unlink()
+            removed += 1
+        except OSError:
+            pass
+    try:
+        root.rmdir()
+    except OSError:
+        pass
+    return removed
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Rendu
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+async def _render_and_store(format: str, kwargs: Dict[str, Any], path: Path) -> Optional[bytes]:
+    try:
+        content, _, _ = await run_cpu(export_summary, format=format, kind=f"export_{format}", **kwargs)
+    except Exception as e:
+        _counters["render_failures"] += 1
+        logger.error("Export render failed", format=format, error=str(e)[:200])
+        return None
+    if content is None:
+        _counters["render_failures"] += 1
+        return None
+    _counters["renders"] += 1
+    try:
+        await asyncio.to_thread(_write_atomic, path, content)
+        evicted = await asyncio.to_thread(_evict_lru, EXPORT_CACHE_DIR, EXPORT_CACHE_MAX_BYTES)
+        _counters["evictions"] += evicted
+    except OSError as e:
+        _counters["cache_errors"] += 1
+        logger.warning("Export cache write failed", path=str(path), error=str(e)[:120])
+    return content
+
+
+async def render_export(*, user_id: int, format: str, **kwargs: Any) -> Optional[ExportArtifact]:
+    """Export d'un résumé : kwargs = ceux de ``exports.service.export_summary``.
+
+    Retourne None si le format n'est pas disponible ou si le rendu échoue.
+    """
+    if format not in BINARY_FORMATS:
+        content, filename, mimetype = export_summary(format=format, **kwargs)
+        if content is None:
+            return None
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        return ExportArtifact(filename=filename, mimetype=mimetype, content=content)
+
+    filename = _export_filename(format, kwargs.get("title", ""), kwargs.get("pdf_export_type") or "full")
+    key = export_cache_key(format, kwargs)
+    path = _cache_path(user_id, key, format)
+
+    if await asyncio.to_thread(_touch_if_exists, path):
+        _counters["hits"] += 1
+        return ExportArtifact(filename=filename, mimetype=BINARY_FORMATS[format], path=path, cached=True)
+    _counters["misses"] += 1
+
+    # Clics répétés / onglets multiples : un seul rendu par artefact
+    task = _inflight.get(path)
+    if task is None:
+        task = asyncio.ensure_future(_render_and_store(format, kwargs, path))
+        _inflight[path] = task
+        task.add_done_callback(lambda _: _inflight.pop(path, None))
+    content = await asyncio.shield(task)
+    if content is None:
+        return None
+    return ExportArtifact(filename=filename, mimetype=BINARY_FORMATS[format], content=content)
+
+
+async def purge_user_exports(user_id: int) -> int:
+    """Supprime les artefacts d'un utilisateur (suppression de compte)."""
+    return await asyncio.to_thread(_purge_user_sync, EXPORT_CACHE_DIR / str(user_id))
+
+
+def get_export_engine_stats() -> dict:
+    lookups = _counters["hits"] + _counters["misses"]
+    return {
+        **_counters,
+        "hit_rate": round(_counters["hits"] / lookups, 3) if lookups else 0.0,
+        "inflight": len(_inflight),
+        "cache_dir": str(EXPORT_CACHE_DIR),
+        "max_mb": round(EXPORT_CACHE_MAX_BYTES / 1024 / 1024),
+    }
+
+
+__all__ = ["ExportArtifact", "export_cache_key", "get_export_engine_stats", "purge_user_exports", "render_export"]
@@ -14,7 +14,7 @@ import json
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 from typing import Optional, List
@@ -25,12 +25,14 @@ from db.database import get_session, User, Summary
 from auth.dependencies import get_current_user
 from videos.service import get_summary_by_id
 
+from .engine import render_export
 from .service import (
-    export_summary,
     get_available_formats,
     get_pdf_export_options,
     export_to_audio,
     get_audio_file_path,
+    is_audio_render_in_progress,
+    iter_audio_file,
 )
 
 router = APIRouter()
@@ -154,8 +156,10 @@ async def export_analysis(
         except (json.JSONDecodeError, TypeError) as e:
             logger.warning(f"Failed to parse fact_check_result for summary {request.summary_id}: {e}")
 
-    # Générer l'export — propager user.plan + user.default_lang pour le watermark
-    content, filename, mimetype = export_summary(
+    # Générer l'export — propager user.plan + user.default_lang pour le watermark.
+    # PDF/DOCX/XLSX : rendu dans le pool CPU + cache d'artefacts (exports.engine)
+    artifact = await render_export(
+        user_id=current_user.id,
         format=request.format,
         title=summary.video_title,
         channel=summary.video_channel,
@@ -175,16 +179,11 @@ async def export_analysis(
         user_language=current_user.default_lang or "fr",
     )
 
-    if content is None:
+    if artifact is None:
         raise HTTPException(status_code=500, detail=f"Failed to generate {request.format} export")
 
-    # Retourner le fichier
-    if isinstance(content, str):
-        content = content.encode("utf-8")
-
-    return Response(
-        content=content, media_type=mimetype, headers={"Content-Disposition": f'attachment; filename="{filename}"'}
-    )
+    # Retourner le fichier (streamé depuis le cache disque si disponible)
+    return artifact.response()
 
 
 @router.get("/{summary_id}/{format}")
@@ -332,6 +331,8 @@ async def export_analysis_audio(
     """
     Export an analysis as audio (MP3) via ElevenLabs TTS.
     Requires Pro plan or higher (tts feature).
+
+    Answers once the first chunk is ready; audio_url streams the rest as it renders.
     """
     from billing.plan_config import get_limits
 
@@ -393,11 +394,23 @@ async def stream_audio_file(
 ):
     """
     Stream a generated audio file. Supports Range requests for seeking.
+    While the export is still rendering, streams it progressively instead.
     No JWT required — the UUID file_id is the security token.
     """
 
     file_path = get_audio_file_path(file_id)
     if not file_path:
+        if is_audio_render_in_progress(file_id):
+            # Later chunks still synthesizing: stream what exists and follow the file.
+            # No Range/Content-Length until the render is complete.
+            return StreamingResponse(
+                iter_audio_file(file_id),
+                media_type="audio/mpeg",
+                headers={
+                    "Content-Disposition": f'inline; filename="{file_id}.mp3"',
+                    "Cache-Control": "no-store",
+                },
+            )
         raise HTTPException(status_code=404, detail="Audio file not found or expired")
 
     import os
@@ -17,7 +17,6 @@ import csv
 from datetime import datetime
 from typing import Optional, Dict, Any, List, Tuple
 
-from core.http_client import shared_http_client
 from .watermark import add_watermark
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -1163,6 +1162,7 @@ def get_pdf_export_options() -> List[Dict]:
 # 🔊 AUDIO EXPORT (ElevenLabs TTS)
 # ═══════════════════════════════════════════════════════════════════════════════
 
+import asyncio
 import uuid
 import logging
 import glob as glob_module
@@ -1191,7 +1191,9 @@ def cleanup_old_audio_files() -> int:
     """Remove audio files older than 24h. Returns count of removed files."""
     removed = 0
     now = _time.time()
-    for filepath in glob_module.glob(os.path.join(AUDIO_TMP_DIR, "*.mp3")):
+    paths = glob_module.glob(os.path.join(AUDIO_TMP_DIR, "*.mp3"))
+    paths += glob_module.glob(os.path.join(AUDIO_TMP_DIR, "*.failed"))
+    for filepath in paths:
         try:
             if now - os.path.getmtime(filepath) > _AUDIO_MAX_AGE_SECONDS:
                 os.remove(filepath)
@@ -1263,11 +1265,18 @@ def build_narrative_text(
     return full_text.strip()
 
 
-def chunk_text_for_tts(text: str, max_chunk_size: int = 4500) -> List[str]:
+def chunk_text_for_tts(text: str, max_chunk_size: int = 4500, first_chunk_size: Optional[int] = None) -> List[str]:
     """
     Split text into chunks at sentence boundaries.
     ElevenLabs has a ~5000 char limit per request.
+
+    first_chunk_size: smaller leading chunk, so the first audio bytes arrive
+    after a short request instead of a full-size one.
     """
+    if first_chunk_size and len(text) > first_chunk_size:
+        head = chunk_text_for_tts(text, first_chunk_size)[0]
+        return [head] + chunk_text_for_tts(text[len(head) :].strip(), max_chunk_size)
+
     if len(text) <= max_chunk_size:
         return [text]
 
@@ -1298,6 +1307,56 @@ def chunk_text_for_tts(text: str, max_chunk_size: int = 4500) -> List[str]:
     return [c for c in chunks if c]
 
 
+# Leading chunk size: ~10 s of speech, synthesized in a couple of seconds
+AUDIO_FIRST_CHUNK_CHARS = 600
+# A reader tailing an in-progress file gives up after this long without new audio
+_AUDIO_TAIL_IDLE_TIMEOUT = 180.0
+
+_audio_renders: set = set()
+
+
+def _partial_audio_path(file_id: str) -> str:
+    # *.mp3 so cleanup_old_audio_files() also sweeps renders that never finished
+    return os.path.join(AUDIO_TMP_DIR, f"{file_id}.part.mp3")
+
+
+def _failed_audio_marker(file_id: str) -> str:
+    # Left behind by a render that died mid-way, so tailing readers can tell it from "done"
+    return os.path.join(AUDIO_TMP_DIR, f"{file_id}.failed")
+
+
+class AudioRenderFailed(RuntimeError):
+    """The export's background render failed after the stream had started."""
+
+
+def _write_file(path: str, data: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+async def _finish_audio_file(parts, file_id: str, part_path: str, file_path: str) -> None:
+    """Append chunks to the partial file in order, then publish it under its final name."""
+    try:
+        with open(part_path, "ab") as f:
+            async for audio in parts:
+                await asyncio.to_thread(f.write, audio)
+                f.flush()
+        os.replace(part_path, file_path)
+    except (Exception, asyncio.CancelledError) as e:
+        # Cancelled too (shutdown, deploy): otherwise the partial file stays and
+        # readers tail it until the idle timeout, then end with a truncated 200
+        _audio_logger.error(f"Audio export failed mid-render: {e!r}")
+        # Marker first: readers see it as soon as the partial file disappears.
+        # Written inline: a second cancel() must not be able to skip it
+        _write_file(_failed_audio_marker(file_id), repr(e).encode())
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        if isinstance(e, asyncio.CancelledError):
+            raise
+    finally:
+        await parts.aclose()
+
+
 async def export_to_audio(
     title: str,
     channel: str,
@@ -1308,7 +1367,11 @@ async def export_to_audio(
     condensed: bool = False,
 ) -> Optional[Dict[str, Any]]:
     """
-    Generate MP3 audio from analysis content via ElevenLabs TTS.
+    Generate MP3 audio from analysis content via the TTS fan-out (tts.fanout).
+
+    Returns as soon as the first chunk is synthesized: the rest keeps rendering
+    in the background, in order, into a partial file that
+    ``iter_audio_file`` streams while it grows.
 
     Args:
         condensed: If True, truncate to ~300 words (~2 min audio).
@@ -1316,15 +1379,11 @@ async def export_to_audio(
     Returns:
         dict with { file_id, file_path, duration_estimate } or None on failure.
     """
-    from core.config import get_elevenlabs_key
-
-    api_key = get_elevenlabs_key()
-    if not api_key:
-        _audio_logger.error("ElevenLabs API key not configured for audio export")
-        return None
+    from tts.fanout import TTSVoice, cleanup_chunk_cache, synthesize_ordered
 
     # Cleanup old files opportunistically
     cleanup_old_audio_files()
+    await asyncio.to_thread(cleanup_chunk_cache)
 
     # Build narrative text
     narrative = build_narrative_text(title, channel, summary, mode, condensed=condensed)
@@ -1332,86 +1391,38 @@ async def export_to_audio(
         _audio_logger.error("Narrative text too short for audio export")
         return None
 
-    # Determine voice
-    if not voice_id:
-        try:
-            from tts.service import get_voice_id, DEFAULT_MODEL_ID
-
-            voice_id = get_voice_id("fr", "female")
-            model_id = DEFAULT_MODEL_ID
-        except ImportError:
-            voice_id = "pFZP5JQG7iQjIQuC4Bku"  # Lily default
-            model_id = "eleven_multilingual_v2"
-    else:
-        model_id = "eleven_multilingual_v2"
-
     # Chunk the text
-    chunks = chunk_text_for_tts(narrative)
+    chunks = chunk_text_for_tts(narrative, first_chunk_size=AUDIO_FIRST_CHUNK_CHARS)
     _audio_logger.info(f"Audio export: {len(narrative)} chars → {len(chunks)} chunks")
 
-    # Generate audio for each chunk
     file_id = str(uuid.uuid4())
     file_path = os.path.join(AUDIO_TMP_DIR, f"{file_id}.mp3")
 
+    parts = synthesize_ordered(chunks, TTSVoice(voice_id=voice_id or None, language="fr", speed=speed))
     try:
-        async with shared_http_client() as client:
-            audio_parts: list[bytes] = []
-
-            for i, chunk_text in enumerate(chunks):
-                url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
-                payload = {
-                    "text": chunk_text,
-                    "model_id": model_id,
-                    "voice_settings": {
-                        "stability": 0.5,
-                        "similarity_boost": 0.75,
-                        "style": 0.3,
-                        "use_speaker_boost": True,
-                        "speed": speed,
-                    },
-                }
-                headers = {
-                    "xi-api-key": api_key,
-                    "Content-Type": "application/json",
-                    "Accept": "audio/mpeg",
-                }
-
-                response = await client.post(url, json=payload, headers=headers, timeout=120.0)
-
-                if response.status_code != 200:
-                    _audio_logger.error(
-                        f"ElevenLabs API error on chunk {i + 1}/{len(chunks)}: "
-                        f"{response.status_code} {response.text[:200]}"
-                    )
-                    return None
-
-                audio_parts.append(response.content)
-
-            # Concatenate MP3 chunks (simple byte concatenation works for MP3)
-            with open(file_path, "wb") as f:
-                for part in audio_parts:
-                    f.write(part)
-
-        # Estimate duration: ~150 words/min for French TTS
-        word_count = len(narrative.split())
-        duration_estimate = int((word_count / 150) * 60)
-
-        return {
-            "file_id": file_id,
-            "file_path": file_path,
-            "duration_estimate": duration_estimate,
-        }
-
-    except httpx.TimeoutException:
-        _audio_logger.error("ElevenLabs API timeout during audio export")
-        return None
+        first = await parts.__anext__()
     except Exception as e:
         _audio_logger.error(f"Audio export error: {e}")
-        # Cleanup partial file
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        await parts.aclose()
         return None
 
+    # Partial file exists before we answer: the client's GET can start streaming right away
+    part_path = _partial_audio_path(file_id)
+    await asyncio.to_thread(_write_file, part_path, first)
+    task = asyncio.create_task(_finish_audio_file(parts, file_id, part_path, file_path))
+    _audio_renders.add(task)
+    task.add_done_callback(_audio_renders.discard)
+
+    # Estimate duration: ~150 words/min for French TTS
+    word_count = len(narrative.split())
+    duration_estimate = int((word_count / 150) * 60)
+
+    return {
+        "file_id": file_id,
+        "file_path": file_path,
+        "duration_estimate": duration_estimate,
+    }
+
 
 def get_audio_file_path(file_id: str) -> Optional[str]:
     """Get the path to a temporary audio file, validating the file_id format."""
@@ -1425,3 +1436,54 @@ def get_audio_file_path(file_id: str) -> Optional[str]:
     if os.path.exists(file_path):
         return file_path
     return None
+
+
+def is_audio_render_in_progress(file_id: str) -> bool:
+    """True while the export's later chunks are still being synthesized."""
+    try:
+        uuid.UUID(file_id)
+    except ValueError:
+        return False
+    return os.path.exists(_partial_audio_path(file_id))
+
+
+async def iter_audio_file(file_id: str, poll_interval: float = 0.2):
+    """
+    Stream an audio export from its first byte while it is still rendering.
+
+    Works from any worker of the host: follows the partial file until it is
+    renamed to its final name (done) or removed next to a ``.failed`` marker.
+
+    Raises AudioRenderFailed when the render fails, so the response is aborted
+    instead of ending as a truncated but complete-looking MP3.
+    """
+    part_path = _partial_audio_path(file_id)
+    final_path = os.path.join(AUDIO_TMP_DIR, f"{file_id}.mp3")
+    failed_path = _failed_audio_marker(file_id)
+    try:
+        f = open(part_path, "rb")
+    except FileNotFoundError:
+        # Finished (or failed) between the check and the open
+        if os.path.exists(failed_path):
+            raise AudioRenderFailed(f"Audio export {file_id} failed while rendering")
+        f = open(final_path, "rb")
+    with f:
+        idle_since = _time.monotonic()
+        while True:
+            data = await asyncio.to_thread(f.read, 64 * 1024)
+            if data:
+                idle_since = _time.monotonic()
+                yield data
+                continue
+            if not os.path.exists(part_path):
+                if os.path.exists(failed_path):
+                    raise AudioRenderFailed(f"Audio export {file_id} failed while rendering")
+                # Renamed (done): drain what is left and stop
+                rest = await asyncio.to_thread(f.read)
+                if rest:
+                    yield rest
+                return
+            if _time.monotonic() - idle_since > _AUDIO_TAIL_IDLE_TIMEOUT:
+                _audio_logger.warning(f"Audio stream {file_id} idle for too long, closing")
+                return
+            await asyncio.sleep(poll_interval)
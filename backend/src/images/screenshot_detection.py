@@ -16,12 +16,12 @@ import asyncio
 import logging
 import os
 import re
-import subprocess
 from typing import Any, Dict, List, Optional
 
 import httpx
 
 from core.config import BRAVE_SEARCH_API_KEY
+from core.media_process import run_media_process
 
 logger = logging.getLogger(__name__)
 
@@ -944,16 +944,10 @@ async def _ytdlp_search(query: str, search_prefix: str = "ytsearch5") -> Optiona
         f"{search_prefix}:{query}",
     ]
 
-    loop = asyncio.get_event_loop()
-
-    def _run():
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=20)
-            return result.stdout
-        except Exception:
-            return ""
-
-    stdout = await loop.run_in_executor(None, _run)
+    try:
+        stdout = (await run_media_process(cmd, timeout=20)).text
+    except Exception:
+        stdout = ""
 
     if stdout:
         for line in stdout.strip().split("\n"):
@@ -984,16 +978,10 @@ async def _ytdlp_search_tiktok(query: str) -> Optional[str]:
         f"tiktoksearch3:{query}",
     ]
 
-    loop = asyncio.get_event_loop()
-
-    def _run():
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=20)
-            return result.stdout
-        except Exception:
-            return ""
-
-    stdout = await loop.run_in_executor(None, _run)
+    try:
+        stdout = (await run_media_process(cmd, timeout=20)).text
+    except Exception:
+        stdout = ""
 
     if stdout:
         for line in stdout.strip().split("\n"):
@@ -575,10 +575,14 @@ async def initialize_database_background():
             redis_url = os.environ.get("REDIS_URL")
             if redis_url and CACHE_AVAILABLE and cache_service.is_redis:
                 redis_client = cache_service.backend.redis
-                from core.task_store import task_store, guest_limiter
+                from core.task_events import task_events
+                from core.task_store import task_store, playlist_task_store, guest_limiter
 
                 await task_store.init_redis(redis_client)
+                await playlist_task_store.init_redis(redis_client)
                 await guest_limiter.init_redis(redis_client)
+                # Progression des tâches poussée en SSE (pub/sub) + copies locales fraîches
+                await task_events.start()
                 try:
                     from academic.arxiv_client import init_arxiv_redis
 
@@ -606,6 +610,14 @@ async def initialize_database_background():
         except Exception as eq_err:
             logger.warning(f"Email queue init failed (non-blocking): {eq_err}")
 
+        # Étape 5b: Workers de jobs durables (analyses vidéo) — Redis si dispo, sinon file locale
+        try:
+            from core.job_queue import job_queue
+
+            await job_queue.start()
+        except Exception as jq_err:
+            logger.warning(f"Job queue init failed (non-blocking): {jq_err}")
+
         # Étape 6: Initialiser le Video Content Cache (L1 Redis + L2 PostgreSQL VPS)
         global _video_cache
         if VIDEO_CACHE_AVAILABLE:
@@ -953,6 +965,46 @@ async def lifespan(app: FastAPI):
             logger.info("Video content cache closed")
         except Exception:
             pass
+    # Stop embedding batcher (avant le client HTTP qu'il utilise)
+    try:
+        from search.embedding_service import embedding_batcher
+
+        await embedding_batcher.stop()
+    except Exception:
+        pass
+    # Flush provider-health writes, then stop cache L1 invalidation listener (same Redis client)
+    try:
+        from core.provider_health import provider_health
+
+        await provider_health.close()
+    except Exception:
+        pass
+    # Stop job workers: in-flight analyses go back to the queue (resumed from their last checkpoint)
+    try:
+        from core.job_queue import job_queue
+
+        await job_queue.close()
+    except Exception:
+        pass
+    # Stop the task events pub/sub listener before its Redis client goes away
+    try:
+        from core.task_events import task_events
+
+        await task_events.close()
+    except Exception:
+        pass
+    if CACHE_AVAILABLE:
+        try:
+            await cache_service.close()
+        except Exception:
+            pass
+    # Stop CPU render workers (OG images, exports)
+    try:
+        from core.cpu_pool import shutdown_cpu_pool
+
+        shutdown_cpu_pool()
+    except Exception:
+        pass
     # Close shared HTTP client
     await close_http_client()
     logger.info("Shared HTTP client closed")
@@ -1494,13 +1546,15 @@ async def health_detailed():
 
     # Check rate limiting metrics
     try:
-        from core.security import _rate_limits, _ip_rate_limits, cleanup_expired_ip_limits
+        from core.rate_limit_engine import get_rate_limit_stats
 
-        expired_cleaned = cleanup_expired_ip_limits()
+        rl_stats = get_rate_limit_stats()
         health_data["metrics"]["rate_limiting"] = {
-            "active_user_sessions": len(_rate_limits),
-            "active_ip_sessions": len(_ip_rate_limits),
-            "expired_cleaned": expired_cleaned,
+            "scope": rl_stats["scope"],
+            "checks": rl_stats["checks"],
+            "denied": rl_stats["denied"],
+            "prefetch_hit_rate": rl_stats["prefetch_hit_rate"],
+            "local_keys": rl_stats["local_keys"],
         }
     except Exception as e:
         health_data["metrics"]["rate_limiting"] = {"error": str(e)[:50]}
@@ -1730,7 +1784,22 @@ if ENVIRONMENT != "production":
         """Statistiques du cache — Uniquement en développement."""
         if not CACHE_AVAILABLE:
             return {"error": "Cache not available"}
-        return {"status": "ok", "stats": cache_service.get_stats()}
+        from search.embedding_service import embedding_batcher
+        from search.query_cache import query_embedding_cache
+
+        return {
+            "status": "ok",
+            "stats": cache_service.get_stats(),
+            "query_embeddings": query_embedding_cache.get_stats(),
+            "embedding_batcher": embedding_batcher.get_stats(),
+        }
+
+    @app.get("/debug/http-pools")
+    async def debug_http_pools():
+        """Utilisation des pools HTTP providers (LLM / embeddings / TTS)."""
+        from core.http_client import get_pool_stats
+
+        return {"status": "ok", "pools": get_pool_stats()}
 else:
     logger.info("Debug endpoints disabled in production")
 
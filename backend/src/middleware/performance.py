@@ -4,7 +4,7 @@
 ╠════════════════════════════════════════════════════════════════════════════════════╣
 ║  FONCTIONNALITÉS:                                                                  ║
 ║  • ⏱️ Request timing avec headers X-Process-Time                                   ║
-║  • 🗜️ Compression Gzip/Brotli automatique                                         ║
+║  • 🗜️ Compression Brotli/Gzip en streaming (ASGI pur)                             ║
 ║  • 📊 Métriques Prometheus                                                         ║
 ║  • 📝 Structured logging JSON                                                      ║
 ║  • 🚦 Rate limiting par IP/User                                                    ║
@@ -15,14 +15,22 @@
 import os
 import time
 import json
-import gzip
+import zlib
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
+import anyio
 from fastapi import Request, Response
-from fastapi.responses import StreamingResponse
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 📊 METRICS (Prometheus-compatible)
@@ -177,84 +185,178 @@ class TimingMiddleware(BaseHTTPMiddleware):
 # ═══════════════════════════════════════════════════════════════════════════════
 
 
-class CompressionMiddleware(BaseHTTPMiddleware):
+class CompressionMiddleware:
     """
-    Middleware pour compresser les réponses avec Gzip.
-    S'applique aux réponses > 1KB avec Accept-Encoding: gzip.
+    Compression Brotli/Gzip en streaming (ASGI pur).
+
+    - Le corps n'est jamais accumulé : chaque chunk passe dans un compresseur
+      incrémental puis est flushé (TTFB préservé sur les gros exports et les
+      réponses streamées).
+    - Brotli si le client l'accepte et que le paquet ``brotli`` est installé,
+      sinon Gzip.
+    - Les chunks >= OFFLOAD_THRESHOLD sont compressés dans un thread pour ne
+      pas bloquer l'event loop.
+    - Ignoré pour les réponses déjà encodées, les médias et le SSE.
     """
 
     MIN_SIZE = 1024  # 1KB minimum pour compression
+    OFFLOAD_THRESHOLD = 256 * 1024  # chunks plus gros → thread
+    GZIP_LEVEL = 6
+    BROTLI_QUALITY = 4  # bon compromis CPU/ratio pour du contenu dynamique
     COMPRESSIBLE_TYPES = {
         "application/json",
+        "application/x-ndjson",
         "text/html",
         "text/plain",
         "text/css",
+        "text/csv",
+        "text/markdown",
         "text/javascript",
         "application/javascript",
         "application/xml",
         "text/xml",
+        "image/svg+xml",
     }
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        # Check if client accepts gzip
-        accept_encoding = request.headers.get("Accept-Encoding", "")
-        accepts_gzip = "gzip" in accept_encoding.lower()
-
-        if not accepts_gzip:
-            return await call_next(request)
-
-        # Get response
-        response = await call_next(request)
-
-        # Skip streaming responses and small responses
-        if isinstance(response, StreamingResponse):
-            return response
-
-        # Check content type
-        content_type = response.headers.get("Content-Type", "")
-        base_type = content_type.split(";")[0].strip()
-
-        if base_type not in self.COMPRESSIBLE_TYPES:
-            return response
-
-        # Get body
-        body = b""
-        async for chunk in response.body_iterator:
-            body += chunk
-
-        # Skip if too small
-        if len(body) < self.MIN_SIZE:
-            return Response(
-                content=body,
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                media_type=response.media_type,
-            )
-
-        # Compress
-        compressed = gzip.compress(body, compresslevel=6)
-
-        # Only use compression if it actually helps
-        if len(compressed) >= len(body):
-            return Response(
-                content=body,
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                media_type=response.media_type,
-            )
-
-        # Return compressed response
-        headers = dict(response.headers)
-        headers["Content-Encoding"] = "gzip"
-        headers["Content-Length"] = str(len(compressed))
-        headers["Vary"] = "Accept-Encoding"
-
-        return Response(
-            content=compressed,
-            status_code=response.status_code,
-            headers=headers,
-            media_type=response.media_type,
-        )
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = MIN_SIZE,
+        offload_threshold: int = OFFLOAD_THRESHOLD,
+        gzip_level: int = GZIP_LEVEL,
+        brotli_quality: int = BROTLI_QUALITY,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_threshold = offload_threshold
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._select_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressionResponder(self, encoding, send).run(self.app, scope, receive)
+
+    @staticmethod
+    def _select_encoding(accept_encoding: str) -> Optional[str]:
+        accepted = set()
+        for part in accept_encoding.lower().split(","):
+            name, _, params = part.strip().partition(";")
+            params = params.replace(" ", "")
+            if params.startswith("q="):
+                try:
+                    if float(params[2:]) <= 0:
+                        continue  # refus explicite (q=0)
+                except ValueError:
+                    continue
+            accepted.add(name.strip())
+        if BROTLI_AVAILABLE and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def compressible(self, headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return False
+        base_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return base_type in self.COMPRESSIBLE_TYPES
+
+    def make_compressor(self, encoding: str) -> "_StreamCompressor":
+        if encoding == "br":
+            return _StreamCompressor(brotli.Compressor(quality=self.brotli_quality))
+        return _StreamCompressor(zlib.compressobj(self.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS))
+
+
+class _StreamCompressor:
+    """Adapte zlib (gzip) et brotli à une même interface ``compress(chunk, final)``."""
+
+    def __init__(self, compressor):
+        self._c = compressor
+        self._brotli = not hasattr(compressor, "compress")
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self._brotli:
+            out = self._c.process(data) if data else b""
+            return out + (self._c.finish() if final else self._c.flush())
+        out = self._c.compress(data)
+        return out + self._c.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _CompressionResponder:
+    """État d'une réponse : retient ``http.response.start`` jusqu'au premier chunk."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.mw = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_StreamCompressor] = None
+        self.passthrough = False
+
+    async def run(self, app: ASGIApp, scope: Scope, receive: Receive) -> None:
+        await app(scope, receive, self.send_wrapper)
+
+    async def _compress(self, data: bytes, final: bool) -> bytes:
+        if len(data) >= self.mw.offload_threshold:
+            return await anyio.to_thread.run_sync(self.compressor.compress, data, final)
+        return self.compressor.compress(data, final)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            if message["status"] in (204, 304) or not self.mw.compressible(headers):
+                self.passthrough = True
+                await self.send(message)
+            else:
+                self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            headers = MutableHeaders(raw=list(self.start_message["headers"]))
+            if not more_body and len(body) < self.mw.minimum_size:
+                # Réponse complète et petite : envoyée telle quelle
+                self.passthrough = True
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+
+            self.compressor = self.mw.make_compressor(self.encoding)
+            payload = await self._compress(body, final=not more_body)
+            if not more_body and len(payload) >= len(body):
+                # Incompressible : inutile de changer l'encodage
+                self.passthrough = True
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(payload))
+            self.start_message["headers"] = headers.raw
+            await self.send(self.start_message)
+            await self.send({"type": "http.response.body", "body": payload, "more_body": more_body})
+            return
+
+        payload = await self._compress(body, final=not more_body)
+        await self.send({"type": "http.response.body", "body": payload, "more_body": more_body})
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -7,7 +7,7 @@
 ║  • 🎯 Limites par endpoint, user, IP                                              ║
 ║  • 🔑 Limites différenciées par plan utilisateur                                  ║
 ║  • 📈 Headers de quota standards (X-RateLimit-*)                                  ║
-║  • 💾 Backend Redis avec fallback in-memory                                       ║
+║  • 💾 Backend Redis (core.rate_limit_engine, 1 script Lua) + fallback in-memory   ║
 ║  • 📝 Logging des violations pour monitoring                                       ║
 ║  • 🧹 Auto-cleanup des entrées expirées (toutes les 5 min)                       ║
 ║  • 📦 Mémoire bornée: max 10000 IPs, LRU eviction                               ║
@@ -220,57 +220,36 @@ class InMemoryBackend(RateLimiterBackend):
             )
 
 
-class RedisBackend(RateLimiterBackend):
-    """Backend Redis avec sliding window précis"""
-
-    def __init__(self, redis_client):
-        self.redis = redis_client
-
-    async def check_and_increment(self, key: str, limit: int, window_seconds: int) -> RateLimitResult:
-        now = time.time()
-        window_start = now - window_seconds
-
-        # Use Redis sorted set for sliding window
-        pipe = self.redis.pipeline()
-
-        # Remove old entries
-        pipe.zremrangebyscore(key, 0, window_start)
-
-        # Count current entries
-        pipe.zcount(key, window_start, now)
-
-        # Add current request
-        pipe.zadd(key, {str(now): now})
-
-        # Set expiry
-        pipe.expire(key, window_seconds + 1)
-
-        results = await pipe.execute()
-        current_count = results[1]
+class EngineBackend(RateLimiterBackend):
+    """
+    Backend partagé par le cluster : ``core.rate_limit_engine`` (fenêtre
+    glissante en un seul script Lua, pré-fetch local pour les clés chaudes,
+    fallback in-memory si Redis est absent ou en erreur).
+    """
 
-        reset_at = int(now + window_seconds)
+    def __init__(self, engine=None):
+        from core.rate_limit_engine import rate_limit_engine
 
-        if current_count >= limit:
-            # Rate limited - remove the request we just added
-            await self.redis.zrem(key, str(now))
+        self.engine = engine or rate_limit_engine
 
-            # Find retry_after
-            oldest = await self.redis.zrange(key, 0, 0, withscores=True)
-            retry_after = int(oldest[0][1] + window_seconds - now) + 1 if oldest else window_seconds
+    async def check_and_increment(self, key: str, limit: int, window_seconds: int) -> RateLimitResult:
+        from core.rate_limit_engine import RateRule
 
+        decision = await self.engine.hit(key, (RateRule(f"{window_seconds}s", limit, window_seconds),))
+        now = time.time()
+        if not decision.allowed:
             return RateLimitResult(
                 allowed=False,
                 limit=limit,
                 remaining=0,
-                reset_at=reset_at,
-                retry_after=retry_after,
+                reset_at=int(now + decision.retry_after_s),
+                retry_after=decision.retry_after_s,
             )
-
         return RateLimitResult(
             allowed=True,
             limit=limit,
-            remaining=limit - current_count - 1,
-            reset_at=reset_at,
+            remaining=decision.remaining,
+            reset_at=int(now + decision.reset_after),
         )
 
 
@@ -296,17 +275,18 @@ class RateLimiter:
             return
 
         self._initialized = True
-        self.backend: RateLimiterBackend = InMemoryBackend()
+        self.backend: RateLimiterBackend = EngineBackend()
         self._redis_available = False
 
     async def init_redis(self, redis_url: str):
-        """Initialize Redis backend"""
+        """Initialize Redis backend (client dédié, partagé avec le moteur)"""
         try:
             import redis.asyncio as redis
 
             client = redis.from_url(redis_url, decode_responses=True)
             await client.ping()
-            self.backend = RedisBackend(client)
+            if isinstance(self.backend, EngineBackend):
+                self.backend.engine.attach_redis(client)
             self._redis_available = True
             print("✅ [RATE_LIMITER] Redis backend initialized", flush=True)
         except Exception as e:
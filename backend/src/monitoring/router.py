@@ -15,7 +15,22 @@ from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, Header
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from auth.principal_cache import get_principal_cache_stats
+from chat.context_builder import get_chat_context_metrics
+from core.cpu_pool import get_cpu_pool_stats
+from core.hedging import get_hedging_stats
+from core.http_client import get_pool_stats
+from core.job_queue import get_job_queue_stats
+from core.llm_limiter import get_llm_limiter_snapshot
+from core.logging import get_log_queue_stats
+from core.media_process import get_media_process_stats
+from core.rate_limit_engine import get_rate_limit_stats
+from core.task_events import get_task_events_stats
+from exports.engine import get_export_engine_stats
 from monitoring.checks import run_all_checks, get_memory_usage
+from share.og_cache import get_og_cache_stats
+from tts.fanout import get_tts_fanout_stats
+from videos.chunk_cache import get_chunk_cache_metrics
 from db.database import get_session
 
 router = APIRouter(tags=["Monitoring"])
@@ -86,7 +101,9 @@ async def status():
 @router.get("/deep")
 async def deep_status(secret: str = ""):
     """
-    Deep health check — returns full status + memory + Redis.
+    Deep health check — returns full status + memory + Redis + HTTP provider pools
+    + media subprocess engine (ffmpeg / yt-dlp) + hedging latency histograms
+    + per-chunk LLM analysis cache hit rates.
     Protected by HEALTH_CHECK_SECRET query param.
     Called by the Vercel serverless proxy to avoid exposing the secret client-side.
     """
@@ -119,6 +136,21 @@ async def deep_status(secret: str = ""):
         "uptime_seconds": uptime,
         "memory": get_memory_usage(),
         "services": services,
+        "http_pools": get_pool_stats(),
+        "media_processes": get_media_process_stats(),
+        "hedging": get_hedging_stats(),
+        "chunk_cache": await get_chunk_cache_metrics(),
+        "chat_context": await get_chat_context_metrics(),
+        "llm_limiter": await get_llm_limiter_snapshot(),
+        "logging": get_log_queue_stats(),
+        "auth_principal": get_principal_cache_stats(),
+        "rate_limit": get_rate_limit_stats(),
+        "cpu_pool": get_cpu_pool_stats(),
+        "share_og": get_og_cache_stats(),
+        "exports": get_export_engine_stats(),
+        "tts_fanout": get_tts_fanout_stats(),
+        "task_events": get_task_events_stats(),
+        "jobs": await get_job_queue_stats(),
         "checked_at": datetime.now(timezone.utc).isoformat(),
     }
 
@@ -404,6 +404,7 @@ async def _sequential_fallback(
                 max_tokens=5000,
                 temperature=0.3,
                 timeout=180,
+                priority="batch",
             )
 
             if result and result.content:
@@ -12,7 +12,6 @@
 """
 
 import asyncio
-import httpx
 from uuid import uuid4
 from datetime import datetime
 from typing import Optional, Dict, Any, List, Callable, Awaitable
@@ -21,6 +20,8 @@ from dataclasses import dataclass, field
 
 from db.database import User, Summary, PlaylistAnalysis, VideoChunk
 from core.config import get_mistral_key
+from core.http_client import provider_client
+from core.llm_limiter import llm_limiter, llm_priority
 from videos.analysis import generate_summary, detect_category
 from transcripts import extract_video_id, get_video_info, get_transcript_with_timestamps
 
@@ -199,6 +200,9 @@ async def run_playlist_pipeline(
     results: List[Optional[VideoResult]] = [None] * len(video_ids)
 
     async def process_one_video(idx: int, video_id: str):
+        # Travail de fond : chaque appel LLM de la vidéo (generate_summary → llm_complete
+        # compris) cède la place au chat dans core.llm_limiter
+        priority_token = llm_priority.set("batch")
         async with semaphore:
             try:
                 result = await _process_single_video(
@@ -216,6 +220,7 @@ async def run_playlist_pipeline(
                 logger.error(f"pipeline_video_error: video={video_id} error={e}")
                 progress.skipped_videos.append({"video_id": video_id, "reason": str(e)[:200]})
             finally:
+                llm_priority.reset(priority_token)
                 progress.completed_videos += 1
                 progress.percent = 5 + int((progress.completed_videos / progress.total_videos) * 75)
                 await _notify(progress)
@@ -600,18 +605,20 @@ Don't say "in this segment" — write as if it were a standalone article.
 Length: 150-300 words.
 🌐 RESPOND IN ENGLISH."""
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "https://api.mistral.ai/v1/chat/completions",
-            headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
-            json={
-                "model": model,
-                "messages": [{"role": "user", "content": prompt}],
-                "max_tokens": 1200,
-                "temperature": 0.25,
-            },
-            timeout=CHUNK_SUMMARY_TIMEOUT,
-        )
+    async with provider_client("mistral") as client:
+        async with llm_limiter.slot(f"mistral:{model}", "batch") as slot:
+            response = await client.post(
+                "https://api.mistral.ai/v1/chat/completions",
+                headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+                json={
+                    "model": model,
+                    "messages": [{"role": "user", "content": prompt}],
+                    "max_tokens": 1200,
+                    "temperature": 0.25,
+                },
+                timeout=CHUNK_SUMMARY_TIMEOUT,
+            )
+            slot.observe(response.status_code)
         if response.status_code == 200:
             return response.json()["choices"][0]["message"]["content"]
         elif response.status_code == 429:
@@ -713,18 +720,20 @@ Format:
 🌐 RESPOND ONLY IN ENGLISH."""
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.mistral.ai/v1/chat/completions",
-                headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
-                json={
-                    "model": model,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "max_tokens": max_tokens,
-                    "temperature": 0.3,
-                },
-                timeout=MERGE_SUMMARY_TIMEOUT,
-            )
+        async with provider_client("mistral") as client:
+            async with llm_limiter.slot(f"mistral:{model}", "batch") as slot:
+                response = await client.post(
+                    "https://api.mistral.ai/v1/chat/completions",
+                    headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+                    json={
+                        "model": model,
+                        "messages": [{"role": "user", "content": prompt}],
+                        "max_tokens": max_tokens,
+                        "temperature": 0.3,
+                    },
+                    timeout=MERGE_SUMMARY_TIMEOUT,
+                )
+                slot.observe(response.status_code)
             if response.status_code == 200:
                 content = response.json()["choices"][0]["message"]["content"]
                 logger.info(f"merge_complete: title={title[:40]} chunks={num_chunks} result={len(content)} chars")
@@ -822,19 +831,21 @@ Be analytical and precise. Cite videos by number.
 🌐 RESPOND IN ENGLISH."""
 
     try:
-        async with httpx.AsyncClient() as client:
+        async with provider_client("mistral") as client:
             # Pass 1
-            response1 = await client.post(
-                "https://api.mistral.ai/v1/chat/completions",
-                headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
-                json={
-                    "model": model,
-                    "messages": [{"role": "user", "content": pass1_prompt}],
-                    "max_tokens": 4000,
-                    "temperature": 0.3,
-                },
-                timeout=180,
-            )
+            async with llm_limiter.slot(f"mistral:{model}", "batch") as slot:
+                response1 = await client.post(
+                    "https://api.mistral.ai/v1/chat/completions",
+                    headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+                    json={
+                        "model": model,
+                        "messages": [{"role": "user", "content": pass1_prompt}],
+                        "max_tokens": 4000,
+                        "temperature": 0.3,
+                    },
+                    timeout=180,
+                )
+                slot.observe(response1.status_code)
 
             if response1.status_code != 200:
                 logger.error(f"meta_pass1_failed: status={response1.status_code}")
@@ -913,17 +924,19 @@ Be exhaustive and analytical. The quality of this meta-analysis is critical.
 
             # Pass 2
             max_tokens_pass2 = min(6000, 2000 + num_videos * 500)
-            response2 = await client.post(
-                "https://api.mistral.ai/v1/chat/completions",
-                headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
-                json={
-                    "model": model,
-                    "messages": [{"role": "user", "content": pass2_prompt}],
-                    "max_tokens": max_tokens_pass2,
-                    "temperature": 0.35,
-                },
-                timeout=180,
-            )
+            async with llm_limiter.slot(f"mistral:{model}", "batch") as slot:
+                response2 = await client.post(
+                    "https://api.mistral.ai/v1/chat/completions",
+                    headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+                    json={
+                        "model": model,
+                        "messages": [{"role": "user", "content": pass2_prompt}],
+                        "max_tokens": max_tokens_pass2,
+                        "temperature": 0.35,
+                    },
+                    timeout=180,
+                )
+                slot.observe(response2.status_code)
 
             if response2.status_code == 200:
                 content = response2.json()["choices"][0]["message"]["content"]
@@ -14,21 +14,24 @@
 """
 
 import json
-import httpx
 import re
 import hashlib
 from uuid import uuid4
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List, Tuple
 from collections import Counter, OrderedDict
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete, func
 
 from db.database import get_session, User, Summary, PlaylistAnalysis, PlaylistChatMessage, VideoChunk
-from auth.dependencies import get_current_user
+from auth.dependencies import get_current_user, get_current_user_sse
 from core.config import get_mistral_key
+from core.http_client import provider_client
+from core.task_events import SSE_HEADERS, parse_last_event_id, task_event_stream
+from core.task_store import playlist_task_store as _playlist_task_store
 from billing.plan_config import get_limits
 from videos.web_search_provider import web_search_and_synthesize
 from transcripts import extract_playlist_id, get_playlist_videos, get_playlist_info
@@ -91,7 +94,8 @@ class ChatCorpusResponse(BaseModel):
 # 🗄️ CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════════════════
 
-_playlist_task_store: Dict[str, Dict[str, Any]] = {}
+# _playlist_task_store (core.task_store) : dict synchronisé Redis, chaque mise à jour
+# est poussée aux clients SSE de /task/{task_id}/events quel que soit le worker.
 
 
 PLAN_MODELS = {
@@ -780,6 +784,7 @@ async def analyze_playlist(
         "current_video": 0,
         "total_videos": 0,
         "result": None,
+        "user_id": current_user.id,
     }
 
     background_tasks.add_task(
@@ -801,7 +806,7 @@ async def analyze_playlist(
 @router.get("/task/{task_id}", response_model=PlaylistTaskStatus)
 async def get_task_status(task_id: str):
     """Récupère le statut d'une tâche d'analyse."""
-    task = _playlist_task_store.get(task_id)
+    task = await _playlist_task_store.aget(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Tâche non trouvée")
 
@@ -816,6 +821,37 @@ async def get_task_status(task_id: str):
     )
 
 
+@router.get("/task/{task_id}/events")
+async def stream_task_events(
+    task_id: str,
+    request: Request,
+    last_event_id: Optional[str] = Query(None, description="Reprise si le header Last-Event-ID est absent"),
+    current_user: User = Depends(get_current_user_sse),
+):
+    """
+    📣 Progression d'une analyse playlist/corpus poussée en SSE (au lieu du polling).
+
+    Événements `progress` (champs de /task/{task_id}) puis `end` au statut terminal ;
+    reprise via Last-Event-ID.
+    """
+    snapshot, event_id = await _playlist_task_store.aget_snapshot(task_id)
+    if snapshot is None or snapshot.get("user_id") != current_user.id:
+        raise HTTPException(status_code=404, detail="Tâche non trouvée")
+
+    return StreamingResponse(
+        task_event_stream(
+            _playlist_task_store,
+            task_id,
+            snapshot,
+            event_id,
+            last_event_id=parse_last_event_id(request.headers.get("last-event-id"), last_event_id),
+            is_disconnected=request.is_disconnected,
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
 @router.post("/corpus/analyze", response_model=PlaylistTaskStatus)
 @router.post("/analyze-corpus", response_model=PlaylistTaskStatus, include_in_schema=False)
 async def analyze_corpus(
@@ -854,6 +890,7 @@ async def analyze_corpus(
         "current_video": 0,
         "total_videos": len(request.urls),
         "result": None,
+        "user_id": current_user.id,
     }
 
     background_tasks.add_task(
@@ -2187,7 +2224,7 @@ QUESTION: {question}
 {final_instruction}"""
 
     try:
-        async with httpx.AsyncClient() as client:
+        async with provider_client("mistral") as client:
             response = await client.post(
                 "https://api.mistral.ai/v1/chat/completions",
                 headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
@@ -2662,7 +2699,7 @@ Which video to start with? What viewing order do you recommend and why?
 """
 
     try:
-        async with httpx.AsyncClient() as client:
+        async with provider_client("mistral") as client:
             response = await client.post(
                 "https://api.mistral.ai/v1/chat/completions",
                 headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
@@ -0,0 +1,319 @@
+"""Chargeur unifié de candidats + scoring vectorisé pour search_within / search_global.
+
+Au lieu d'une requête + d'une boucle Python de scoring par type de source
+(summary / flashcard / quiz / chat / transcript), on :
+
+1. construit une seule requête ``UNION ALL`` dont chaque branche projette les
+   mêmes colonnes (``source_type`` littéral + colonnes NULL typées pour les
+   champs absents du type) → un seul aller-retour DB ;
+2. empile tous les vecteurs dans une matrice ``float32`` (concaténation des
+   blobs ``embedding_vec`` puis ``frombuffer`` quand c'est possible) ;
+3. score en un seul ``matmul`` contre la query normalisée et sélectionne le
+   top-k via ``argpartition`` au lieu de trier tous les candidats.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import numpy as np
+from sqlalchemy import Integer, LargeBinary, String, Text, cast, literal, null, select, union_all
+
+from db.database import (
+    Summary,
+    SummaryEmbedding,
+    Flashcard,
+    FlashcardEmbedding,
+    QuizQuestion,
+    QuizEmbedding,
+    ChatEmbedding,
+    TranscriptEmbedding,
+    TranscriptCache,
+)
+from .vector_codec import EMBEDDING_DTYPE, decode_embedding
+
+# Colonnes communes à toutes les branches de l'UNION (ordre fixe)
+_COLUMNS = {
+    "row_id": Integer,
+    "source_id": Integer,
+    "summary_id": Integer,
+    "embedding_vec": LargeBinary,
+    "embedding_json": Text,
+    "text_preview": String,
+    "source_metadata": Text,
+    "section_ref": String,
+    "position": Integer,
+    "turn_index": Integer,
+    "user_message_id": Integer,
+    "agent_message_id": Integer,
+    "chunk_index": Integer,
+    "video_id": String,
+    "summary_title": String,
+    "summary_thumbnail": Text,
+    "channel": String,
+}
+
+
+def _columns(source_type: str, **exprs) -> list:
+    """Projette les colonnes communes ; les champs absents deviennent NULL typés."""
+    cols = [literal(source_type, String).label("source_type")]
+    for name, type_ in _COLUMNS.items():
+        expr = exprs.get(name)
+        cols.append((expr if expr is not None else cast(null(), type_)).label(name))
+    return cols
+
+
+def _summary_columns() -> dict:
+    return {
+        "summary_title": Summary.video_title,
+        "summary_thumbnail": Summary.thumbnail_url,
+        "video_id": Summary.video_id,
+        "channel": Summary.video_channel,
+    }
+
+
+def _vector_columns(emb) -> dict:
+    return {
+        "row_id": emb.id,
+        "embedding_vec": emb.embedding_vec,
+        "embedding_json": emb.embedding_json,
+        "text_preview": emb.text_preview,
+    }
+
+
+def global_candidates_query(user_id: int, source_types: Sequence[str], apply_filters):
+    """UNION ALL des embeddings d'un user, filtrés via ``apply_filters(stmt)`` (table Summary).
+
+    Retourne None si aucun type de source n'est demandé.
+    """
+    branches = []
+    if "summary" in source_types:
+        stmt = select(
+            *_columns(
+                "summary",
+                **_vector_columns(SummaryEmbedding),
+                **_summary_columns(),
+                source_id=SummaryEmbedding.id,
+                summary_id=Summary.id,
+                source_metadata=SummaryEmbedding.source_metadata,
+                section_ref=SummaryEmbedding.section_ref,
+            )
+        ).select_from(SummaryEmbedding).join(Summary, SummaryEmbedding.summary_id == Summary.id)
+        branches.append(apply_filters(stmt.where(SummaryEmbedding.user_id == user_id)))
+
+    if "flashcard" in source_types:
+        stmt = (
+            select(
+                *_columns(
+                    "flashcard",
+                    **_vector_columns(FlashcardEmbedding),
+                    **_summary_columns(),
+                    source_id=Flashcard.id,
+                    summary_id=Summary.id,
+                    position=Flashcard.position,
+                )
+            )
+            .select_from(FlashcardEmbedding)
+            .join(Flashcard, FlashcardEmbedding.flashcard_id == Flashcard.id)
+            .join(Summary, FlashcardEmbedding.summary_id == Summary.id)
+        )
+        branches.append(apply_filters(stmt.where(FlashcardEmbedding.user_id == user_id)))
+
+    if "quiz" in source_types:
+        stmt = (
+            select(
+                *_columns(
+                    "quiz",
+                    **_vector_columns(QuizEmbedding),
+                    **_summary_columns(),
+                    source_id=QuizQuestion.id,
+                    summary_id=Summary.id,
+                    position=QuizQuestion.position,
+                )
+            )
+            .select_from(QuizEmbedding)
+            .join(QuizQuestion, QuizEmbedding.quiz_question_id == QuizQuestion.id)
+            .join(Summary, QuizEmbedding.summary_id == Summary.id)
+        )
+        branches.append(apply_filters(stmt.where(QuizEmbedding.user_id == user_id)))
+
+    if "chat" in source_types:
+        stmt = select(
+            *_columns(
+                "chat",
+                **_vector_columns(ChatEmbedding),
+                **_summary_columns(),
+                source_id=ChatEmbedding.id,
+                summary_id=Summary.id,
+                turn_index=ChatEmbedding.turn_index,
+                user_message_id=ChatEmbedding.user_message_id,
+                agent_message_id=ChatEmbedding.agent_message_id,
+            )
+        ).select_from(ChatEmbedding).join(Summary, ChatEmbedding.summary_id == Summary.id)
+        branches.append(apply_filters(stmt.where(ChatEmbedding.user_id == user_id)))
+
+    if "transcript" in source_types:
+        # Le transcript est cross-user mais on ne montre que si le user a une
+        # Summary qui pointe sur ce video_id.
+        stmt = (
+            select(
+                *_columns(
+                    "transcript",
+                    **_vector_columns(TranscriptEmbedding),
+                    **_summary_columns(),
+                    source_id=TranscriptEmbedding.id,
+                    summary_id=Summary.id,
+                    chunk_index=TranscriptEmbedding.chunk_index,
+                )
+            )
+            .select_from(TranscriptEmbedding)
+            .join(TranscriptCache, TranscriptEmbedding.video_id == TranscriptCache.video_id)
+            .join(Summary, Summary.video_id == TranscriptCache.video_id)
+        )
+        branches.append(apply_filters(stmt.where(Summary.user_id == user_id)))
+
+    return _union(branches)
+
+
+def within_candidates_query(summary_id: int, video_id: Optional[str], source_types: Sequence[str]):
+    """UNION ALL des embeddings rattachés à un seul summary (+ transcript de sa vidéo)."""
+    branches = []
+    if "summary" in source_types:
+        branches.append(
+            select(
+                *_columns(
+                    "summary",
+                    **_vector_columns(SummaryEmbedding),
+                    source_id=SummaryEmbedding.id,
+                    summary_id=SummaryEmbedding.summary_id,
+                    source_metadata=SummaryEmbedding.source_metadata,
+                    section_ref=SummaryEmbedding.section_ref,
+                )
+            ).where(SummaryEmbedding.summary_id == summary_id)
+        )
+
+    if "flashcard" in source_types:
+        branches.append(
+            select(
+                *_columns(
+                    "flashcard",
+                    **_vector_columns(FlashcardEmbedding),
+                    source_id=Flashcard.id,
+                    summary_id=FlashcardEmbedding.summary_id,
+                    position=Flashcard.position,
+                )
+            )
+            .select_from(FlashcardEmbedding)
+            .join(Flashcard, FlashcardEmbedding.flashcard_id == Flashcard.id)
+            .where(FlashcardEmbedding.summary_id == summary_id)
+        )
+
+    if "quiz" in source_types:
+        branches.append(
+            select(
+                *_columns(
+                    "quiz",
+                    **_vector_columns(QuizEmbedding),
+                    source_id=QuizQuestion.id,
+                    summary_id=QuizEmbedding.summary_id,
+                    position=QuizQuestion.position,
+                )
+            )
+            .select_from(QuizEmbedding)
+            .join(QuizQuestion, QuizEmbedding.quiz_question_id == QuizQuestion.id)
+            .where(QuizEmbedding.summary_id == summary_id)
+        )
+
+    if "chat" in source_types:
+        branches.append(
+            select(
+                *_columns(
+                    "chat",
+                    **_vector_columns(ChatEmbedding),
+                    source_id=ChatEmbedding.id,
+                    summary_id=ChatEmbedding.summary_id,
+                    turn_index=ChatEmbedding.turn_index,
+                )
+            ).where(ChatEmbedding.summary_id == summary_id)
+        )
+
+    if "transcript" in source_types and video_id:
+        branches.append(
+            select(
+                *_columns(
+                    "transcript",
+                    **_vector_columns(TranscriptEmbedding),
+                    source_id=TranscriptEmbedding.id,
+                    summary_id=literal(summary_id, Integer),
+                    chunk_index=TranscriptEmbedding.chunk_index,
+                )
+            ).where(TranscriptEmbedding.video_id == video_id)
+        )
+
+    return _union(branches)
+
+
+def _union(branches: list):
+    if not branches:
+        return None
+    if len(branches) == 1:
+        return branches[0]
+    return union_all(*branches)
+
+
+async def load_candidates(session, stmt) -> list:
+    """Exécute la requête unifiée (un seul aller-retour DB)."""
+    if stmt is None:
+        return []
+    return list((await session.execute(stmt)).all())
+
+
+def _stack(rows: Sequence, dim: int) -> tuple[np.ndarray, list[int]]:
+    """Empile les vecteurs des rows en matrice (n, dim) ; retourne aussi les indices gardés."""
+    blobs = [row.embedding_vec for row in rows]
+    row_bytes = dim * EMBEDDING_DTYPE.itemsize
+    if all(blob is not None and len(blob) == row_bytes for blob in blobs):
+        # Chemin rapide : une seule concaténation + frombuffer
+        return np.frombuffer(b"".join(blobs), dtype=EMBEDDING_DTYPE).reshape(len(rows), dim), list(range(len(rows)))
+
+    vectors, kept = [], []
+    for i, row in enumerate(rows):
+        vec = decode_embedding(row.embedding_vec, row.embedding_json)
+        if vec is not None and len(vec) == dim:
+            vectors.append(vec)
+            kept.append(i)
+    if not vectors:
+        return np.empty((0, dim), dtype=EMBEDDING_DTYPE), []
+    return np.stack(vectors), kept
+
+
+def score_candidates(
+    query_embedding: Sequence[float],
+    rows: Sequence,
+    min_score: float,
+    limit: Optional[int] = None,
+) -> list[tuple[object, float]]:
+    """Score toutes les rows en un seul passage ; retourne [(row, score)] triés décroissant.
+
+    Seules les rows avec ``score >= min_score`` sont gardées ; si ``limit`` est
+    fourni, seul le top-``limit`` est extrait (``argpartition``) puis trié.
+    """
+    if not rows or limit == 0:
+        return []
+    query = np.asarray(query_embedding, dtype=np.float32)
+    query_norm = float(np.linalg.norm(query))
+    if query_norm == 0:
+        return []
+
+    matrix, kept = _stack(rows, len(query))
+    if not kept:
+        return []
+    norms = np.linalg.norm(matrix, axis=1)
+    norms[norms == 0] = np.inf  # vecteur nul → score 0
+    scores = (matrix @ (query / query_norm)) / norms
+
+    passing = np.flatnonzero(scores >= min_score)
+    if limit is not None and len(passing) > limit:
+        passing = passing[np.argpartition(-scores[passing], limit - 1)[:limit]]
+    order = passing[np.argsort(-scores[passing], kind="stable")]
+    return [(rows[kept[i]], float(scores[i])) for i in order]
@@ -0,0 +1,280 @@
+"""Micro-batching adaptatif des appels d'embedding Mistral.
+
+Les writers ``embed_*`` (summary, flashcards, quiz, chat, transcript) sont
+lancés en fire-and-forget juste après les écritures : une rafale d'analyses
+produisait des dizaines de petits POST ``/v1/embeddings`` concurrents (10
+textes max chacun) et des 429.
+
+Ici, tous les textes en attente passent par UNE file par event loop :
+
+- un worker draine la file et coalesce les textes de tous les writers en
+  requêtes aussi grosses que possible (``EMBED_BATCH_MAX_ITEMS`` textes /
+  ``EMBED_BATCH_MAX_CHARS`` caractères) ;
+- fenêtre de linger adaptative : si la file est déjà pleine on part tout de
+  suite, sinon on attend au plus ``EMBED_BATCH_LINGER_MS`` que d'autres
+  writers arrivent ;
+- un token bucket (``EMBED_REQUESTS_PER_SECOND`` / ``EMBED_BURST``) borne le
+  débit de requêtes vers Mistral, et ``EMBED_BATCH_CONCURRENCY`` le nombre de
+  requêtes en vol ;
+- ``get_stats()`` expose profondeur de file, tailles de batch et latences.
+
+Usage::
+
+    from search.embedding_service import embedding_batcher
+
+    vectors = await embedding_batcher.embed_many(texts)  # list[Optional[list]]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+EMBED_BATCHER_ENABLED = os.getenv("EMBED_BATCHER_ENABLED", "true").lower() == "true"
+EMBED_BATCH_MAX_ITEMS = int(os.getenv("EMBED_BATCH_MAX_ITEMS", "32"))
+EMBED_BATCH_MAX_CHARS = int(os.getenv("EMBED_BATCH_MAX_CHARS", "48000"))  # ~12k tokens
+EMBED_BATCH_LINGER_MS = float(os.getenv("EMBED_BATCH_LINGER_MS", "25"))
+EMBED_BATCH_CONCURRENCY = int(os.getenv("EMBED_BATCH_CONCURRENCY", "4"))
+EMBED_REQUESTS_PER_SECOND = float(os.getenv("EMBED_REQUESTS_PER_SECOND", "5"))
+EMBED_BURST = int(os.getenv("EMBED_BURST", "5"))
+
+# generate_embeddings_batch tronque chaque texte à 8000 caractères
+_MAX_TEXT_CHARS = 8000
+
+EmbedFn = Callable[[list], Awaitable[list]]
+
+
+class TokenBucket:
+    """Token bucket asynchrone : ``rate`` jetons/s, capacité ``burst``."""
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._clock = clock
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """Prend un jeton si possible ; sinon retourne le délai d'attente (secondes)."""
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate if self.rate > 0 else 1.0
+
+    async def acquire(self) -> float:
+        """Attend un jeton ; retourne le temps total passé à attendre."""
+        waited = 0.0
+        while True:
+            delay = self.try_acquire()
+            if delay <= 0:
+                return waited
+            await asyncio.sleep(delay)
+            waited += delay
+
+
+@dataclass
+class _Pending:
+    text: str
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class BatcherStats:
+    enqueued: int = 0
+    batches: int = 0
+    embedded: int = 0
+    failed: int = 0
+    throttled_seconds: float = 0.0
+    queue_wait_ms_sum: float = 0.0
+    request_ms_sum: float = 0.0
+    max_batch_size: int = 0
+
+    def to_dict(self, queue_depth: int, in_flight: int) -> dict:
+        done = self.embedded + self.failed
+        return {
+            "queue_depth": queue_depth,
+            "in_flight_batches": in_flight,
+            "enqueued": self.enqueued,
+            "batches": self.batches,
+            "embedded": self.embedded,
+            "failed": self.failed,
+            "avg_batch_size": round(done / self.batches, 1) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "avg_queue_wait_ms": round(self.queue_wait_ms_sum / done, 1) if done else 0.0,
+            "avg_request_ms": round(self.request_ms_sum / self.batches, 1) if self.batches else 0.0,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+        }
+
+
+class EmbeddingBatcher:
+    """File d'embeddings partagée par tous les writers, drainée par un worker."""
+
+    def __init__(
+        self,
+        embed_fn: EmbedFn,
+        *,
+        max_items: int = EMBED_BATCH_MAX_ITEMS,
+        max_chars: int = EMBED_BATCH_MAX_CHARS,
+        linger_ms: float = EMBED_BATCH_LINGER_MS,
+        concurrency: int = EMBED_BATCH_CONCURRENCY,
+        bucket: Optional[TokenBucket] = None,
+        enabled: bool = EMBED_BATCHER_ENABLED,
+    ):
+        self._embed_fn = embed_fn
+        self.max_items = max_items
+        self.max_chars = max_chars
+        self.linger = linger_ms / 1000
+        self.concurrency = concurrency
+        self.enabled = enabled
+        self.bucket = bucket or TokenBucket(EMBED_REQUESTS_PER_SECOND, EMBED_BURST)
+        self.stats = BatcherStats()
+        self._queue: deque[_Pending] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._in_flight: set[asyncio.Task] = set()
+
+    # ── API writers ───────────────────────────────────────────────────────
+
+    async def embed_many(self, texts: Sequence[str]) -> list[Optional[list]]:
+        """Embeddings de ``texts`` (même ordre ; None pour un texte en échec)."""
+        if not texts:
+            return []
+        if not self.enabled:
+            return await self._embed_direct(list(texts))
+
+        self._ensure_worker()
+        loop = asyncio.get_running_loop()
+        items = [_Pending(text, loop.create_future()) for text in texts]
+        self._queue.extend(items)
+        self.stats.enqueued += len(items)
+        self._wakeup.set()
+        return list(await asyncio.gather(*(item.future for item in items)))
+
+    async def embed_one(self, text: str) -> Optional[list]:
+        return (await self.embed_many([text]))[0]
+
+    async def _embed_direct(self, texts: list) -> list:
+        """Chemin sans file (batcher désactivé) : batches séquentiels de ``max_items``."""
+        results: list = []
+        for i in range(0, len(texts), self.max_items):
+            results.extend(await self._embed_fn(texts[i : i + self.max_items]))
+        return results
+
+    # ── Worker ────────────────────────────────────────────────────────────
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._worker is not None and not self._worker.done() and self._loop is loop:
+            return
+        # Nouvel event loop (tests, reload) : l'état lié à l'ancien loop est jeté
+        self._loop = loop
+        self._queue.clear()
+        self._in_flight.clear()
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._worker = loop.create_task(self._run(), name="embedding-batcher")
+
+    def _take_batch(self) -> list[_Pending]:
+        batch: list[_Pending] = []
+        chars = 0
+        while self._queue and len(batch) < self.max_items:
+            size = min(len(self._queue[0].text), _MAX_TEXT_CHARS)
+            if batch and chars + size > self.max_chars:
+                break
+            batch.append(self._queue.popleft())
+            chars += size
+        return batch
+
+    def _batch_full(self) -> bool:
+        if len(self._queue) >= self.max_items:
+            return True
+        return sum(min(len(p.text), _MAX_TEXT_CHARS) for p in self._queue) >= self.max_chars
+
+    async def _run(self) -> None:
+        while True:
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+            # Linger : laisse les autres writers rejoindre le batch, sauf s'il est déjà plein
+            deadline = self._queue[0].enqueued_at + self.linger
+            while not self._batch_full():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            await self._slots.acquire()
+            self.stats.throttled_seconds += await self.bucket.acquire()
+            batch = self._take_batch()
+            if not batch:
+                self._slots.release()
+                continue
+            task = asyncio.create_task(self._dispatch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _dispatch(self, batch: list[_Pending]) -> None:
+        started = time.monotonic()
+        try:
+            vectors = await self._embed_fn([item.text for item in batch])
+            if len(vectors) != len(batch):
+                raise ValueError(f"expected {len(batch)} embeddings, got {len(vectors)}")
+        except Exception as e:
+            logger.warning(f"[EMBED-BATCH] batch of {len(batch)} failed: {e}")
+            vectors = [None] * len(batch)
+        finally:
+            self._slots.release()
+
+        finished = time.monotonic()
+        stats = self.stats
+        stats.batches += 1
+        stats.max_batch_size = max(stats.max_batch_size, len(batch))
+        stats.request_ms_sum += (finished - started) * 1000
+        for item, vector in zip(batch, vectors):
+            stats.queue_wait_ms_sum += (started - item.enqueued_at) * 1000
+            if vector is None:
+                stats.failed += 1
+            else:
+                stats.embedded += 1
+            if not item.future.done():
+                item.future.set_result(vector)
+
+    async def stop(self) -> None:
+        """Arrête le worker (shutdown) ; les textes encore en file reçoivent None."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except (asyncio.CancelledError, RuntimeError):
+                pass
+            self._worker = None
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        while self._queue:
+            item = self._queue.popleft()
+            if not item.future.done():
+                item.future.set_result(None)
+
+    def get_stats(self) -> dict:
+        return self.stats.to_dict(len(self._queue), len(self._in_flight))
@@ -6,15 +6,18 @@ cosine similarity search across all stored embeddings.
 """
 
 import json
-import math
 import logging
 from typing import Optional
 
-import httpx
-from sqlalchemy import select
+import numpy as np
+from sqlalchemy import insert, select
 
 from db.database import async_session_maker, TranscriptCache, TranscriptCacheChunk, TranscriptEmbedding
 from core.config import MISTRAL_API_KEY
+from core.http_client import provider_client
+from .embedding_batcher import EmbeddingBatcher
+from .vector_codec import embedding_columns
+from .vector_index import IndexedChunk, transcript_index
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +42,6 @@ MISTRAL_EMBED_MODEL = "mistral-embed"
 MODEL_VERSION_TAG = "mistral-embed"  # written to TranscriptEmbedding.model_version
 EMBEDDING_DIMENSION = 1024  # invariant — guarded by re-embedding script
 CHUNK_WORDS = 500
-BATCH_SIZE = 10
 MIN_SIMILARITY = 0.3
 
 
@@ -51,10 +53,11 @@ async def generate_embedding(text: str) -> Optional[list]:
         return None
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with provider_client("mistral", timeout=30.0) as client:
             resp = await client.post(
                 MISTRAL_EMBED_URL,
                 headers={"Authorization": f"Bearer {api_key}"},
+                timeout=30.0,
                 json={"model": MISTRAL_EMBED_MODEL, "input": [text[:8000]]},
             )
             resp.raise_for_status()
@@ -66,17 +69,18 @@ async def generate_embedding(text: str) -> Optional[list]:
 
 
 async def generate_embeddings_batch(texts: list[str]) -> list[Optional[list]]:
-    """Generate embeddings for a batch of texts (max 10)."""
+    """Generate embeddings for a batch of texts (one API call, sized by the batcher)."""
     api_key = MISTRAL_API_KEY
     if not api_key:
         return [None] * len(texts)
 
     try:
         truncated = [t[:8000] for t in texts]
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        async with provider_client("mistral", timeout=60.0) as client:
             resp = await client.post(
                 MISTRAL_EMBED_URL,
                 headers={"Authorization": f"Bearer {api_key}"},
+                timeout=60.0,
                 json={"model": MISTRAL_EMBED_MODEL, "input": truncated},
             )
             resp.raise_for_status()
@@ -87,6 +91,12 @@ async def generate_embeddings_batch(texts: list[str]) -> list[Optional[list]]:
         return [None] * len(texts)
 
 
+# File partagée par tous les writers embed_* : coalesce leurs textes en requêtes
+# pleines, sous token bucket (cf. search/embedding_batcher.py). Le lambda résout
+# generate_embeddings_batch à l'appel (monkeypatch-friendly).
+embedding_batcher = EmbeddingBatcher(lambda texts: generate_embeddings_batch(texts))
+
+
 def _chunk_text(text: str, words_per_chunk: int = CHUNK_WORDS) -> list[str]:
     """Split text into chunks of approximately words_per_chunk words."""
     words = text.split()
@@ -101,14 +111,15 @@ def _chunk_text(text: str, words_per_chunk: int = CHUNK_WORDS) -> list[str]:
     return chunks
 
 
-def _cosine_similarity(a: list, b: list) -> float:
-    """Pure Python cosine similarity — no numpy needed."""
-    dot = sum(x * y for x, y in zip(a, b))
-    norm_a = math.sqrt(sum(x * x for x in a))
-    norm_b = math.sqrt(sum(x * x for x in b))
+def _cosine_similarity(a, b) -> float:
+    """Cosine similarity between two vectors (lists or numpy arrays)."""
+    a = np.asarray(a, dtype=np.float32)
+    b = np.asarray(b, dtype=np.float32)
+    norm_a = float(np.linalg.norm(a))
+    norm_b = float(np.linalg.norm(b))
     if norm_a == 0 or norm_b == 0:
         return 0.0
-    return dot / (norm_a * norm_b)
+    return float(np.dot(a, b)) / (norm_a * norm_b)
 
 
 async def embed_transcript(video_id: str) -> bool:
@@ -148,32 +159,54 @@ async def embed_transcript(video_id: str) -> bool:
             text_chunks = _chunk_text(full_text)
             logger.info(f"[EMBED] Processing {video_id}: {len(text_chunks)} chunks")
 
-            # Generate embeddings in batches
-            all_embeddings = []
-            for i in range(0, len(text_chunks), BATCH_SIZE):
-                batch = text_chunks[i : i + BATCH_SIZE]
-                embeddings = await generate_embeddings_batch(batch)
-                all_embeddings.extend(embeddings)
+            all_embeddings = await embedding_batcher.embed_many(text_chunks)
 
-            # Store embeddings
-            stored = 0
+            # Store embeddings (bulk INSERT … RETURNING id)
+            rows = []
+            vectors = []
             for idx, (chunk_text, embedding) in enumerate(zip(text_chunks, all_embeddings)):
                 if embedding is None:
                     continue
-                session.add(
-                    TranscriptEmbedding(
+                rows.append(
+                    dict(
                         video_id=video_id,
                         chunk_index=idx,
-                        embedding_json=json.dumps(embedding),
+                        **embedding_columns(embedding),
                         text_preview=chunk_text[:500],
                         token_count=len(chunk_text.split()),
                         model_version=MODEL_VERSION_TAG,
                     )
                 )
-                stored += 1
+                vectors.append(embedding)
 
+            row_ids = []
+            if rows:
+                result = await session.scalars(
+                    insert(TranscriptEmbedding).returning(TranscriptEmbedding.id, sort_by_parameter_order=True),
+                    rows,
+                )
+                row_ids = list(result)
             await session.commit()
-            logger.info(f"[EMBED] Stored {stored} embeddings for {video_id}")
+            logger.info(f"[EMBED] Stored {len(rows)} embeddings for {video_id}")
+
+            # Alimente l'index in-memory de ce worker (les autres rattrapent par keyset)
+            if rows and transcript_index.loaded:
+                transcript_index.add(
+                    [
+                        IndexedChunk(
+                            row_id=row_id,
+                            video_id=video_id,
+                            chunk_index=row["chunk_index"],
+                            text_preview=row["text_preview"],
+                            video_title=entry.video_title,
+                            video_channel=entry.video_channel,
+                            thumbnail_url=entry.thumbnail_url,
+                            category=entry.category,
+                        )
+                        for row_id, row in zip(row_ids, rows)
+                    ],
+                    vectors,
+                )
             return True
 
     except Exception as e:
@@ -225,18 +258,14 @@ async def embed_summary(summary_id: int) -> bool:
         # Préparer les textes à embed
         texts = [f"{section.get('title', '')}\n\n{section.get('summary', '')}" for section in sections]
 
+        # Embed via la file partagée (coalescée avec les autres writers)
+        all_embeddings = await embedding_batcher.embed_many(texts)
+
         # Delete existants (idempotence)
         await session.execute(sa_delete(SummaryEmbedding).where(SummaryEmbedding.summary_id == summary_id))
 
-        # Embed par batches de 10
-        all_embeddings: list = []
-        for i in range(0, len(texts), BATCH_SIZE):
-            batch = texts[i : i + BATCH_SIZE]
-            batch_embeddings = await generate_embeddings_batch(batch)
-            all_embeddings.extend(batch_embeddings)
-
-        # Insert
-        inserted = 0
+        # Insert (bulk)
+        rows: list[dict] = []
         for idx, (section, embedding) in enumerate(zip(sections, all_embeddings)):
             if embedding is None:
                 logger.warning(f"[EMBED-SUMMARY] Embedding {idx} failed for {summary_id}")
@@ -244,13 +273,13 @@ async def embed_summary(summary_id: int) -> bool:
             preview = (texts[idx] or "")[:497]
             if len(texts[idx]) > 500:
                 preview += "..."
-            session.add(
-                SummaryEmbedding(
+            rows.append(
+                dict(
                     summary_id=summary_id,
                     user_id=summary.user_id,
                     section_index=idx,
                     section_ref=str(section.get("ts")) if section.get("ts") else None,
-                    embedding_json=json.dumps(embedding),
+                    **embedding_columns(embedding),
                     text_preview=preview,
                     token_count=len(texts[idx].split()),
                     model_version=MODEL_VERSION_TAG,
@@ -264,8 +293,10 @@ async def embed_summary(summary_id: int) -> bool:
                     ),
                 )
             )
-            inserted += 1
 
+        if rows:
+            await session.execute(insert(SummaryEmbedding), rows)
+        inserted = len(rows)
         await session.commit()
         logger.info(f"[EMBED-SUMMARY] {summary_id}: {inserted}/{len(sections)} sections embedded")
         return inserted > 0
@@ -297,32 +328,27 @@ async def embed_flashcards(summary_id: int) -> bool:
             # Texts : "Q: ...\n\nA: ..."
             texts = [f"Q: {f.front}\n\nA: {f.back}" for f in flashcards]
 
+            all_embeddings = await embedding_batcher.embed_many(texts)
+
             # Delete existants
             await session.execute(sa_delete(FlashcardEmbedding).where(FlashcardEmbedding.summary_id == summary_id))
 
-            # Embed par batches
-            all_embeddings: list = []
-            for i in range(0, len(texts), BATCH_SIZE):
-                batch = texts[i : i + BATCH_SIZE]
-                all_embeddings.extend(await generate_embeddings_batch(batch))
-
             user_id = flashcards[0].user_id
-            inserted = 0
-            for f, embedding, text in zip(flashcards, all_embeddings, texts):
-                if embedding is None:
-                    continue
-                session.add(
-                    FlashcardEmbedding(
-                        flashcard_id=f.id,
-                        summary_id=summary_id,
-                        user_id=user_id,
-                        embedding_json=json.dumps(embedding),
-                        text_preview=text[:500],
-                        model_version=MODEL_VERSION_TAG,
-                    )
+            rows = [
+                dict(
+                    flashcard_id=f.id,
+                    summary_id=summary_id,
+                    user_id=user_id,
+                    **embedding_columns(embedding),
+                    text_preview=text[:500],
+                    model_version=MODEL_VERSION_TAG,
                 )
-                inserted += 1
-
+                for f, embedding, text in zip(flashcards, all_embeddings, texts)
+                if embedding is not None
+            ]
+            if rows:
+                await session.execute(insert(FlashcardEmbedding), rows)
+            inserted = len(rows)
             await session.commit()
             logger.info(f"[EMBED-FLASHCARD] {summary_id}: {inserted}/{len(flashcards)} flashcards embedded")
             return inserted > 0
@@ -366,32 +392,27 @@ async def embed_quiz(summary_id: int) -> bool:
                     correct_text = "?"
                 texts.append(f"Q: {q.question}\n\nBonne réponse : {correct_text}")
 
+            all_embeddings = await embedding_batcher.embed_many(texts)
+
             # Delete existants
             await session.execute(sa_delete(QuizEmbedding).where(QuizEmbedding.summary_id == summary_id))
 
-            # Embed par batches
-            all_embeddings: list = []
-            for i in range(0, len(texts), BATCH_SIZE):
-                batch = texts[i : i + BATCH_SIZE]
-                all_embeddings.extend(await generate_embeddings_batch(batch))
-
             user_id = questions[0].user_id
-            inserted = 0
-            for q, embedding, text in zip(questions, all_embeddings, texts):
-                if embedding is None:
-                    continue
-                session.add(
-                    QuizEmbedding(
-                        quiz_question_id=q.id,
-                        summary_id=summary_id,
-                        user_id=user_id,
-                        embedding_json=json.dumps(embedding),
-                        text_preview=text[:500],
-                        model_version=MODEL_VERSION_TAG,
-                    )
+            rows = [
+                dict(
+                    quiz_question_id=q.id,
+                    summary_id=summary_id,
+                    user_id=user_id,
+                    **embedding_columns(embedding),
+                    text_preview=text[:500],
+                    model_version=MODEL_VERSION_TAG,
                 )
-                inserted += 1
-
+                for q, embedding, text in zip(questions, all_embeddings, texts)
+                if embedding is not None
+            ]
+            if rows:
+                await session.execute(insert(QuizEmbedding), rows)
+            inserted = len(rows)
             await session.commit()
             logger.info(f"[EMBED-QUIZ] {summary_id}: {inserted}/{len(questions)} quiz embedded")
             return inserted > 0
@@ -458,7 +479,7 @@ async def embed_chat_turn(user_msg_id: int, agent_msg_id: int) -> bool:
 
             # Embed
             text = f"Q: {user_msg.content}\n\nA: {agent_msg.content}"
-            embedding = await generate_embedding(text)
+            embedding = await embedding_batcher.embed_one(text)
             if embedding is None:
                 logger.warning(f"[EMBED-CHAT] Embedding failed for turn {turn_index}")
                 return False
@@ -478,7 +499,7 @@ async def embed_chat_turn(user_msg_id: int, agent_msg_id: int) -> bool:
                     turn_index=turn_index,
                     user_message_id=user_msg_id,
                     agent_message_id=agent_msg_id,
-                    embedding_json=json.dumps(embedding),
+                    **embedding_columns(embedding),
                     text_preview=text[:500],
                     token_count=combined_tokens,
                     model_version=MODEL_VERSION_TAG,
@@ -502,68 +523,33 @@ async def search_similar(
 ) -> list[dict]:
     """
     Search for transcripts similar to the query using cosine similarity.
-    Returns top-N results with score > MIN_SIMILARITY.
+    Returns top-N results (best chunk per video) with score > MIN_SIMILARITY.
+
+    Scoring runs against the per-worker ``transcript_index`` (normalized
+    float32 matrix) instead of decoding every row from the DB.
     """
-    query_embedding = await generate_embedding(query)
+    from .query_cache import embed_query
+
+    query_embedding = await embed_query(query)
     if not query_embedding:
         return []
 
     try:
-        async with async_session_maker() as session:
-            # Load all embeddings (with optional category filter)
-            stmt = select(
-                TranscriptEmbedding.video_id,
-                TranscriptEmbedding.chunk_index,
-                TranscriptEmbedding.embedding_json,
-                TranscriptEmbedding.text_preview,
-                TranscriptCache.video_title,
-                TranscriptCache.video_channel,
-                TranscriptCache.thumbnail_url,
-                TranscriptCache.category,
-            ).join(TranscriptCache, TranscriptEmbedding.video_id == TranscriptCache.video_id)
-
-            if category:
-                stmt = stmt.where(TranscriptCache.category == category)
-
-            result = await session.execute(stmt)
-            rows = result.all()
-
-            if not rows:
-                return []
-
-            # Compute similarities
-            scored = []
-            seen_videos = set()
-            for row in rows:
-                embedding = json.loads(row.embedding_json)
-                score = _cosine_similarity(query_embedding, embedding)
-                if score >= MIN_SIMILARITY:
-                    scored.append(
-                        {
-                            "video_id": row.video_id,
-                            "chunk_index": row.chunk_index,
-                            "score": round(score, 4),
-                            "text_preview": row.text_preview,
-                            "video_title": row.video_title or "Unknown",
-                            "video_channel": row.video_channel or "Unknown",
-                            "thumbnail_url": row.thumbnail_url,
-                            "category": row.category,
-                        }
-                    )
-
-            # Sort by score descending
-            scored.sort(key=lambda x: x["score"], reverse=True)
-
-            # Deduplicate by video_id (keep best chunk per video)
-            unique_results = []
-            for item in scored:
-                if item["video_id"] not in seen_videos:
-                    seen_videos.add(item["video_id"])
-                    unique_results.append(item)
-                if len(unique_results) >= limit:
-                    break
-
-            return unique_results
+        await transcript_index.ensure_synced()
+        hits = transcript_index.search(query_embedding, limit=limit, category=category, min_score=MIN_SIMILARITY)
+        return [
+            {
+                "video_id": chunk.video_id,
+                "chunk_index": chunk.chunk_index,
+                "score": round(score, 4),
+                "text_preview": chunk.text_preview,
+                "video_title": chunk.video_title or "Unknown",
+                "video_channel": chunk.video_channel or "Unknown",
+                "thumbnail_url": chunk.thumbnail_url,
+                "category": chunk.category,
+            }
+            for chunk, score in hits
+        ]
 
     except Exception as e:
         logger.error(f"[EMBED] Search error: {e}")
@@ -14,6 +14,7 @@ import httpx
 from sqlalchemy import delete as sa_delete
 
 from core.config import MISTRAL_API_KEY
+from core.http_client import provider_client
 
 logger = logging.getLogger(__name__)
 
@@ -111,8 +112,8 @@ async def _call_mistral_chat(user_prompt: str) -> str | None:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=EXPLAIN_TIMEOUT) as client:
-            resp = await client.post(MISTRAL_CHAT_URL, json=payload, headers=headers)
+        async with provider_client("mistral", timeout=EXPLAIN_TIMEOUT) as client:
+            resp = await client.post(MISTRAL_CHAT_URL, json=payload, headers=headers, timeout=EXPLAIN_TIMEOUT)
             resp.raise_for_status()
             data = resp.json()
             content = data["choices"][0]["message"]["content"].strip()
@@ -1,7 +1,8 @@
 """Service de recherche sémantique globale (cross-source, filtré user_id).
 
-Charge les embeddings depuis les 5 tables (summary/flashcard/quiz/chat/transcript),
-calcule le cosine vs l'embedding de la query, retourne les top N triés.
+Charge les embeddings des 5 tables (summary/flashcard/quiz/chat/transcript) en une
+seule requête UNION ALL, les score en un passage vectorisé vs l'embedding de la
+query et retourne les top N triés (cf. ``search.candidates``).
 """
 
 from __future__ import annotations
@@ -12,25 +13,10 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import select
-
-from db.database import (
-    async_session_maker,
-    Summary,
-    SummaryEmbedding,
-    Flashcard,
-    FlashcardEmbedding,
-    QuizQuestion,
-    QuizEmbedding,
-    ChatEmbedding,
-    TranscriptEmbedding,
-    TranscriptCache,
-)
-from .embedding_service import (
-    generate_embedding,
-    _cosine_similarity,
-    MIN_SIMILARITY,
-)
+from db.database import async_session_maker, Summary
+from .candidates import global_candidates_query, load_candidates, score_candidates
+from .embedding_service import MIN_SIMILARITY
+from .query_cache import embed_query
 
 logger = logging.getLogger(__name__)
 
@@ -65,184 +51,65 @@ async def search_global(user_id: int, query: str, filters: SearchFilters) -> lis
     if not query or len(query) < 2:
         return []
 
-    query_embedding = await generate_embedding(query)
+    query_embedding = await embed_query(query)
     if query_embedding is None:
         logger.error(f"[SEARCH-GLOBAL] Failed to embed query for user {user_id}")
         return []
 
-    candidates: list[SearchResult] = []
-
     async with async_session_maker() as session:
-        # ─── Summaries ──────────────────────────────────────────────────────
-        if "summary" in filters.source_types:
-            stmt = (
-                select(SummaryEmbedding, Summary)
-                .join(Summary, SummaryEmbedding.summary_id == Summary.id)
-                .where(SummaryEmbedding.user_id == user_id)
-            )
-            stmt = _apply_summary_filters(stmt, filters)
-            for emb, summary in (await session.execute(stmt)).all():
-                vec = json.loads(emb.embedding_json)
-                score = _cosine_similarity(query_embedding, vec)
-                if score < MIN_SIMILARITY:
-                    continue
-                meta = json.loads(emb.source_metadata) if emb.source_metadata else {}
-                candidates.append(
-                    SearchResult(
-                        source_type="summary",
-                        source_id=emb.id,
-                        summary_id=summary.id,
-                        score=score,
-                        text_preview=emb.text_preview or "",
-                        source_metadata={
-                            **meta,
-                            "summary_title": summary.video_title,
-                            "summary_thumbnail": summary.thumbnail_url,
-                            "video_id": summary.video_id,
-                            "channel": summary.video_channel,
-                            "section_ref": emb.section_ref,
-                        },
-                    )
-                )
-
-        # ─── Flashcards ─────────────────────────────────────────────────────
-        if "flashcard" in filters.source_types:
-            stmt = (
-                select(FlashcardEmbedding, Flashcard, Summary)
-                .join(Flashcard, FlashcardEmbedding.flashcard_id == Flashcard.id)
-                .join(Summary, FlashcardEmbedding.summary_id == Summary.id)
-                .where(FlashcardEmbedding.user_id == user_id)
-            )
-            stmt = _apply_summary_filters(stmt, filters)
-            for emb, fc, summary in (await session.execute(stmt)).all():
-                vec = json.loads(emb.embedding_json)
-                score = _cosine_similarity(query_embedding, vec)
-                if score < MIN_SIMILARITY:
-                    continue
-                candidates.append(
-                    SearchResult(
-                        source_type="flashcard",
-                        source_id=fc.id,
-                        summary_id=summary.id,
-                        score=score,
-                        text_preview=emb.text_preview or "",
-                        source_metadata={
-                            "summary_title": summary.video_title,
-                            "summary_thumbnail": summary.thumbnail_url,
-                            "video_id": summary.video_id,
-                            "channel": summary.video_channel,
-                            "tab": "flashcards",
-                            "flashcard_id": fc.id,
-                            "position": fc.position,
-                        },
-                    )
-                )
-
-        # ─── Quiz ───────────────────────────────────────────────────────────
-        if "quiz" in filters.source_types:
-            stmt = (
-                select(QuizEmbedding, QuizQuestion, Summary)
-                .join(QuizQuestion, QuizEmbedding.quiz_question_id == QuizQuestion.id)
-                .join(Summary, QuizEmbedding.summary_id == Summary.id)
-                .where(QuizEmbedding.user_id == user_id)
-            )
-            stmt = _apply_summary_filters(stmt, filters)
-            for emb, q, summary in (await session.execute(stmt)).all():
-                vec = json.loads(emb.embedding_json)
-                score = _cosine_similarity(query_embedding, vec)
-                if score < MIN_SIMILARITY:
-                    continue
-                candidates.append(
-                    SearchResult(
-                        source_type="quiz",
-                        source_id=q.id,
-                        summary_id=summary.id,
-                        score=score,
-                        text_preview=emb.text_preview or "",
-                        source_metadata={
-                            "summary_title": summary.video_title,
-                            "summary_thumbnail": summary.thumbnail_url,
-                            "video_id": summary.video_id,
-                            "channel": summary.video_channel,
-                            "tab": "quiz",
-                            "quiz_question_id": q.id,
-                            "position": q.position,
-                        },
-                    )
-                )
-
-        # ─── Chat ───────────────────────────────────────────────────────────
-        if "chat" in filters.source_types:
-            stmt = (
-                select(ChatEmbedding, Summary)
-                .join(Summary, ChatEmbedding.summary_id == Summary.id)
-                .where(ChatEmbedding.user_id == user_id)
-            )
-            stmt = _apply_summary_filters(stmt, filters)
-            for emb, summary in (await session.execute(stmt)).all():
-                vec = json.loads(emb.embedding_json)
-                score = _cosine_similarity(query_embedding, vec)
-                if score < MIN_SIMILARITY:
-                    continue
-                candidates.append(
-                    SearchResult(
-                        source_type="chat",
-                        source_id=emb.id,
-                        summary_id=summary.id,
-                        score=score,
-                        text_preview=emb.text_preview or "",
-                        source_metadata={
-                            "summary_title": summary.video_title,
-                            "video_id": summary.video_id,
-                            "channel": summary.video_channel,
-                            "tab": "chat",
-                            "turn_index": emb.turn_index,
-                            "user_message_id": emb.user_message_id,
-                            "agent_message_id": emb.agent_message_id,
-                        },
-                    )
-                )
-
-        # ─── Transcripts (filtré via JOIN summaries.user_id) ────────────────
-        if "transcript" in filters.source_types:
-            # Le transcript est cross-user mais on ne montre que si le user a une
-            # Summary qui pointe sur ce video_id.
-            stmt = (
-                select(TranscriptEmbedding, TranscriptCache, Summary)
-                .join(TranscriptCache, TranscriptEmbedding.video_id == TranscriptCache.video_id)
-                .join(Summary, Summary.video_id == TranscriptCache.video_id)
-                .where(Summary.user_id == user_id)
-            )
-            stmt = _apply_summary_filters(stmt, filters)
-            seen_video_ids = set()
-            for emb, tc, summary in (await session.execute(stmt)).all():
-                if (emb.video_id, emb.chunk_index) in seen_video_ids:
-                    continue
-                seen_video_ids.add((emb.video_id, emb.chunk_index))
-                vec = json.loads(emb.embedding_json)
-                score = _cosine_similarity(query_embedding, vec)
-                if score < MIN_SIMILARITY:
-                    continue
-                candidates.append(
-                    SearchResult(
-                        source_type="transcript",
-                        source_id=emb.id,
-                        summary_id=summary.id,
-                        score=score,
-                        text_preview=emb.text_preview or "",
-                        source_metadata={
-                            "summary_title": summary.video_title,
-                            "summary_thumbnail": summary.thumbnail_url,
-                            "video_id": summary.video_id,
-                            "channel": summary.video_channel,
-                            "tab": "transcript",
-                            "chunk_index": emb.chunk_index,
-                        },
-                    )
-                )
-
-    candidates.sort(key=lambda r: -r.score)
-    return candidates[: filters.limit]
+        stmt = global_candidates_query(user_id, filters.source_types, lambda s: _apply_summary_filters(s, filters))
+        rows = await load_candidates(session, stmt)
+
+    # Un même chunk de transcript peut remonter via plusieurs Summary du user
+    # (même video_id) : on ne garde que la première occurrence.
+    seen_chunks = set()
+    unique_rows = []
+    for row in rows:
+        if row.source_type == "transcript":
+            if (row.video_id, row.chunk_index) in seen_chunks:
+                continue
+            seen_chunks.add((row.video_id, row.chunk_index))
+        unique_rows.append(row)
+
+    scored = score_candidates(query_embedding, unique_rows, MIN_SIMILARITY, limit=filters.limit)
+    return [_to_result(row, score) for row, score in scored]
+
+
+def _to_result(row, score: float) -> SearchResult:
+    """Construit le SearchResult d'une row du chargeur unifié."""
+    base = {
+        "summary_title": row.summary_title,
+        "summary_thumbnail": row.summary_thumbnail,
+        "video_id": row.video_id,
+        "channel": row.channel,
+    }
+    if row.source_type == "summary":
+        meta = json.loads(row.source_metadata) if row.source_metadata else {}
+        metadata = {**meta, **base, "section_ref": row.section_ref}
+    elif row.source_type == "flashcard":
+        metadata = {**base, "tab": "flashcards", "flashcard_id": row.source_id, "position": row.position}
+    elif row.source_type == "quiz":
+        metadata = {**base, "tab": "quiz", "quiz_question_id": row.source_id, "position": row.position}
+    elif row.source_type == "chat":
+        base.pop("summary_thumbnail")
+        metadata = {
+            **base,
+            "tab": "chat",
+            "turn_index": row.turn_index,
+            "user_message_id": row.user_message_id,
+            "agent_message_id": row.agent_message_id,
+        }
+    else:
+        metadata = {**base, "tab": "transcript", "chunk_index": row.chunk_index}
+
+    return SearchResult(
+        source_type=row.source_type,
+        source_id=row.source_id,
+        summary_id=row.summary_id,
+        score=score,
+        text_preview=row.text_preview or "",
+        source_metadata=metadata,
+    )
 
 
 def _apply_summary_filters(stmt, filters: SearchFilters):
@@ -0,0 +1,142 @@
+"""Cache des embeddings de requêtes de recherche (LRU in-process + tier Redis).
+
+Chaque recherche (``search_global``, ``search_within``, ``search_similar``)
+embed la query via Mistral (~200–500ms). Les users répètent souvent les mêmes
+requêtes (cf. ``search/recent_queries.py``) : on met en cache le vecteur,
+
+- clé = query normalisée (NFKC, casefold, espaces compactés) hashée, préfixée
+  par ``MODEL_VERSION_TAG`` pour qu'un bump de modèle invalide tout ;
+- L1 = ``OrderedDict`` LRU + TTL local au worker ;
+- L2 = ``core.cache.cache_service`` (Redis si configuré), partagé entre workers,
+  vecteur stocké en float32 base64 (4 Ko au lieu de ~20 Ko de JSON).
+
+Usage::
+
+    from search.query_cache import embed_query
+
+    vec = await embed_query("photosynthèse")
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import logging
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from core.cache import cache_service
+from . import embedding_service
+from .vector_codec import decode_embedding, encode_embedding
+
+logger = logging.getLogger(__name__)
+
+QUERY_EMBED_L1_SIZE = int(os.getenv("QUERY_EMBED_L1_SIZE", "2048"))
+QUERY_EMBED_L1_TTL = int(os.getenv("QUERY_EMBED_L1_TTL", "3600"))  # 1h
+QUERY_EMBED_L2_TTL = int(os.getenv("QUERY_EMBED_L2_TTL", "604800"))  # 7j — l'embedding d'un texte ne change pas
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Forme canonique d'une query pour la clé de cache."""
+    query = unicodedata.normalize("NFKC", query or "")
+    return _WHITESPACE_RE.sub(" ", query).strip().casefold()
+
+
+def _cache_key(normalized: str) -> str:
+    digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+    return f"query_embed:{embedding_service.MODEL_VERSION_TAG}:{digest}"
+
+
+@dataclass
+class QueryEmbeddingStats:
+    l1_hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    api_failures: int = 0
+
+    def to_dict(self, l1_size: int) -> dict:
+        total = self.l1_hits + self.l2_hits + self.misses
+        hits = self.l1_hits + self.l2_hits
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "api_failures": self.api_failures,
+            "hit_rate": f"{(hits / total * 100) if total else 0.0:.1f}%",
+            "l1_size": l1_size,
+        }
+
+
+class QueryEmbeddingCache:
+    """LRU+TTL local devant ``cache_service``, lui-même devant ``generate_embedding``."""
+
+    def __init__(self, maxsize: int = QUERY_EMBED_L1_SIZE, ttl: int = QUERY_EMBED_L1_TTL):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: "OrderedDict[str, tuple[float, list]]" = OrderedDict()
+        self.stats = QueryEmbeddingStats()
+
+    def _l1_get(self, key: str) -> Optional[list]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, vector = entry
+        if time.monotonic() > expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return vector
+
+    def _l1_set(self, key: str, vector: list) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl, vector)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    async def get_embedding(self, query: str) -> Optional[list]:
+        """Embedding de ``query`` depuis L1 → L2 → API Mistral (None si échec API)."""
+        key = _cache_key(normalize_query(query))
+
+        vector = self._l1_get(key)
+        if vector is not None:
+            self.stats.l1_hits += 1
+            return vector
+
+        cached = await cache_service.get(key)
+        if cached:
+            decoded = decode_embedding(base64.b64decode(cached))
+            if decoded is not None:
+                vector = decoded.tolist()
+                self.stats.l2_hits += 1
+                self._l1_set(key, vector)
+                return vector
+
+        self.stats.misses += 1
+        vector = await embedding_service.generate_embedding(query)
+        if vector is None:
+            self.stats.api_failures += 1
+            return None
+        self._l1_set(key, vector)
+        await cache_service.set(key, base64.b64encode(encode_embedding(vector)).decode("ascii"), ttl=QUERY_EMBED_L2_TTL)
+        return vector
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> dict:
+        return self.stats.to_dict(len(self._entries))
+
+
+query_embedding_cache = QueryEmbeddingCache()
+
+
+async def embed_query(query: str) -> Optional[list]:
+    """Raccourci : embedding (caché) d'une query de recherche."""
+    return await query_embedding_cache.get_embedding(query)
@@ -0,0 +1,53 @@
+"""Encodage binaire des embeddings (colonne ``embedding_vec``).
+
+Les vecteurs sont stockés en ``float32`` little-endian bruts (4 octets × dim,
+soit 4 Ko pour mistral-embed 1024-dim contre ~20 Ko de JSON). Le décodage est
+zero-copy via ``numpy.frombuffer`` : le tableau retourné est une vue read-only
+sur les octets renvoyés par le driver.
+
+Les lignes antérieures à la migration 034 n'ont que ``embedding_json`` ;
+``decode_embedding`` retombe dessus tant que le backfill
+(``scripts/reembed_progressive.py --backfill-binary``) n'est pas passé.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Optional, Sequence
+
+import numpy as np
+
+EMBEDDING_DTYPE = np.dtype("<f4")
+
+# Rollback safety : continuer à écrire embedding_json en plus du binaire tant
+# que l'ancien code peut encore être redéployé.
+EMBEDDING_JSON_DUAL_WRITE: bool = os.getenv("EMBEDDING_JSON_DUAL_WRITE", "false").lower() == "true"
+
+
+def encode_embedding(vector: Sequence[float]) -> bytes:
+    """Sérialise un vecteur en octets float32 little-endian."""
+    return np.asarray(vector, dtype=EMBEDDING_DTYPE).tobytes()
+
+
+def decode_embedding(blob: Optional[bytes], json_text: Optional[str] = None) -> Optional[np.ndarray]:
+    """Décode ``embedding_vec`` (zero-copy) ou, à défaut, ``embedding_json``.
+
+    Retourne None si aucune des deux colonnes n'est exploitable.
+    """
+    if blob:
+        return np.frombuffer(blob, dtype=EMBEDDING_DTYPE)
+    if json_text:
+        try:
+            return np.asarray(json.loads(json_text), dtype=EMBEDDING_DTYPE)
+        except (json.JSONDecodeError, TypeError, ValueError):
+            return None
+    return None
+
+
+def embedding_columns(vector: Sequence[float]) -> dict:
+    """Valeurs de colonnes à écrire pour un nouvel embedding (kwargs du modèle)."""
+    return {
+        "embedding_vec": encode_embedding(vector),
+        "embedding_json": json.dumps(list(vector)) if EMBEDDING_JSON_DUAL_WRITE else None,
+    }
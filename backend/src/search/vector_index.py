@@ -0,0 +1,376 @@
+"""Index vectoriel in-memory (par worker) pour la recherche sémantique transcripts.
+
+Remplace le scan décodage par ligne + cosine pure-Python de ``search_similar`` par :
+
+- une matrice ``float32`` de vecteurs **pré-normalisés** (cosine = produit scalaire),
+  scorée en un seul ``matmul`` NumPy + sélection top-k via ``argpartition`` ;
+- un mode ``hnsw`` optionnel (``hnswlib`` si installé) pour les gros corpus ;
+- des masques de catégorie pré-calculés (masque ``bool`` + positions, mis en
+  cache par catégorie et invalidés à chaque ajout) : seules les lignes de la
+  catégorie sont scorées ;
+- une synchronisation incrémentale : ``embed_transcript`` pousse ses nouvelles
+  lignes directement, et les lignes écrites par les autres workers sont
+  rattrapées par keyset sur ``TranscriptEmbedding.id`` toutes les
+  ``VECTOR_INDEX_SYNC_SECONDS``. Un rebuild complet périodique ramasse les
+  suppressions et les ré-embeddings (``scripts/reembed_progressive.py``).
+
+Usage::
+
+    from search.vector_index import transcript_index
+
+    await transcript_index.ensure_synced()
+    hits = transcript_index.search(query_vec, limit=10, category="science")
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .vector_codec import decode_embedding
+
+try:
+    import hnswlib
+
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    hnswlib = None
+    HNSWLIB_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# "flat" (matmul exact) ou "hnsw" (approché, nécessite hnswlib)
+VECTOR_INDEX_MODE = os.getenv("VECTOR_INDEX_MODE", "flat").lower()
+# Rattrapage incrémental des lignes écrites par les autres workers
+VECTOR_INDEX_SYNC_SECONDS = float(os.getenv("VECTOR_INDEX_SYNC_SECONDS", "30"))
+# Rebuild complet (suppressions, ré-embeddings)
+VECTOR_INDEX_REBUILD_SECONDS = float(os.getenv("VECTOR_INDEX_REBUILD_SECONDS", "3600"))
+LOAD_PAGE_SIZE = 5000
+# Nombre de chunks candidats par vidéo demandée (dédup par video_id)
+OVERSAMPLE = 8
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 128
+
+
+@dataclass
+class IndexedChunk:
+    """Métadonnées d'une ligne de l'index (une ligne = un chunk de transcript)."""
+
+    row_id: int
+    video_id: str
+    chunk_index: int
+    text_preview: Optional[str]
+    video_title: Optional[str]
+    video_channel: Optional[str]
+    thumbnail_url: Optional[str]
+    category: Optional[str]
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Normalise chaque ligne (L2). Les vecteurs nuls restent nuls (score 0)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class TranscriptVectorIndex:
+    """Index vectoriel des ``TranscriptEmbedding``, local au process."""
+
+    def __init__(self, dim: int = 1024, mode: str = VECTOR_INDEX_MODE):
+        self.dim = dim
+        if mode == "hnsw" and not HNSWLIB_AVAILABLE:
+            logger.warning("[VINDEX] hnswlib not installed, falling back to flat mode")
+            mode = "flat"
+        self.mode = mode
+        self._lock = asyncio.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._vectors = np.empty((0, self.dim), dtype=np.float32)
+        self._size = 0
+        self._chunks: list[IndexedChunk] = []
+        self._positions: dict[tuple[str, int], int] = {}
+        self._category_codes = np.empty(0, dtype=np.int32)
+        self._category_ids: dict[Optional[str], int] = {}
+        self._masks: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._hnsw = None
+        # Curseur keyset du rattrapage DB : avancé par ``_load`` uniquement. Les
+        # ``add()`` locaux ne le bougent pas, sinon les lignes d'id inférieur
+        # committées entre-temps par un autre worker seraient sautées.
+        self._sync_cursor = 0
+        self._loaded_at = 0.0
+        self._synced_at = 0.0
+
+    # ─── Écriture ────────────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at > 0
+
+    def _grow(self, needed: int) -> None:
+        capacity = self._vectors.shape[0]
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, 1024)
+        vectors = np.empty((new_capacity, self.dim), dtype=np.float32)
+        vectors[: self._size] = self._vectors[: self._size]
+        codes = np.empty(new_capacity, dtype=np.int32)
+        codes[: self._size] = self._category_codes[: self._size]
+        self._vectors, self._category_codes = vectors, codes
+        if self._hnsw is not None:
+            self._hnsw.resize_index(new_capacity)
+
+    def _category_code(self, category: Optional[str]) -> int:
+        code = self._category_ids.get(category)
+        if code is None:
+            code = len(self._category_ids)
+            self._category_ids[category] = code
+        return code
+
+    def add(self, chunks: Sequence[IndexedChunk], vectors: np.ndarray) -> int:
+        """Ajoute (ou remplace, par ``(video_id, chunk_index)``) des lignes.
+
+        ``vectors`` est une matrice ``(len(chunks), dim)`` non normalisée.
+        Retourne le nombre de lignes insérées ou mises à jour.
+        """
+        if not len(chunks):
+            return 0
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(chunks), self.dim)
+        vectors = _normalize_rows(vectors)
+
+        self._grow(self._size + len(chunks))
+        written: list[int] = []
+        for chunk, vector in zip(chunks, vectors):
+            key = (chunk.video_id, chunk.chunk_index)
+            pos = self._positions.get(key)
+            if pos is None:
+                pos = self._size
+                self._size += 1
+                self._positions[key] = pos
+                self._chunks.append(chunk)
+            else:
+                self._chunks[pos] = chunk
+            self._vectors[pos] = vector
+            self._category_codes[pos] = self._category_code(chunk.category)
+            written.append(pos)
+
+        if self._hnsw is not None:
+            self._hnsw.add_items(self._vectors[written], np.asarray(written), replace_deleted=False)
+        self._masks.clear()
+        return len(written)
+
+    def _build_hnsw(self) -> None:
+        if self.mode != "hnsw":
+            return
+        index = hnswlib.Index(space="ip", dim=self.dim)
+        index.init_index(
+            max_elements=max(self._vectors.shape[0], 1024),
+            M=HNSW_M,
+            ef_construction=HNSW_EF_CONSTRUCTION,
+            allow_replace_deleted=False,
+        )
+        if self._size:
+            index.add_items(self._vectors[: self._size], np.arange(self._size))
+        index.set_ef(HNSW_EF_SEARCH)
+        self._hnsw = index
+
+    # ─── Lecture ─────────────────────────────────────────────────────────────
+
+    def _category_mask(self, category: str) -> Optional[tuple[np.ndarray, np.ndarray]]:
+        """(masque booléen, positions) pré-calculés d'une catégorie (None si inconnue)."""
+        code = self._category_ids.get(category)
+        if code is None:
+            return None
+        cached = self._masks.get(category)
+        if cached is None:
+            mask = self._category_codes[: self._size] == code
+            cached = (mask, np.flatnonzero(mask))
+            self._masks[category] = cached
+        return cached
+
+    def _candidates(
+        self, query: np.ndarray, k: int, mask: Optional[tuple[np.ndarray, np.ndarray]]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Retourne (positions, scores) des ``k`` meilleurs chunks, non triés."""
+        rows = mask[1] if mask is not None else None
+        total = len(rows) if rows is not None else self._size
+        k = min(k, total)
+        if k == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        if self._hnsw is not None:
+            allowed = None if mask is None else (lambda i, m=mask[0]: bool(m[i]))
+            labels, distances = self._hnsw.knn_query(query, k=k, filter=allowed)
+            # space="ip" → distance = 1 - dot
+            return labels[0].astype(np.int64), 1.0 - distances[0]
+
+        # Filtre catégorie : on ne score que les lignes concernées
+        matrix = self._vectors[rows] if rows is not None else self._vectors[: self._size]
+        scores = matrix @ query
+        if k < total:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(total)
+        positions = rows[top] if rows is not None else top
+        return positions, scores[top]
+
+    def search(
+        self,
+        query_vector: Sequence[float],
+        limit: int = 10,
+        category: Optional[str] = None,
+        min_score: float = 0.0,
+    ) -> list[tuple[IndexedChunk, float]]:
+        """Top ``limit`` chunks (meilleur chunk par vidéo) triés par score décroissant."""
+        if self._size == 0 or limit <= 0:
+            return []
+        query = np.asarray(query_vector, dtype=np.float32).reshape(self.dim)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+        query = query / norm
+
+        mask = None
+        if category:
+            mask = self._category_mask(category)
+            if mask is None:
+                return []
+
+        k = limit * OVERSAMPLE
+        while True:
+            positions, scores = self._candidates(query, k, mask)
+            order = np.argsort(-scores, kind="stable")
+            results: list[tuple[IndexedChunk, float]] = []
+            seen_videos: set[str] = set()
+            for i in order:
+                score = float(scores[i])
+                if score < min_score:
+                    break
+                chunk = self._chunks[int(positions[i])]
+                if chunk.video_id in seen_videos:
+                    continue
+                seen_videos.add(chunk.video_id)
+                results.append((chunk, score))
+                if len(results) >= limit:
+                    return results
+            # Pas assez de vidéos distinctes : élargir tant qu'il reste des lignes
+            if len(positions) < k:
+                return results
+            k *= 4
+
+    # ─── Synchronisation DB ──────────────────────────────────────────────────
+
+    async def ensure_synced(self, force: bool = False) -> None:
+        """Charge l'index au premier appel, puis rattrape les lignes récentes."""
+        now = time.monotonic()
+        if not force and self.loaded and now - self._synced_at < VECTOR_INDEX_SYNC_SECONDS:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            if not self.loaded or force or now - self._loaded_at >= VECTOR_INDEX_REBUILD_SECONDS:
+                await self._load(full=True)
+            elif now - self._synced_at >= VECTOR_INDEX_SYNC_SECONDS:
+                await self._load(full=False)
+
+    async def _load(self, full: bool) -> None:
+        from db.database import async_session_maker, TranscriptCache, TranscriptEmbedding
+        from sqlalchemy import select
+
+        started = time.perf_counter()
+        # Rebuild complet dans un index neuf, swappé à la fin : les recherches
+        # concurrentes continuent de servir l'ancien état pendant le chargement.
+        target = TranscriptVectorIndex(dim=self.dim, mode=self.mode) if full else self
+        after_id = target._sync_cursor
+        loaded = 0
+        async with async_session_maker() as session:
+            while True:
+                stmt = (
+                    select(
+                        TranscriptEmbedding.id,
+                        TranscriptEmbedding.video_id,
+                        TranscriptEmbedding.chunk_index,
+                        TranscriptEmbedding.embedding_vec,
+                        TranscriptEmbedding.embedding_json,
+                        TranscriptEmbedding.text_preview,
+                        TranscriptCache.video_title,
+                        TranscriptCache.video_channel,
+                        TranscriptCache.thumbnail_url,
+                        TranscriptCache.category,
+                    )
+                    .join(TranscriptCache, TranscriptEmbedding.video_id == TranscriptCache.video_id)
+                    .where(TranscriptEmbedding.id > after_id)
+                    .order_by(TranscriptEmbedding.id)
+                    .limit(LOAD_PAGE_SIZE)
+                )
+                rows = (await session.execute(stmt)).all()
+                if not rows:
+                    break
+                # Décodage hors event loop ; la mutation de l'index reste sur la loop
+                chunks, vectors = await asyncio.to_thread(self._decode_rows, rows)
+                target.add(chunks, vectors)
+                loaded += len(chunks)
+                after_id = rows[-1].id
+                target._sync_cursor = after_id
+                if len(rows) < LOAD_PAGE_SIZE:
+                    break
+
+        now = time.monotonic()
+        if full:
+            target._build_hnsw()
+            self._swap_from(target)
+            self._loaded_at = now
+        self._synced_at = now
+        if full or loaded:
+            logger.info(
+                f"[VINDEX] {'Loaded' if full else 'Synced'} {loaded} chunks "
+                f"(total={self._size}, mode={self.mode}) in {(time.perf_counter() - started) * 1000:.0f}ms"
+            )
+
+    def _swap_from(self, other: "TranscriptVectorIndex") -> None:
+        lock = self._lock
+        self.__dict__.update(other.__dict__)
+        self._lock = lock
+
+    def _decode_rows(self, rows) -> tuple[list[IndexedChunk], np.ndarray]:
+        chunks: list[IndexedChunk] = []
+        vectors = np.empty((len(rows), self.dim), dtype=np.float32)
+        for row in rows:
+            vector = decode_embedding(row.embedding_vec, row.embedding_json)
+            if vector is None or len(vector) != self.dim:
+                continue
+            vectors[len(chunks)] = vector
+            chunks.append(
+                IndexedChunk(
+                    row_id=row.id,
+                    video_id=row.video_id,
+                    chunk_index=row.chunk_index,
+                    text_preview=row.text_preview,
+                    video_title=row.video_title,
+                    video_channel=row.video_channel,
+                    thumbnail_url=row.thumbnail_url,
+                    category=row.category,
+                )
+            )
+        return chunks, vectors[: len(chunks)]
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "size": self._size,
+            "categories": len(self._category_ids),
+            "memory_mb": round(self._vectors.nbytes / 1024 / 1024, 1),
+            "sync_cursor": self._sync_cursor,
+        }
+
+
+transcript_index = TranscriptVectorIndex()
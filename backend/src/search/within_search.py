@@ -1,4 +1,8 @@
-"""Service de recherche sémantique intra-analyse."""
+"""Service de recherche sémantique intra-analyse.
+
+Toutes les sources du summary sont chargées en une requête UNION ALL puis scorées
+en un seul passage vectorisé (cf. ``search.candidates``).
+"""
 
 from __future__ import annotations
 
@@ -7,21 +11,10 @@ import logging
 from dataclasses import dataclass
 from typing import Optional
 
-from sqlalchemy import select
-
-from db.database import (
-    async_session_maker,
-    Summary,
-    SummaryEmbedding,
-    Flashcard,
-    FlashcardEmbedding,
-    QuizQuestion,
-    QuizEmbedding,
-    ChatEmbedding,
-    TranscriptEmbedding,
-    TranscriptCache,
-)
-from .embedding_service import generate_embedding, _cosine_similarity, MIN_SIMILARITY
+from db.database import async_session_maker, Summary
+from .candidates import load_candidates, score_candidates, within_candidates_query
+from .embedding_service import MIN_SIMILARITY
+from .query_cache import embed_query
 
 logger = logging.getLogger(__name__)
 
@@ -62,150 +55,45 @@ async def search_within(
         if summary.user_id != user_id:
             raise NotOwnerError(f"User {user_id} not owner of summary {summary_id}")
 
-        query_embedding = await generate_embedding(query)
+        query_embedding = await embed_query(query)
         if query_embedding is None:
             return []
 
-        matches: list[WithinMatch] = []
-
-        if "summary" in source_types:
-            rows = (
-                (await session.execute(select(SummaryEmbedding).where(SummaryEmbedding.summary_id == summary_id)))
-                .scalars()
-                .all()
-            )
-            for emb in rows:
-                vec = json.loads(emb.embedding_json)
-                score = _cosine_similarity(query_embedding, vec)
-                if score < MIN_SIMILARITY:
-                    continue
-                meta = json.loads(emb.source_metadata) if emb.source_metadata else {}
-                matches.append(
-                    WithinMatch(
-                        source_type="summary",
-                        source_id=emb.id,
-                        summary_id=summary_id,
-                        text=emb.text_preview or "",
-                        text_html=_wrap_query_in_mark(emb.text_preview or "", query),
-                        tab=meta.get("tab", "synthesis"),
-                        score=score,
-                        passage_id=f"summary:{emb.id}",
-                        metadata=meta,
-                    )
-                )
-
-        if "flashcard" in source_types:
-            rows = (
-                await session.execute(
-                    select(FlashcardEmbedding, Flashcard)
-                    .join(Flashcard, FlashcardEmbedding.flashcard_id == Flashcard.id)
-                    .where(FlashcardEmbedding.summary_id == summary_id)
-                )
-            ).all()
-            for emb, fc in rows:
-                vec = json.loads(emb.embedding_json)
-                score = _cosine_similarity(query_embedding, vec)
-                if score < MIN_SIMILARITY:
-                    continue
-                matches.append(
-                    WithinMatch(
-                        source_type="flashcard",
-                        source_id=fc.id,
-                        summary_id=summary_id,
-                        text=emb.text_preview or "",
-                        text_html=_wrap_query_in_mark(emb.text_preview or "", query),
-                        tab="flashcards",
-                        score=score,
-                        passage_id=f"flashcard:{fc.id}",
-                        metadata={"position": fc.position},
-                    )
-                )
-
-        if "quiz" in source_types:
-            rows = (
-                await session.execute(
-                    select(QuizEmbedding, QuizQuestion)
-                    .join(QuizQuestion, QuizEmbedding.quiz_question_id == QuizQuestion.id)
-                    .where(QuizEmbedding.summary_id == summary_id)
-                )
-            ).all()
-            for emb, q in rows:
-                vec = json.loads(emb.embedding_json)
-                score = _cosine_similarity(query_embedding, vec)
-                if score < MIN_SIMILARITY:
-                    continue
-                matches.append(
-                    WithinMatch(
-                        source_type="quiz",
-                        source_id=q.id,
-                        summary_id=summary_id,
-                        text=emb.text_preview or "",
-                        text_html=_wrap_query_in_mark(emb.text_preview or "", query),
-                        tab="quiz",
-                        score=score,
-                        passage_id=f"quiz:{q.id}",
-                        metadata={"position": q.position},
-                    )
-                )
-
-        if "chat" in source_types:
-            rows = (
-                (await session.execute(select(ChatEmbedding).where(ChatEmbedding.summary_id == summary_id)))
-                .scalars()
-                .all()
-            )
-            for emb in rows:
-                vec = json.loads(emb.embedding_json)
-                score = _cosine_similarity(query_embedding, vec)
-                if score < MIN_SIMILARITY:
-                    continue
-                matches.append(
-                    WithinMatch(
-                        source_type="chat",
-                        source_id=emb.id,
-                        summary_id=summary_id,
-                        text=emb.text_preview or "",
-                        text_html=_wrap_query_in_mark(emb.text_preview or "", query),
-                        tab="chat",
-                        score=score,
-                        passage_id=f"chat:{emb.id}",
-                        metadata={"turn_index": emb.turn_index},
-                    )
-                )
-
-        if "transcript" in source_types:
-            rows = (
-                (
-                    await session.execute(
-                        select(TranscriptEmbedding)
-                        .join(TranscriptCache, TranscriptEmbedding.video_id == TranscriptCache.video_id)
-                        .where(TranscriptCache.video_id == summary.video_id)
-                    )
-                )
-                .scalars()
-                .all()
-            )
-            for emb in rows:
-                vec = json.loads(emb.embedding_json)
-                score = _cosine_similarity(query_embedding, vec)
-                if score < MIN_SIMILARITY:
-                    continue
-                matches.append(
-                    WithinMatch(
-                        source_type="transcript",
-                        source_id=emb.id,
-                        summary_id=summary_id,
-                        text=emb.text_preview or "",
-                        text_html=_wrap_query_in_mark(emb.text_preview or "", query),
-                        tab="transcript",
-                        score=score,
-                        passage_id=f"transcript:{emb.id}",
-                        metadata={"chunk_index": emb.chunk_index},
-                    )
-                )
-
-    matches.sort(key=lambda m: -m.score)
-    return matches
+        stmt = within_candidates_query(summary_id, summary.video_id, source_types)
+        rows = await load_candidates(session, stmt)
+
+    return [_to_match(row, score, query) for row, score in score_candidates(query_embedding, rows, MIN_SIMILARITY)]
+
+
+_TABS = {"flashcard": "flashcards", "quiz": "quiz", "chat": "chat", "transcript": "transcript"}
+
+
+def _to_match(row, score: float, query: str) -> WithinMatch:
+    """Construit le WithinMatch d'une row du chargeur unifié."""
+    if row.source_type == "summary":
+        metadata = json.loads(row.source_metadata) if row.source_metadata else {}
+        tab = metadata.get("tab", "synthesis")
+    else:
+        if row.source_type in ("flashcard", "quiz"):
+            metadata = {"position": row.position}
+        elif row.source_type == "chat":
+            metadata = {"turn_index": row.turn_index}
+        else:
+            metadata = {"chunk_index": row.chunk_index}
+        tab = _TABS[row.source_type]
+
+    text = row.text_preview or ""
+    return WithinMatch(
+        source_type=row.source_type,
+        source_id=row.source_id,
+        summary_id=row.summary_id,
+        text=text,
+        text_html=_wrap_query_in_mark(text, query),
+        tab=tab,
+        score=score,
+        passage_id=f"{row.source_type}:{row.source_id}",
+        metadata=metadata,
+    )
 
 
 def _wrap_query_in_mark(text: str, query: str) -> str:
@@ -0,0 +1,144 @@
+"""Pre-rendered OG images for shared analyses.
+
+Rendered once — in the background at share creation, or on the first crawler
+hit after the snapshot changed — then stored in ``storage.r2`` under a
+content-addressed key and served with an ETag:
+
+    inputs = og_render_inputs(share)     # title, thumbnail URL, verdict, channel
+    digest = og_render_hash(inputs)      # sha256(inputs + OG_RENDER_VERSION)
+    key    = share-og/{user_id}/{digest}.png   (per-user prefix → GDPR purge)
+
+The thumbnail is fetched with the async HTTP client; PIL compositing runs in
+``core.cpu_pool`` worker processes, never on the event loop. Concurrent misses
+on the same digest share one render, and recently served images stay in a
+small per-process LRU so crawler bursts don't round-trip to storage.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from core.cpu_pool import run_cpu
+from share.og_image import OG_RENDER_VERSION, render_og_image
+from storage.r2 import check_exists_r2, download_from_r2, is_r2_available, upload_to_r2
+from storage.thumbnails import download_image
+
+logger = logging.getLogger(__name__)
+
+R2_OG_PREFIX = "share-og"
+OG_MEMORY_CACHE_SIZE = int(os.environ.get("SHARE_OG_MEMORY_CACHE_SIZE", "64"))
+
+_memory: "OrderedDict[str, bytes]" = OrderedDict()
+_inflight: Dict[str, asyncio.Task] = {}
+_counters = {"memory_hits": 0, "storage_hits": 0, "renders": 0, "prerenders": 0, "errors": 0}
+
+
+def og_render_inputs(share) -> dict:
+    """Everything the rendered image depends on, read from a SharedAnalysis row."""
+    try:
+        snapshot = json.loads(share.analysis_snapshot or "{}")
+    except json.JSONDecodeError:
+        snapshot = {}
+    verdict = snapshot.get("verdict")
+    return {
+        "video_title": snapshot.get("video_title") or share.video_title or "Analyse DeepSight",
+        "video_thumbnail": snapshot.get("video_thumbnail") or share.video_thumbnail,
+        "verdict_text": verdict.get("text") if isinstance(verdict, dict) else (verdict or share.verdict),
+        "channel": snapshot.get("channel"),
+    }
+
+
+def og_render_hash(inputs: dict) -> str:
+    payload = json.dumps({"v": OG_RENDER_VERSION, **inputs}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def og_image_key(user_id: int, digest: str) -> str:
+    return f"{R2_OG_PREFIX}/{user_id}/{digest}.png"
+
+
+def _remember(digest: str, png: bytes) -> None:
+    _memory[digest] = png
+    _memory.move_to_end(digest)
+    while len(_memory) > OG_MEMORY_CACHE_SIZE:
+        _memory.popitem(last=False)
+
+
+async def _render(inputs: dict) -> bytes:
+    thumbnail = await download_image(inputs["video_thumbnail"]) if inputs.get("video_thumbnail") else None
+    _counters["renders"] += 1
+    return await run_cpu(
+        render_og_image,
+        video_title=inputs["video_title"],
+        thumbnail_bytes=thumbnail,
+        verdict_text=inputs.get("verdict_text"),
+        channel=inputs.get("channel"),
+        kind="og_image",
+    )
+
+
+async def _load_or_render(user_id: int, inputs: dict, digest: str, read_stored: bool) -> bytes:
+    key = og_image_key(user_id, digest)
+    stored = is_r2_available()
+    png: Optional[bytes] = None
+    if stored and read_stored:
+        try:
+            png = await download_from_r2(key)
+        except Exception as e:
+            _counters["errors"] += 1
+            logger.warning(f"OG image storage read failed for {key}: {e}")
+        if png is not None:
+            _counters["storage_hits"] += 1
+    if png is None:
+        png = await _render(inputs)
+        if stored:
+            try:
+                await upload_to_r2(png, key, content_type="image/png")
+            except Exception as e:
+                _counters["errors"] += 1
+                logger.warning(f"OG image upload failed for {key}: {e}")
+    _remember(digest, png)
+    return png
+
+
+async def _single_flight(user_id: int, inputs: dict, digest: str, read_stored: bool) -> bytes:
+    task = _inflight.get(digest)
+    if task is None:
+        task = asyncio.ensure_future(_load_or_render(user_id, inputs, digest, read_stored))
+        _inflight[digest] = task
+        task.add_done_callback(lambda _: _inflight.pop(digest, None))
+    return await asyncio.shield(task)
+
+
+async def get_og_image(user_id: int, inputs: dict) -> bytes:
+    """PNG for these inputs: process LRU, then storage, then render (and store)."""
+    digest = og_render_hash(inputs)
+    png = _memory.get(digest)
+    if png is not None:
+        _memory.move_to_end(digest)
+        _counters["memory_hits"] += 1
+        return png
+    return await _single_flight(user_id, inputs, digest, read_stored=True)
+
+
+async def prerender_og_image(user_id: int, inputs: dict) -> None:
+    """Best-effort background render at share time; no-op if already stored."""
+    digest = og_render_hash(inputs)
+    try:
+        if digest in _memory or (is_r2_available() and await check_exists_r2(og_image_key(user_id, digest))):
+            return
+        _counters["prerenders"] += 1
+        await _single_flight(user_id, inputs, digest, read_stored=False)
+    except Exception as e:
+        _counters["errors"] += 1
+        logger.warning(f"OG image pre-render failed for user {user_id}: {e}")
+
+
+def get_og_cache_stats() -> dict:
+    return {**_counters, "memory_entries": len(_memory), "inflight": len(_inflight)}
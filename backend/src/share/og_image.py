@@ -4,6 +4,10 @@ Produces a 1200×630 PNG: background gradient + (optional) video thumbnail
 masked to rounded rect + title + verdict chip + DeepSight branding.
 Used at GET /api/share/{token}/og-image.png for rich social previews
 (Twitter/X, LinkedIn, Facebook, iMessage, Slack, WhatsApp, Discord).
+
+``render_og_image`` is the pure CPU step (no network): it runs in the
+``core.cpu_pool`` worker processes, where fonts and the decoded background
+stay cached between renders. ``share.og_cache`` drives it.
 """
 
 from __future__ import annotations
@@ -11,6 +15,7 @@ from __future__ import annotations
 import io
 import logging
 import os
+from functools import lru_cache
 from typing import Optional
 
 import httpx
@@ -24,9 +29,14 @@ _FONT_DIR = os.path.join(_STATIC_DIR, "fonts")
 
 W, H = 1200, 630
 
+# Bump when the layout changes: part of the render hash, so stored images
+# from the previous layout are never served again.
+OG_RENDER_VERSION = 1
+
 
+@lru_cache(maxsize=16)
 def _load_font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
-    """Load Inter font or fall back to default."""
+    """Load Inter font or fall back to default (cached per process)."""
     try:
         name = "Inter-Bold.ttf" if bold else "Inter-Regular.ttf"
         return ImageFont.truetype(os.path.join(_FONT_DIR, name), size)
@@ -35,25 +45,40 @@ def _load_font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
         return ImageFont.load_default()
 
 
-def _load_bg() -> Image.Image:
+@lru_cache(maxsize=1)
+def _decoded_bg() -> Image.Image:
     try:
-        return Image.open(_BG_PATH).convert("RGB").copy()
+        with Image.open(_BG_PATH) as img:
+            return img.convert("RGB")
     except FileNotFoundError:
-        bg = Image.new("RGB", (W, H), (10, 10, 15))
-        return bg
+        return Image.new("RGB", (W, H), (10, 10, 15))
+
+
+def _load_bg() -> Image.Image:
+    """Fresh canvas from the process-level decoded background."""
+    return _decoded_bg().copy()
 
 
-def _download_thumbnail(url: str, timeout: float = 4.0) -> Optional[Image.Image]:
+def _download_thumbnail(url: str, timeout: float = 4.0) -> Optional[bytes]:
     try:
         with httpx.Client(timeout=timeout, follow_redirects=True) as client:
             resp = client.get(url)
             resp.raise_for_status()
-            return Image.open(io.BytesIO(resp.content)).convert("RGB")
+            return resp.content
     except Exception as e:
         logger.debug(f"OG thumbnail download failed: {e}")
         return None
 
 
+def _decode_thumbnail(data: bytes) -> Optional[Image.Image]:
+    try:
+        return Image.open(io.BytesIO(data)).convert("RGB")
+    except Exception as e:
+        logger.debug(f"OG thumbnail decode failed: {e}")
+        return None
+
+
+@lru_cache(maxsize=4)
 def _rounded_mask(size: tuple[int, int], radius: int) -> Image.Image:
     mask = Image.new("L", size, 0)
     ImageDraw.Draw(mask).rounded_rectangle([(0, 0), (size[0] - 1, size[1] - 1)], radius=radius, fill=255)
@@ -98,12 +123,32 @@ def generate_og_image(
     verdict_text: Optional[str] = None,
     channel: Optional[str] = None,
 ) -> bytes:
-    """Generate a 1200×630 OG image and return PNG bytes."""
+    """Generate a 1200×630 OG image and return PNG bytes.
+
+    Blocking (sync thumbnail download + render): scripts and tests only.
+    Request paths go through ``share.og_cache``.
+    """
+    return render_og_image(
+        video_title=video_title,
+        thumbnail_bytes=_download_thumbnail(video_thumbnail) if video_thumbnail else None,
+        verdict_text=verdict_text,
+        channel=channel,
+    )
+
+
+def render_og_image(
+    *,
+    video_title: str,
+    thumbnail_bytes: Optional[bytes] = None,
+    verdict_text: Optional[str] = None,
+    channel: Optional[str] = None,
+) -> bytes:
+    """Render a 1200×630 OG image from already-downloaded inputs, return PNG bytes."""
     canvas = _load_bg()
     draw = ImageDraw.Draw(canvas)
 
-    if video_thumbnail:
-        thumb = _download_thumbnail(video_thumbnail)
+    if thumbnail_bytes:
+        thumb = _decode_thumbnail(thumbnail_bytes)
         if thumb:
             tw, th = 480, 270
             thumb = thumb.resize((tw, th), Image.LANCZOS)
@@ -3,7 +3,7 @@ Share Router — Public sharing of video analyses
 POST   /api/share                       → Create a share link (auth required)
 GET    /api/share/{token}               → View shared analysis (public, JSON)
 GET    /api/share/{token}/og            → OG meta tags page for social bots
-GET    /api/share/{token}/og-image.png  → Dynamic 1200×630 PNG for social previews
+GET    /api/share/{token}/og-image.png  → Pre-rendered 1200×630 PNG for social previews (ETag)
 DELETE /api/share/{video_id}            → Deactivate share link (auth required)
 """
 
@@ -23,7 +23,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from db.database import get_session, SharedAnalysis, Summary, User
 from auth.dependencies import get_current_user
 from core.config import _settings as _cfg
-from share.og_image import generate_og_image
+from share.og_cache import get_og_image, og_render_hash, og_render_inputs, prerender_og_image
 from share.html_renderer import render_analysis_page
 
 router = APIRouter()
@@ -231,10 +231,16 @@ def _build_og_html(shared: SharedAnalysis, share_token: str) -> str:
 @router.post("", response_model=ShareResponse)
 async def create_share_link(
     request: ShareRequest,
+    background: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
-    """Create a public share link for an analysis."""
+    """Create a public share link for an analysis.
+
+    The OG image is pre-rendered in the background so the first crawler hit
+    (Slack/X/LinkedIn fetch it as soon as the link is pasted) is served from
+    storage.
+    """
     # Check if active share already exists for this user+video
     existing = await session.execute(
         select(SharedAnalysis).where(
@@ -246,6 +252,7 @@ async def create_share_link(
     existing_share = existing.scalar_one_or_none()
 
     if existing_share:
+        background.add_task(prerender_og_image, current_user.id, og_render_inputs(existing_share))
         return ShareResponse(
             share_url=f"{FRONTEND_URL}/s/{existing_share.share_token}",
             share_token=existing_share.share_token,
@@ -296,6 +303,7 @@ async def create_share_link(
 
     session.add(shared)
     await session.commit()
+    background.add_task(prerender_og_image, current_user.id, og_render_inputs(shared))
 
     return ShareResponse(
         share_url=f"{FRONTEND_URL}/s/{token}",
@@ -331,13 +339,16 @@ async def get_shared_og(
 @router.get("/{token}/og-image.png", include_in_schema=True)
 async def get_share_og_image(
     token: str,
+    request: Request,
     session: AsyncSession = Depends(get_session),
 ) -> Response:
-    """Dynamic 1200×630 OG image for social previews.
+    """Pre-rendered 1200×630 OG image for social previews.
 
-    Cached 1h client-side + 24h on CDN edge to avoid re-rendering for each
-    bot fetch. Returns 404 if the token never existed, 410 Gone if it
-    existed but has been revoked — letting Google deindex revoked pages.
+    Served from storage (rendered once per snapshot, see share.og_cache) with
+    an ETag = render hash: revalidations get a 304 without touching storage.
+    Cached 1h client-side + 24h on CDN edge. Returns 404 if the token never
+    existed, 410 Gone if it existed but has been revoked — letting Google
+    deindex revoked pages.
     """
     result = await session.execute(select(SharedAnalysis).where(SharedAnalysis.share_token == token))
     share: Optional[SharedAnalysis] = result.scalar_one_or_none()
@@ -346,27 +357,16 @@ async def get_share_og_image(
     if not share.is_active:
         raise HTTPException(status_code=410, detail="Share revoked")
 
-    try:
-        snapshot = json.loads(share.analysis_snapshot or "{}")
-    except json.JSONDecodeError:
-        snapshot = {}
-
-    png = generate_og_image(
-        video_title=snapshot.get("video_title") or share.video_title or "Analyse DeepSight",
-        video_thumbnail=snapshot.get("video_thumbnail") or share.video_thumbnail,
-        verdict_text=(snapshot.get("verdict") or {}).get("text")
-        if isinstance(snapshot.get("verdict"), dict)
-        else (snapshot.get("verdict") or share.verdict),
-        channel=snapshot.get("channel"),
-    )
+    inputs = og_render_inputs(share)
+    headers = {
+        "Cache-Control": "public, max-age=3600, s-maxage=86400, stale-while-revalidate=86400",
+        "ETag": f'"{og_render_hash(inputs)}"',
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
 
-    return Response(
-        content=png,
-        media_type="image/png",
-        headers={
-            "Cache-Control": "public, max-age=3600, s-maxage=86400, stale-while-revalidate=86400",
-        },
-    )
+    png = await get_og_image(share.user_id, inputs)
+    return Response(content=png, media_type="image/png", headers=headers)
 
 
 @router.get("/{token}/page", response_class=HTMLResponse, include_in_schema=True)
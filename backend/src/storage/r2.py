@@ -11,6 +11,7 @@ import logging
 import os
 from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 from core.config import R2_CONFIG
 
@@ -160,6 +161,37 @@ async def _check_exists_r2_remote(key: str) -> bool:
         return False
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# Download (dual-mode)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+async def download_from_r2(key: str) -> Optional[bytes]:
+    """Read a stored object back (R2 or local). Returns None if it does not exist."""
+    if _is_r2_credentials_set():
+        return await asyncio.to_thread(_download_r2_sync, key)
+    return await asyncio.to_thread(_read_local_sync, LOCAL_THUMB_DIR / key)
+
+
+def _download_r2_sync(key: str) -> Optional[bytes]:
+    """GET an object from Cloudflare R2."""
+    from botocore.exceptions import ClientError
+
+    client = _get_r2_client()
+    try:
+        response = client.get_object(Bucket=R2_CONFIG["BUCKET"], Key=key)
+        return response["Body"].read()
+    except ClientError:
+        return None
+
+
+def _read_local_sync(path: Path) -> Optional[bytes]:
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # Bulk delete by prefix (used by GDPR account deletion)
 # ═══════════════════════════════════════════════════════════════════════════════
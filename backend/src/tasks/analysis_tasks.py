@@ -10,29 +10,13 @@
 ╚════════════════════════════════════════════════════════════════════════════════════╝
 """
 
-import asyncio
 import json
 from datetime import datetime
 from typing import Dict, Any, List
 from celery import chain
 from celery.exceptions import SoftTimeLimitExceeded
 
-from tasks.celery_app import celery_app, BaseTask
-
-# ═══════════════════════════════════════════════════════════════════════════════
-# 🔧 ASYNC HELPER
-# ═══════════════════════════════════════════════════════════════════════════════
-
-
-def run_async(coro):
-    """Execute async function in sync context"""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
-
+from tasks.celery_app import celery_app, BaseTask, run_async
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🎬 VIDEO ANALYSIS TASK
@@ -439,6 +423,10 @@ async def _enrich_analysis_async(
             summary.fact_check_result = json.dumps({"enriched_at": datetime.utcnow().isoformat()})
             await db.commit()
 
+            from chat.context_builder import invalidate_rich_context
+
+            await invalidate_rich_context(summary_id)
+
         task.update_progress(100, 100, "Enrichissement terminé!")
 
         return {
@@ -11,13 +11,17 @@
 ╚════════════════════════════════════════════════════════════════════════════════════╝
 """
 
+import asyncio
 import os
+import threading
 from datetime import timedelta
 from typing import Any
 from celery import Celery, Task
 from celery.schedules import crontab
 from kombu import Queue, Exchange
 
+from core.llm_limiter import llm_priority
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🔧 CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -269,6 +273,42 @@ class BaseTask(Task):
 # Register base task
 celery_app.Task = BaseTask
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# 🔁 ASYNC BRIDGE — une event loop longue durée par process worker
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Créer une loop par tâche cassait les ressources liées à la loop (pool asyncpg,
+# clients httpx partagés) et coûtait son setup/teardown à chaque exécution
+_worker_loop: asyncio.AbstractEventLoop | None = None
+_worker_loop_pid: int | None = None
+_worker_loop_lock = threading.Lock()
+
+
+def _get_worker_loop() -> asyncio.AbstractEventLoop:
+    global _worker_loop, _worker_loop_pid
+    with _worker_loop_lock:
+        # Nouveau process (fork prefork) ou loop fermée : on en recrée une
+        if _worker_loop is None or _worker_loop.is_closed() or _worker_loop_pid != os.getpid():
+            _worker_loop = asyncio.new_event_loop()
+            _worker_loop_pid = os.getpid()
+            asyncio.set_event_loop(_worker_loop)
+        return _worker_loop
+
+
+def run_async(coro):
+    """
+    Exécute une coroutine depuis une tâche Celery sur la loop du process worker.
+
+    Les tâches Celery sont du travail de fond : leurs appels LLM passent en classe
+    "batch" dans core.llm_limiter et cèdent la place au chat.
+    """
+    token = llm_priority.set("batch")
+    try:
+        return _get_worker_loop().run_until_complete(coro)
+    finally:
+        llm_priority.reset(token)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🎯 TASK PRIORITIES
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -310,4 +350,5 @@ __all__ = [
     "BaseTask",
     "TaskPriority",
     "apply_task_with_priority",
+    "run_async",
 ]
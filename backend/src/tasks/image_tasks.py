@@ -12,17 +12,7 @@
 import asyncio
 from typing import Dict, Any
 
-from tasks.celery_app import celery_app, BaseTask
-
-
-def run_async(coro):
-    """Execute async function in sync context."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
+from tasks.celery_app import celery_app, BaseTask, run_async
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -7,7 +7,6 @@
 
 import asyncio
 import os
-import subprocess
 import tempfile
 import time
 from pathlib import Path
@@ -27,6 +26,7 @@ from core.config import (
     get_ytdlp_cookies_path,
 )
 from core.logging import logger
+from core.media_process import MediaProcessTimeout, run_media_process
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -190,38 +190,192 @@ async def compress_audio(audio_data: bytes, audio_ext: str, source_name: str = "
     if len(audio_data) <= GROQ_MAX_FILE_SIZE:
         return audio_data, audio_ext
 
-    print(
-        f"  🎙️ [{source_name}] Compressing audio ({len(audio_data) / 1024 / 1024:.1f}MB > {GROQ_MAX_FILE_SIZE / 1024 / 1024:.0f}MB)...",
-        flush=True,
+    logger.debug(
+        f"  🎙️ [{source_name}] Compressing audio ({len(audio_data) / 1024 / 1024:.1f}MB > {GROQ_MAX_FILE_SIZE / 1024 / 1024:.0f}MB)..."
     )
 
+    compressed = await transcode_audio_for_stt(audio_data, audio_ext, source_name)
+    if compressed:
+        logger.info(
+            f"  ✅ [{source_name}] Compressed: {len(audio_data) / 1024 / 1024:.1f}MB → {len(compressed) / 1024 / 1024:.1f}MB"
+        )
+        return compressed, ".mp3"
+
+    return audio_data, audio_ext
+
+
+# Conteneurs lisibles en flux : ffmpeg les lit directement sur stdin.
+# MP4/M4A peuvent avoir l'atome moov en fin de fichier → entrée fichier requise.
+_PIPEABLE_AUDIO_EXTS = {".mp3", ".webm", ".opus", ".ogg", ".wav"}
+
+
+async def transcode_audio_for_stt(
+    audio_data: bytes, audio_ext: str, source_name: str = "AUDIO", timeout: float = 120
+) -> Optional[bytes]:
+    """
+    Transcode en MP3 mono 16kHz 32kbps (format STT) via le moteur media partagé.
+    Sortie toujours en pipe ; entrée en pipe quand le conteneur le permet.
+    Retourne les bytes MP3, ou None si échec.
+    """
+    output_args = ["-b:a", "32k", "-ac", "1", "-ar", "16000", "-f", "mp3", "pipe:1"]
+    base_cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-i"]
+    tmp_in_path = None
     try:
-        with tempfile.NamedTemporaryFile(suffix=audio_ext, delete=False) as tmp_in:
-            tmp_in.write(audio_data)
-            tmp_in_path = tmp_in.name
+        if audio_ext.lower() in _PIPEABLE_AUDIO_EXTS:
+            result = await run_media_process([*base_cmd, "pipe:0", *output_args], input=audio_data, timeout=timeout)
+        else:
+            with tempfile.NamedTemporaryFile(suffix=audio_ext, delete=False) as tmp_in:
+                tmp_in_path = tmp_in.name
+            await asyncio.to_thread(Path(tmp_in_path).write_bytes, audio_data)
+            result = await run_media_process([*base_cmd, tmp_in_path, *output_args], timeout=timeout)
+    except MediaProcessTimeout:
+        logger.warning(f"  ⚠️ [{source_name}] Compression timeout ({timeout:.0f}s)")
+        return None
+    except Exception as e:
+        logger.warning(f"  ⚠️ [{source_name}] Compression failed: {e}")
+        return None
+    finally:
+        if tmp_in_path:
+            Path(tmp_in_path).unlink(missing_ok=True)
 
-        tmp_out_path = tmp_in_path + "_compressed.mp3"
+    if not result.ok or not result.stdout:
+        logger.warning(f"  ⚠️ [{source_name}] Compression failed: {result.stderr_text[:150]}")
+        return None
+    return result.stdout
 
-        cmd = ["ffmpeg", "-i", tmp_in_path, "-b:a", "32k", "-ac", "1", "-ar", "16000", "-y", tmp_out_path]
-        subprocess.run(cmd, capture_output=True, timeout=120)
 
-        if Path(tmp_out_path).exists():
-            compressed = Path(tmp_out_path).read_bytes()
-            print(
-                f"  ✅ [{source_name}] Compressed: {len(audio_data) / 1024 / 1024:.1f}MB → {len(compressed) / 1024 / 1024:.1f}MB",
-                flush=True,
+# ═══════════════════════════════════════════════════════════════════════════════
+# 🧱 APPELS STT BRUTS (segments horodatés, sans mise en forme)
+# Partagés par les transcriptions mono-fichier ci-dessous et par chunked_stt.py
+# ═══════════════════════════════════════════════════════════════════════════════
+
+GROQ_STT_URL = "https://api.groq.com/openai/v1/audio/transcriptions"
+VOXTRAL_STT_URL = "https://api.mistral.ai/v1/audio/transcriptions"
+# v7.3 — Switch to transcribe-only model (faster + cheaper than chat-tuned voxtral-mini-latest)
+# Official doc: https://docs.mistral.ai/models/voxtral-mini-transcribe-26-02
+VOXTRAL_STT_MODEL = "voxtral-mini-2602"
+VOXTRAL_TRANSCRIBE_TIMEOUT = 360
+
+
+def build_timestamped(segments: list, full_text: str = "", interval: float = 30) -> str:
+    """
+    Construit le texte horodaté ``[MM:SS] ...`` à partir de segments STT
+    (``{"text", "start"}``) : un marqueur toutes les ``interval`` secondes.
+    Sans segments, retourne ``full_text`` tel quel.
+    """
+    if not segments:
+        return full_text
+    timestamped_parts = []
+    last_ts = -interval
+    for seg in segments:
+        text = seg.get("text", "").strip()
+        start = seg.get("start", 0)
+        if not text:
+            continue
+        if start - last_ts >= interval:
+            ts = format_seconds_to_timestamp(start)
+            timestamped_parts.append(f"\n[{ts}] {text}")
+            last_ts = start
+        else:
+            timestamped_parts.append(f" {text}")
+    return "".join(timestamped_parts).strip()
+
+
+async def _request_transcription(
+    url: str,
+    api_key: str,
+    data: dict,
+    audio_data: bytes,
+    audio_ext: str,
+    timeout: float,
+    source_name: str,
+    label: str,
+) -> Optional[dict]:
+    """POST multipart vers une API de transcription ; retourne le JSON (text/segments/language) ou None.
+
+    None seulement sur erreur transport/HTTP : un 200 au ``text`` vide (musique,
+    silence) est une réponse valide, renvoyée telle quelle.
+    """
+    try:
+        mime_type = AUDIO_MIME_TYPES.get(audio_ext, "audio/mpeg")
+
+        async with httpx.AsyncClient() as client:
+            files = {"file": (f"audio{audio_ext}", audio_data, mime_type)}
+
+            start_time = time.time()
+            response = await client.post(
+                url,
+                headers={"Authorization": f"Bearer {api_key}"},
+                files=files,
+                data=data,
+                timeout=timeout,
             )
-            Path(tmp_in_path).unlink(missing_ok=True)
-            Path(tmp_out_path).unlink(missing_ok=True)
-            return compressed, ".mp3"
+            elapsed = time.time() - start_time
+            logger.debug(f"  🎙️ [{source_name}] {label} response in {elapsed:.1f}s: {response.status_code}")
 
-        Path(tmp_in_path).unlink(missing_ok=True)
-        Path(tmp_out_path).unlink(missing_ok=True)
+            if response.status_code == 200:
+                return response.json()
+            else:
+                logger.error(f"  ❌ [{source_name}] {label} error {response.status_code}: {response.text[:200]}")
 
     except Exception as e:
-        print(f"  ⚠️ [{source_name}] Compression failed: {e}", flush=True)
+        logger.error(f"  ❌ [{source_name}] {label} transcription error: {e}")
+
+    return None
 
-    return audio_data, audio_ext
+
+async def transcribe_segments_groq(
+    audio_data: bytes, audio_ext: str = ".mp3", source_name: str = "AUDIO"
+) -> Optional[dict]:
+    """Groq Whisper brut : ``{"text", "segments", "language"}`` ou None (fichier ≤ 25MB attendu)."""
+    groq_key = get_groq_key()
+    if not groq_key:
+        logger.error(f"  ❌ [{source_name}] GROQ_API_KEY not configured!")
+        return None
+    if len(audio_data) > GROQ_MAX_FILE_SIZE:
+        logger.error(
+            f"  ❌ [{source_name}] Audio too large for Groq: {len(audio_data) / 1024 / 1024:.1f}MB"
+        )
+        return None
+    return await _request_transcription(
+        GROQ_STT_URL,
+        groq_key,
+        {"model": "whisper-large-v3", "response_format": "verbose_json"},
+        audio_data,
+        audio_ext,
+        GROQ_TRANSCRIBE_TIMEOUT,
+        source_name,
+        "Groq",
+    )
+
+
+async def transcribe_segments_voxtral(
+    audio_data: bytes, audio_ext: str = ".mp3", source_name: str = "AUDIO"
+) -> Optional[dict]:
+    """Voxtral STT brut : ``{"text", "segments", "language"}`` ou None."""
+    from core.config import get_mistral_key
+
+    mistral_key = get_mistral_key()
+    if not mistral_key:
+        logger.debug(f"  ⏭️ [{source_name}] VOXTRAL-STT: No Mistral API key")
+        return None
+    return await _request_transcription(
+        VOXTRAL_STT_URL,
+        mistral_key,
+        {"model": VOXTRAL_STT_MODEL, "timestamp_granularities": "segment"},
+        audio_data,
+        audio_ext,
+        VOXTRAL_TRANSCRIBE_TIMEOUT,
+        source_name,
+        "Voxtral",
+    )
+
+
+def _format_stt_result(result: Optional[dict]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    if not result or not result.get("text"):
+        return None, None, None
+    full_text = result["text"]
+    return full_text, build_timestamped(result.get("segments", []), full_text), result.get("language", "fr")
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -243,79 +397,27 @@ async def transcribe_audio_groq(
     Returns:
         (full_text, timestamped_text, detected_language) ou (None, None, None)
     """
-    groq_key = get_groq_key()
-    if not groq_key:
-        print(f"  ❌ [{source_name}] GROQ_API_KEY not configured!", flush=True)
+    if not get_groq_key():
+        logger.error(f"  ❌ [{source_name}] GROQ_API_KEY not configured!")
         return None, None, None
 
     # Compresser si nécessaire
     audio_data, audio_ext = await compress_audio(audio_data, audio_ext, source_name)
 
     if len(audio_data) > GROQ_MAX_FILE_SIZE:
-        print(
-            f"  ❌ [{source_name}] Audio still too large after compression: {len(audio_data) / 1024 / 1024:.1f}MB",
-            flush=True,
+        logger.error(
+            f"  ❌ [{source_name}] Audio still too large after compression: {len(audio_data) / 1024 / 1024:.1f}MB"
         )
         return None, None, None
 
-    print(f"  🎙️ [{source_name}] Sending {len(audio_data) / 1024 / 1024:.1f}MB to Groq Whisper...", flush=True)
-
-    try:
-        mime_type = AUDIO_MIME_TYPES.get(audio_ext, "audio/mpeg")
-
-        async with httpx.AsyncClient() as client:
-            files = {"file": (f"audio{audio_ext}", audio_data, mime_type)}
-            data = {"model": "whisper-large-v3", "response_format": "verbose_json"}
-
-            start_time = time.time()
-            response = await client.post(
-                "https://api.groq.com/openai/v1/audio/transcriptions",
-                headers={"Authorization": f"Bearer {groq_key}"},
-                files=files,
-                data=data,
-                timeout=GROQ_TRANSCRIBE_TIMEOUT,
-            )
-            elapsed = time.time() - start_time
-            print(f"  🎙️ [{source_name}] Groq response in {elapsed:.1f}s: {response.status_code}", flush=True)
+    logger.debug(f"  🎙️ [{source_name}] Sending {len(audio_data) / 1024 / 1024:.1f}MB to Groq Whisper...")
 
-            if response.status_code == 200:
-                result = response.json()
-                full_text = result.get("text", "")
-                segments = result.get("segments", [])
-                detected_lang = result.get("language", "fr")
-
-                if full_text:
-                    # Construire le texte avec timestamps
-                    if segments:
-                        timestamped_parts = []
-                        last_ts = -30
-                        for seg in segments:
-                            text = seg.get("text", "").strip()
-                            start = seg.get("start", 0)
-                            if not text:
-                                continue
-                            if start - last_ts >= 30:
-                                ts = format_seconds_to_timestamp(start)
-                                timestamped_parts.append(f"\n[{ts}] {text}")
-                                last_ts = start
-                            else:
-                                timestamped_parts.append(f" {text}")
-                        timestamped = "".join(timestamped_parts).strip()
-                    else:
-                        timestamped = full_text
-
-                    print(
-                        f"  ✅ [{source_name}] Transcription OK: {len(full_text)} chars, lang={detected_lang}",
-                        flush=True,
-                    )
-                    return full_text, timestamped, detected_lang
-            else:
-                print(f"  ❌ [{source_name}] Groq error {response.status_code}: {response.text[:200]}", flush=True)
-
-    except Exception as e:
-        print(f"  ❌ [{source_name}] Transcription error: {e}", flush=True)
-
-    return None, None, None
+    full_text, timestamped, detected_lang = _format_stt_result(
+        await transcribe_segments_groq(audio_data, audio_ext, source_name)
+    )
+    if full_text:
+        logger.info(f"  ✅ [{source_name}] Transcription OK: {len(full_text)} chars, lang={detected_lang}")
+    return full_text, timestamped, detected_lang
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -323,11 +425,6 @@ async def transcribe_audio_groq(
 # v7.2 — Supporte 3h audio, 13 langues, timestamps segment-level
 # ═══════════════════════════════════════════════════════════════════════════════
 
-VOXTRAL_STT_URL = "https://api.mistral.ai/v1/audio/transcriptions"
-# v7.3 — Switch to transcribe-only model (faster + cheaper than chat-tuned voxtral-mini-latest)
-# Official doc: https://docs.mistral.ai/models/voxtral-mini-transcribe-26-02
-VOXTRAL_STT_MODEL = "voxtral-mini-2602"
-
 
 async def transcribe_audio_voxtral(
     audio_data: bytes,
@@ -347,72 +444,18 @@ async def transcribe_audio_voxtral(
     """
     from core.config import get_mistral_key
 
-    mistral_key = get_mistral_key()
-    if not mistral_key:
-        print(f"  ⏭️ [{source_name}] VOXTRAL-STT: No Mistral API key", flush=True)
+    if not get_mistral_key():
+        logger.debug(f"  ⏭️ [{source_name}] VOXTRAL-STT: No Mistral API key")
         return None, None, None
 
-    print(f"  🎙️ [{source_name}] Sending {len(audio_data) / 1024 / 1024:.1f}MB to Voxtral STT...", flush=True)
-
-    try:
-        mime_type = AUDIO_MIME_TYPES.get(audio_ext, "audio/mpeg")
-
-        async with httpx.AsyncClient() as client:
-            files = {"file": (f"audio{audio_ext}", audio_data, mime_type)}
-            data = {
-                "model": VOXTRAL_STT_MODEL,
-                "timestamp_granularities": "segment",
-            }
-
-            start_time = time.time()
-            response = await client.post(
-                VOXTRAL_STT_URL,
-                headers={"Authorization": f"Bearer {mistral_key}"},
-                files=files,
-                data=data,
-                timeout=360,
-            )
-            elapsed = time.time() - start_time
-            print(f"  🎙️ [{source_name}] Voxtral response in {elapsed:.1f}s: {response.status_code}", flush=True)
+    logger.debug(f"  🎙️ [{source_name}] Sending {len(audio_data) / 1024 / 1024:.1f}MB to Voxtral STT...")
 
-            if response.status_code == 200:
-                result = response.json()
-                full_text = result.get("text", "")
-                segments = result.get("segments", [])
-                detected_lang = result.get("language", "fr")
-
-                if full_text:
-                    if segments:
-                        timestamped_parts = []
-                        last_ts = -30
-                        for seg in segments:
-                            text = seg.get("text", "").strip()
-                            start = seg.get("start", 0)
-                            if not text:
-                                continue
-                            if start - last_ts >= 30:
-                                ts = format_seconds_to_timestamp(start)
-                                timestamped_parts.append(f"\n[{ts}] {text}")
-                                last_ts = start
-                            else:
-                                timestamped_parts.append(f" {text}")
-                        timestamped = "".join(timestamped_parts).strip()
-                    else:
-                        timestamped = full_text
-
-                    print(
-                        f"  ✅ [{source_name}] Voxtral STT OK: {len(full_text)} chars, lang={detected_lang}", flush=True
-                    )
-                    return full_text, timestamped, detected_lang
-            else:
-                print(
-                    f"  ❌ [{source_name}] Voxtral STT error {response.status_code}: {response.text[:200]}", flush=True
-                )
-
-    except Exception as e:
-        print(f"  ❌ [{source_name}] Voxtral STT error: {e}", flush=True)
-
-    return None, None, None
+    full_text, timestamped, detected_lang = _format_stt_result(
+        await transcribe_segments_voxtral(audio_data, audio_ext, source_name)
+    )
+    if full_text:
+        logger.info(f"  ✅ [{source_name}] Voxtral STT OK: {len(full_text)} chars, lang={detected_lang}")
+    return full_text, timestamped, detected_lang
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -435,12 +478,11 @@ async def download_audio_ytdlp(
     Returns:
         (audio_bytes, extension) ou (None, ".mp3")
     """
-    print(f"  📥 [{source_name}] Downloading audio via yt-dlp...", flush=True)
+    logger.debug(f"  📥 [{source_name}] Downloading audio via yt-dlp...")
 
     try:
-        loop = asyncio.get_event_loop()
 
-        def _download():
+        async def _download():
             with tempfile.TemporaryDirectory() as tmpdir:
                 audio_path = f"{tmpdir}/audio.mp3"
 
@@ -465,25 +507,24 @@ async def download_audio_ytdlp(
 
                 cmd.append(url)
 
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+                result = await run_media_process(cmd, timeout=timeout)
 
-                if result.returncode != 0:
-                    print(f"  ⚠️ [{source_name}] yt-dlp failed: {result.stderr[:150]}", flush=True)
+                if not result.ok:
+                    logger.warning(f"  ⚠️ [{source_name}] yt-dlp failed: {result.stderr_text[:150]}")
                     return None, ".mp3"
 
                 # Chercher le fichier audio produit
                 for f in Path(tmpdir).iterdir():
                     if f.suffix in [".mp3", ".m4a", ".webm", ".opus", ".wav", ".ogg"]:
-                        data = f.read_bytes()
-                        print(
-                            f"  ✅ [{source_name}] Audio downloaded: {len(data) / 1024 / 1024:.1f}MB ({f.suffix})",
-                            flush=True,
+                        data = await asyncio.to_thread(f.read_bytes)
+                        logger.info(
+                            f"  ✅ [{source_name}] Audio downloaded: {len(data) / 1024 / 1024:.1f}MB ({f.suffix})"
                         )
                         return data, f.suffix
 
                 return None, ".mp3"
 
-        result = await asyncio.wait_for(loop.run_in_executor(executor, _download), timeout=timeout)
+        result = await _download()
         # 📡 Proxy telemetry — track bytes_in = taille du fichier téléchargé (compressé).
         # No-op si proxy pas configuré (dev local). Best-effort, jamais bloquant.
         try:
@@ -497,8 +538,8 @@ async def download_audio_ytdlp(
         return result
 
     except asyncio.TimeoutError:
-        print(f"  ⚠️ [{source_name}] Download timeout ({timeout}s)", flush=True)
+        logger.warning(f"  ⚠️ [{source_name}] Download timeout ({timeout}s)")
     except Exception as e:
-        print(f"  ⚠️ [{source_name}] Download error: {e}", flush=True)
+        logger.warning(f"  ⚠️ [{source_name}] Download error: {e}")
 
     return None, ".mp3"
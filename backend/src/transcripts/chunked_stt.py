@@ -0,0 +1,448 @@
+"""
+╔════════════════════════════════════════════════════════════════════════════════════╗
+║  🎙️ CHUNKED STT — Transcription parallèle des audios longs                        ║
+╠════════════════════════════════════════════════════════════════════════════════════╣
+║  • ffmpeg silencedetect → coupes sur les silences (~10 min par segment)           ║
+║  • Segments extraits en pipe (MP3 mono 16kHz) avec recouvrement de ~1.5s          ║
+║  • Transcription concurrente bornée, répartie Voxtral / Groq (fallback croisé)    ║
+║  • Timestamps recalés sur la vidéo puis recousus au format ``timestamped``        ║
+║  • Transcript partiel publié dès que le préfixe contigu s'allonge                 ║
+╚════════════════════════════════════════════════════════════════════════════════════╝
+
+Usage:
+    from transcripts.chunked_stt import should_chunk_audio, transcribe_chunked
+
+    if should_chunk_audio(duration, len(audio_data)):
+        simple, timestamped, lang = await transcribe_chunked(
+            audio_data, ".m4a", duration=duration, on_partial=lambda p: print(p.done, p.total)
+        )
+
+    # Ou en flux (transcript partiel en ordre chronologique)
+    async for partial in iter_chunked_transcript(audio_data, ".m4a"):
+        ...
+"""
+
+import asyncio
+import contextvars
+import inspect
+import os
+import re
+import tempfile
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from core.config import get_groq_key, get_mistral_key
+from core.logging import logger
+from core.media_process import MediaProcessTimeout, run_media_process
+from core.provider_health import provider_health
+from transcripts.audio_utils import (
+    GROQ_MAX_FILE_SIZE,
+    build_timestamped,
+    transcribe_segments_groq,
+    transcribe_segments_voxtral,
+)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Configuration
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# En dessous, un seul appel STT reste plus simple et aussi rapide
+CHUNKED_STT_MIN_DURATION_S = float(os.environ.get("CHUNKED_STT_MIN_DURATION_S", "900"))
+CHUNKED_STT_TARGET_S = float(os.environ.get("CHUNKED_STT_TARGET_S", "600"))
+CHUNKED_STT_MAX_S = float(os.environ.get("CHUNKED_STT_MAX_S", "780"))
+CHUNKED_STT_OVERLAP_S = float(os.environ.get("CHUNKED_STT_OVERLAP_S", "1.5"))
+CHUNKED_STT_CONCURRENCY = int(os.environ.get("CHUNKED_STT_CONCURRENCY", "4"))
+CHUNKED_STT_SILENCE_DB = os.environ.get("CHUNKED_STT_SILENCE_DB", "-35dB")
+CHUNKED_STT_SILENCE_MIN_S = float(os.environ.get("CHUNKED_STT_SILENCE_MIN_S", "0.5"))
+
+_SILENCE_START_RE = re.compile(r"silence_start:\s*(-?[\d.]+)")
+_SILENCE_END_RE = re.compile(r"silence_end:\s*(-?[\d.]+)")
+_DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):([\d.]+)")
+
+# (audio_bytes, ext, source_name) → {"text", "segments", "language"} ou None
+SttCall = Callable[[bytes, str, str], Awaitable[Optional[dict]]]
+PartialListener = Callable[["PartialTranscript"], Any]
+
+# Écouteur de transcript partiel, posé par get_transcript_with_timestamps(on_partial=...)
+# pour ne pas faire traverser le callback à toutes les phases d'extraction.
+partial_transcript_listener: contextvars.ContextVar[Optional[PartialListener]] = contextvars.ContextVar(
+    "partial_transcript_listener", default=None
+)
+
+
+class ChunkedTranscriptionError(Exception):
+    """Un segment n'a pu être transcrit par aucun provider."""
+
+
+@dataclass
+class AudioSegment:
+    index: int
+    cut_start: float  # bornes nominales : chaque instant appartient à un seul segment
+    cut_end: float
+    start: float  # bornes d'extraction (recouvrement inclus)
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class SegmentTranscript:
+    segment: AudioSegment
+    provider: str
+    segments: List[dict]  # segments STT en temps absolu, limités à [cut_start, cut_end)
+    language: str
+
+
+@dataclass
+class PartialTranscript:
+    done: int  # segments contigus transcrits depuis le début
+    total: int
+    simple: str
+    timestamped: str
+    language: Optional[str]
+    covered_until_s: float
+    providers: List[str] = field(default_factory=list)
+
+    @property
+    def complete(self) -> bool:
+        return self.done == self.total
+
+
+def should_chunk_audio(duration: float, audio_size: int) -> bool:
+    """Audio long (durée connue) ou trop lourd pour un envoi Groq unique."""
+    return (duration or 0) >= CHUNKED_STT_MIN_DURATION_S or audio_size > GROQ_MAX_FILE_SIZE
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Découpage sur silences
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def parse_silencedetect(stderr: str) -> Tuple[List[Tuple[float, float]], Optional[float]]:
+    """Extrait les silences ``(début, fin)`` et la durée totale de la sortie ffmpeg silencedetect."""
+    silences: List[Tuple[float, float]] = []
+    pending: Optional[float] = None
+    for line in stderr.splitlines():
+        m = _SILENCE_START_RE.search(line)
+        if m:
+            pending = max(0.0, float(m.group(1)))
+            continue
+        m = _SILENCE_END_RE.search(line)
+        if m and pending is not None:
+            silences.append((pending, float(m.group(1))))
+            pending = None
+
+    duration = None
+    m = _DURATION_RE.search(stderr)
+    if m:
+        hours, minutes, seconds = m.groups()
+        duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    return silences, duration
+
+
+def plan_segments(
+    duration: float,
+    silences: Sequence[Tuple[float, float]],
+    target_s: float = CHUNKED_STT_TARGET_S,
+    max_s: float = CHUNKED_STT_MAX_S,
+    overlap_s: float = CHUNKED_STT_OVERLAP_S,
+) -> List[AudioSegment]:
+    """
+    Coupe au milieu du silence le plus proche de ``target_s`` (entre target/2 et
+    ``max_s`` après la coupe précédente), sinon coupe franche à ``target_s``.
+    """
+    midpoints = sorted((start + end) / 2 for start, end in silences)
+    cuts = [0.0]
+    while duration - cuts[-1] > max_s:
+        pos = cuts[-1]
+        ideal = pos + target_s
+        candidates = [m for m in midpoints if pos + target_s / 2 <= m <= pos + max_s]
+        cuts.append(min(candidates, key=lambda m: abs(m - ideal)) if candidates else ideal)
+    cuts.append(duration)
+
+    return [
+        AudioSegment(
+            index=i,
+            cut_start=cut_start,
+            cut_end=cut_end,
+            start=max(0.0, cut_start - overlap_s),
+            end=min(duration, cut_end + overlap_s),
+        )
+        for i, (cut_start, cut_end) in enumerate(zip(cuts, cuts[1:]))
+    ]
+
+
+async def detect_silences(path: str, source_name: str = "CHUNKED-STT") -> Tuple[List[Tuple[float, float]], Optional[float]]:
+    """Passe ffmpeg silencedetect (décodage seul, sans sortie) sur le fichier audio."""
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-nostats",
+        "-i",
+        path,
+        "-vn",
+        "-af",
+        f"silencedetect=noise={CHUNKED_STT_SILENCE_DB}:d={CHUNKED_STT_SILENCE_MIN_S}",
+        "-f",
+        "null",
+        "-",
+    ]
+    try:
+        result = await run_media_process(cmd, timeout=180)
+    except MediaProcessTimeout:
+        logger.warning(f"  ⚠️ [{source_name}] silencedetect timeout — coupes franches")
+        return [], None
+    return parse_silencedetect(result.stderr_text)
+
+
+async def extract_segment(path: str, segment: AudioSegment, timeout: float = 120) -> Optional[bytes]:
+    """Extrait ``segment`` en MP3 mono 16kHz 32kbps, sortie en pipe."""
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-ss",
+        f"{segment.start:.3f}",
+        "-t",
+        f"{segment.duration:.3f}",
+        "-i",
+        path,
+        "-vn",
+        "-b:a",
+        "32k",
+        "-ac",
+        "1",
+        "-ar",
+        "16000",
+        "-f",
+        "mp3",
+        "pipe:1",
+    ]
+    result = await run_media_process(cmd, timeout=timeout)
+    if not result.ok or not result.stdout:
+        return None
+    return result.stdout
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Transcription parallèle + couture
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def default_stt_providers() -> List[Tuple[str, SttCall]]:
+    """Providers STT disponibles (clé configurée), Voxtral en tête."""
+    providers: List[Tuple[str, SttCall]] = []
+    if get_mistral_key():
+        providers.append(("voxtral", transcribe_segments_voxtral))
+    if get_groq_key():
+        providers.append(("groq", transcribe_segments_groq))
+    return providers
+
+
+def shift_segments(segment: AudioSegment, raw: dict) -> List[dict]:
+    """
+    Recale les segments STT en temps absolu et ne garde que ceux qui se terminent
+    dans [cut_start, cut_end) : sur une coupe franche, une phrase commencée dans le
+    recouvrement et qui déborde est gardée (début ramené à cut_start) par le segment
+    qui l'entend en entier, au lieu d'être tronquée par le précédent.
+    """
+    stt_segments = raw.get("segments") or []
+    if not stt_segments:
+        text = (raw.get("text") or "").strip()
+        return [{"start": segment.cut_start, "text": text}] if text else []
+
+    is_last = segment.end <= segment.cut_end  # pas de recouvrement après la fin de l'audio
+    kept = []
+    for seg in stt_segments:
+        text = (seg.get("text") or "").strip()
+        if not text:
+            continue
+        start = segment.start + float(seg.get("start", 0) or 0)
+        end = segment.start + float(seg["end"]) if seg.get("end") is not None else start
+        if end < segment.cut_start or (end >= segment.cut_end and not is_last):
+            continue  # zone de recouvrement : appartient au segment voisin
+        kept.append({"start": max(start, segment.cut_start), "text": text})
+    return kept
+
+
+def stitch_transcripts(parts: Sequence[SegmentTranscript]) -> Tuple[str, str, Optional[str]]:
+    """Concatène les segments dans l'ordre → (simple, timestamped, langue majoritaire)."""
+    ordered = sorted(parts, key=lambda p: p.segment.index)
+    segments = [seg for part in ordered for seg in part.segments]
+    simple = " ".join(seg["text"] for seg in segments)
+    languages = Counter(part.language for part in ordered if part.language)
+    language = languages.most_common(1)[0][0] if languages else None
+    return simple, build_timestamped(segments, simple), language
+
+
+async def _transcribe_segment(
+    path: str,
+    segment: AudioSegment,
+    providers: Sequence[Tuple[str, SttCall]],
+    semaphore: asyncio.Semaphore,
+    source_name: str,
+) -> SegmentTranscript:
+    async with semaphore:
+        audio = await extract_segment(path, segment)
+        if not audio:
+            raise ChunkedTranscriptionError(f"segment {segment.index}: extraction ffmpeg échouée")
+
+        # Répartition tournante : le segment i part d'abord sur providers[i % n]
+        rotation = [providers[(segment.index + k) % len(providers)] for k in range(len(providers))]
+        label = f"{source_name} #{segment.index + 1}"
+        for key, call in rotation:
+            if not await provider_health.allow(f"stt:{key}"):
+                continue
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            try:
+                raw = await call(audio, ".mp3", label)
+            except Exception as e:
+                logger.warning("Chunked STT provider error", provider=key, segment=segment.index, error=str(e)[:120])
+                raw = None
+            # None = erreur transport/HTTP ; un texte vide (musique, silence) est un segment vide valide
+            ok = raw is not None
+            provider_health.record(f"stt:{key}", ok, loop.time() - started if ok else None)
+            if ok:
+                return SegmentTranscript(segment, key, shift_segments(segment, raw), raw.get("language") or "")
+        raise ChunkedTranscriptionError(f"segment {segment.index}: aucun provider STT n'a répondu")
+
+
+async def iter_chunked_transcript(
+    audio_data: bytes,
+    audio_ext: str = ".mp3",
+    *,
+    duration: Optional[float] = None,
+    source_name: str = "CHUNKED-STT",
+    providers: Optional[Sequence[Tuple[str, SttCall]]] = None,
+    concurrency: int = CHUNKED_STT_CONCURRENCY,
+) -> AsyncIterator[PartialTranscript]:
+    """
+    Transcrit l'audio par segments en parallèle et produit un ``PartialTranscript``
+    chaque fois que le préfixe contigu transcrit s'allonge (le dernier est complet).
+    Lève ``ChunkedTranscriptionError`` si un segment échoue sur tous les providers.
+    """
+    providers = list(providers if providers is not None else default_stt_providers())
+    if not providers:
+        raise ChunkedTranscriptionError("aucun provider STT configuré")
+
+    with tempfile.NamedTemporaryFile(suffix=audio_ext, delete=False) as tmp:
+        path = tmp.name
+    tasks: Dict[asyncio.Task, AudioSegment] = {}
+    try:
+        await asyncio.to_thread(Path(path).write_bytes, audio_data)
+        silences, probed = await detect_silences(path, source_name)
+        total_s = probed or duration
+        if not total_s:
+            raise ChunkedTranscriptionError("durée audio inconnue")
+
+        segments = plan_segments(total_s, silences)
+        logger.debug(
+            f"  ✂️ [{source_name}] {total_s / 60:.0f} min → {len(segments)} segments "
+            f"({len(silences)} silences, x{min(concurrency, len(segments))} en parallèle)"
+        )
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        tasks = {
+            asyncio.create_task(_transcribe_segment(path, seg, providers, semaphore, source_name)): seg
+            for seg in segments
+        }
+        done_parts: Dict[int, SegmentTranscript] = {}
+        emitted = 0
+        pending = set(tasks)
+        while pending:
+            finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                part = task.result()  # propage ChunkedTranscriptionError
+                done_parts[part.segment.index] = part
+            contiguous = emitted
+            while contiguous in done_parts:
+                contiguous += 1
+            if contiguous > emitted:
+                emitted = contiguous
+                prefix = [done_parts[i] for i in range(emitted)]
+                simple, timestamped, language = stitch_transcripts(prefix)
+                yield PartialTranscript(
+                    done=emitted,
+                    total=len(segments),
+                    simple=simple,
+                    timestamped=timestamped,
+                    language=language,
+                    covered_until_s=prefix[-1].segment.cut_end,
+                    providers=[p.provider for p in prefix],
+                )
+    finally:
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        Path(path).unlink(missing_ok=True)
+
+
+async def transcribe_chunked(
+    audio_data: bytes,
+    audio_ext: str = ".mp3",
+    *,
+    duration: Optional[float] = None,
+    source_name: str = "CHUNKED-STT",
+    providers: Optional[Sequence[Tuple[str, SttCall]]] = None,
+    concurrency: int = CHUNKED_STT_CONCURRENCY,
+    on_partial: Optional[PartialListener] = None,
+) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Version collectée de ``iter_chunked_transcript`` : (simple, timestamped, lang)
+    ou (None, None, None). ``on_partial`` (sync ou async) reçoit chaque partiel ;
+    à défaut, l'écouteur du contexte ``partial_transcript_listener`` est utilisé.
+    """
+    listener = on_partial or partial_transcript_listener.get()
+    final: Optional[PartialTranscript] = None
+    try:
+        async for partial in iter_chunked_transcript(
+            audio_data,
+            audio_ext,
+            duration=duration,
+            source_name=source_name,
+            providers=providers,
+            concurrency=concurrency,
+        ):
+            final = partial
+            if listener is not None:
+                try:
+                    outcome = listener(partial)
+                    if inspect.isawaitable(outcome):
+                        await outcome
+                except Exception as e:
+                    logger.warning("Partial transcript listener failed", error=str(e)[:120])
+    except ChunkedTranscriptionError as e:
+        logger.error(f"  ❌ [{source_name}] {e}")
+        return None, None, None
+    except Exception as e:
+        logger.error(f"  ❌ [{source_name}] Chunked STT error ({type(e).__name__}): {str(e)[:200]}")
+        return None, None, None
+
+    if final is None or not final.complete or not final.simple:
+        return None, None, None
+    logger.info(
+        f"  ✅ [{source_name}] {final.total} segments, {len(final.simple)} chars, "
+        f"providers={dict(Counter(final.providers))}"
+    )
+    return final.simple, final.timestamped, final.language or "fr"
+
+
+__all__ = [
+    "AudioSegment",
+    "ChunkedTranscriptionError",
+    "PartialTranscript",
+    "iter_chunked_transcript",
+    "parse_silencedetect",
+    "partial_transcript_listener",
+    "plan_segments",
+    "should_chunk_audio",
+    "stitch_transcripts",
+    "transcribe_chunked",
+]
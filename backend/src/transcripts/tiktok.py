@@ -21,7 +21,6 @@ import logging
 import httpx
 from typing import Optional, Dict, Any, Tuple
 from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass, field
 
 from transcripts.audio_utils import (
     download_audio_ytdlp,
@@ -33,6 +32,8 @@ from transcripts.audio_utils import (
 )
 from core.config import get_supadata_key, get_mistral_key
 from core.http_client import get_proxied_client, record_proxied_response, smart_request
+from core.media_process import run_media_process
+from core.provider_health import provider_health
 
 logger = logging.getLogger(__name__)
 
@@ -93,40 +94,8 @@ BASE_BACKOFF_SEC = 2.0
 # 🔌 CIRCUIT BREAKER (évite de spammer TikTok si le service est down)
 # ═══════════════════════════════════════════════════════════════════════════════
 
-
-@dataclass
-class CircuitBreaker:
-    """Simple circuit breaker pour les requêtes TikTok."""
-
-    failure_count: int = 0
-    last_failure_time: float = 0.0
-    threshold: int = 5  # Nombre d'échecs avant ouverture
-    reset_timeout: float = 300  # 5 min avant de réessayer
-
-    def record_failure(self) -> None:
-        self.failure_count += 1
-        self.last_failure_time = time.time()
-        logger.warning(f"[TIKTOK] Circuit breaker: failure #{self.failure_count}")
-
-    def record_success(self) -> None:
-        self.failure_count = 0
-        self.last_failure_time = 0.0
-
-    def is_open(self) -> bool:
-        if self.failure_count < self.threshold:
-            return False
-        elapsed = time.time() - self.last_failure_time
-        if elapsed > self.reset_timeout:
-            # Half-open: on laisse passer pour tester
-            logger.info("[TIKTOK] Circuit breaker: half-open, allowing retry")
-            return False
-        logger.warning(
-            f"[TIKTOK] Circuit breaker OPEN ({self.failure_count} failures, retry in {int(self.reset_timeout - elapsed)}s)"
-        )
-        return True
-
-
-_circuit_breaker = CircuitBreaker()
+# Circuit partagé entre workers (Redis) — voir core.provider_health
+_circuit_breaker = provider_health.circuit("tiktok:extraction")
 
 # Patterns TikTok reconnus
 TIKTOK_PATTERNS = [
@@ -310,7 +279,7 @@ async def get_tiktok_video_info(url: str) -> Optional[Dict[str, Any]]:
 
     # ─── yt-dlp (fallback) ─────────────────────────────────────────────────
     # Circuit breaker check
-    if _circuit_breaker.is_open():
+    if not await _circuit_breaker.allow():
         logger.error("[TIKTOK] Circuit breaker is open, skipping yt-dlp info")
         # Try oEmbed as last resort
         oembed_info = await _get_info_via_oembed(url)
@@ -603,7 +572,7 @@ async def get_tiktok_transcript(
     logger.info(f"[TIKTOK] Starting transcript extraction for {vid}")
 
     # Circuit breaker check
-    if _circuit_breaker.is_open():
+    if not await _circuit_breaker.allow():
         logger.error(f"[TIKTOK] Circuit breaker open, skipping transcript for {vid}")
         return None, None, None
 
@@ -859,22 +828,16 @@ async def _download_media_bytes(media_url: str, source: str) -> Optional[bytes]:
 
 
 async def _extract_audio_ffmpeg(video_data: bytes) -> Tuple[Optional[bytes], str]:
-    """Extrait l'audio d'une vidéo MP4 via ffmpeg."""
+    """Extrait l'audio d'une vidéo MP4 via ffmpeg (sortie en pipe, sans fichier mp3 intermédiaire)."""
     import tempfile
     from pathlib import Path
 
     try:
+        # MP4 : l'atome moov peut être en fin de fichier → entrée fichier, pas stdin
         with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as tmp_in:
-            tmp_in.write(video_data)
             tmp_in_path = tmp_in.name
-
-        tmp_out_path = tmp_in_path.replace(".mp4", ".mp3")
-
-        loop = asyncio.get_event_loop()
-
-        def _convert():
-            import subprocess
-
+        try:
+            await asyncio.to_thread(Path(tmp_in_path).write_bytes, video_data)
             cmd = [
                 "ffmpeg",
                 "-i",
@@ -886,27 +849,19 @@ async def _extract_audio_ffmpeg(video_data: bytes) -> Tuple[Optional[bytes], str
                 "1",
                 "-ar",
                 "16000",
-                "-y",
-                tmp_out_path,
+                "-f",
+                "mp3",
+                "pipe:1",
             ]
-            result = subprocess.run(cmd, capture_output=True, timeout=60)
-            return result.returncode == 0
-
-        success = await asyncio.wait_for(
-            loop.run_in_executor(audio_executor, _convert),
-            timeout=60,
-        )
+            result = await run_media_process(cmd, timeout=60)
+        finally:
+            Path(tmp_in_path).unlink(missing_ok=True)
 
-        if success and Path(tmp_out_path).exists():
-            audio_bytes = Path(tmp_out_path).read_bytes()
+        if result.ok and result.stdout:
+            audio_bytes = result.stdout
             logger.info(f"[TIKTOK] ffmpeg extracted audio: {len(audio_bytes) / 1024:.0f}KB")
-            Path(tmp_in_path).unlink(missing_ok=True)
-            Path(tmp_out_path).unlink(missing_ok=True)
             return audio_bytes, ".mp3"
 
-        Path(tmp_in_path).unlink(missing_ok=True)
-        Path(tmp_out_path).unlink(missing_ok=True)
-
     except Exception as e:
         logger.error(f"[TIKTOK] ffmpeg extraction failed: {e}")
 
@@ -25,6 +25,7 @@ import tempfile
 import os
 
 from core.logging import logger
+from core.provider_health import provider_health
 from core.config import (
     get_supadata_key,
     get_groq_key,
@@ -113,7 +114,10 @@ class ExtractionAttempt:
 
 
 class CircuitBreaker:
-    """Circuit breaker pour eviter de surcharger les endpoints defaillants"""
+    """
+    Circuit breaker local (par process) pour eviter de surcharger les endpoints defaillants.
+    L'extracteur utilise les circuits partages du cluster (core.provider_health).
+    """
 
     def __init__(self, failure_threshold: int = 5, recovery_timeout: int = 300):
         self.failure_threshold = failure_threshold
@@ -149,7 +153,7 @@ class CircuitBreaker:
 
 
 class InstanceHealthManager:
-    """Manages health of external service instances"""
+    """Manages health of external service instances (local; see core.provider_health for the shared registry)"""
 
     def __init__(self):
         self.instance_failures: Dict[str, int] = {}
@@ -244,11 +248,9 @@ class UltraResilientTranscriptExtractor:
     ]
 
     def __init__(self):
-        self.circuit_breaker = CircuitBreaker(
-            failure_threshold=TRANSCRIPT_CONFIG.get("circuit_breaker_failure_threshold", 5),
-            recovery_timeout=TRANSCRIPT_CONFIG.get("circuit_breaker_recovery_timeout", 300),
-        )
-        self.instance_health = InstanceHealthManager()
+        # Circuits partages entre workers (Redis) : methodes d'extraction + instances
+        self.circuit_breaker = provider_health.group("transcript")
+        self.instance_health = provider_health.group("instance")
         self.http_client: Optional[httpx.AsyncClient] = None
         self.extraction_stats: Dict[str, Dict] = {}
         self._rate_limit_tokens = 10
@@ -851,7 +853,7 @@ class UltraResilientTranscriptExtractor:
         """Uses Invidious public instances"""
         await self._rate_limit()
 
-        healthy_instances = self.instance_health.get_healthy_instances(self.INVIDIOUS_INSTANCES)
+        healthy_instances = await self.instance_health.order(self.INVIDIOUS_INSTANCES, by_latency=True, shuffle=True)
 
         for instance in healthy_instances[:5]:
             try:
@@ -924,7 +926,7 @@ class UltraResilientTranscriptExtractor:
         """Uses Piped public instances"""
         await self._rate_limit()
 
-        healthy_instances = self.instance_health.get_healthy_instances(self.PIPED_INSTANCES)
+        healthy_instances = await self.instance_health.order(self.PIPED_INSTANCES, by_latency=True, shuffle=True)
 
         for instance in healthy_instances[:5]:
             try:
@@ -1234,7 +1236,7 @@ class UltraResilientTranscriptExtractor:
             method_name = method_enum.value
 
             # Check circuit breaker
-            if not self.circuit_breaker.can_execute(method_name):
+            if not await self.circuit_breaker.allow(method_name):
                 logger.debug(f"Skipping {method_name} (circuit breaker open)")
                 continue
 
@@ -1253,7 +1255,7 @@ class UltraResilientTranscriptExtractor:
                     raise Exception(f"{method_name} returned empty transcript (no captions for this video)")
 
                 # Success!
-                self.circuit_breaker.record_success(method_name)
+                self.circuit_breaker.record_success(method_name, (datetime.now() - attempt_start).total_seconds())
 
                 extraction_time = int((datetime.now() - start_time).total_seconds() * 1000)
                 result.extraction_time_ms = extraction_time
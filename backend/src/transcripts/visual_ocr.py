@@ -15,15 +15,14 @@
 import asyncio
 import base64
 import logging
-import subprocess
 import tempfile
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Tuple
 
 import httpx
 
 from core.config import get_mistral_key
+from core.media_process import MediaProcessTimeout, run_media_process
 
 logger = logging.getLogger(__name__)
 
@@ -37,9 +36,6 @@ MAX_FRAMES = 10  # Max slides à envoyer (coût + context)
 FRAME_MAX_SIZE_KB = 300  # Compresser au-delà
 PIXTRAL_TIMEOUT = 60  # Timeout appel API
 
-_executor = ThreadPoolExecutor(max_workers=2)
-
-
 async def extract_text_from_video_frames(
     video_data: bytes,
     video_id: str = "unknown",
@@ -92,17 +88,11 @@ async def _extract_key_frames(
     Extrait les frames clés d'une vidéo en utilisant ffmpeg.
     Détection de changement de scène pour capturer chaque slide.
     """
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(_executor, _extract_frames_sync, video_data, video_id)
-
-
-def _extract_frames_sync(video_data: bytes, video_id: str) -> list[bytes]:
-    """Extraction synchrone des frames via ffmpeg."""
     frames = []
 
     with tempfile.TemporaryDirectory() as tmpdir:
         video_path = Path(tmpdir) / "input.mp4"
-        video_path.write_bytes(video_data)
+        await asyncio.to_thread(video_path.write_bytes, video_data)
 
         output_pattern = str(Path(tmpdir) / "frame_%03d.jpg")
 
@@ -126,10 +116,10 @@ def _extract_frames_sync(video_data: bytes, video_id: str) -> list[bytes]:
         ]
 
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            if result.returncode != 0:
-                logger.warning(f"[VISUAL_OCR] ffmpeg scene detection failed: {result.stderr[:200]}")
-        except subprocess.TimeoutExpired:
+            result = await run_media_process(cmd, timeout=30)
+            if not result.ok:
+                logger.warning(f"[VISUAL_OCR] ffmpeg scene detection failed: {result.stderr_text[:200]}")
+        except MediaProcessTimeout:
             logger.warning(f"[VISUAL_OCR] ffmpeg timeout for {video_id}")
         except FileNotFoundError:
             logger.error("[VISUAL_OCR] ffmpeg not found!")
@@ -157,8 +147,8 @@ def _extract_frames_sync(video_data: bytes, video_id: str) -> list[bytes]:
                 "error",
             ]
             try:
-                subprocess.run(cmd2, capture_output=True, text=True, timeout=30)
-            except (subprocess.TimeoutExpired, FileNotFoundError):
+                await run_media_process(cmd2, timeout=30)
+            except (MediaProcessTimeout, FileNotFoundError):
                 pass
             frame_files = sorted(Path(tmpdir).glob("fallback_*.jpg"))
 
@@ -63,6 +63,17 @@ from core.config import (
     TRANSCRIPT_CONFIG,
 )
 from core.http_client import shared_http_client, get_proxied_client, record_proxied_response, smart_request
+from core.media_process import run_media_process
+from core.hedging import HedgeCandidate, HedgingScheduler
+from core.provider_health import CircuitState, ProviderCircuit, provider_health
+from core.logging import logger
+from transcripts.audio_utils import transcode_audio_for_stt
+from transcripts.chunked_stt import (
+    PartialListener,
+    partial_transcript_listener,
+    should_chunk_audio,
+    transcribe_chunked,
+)
 
 # 💾 Cache pour les transcripts (TTL 24h)
 try:
@@ -72,7 +83,7 @@ try:
 except ImportError:
     CACHE_AVAILABLE = False
     transcript_metrics = None
-    print("⚠️ [YOUTUBE] Cache not available, transcripts won't be cached", flush=True)
+    logger.warning("⚠️ [YOUTUBE] Cache not available, transcripts won't be cached")
 
 # 💾 DB Cache L2 (persistent, cross-user) — kept for legacy / direct use
 try:
@@ -81,7 +92,7 @@ try:
     DB_CACHE_AVAILABLE = True
 except ImportError:
     DB_CACHE_AVAILABLE = False
-    print("⚠️ [YOUTUBE] DB cache not available", flush=True)
+    logger.warning("⚠️ [YOUTUBE] DB cache not available")
 
 # 💾 Unified L1 (Redis) + L2 (DB) transcript cache orchestrator
 try:
@@ -91,7 +102,7 @@ try:
 except ImportError:
     TRANSCRIPT_CACHE_AVAILABLE = False
     transcript_cache = None
-    print("⚠️ [YOUTUBE] Unified transcript cache not available", flush=True)
+    logger.warning("⚠️ [YOUTUBE] Unified transcript cache not available")
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 📊 CONFIGURATION
@@ -227,64 +238,17 @@ def get_working_piped_instance() -> Optional[str]:
 # ═══════════════════════════════════════════════════════════════════════════════
 
 
-class CircuitState(Enum):
-    CLOSED = "closed"  # Normal - méthode active
-    OPEN = "open"  # Méthode désactivée temporairement
-    HALF_OPEN = "half_open"  # Test en cours
+# Circuits partagés entre workers (Redis) — voir core.provider_health
+CircuitBreaker = ProviderCircuit
 
 
-@dataclass
-class CircuitBreaker:
-    """Circuit Breaker pattern pour éviter de perdre du temps sur méthodes cassées"""
-
-    name: str
-    failure_threshold: int = 5
-    recovery_timeout: int = 300  # 5 minutes
-    state: CircuitState = CircuitState.CLOSED
-    failures: int = 0
-    last_failure_time: float = 0
-
-    def record_success(self):
-        """Enregistre un succès et réinitialise le compteur"""
-        self.failures = 0
-        self.state = CircuitState.CLOSED
-
-    def record_failure(self):
-        """Enregistre un échec et ouvre le circuit si nécessaire"""
-        self.failures += 1
-        self.last_failure_time = time.time()
-        if self.failures >= self.failure_threshold:
-            self.state = CircuitState.OPEN
-            print(f"  🔌 [CIRCUIT] {self.name} OUVERT après {self.failures} échecs", flush=True)
-
-    def can_execute(self) -> bool:
-        """Vérifie si la méthode peut être exécutée"""
-        if self.state == CircuitState.CLOSED:
-            return True
-        if self.state == CircuitState.OPEN:
-            # Vérifier si le temps de récupération est passé
-            if time.time() - self.last_failure_time >= self.recovery_timeout:
-                self.state = CircuitState.HALF_OPEN
-                print(f"  🔌 [CIRCUIT] {self.name} HALF-OPEN (test)", flush=True)
-                return True
-            return False
-        return True  # HALF_OPEN
-
-
-# Instance globale des circuit breakers
-_circuit_breakers: Dict[str, CircuitBreaker] = {}
-
-
-def get_circuit_breaker(name: str) -> CircuitBreaker:
-    """Récupère ou crée un circuit breaker pour une méthode"""
-    if name not in _circuit_breakers:
-        config = TRANSCRIPT_CONFIG
-        _circuit_breakers[name] = CircuitBreaker(
-            name=name,
-            failure_threshold=config.get("circuit_breaker_failure_threshold", 5),
-            recovery_timeout=config.get("circuit_breaker_recovery_timeout", 300),
-        )
-    return _circuit_breakers[name]
+def get_circuit_breaker(name: str) -> ProviderCircuit:
+    """Récupère le circuit (partagé cluster) d'une méthode d'extraction"""
+    return provider_health.circuit(f"transcript:{name}")
+
+
+# Hedging Phase 0/1 : histogrammes de latence par méthode, mêmes circuits "transcript:<méthode>"
+transcript_hedger = HedgingScheduler(name="transcript", circuit_family="transcript")
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -311,75 +275,25 @@ def calculate_backoff(attempt: int, base: float = 1.0, max_delay: float = 30.0)
 # ═══════════════════════════════════════════════════════════════════════════════
 
 
-@dataclass
-class InstanceHealth:
-    """Suivi de santé d'une instance"""
-
-    url: str
-    failures: int = 0
-    successes: int = 0
-    last_check: float = 0
-    is_healthy: bool = True
-
-
-_instance_health: Dict[str, InstanceHealth] = {}
-
-
-def get_instance_health(url: str) -> InstanceHealth:
-    """Récupère ou crée le suivi de santé d'une instance"""
-    if url not in _instance_health:
-        _instance_health[url] = InstanceHealth(url=url)
-    return _instance_health[url]
+_instance_health = provider_health.group("instance")
 
 
-def record_instance_success(url: str):
-    """Enregistre un succès pour une instance"""
-    health = get_instance_health(url)
-    health.successes += 1
-    health.failures = max(0, health.failures - 1)  # Décrémente les échecs
-    health.is_healthy = True
-    health.last_check = time.time()
+def record_instance_success(url: str, latency_s: Optional[float] = None):
+    """Enregistre un succès pour une instance (alimente l'EWMA de latence)"""
+    _instance_health.record_success(url, latency_s)
 
 
 def record_instance_failure(url: str):
     """Enregistre un échec pour une instance"""
-    config = TRANSCRIPT_CONFIG
-    threshold = config.get("instance_timeout_threshold", 3)
-
-    health = get_instance_health(url)
-    health.failures += 1
-    health.last_check = time.time()
-
-    if health.failures >= threshold:
-        health.is_healthy = False
-        print(f"  🏥 [HEALTH] {url[:30]}... marqué DOWN après {health.failures} échecs", flush=True)
+    _instance_health.record_failure(url)
 
 
-def get_healthy_instances(instances: List[str]) -> List[str]:
-    """Retourne les instances en bonne santé, avec les saines en premier"""
-    config = TRANSCRIPT_CONFIG
-    check_interval = config.get("health_check_interval", 600)
-    current_time = time.time()
-
-    healthy = []
-    unhealthy = []
-
-    for url in instances:
-        health = get_instance_health(url)
-        # Réactiver les instances après un certain temps
-        if not health.is_healthy and (current_time - health.last_check) > check_interval:
-            health.is_healthy = True
-            health.failures = 0
-            print(f"  🏥 [HEALTH] {url[:30]}... réactivé", flush=True)
-
-        if health.is_healthy:
-            healthy.append(url)
-        else:
-            unhealthy.append(url)
-
-    # Shuffle les instances saines pour distribuer la charge
-    random.shuffle(healthy)
-    return healthy + unhealthy  # Les unhealthy à la fin en dernier recours
+async def get_healthy_instances(instances: List[str]) -> List[str]:
+    """
+    Retourne les instances triées selon leur santé cluster : saines d'abord
+    (latence EWMA croissante, inconnues en tête pour les explorer), DOWN en dernier recours
+    """
+    return await _instance_health.order(instances, by_latency=True, shuffle=True)
 
 
 class TranscriptSource(Enum):
@@ -413,10 +327,10 @@ try:
     from youtube_transcript_api import YouTubeTranscriptApi
 
     YTAPI_AVAILABLE = True
-    print("✅ youtube-transcript-api available", flush=True)
+    logger.info("✅ youtube-transcript-api available")
 except ImportError:
     YTAPI_AVAILABLE = False
-    print("⚠️ youtube-transcript-api not available", flush=True)
+    logger.warning("⚠️ youtube-transcript-api not available")
 
 executor = ThreadPoolExecutor(max_workers=4)
 
@@ -465,7 +379,7 @@ async def get_video_info(video_id: str) -> Optional[Dict[str, Any]]:
     🆕 v7.0: Supadata metadata en priorité
     ⚡ v7.3: Cache Redis (TTL 12h) pour éviter re-fetch métadonnées
     """
-    print(f"📺 [VIDEO INFO] Getting info for: {video_id}", flush=True)
+    logger.info(f"📺 [VIDEO INFO] Getting info for: {video_id}")
 
     # ─── Cache check (Redis L1) ──────────────────────────────────────────
     _vinfo_cache_key = f"video_info:youtube:{video_id}"
@@ -474,7 +388,7 @@ async def get_video_info(video_id: str) -> Optional[Dict[str, Any]]:
 
         _cached = await _cache_service.get(_vinfo_cache_key)
         if _cached:
-            print(f"💾 [VIDEO INFO] Cache HIT for {video_id}", flush=True)
+            logger.info(f"💾 [VIDEO INFO] Cache HIT for {video_id}")
             return _cached
     except Exception:
         pass
@@ -500,7 +414,7 @@ async def get_video_info(video_id: str) -> Optional[Dict[str, Any]]:
                     data = resp.json()
                     duration = data.get("duration", 0) or 0
                     if duration > 0:
-                        print(f"  ✅ [SUPADATA] Metadata OK - Duration: {duration}s", flush=True)
+                        logger.info(f"  ✅ [SUPADATA] Metadata OK - Duration: {duration}s")
                         # 📊 Support both new unified format (author/stats objects)
                         # and legacy flat format (viewCount, likeCount, etc.)
                         author = data.get("author", {})
@@ -548,11 +462,11 @@ async def get_video_info(video_id: str) -> Optional[Dict[str, Any]]:
                             pass
                         return _supa_result
                     else:
-                        print("  ⚠️ [SUPADATA] Metadata OK but no duration", flush=True)
+                        logger.warning("  ⚠️ [SUPADATA] Metadata OK but no duration")
                 else:
-                    print(f"  ⚠️ [SUPADATA] Metadata error {resp.status_code}", flush=True)
+                    logger.warning(f"  ⚠️ [SUPADATA] Metadata error {resp.status_code}")
         except Exception as e:
-            print(f"  ⚠️ [SUPADATA] Metadata exception: {str(e)[:100]}", flush=True)
+            logger.warning(f"  ⚠️ [SUPADATA] Metadata exception: {str(e)[:100]}")
 
     # ─── Invidious (fallback) ─────────────────────────────────────────────
     # Essayer plusieurs instances Invidious
@@ -569,7 +483,7 @@ async def get_video_info(video_id: str) -> Optional[Dict[str, Any]]:
                     duration = data.get("lengthSeconds", 0)
                     if isinstance(duration, str):
                         duration = int(duration) if duration.isdigit() else 0
-                    print(f"  ✅ [INVIDIOUS] {instance} - Duration: {duration}s", flush=True)
+                    logger.info(f"  ✅ [INVIDIOUS] {instance} - Duration: {duration}s")
                     if duration > 0:  # Seulement si on a une durée valide
                         _inv_result = {
                             "video_id": video_id,
@@ -593,13 +507,14 @@ async def get_video_info(video_id: str) -> Optional[Dict[str, Any]]:
                             pass
                         return _inv_result
         except Exception as e:
-            print(f"  ⚠️ [INVIDIOUS] {instance} error: {str(e)[:50]}", flush=True)
+            record_instance_failure(instance)
+            logger.warning(f"  ⚠️ [INVIDIOUS] {instance} error: {str(e)[:50]}")
 
     # Essayer yt-dlp (plus lent mais plus fiable)
-    print("  🔄 [YT-DLP] Trying yt-dlp fallback...", flush=True)
+    logger.debug("  🔄 [YT-DLP] Trying yt-dlp fallback...")
     ytdlp_result = await get_video_info_ytdlp(video_id)
     if ytdlp_result and ytdlp_result.get("duration", 0) > 0:
-        print(f"  ✅ [YT-DLP] Duration: {ytdlp_result['duration']}s", flush=True)
+        logger.info(f"  ✅ [YT-DLP] Duration: {ytdlp_result['duration']}s")
         # Cache set (TTL 12h)
         try:
             from core.cache import cache_service as _cs
@@ -613,7 +528,7 @@ async def get_video_info(video_id: str) -> Optional[Dict[str, Any]]:
     # 🔌 Sprint B (Audit) — l'oEmbed YouTube tape `www.youtube.com` directement,
     # qui est bloqué depuis Hetzner. On route via le proxy résidentiel Decodo
     # (settings.YOUTUBE_PROXY). Si non configuré, le client retombe sur bare.
-    print("  🔄 [OEMBED] Trying oembed fallback...", flush=True)
+    logger.debug("  🔄 [OEMBED] Trying oembed fallback...")
     try:
         url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
         response = await smart_request(
@@ -625,7 +540,7 @@ async def get_video_info(video_id: str) -> Optional[Dict[str, Any]]:
         )
         if response.status_code == 200:
             data = response.json()
-            print("  ⚠️ [OEMBED] Got title but no duration", flush=True)
+            logger.warning("  ⚠️ [OEMBED] Got title but no duration")
             return {
                 "video_id": video_id,
                 "title": data.get("title", "Unknown"),
@@ -638,10 +553,10 @@ async def get_video_info(video_id: str) -> Optional[Dict[str, Any]]:
                 "categories": [],
             }
     except Exception as e:
-        print(f"  ⚠️ [OEMBED] error: {e}", flush=True)
+        logger.warning(f"  ⚠️ [OEMBED] error: {e}")
 
     # Dernier recours
-    print(f"  ❌ [VIDEO INFO] All methods failed for {video_id}", flush=True)
+    logger.error(f"  ❌ [VIDEO INFO] All methods failed for {video_id}")
     return {
         "video_id": video_id,
         "title": "Unknown Video",
@@ -679,7 +594,7 @@ async def get_video_info_ytdlp(video_id: str) -> Optional[Dict[str, Any]]:
             if proxy:
                 cmd.insert(1, "--proxy")
                 cmd.insert(2, proxy)
-                print("  🔌 [YT-DLP-INFO] Using proxy", flush=True)
+                logger.debug("  🔌 [YT-DLP-INFO] Using proxy")
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
             if result.returncode == 0:
                 return json.loads(result.stdout)
@@ -710,7 +625,7 @@ async def get_video_info_ytdlp(video_id: str) -> Optional[Dict[str, Any]]:
                 "content_type": "video",
             }
     except Exception as e:
-        print(f"⚠️ yt-dlp info error: {e}", flush=True)
+        logger.warning(f"⚠️ yt-dlp info error: {e}")
 
     return {
         "video_id": video_id,
@@ -838,10 +753,10 @@ async def get_transcript_supadata(
 ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
     api_key = api_key or get_supadata_key()
     if not api_key:
-        print("  ⏭️ [SUPADATA] Skipped: No API key", flush=True)
+        logger.debug("  ⏭️ [SUPADATA] Skipped: No API key")
         return None, None, None
 
-    print("  🥇 [SUPADATA] Trying...", flush=True)
+    logger.debug("  🥇 [SUPADATA] Trying...")
 
     try:
         # 🔄 Revert post-PR #472 — Supadata est un service intermédiaire qui
@@ -884,9 +799,8 @@ async def get_transcript_supadata(
                                 # la regex de `_parse_timestamps` (chunker.py) matchait
                                 # zéro anchor, causant silencieusement la perte de
                                 # timestamps pour visual analysis.
-                                print(
-                                    f"  ✅ [SUPADATA] YT-specific success (plain text, no timestamps): {len(segments)} chars",
-                                    flush=True,
+                                logger.info(
+                                    f"  ✅ [SUPADATA] YT-specific success (plain text, no timestamps): {len(segments)} chars"
                                 )
                                 return segments, None, lang or "fr"
 
@@ -912,21 +826,21 @@ async def get_transcript_supadata(
                             timestamped = "".join(timestamped_parts).strip()
 
                             if simple:
-                                print(f"  ✅ [SUPADATA] YT-specific success: {len(simple)} chars", flush=True)
+                                logger.info(f"  ✅ [SUPADATA] YT-specific success: {len(simple)} chars")
                                 return simple, timestamped, lang or "fr"
 
                     elif response.status_code == 404:
                         continue
                     else:
-                        print(f"  ⚠️ [SUPADATA] YT-specific error {response.status_code}", flush=True)
+                        logger.warning(f"  ⚠️ [SUPADATA] YT-specific error {response.status_code}")
                         break
 
                 except httpx.TimeoutException:
-                    print("  ⚠️ [SUPADATA] YT-specific timeout", flush=True)
+                    logger.warning("  ⚠️ [SUPADATA] YT-specific timeout")
                     break
 
             # ─── Méthode 2 : Endpoint unifié (fallback — supporte STT côté Supadata) ───
-            print("  🔄 [SUPADATA] Trying unified endpoint (with AI fallback)...", flush=True)
+            logger.debug("  🔄 [SUPADATA] Trying unified endpoint (with AI fallback)...")
             try:
                 url = f"https://www.youtube.com/watch?v={video_id}"
                 response = await client.get(
@@ -961,9 +875,8 @@ async def get_transcript_supadata(
                         # le timestamped était dupliqué depuis le texte plain → la regex
                         # de _parse_timestamps (chunker.py) matchait zéro anchor, causant
                         # silencieusement la perte de timestamps pour visual analysis.
-                        print(
-                            f"  ✅ [SUPADATA] Unified success (plain text, no timestamps): {len(content)} chars",
-                            flush=True,
+                        logger.info(
+                            f"  ✅ [SUPADATA] Unified success (plain text, no timestamps): {len(content)} chars"
                         )
                         return content.strip(), None, detected_lang
 
@@ -971,7 +884,7 @@ async def get_transcript_supadata(
                     # Async job — poll
                     job_id = response.json().get("jobId")
                     if job_id:
-                        print(f"  ⏳ [SUPADATA] Async job {job_id}, polling...", flush=True)
+                        logger.debug(f"  ⏳ [SUPADATA] Async job {job_id}, polling...")
                         for _ in range(12):  # 60s max
                             await asyncio.sleep(5)
                             poll = await client.get(
@@ -995,9 +908,8 @@ async def get_transcript_supadata(
                                     # sur l'endpoint unifié plus haut. L'endpoint async
                                     # de Supadata retourne le même format (`content` =
                                     # plain text), donc même contrat : timestamped=None.
-                                    print(
-                                        f"  ✅ [SUPADATA] Async success (plain text, no timestamps): {len(content)} chars",
-                                        flush=True,
+                                    logger.info(
+                                        f"  ✅ [SUPADATA] Async success (plain text, no timestamps): {len(content)} chars"
                                     )
                                     return content.strip(), None, detected_lang
                             elif poll.status_code == 202:
@@ -1005,13 +917,13 @@ async def get_transcript_supadata(
                             else:
                                 break
                 else:
-                    print(f"  ⚠️ [SUPADATA] Unified error {response.status_code}", flush=True)
+                    logger.warning(f"  ⚠️ [SUPADATA] Unified error {response.status_code}")
 
             except httpx.TimeoutException:
-                print("  ⚠️ [SUPADATA] Unified timeout", flush=True)
+                logger.warning("  ⚠️ [SUPADATA] Unified timeout")
 
     except Exception as e:
-        print(f"  ⚠️ [SUPADATA] Exception: {e}", flush=True)
+        logger.warning(f"  ⚠️ [SUPADATA] Exception: {e}")
 
     return None, None, None
 
@@ -1023,10 +935,10 @@ async def get_transcript_supadata(
 
 async def get_transcript_ytapi(video_id: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
     if not YTAPI_AVAILABLE:
-        print("  ⏭️ [YTAPI] Skipped: Not installed", flush=True)
+        logger.debug("  ⏭️ [YTAPI] Skipped: Not installed")
         return None, None, None
 
-    print("  🥈 [YTAPI] Trying...", flush=True)
+    logger.debug("  🥈 [YTAPI] Trying...")
 
     try:
         loop = asyncio.get_event_loop()
@@ -1042,7 +954,7 @@ async def get_transcript_ytapi(video_id: str) -> Tuple[Optional[str], Optional[s
                     session = _requests.Session()
                     session.proxies.update(proxies)
                     ytt_api = YouTubeTranscriptApi(http_client=session)
-                    print("  🔌 [YTAPI] Using proxy", flush=True)
+                    logger.debug("  🔌 [YTAPI] Using proxy")
                 else:
                     ytt_api = YouTubeTranscriptApi()
                 transcript_list = ytt_api.list(video_id)
@@ -1091,21 +1003,21 @@ async def get_transcript_ytapi(video_id: str) -> Tuple[Optional[str], Optional[s
                         except Exception:
                             continue
             except Exception as e:
-                print(f"  ⚠️ [YTAPI] Error: {e}", flush=True)
+                logger.warning(f"  ⚠️ [YTAPI] Error: {e}")
             return None, None, None
 
         simple, timestamped, lang = await asyncio.wait_for(loop.run_in_executor(executor, _fetch), timeout=_t("ytapi"))
 
         if simple:
-            print(f"  ✅ [YTAPI] Success: {len(simple)} chars", flush=True)
+            logger.info(f"  ✅ [YTAPI] Success: {len(simple)} chars")
             return simple, timestamped, lang
         else:
-            print("  ⚠️ [YTAPI] No captions found", flush=True)
+            logger.warning("  ⚠️ [YTAPI] No captions found")
 
     except asyncio.TimeoutError:
-        print("  ⚠️ [YTAPI] Timeout", flush=True)
+        logger.warning("  ⚠️ [YTAPI] Timeout")
     except Exception as e:
-        print(f"  ⚠️ [YTAPI] Exception: {e}", flush=True)
+        logger.warning(f"  ⚠️ [YTAPI] Exception: {e}")
 
     return None, None, None
 
@@ -1120,9 +1032,12 @@ async def get_transcript_invidious(video_id: str) -> Tuple[Optional[str], Option
     🌐 Utilise Invidious pour récupérer les sous-titres
     Contourne le blocage YouTube car Invidious a ses propres IPs
     """
-    print("  🌐 [INVIDIOUS] Trying captions...", flush=True)
+    logger.debug("  🌐 [INVIDIOUS] Trying captions...")
+
+    healthy_instances = await get_healthy_instances(INVIDIOUS_INSTANCES)
 
-    for instance in INVIDIOUS_INSTANCES[:5]:  # Essayer 5 instances max (augmenté de 3)
+    for instance in healthy_instances[:5]:  # Essayer 5 instances max (augmenté de 3)
+        started = time.monotonic()
         try:
             # 🔄 Revert post-PR #472 — Invidious instances ont leur propre infra
             # YouTube ; le proxy Decodo n'aide pas et ajoute latence + coût.
@@ -1135,6 +1050,7 @@ async def get_transcript_invidious(video_id: str) -> Tuple[Optional[str], Option
                 )
 
                 if response.status_code != 200:
+                    record_instance_failure(instance)
                     continue
 
                 data = response.json()
@@ -1177,14 +1093,15 @@ async def get_transcript_invidious(video_id: str) -> Tuple[Optional[str], Option
                     simple, timestamped = _parse_vtt_content(content)
 
                     if simple and len(simple) > 50:
-                        print(f"  ✅ [INVIDIOUS] Success: {len(simple)} chars from {instance}", flush=True)
+                        record_instance_success(instance, time.monotonic() - started)
+                        logger.info(f"  ✅ [INVIDIOUS] Success: {len(simple)} chars from {instance}")
                         return simple, timestamped, caption_lang
 
         except Exception as e:
-            print(f"  ⚠️ [INVIDIOUS] {instance} error: {str(e)[:50]}", flush=True)
+            logger.warning(f"  ⚠️ [INVIDIOUS] {instance} error: {str(e)[:50]}")
             continue
 
-    print("  ⚠️ [INVIDIOUS] No captions from any instance", flush=True)
+    logger.warning("  ⚠️ [INVIDIOUS] No captions from any instance")
     return None, None, None
 
 
@@ -1198,12 +1115,13 @@ async def get_transcript_piped(video_id: str) -> Tuple[Optional[str], Optional[s
     🌐 Utilise Piped pour récupérer les sous-titres
     Alternative à Invidious - différentes IPs, mêmes fonctionnalités
     """
-    print("  🟣 [PIPED] Trying captions...", flush=True)
+    logger.debug("  🟣 [PIPED] Trying captions...")
 
     # Utiliser les instances saines en priorité
-    healthy_instances = get_healthy_instances(PIPED_INSTANCES)
+    healthy_instances = await get_healthy_instances(PIPED_INSTANCES)
 
     for instance in healthy_instances[:5]:  # Essayer 5 instances max
+        started = time.monotonic()
         try:
             # 🔄 Revert post-PR #472 — Piped instances ont leur propre infra
             # YouTube ; le proxy Decodo n'aide pas et ajoute latence + coût.
@@ -1260,16 +1178,16 @@ async def get_transcript_piped(video_id: str) -> Tuple[Optional[str], Optional[s
                     simple, timestamped = _parse_vtt_content(content)
 
                     if simple and len(simple) > 50:
-                        record_instance_success(instance)
-                        print(f"  ✅ [PIPED] Success: {len(simple)} chars from {instance}", flush=True)
+                        record_instance_success(instance, time.monotonic() - started)
+                        logger.info(f"  ✅ [PIPED] Success: {len(simple)} chars from {instance}")
                         return simple, timestamped, caption_lang
 
         except Exception as e:
             record_instance_failure(instance)
-            print(f"  ⚠️ [PIPED] {instance} error: {str(e)[:50]}", flush=True)
+            logger.warning(f"  ⚠️ [PIPED] {instance} error: {str(e)[:50]}")
             continue
 
-    print("  ⚠️ [PIPED] No captions from any instance", flush=True)
+    logger.warning("  ⚠️ [PIPED] No captions from any instance")
     return None, None, None
 
 
@@ -1279,12 +1197,10 @@ async def get_transcript_piped(video_id: str) -> Tuple[Optional[str], Optional[s
 
 
 async def get_transcript_ytdlp(video_id: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
-    print("  🏅 [YT-DLP] Trying manual subtitles...", flush=True)
+    logger.debug("  🏅 [YT-DLP] Trying manual subtitles...")
 
     try:
-        loop = asyncio.get_event_loop()
-
-        def _fetch():
+        async def _fetch():
             with tempfile.TemporaryDirectory() as tmpdir:
                 cmd = [
                     "yt-dlp",
@@ -1318,24 +1234,22 @@ async def get_transcript_ytdlp(video_id: str) -> Tuple[Optional[str], Optional[s
                 if proxy:
                     cmd.insert(1, "--proxy")
                     cmd.insert(2, proxy)
-                    print("  🔌 [YT-DLP] Using proxy", flush=True)
-                subprocess.run(cmd, capture_output=True, text=True, timeout=_t("ytdlp_subs"))
+                    logger.debug("  🔌 [YT-DLP] Using proxy")
+                await run_media_process(cmd, timeout=_t("ytdlp_subs"))
                 return _parse_subtitle_files(tmpdir, video_id)
 
-        simple, timestamped, lang = await asyncio.wait_for(
-            loop.run_in_executor(executor, _fetch), timeout=_t("ytdlp_subs") + 10
-        )
+        simple, timestamped, lang = await _fetch()
 
         if simple:
-            print(f"  ✅ [YT-DLP] Success: {len(simple)} chars", flush=True)
+            logger.info(f"  ✅ [YT-DLP] Success: {len(simple)} chars")
             return simple, timestamped, lang
         else:
-            print("  ⚠️ [YT-DLP] No manual subtitles", flush=True)
+            logger.warning("  ⚠️ [YT-DLP] No manual subtitles")
 
     except asyncio.TimeoutError:
-        print("  ⚠️ [YT-DLP] Timeout", flush=True)
+        logger.warning("  ⚠️ [YT-DLP] Timeout")
     except Exception as e:
-        print(f"  ⚠️ [YT-DLP] Exception: {e}", flush=True)
+        logger.warning(f"  ⚠️ [YT-DLP] Exception: {e}")
 
     return None, None, None
 
@@ -1346,12 +1260,10 @@ async def get_transcript_ytdlp(video_id: str) -> Tuple[Optional[str], Optional[s
 
 
 async def get_transcript_ytdlp_auto(video_id: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
-    print("  🎖️ [YT-DLP-AUTO] Trying auto-captions...", flush=True)
+    logger.debug("  🎖️ [YT-DLP-AUTO] Trying auto-captions...")
 
     try:
-        loop = asyncio.get_event_loop()
-
-        def _fetch():
+        async def _fetch():
             with tempfile.TemporaryDirectory() as tmpdir:
                 cmd = [
                     "yt-dlp",
@@ -1385,23 +1297,21 @@ async def get_transcript_ytdlp_auto(video_id: str) -> Tuple[Optional[str], Optio
                 if proxy:
                     cmd.insert(1, "--proxy")
                     cmd.insert(2, proxy)
-                subprocess.run(cmd, capture_output=True, text=True, timeout=_t("ytdlp_auto"))
+                await run_media_process(cmd, timeout=_t("ytdlp_auto"))
                 return _parse_subtitle_files(tmpdir, video_id)
 
-        simple, timestamped, lang = await asyncio.wait_for(
-            loop.run_in_executor(executor, _fetch), timeout=_t("ytdlp_auto") + 10
-        )
+        simple, timestamped, lang = await _fetch()
 
         if simple:
-            print(f"  ✅ [YT-DLP-AUTO] Success: {len(simple)} chars", flush=True)
+            logger.info(f"  ✅ [YT-DLP-AUTO] Success: {len(simple)} chars")
             return simple, timestamped, lang
         else:
-            print("  ⚠️ [YT-DLP-AUTO] No auto-captions", flush=True)
+            logger.warning("  ⚠️ [YT-DLP-AUTO] No auto-captions")
 
     except asyncio.TimeoutError:
-        print("  ⚠️ [YT-DLP-AUTO] Timeout", flush=True)
+        logger.warning("  ⚠️ [YT-DLP-AUTO] Timeout")
     except Exception as e:
-        print(f"  ⚠️ [YT-DLP-AUTO] Exception: {e}", flush=True)
+        logger.warning(f"  ⚠️ [YT-DLP-AUTO] Exception: {e}")
 
     return None, None, None
 
@@ -1418,10 +1328,10 @@ async def get_transcript_whisper(video_id: str) -> Tuple[Optional[str], Optional
     """
     groq_key = get_groq_key()
     if not groq_key:
-        print("  ❌ [WHISPER] GROQ_API_KEY not configured!", flush=True)
+        logger.error("  ❌ [WHISPER] GROQ_API_KEY not configured!")
         return None, None, None
 
-    print("  🎙️ [WHISPER] Downloading audio...", flush=True)
+    logger.debug("  🎙️ [WHISPER] Downloading audio...")
 
     audio_data = None
     audio_ext = ".mp3"
@@ -1456,7 +1366,7 @@ async def get_transcript_whisper(video_id: str) -> Tuple[Optional[str], Optional
                 if not audio_url:
                     continue
 
-                print("  🎙️ [WHISPER] Downloading from Invidious...", flush=True)
+                logger.debug("  🎙️ [WHISPER] Downloading from Invidious...")
 
                 audio_response = await client.get(
                     audio_url, timeout=120, headers={"User-Agent": get_random_user_agent()}, follow_redirects=True
@@ -1464,20 +1374,18 @@ async def get_transcript_whisper(video_id: str) -> Tuple[Optional[str], Optional
 
                 if audio_response.status_code == 200 and len(audio_response.content) > 10000:
                     audio_data = audio_response.content
-                    print(f"  ✅ [WHISPER] Audio from Invidious: {len(audio_data) / 1024 / 1024:.1f}MB", flush=True)
+                    logger.info(f"  ✅ [WHISPER] Audio from Invidious: {len(audio_data) / 1024 / 1024:.1f}MB")
                     break
 
         except Exception as e:
-            print(f"  ⚠️ [WHISPER] Invidious {instance}: {str(e)[:50]}", flush=True)
+            logger.warning(f"  ⚠️ [WHISPER] Invidious {instance}: {str(e)[:50]}")
             continue
 
     # MÉTHODE B: Fallback sur yt-dlp si Invidious échoue
     if not audio_data:
-        print("  🎙️ [WHISPER] Trying yt-dlp download...", flush=True)
+        logger.debug("  🎙️ [WHISPER] Trying yt-dlp download...")
         try:
-            loop = asyncio.get_event_loop()
-
-            def _download_audio():
+            async def _download_audio():
                 with tempfile.TemporaryDirectory() as tmpdir:
                     audio_path = f"{tmpdir}/{video_id}.mp3"
 
@@ -1502,66 +1410,47 @@ async def get_transcript_whisper(video_id: str) -> Tuple[Optional[str], Optional
                     if proxy:
                         cmd.insert(1, "--proxy")
                         cmd.insert(2, proxy)
-                        print("  🔌 [WHISPER] Using proxy", flush=True)
+                        logger.debug("  🔌 [WHISPER] Using proxy")
 
-                    result = subprocess.run(cmd, capture_output=True, text=True, timeout=_t("whisper_download"))
+                    result = await run_media_process(cmd, timeout=_t("whisper_download"))
 
-                    if result.returncode != 0:
-                        print(f"  ⚠️ [WHISPER] yt-dlp failed: {result.stderr[:100]}", flush=True)
+                    if not result.ok:
+                        logger.warning(f"  ⚠️ [WHISPER] yt-dlp failed: {result.stderr_text[:100]}")
                         return None, None
 
                     for f in Path(tmpdir).iterdir():
                         if f.suffix in [".mp3", ".m4a", ".webm", ".opus", ".wav"]:
-                            return f.read_bytes(), f.suffix
+                            return await asyncio.to_thread(f.read_bytes), f.suffix
 
                     return None, None
 
-            result = await asyncio.wait_for(
-                loop.run_in_executor(executor, _download_audio), timeout=_t("whisper_download")
-            )
+            result = await _download_audio()
 
             if result and result[0]:
                 audio_data, audio_ext = result
-                print(f"  ✅ [WHISPER] Audio from yt-dlp: {len(audio_data) / 1024 / 1024:.1f}MB", flush=True)
+                logger.info(f"  ✅ [WHISPER] Audio from yt-dlp: {len(audio_data) / 1024 / 1024:.1f}MB")
 
         except Exception as e:
-            print(f"  ⚠️ [WHISPER] yt-dlp download failed: {e}", flush=True)
+            logger.warning(f"  ⚠️ [WHISPER] yt-dlp download failed: {e}")
 
     if not audio_data:
-        print("  ❌ [WHISPER] Failed to download audio", flush=True)
+        logger.error("  ❌ [WHISPER] Failed to download audio")
         return None, None, None
 
     # Compresser si trop gros
     if len(audio_data) > GROQ_MAX_FILE_SIZE:
-        print(f"  🎙️ [WHISPER] Compressing audio (>{GROQ_MAX_FILE_SIZE / 1024 / 1024:.0f}MB)...", flush=True)
-        try:
-            with tempfile.NamedTemporaryFile(suffix=audio_ext, delete=False) as tmp_in:
-                tmp_in.write(audio_data)
-                tmp_in_path = tmp_in.name
-
-            tmp_out_path = tmp_in_path + "_compressed.mp3"
-
-            cmd = ["ffmpeg", "-i", tmp_in_path, "-b:a", "32k", "-ac", "1", "-ar", "16000", "-y", tmp_out_path]
-            subprocess.run(cmd, capture_output=True, timeout=120)
-
-            if Path(tmp_out_path).exists():
-                audio_data = Path(tmp_out_path).read_bytes()
-                audio_ext = ".mp3"
-                print(f"  ✅ [WHISPER] Compressed to: {len(audio_data) / 1024 / 1024:.1f}MB", flush=True)
-
-            # Cleanup
-            Path(tmp_in_path).unlink(missing_ok=True)
-            Path(tmp_out_path).unlink(missing_ok=True)
-
-        except Exception as e:
-            print(f"  ⚠️ [WHISPER] Compression failed: {e}", flush=True)
+        logger.debug(f"  🎙️ [WHISPER] Compressing audio (>{GROQ_MAX_FILE_SIZE / 1024 / 1024:.0f}MB)...")
+        compressed = await transcode_audio_for_stt(audio_data, audio_ext, "WHISPER")
+        if compressed:
+            audio_data, audio_ext = compressed, ".mp3"
+            logger.info(f"  ✅ [WHISPER] Compressed to: {len(audio_data) / 1024 / 1024:.1f}MB")
 
     if len(audio_data) > GROQ_MAX_FILE_SIZE:
-        print("  ❌ [WHISPER] Audio still too large", flush=True)
+        logger.error("  ❌ [WHISPER] Audio still too large")
         return None, None, None
 
     # Transcrire avec Groq
-    print(f"  🎙️ [WHISPER] Sending {len(audio_data) / 1024 / 1024:.1f}MB to Groq...", flush=True)
+    logger.debug(f"  🎙️ [WHISPER] Sending {len(audio_data) / 1024 / 1024:.1f}MB to Groq...")
 
     try:
         mime_types = {
@@ -1586,7 +1475,7 @@ async def get_transcript_whisper(video_id: str) -> Tuple[Optional[str], Optional
                 timeout=_t("whisper_transcribe"),
             )
             elapsed = time.time() - start_time
-            print(f"  🎙️ [WHISPER] Groq response in {elapsed:.1f}s: {response.status_code}", flush=True)
+            logger.debug(f"  🎙️ [WHISPER] Groq response in {elapsed:.1f}s: {response.status_code}")
 
             if response.status_code == 200:
                 result = response.json()
@@ -1613,13 +1502,13 @@ async def get_transcript_whisper(video_id: str) -> Tuple[Optional[str], Optional
                     else:
                         timestamped = full_text
 
-                    print(f"  ✅ [WHISPER] Success: {len(full_text)} chars", flush=True)
+                    logger.info(f"  ✅ [WHISPER] Success: {len(full_text)} chars")
                     return full_text, timestamped, detected_lang
             else:
-                print(f"  ❌ [WHISPER] Groq error: {response.text[:200]}", flush=True)
+                logger.error(f"  ❌ [WHISPER] Groq error: {response.text[:200]}")
 
     except Exception as e:
-        print(f"  ❌ [WHISPER] Transcription error: {e}", flush=True)
+        logger.error(f"  ❌ [WHISPER] Transcription error: {e}")
 
     return None, None, None
 
@@ -1657,26 +1546,25 @@ async def get_transcript_voxtral(
     """
     mistral_key = get_mistral_key()
     if not mistral_key:
-        print("  ⏭️ [VOXTRAL-STT] Skipped: No Mistral API key", flush=True)
+        logger.debug("  ⏭️ [VOXTRAL-STT] Skipped: No Mistral API key")
         return None, None, None
 
-    print("  🎙️ [VOXTRAL-STT] Starting...", flush=True)
+    logger.debug("  🎙️ [VOXTRAL-STT] Starting...")
 
     # ── Télécharger l'audio si pas fourni ────────────────────────────────
     if not audio_data:
         audio_data, audio_ext = await _download_audio_for_transcription(video_id)
         if not audio_data:
-            print("  ❌ [VOXTRAL-STT] Failed to download audio", flush=True)
+            logger.error("  ❌ [VOXTRAL-STT] Failed to download audio")
             return None, None, None
 
     if len(audio_data) > VOXTRAL_MAX_FILE_SIZE:
-        print(
-            f"  ❌ [VOXTRAL-STT] Audio too large: {len(audio_data) / 1024 / 1024:.1f}MB > {VOXTRAL_MAX_FILE_SIZE / 1024 / 1024:.0f}MB",
-            flush=True,
+        logger.error(
+            f"  ❌ [VOXTRAL-STT] Audio too large: {len(audio_data) / 1024 / 1024:.1f}MB > {VOXTRAL_MAX_FILE_SIZE / 1024 / 1024:.0f}MB"
         )
         return None, None, None
 
-    print(f"  🎙️ [VOXTRAL-STT] Sending {len(audio_data) / 1024 / 1024:.1f}MB to Mistral Voxtral...", flush=True)
+    logger.debug(f"  🎙️ [VOXTRAL-STT] Sending {len(audio_data) / 1024 / 1024:.1f}MB to Mistral Voxtral...")
 
     try:
         mime_type = AUDIO_MIME_TYPES.get(audio_ext, "audio/mpeg")
@@ -1700,7 +1588,7 @@ async def get_transcript_voxtral(
                 timeout=_t("voxtral_stt"),
             )
             elapsed = time.time() - start_time
-            print(f"  🎙️ [VOXTRAL-STT] Response in {elapsed:.1f}s: {response.status_code}", flush=True)
+            logger.debug(f"  🎙️ [VOXTRAL-STT] Response in {elapsed:.1f}s: {response.status_code}")
 
             if response.status_code == 200:
                 result = response.json()
@@ -1709,7 +1597,7 @@ async def get_transcript_voxtral(
                 full_text = result.get("text", "")
 
                 if not full_text:
-                    print("  ❌ [VOXTRAL-STT] Empty transcription returned", flush=True)
+                    logger.error("  ❌ [VOXTRAL-STT] Empty transcription returned")
                     return None, None, None
 
                 # ── Build timestamped text from segments ─────────────────
@@ -1734,20 +1622,19 @@ async def get_transcript_voxtral(
                 else:
                     timestamped = full_text
 
-                print(
-                    f"  ✅ [VOXTRAL-STT] Success: {len(full_text)} chars, lang={detected_lang}, {elapsed:.1f}s",
-                    flush=True,
+                logger.info(
+                    f"  ✅ [VOXTRAL-STT] Success: {len(full_text)} chars, lang={detected_lang}, {elapsed:.1f}s"
                 )
                 return full_text, timestamped, detected_lang
 
             else:
                 error_body = response.text[:200]
-                print(f"  ❌ [VOXTRAL-STT] Error {response.status_code}: {error_body}", flush=True)
+                logger.error(f"  ❌ [VOXTRAL-STT] Error {response.status_code}: {error_body}")
 
     except httpx.TimeoutException:
-        print(f"  ❌ [VOXTRAL-STT] Timeout ({_t('voxtral_stt')}s)", flush=True)
+        logger.error(f"  ❌ [VOXTRAL-STT] Timeout ({_t('voxtral_stt')}s)")
     except Exception as e:
-        print(f"  ❌ [VOXTRAL-STT] Transcription error: {e}", flush=True)
+        logger.error(f"  ❌ [VOXTRAL-STT] Transcription error: {e}")
 
     return None, None, None
 
@@ -1764,10 +1651,10 @@ async def get_transcript_deepgram(video_id: str) -> Tuple[Optional[str], Optiona
     """
     deepgram_key = get_deepgram_key()
     if not deepgram_key:
-        print("  ⏭️ [DEEPGRAM] Skipped: No API key", flush=True)
+        logger.debug("  ⏭️ [DEEPGRAM] Skipped: No API key")
         return None, None, None
 
-    print("  🎙️ [DEEPGRAM] Starting...", flush=True)
+    logger.debug("  🎙️ [DEEPGRAM] Starting...")
 
     audio_data = None
     audio_ext = ".mp3"
@@ -1800,7 +1687,7 @@ async def get_transcript_deepgram(video_id: str) -> Tuple[Optional[str], Optiona
                 if not audio_url:
                     continue
 
-                print("  🎙️ [DEEPGRAM] Downloading audio from Invidious...", flush=True)
+                logger.debug("  🎙️ [DEEPGRAM] Downloading audio from Invidious...")
 
                 audio_response = await client.get(
                     audio_url, timeout=120, headers={"User-Agent": get_random_user_agent()}, follow_redirects=True
@@ -1808,20 +1695,18 @@ async def get_transcript_deepgram(video_id: str) -> Tuple[Optional[str], Optiona
 
                 if audio_response.status_code == 200 and len(audio_response.content) > 10000:
                     audio_data = audio_response.content
-                    print(f"  ✅ [DEEPGRAM] Audio downloaded: {len(audio_data) / 1024 / 1024:.1f}MB", flush=True)
+                    logger.info(f"  ✅ [DEEPGRAM] Audio downloaded: {len(audio_data) / 1024 / 1024:.1f}MB")
                     break
 
         except Exception as e:
-            print(f"  ⚠️ [DEEPGRAM] Invidious {instance}: {str(e)[:50]}", flush=True)
+            logger.warning(f"  ⚠️ [DEEPGRAM] Invidious {instance}: {str(e)[:50]}")
             continue
 
     # Fallback yt-dlp si Invidious échoue
     if not audio_data:
-        print("  🎙️ [DEEPGRAM] Trying yt-dlp download...", flush=True)
+        logger.debug("  🎙️ [DEEPGRAM] Trying yt-dlp download...")
         try:
-            loop = asyncio.get_event_loop()
-
-            def _download_audio():
+            async def _download_audio():
                 with tempfile.TemporaryDirectory() as tmpdir:
                     audio_path = f"{tmpdir}/{video_id}.mp3"
 
@@ -1848,36 +1733,34 @@ async def get_transcript_deepgram(video_id: str) -> Tuple[Optional[str], Optiona
                     if proxy:
                         cmd.insert(1, "--proxy")
                         cmd.insert(2, proxy)
-                        print("  🔌 [DEEPGRAM] Using proxy", flush=True)
+                        logger.debug("  🔌 [DEEPGRAM] Using proxy")
 
-                    result = subprocess.run(cmd, capture_output=True, text=True, timeout=_t("whisper_download"))
+                    result = await run_media_process(cmd, timeout=_t("whisper_download"))
 
-                    if result.returncode != 0:
+                    if not result.ok:
                         return None, None
 
                     for f in Path(tmpdir).iterdir():
                         if f.suffix in [".mp3", ".m4a", ".webm", ".opus", ".wav"]:
-                            return f.read_bytes(), f.suffix
+                            return await asyncio.to_thread(f.read_bytes), f.suffix
 
                     return None, None
 
-            result = await asyncio.wait_for(
-                loop.run_in_executor(executor, _download_audio), timeout=_t("whisper_download")
-            )
+            result = await _download_audio()
 
             if result and result[0]:
                 audio_data, audio_ext = result
-                print(f"  ✅ [DEEPGRAM] Audio from yt-dlp: {len(audio_data) / 1024 / 1024:.1f}MB", flush=True)
+                logger.info(f"  ✅ [DEEPGRAM] Audio from yt-dlp: {len(audio_data) / 1024 / 1024:.1f}MB")
 
         except Exception as e:
-            print(f"  ⚠️ [DEEPGRAM] yt-dlp download failed: {e}", flush=True)
+            logger.warning(f"  ⚠️ [DEEPGRAM] yt-dlp download failed: {e}")
 
     if not audio_data:
-        print("  ❌ [DEEPGRAM] Failed to download audio", flush=True)
+        logger.error("  ❌ [DEEPGRAM] Failed to download audio")
         return None, None, None
 
     # Envoyer à Deepgram
-    print(f"  🎙️ [DEEPGRAM] Sending {len(audio_data) / 1024 / 1024:.1f}MB to Deepgram Nova-2...", flush=True)
+    logger.debug(f"  🎙️ [DEEPGRAM] Sending {len(audio_data) / 1024 / 1024:.1f}MB to Deepgram Nova-2...")
 
     try:
         mime_types = {
@@ -1908,7 +1791,7 @@ async def get_transcript_deepgram(video_id: str) -> Tuple[Optional[str], Optiona
                 timeout=_t("deepgram"),
             )
             elapsed = time.time() - start_time
-            print(f"  🎙️ [DEEPGRAM] Response in {elapsed:.1f}s: {response.status_code}", flush=True)
+            logger.debug(f"  🎙️ [DEEPGRAM] Response in {elapsed:.1f}s: {response.status_code}")
 
             if response.status_code == 200:
                 result = response.json()
@@ -1942,13 +1825,13 @@ async def get_transcript_deepgram(video_id: str) -> Tuple[Optional[str], Optiona
                             else:
                                 timestamped = transcript
 
-                            print(f"  ✅ [DEEPGRAM] Success: {len(transcript)} chars", flush=True)
+                            logger.info(f"  ✅ [DEEPGRAM] Success: {len(transcript)} chars")
                             return transcript, timestamped, detected_lang
             else:
-                print(f"  ❌ [DEEPGRAM] Error {response.status_code}: {response.text[:200]}", flush=True)
+                logger.error(f"  ❌ [DEEPGRAM] Error {response.status_code}: {response.text[:200]}")
 
     except Exception as e:
-        print(f"  ❌ [DEEPGRAM] Transcription error: {e}", flush=True)
+        logger.error(f"  ❌ [DEEPGRAM] Transcription error: {e}")
 
     return None, None, None
 
@@ -1967,27 +1850,27 @@ async def get_transcript_openai_whisper(
     """
     openai_key = get_openai_key()
     if not openai_key:
-        print("  ⏭️ [OPENAI-WHISPER] Skipped: No API key", flush=True)
+        logger.debug("  ⏭️ [OPENAI-WHISPER] Skipped: No API key")
         return None, None, None
 
-    print("  🎙️ [OPENAI-WHISPER] Starting...", flush=True)
+    logger.debug("  🎙️ [OPENAI-WHISPER] Starting...")
 
     # Si pas d'audio fourni, télécharger
     if not audio_data:
         audio_data, audio_ext = await _download_audio_for_transcription(video_id)
         if not audio_data:
-            print("  ❌ [OPENAI-WHISPER] Failed to download audio", flush=True)
+            logger.error("  ❌ [OPENAI-WHISPER] Failed to download audio")
             return None, None, None
 
     # Compresser si nécessaire
     if len(audio_data) > OPENAI_MAX_FILE_SIZE:
         audio_data, audio_ext = await _compress_audio(audio_data, audio_ext, "OPENAI-WHISPER")
         if not audio_data or len(audio_data) > OPENAI_MAX_FILE_SIZE:
-            print("  ❌ [OPENAI-WHISPER] Audio still too large after compression", flush=True)
+            logger.error("  ❌ [OPENAI-WHISPER] Audio still too large after compression")
             return None, None, None
 
     # Transcrire avec OpenAI
-    print(f"  🎙️ [OPENAI-WHISPER] Sending {len(audio_data) / 1024 / 1024:.1f}MB to OpenAI...", flush=True)
+    logger.debug(f"  🎙️ [OPENAI-WHISPER] Sending {len(audio_data) / 1024 / 1024:.1f}MB to OpenAI...")
 
     try:
         mime_types = {
@@ -2012,7 +1895,7 @@ async def get_transcript_openai_whisper(
                 timeout=_t("openai_whisper"),
             )
             elapsed = time.time() - start_time
-            print(f"  🎙️ [OPENAI-WHISPER] Response in {elapsed:.1f}s: {response.status_code}", flush=True)
+            logger.debug(f"  🎙️ [OPENAI-WHISPER] Response in {elapsed:.1f}s: {response.status_code}")
 
             if response.status_code == 200:
                 result = response.json()
@@ -2039,13 +1922,13 @@ async def get_transcript_openai_whisper(
                     else:
                         timestamped = full_text
 
-                    print(f"  ✅ [OPENAI-WHISPER] Success: {len(full_text)} chars", flush=True)
+                    logger.info(f"  ✅ [OPENAI-WHISPER] Success: {len(full_text)} chars")
                     return full_text, timestamped, detected_lang
             else:
-                print(f"  ❌ [OPENAI-WHISPER] Error: {response.text[:200]}", flush=True)
+                logger.error(f"  ❌ [OPENAI-WHISPER] Error: {response.text[:200]}")
 
     except Exception as e:
-        print(f"  ❌ [OPENAI-WHISPER] Transcription error: {e}", flush=True)
+        logger.error(f"  ❌ [OPENAI-WHISPER] Transcription error: {e}")
 
     return None, None, None
 
@@ -2064,22 +1947,22 @@ async def get_transcript_assemblyai(
     """
     assemblyai_key = get_assemblyai_key()
     if not assemblyai_key:
-        print("  ⏭️ [ASSEMBLYAI] Skipped: No API key", flush=True)
+        logger.debug("  ⏭️ [ASSEMBLYAI] Skipped: No API key")
         return None, None, None
 
-    print("  🎙️ [ASSEMBLYAI] Starting...", flush=True)
+    logger.debug("  🎙️ [ASSEMBLYAI] Starting...")
 
     # Si pas d'audio fourni, télécharger
     if not audio_data:
         audio_data, audio_ext = await _download_audio_for_transcription(video_id)
         if not audio_data:
-            print("  ❌ [ASSEMBLYAI] Failed to download audio", flush=True)
+            logger.error("  ❌ [ASSEMBLYAI] Failed to download audio")
             return None, None, None
 
     try:
         async with shared_http_client() as client:
             # Étape 1: Upload de l'audio
-            print(f"  🎙️ [ASSEMBLYAI] Uploading {len(audio_data) / 1024 / 1024:.1f}MB...", flush=True)
+            logger.debug(f"  🎙️ [ASSEMBLYAI] Uploading {len(audio_data) / 1024 / 1024:.1f}MB...")
             upload_response = await client.post(
                 "https://api.assemblyai.com/v2/upload",
                 headers={"Authorization": assemblyai_key},
@@ -2088,16 +1971,16 @@ async def get_transcript_assemblyai(
             )
 
             if upload_response.status_code != 200:
-                print(f"  ❌ [ASSEMBLYAI] Upload failed: {upload_response.text[:100]}", flush=True)
+                logger.error(f"  ❌ [ASSEMBLYAI] Upload failed: {upload_response.text[:100]}")
                 return None, None, None
 
             upload_url = upload_response.json().get("upload_url")
             if not upload_url:
-                print("  ❌ [ASSEMBLYAI] No upload URL returned", flush=True)
+                logger.error("  ❌ [ASSEMBLYAI] No upload URL returned")
                 return None, None, None
 
             # Étape 2: Demander la transcription
-            print("  🎙️ [ASSEMBLYAI] Starting transcription...", flush=True)
+            logger.debug("  🎙️ [ASSEMBLYAI] Starting transcription...")
             transcript_request = await client.post(
                 "https://api.assemblyai.com/v2/transcript",
                 headers={"Authorization": assemblyai_key},
@@ -2110,16 +1993,16 @@ async def get_transcript_assemblyai(
             )
 
             if transcript_request.status_code != 200:
-                print(f"  ❌ [ASSEMBLYAI] Transcript request failed: {transcript_request.text[:100]}", flush=True)
+                logger.error(f"  ❌ [ASSEMBLYAI] Transcript request failed: {transcript_request.text[:100]}")
                 return None, None, None
 
             transcript_id = transcript_request.json().get("id")
             if not transcript_id:
-                print("  ❌ [ASSEMBLYAI] No transcript ID returned", flush=True)
+                logger.error("  ❌ [ASSEMBLYAI] No transcript ID returned")
                 return None, None, None
 
             # Étape 3: Polling jusqu'à complétion
-            print("  🎙️ [ASSEMBLYAI] Waiting for transcription...", flush=True)
+            logger.debug("  🎙️ [ASSEMBLYAI] Waiting for transcription...")
             start_time = time.time()
             while time.time() - start_time < _t("assemblyai"):
                 status_response = await client.get(
@@ -2164,20 +2047,20 @@ async def get_transcript_assemblyai(
                             timestamped = full_text
 
                         elapsed = time.time() - start_time
-                        print(f"  ✅ [ASSEMBLYAI] Success in {elapsed:.1f}s: {len(full_text)} chars", flush=True)
+                        logger.info(f"  ✅ [ASSEMBLYAI] Success in {elapsed:.1f}s: {len(full_text)} chars")
                         return full_text, timestamped, detected_lang
 
                 elif status == "error":
                     error = status_data.get("error", "Unknown error")
-                    print(f"  ❌ [ASSEMBLYAI] Transcription error: {error}", flush=True)
+                    logger.error(f"  ❌ [ASSEMBLYAI] Transcription error: {error}")
                     return None, None, None
 
                 await asyncio.sleep(3)
 
-            print("  ❌ [ASSEMBLYAI] Timeout waiting for transcription", flush=True)
+            logger.error("  ❌ [ASSEMBLYAI] Timeout waiting for transcription")
 
     except Exception as e:
-        print(f"  ❌ [ASSEMBLYAI] Error: {e}", flush=True)
+        logger.error(f"  ❌ [ASSEMBLYAI] Error: {e}")
 
     return None, None, None
 
@@ -2196,19 +2079,19 @@ async def _elevenlabs_scribe_transcribe(
     """
     elevenlabs_key = get_elevenlabs_key()
     if not elevenlabs_key:
-        print("  ⏭️ [ELEVENLABS-SCRIBE] Skipped: No API key", flush=True)
+        logger.debug("  ⏭️ [ELEVENLABS-SCRIBE] Skipped: No API key")
         return None, None, None
 
-    print("  🎙️ [ELEVENLABS-SCRIBE] Starting...", flush=True)
+    logger.debug("  🎙️ [ELEVENLABS-SCRIBE] Starting...")
 
     # Si pas d'audio fourni, télécharger
     if not audio_data:
         audio_data, audio_ext = await _download_audio_for_transcription(video_id)
         if not audio_data:
-            print("  ❌ [ELEVENLABS-SCRIBE] Failed to download audio", flush=True)
+            logger.error("  ❌ [ELEVENLABS-SCRIBE] Failed to download audio")
             return None, None, None
 
-    print(f"  🎙️ [ELEVENLABS-SCRIBE] Sending {len(audio_data) / 1024 / 1024:.1f}MB to ElevenLabs...", flush=True)
+    logger.debug(f"  🎙️ [ELEVENLABS-SCRIBE] Sending {len(audio_data) / 1024 / 1024:.1f}MB to ElevenLabs...")
 
     try:
         mime_types = {
@@ -2235,7 +2118,7 @@ async def _elevenlabs_scribe_transcribe(
                 timeout=_t("elevenlabs_scribe"),
             )
             elapsed = time.time() - start_time
-            print(f"  🎙️ [ELEVENLABS-SCRIBE] Response in {elapsed:.1f}s: {response.status_code}", flush=True)
+            logger.debug(f"  🎙️ [ELEVENLABS-SCRIBE] Response in {elapsed:.1f}s: {response.status_code}")
 
             if response.status_code == 200:
                 result = response.json()
@@ -2263,13 +2146,13 @@ async def _elevenlabs_scribe_transcribe(
                     else:
                         timestamped = full_text
 
-                    print(f"  ✅ [ELEVENLABS-SCRIBE] Success: {len(full_text)} chars", flush=True)
+                    logger.info(f"  ✅ [ELEVENLABS-SCRIBE] Success: {len(full_text)} chars")
                     return full_text, timestamped, detected_lang
             else:
-                print(f"  ❌ [ELEVENLABS-SCRIBE] Error: {response.text[:200]}", flush=True)
+                logger.error(f"  ❌ [ELEVENLABS-SCRIBE] Error: {response.text[:200]}")
 
     except Exception as e:
-        print(f"  ❌ [ELEVENLABS-SCRIBE] Transcription error: {e}", flush=True)
+        logger.error(f"  ❌ [ELEVENLABS-SCRIBE] Transcription error: {e}")
 
     return None, None, None
 
@@ -2284,7 +2167,7 @@ async def _download_audio_for_transcription(video_id: str) -> Tuple[Optional[byt
     audio_ext = ".mp3"
 
     # Essayer Invidious d'abord
-    healthy_instances = get_healthy_instances(INVIDIOUS_INSTANCES)
+    healthy_instances = await get_healthy_instances(INVIDIOUS_INSTANCES)
     for instance in healthy_instances[:3]:
         try:
             # 🔄 Revert post-PR #472 — Invidious instances ont leur propre infra
@@ -2326,9 +2209,7 @@ async def _download_audio_for_transcription(video_id: str) -> Tuple[Optional[byt
 
     # Fallback yt-dlp
     try:
-        loop = asyncio.get_event_loop()
-
-        def _download():
+        async def _download():
             with tempfile.TemporaryDirectory() as tmpdir:
                 audio_path = f"{tmpdir}/{video_id}.mp3"
                 cmd = [
@@ -2355,15 +2236,15 @@ async def _download_audio_for_transcription(video_id: str) -> Tuple[Optional[byt
                 if proxy:
                     cmd.insert(1, "--proxy")
                     cmd.insert(2, proxy)
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=_t("whisper_download"))
-                if result.returncode != 0:
+                result = await run_media_process(cmd, timeout=_t("whisper_download"))
+                if not result.ok:
                     return None, ".mp3"
                 for f in Path(tmpdir).iterdir():
                     if f.suffix in [".mp3", ".m4a", ".webm", ".opus", ".wav"]:
-                        return f.read_bytes(), f.suffix
+                        return await asyncio.to_thread(f.read_bytes), f.suffix
                 return None, ".mp3"
 
-        result = await asyncio.wait_for(loop.run_in_executor(executor, _download), timeout=_t("whisper_download"))
+        result = await _download()
         return result
 
     except Exception:
@@ -2374,29 +2255,11 @@ async def _download_audio_for_transcription(video_id: str) -> Tuple[Optional[byt
 
 async def _compress_audio(audio_data: bytes, audio_ext: str, source_name: str = "AUDIO") -> Tuple[Optional[bytes], str]:
     """Compresse l'audio si trop gros"""
-    print(f"  🎙️ [{source_name}] Compressing audio...", flush=True)
-    try:
-        with tempfile.NamedTemporaryFile(suffix=audio_ext, delete=False) as tmp_in:
-            tmp_in.write(audio_data)
-            tmp_in_path = tmp_in.name
-
-        tmp_out_path = tmp_in_path + "_compressed.mp3"
-
-        cmd = ["ffmpeg", "-i", tmp_in_path, "-b:a", "32k", "-ac", "1", "-ar", "16000", "-y", tmp_out_path]
-        subprocess.run(cmd, capture_output=True, timeout=120)
-
-        if Path(tmp_out_path).exists():
-            compressed = Path(tmp_out_path).read_bytes()
-            print(f"  ✅ [{source_name}] Compressed to: {len(compressed) / 1024 / 1024:.1f}MB", flush=True)
-            Path(tmp_in_path).unlink(missing_ok=True)
-            Path(tmp_out_path).unlink(missing_ok=True)
-            return compressed, ".mp3"
-
-        Path(tmp_in_path).unlink(missing_ok=True)
-        Path(tmp_out_path).unlink(missing_ok=True)
-
-    except Exception as e:
-        print(f"  ⚠️ [{source_name}] Compression failed: {e}", flush=True)
+    logger.debug(f"  🎙️ [{source_name}] Compressing audio...")
+    compressed = await transcode_audio_for_stt(audio_data, audio_ext, source_name)
+    if compressed:
+        logger.info(f"  ✅ [{source_name}] Compressed to: {len(compressed) / 1024 / 1024:.1f}MB")
+        return compressed, ".mp3"
 
     return audio_data, audio_ext
 
@@ -2412,6 +2275,7 @@ async def get_transcript_with_timestamps(
     is_short: bool = False,
     duration: int = 0,
     user_plan: Optional[str] = None,
+    on_partial: Optional[PartialListener] = None,
 ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
     """
     🎯 FONCTION PRINCIPALE v7.1 - Supadata PRIORITAIRE + STT pour TOUTES vidéos
@@ -2436,10 +2300,18 @@ async def get_transcript_with_timestamps(
     │  9. Deepgram Nova-2 (ultra-rapide)                                             │
     │  10. AssemblyAI (premium, très fiable)                                         │
     └────────────────────────────────────────────────────────────────────────────────┘
+
+    on_partial: appelé (sync ou async) avec un PartialTranscript à chaque segment
+    transcrit quand l'audio long passe par le STT découpé (Phase 3).
     """
-    # 🚦 Semaphore: limite les extractions concurrentes pour protéger les APIs
-    async with _extraction_semaphore:
-        return await _get_transcript_with_timestamps_inner(video_id, supadata_key, is_short, duration, user_plan)
+    token = partial_transcript_listener.set(on_partial) if on_partial is not None else None
+    try:
+        # 🚦 Semaphore: limite les extractions concurrentes pour protéger les APIs
+        async with _extraction_semaphore:
+            return await _get_transcript_with_timestamps_inner(video_id, supadata_key, is_short, duration, user_plan)
+    finally:
+        if token is not None:
+            partial_transcript_listener.reset(token)
 
 
 async def _get_transcript_with_timestamps_inner(
@@ -2450,18 +2322,18 @@ async def _get_transcript_with_timestamps_inner(
     user_plan: Optional[str] = None,
 ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
     """Inner function — exécutée sous le semaphore de concurrence."""
-    print("", flush=True)
-    print(f"{'=' * 70}", flush=True)
-    print(
-        f"🔍 TRANSCRIPT EXTRACTION v7.1 for {video_id} (is_short={is_short}) [slots: {MAX_CONCURRENT_EXTRACTIONS - _extraction_semaphore._value}/{MAX_CONCURRENT_EXTRACTIONS}]",
-        flush=True,
+    logger.info(
+        f"🔍 TRANSCRIPT EXTRACTION v7.1 for {video_id}",
+        video_id=video_id,
+        is_short=is_short,
+        slots_in_use=MAX_CONCURRENT_EXTRACTIONS - _extraction_semaphore._value,
+        max_slots=MAX_CONCURRENT_EXTRACTIONS,
     )
-    print(f"{'=' * 70}", flush=True)
 
     # ⚡ v7.1: Activer les timeouts adaptatifs pour vidéos courtes
     if is_short:
         _active_timeouts.set(TIMEOUTS_SHORT)
-        print("⚡ [v7.1] Short video detected → using REDUCED timeouts (50% faster fallback)", flush=True)
+        logger.info("⚡ [v7.1] Short video detected → using REDUCED timeouts (50% faster fallback)")
     else:
         _active_timeouts.set(TIMEOUTS)
 
@@ -2472,13 +2344,12 @@ async def _get_transcript_with_timestamps_inner(
         try:
             payload = await transcript_cache.get(video_id, platform="youtube")
             if payload is not None and payload.get("simple"):
-                print(f"💾 Transcript cache HIT for {video_id}", flush=True)
-                print(f"{'=' * 70}", flush=True)
+                logger.info(f"💾 Transcript cache HIT for {video_id}")
                 return payload.get("simple"), payload.get("timestamped"), payload.get("lang")
             else:
-                print(f"💾 Transcript cache MISS for {video_id}", flush=True)
+                logger.info(f"💾 Transcript cache MISS for {video_id}")
         except Exception as e:
-            print(f"⚠️ Transcript cache error (continuing): {e}", flush=True)
+            logger.warning(f"⚠️ Transcript cache error (continuing): {e}")
 
     # Helper pour cacher un résultat réussi (évite la duplication de code)
     async def _cache_success(vid: str, simple: str, timestamped: str, lang: str, method_name: str):
@@ -2493,134 +2364,55 @@ async def _get_transcript_with_timestamps_inner(
                     extraction_method=method_name,
                     thumbnail_url=f"https://img.youtube.com/vi/{vid}/mqdefault.jpg",
                 )
-                print(f"💾 Transcript cached (L1+L2) for {vid}", flush=True)
+                logger.info(f"💾 Transcript cached (L1+L2) for {vid}")
             except Exception as e:
-                print(f"⚠️ Transcript cache save error for {vid}: {e}", flush=True)
+                logger.warning(f"⚠️ Transcript cache save error for {vid}: {e}")
 
     # ═══════════════════════════════════════════════════════════════════════════════
-    # PHASE 0: Supadata API EN PRIORITÉ (seul, le plus fiable)
+    # PHASE 0 + 1: Supadata + méthodes texte en HEDGING (core.hedging)
+    # Le provider historiquement le plus rapide part seul ; le suivant est lancé
+    # après le p50 observé du meneur (p90 avant Supadata, payant), ou dès qu'un
+    # provider échoue. Premier transcript valide gagnant, les autres sont annulés.
     # ═══════════════════════════════════════════════════════════════════════════════
-    print("", flush=True)
-    print("🥇 PHASE 0: Supadata API (PRIORITY)", flush=True)
-    print("─" * 50, flush=True)
-
-    supadata_cb = get_circuit_breaker("supadata")
-    if supadata_cb.can_execute():
-        # ⚡ v7.3: 1 attempt only (was 2) — fallback Phase 1 plus rapide en cas de lenteur Supadata
-        for attempt in range(1):
-            try:
-                if transcript_metrics:
-                    await transcript_metrics.increment("supadata_calls")
-                simple, timestamped, lang = await get_transcript_supadata(video_id, supadata_key)
-                if simple and timestamped:
-                    supadata_cb.record_success()
-                    if transcript_metrics:
-                        await transcript_metrics.increment("supadata_successes")
-                    print("✅ SUCCESS with Supadata API (Phase 0 - Priority)", flush=True)
-                    print(f"{'=' * 70}", flush=True)
-                    await _cache_success(video_id, simple, timestamped, lang, "Supadata API")
-                    return simple, timestamped, lang
-            except Exception as e:
-                print(f"  ⚠️ [Supadata] Attempt {attempt + 1} failed ({type(e).__name__}): {str(e)[:200]}", flush=True)
-        supadata_cb.record_failure()
-        print("  ❌ [Supadata] Failed — falling back to Phase 1", flush=True)
-    else:
-        print("  ⏭️ [Supadata] Skipped (circuit OPEN)", flush=True)
-
-    # ═══════════════════════════════════════════════════════════════════════════════
-    # PHASE 1: Méthodes texte EN PARALLÈLE (sans Supadata)
-    # ═══════════════════════════════════════════════════════════════════════════════
-    print("", flush=True)
-    print("📋 PHASE 1: Text methods (PARALLEL — sans Supadata)", flush=True)
-    print("─" * 50, flush=True)
-
-    phase1_methods = [
-        ("youtube-transcript-api", "ytapi", lambda: get_transcript_ytapi(video_id)),
-        ("Invidious API", "invidious", lambda: get_transcript_invidious(video_id)),
-        ("Piped API", "piped", lambda: get_transcript_piped(video_id)),
+    logger.info("🥇 PHASE 0: Supadata API (PRIORITY)")
+    logger.info("📋 PHASE 1: Text methods (HEDGED with Supadata — latency-ordered)")
+
+    async def _supadata_attempt():
+        if transcript_metrics:
+            await transcript_metrics.increment("supadata_calls")
+        simple, timestamped, lang = await get_transcript_supadata(video_id, supadata_key)
+        # `(content, None, lang)` = pas d'anchors exploitables → rejeté, les autres continuent
+        if simple and timestamped and transcript_metrics:
+            await transcript_metrics.increment("supadata_successes")
+        return simple, timestamped, lang
+
+    phase1_candidates = [
+        HedgeCandidate("youtube-transcript-api", "ytapi", lambda: get_transcript_ytapi(video_id), expected_s=3.0),
+        HedgeCandidate("Invidious API", "invidious", lambda: get_transcript_invidious(video_id), expected_s=6.0),
+        HedgeCandidate("Piped API", "piped", lambda: get_transcript_piped(video_id), expected_s=6.0),
     ]
-
-    # Filtrer les méthodes avec circuit breaker ouvert
-    active_methods = []
-    for name, cb_name, method in phase1_methods:
-        cb = get_circuit_breaker(cb_name)
-        if cb.can_execute():
-            active_methods.append((name, cb_name, method))
-        else:
-            print(f"  ⏭️ [{name}] Skipped (circuit OPEN)", flush=True)
-
-    if active_methods:
-        # Exécuter en parallèle
-        async def run_method_with_retry(name: str, cb_name: str, method):
-            cb = get_circuit_breaker(cb_name)
-            for attempt in range(2):
-                try:
-                    simple, timestamped, lang = await method()
-                    if simple and timestamped:
-                        cb.record_success()
-                        return (name, simple, timestamped, lang)
-                except Exception as e:
-                    print(f"  ⚠️ [{name}] Attempt {attempt + 1} failed ({type(e).__name__}): {str(e)[:200]}", flush=True)
-                if attempt == 0:
-                    await asyncio.sleep(calculate_backoff(attempt))
-            cb.record_failure()
-            return None
-
-        # ⚡ Phase 1 race-cancel: first valid result wins, cancel the rest
-        tasks = [
-            asyncio.create_task(run_method_with_retry(name, cb_name, method))
-            for name, cb_name, method in active_methods
-        ]
-        phase1_timeout = max(
-            TIMEOUTS.get("invidious", 35),
-            TIMEOUTS.get("piped", 35),
-            TIMEOUTS.get("ytapi", 25),
+    if supadata_key or get_supadata_key():
+        # A priori le plus rapide (et le plus fiable) : reste en tête tant que l'historique le confirme
+        phase1_candidates.insert(
+            0, HedgeCandidate("Supadata API", "supadata", _supadata_attempt, paid=True, expected_s=2.0)
         )
 
-        winning_result = None
-        remaining = set(tasks)
-        deadline_left = phase1_timeout
-
-        # Boucle: attendre FIRST_COMPLETED, vérifier la validité, annuler si gagnant trouvé
-        while remaining and winning_result is None and deadline_left > 0:
-            start_wait = time.monotonic()
-            done, pending = await asyncio.wait(
-                remaining,
-                return_when=asyncio.FIRST_COMPLETED,
-                timeout=deadline_left,
-            )
-            deadline_left -= time.monotonic() - start_wait
-
-            if not done:
-                # Timeout global atteint sans nouveau résultat
-                break
-
-            for task in done:
-                try:
-                    result = task.result()
-                except Exception:
-                    continue
-                if result and not isinstance(result, Exception):
-                    name, simple, timestamped, lang = result
-                    if simple and timestamped:
-                        winning_result = (name, simple, timestamped, lang)
-                        print(f"🏁 [Phase 1] Winner: {name} — cancelling {len(pending)} pending", flush=True)
-                        break
-
-            # Recalculer le set des tasks encore en cours
-            remaining = pending
-
-        # Annuler tout ce qui reste
-        for p in remaining:
-            p.cancel()
-
-        if winning_result is not None:
-            name, simple, timestamped, lang = winning_result
-            print("", flush=True)
-            print(f"✅ SUCCESS with {name} (Phase 1 - Race)", flush=True)
-            print(f"{'=' * 70}", flush=True)
-            await _cache_success(video_id, simple, timestamped, lang, name)
-            return simple, timestamped, lang
+    phase1_budget = _t("supadata") + max(_t("invidious"), _t("piped"), _t("ytapi"))
+    outcome = await transcript_hedger.race(
+        phase1_candidates,
+        accept=lambda r: bool(r and r[0] and r[1]),
+        budget_s=phase1_budget,
+    )
+    if outcome is not None:
+        name = outcome.candidate.name
+        simple, timestamped, lang = outcome.result
+        logger.info(
+            f"✅ SUCCESS with {name} (Phase 0/1 - Hedged, {outcome.elapsed_s:.1f}s, "
+            f"launched={','.join(outcome.launched)})"
+        )
+        await _cache_success(video_id, simple, timestamped, lang, name)
+        return simple, timestamped, lang
+    logger.error("  ❌ [Phase 0/1] No valid transcript from text providers")
 
     # ═══════════════════════════════════════════════════════════════════════════════
     # PHASE 1.5: VOXTRAL SHORT-CIRCUIT (Mistral-First Phase 1, Task 1.3)
@@ -2632,28 +2424,23 @@ async def _get_transcript_with_timestamps_inner(
 
     _short_circuit_cap = _get_max_stt_duration(user_plan or "free")
     _voxtral_cb = get_circuit_breaker("voxtral_stt")
-    if duration > 0 and duration <= _short_circuit_cap and _voxtral_cb.can_execute():
-        print("", flush=True)
-        print(
+    if duration > 0 and duration <= _short_circuit_cap and await _voxtral_cb.allow():
+        logger.info(
             f"🎙️ PHASE 1.5: No captions detected by Supadata, short-circuiting to Voxtral STT "
-            f"(duration={duration}s ≤ cap={_short_circuit_cap}s, plan={user_plan or 'free'})",
-            flush=True,
+            f"(duration={duration}s ≤ cap={_short_circuit_cap}s, plan={user_plan or 'free'})"
         )
-        print("─" * 50, flush=True)
         try:
             sc_simple, sc_timestamped, sc_lang = await get_transcript_voxtral(video_id)
             if sc_simple and sc_timestamped:
                 _voxtral_cb.record_success()
-                print("✅ SUCCESS with Voxtral STT (Phase 1.5 short-circuit)", flush=True)
-                print(f"{'=' * 70}", flush=True)
+                logger.info("✅ SUCCESS with Voxtral STT (Phase 1.5 short-circuit)")
                 await _cache_success(video_id, sc_simple, sc_timestamped, sc_lang, "Voxtral STT (short-circuit)")
                 return sc_simple, sc_timestamped, sc_lang
             else:
-                print("  ❌ [Voxtral short-circuit] Empty result, falling back to Phase 2", flush=True)
+                logger.error("  ❌ [Voxtral short-circuit] Empty result, falling back to Phase 2")
         except Exception as e:
-            print(
-                f"  ⚠️ [Voxtral short-circuit] Failed ({type(e).__name__}): {str(e)[:200]} — falling back to Phase 2",
-                flush=True,
+            logger.warning(
+                f"  ⚠️ [Voxtral short-circuit] Failed ({type(e).__name__}): {str(e)[:200]} — falling back to Phase 2"
             )
             # Don't record failure on circuit breaker — Phase 3 will retry the same provider
             # only if the short-circuit timed out / network failed. Real STT errors will
@@ -2662,9 +2449,7 @@ async def _get_transcript_with_timestamps_inner(
     # ═══════════════════════════════════════════════════════════════════════════════
     # PHASE 2: yt-dlp (séquentiel, plus lent mais fiable)
     # ═══════════════════════════════════════════════════════════════════════════════
-    print("", flush=True)
-    print("📋 PHASE 2: yt-dlp methods (SEQUENTIAL)", flush=True)
-    print("─" * 50, flush=True)
+    logger.info("📋 PHASE 2: yt-dlp methods (SEQUENTIAL)")
 
     phase2_methods = [
         ("yt-dlp manual", "ytdlp", lambda: get_transcript_ytdlp(video_id)),
@@ -2673,22 +2458,21 @@ async def _get_transcript_with_timestamps_inner(
 
     for name, cb_name, method in phase2_methods:
         cb = get_circuit_breaker(cb_name)
-        if not cb.can_execute():
-            print(f"  ⏭️ [{name}] Skipped (circuit OPEN)", flush=True)
+        if not await cb.allow():
+            logger.debug(f"  ⏭️ [{name}] Skipped (circuit OPEN)")
             continue
 
-        print(f"  🔄 [{name}] Trying...", flush=True)
+        logger.debug(f"  🔄 [{name}] Trying...")
         for attempt in range(2):
             try:
                 simple, timestamped, lang = await method()
                 if simple and timestamped:
                     cb.record_success()
-                    print(f"✅ SUCCESS with {name} (Phase 2)", flush=True)
-                    print(f"{'=' * 70}", flush=True)
+                    logger.info(f"✅ SUCCESS with {name} (Phase 2)")
                     await _cache_success(video_id, simple, timestamped, lang, name)
                     return simple, timestamped, lang
             except Exception as e:
-                print(f"  ⚠️ [{name}] Attempt {attempt + 1} failed ({type(e).__name__}): {str(e)[:200]}", flush=True)
+                logger.warning(f"  ⚠️ [{name}] Attempt {attempt + 1} failed ({type(e).__name__}): {str(e)[:200]}")
             if attempt == 0:
                 await asyncio.sleep(calculate_backoff(attempt))
         cb.record_failure()
@@ -2696,9 +2480,7 @@ async def _get_transcript_with_timestamps_inner(
     # ═══════════════════════════════════════════════════════════════════════════════
     # PHASE 3: Audio STT (dernier recours — toutes vidéos)
     # ═══════════════════════════════════════════════════════════════════════════════
-    print("", flush=True)
-    print(f"📋 PHASE 3: Audio STT (last resort{' — SHORT' if is_short else ' — full video'})", flush=True)
-    print("─" * 50, flush=True)
+    logger.info(f"📋 PHASE 3: Audio STT (last resort{' — SHORT' if is_short else ' — full video'})")
 
     # Duration guard: plan-aware cap (Mistral-First Phase 1).
     # Free=20min / Pro=40min / Expert=60min. Voxtral handles up to 3h, so the
@@ -2706,18 +2488,27 @@ async def _get_transcript_with_timestamps_inner(
     # _get_max_stt_duration is already imported above at the Phase 1.5 short-circuit.
     max_stt_duration = _get_max_stt_duration(user_plan or "free")
     if duration > 0 and duration > max_stt_duration:
-        print(
+        logger.debug(
             f"  ⏭️ [STT] Skipped ALL STT providers: video duration {duration}s > "
-            f"max_stt_duration {max_stt_duration}s for plan={user_plan or 'free'}",
-            flush=True,
+            f"max_stt_duration {max_stt_duration}s for plan={user_plan or 'free'}"
         )
     else:
         # Télécharger l'audio une seule fois pour tous les services
-        print("  🎵 Downloading audio for transcription...", flush=True)
+        logger.debug("  🎵 Downloading audio for transcription...")
         audio_data, audio_ext = await _download_audio_for_transcription(video_id)
 
         if not audio_data:
-            print("  ❌ Failed to download audio - trying services anyway", flush=True)
+            logger.error("  ❌ Failed to download audio - trying services anyway")
+
+        # Audio long : découpage sur silences + segments transcrits en parallèle
+        # (Voxtral/Groq), transcript partiel publié au fil de l'eau
+        if audio_data and should_chunk_audio(duration, len(audio_data)):
+            logger.debug("  ✂️ [Chunked STT] Trying...")
+            simple, timestamped, lang = await transcribe_chunked(audio_data, audio_ext, duration=duration)
+            if simple:
+                logger.info("✅ SUCCESS with Chunked STT (Phase 3 - Audio STT)")
+                await _cache_success(video_id, simple, timestamped, lang, "Chunked STT")
+                return simple, timestamped, lang
 
         phase3_methods = [
             ("Voxtral STT", "voxtral_stt", lambda: get_transcript_voxtral(video_id, audio_data, audio_ext)),
@@ -2738,29 +2529,27 @@ async def _get_transcript_with_timestamps_inner(
 
         for name, cb_name, method in phase3_methods:
             cb = get_circuit_breaker(cb_name)
-            if not cb.can_execute():
-                print(f"  ⏭️ [{name}] Skipped (circuit OPEN)", flush=True)
+            if not await cb.allow():
+                logger.debug(f"  ⏭️ [{name}] Skipped (circuit OPEN)")
                 continue
 
-            print(f"  🎙️ [{name}] Trying...", flush=True)
+            logger.debug(f"  🎙️ [{name}] Trying...")
             try:
                 simple, timestamped, lang = await method()
                 if simple:
                     cb.record_success()
-                    print(f"✅ SUCCESS with {name} (Phase 3 - Audio STT)", flush=True)
-                    print(f"{'=' * 70}", flush=True)
+                    logger.info(f"✅ SUCCESS with {name} (Phase 3 - Audio STT)")
                     result_ts = timestamped or simple
                     await _cache_success(video_id, simple, result_ts, lang, name)
                     return simple, result_ts, lang
             except Exception as e:
-                print(f"  ⚠️ [{name}] Failed ({type(e).__name__}): {str(e)[:200]}", flush=True)
+                logger.warning(f"  ⚠️ [{name}] Failed ({type(e).__name__}): {str(e)[:200]}")
             cb.record_failure()
 
     # ═══════════════════════════════════════════════════════════════════════════════
     # ÉCHEC TOTAL — Log détaillé pour diagnostic
     # ═══════════════════════════════════════════════════════════════════════════════
-    print("", flush=True)
-    print(f"❌ FAILED: All methods failed for {video_id} (is_short={is_short})", flush=True)
+    logger.error(f"❌ FAILED: All methods failed for {video_id} (is_short={is_short})")
     # Log l'état des circuit breakers pour diagnostic
     for cb_name in [
         "supadata",
@@ -2778,8 +2567,7 @@ async def _get_transcript_with_timestamps_inner(
     ]:
         cb = get_circuit_breaker(cb_name)
         if cb.state != CircuitState.CLOSED:
-            print(f"  🔌 [{cb_name}] circuit={cb.state.value} failures={cb.failures}", flush=True)
-    print(f"{'=' * 70}", flush=True)
+            logger.debug(f"  🔌 [{cb_name}] circuit={cb.state.value} failures={cb.failures}")
     return None, None, None
 
 
@@ -2816,10 +2604,10 @@ async def get_playlist_videos(playlist_id: str, max_videos: int = 50) -> List[Di
                             }
                         )
                     if videos:
-                        print(f"📋 Playlist {playlist_id}: {len(videos)} videos from Invidious", flush=True)
+                        logger.info(f"📋 Playlist {playlist_id}: {len(videos)} videos from Invidious")
                         return videos
         except Exception as e:
-            print(f"⚠️ Invidious playlist error: {e}", flush=True)
+            logger.warning(f"⚠️ Invidious playlist error: {e}")
 
     # Fallback yt-dlp
     try:
@@ -2839,7 +2627,7 @@ async def get_playlist_videos(playlist_id: str, max_videos: int = 50) -> List[Di
             if proxy:
                 cmd.insert(1, "--proxy")
                 cmd.insert(2, proxy)
-                print("  🔌 [PLAYLIST] Using proxy", flush=True)
+                logger.debug("  🔌 [PLAYLIST] Using proxy")
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
             if result.returncode != 0:
                 return []
@@ -2861,10 +2649,10 @@ async def get_playlist_videos(playlist_id: str, max_videos: int = 50) -> List[Di
             return videos[:max_videos]
 
         videos = await loop.run_in_executor(executor, _fetch)
-        print(f"📋 Playlist {playlist_id}: {len(videos)} videos found", flush=True)
+        logger.info(f"📋 Playlist {playlist_id}: {len(videos)} videos found")
         return videos
     except Exception as e:
-        print(f"⚠️ Playlist fetch error: {e}", flush=True)
+        logger.warning(f"⚠️ Playlist fetch error: {e}")
         return []
 
 
@@ -2913,7 +2701,7 @@ async def get_playlist_info(playlist_id: str) -> Optional[Dict[str, Any]]:
             if proxy:
                 cmd.insert(1, "--proxy")
                 cmd.insert(2, proxy)
-                print("  🔌 [PLAYLIST-INFO] Using proxy", flush=True)
+                logger.debug("  🔌 [PLAYLIST-INFO] Using proxy")
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
             if result.returncode == 0:
                 return json.loads(result.stdout)
@@ -2929,7 +2717,7 @@ async def get_playlist_info(playlist_id: str) -> Optional[Dict[str, Any]]:
                 "description": data.get("description", "")[:500],
             }
     except Exception as e:
-        print(f"⚠️ Playlist info error: {e}", flush=True)
+        logger.warning(f"⚠️ Playlist info error: {e}")
 
     return {
         "playlist_id": playlist_id,
@@ -22,6 +22,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from core.config import get_elevenlabs_key
+from core.http_client import provider_client
 from db.database import Summary
 from storage.r2 import upload_to_r2, check_exists_r2, get_r2_public_url
 from tts.service import (
@@ -271,7 +272,7 @@ async def _elevenlabs_generate_bytes(
     if not api_key:
         raise RuntimeError("ElevenLabs API key not configured")
 
-    if not elevenlabs_circuit.can_execute():
+    if not await elevenlabs_circuit.allow():
         raise RuntimeError("ElevenLabs circuit breaker is open")
 
     resolved_voice = voice_id or get_voice_id(language, gender)
@@ -297,9 +298,9 @@ async def _elevenlabs_generate_bytes(
         "Accept": "audio/mpeg",
     }
 
-    async with httpx.AsyncClient(timeout=120.0) as client:
+    async with provider_client("elevenlabs", timeout=120.0) as client:
         try:
-            response = await client.post(url, headers=headers, json=payload)
+            response = await client.post(url, headers=headers, json=payload, timeout=120.0)
         except httpx.TimeoutException:
             elevenlabs_circuit.record_failure()
             raise RuntimeError("ElevenLabs TTS timeout during audio summary generation")
@@ -515,9 +516,10 @@ async def _translate_text_with_mistral(
         f"Retourne UNIQUEMENT la traduction, sans commentaire."
     )
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
+    async with provider_client("mistral", timeout=60.0) as client:
         response = await client.post(
             "https://api.mistral.ai/v1/chat/completions",
+            timeout=60.0,
             headers={
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json",
@@ -0,0 +1,221 @@
+"""
+TTS FAN-OUT — Concurrent, order-preserving synthesis of long texts
+v1.0 — Used by the audio export (exports.service.export_to_audio)
+
+Architecture:
+    synthesize_ordered(chunks)
+        → one provider picked for the whole text (voice must not change mid-export)
+        → every chunk scheduled at once, real requests bounded per provider
+          (TTS_CONCURRENCY_<PROVIDER>, shared by all exports of the worker)
+        → each chunk cached on disk by sha256(provider, voice, speed, model, text)
+        → audio yielded in text order as soon as the leading chunk is ready
+
+Time-to-first-audio is one chunk; total time is ~chunks / concurrency requests
+instead of one request per chunk back to back.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from tts.providers import TTSProvider, get_tts_provider
+
+logger = logging.getLogger(__name__)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Configuration
+# ═══════════════════════════════════════════════════════════════════════════════
+
+PROVIDER_CONCURRENCY = {
+    "elevenlabs": int(os.environ.get("TTS_CONCURRENCY_ELEVENLABS", "4")),
+    "voxtral": int(os.environ.get("TTS_CONCURRENCY_VOXTRAL", "2")),
+    "openai": int(os.environ.get("TTS_CONCURRENCY_OPENAI", "4")),
+}
+CHUNK_ATTEMPTS = 3
+# Pause before retry n (seconds): lets a 429/503 from the provider clear
+CHUNK_RETRY_BACKOFF_SECONDS = (0.5, 1.0)
+CHUNK_CACHE_DIR = os.environ.get(
+    "TTS_CHUNK_CACHE_DIR", os.path.join(os.path.dirname(__file__), "..", "..", "tmp", "tts-chunks")
+)
+CHUNK_CACHE_MAX_AGE_SECONDS = int(os.environ.get("TTS_CHUNK_CACHE_MAX_AGE_SECONDS", str(7 * 86400)))
+
+_semaphores: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+_in_flight: Dict[str, int] = {}
+_counters = {"cache_hits": 0, "synthesized": 0, "retries": 0, "failures": 0, "chars_synthesized": 0}
+
+
+@dataclass(frozen=True)
+class TTSVoice:
+    """Everything besides the text that changes the synthesized audio."""
+
+    voice_id: Optional[str] = None
+    language: str = "fr"
+    gender: str = "female"
+    speed: float = 1.0
+    model_id: Optional[str] = None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Chunk cache (disk, shared by the workers of the host)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def chunk_cache_key(provider_name: str, text: str, voice: TTSVoice) -> str:
+    material = "\x1f".join(
+        [
+            provider_name,
+            voice.voice_id or "",
+            voice.language,
+            voice.gender,
+            f"{voice.speed:.2f}",
+            voice.model_id or "",
+            text,
+        ]
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _chunk_path(key: str) -> str:
+    return os.path.join(CHUNK_CACHE_DIR, key[:2], f"{key}.mp3")
+
+
+def _read_chunk(key: str) -> Optional[bytes]:
+    path = _chunk_path(key)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        os.utime(path)  # keeps popular chunks (intro/outro) past the age cleanup
+        return data
+    except FileNotFoundError:
+        return None
+
+
+def _write_chunk(key: str, audio: bytes) -> None:
+    path = _chunk_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(audio)
+    os.replace(tmp, path)
+
+
+def cleanup_chunk_cache() -> int:
+    """Remove cached chunks not served for CHUNK_CACHE_MAX_AGE_SECONDS. Returns count."""
+    removed = 0
+    cutoff = time.time() - CHUNK_CACHE_MAX_AGE_SECONDS
+    for root, _dirs, files in os.walk(CHUNK_CACHE_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Synthesis
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def _provider_semaphore(name: str) -> asyncio.Semaphore:
+    """Per-provider bound, shared by every export of this worker (one loop per worker)."""
+    loop = asyncio.get_running_loop()
+    entry = _semaphores.get(name)
+    if entry is None or entry[0] is not loop:
+        entry = (loop, asyncio.Semaphore(max(1, PROVIDER_CONCURRENCY.get(name, 2))))
+        _semaphores[name] = entry
+    return entry[1]
+
+
+async def _request_chunk(provider: TTSProvider, text: str, voice: TTSVoice) -> bytes:
+    stream, _client, _media = await provider.generate_stream(
+        text=text,
+        # Explicit voice ids are ElevenLabs ids; other providers resolve their own
+        voice_id=voice.voice_id if provider.name == "elevenlabs" else None,
+        language=voice.language,
+        gender=voice.gender,
+        speed=voice.speed,
+        model_id=voice.model_id if provider.name == "elevenlabs" else None,
+    )
+    parts = []
+    async for part in stream:
+        parts.append(part)
+    audio = b"".join(parts)
+    if not audio:
+        raise RuntimeError(f"{provider.name} TTS returned empty audio")
+    return audio
+
+
+async def synthesize_chunk(provider: TTSProvider, text: str, voice: TTSVoice) -> bytes:
+    """Audio for one chunk: disk cache, else a bounded provider request (retried with backoff)."""
+    key = chunk_cache_key(provider.name, text, voice)
+    cached = await asyncio.to_thread(_read_chunk, key)
+    if cached is not None:
+        _counters["cache_hits"] += 1
+        return cached
+
+    async with _provider_semaphore(provider.name):
+        _in_flight[provider.name] = _in_flight.get(provider.name, 0) + 1
+        try:
+            for attempt in range(1, CHUNK_ATTEMPTS + 1):
+                try:
+                    audio = await _request_chunk(provider, text, voice)
+                    break
+                except Exception as e:
+                    if attempt == CHUNK_ATTEMPTS:
+                        _counters["failures"] += 1
+                        raise
+                    _counters["retries"] += 1
+                    logger.warning("TTS chunk attempt %d failed on %s: %s", attempt, provider.name, e)
+                    await asyncio.sleep(
+                        CHUNK_RETRY_BACKOFF_SECONDS[min(attempt, len(CHUNK_RETRY_BACKOFF_SECONDS)) - 1]
+                    )
+        finally:
+            _in_flight[provider.name] -= 1
+
+    _counters["synthesized"] += 1
+    _counters["chars_synthesized"] += len(text)
+    try:
+        await asyncio.to_thread(_write_chunk, key, audio)
+    except OSError as e:
+        logger.warning("TTS chunk cache write failed: %s", e)
+    return audio
+
+
+async def synthesize_ordered(
+    chunks: List[str],
+    voice: TTSVoice,
+    provider: Optional[TTSProvider] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Yield the audio of ``chunks`` in order while later chunks are still synthesizing.
+
+    Raises (from the iterator) if a chunk fails after retries; pending chunks are
+    cancelled when the consumer stops early or on failure.
+    """
+    provider = provider or get_tts_provider()
+    tasks = [asyncio.ensure_future(synthesize_chunk(provider, text, voice)) for text in chunks]
+    try:
+        for task in tasks:
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Retrieve cancelled/failed results so none is reported as "never retrieved"
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def get_tts_fanout_stats() -> dict:
+    return {
+        **_counters,
+        "in_flight": dict(_in_flight),
+        "concurrency": dict(PROVIDER_CONCURRENCY),
+    }
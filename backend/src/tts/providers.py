@@ -19,6 +19,7 @@ from typing import AsyncIterator, Optional
 import httpx
 
 from core.config import get_elevenlabs_key, get_mistral_key, get_voxtral_voice_id, is_voxtral_available
+from core.http_client import get_provider_client, provider_client, release_provider_client
 from tts.service import (
     get_voice_id,
     DEFAULT_MODEL_ID,
@@ -54,7 +55,8 @@ class TTSProvider(ABC):
         Generate TTS audio stream.
 
         Returns:
-            (stream_iterator, client_to_close, media_type)
+            (stream_iterator, client_to_close, media_type) — le client se libère
+            via ``release_provider_client`` (no-op s'il vient du pool provider).
         """
         ...
 
@@ -114,18 +116,18 @@ class ElevenLabsTTSProvider(TTSProvider):
             "Accept": "audio/mpeg",
         }
 
-        client = httpx.AsyncClient(timeout=60.0)
+        client = get_provider_client("elevenlabs", timeout=60.0)
 
         try:
-            req = client.build_request("POST", url, headers=headers, json=payload)
+            req = client.build_request("POST", url, headers=headers, json=payload, timeout=60.0)
             response = await client.send(req, stream=True)
         except httpx.TimeoutException:
-            await client.aclose()
+            await release_provider_client(client)
             elevenlabs_circuit.record_failure()
             logger.error("ElevenLabs TTS timeout")
             raise
         except Exception as e:
-            await client.aclose()
+            await release_provider_client(client)
             elevenlabs_circuit.record_failure()
             logger.error("ElevenLabs TTS connection error: %s", e)
             raise
@@ -133,14 +135,14 @@ class ElevenLabsTTSProvider(TTSProvider):
         # ── Validate response ────────────────────────────────────────────
         if response.status_code == 401:
             await response.aclose()
-            await client.aclose()
+            await release_provider_client(client)
             elevenlabs_circuit.record_failure()
             raise RuntimeError("ElevenLabs API key invalid (401)")
 
         if response.status_code != 200:
             error_body = (await response.aread()).decode(errors="replace")[:200]
             await response.aclose()
-            await client.aclose()
+            await release_provider_client(client)
             elevenlabs_circuit.record_failure()
             raise RuntimeError(f"ElevenLabs error {response.status_code}: {error_body}")
 
@@ -152,7 +154,7 @@ class ElevenLabsTTSProvider(TTSProvider):
                     yield chunk
             finally:
                 await response.aclose()
-                await client.aclose()
+                await release_provider_client(client)
 
         return _stream(), client, "audio/mpeg"
 
@@ -221,24 +223,24 @@ class OpenAITTSProvider(TTSProvider):
             "Content-Type": "application/json",
         }
 
-        client = httpx.AsyncClient(timeout=60.0)
+        client = get_provider_client("openai", timeout=60.0)
 
         try:
-            req = client.build_request("POST", url, headers=headers, json=payload)
+            req = client.build_request("POST", url, headers=headers, json=payload, timeout=60.0)
             response = await client.send(req, stream=True)
         except httpx.TimeoutException:
-            await client.aclose()
+            await release_provider_client(client)
             logger.error("OpenAI TTS timeout")
             raise
         except Exception as e:
-            await client.aclose()
+            await release_provider_client(client)
             logger.error("OpenAI TTS connection error: %s", e)
             raise
 
         if response.status_code != 200:
             error_body = (await response.aread()).decode(errors="replace")[:200]
             await response.aclose()
-            await client.aclose()
+            await release_provider_client(client)
             raise RuntimeError(f"OpenAI TTS error {response.status_code}: {error_body}")
 
         async def _stream() -> AsyncIterator[bytes]:
@@ -247,7 +249,7 @@ class OpenAITTSProvider(TTSProvider):
                     yield chunk
             finally:
                 await response.aclose()
-                await client.aclose()
+                await release_provider_client(client)
 
         return _stream(), client, "audio/mpeg"
 
@@ -344,18 +346,18 @@ class VoxtralTTSProvider(TTSProvider):
             "Accept": "text/event-stream",
         }
 
-        client = httpx.AsyncClient(timeout=120.0)
+        client = get_provider_client("mistral", timeout=120.0)
 
         try:
-            req = client.build_request("POST", VOXTRAL_API_URL, headers=headers, json=payload)
+            req = client.build_request("POST", VOXTRAL_API_URL, headers=headers, json=payload, timeout=120.0)
             response = await client.send(req, stream=True)
         except httpx.TimeoutException:
-            await client.aclose()
+            await release_provider_client(client)
             _voxtral_record_failure()
             logger.error("Voxtral TTS timeout")
             raise
         except Exception as e:
-            await client.aclose()
+            await release_provider_client(client)
             _voxtral_record_failure()
             logger.error("Voxtral TTS connection error: %s", e)
             raise
@@ -363,7 +365,7 @@ class VoxtralTTSProvider(TTSProvider):
         if response.status_code != 200:
             error_body = (await response.aread()).decode(errors="replace")[:200]
             await response.aclose()
-            await client.aclose()
+            await release_provider_client(client)
             _voxtral_record_failure()
             raise RuntimeError(f"Voxtral TTS error {response.status_code}: {error_body}")
 
@@ -398,7 +400,7 @@ class VoxtralTTSProvider(TTSProvider):
                                 continue
             finally:
                 await response.aclose()
-                await client.aclose()
+                await release_provider_client(client)
 
         return _stream(), client, "audio/mpeg"
 
@@ -436,9 +438,9 @@ class VoxtralTTSProvider(TTSProvider):
             "Content-Type": "application/json",
         }
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        async with provider_client("mistral", timeout=120.0) as client:
             try:
-                response = await client.post(VOXTRAL_API_URL, headers=headers, json=payload)
+                response = await client.post(VOXTRAL_API_URL, headers=headers, json=payload, timeout=120.0)
             except httpx.TimeoutException:
                 _voxtral_record_failure()
                 raise RuntimeError("Voxtral TTS timeout")
@@ -479,7 +481,7 @@ def get_tts_provider() -> TTSProvider:
 
     logger.warning(
         "ElevenLabs TTS unavailable (circuit: %s), trying Voxtral",
-        elevenlabs_circuit.state,
+        elevenlabs_circuit.state.value,
     )
 
     voxtral = VoxtralTTSProvider()
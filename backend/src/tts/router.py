@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from auth.dependencies import get_current_user
 from billing.permissions import require_feature
 from core.config import get_elevenlabs_key
+from core.http_client import provider_client
 from middleware.rate_limiter import InMemoryBackend
 from tts.schemas import TTSRequest
 from tts.service import clean_text_for_tts, get_voice_id
@@ -462,9 +463,10 @@ async def list_voices(
         raise HTTPException(status_code=503, detail="TTS service not configured")
 
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
+        async with provider_client("elevenlabs", timeout=15.0) as client:
             response = await client.get(
                 f"{ELEVENLABS_BASE_URL}/voices",
+                timeout=15.0,
                 headers={"xi-api-key": api_key},
             )
 
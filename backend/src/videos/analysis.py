@@ -13,6 +13,8 @@ from core.config import get_mistral_key
 from core.config import MISTRAL_INTERNAL_MODEL
 from core.llm_provider import llm_complete
 from core.http_client import shared_http_client
+from core.llm_limiter import llm_limiter
+from core.logging import logger
 
 try:
     from core.cache import cache_service, make_cache_key
@@ -1042,11 +1044,13 @@ def detect_category(
     tags_lower = [t.lower() for t in tags]
     transcript_lower = transcript[:8000].lower() if transcript else ""
 
-    print("🏷️ [CATEGORY DETECTION v3.0]", flush=True)
-    print(f"   📺 Channel: {channel}", flush=True)
-    print(f"   🎬 Title: {title[:60]}...", flush=True)
-    print(f"   🏷️ Tags: {tags[:5]}...", flush=True)
-    print(f"   📂 YT Categories: {youtube_categories}", flush=True)
+    logger.debug(
+        "🏷️ [CATEGORY DETECTION v3.0] Inputs",
+        channel=channel,
+        title=title[:60],
+        tags=tags[:5],
+        youtube_categories=youtube_categories,
+    )
 
     # ═══════════════════════════════════════════════════════════════════════
     # 1. CHAÎNE CONNUE (PRIORITÉ MAXIMALE)
@@ -1054,7 +1058,12 @@ def detect_category(
     for cat_id, channels in KNOWN_CHANNELS.items():
         for known_channel in channels:
             if known_channel in channel_lower:
-                print(f"   ✅ MATCH: Known channel '{known_channel}' → {cat_id} (confidence: 0.95)", flush=True)
+                logger.info(
+                    "🏷️ [CATEGORY DETECTION] Known channel match",
+                    category=cat_id,
+                    channel=known_channel,
+                    confidence=0.95,
+                )
                 return cat_id, 0.95
 
     # ═══════════════════════════════════════════════════════════════════════
@@ -1064,7 +1073,12 @@ def detect_category(
         if yt_cat in YOUTUBE_CATEGORY_MAPPING:
             mapped_cat = YOUTUBE_CATEGORY_MAPPING[yt_cat]
             if mapped_cat != "general":
-                print(f"   ✅ MATCH: YouTube category '{yt_cat}' → {mapped_cat} (confidence: 0.85)", flush=True)
+                logger.info(
+                    "🏷️ [CATEGORY DETECTION] YouTube category match",
+                    category=mapped_cat,
+                    youtube_category=yt_cat,
+                    confidence=0.85,
+                )
                 return mapped_cat, 0.85
 
     # ═══════════════════════════════════════════════════════════════════════
@@ -1116,7 +1130,7 @@ def detect_category(
     # 4. SÉLECTION DU MEILLEUR
     # ═══════════════════════════════════════════════════════════════════════
     if not scores:
-        print("   ⚠️ No matches found → general (confidence: 0.50)", flush=True)
+        logger.info("🏷️ [CATEGORY DETECTION] No keyword match", category="general", confidence=0.50)
         return "general", 0.50
 
     # Trier par score
@@ -1125,11 +1139,6 @@ def detect_category(
     best_score = sorted_cats[0][1]["score"]
     sorted_cats[0][1]["matches"]
 
-    # Log des top 3
-    print("   📊 Top categories:", flush=True)
-    for cat, info in sorted_cats[:3]:
-        print(f"      - {cat}: score={info['score']} matches={info['matches'][:5]}", flush=True)
-
     # Calculer la confiance
     if len(sorted_cats) > 1:
         second_score = sorted_cats[1][1]["score"]
@@ -1138,7 +1147,12 @@ def detect_category(
     else:
         confidence = min(0.90, 0.60 + (min(best_score, 25) * 0.012))
 
-    print(f"   ✅ SELECTED: {best_cat} (confidence: {confidence:.2f})", flush=True)
+    logger.info(
+        "🏷️ [CATEGORY DETECTION] Keyword scoring",
+        category=best_cat,
+        confidence=round(confidence, 2),
+        top={cat: {"score": info["score"], "matches": info["matches"][:5]} for cat, info in sorted_cats[:3]},
+    )
 
     return best_cat, confidence
 
@@ -2020,21 +2034,21 @@ async def generate_summary(
         try:
             cached = await cache_service.get(cache_key)
             if cached:
-                print(f"💾 Cache HIT for analysis:{video_id}:{mode}", flush=True)
+                logger.info(f"💾 Cache HIT for analysis:{video_id}:{mode}")
                 return cached
         except Exception:
             pass
 
     api_key = api_key or get_mistral_key()
     if not api_key:
-        print("❌ Mistral API key not configured", flush=True)
+        logger.error("❌ Mistral API key not configured")
         return None
 
-    print(f"🧠 Generating summary with {model}...", flush=True)
-    print(f"   Title: {title[:60]}...", flush=True)
-    print(f"   Category: {category}, Mode: {mode}, Lang: {lang}", flush=True)
+    logger.info(f"🧠 Generating summary with {model}...")
+    logger.debug(f"   Title: {title[:60]}...")
+    logger.debug(f"   Category: {category}, Mode: {mode}, Lang: {lang}")
     if web_context:
-        print(f"   📡 Web context provided: {len(web_context)} chars", flush=True)
+        logger.debug(f"   📡 Web context provided: {len(web_context)} chars")
 
     system_prompt, user_prompt = build_analysis_prompt(
         title=title,
@@ -2130,14 +2144,14 @@ async def generate_summary(
         summary = result.content
         word_count = len(summary.split())
         fallback_info = f" [fallback: {result.provider}:{result.model_used}]" if result.fallback_used else ""
-        print(f"✅ Summary generated: {word_count} words, {result.tokens_total} tokens{fallback_info}", flush=True)
+        logger.info(f"✅ Summary generated: {word_count} words, {result.tokens_total} tokens{fallback_info}")
 
         # Cache the result
         if CACHE_AVAILABLE and video_id:
             try:
                 cache_key = make_cache_key("analysis", video_id, mode, model)
                 await cache_service.set(cache_key, summary)
-                print(f"💾 Analysis cached: {cache_key}", flush=True)
+                logger.info(f"💾 Analysis cached: {cache_key}")
             except Exception:
                 pass
         return summary
@@ -2181,17 +2195,20 @@ Summary:
 
     try:
         async with shared_http_client() as client:
-            response = await client.post(
-                "https://api.mistral.ai/v1/chat/completions",
-                headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
-                json={
-                    "model": MISTRAL_INTERNAL_MODEL,
-                    "messages": [{"role": "user", "content": f"{prompt}\n\n{summary[:3000]}"}],
-                    "temperature": 0.1,
-                    "max_tokens": 500,
-                },
-                timeout=30,
-            )
+            # Classe de priorité héritée du contexte (batch dans les pipelines de fond)
+            async with llm_limiter.slot(f"mistral:{MISTRAL_INTERNAL_MODEL}") as slot:
+                response = await client.post(
+                    "https://api.mistral.ai/v1/chat/completions",
+                    headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+                    json={
+                        "model": MISTRAL_INTERNAL_MODEL,
+                        "messages": [{"role": "user", "content": f"{prompt}\n\n{summary[:3000]}"}],
+                        "temperature": 0.1,
+                        "max_tokens": 500,
+                    },
+                    timeout=30,
+                )
+                slot.observe(response.status_code)
 
             if response.status_code == 200:
                 content = response.json()["choices"][0]["message"]["content"]
@@ -2205,7 +2222,7 @@ Summary:
 
                 return json.loads(content)
     except Exception as e:
-        print(f"⚠️ Entity extraction error: {e}", flush=True)
+        logger.warning(f"⚠️ Entity extraction error: {e}")
 
     return None
 
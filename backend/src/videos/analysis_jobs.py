@@ -0,0 +1,101 @@
+"""
+╔════════════════════════════════════════════════════════════════════════════════════╗
+║  🧵 ANALYSIS JOBS — Analyses vidéo exécutées par core.job_queue                    ║
+╠════════════════════════════════════════════════════════════════════════════════════╣
+║  /analyze, /analyze/v2 et /analyze/v2.1 mettent l'analyse en file (job id =        ║
+║  task id) au lieu de BackgroundTasks : un redéploiement n'annule plus les          ║
+║  analyses en cours, elles reprennent sur un autre worker au dernier checkpoint.    ║
+║                                                                                    ║
+║  Checkpoints (cf _analyze_video_background_*) :                                    ║
+║    transcript → infos vidéo + transcript                                           ║
+║    chunks     → LongVideoResult (vidéos longues)                                   ║
+║    synthesis  → résumé généré + catégorie                                          ║
+║    extras     → summary_id : crédits consommés et résumé sauvegardé, seules les    ║
+║                 finitions (index, chunks DB, images, notification) sont rejouées   ║
+╚════════════════════════════════════════════════════════════════════════════════════╝
+"""
+
+import asyncio
+from typing import Any, Dict
+
+from core.job_queue import current_job, job_queue
+from core.logging import logger
+from core.task_store import task_store as _task_store
+
+# kind du job (= task_type en DB) → fonction de videos.router
+ANALYSIS_JOBS = {
+    "video_analysis": "_analyze_video_background_v6",
+    "video_analysis_v2": "_analyze_video_background_v2",
+    "video_analysis_v2.1": "_analyze_video_background_v2_1",
+}
+
+
+async def enqueue_analysis(kind: str, **kwargs: Any) -> str:
+    """Met une analyse en file ; ``kwargs`` = arguments de la fonction d'analyse."""
+    return await job_queue.enqueue(kind, kwargs, job_id=kwargs["task_id"], plan=kwargs.get("user_plan"))
+
+
+async def cancel_queued_analysis(task_id: str) -> bool:
+    return await job_queue.cancel(task_id)
+
+
+async def _ensure_task_state(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Le worker qui exécute le job n'est pas forcément celui qui a créé la tâche."""
+    task_id = payload["task_id"]
+    task = await _task_store.aget(task_id)
+    if task is None:
+        _task_store[task_id] = {
+            "status": "pending",
+            "progress": 0,
+            "message": "Initializing...",
+            "user_id": payload["user_id"],
+            "video_id": payload.get("video_id"),
+            "credit_cost": payload.get("credit_cost"),
+        }
+        task = _task_store[task_id]
+    return task
+
+
+def _make_handler(function_name: str):
+    async def run(payload: Dict[str, Any]) -> None:
+        # Résolu à l'exécution : videos.router importe ce module
+        from videos import router as videos_router
+
+        task = await _ensure_task_state(payload)
+        if task.get("status") == "cancelled":
+            return  # Annulée pendant l'attente (crédits déjà libérés par /cancel)
+        job = current_job()
+        if job is not None and job.resumed:
+            task.update({"status": "processing", "message": "⏯️ Reprise de l'analyse..."})
+        try:
+            await getattr(videos_router, function_name)(**payload)
+        except asyncio.CancelledError:
+            # Arrêt du worker : le job est remis en file et reprendra au dernier checkpoint
+            if task.get("status") == "processing":
+                task.update({"status": "pending", "message": "⏸️ Analyse en pause, reprise imminente..."})
+                await _task_store.force_flush()
+            raise
+
+    return run
+
+
+async def _abandon(payload: Dict[str, Any]) -> None:
+    """Job abandonné (workers tombés à chaque tentative) : tâche en échec, crédits rendus."""
+    from db.database import async_session_maker
+    from videos import router as videos_router
+
+    task_id = payload["task_id"]
+    message = "L'analyse a été interrompue à plusieurs reprises, veuillez réessayer"
+    task = await _ensure_task_state(payload)
+    task.update({"status": "failed", "progress": 0, "message": message, "error": message})
+    if videos_router.SECURITY_AVAILABLE:
+        await videos_router.release_reserved_credits(payload["user_id"], task_id)
+    try:
+        async with async_session_maker() as session:
+            await videos_router.update_task_status(session, task_id, status="failed", progress=0, error=message)
+    except Exception as e:
+        logger.warning("Abandoned analysis: DB status update failed", task_id=task_id, error=str(e)[:120])
+
+
+for _kind, _function_name in ANALYSIS_JOBS.items():
+    job_queue.register(_kind, _make_handler(_function_name), on_abandoned=_abandon)
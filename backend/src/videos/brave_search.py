@@ -16,6 +16,7 @@ from dataclasses import dataclass
 
 from core.config import get_brave_key
 from core.http_client import shared_http_client
+from core.logging import logger
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -195,7 +196,7 @@ async def get_brave_factcheck_context(
     """
     api_key = get_brave_key()
     if not api_key:
-        print("⏭️ [BRAVE] Skipped — no API key", flush=True)
+        logger.info("⏭️ [BRAVE] Skipped — no API key")
         return None, []
 
     # Générer les requêtes intelligentes
@@ -209,7 +210,7 @@ async def get_brave_factcheck_context(
     if not queries:
         return None, []
 
-    print(f"🦁 [BRAVE] Running {len(queries)} fact-check queries...", flush=True)
+    logger.info(f"🦁 [BRAVE] Running {len(queries)} fact-check queries...")
 
     # Exécuter les recherches en parallèle (asyncio.gather)
     import asyncio
@@ -226,10 +227,10 @@ async def get_brave_factcheck_context(
 
     for r in results:
         if isinstance(r, Exception):
-            print(f"⚠️ [BRAVE] Query error: {r}", flush=True)
+            logger.warning(f"⚠️ [BRAVE] Query error: {r}")
             continue
         if not r.success:
-            print(f"⚠️ [BRAVE] Query '{r.query[:50]}' failed: {r.error}", flush=True)
+            logger.warning(f"⚠️ [BRAVE] Query '{r.query[:50]}' failed: {r.error}")
             continue
 
         context_parts.append(f'🔎 Recherche: "{r.query}"\n{r.snippets}')
@@ -240,7 +241,7 @@ async def get_brave_factcheck_context(
                 all_sources.append(src)
 
     if not context_parts:
-        print("⚠️ [BRAVE] No usable results from any query", flush=True)
+        logger.warning("⚠️ [BRAVE] No usable results from any query")
         return None, []
 
     # Formater le contexte final
@@ -254,7 +255,7 @@ async def get_brave_factcheck_context(
     )
 
     success_count = sum(1 for r in results if isinstance(r, BraveSearchResult) and r.success)
-    print(f"✅ [BRAVE] {success_count}/{len(queries)} queries OK — {len(all_sources)} unique sources", flush=True)
+    logger.info(f"✅ [BRAVE] {success_count}/{len(queries)} queries OK — {len(all_sources)} unique sources")
 
     return context_text, all_sources
 
@@ -314,7 +315,7 @@ async def get_brave_deep_research_context(
     """🔬 Deep Research: 5 requêtes × 8 résultats = ~40 sources."""
     api_key = get_brave_key()
     if not api_key:
-        print("⏭️ [BRAVE DEEP] Skipped — no API key", flush=True)
+        logger.info("⏭️ [BRAVE DEEP] Skipped — no API key")
         return None, []
 
     queries = generate_deep_research_queries(
@@ -327,7 +328,7 @@ async def get_brave_deep_research_context(
     if not queries:
         return None, []
 
-    print(f"🦁🔬 [BRAVE DEEP] Running {len(queries)} deep research queries (8 results each)...", flush=True)
+    logger.info(f"🦁🔬 [BRAVE DEEP] Running {len(queries)} deep research queries (8 results each)...")
 
     import asyncio
 
@@ -344,10 +345,10 @@ async def get_brave_deep_research_context(
     for i, r in enumerate(results):
         cat = categories[i] if i < len(categories) else f"🔎 Recherche {i + 1}"
         if isinstance(r, Exception):
-            print(f"⚠️ [BRAVE DEEP] Query {i + 1} error: {r}", flush=True)
+            logger.warning(f"⚠️ [BRAVE DEEP] Query {i + 1} error: {r}")
             continue
         if not r.success:
-            print(f"⚠️ [BRAVE DEEP] Query failed: {r.error}", flush=True)
+            logger.warning(f"⚠️ [BRAVE DEEP] Query failed: {r.error}")
             continue
 
         context_parts.append(f'{cat}: "{r.query}"\n{r.snippets}')
@@ -359,7 +360,7 @@ async def get_brave_deep_research_context(
                 all_sources.append(src)
 
     if not context_parts:
-        print("⚠️ [BRAVE DEEP] No usable results", flush=True)
+        logger.warning("⚠️ [BRAVE DEEP] No usable results")
         return None, []
 
     context_text = (
@@ -369,6 +370,6 @@ async def get_brave_deep_research_context(
     )
 
     success_count = sum(1 for r in results if isinstance(r, BraveSearchResult) and r.success)
-    print(f"✅ [BRAVE DEEP] {success_count}/{len(queries)} queries OK — {len(all_sources)} unique sources", flush=True)
+    logger.info(f"✅ [BRAVE DEEP] {success_count}/{len(queries)} queries OK — {len(all_sources)} unique sources")
 
     return context_text, all_sources
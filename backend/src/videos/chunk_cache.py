@@ -0,0 +1,258 @@
+"""
+╔════════════════════════════════════════════════════════════════════════════════════╗
+║  🧩 CHUNK ANALYSIS CACHE — Analyses LLM par chunk adressées par contenu            ║
+╠════════════════════════════════════════════════════════════════════════════════════╣
+║  Clé = sha256(kind, version du prompt, modèle, langue, mode,                       ║
+║               hash du texte du chunk, hash du contexte de prompt)                  ║
+║                                                                                    ║
+║  L1: Redis via core.cache.cache_service (TTL 3j)                                   ║
+║  L2: PostgreSQL chunk_analysis_cache (persistant, cross-user, TTL 90j)             ║
+║                                                                                    ║
+║  → une ré-analyse (autre mode/langue/utilisateur, retry) ne paie que les chunks    ║
+║    dont le texte ou le prompt a changé                                             ║
+║  → ChunkCacheStats par analyse + compteurs Redis agrégés par kind                  ║
+╚════════════════════════════════════════════════════════════════════════════════════╝
+
+Usage:
+    from videos.chunk_cache import ChunkCacheStats, chunk_analysis_cache, chunk_cache_key
+
+    key = chunk_cache_key(
+        "long_video_chunk", text=chunk.text, template_version="v3.0", model=model, lang="fr", context=ctx
+    )
+    payload = await chunk_analysis_cache.get(key, stats)
+    if payload is None:
+        payload = await call_llm(...)
+        await chunk_analysis_cache.set(key, payload, kind="long_video_chunk", model=model, stats=stats)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from core.logging import logger
+
+CHUNK_CACHE_ENABLED = os.environ.get("CHUNK_CACHE_ENABLED", "true").lower() == "true"
+L1_TTL_SECONDS = int(os.environ.get("CHUNK_CACHE_L1_TTL_S", str(3 * 86400)))
+L2_TTL_DAYS = int(os.environ.get("CHUNK_CACHE_L2_TTL_DAYS", "90"))
+
+_METRIC_FIELDS = ("l1_hits", "l2_hits", "misses", "stores")
+
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def chunk_cache_key(
+    kind: str,
+    *,
+    text: str,
+    template_version: str,
+    model: str,
+    lang: Optional[str] = None,
+    mode: Optional[str] = None,
+    context: str = "",
+) -> str:
+    """
+    Adresse de contenu d'une analyse de chunk. ``lang``/``mode`` à None quand le
+    prompt n'en dépend pas (l'entrée est alors partagée entre langues/modes) ;
+    ``context`` = tout ce qui entre dans le prompt en plus du texte (titre,
+    position du chunk, plage horaire...).
+    """
+    parts = [kind, template_version, model, lang or "*", mode or "*", _sha256(text), _sha256(context)]
+    return _sha256("|".join(parts))
+
+
+@dataclass
+class ChunkCacheStats:
+    """Compteurs d'une analyse (un appel analyze_chunks_parallel / process_video_chunks)."""
+
+    l1_hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.l1_hits + self.l2_hits
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return round(self.hits / self.lookups, 3) if self.lookups else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": self.hit_rate,
+        }
+
+
+class ChunkAnalysisCache:
+    """Orchestrateur L1 (Redis) + L2 (PostgreSQL) ; toute erreur de cache = miss."""
+
+    L1_NAMESPACE = "chunk_analysis"
+
+    def __init__(self, enabled: bool = CHUNK_CACHE_ENABLED):
+        self.enabled = enabled
+
+    @classmethod
+    def _l1_key(cls, key: str) -> str:
+        return f"{cls.L1_NAMESPACE}:{key}"
+
+    async def get(self, key: str, stats: Optional[ChunkCacheStats] = None, kind: str = "") -> Optional[dict]:
+        if not self.enabled:
+            return None
+        from core.cache import cache_service
+
+        # ── L1 ────────────────────────────────────────────────────────
+        try:
+            payload = await cache_service.get(self._l1_key(key))
+        except Exception as exc:
+            logger.warning("Chunk cache L1 read failed", error=str(exc)[:120])
+            payload = None
+        if isinstance(payload, dict):
+            await self._count("l1_hits", stats, kind)
+            return payload
+
+        # ── L2 ────────────────────────────────────────────────────────
+        payload = await self._db_get(key)
+        if payload is None:
+            await self._count("misses", stats, kind)
+            return None
+
+        await self._count("l2_hits", stats, kind)
+        try:
+            await cache_service.set(self._l1_key(key), payload, ttl=L1_TTL_SECONDS)
+        except Exception as exc:
+            logger.warning("Chunk cache L1 warm failed", error=str(exc)[:120])
+        return payload
+
+    async def set(
+        self,
+        key: str,
+        payload: dict,
+        *,
+        kind: str,
+        model: str,
+        stats: Optional[ChunkCacheStats] = None,
+    ) -> None:
+        if not self.enabled:
+            return
+        from core.cache import cache_service
+
+        try:
+            await cache_service.set(self._l1_key(key), payload, ttl=L1_TTL_SECONDS)
+        except Exception as exc:
+            logger.warning("Chunk cache L1 write failed", error=str(exc)[:120])
+        await self._db_set(key, payload, kind=kind, model=model)
+        await self._count("stores", stats, kind)
+
+    # -----------------------------------------------------------------
+    # L2 (PostgreSQL)
+    # -----------------------------------------------------------------
+
+    async def _db_get(self, key: str) -> Optional[dict]:
+        try:
+            from db.database import ChunkAnalysisCache as Row, async_session_maker
+
+            async with async_session_maker() as session:
+                row = await session.get(Row, key)
+                if row is None:
+                    return None
+                expires_at = row.expires_at
+                # SQLite (et certains drivers) renvoient des datetimes naïfs → UTC
+                if expires_at.tzinfo is None:
+                    expires_at = expires_at.replace(tzinfo=timezone.utc)
+                if expires_at <= datetime.now(timezone.utc):
+                    return None
+                row.hit_count = (row.hit_count or 0) + 1
+                payload = json.loads(row.payload)
+                await session.commit()
+                return payload
+        except Exception as exc:
+            logger.warning("Chunk cache L2 read failed", error=str(exc)[:120])
+            return None
+
+    async def _db_set(self, key: str, payload: dict, *, kind: str, model: str) -> None:
+        try:
+            from db.database import ChunkAnalysisCache as Row, async_session_maker
+
+            expires_at = (datetime.now(timezone.utc) + timedelta(days=L2_TTL_DAYS)).replace(tzinfo=None)
+            async with async_session_maker() as session:
+                await session.merge(
+                    Row(
+                        cache_key=key,
+                        kind=kind,
+                        model_used=model[:50],
+                        payload=json.dumps(payload, ensure_ascii=False),
+                        hit_count=0,
+                        expires_at=expires_at,
+                    )
+                )
+                await session.commit()
+        except Exception as exc:
+            logger.warning("Chunk cache L2 write failed", error=str(exc)[:120])
+
+    # -----------------------------------------------------------------
+    # Métriques
+    # -----------------------------------------------------------------
+
+    @staticmethod
+    async def _count(field: str, stats: Optional[ChunkCacheStats], kind: str) -> None:
+        if stats is not None:
+            setattr(stats, field, getattr(stats, field) + 1)
+        try:
+            from core.cache import cache_service
+
+            if cache_service.is_redis:
+                await cache_service.backend.redis.incr(f"deepsight:stats:chunk_cache:{kind or 'all'}:{field}")
+        except Exception as exc:
+            logger.debug(f"Chunk cache metrics error for {field}: {exc}")
+
+
+async def get_chunk_cache_metrics() -> Dict[str, Dict[str, Any]]:
+    """Compteurs agrégés (tous workers) par kind, avec hit rate."""
+    from core.cache import cache_service
+
+    metrics: Dict[str, Dict[str, Any]] = {}
+    if not cache_service.is_redis:
+        return metrics
+    try:
+        redis = cache_service.backend.redis
+        keys = [k async for k in redis.scan_iter(match="deepsight:stats:chunk_cache:*")]
+        values = await redis.mget(keys) if keys else []
+    except Exception as exc:
+        logger.debug(f"Chunk cache metrics read error: {exc}")
+        return metrics
+
+    for key, value in zip(keys, values):
+        _, _, _, kind, field = key.split(":", 4)
+        metrics.setdefault(kind, {f: 0 for f in _METRIC_FIELDS})[field] = int(value or 0)
+    for counters in metrics.values():
+        hits = counters["l1_hits"] + counters["l2_hits"]
+        lookups = hits + counters["misses"]
+        counters["hit_rate"] = round(hits / lookups, 3) if lookups else 0.0
+    return metrics
+
+
+chunk_analysis_cache = ChunkAnalysisCache()
+
+
+__all__ = [
+    "ChunkAnalysisCache",
+    "ChunkCacheStats",
+    "chunk_analysis_cache",
+    "chunk_cache_key",
+    "get_chunk_cache_metrics",
+]
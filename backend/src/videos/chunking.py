@@ -26,8 +26,11 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config import get_mistral_key
+from core.llm_limiter import llm_limiter
 from core.logging import logger
 from core.config import MISTRAL_INTERNAL_MODEL
+from videos.chunk_cache import ChunkCacheStats, chunk_analysis_cache, chunk_cache_key
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # ⚙️ CONFIGURATION
@@ -59,7 +62,9 @@ MAX_CHUNK_CHARS = 15000  # Max chars per chunk before truncation
 MIN_CHUNK_CHARS = 500  # Min chars for a chunk to be worth summarizing
 MAX_DIGEST_CHARS = 1000  # Target chars per chunk digest (with timestamps)
 MAX_FULL_DIGEST_CHARS = 10000  # Target chars for assembled full digest
-MAX_CONCURRENT_DIGESTS = 5  # Parallel Mistral calls limit
+MAX_CONCURRENT_DIGESTS = 5  # Per-call fan-out cap; cluster-wide concurrency is core.llm_limiter
+# Bump whenever the digest prompt changes (invalidates the chunk digest cache)
+DIGEST_PROMPT_VERSION = "v1.0"
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -321,7 +326,9 @@ def chunk_transcript(transcript: str, video_duration_seconds: int) -> List[Chunk
 # ═══════════════════════════════════════════════════════════════════════════════
 
 
-async def digest_chunk(chunk: ChunkData, video_title: str, category: str = "general") -> str:
+async def digest_chunk(
+    chunk: ChunkData, video_title: str, category: str = "general", cache_stats: Optional[ChunkCacheStats] = None
+) -> str:
     """
     Summarize a single transcript chunk using Mistral Small.
 
@@ -338,13 +345,27 @@ async def digest_chunk(chunk: ChunkData, video_title: str, category: str = "gene
 
     Returns:
         Chunk digest string (~500-800 chars)
-    """
-    client = Mistral(api_key=get_mistral_key())
 
+    Digests are content-addressed (chunk text, prompt version, model, title and
+    time range): re-digesting an unchanged chunk is served from the cache.
+    """
     # Truncate chunk text if excessively long
     text = chunk.text[:MAX_CHUNK_CHARS]
     time_range = _format_time(chunk.start_seconds) + " → " + _format_time(chunk.end_seconds)
 
+    cache_key = chunk_cache_key(
+        "chunk_digest",
+        text=text,
+        template_version=DIGEST_PROMPT_VERSION,
+        model=DIGEST_MODEL,
+        context=f"{video_title}|{chunk.start_seconds}|{chunk.end_seconds}",
+    )
+    cached = await chunk_analysis_cache.get(cache_key, cache_stats, kind="chunk_digest")
+    if cached and cached.get("digest"):
+        return cached["digest"]
+
+    client = Mistral(api_key=get_mistral_key())
+
     prompt = f"""Résume ce segment de la vidéo "{video_title}" ({time_range}).
 
 SEGMENT:
@@ -363,17 +384,24 @@ EXEMPLE DE FORMAT:
 [{_format_time(chunk.start_seconds)}] L'auteur explique que... Puis vers [{_format_time((chunk.start_seconds + chunk.end_seconds) // 2)}], il aborde..."""
 
     try:
-        response = await client.chat.complete_async(
-            model=DIGEST_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=700,
-            temperature=0.3,
-        )
+        # Background digests yield to interactive chat (cluster-wide AIMD limiter)
+        async with llm_limiter.slot(f"mistral:{DIGEST_MODEL}", "batch") as slot:
+            response = await client.chat.complete_async(
+                model=DIGEST_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=700,
+                temperature=0.3,
+            )
+            slot.observe(200)
         digest = response.choices[0].message.content.strip()
         logger.info(
             "Chunk digest complete",
             extra={"chunk_index": chunk.index, "digest_chars": len(digest), "time_range": time_range},
         )
+        if digest:
+            await chunk_analysis_cache.set(
+                cache_key, {"digest": digest}, kind="chunk_digest", model=DIGEST_MODEL, stats=cache_stats
+            )
         return digest
     except Exception as e:
         logger.error("Failed to digest chunk", extra={"chunk_index": chunk.index, "error": str(e)})
@@ -464,6 +492,13 @@ EXEMPLE de conservation des timecodes:
 # ═══════════════════════════════════════════════════════════════════════════════
 
 
+async def _invalidate_chat_context(summary_id: int) -> None:
+    """A new full_digest makes the cached chat RichContext stale."""
+    from chat.context_builder import invalidate_rich_context
+
+    await invalidate_rich_context(summary_id)
+
+
 async def process_video_chunks(
     transcript: str, video_duration: int, video_title: str, summary_id: int, db: AsyncSession, category: str = "general"
 ) -> str:
@@ -506,16 +541,20 @@ async def process_video_chunks(
 
     # Step 2: Digest each chunk in parallel (with concurrency limit)
     semaphore = asyncio.Semaphore(MAX_CONCURRENT_DIGESTS)
+    cache_stats = ChunkCacheStats()
 
     async def digest_with_semaphore(chunk: ChunkData) -> ChunkData:
         async with semaphore:
-            chunk.digest = await digest_chunk(chunk, video_title, category)
+            chunk.digest = await digest_chunk(chunk, video_title, category, cache_stats)
             return chunk
 
     tasks = [digest_with_semaphore(c) for c in chunks]
     chunks = await asyncio.gather(*tasks)
 
-    logger.info("All chunks digested", extra={"summary_id": summary_id, "chunk_count": len(chunks)})
+    logger.info(
+        "All chunks digested",
+        extra={"summary_id": summary_id, "chunk_count": len(chunks), "chunk_cache": cache_stats.to_dict()},
+    )
 
     # Step 3: Store chunks in DB
     for chunk in chunks:
@@ -543,6 +582,7 @@ async def process_video_chunks(
         summary.full_digest = full_digest
 
     await db.commit()
+    await _invalidate_chat_context(summary_id)
 
     logger.info(
         "Chunking pipeline complete",
@@ -611,11 +651,12 @@ async def build_full_digest_from_existing_chunks(
     if needs_digesting:
         logger.info("digesting_missing_chunks", extra={"summary_id": summary_id})
         semaphore = asyncio.Semaphore(MAX_CONCURRENT_DIGESTS)
+        cache_stats = ChunkCacheStats()
 
         async def digest_if_missing(chunk: ChunkData) -> ChunkData:
             if not chunk.digest and chunk.text:
                 async with semaphore:
-                    chunk.digest = await digest_chunk(chunk, video_title, category)
+                    chunk.digest = await digest_chunk(chunk, video_title, category, cache_stats)
                     # Mettre à jour en DB aussi
                     for db_c in db_chunks:
                         if db_c.chunk_index == chunk.index:
@@ -626,6 +667,7 @@ async def build_full_digest_from_existing_chunks(
         tasks = [digest_if_missing(c) for c in chunks_data]
         chunks_data = await asyncio.gather(*tasks)
         await db.flush()
+        logger.info("missing_chunks_digested", extra={"summary_id": summary_id, "chunk_cache": cache_stats.to_dict()})
 
     # Assembler le full_digest
     full_digest = await build_full_digest(chunks_data, video_title, video_duration, category)
@@ -637,6 +679,7 @@ async def build_full_digest_from_existing_chunks(
         summary.full_digest = full_digest
 
     await db.commit()
+    await _invalidate_chat_context(summary_id)
 
     logger.info(
         "digest_from_existing_chunks_complete",
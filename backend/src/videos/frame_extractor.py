@@ -13,19 +13,17 @@
 ╚════════════════════════════════════════════════════════════════════════════════════╝
 """
 
-import asyncio
 import json
 import logging
 import os
 import shutil
-import subprocess
 import time
 import uuid
-from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from core.media_process import MediaProcessTimeout, run_media_process
 from transcripts.audio_utils import _yt_dlp_extra_args
 
 logger = logging.getLogger(__name__)
@@ -92,9 +90,6 @@ MAX_VIDEO_FILESIZE = "200M"  # yt-dlp --max-filesize
 # télécharger en 1080p si on output en 512px).
 YTDLP_FORMAT = "best[height<=720][ext=mp4]/best[height<=720]/best[ext=mp4]/best"
 
-executor = ThreadPoolExecutor(max_workers=2)
-
-
 # ═══════════════════════════════════════════════════════════════════════════════
 # 📦 RESULT TYPE
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -192,7 +187,7 @@ def compute_frame_budget(
 # ═══════════════════════════════════════════════════════════════════════════════
 
 
-def _ffprobe_duration(video_path: str) -> Optional[float]:
+async def _ffprobe_duration(video_path: str) -> Optional[float]:
     """Renvoie la durée de la vidéo en secondes via ffprobe. None si erreur."""
     try:
         cmd = [
@@ -205,11 +200,11 @@ def _ffprobe_duration(video_path: str) -> Optional[float]:
             "json",
             video_path,
         ]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=FFPROBE_TIMEOUT_S)
-        if result.returncode != 0:
-            logger.warning("[FRAME_EXTRACT] ffprobe failed: %s", result.stderr[:200])
+        result = await run_media_process(cmd, timeout=FFPROBE_TIMEOUT_S)
+        if not result.ok:
+            logger.warning("[FRAME_EXTRACT] ffprobe failed: %s", result.stderr_text[:200])
             return None
-        data = json.loads(result.stdout or "{}")
+        data = json.loads(result.text or "{}")
         duration_str = data.get("format", {}).get("duration")
         if not duration_str:
             return None
@@ -224,7 +219,7 @@ def _ffprobe_duration(video_path: str) -> Optional[float]:
 # ═══════════════════════════════════════════════════════════════════════════════
 
 
-def _download_video_sync(url: str, dest_dir: str, log_tag: str) -> Optional[str]:
+async def _download_video(url: str, dest_dir: str, log_tag: str) -> Optional[str]:
     """Télécharge la vidéo via yt-dlp. Renvoie le chemin du fichier ou None."""
     output_template = str(Path(dest_dir) / "video.%(ext)s")
     cmd = [
@@ -244,13 +239,13 @@ def _download_video_sync(url: str, dest_dir: str, log_tag: str) -> Optional[str]
     ]
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=DOWNLOAD_TIMEOUT_S)
-    except subprocess.TimeoutExpired:
+        result = await run_media_process(cmd, timeout=DOWNLOAD_TIMEOUT_S)
+    except MediaProcessTimeout:
         logger.warning("[%s] yt-dlp download timeout (%ds)", log_tag, DOWNLOAD_TIMEOUT_S)
         return None
 
-    if result.returncode != 0:
-        logger.warning("[%s] yt-dlp failed: %s", log_tag, result.stderr[:300])
+    if not result.ok:
+        logger.warning("[%s] yt-dlp failed: %s", log_tag, result.stderr_text[:300])
         return None
 
     # Trouver le fichier produit (extension variable selon le format)
@@ -267,7 +262,7 @@ def _download_video_sync(url: str, dest_dir: str, log_tag: str) -> Optional[str]
 # ═══════════════════════════════════════════════════════════════════════════════
 
 
-def _extract_frames_sync(
+async def _extract_frames(
     video_path: str,
     frames_dir: str,
     fps: float,
@@ -307,13 +302,13 @@ def _extract_frames_sync(
     )
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=FFMPEG_TIMEOUT_S)
-    except subprocess.TimeoutExpired:
+        result = await run_media_process(cmd, timeout=FFMPEG_TIMEOUT_S)
+    except MediaProcessTimeout:
         logger.warning("[%s] ffmpeg timeout (%ds)", log_tag, FFMPEG_TIMEOUT_S)
         return [], []
 
-    if result.returncode != 0:
-        logger.warning("[%s] ffmpeg failed: %s", log_tag, result.stderr[:300])
+    if not result.ok:
+        logger.warning("[%s] ffmpeg failed: %s", log_tag, result.stderr_text[:300])
         return [], []
 
     # Récupération + tri lexicographique = ordre chronologique grâce au padding
@@ -357,12 +352,10 @@ async def extract_frames_from_url(
     workdir = str(Path(FRAMES_BASE_DIR) / f"job_{uuid.uuid4().hex[:12]}")
     Path(workdir).mkdir(parents=True, exist_ok=True)
 
-    loop = asyncio.get_event_loop()
-
     try:
         # ── 1. Download vidéo ──
         t0 = time.time()
-        video_path = await loop.run_in_executor(executor, _download_video_sync, url, workdir, log_tag)
+        video_path = await _download_video(url, workdir, log_tag)
         if not video_path:
             shutil.rmtree(workdir, ignore_errors=True)
             return None
@@ -378,7 +371,7 @@ async def extract_frames_from_url(
             pass
 
         # ── 2. Durée ──
-        duration_s = await loop.run_in_executor(executor, _ffprobe_duration, video_path)
+        duration_s = await _ffprobe_duration(video_path)
         if not duration_s or duration_s <= 0:
             logger.warning("[%s] Could not determine duration, aborting", log_tag)
             shutil.rmtree(workdir, ignore_errors=True)
@@ -415,9 +408,7 @@ async def extract_frames_from_url(
         # ── 4. Extraction frames ──
         frames_dir = str(Path(workdir) / "frames")
         t0 = time.time()
-        paths, timestamps = await loop.run_in_executor(
-            executor,
-            _extract_frames_sync,
+        paths, timestamps = await _extract_frames(
             video_path,
             frames_dir,
             fps,
@@ -483,10 +474,8 @@ async def extract_frames_from_local(
     Path(workdir).mkdir(parents=True, exist_ok=True)
     frames_dir = str(Path(workdir) / "frames")
 
-    loop = asyncio.get_event_loop()
-
     try:
-        duration_s = await loop.run_in_executor(executor, _ffprobe_duration, video_path)
+        duration_s = await _ffprobe_duration(video_path)
         if not duration_s or duration_s <= 0:
             shutil.rmtree(workdir, ignore_errors=True)
             return None
@@ -506,9 +495,7 @@ async def extract_frames_from_local(
                 effective_duration = max(0.1, end - start)
             fps = min(MAX_FPS, target_frames / effective_duration)
 
-        paths, timestamps = await loop.run_in_executor(
-            executor,
-            _extract_frames_sync,
+        paths, timestamps = await _extract_frames(
             video_path,
             frames_dir,
             fps,
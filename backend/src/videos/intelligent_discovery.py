@@ -822,9 +822,8 @@ class QualityScorer:
         # Score normalisé > 0.55 signifie score brut > 10 (clairement positif)
         if candidate.tournesol_score > 0.55:
             candidate.is_tournesol_pick = True
-            print(
-                f"🌻 [AUTO-PICK] {candidate.video_id} marked as Tournesol pick (score={candidate.tournesol_score:.2f})",
-                flush=True,
+            logger.info(
+                f"🌻 [AUTO-PICK] {candidate.video_id} marked as Tournesol pick (score={candidate.tournesol_score:.2f})"
             )
 
         # Score final pondéré - RELEVANCE est le plus important !
@@ -997,7 +996,7 @@ class QualityScorer:
                     if raw_score is not None and raw_score != 0:
                         # Normaliser: -100 -> 0, 0 -> 0.5, +100 -> 1
                         normalized = (raw_score + 100) / 200
-                        print(f"🌻 [TOURNESOL] {video_id}: raw={raw_score}, normalized={normalized:.2f}", flush=True)
+                        logger.info(f"🌻 [TOURNESOL] {video_id}: raw={raw_score}, normalized={normalized:.2f}")
                         return max(0.0, min(1.0, normalized))
 
                 # Fallback: essayer l'ancienne API
@@ -1007,9 +1006,8 @@ class QualityScorer:
                     raw_score = data2.get("tournesol_score", 0)
                     if raw_score is not None and raw_score != 0:
                         normalized = (raw_score + 100) / 200
-                        print(
-                            f"🌻 [TOURNESOL] {video_id}: raw={raw_score}, normalized={normalized:.2f} (fallback)",
-                            flush=True,
+                        logger.info(
+                            f"🌻 [TOURNESOL] {video_id}: raw={raw_score}, normalized={normalized:.2f} (fallback)"
                         )
                         return max(0.0, min(1.0, normalized))
 
@@ -1470,7 +1468,7 @@ class TournesolPromotion:
         # Trouver une vidéo non exclue
         for video_data in FALLBACK_VIDEOS:
             if video_data["video_id"] not in exclude_ids:
-                print(f"🌻 [FALLBACK] Using hardcoded: {video_data['title'][:40]}", flush=True)
+                logger.info(f"🌻 [FALLBACK] Using hardcoded: {video_data['title'][:40]}")
                 return VideoCandidate(
                     video_id=video_data["video_id"],
                     title=f"🌻 {video_data['title']}",
@@ -1076,7 +1076,7 @@ class IntelligentDiscoveryService:
         max_results = min(max_results, MAX_RESULTS_ABSOLUTE)
 
         logger.info(f"🔍 [DISCOVER v4.0] Query: '{query}' | Langs: {languages} | Max: {max_results}")
-        print(f"🔍 [DISCOVER v4.0] Starting parallel search: '{query}' (langs={languages})", flush=True)
+        logger.info(f"🔍 [DISCOVER v4.0] Starting parallel search: '{query}' (langs={languages})")
 
         # 1. Reformulation via Mistral AI
         reformulated = await MistralReprompt.reformulate(query, primary_lang)
@@ -1096,7 +1096,7 @@ class IntelligentDiscoveryService:
             if translated != query:
                 search_tasks.append((translated, lang))
 
-        print(f"🚀 [DISCOVER v4.0] Launching {len(search_tasks)} parallel searches...", flush=True)
+        logger.info(f"🚀 [DISCOVER v4.0] Launching {len(search_tasks)} parallel searches...")
 
         # 3. 🚀 Exécuter toutes les recherches en parallèle
         results_by_lang = await YouTubeSearcher.search_parallel(search_tasks)
@@ -1110,7 +1110,7 @@ class IntelligentDiscoveryService:
                 if candidate and candidate.video_id not in all_candidates:
                     all_candidates[candidate.video_id] = candidate
 
-        print(f"📊 [DISCOVER v4.0] Found {len(all_candidates)} unique candidates", flush=True)
+        logger.info(f"📊 [DISCOVER v4.0] Found {len(all_candidates)} unique candidates")
 
         # 5. 🚀 Scorer tous les candidats en batch parallèle
         candidates_list = list(all_candidates.values())
@@ -1158,7 +1158,7 @@ class IntelligentDiscoveryService:
         has_tournesol = any(c.is_tournesol_pick for c in final_candidates[:5])
 
         if not has_tournesol:
-            print("🌻 [DISCOVER v4.0] No Tournesol in top 5, fetching one...", flush=True)
+            logger.info("🌻 [DISCOVER v4.0] No Tournesol in top 5, fetching one...")
             existing_ids = [c.video_id for c in final_candidates]
             tournesol_pick = await TournesolPromotion.get_tournesol_pick(query, existing_ids)
 
@@ -1173,16 +1173,15 @@ class IntelligentDiscoveryService:
                 if len(final_candidates) > max_results:
                     final_candidates.pop()
 
-                print(f"🌻 [DISCOVER v4.0] Tournesol added at position {insert_pos + 1}", flush=True)
+                logger.info(f"🌻 [DISCOVER v4.0] Tournesol added at position {insert_pos + 1}")
 
         # 9. Stats par langue
         videos_per_lang = Counter(c.detected_language or c.search_language for c in final_candidates)
 
         duration_ms = int((time.time() - start_time) * 1000)
 
-        print(
-            f"✅ [DISCOVER v4.0] Completed in {duration_ms}ms | {len(final_candidates)} videos | By lang: {dict(videos_per_lang)}",
-            flush=True,
+        logger.info(
+            f"✅ [DISCOVER v4.0] Completed in {duration_ms}ms | {len(final_candidates)} videos | By lang: {dict(videos_per_lang)}"
         )
 
         return DiscoveryResultCompat(
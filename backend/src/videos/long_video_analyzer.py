@@ -22,10 +22,13 @@
 import re
 import asyncio
 from typing import List, Tuple, Optional, Dict, Any
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 
 from core.config import get_mistral_key
 from core.http_client import shared_http_client
+from core.llm_limiter import llm_limiter
+from core.logging import logger
+from videos.chunk_cache import ChunkCacheStats, chunk_analysis_cache, chunk_cache_key
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🔧 CONFIGURATION — OPTIMISÉE POUR TRAITEMENT COMPLET (même 3h+)
@@ -50,6 +53,10 @@ MAX_CONCURRENT_CHUNKS = 2  # Fallback si pas de tier
 
 CHUNK_TIMEOUT_SECONDS = 180  # Timeout 3 min par chunk
 
+# Version du prompt d'analyse de chunk — à incrémenter à chaque modification
+# de _build_chunk_prompts (invalide le cache d'analyses par chunk)
+CHUNK_PROMPT_VERSION = "v3.0"
+
 # GARANTIE 100% - PAS DE LIMITE sur le nombre de chunks
 MAX_CHUNKS = None  # Illimité - on traite TOUT le transcript
 
@@ -101,6 +108,7 @@ class AnalysisReport:
     coverage_percent: float
     failed_chunks: List[int] = field(default_factory=list)
     warnings: List[str] = field(default_factory=list)
+    cache: Dict[str, Any] = field(default_factory=dict)  # ChunkCacheStats.to_dict()
 
 
 @dataclass
@@ -116,6 +124,20 @@ class LongVideoResult:
     chunk_analyses: List[ChunkAnalysis] = field(default_factory=list)
     report: Optional[AnalysisReport] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Forme JSON (checkpoint « chunks » des jobs d'analyse)."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LongVideoResult":
+        report = data.get("report")
+        return cls(
+            summary=data["summary"],
+            chunks=[TranscriptChunk(**c) for c in data.get("chunks") or []],
+            chunk_analyses=[ChunkAnalysis(**a) for a in data.get("chunk_analyses") or []],
+            report=AnalysisReport(**report) if report else None,
+        )
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 📏 DÉTECTION ET DÉCOUPAGE
@@ -264,9 +286,9 @@ def split_into_chunks_with_real_timestamps(
     has_real_timestamps = len(real_segments) > 0
 
     if has_real_timestamps:
-        print(f"✅ [TIMESTAMPS] Found {len(real_segments)} real timestamps", flush=True)
+        logger.info(f"✅ [TIMESTAMPS] Found {len(real_segments)} real timestamps")
     else:
-        print("⚠️ [TIMESTAMPS] No real timestamps, using estimation", flush=True)
+        logger.warning("⚠️ [TIMESTAMPS] No real timestamps, using estimation")
 
     words = transcript.split()
     total_words = len(words)
@@ -388,15 +410,24 @@ async def analyze_chunk_with_retry(
     model: str = "mistral-small-2603",
     api_key: str = None,
     max_retries: int = MAX_RETRIES_PER_CHUNK,
+    cache_stats: Optional[ChunkCacheStats] = None,
 ) -> Optional[ChunkAnalysis]:
     """
     🔄 Analyse un chunk avec retry automatique en cas d'échec.
 
     GARANTIE: Tente jusqu'à max_retries fois avant d'abandonner.
+    Cache adressé par contenu : un chunk déjà analysé (même texte, même prompt,
+    même modèle) n'est pas renvoyé à Mistral.
     """
+    cache_key = _chunk_cache_key(chunk, video_title, category, lang, model)
+    cached = await chunk_analysis_cache.get(cache_key, cache_stats, kind="long_video_chunk")
+    if cached:
+        chunk.processed = True
+        return ChunkAnalysis(**{**cached, "chunk_index": chunk.index})
+
     api_key = api_key or get_mistral_key()
     if not api_key:
-        print(f"❌ [Chunk {chunk.index}] No API key!", flush=True)
+        logger.error(f"❌ [Chunk {chunk.index}] No API key!")
         return None
 
     last_error = None
@@ -416,8 +447,11 @@ async def analyze_chunk_with_retry(
             if result:
                 result.word_count_analyzed = chunk.word_count
                 chunk.processed = True
+                await chunk_analysis_cache.set(
+                    cache_key, asdict(result), kind="long_video_chunk", model=model, stats=cache_stats
+                )
                 if attempt > 0:
-                    print(f"✅ [Chunk {chunk.index}] Succeeded on attempt {attempt + 1}", flush=True)
+                    logger.info(f"✅ [Chunk {chunk.index}] Succeeded on attempt {attempt + 1}")
                 return result
             else:
                 last_error = "Empty result"
@@ -425,7 +459,7 @@ async def analyze_chunk_with_retry(
         except Exception as e:
             last_error = str(e)
             chunk.retry_count = attempt + 1
-            print(f"⚠️ [Chunk {chunk.index}] Attempt {attempt + 1}/{max_retries} failed: {e}", flush=True)
+            logger.warning(f"⚠️ [Chunk {chunk.index}] Attempt {attempt + 1}/{max_retries} failed: {e}")
 
         # Attendre avant de réessayer
         if attempt < max_retries - 1:
@@ -433,16 +467,39 @@ async def analyze_chunk_with_retry(
 
     # Échec après toutes les tentatives
     chunk.error = last_error
-    print(f"❌ [Chunk {chunk.index}] FAILED after {max_retries} attempts: {last_error}", flush=True)
+    logger.error(f"❌ [Chunk {chunk.index}] FAILED after {max_retries} attempts: {last_error}")
     return None
 
 
-async def _analyze_chunk_internal(
-    chunk: TranscriptChunk, video_title: str, category: str, lang: str, mode: str, model: str, api_key: str
-) -> Optional[ChunkAnalysis]:
+def _chunk_cache_key(chunk: TranscriptChunk, video_title: str, category: str, lang: str, model: str) -> str:
     """
-    Analyse interne d'un chunk (appelée par analyze_chunk_with_retry).
+    Clé de cache d'un chunk. Le prompt de chunk ne dépend pas du mode d'analyse
+    (le mode n'intervient qu'à la synthèse) → entrée partagée entre modes.
     """
+    context = "|".join(
+        str(part)
+        for part in (
+            video_title,
+            category,
+            chunk.index,
+            chunk.total_chunks,
+            chunk.start_time,
+            chunk.end_time,
+            chunk.word_count,
+        )
+    )
+    return chunk_cache_key(
+        "long_video_chunk",
+        text=chunk.text,
+        template_version=CHUNK_PROMPT_VERSION,
+        model=model,
+        lang="fr" if lang == "fr" else "en",
+        context=context,
+    )
+
+
+def _build_chunk_prompts(chunk: TranscriptChunk, video_title: str, category: str, lang: str) -> Tuple[str, str]:
+    """Prompts (system, user) d'analyse d'un chunk — voir CHUNK_PROMPT_VERSION."""
     # Adapter le prompt selon la position
     position_context = ""
     if chunk.index == 0:
@@ -492,20 +549,35 @@ FORMAT DE RÉPONSE (JSON):
 
 Analyse ce segment INTÉGRALEMENT en {"français" if lang == "fr" else "anglais"}.
 N'omets aucun point important mentionné dans ce segment."""
+    return system_prompt, user_prompt
+
+
+async def _analyze_chunk_internal(
+    chunk: TranscriptChunk, video_title: str, category: str, lang: str, mode: str, model: str, api_key: str
+) -> Optional[ChunkAnalysis]:
+    """
+    Analyse interne d'un chunk (appelée par analyze_chunk_with_retry).
+    """
+    system_prompt, user_prompt = _build_chunk_prompts(chunk, video_title, category, lang)
 
     async with shared_http_client() as client:
-        response = await client.post(
-            "https://api.mistral.ai/v1/chat/completions",
-            headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
-            json={
-                "model": model,
-                "messages": [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
-                "max_tokens": 2000,  # Augmenté pour des résumés plus complets
-                "temperature": 0.3,
-                "response_format": {"type": "json_object"},
-            },
-            timeout=CHUNK_TIMEOUT_SECONDS,
-        )
+        async with llm_limiter.slot(f"mistral:{model}") as slot:
+            response = await client.post(
+                "https://api.mistral.ai/v1/chat/completions",
+                headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+                json={
+                    "model": model,
+                    "messages": [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt},
+                    ],
+                    "max_tokens": 2000,  # Augmenté pour des résumés plus complets
+                    "temperature": 0.3,
+                    "response_format": {"type": "json_object"},
+                },
+                timeout=CHUNK_TIMEOUT_SECONDS,
+            )
+            slot.observe(response.status_code)
 
         if response.status_code == 200:
             data = response.json()
@@ -580,10 +652,11 @@ async def analyze_chunks_parallel(
     total_chunks = len(chunks)
     total_words = sum(c.word_count for c in chunks)
 
-    print(f"📚 [FULL ANALYSIS] Starting analysis of {total_chunks} chunks ({total_words} words total)", flush=True)
+    logger.info(f"📚 [FULL ANALYSIS] Starting analysis of {total_chunks} chunks ({total_words} words total)")
 
     results: List[Optional[ChunkAnalysis]] = [None] * total_chunks
     semaphore = asyncio.Semaphore(max_concurrent)
+    cache_stats = ChunkCacheStats()
 
     async def analyze_with_semaphore(chunk: TranscriptChunk, index: int):
         async with semaphore:
@@ -594,24 +667,31 @@ async def analyze_chunks_parallel(
                     progress, f"📝 Analyse partie {index + 1}/{total_chunks} ({chunk.word_count} mots)..."
                 )
 
-            print(
-                f"🔍 [Chunk {index + 1}/{total_chunks}] Analyzing {chunk.word_count} words ({chunk.start_time} → {chunk.end_time})...",
-                flush=True,
+            logger.debug(
+                f"🔍 [Chunk {index + 1}/{total_chunks}] Analyzing",
+                words=chunk.word_count,
+                time_range=f"{chunk.start_time} → {chunk.end_time}",
             )
 
             result = await analyze_chunk_with_retry(
-                chunk=chunk, video_title=video_title, category=category, lang=lang, mode=mode, model=model
+                chunk=chunk,
+                video_title=video_title,
+                category=category,
+                lang=lang,
+                mode=mode,
+                model=model,
+                cache_stats=cache_stats,
             )
 
             if result:
-                print(f"✅ [Chunk {index + 1}/{total_chunks}] Done - {len(result.summary)} chars summary", flush=True)
+                logger.debug(f"✅ [Chunk {index + 1}/{total_chunks}] Done", summary_chars=len(result.summary))
             else:
-                print(f"❌ [Chunk {index + 1}/{total_chunks}] FAILED after all retries", flush=True)
+                logger.error(f"❌ [Chunk {index + 1}/{total_chunks}] FAILED after all retries")
 
             return index, result
 
     # Phase 1: Analyse initiale de TOUS les chunks
-    print(f"🚀 [FULL ANALYSIS] Phase 1: Initial analysis of all {total_chunks} chunks...", flush=True)
+    logger.info(f"🚀 [FULL ANALYSIS] Phase 1: Initial analysis of all {total_chunks} chunks...")
 
     tasks = [analyze_with_semaphore(chunk, i) for i, chunk in enumerate(chunks)]
     task_results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -620,7 +700,7 @@ async def analyze_chunks_parallel(
     failed_indices = []
     for result in task_results:
         if isinstance(result, Exception):
-            print(f"⚠️ Task exception: {result}", flush=True)
+            logger.warning(f"⚠️ Task exception: {result}")
             continue
         if isinstance(result, tuple):
             index, analysis = result
@@ -630,7 +710,7 @@ async def analyze_chunks_parallel(
 
     # Phase 2: Retry des chunks qui ont échoué (EN PARALLÈLE avec le même sémaphore)
     if failed_indices:
-        print(f"🔄 [FULL ANALYSIS] Phase 2: retrying {len(failed_indices)} failed chunks in parallel...", flush=True)
+        logger.info(f"🔄 [FULL ANALYSIS] Phase 2: retrying {len(failed_indices)} failed chunks in parallel...")
 
         if progress_callback:
             progress_callback(76, f"🔄 Nouvel essai pour {len(failed_indices)} parties...")
@@ -638,7 +718,7 @@ async def analyze_chunks_parallel(
         async def retry_with_semaphore(failed_index: int):
             chunk = chunks[failed_index]
             async with semaphore:
-                print(f"🔄 [Retry] Chunk {failed_index + 1}/{total_chunks}...", flush=True)
+                logger.info(f"🔄 [Retry] Chunk {failed_index + 1}/{total_chunks}...")
                 result = await analyze_chunk_with_retry(
                     chunk=chunk,
                     video_title=video_title,
@@ -647,11 +727,12 @@ async def analyze_chunks_parallel(
                     mode=mode,
                     model=model,
                     max_retries=2,  # Moins de retries car déjà essayé
+                    cache_stats=cache_stats,
                 )
                 if result:
-                    print(f"✅ [Retry] Chunk {failed_index + 1} succeeded!", flush=True)
+                    logger.info(f"✅ [Retry] Chunk {failed_index + 1} succeeded!")
                 else:
-                    print(f"❌ [Retry] Chunk {failed_index + 1} still failed", flush=True)
+                    logger.error(f"❌ [Retry] Chunk {failed_index + 1} still failed")
                 return failed_index, result
 
         retry_tasks = [retry_with_semaphore(idx) for idx in failed_indices]
@@ -659,7 +740,7 @@ async def analyze_chunks_parallel(
 
         for retry_result in retry_results:
             if isinstance(retry_result, Exception):
-                print(f"⚠️ Retry task exception: {retry_result}", flush=True)
+                logger.warning(f"⚠️ Retry task exception: {retry_result}")
                 continue
             if isinstance(retry_result, tuple):
                 failed_index, result = retry_result
@@ -680,6 +761,7 @@ async def analyze_chunks_parallel(
         chunks_failed=len(final_failed),
         coverage_percent=coverage_percent,
         failed_chunks=final_failed,
+        cache=cache_stats.to_dict(),
     )
 
     # Warnings si couverture incomplète
@@ -691,12 +773,15 @@ async def analyze_chunks_parallel(
                 f"  - Chunk {idx + 1}: {chunk.start_time} → {chunk.end_time} ({chunk.word_count} mots)"
             )
 
-    print("📊 [FULL ANALYSIS] REPORT:", flush=True)
-    print(f"   - Total words: {total_words}", flush=True)
-    print(f"   - Chunks: {len(successful_analyses)}/{total_chunks} analyzed", flush=True)
-    print(f"   - Coverage: {coverage_percent:.1f}%", flush=True)
-    if final_failed:
-        print(f"   - ⚠️ FAILED chunks: {final_failed}", flush=True)
+    logger.info(
+        "📊 [FULL ANALYSIS] REPORT",
+        total_words=total_words,
+        chunks_analyzed=len(successful_analyses),
+        total_chunks=total_chunks,
+        coverage_percent=round(coverage_percent, 1),
+        chunk_cache=cache_stats.to_dict(),
+        failed_chunks=final_failed,
+    )
 
     return successful_analyses, report
 
@@ -881,14 +966,14 @@ Crée maintenant la SYNTHÈSE FINALE en {"français" if lang == "fr" else "angla
                 data = response.json()
                 synthesis = data["choices"][0]["message"]["content"].strip()
                 word_count = len(synthesis.split())
-                print(f"✅ Final synthesis: {word_count} words from {len(analyses)} chunks", flush=True)
+                logger.info(f"✅ Final synthesis: {word_count} words from {len(analyses)} chunks")
                 return synthesis
             else:
-                print(f"❌ Synthesis failed: {response.status_code} - {response.text}", flush=True)
+                logger.error(f"❌ Synthesis failed: {response.status_code} - {response.text}")
                 return None
 
     except Exception as e:
-        print(f"❌ Synthesis error: {e}", flush=True)
+        logger.error(f"❌ Synthesis error: {e}")
         return None
 
 
@@ -952,7 +1037,7 @@ async def analyze_long_video(
     needs_chunk, word_count, reason = needs_chunking(transcript)
 
     if not needs_chunk:
-        print(f"📝 Standard analysis (no chunking needed): {word_count} words", flush=True)
+        logger.info(f"📝 Standard analysis (no chunking needed): {word_count} words")
         return None  # Utiliser l'analyse standard
 
     # ═══════════════════════════════════════════════════════════════════════
@@ -969,18 +1054,21 @@ async def analyze_long_video(
     )
     max_concurrent = get_concurrent_chunks(tier)
 
-    print("", flush=True)
-    print("╔══════════════════════════════════════════════════════════════════╗", flush=True)
-    print("║  📚 LONG VIDEO ANALYSIS v3.0 - INTELLIGENT MODEL ROUTING         ║", flush=True)
-    print("╚══════════════════════════════════════════════════════════════════╝", flush=True)
-    print(f"📊 Transcript: {word_count} words", flush=True)
-    print(f"⏱️ Duration: {video_duration // 60} min {video_duration % 60} sec", flush=True)
-    print(f"📁 Category: {category} | 🎯 Mode: {mode} | 👤 Plan: {user_plan}", flush=True)
-    print(f"🧠 Chunk model: {chunk_model} (max {chunk_max_tokens} tokens)", flush=True)
-    print(f"🧠 Synthesis model: {synthesis_model} (max {synthesis_max_tokens} tokens)", flush=True)
-    print(f"⚡ Concurrence: {max_concurrent} chunks simultanés (tier: {tier.value})", flush=True)
-    print(f"⏱️ Real timestamps: {'YES ✅' if transcript_timestamped else 'NO (estimated)'}", flush=True)
-    print("", flush=True)
+    logger.info(
+        "📚 LONG VIDEO ANALYSIS v3.0 - INTELLIGENT MODEL ROUTING",
+        words=word_count,
+        duration_s=video_duration,
+        category=category,
+        mode=mode,
+        plan=user_plan,
+        chunk_model=chunk_model,
+        chunk_max_tokens=chunk_max_tokens,
+        synthesis_model=synthesis_model,
+        synthesis_max_tokens=synthesis_max_tokens,
+        max_concurrent=max_concurrent,
+        tier=tier.value,
+        real_timestamps=bool(transcript_timestamped),
+    )
 
     if progress_callback:
         progress_callback(35, f"📚 Vidéo longue détectée ({word_count} mots)...")
@@ -994,10 +1082,10 @@ async def analyze_long_video(
 
     # Vérifier que le découpage couvre tout
     total_chunk_words = sum(c.word_count for c in chunks)
-    print(f"✂️ Split into {len(chunks)} chunks covering {total_chunk_words} words", flush=True)
+    logger.info(f"✂️ Split into {len(chunks)} chunks covering {total_chunk_words} words")
 
     for i, chunk in enumerate(chunks):
-        print(f"   └─ Chunk {i + 1}: [{chunk.start_time} → {chunk.end_time}] {chunk.word_count} mots", flush=True)
+        logger.debug(f"   └─ Chunk {i + 1}: [{chunk.start_time} → {chunk.end_time}] {chunk.word_count} mots")
 
     if progress_callback:
         progress_callback(38, f"✂️ Division en {len(chunks)} parties...")
@@ -1019,18 +1107,18 @@ async def analyze_long_video(
 
     # Vérifier la couverture
     if report.coverage_percent < 100:
-        print(f"⚠️ WARNING: Coverage is {report.coverage_percent:.1f}% (not 100%)", flush=True)
+        logger.warning(f"⚠️ WARNING: Coverage is {report.coverage_percent:.1f}% (not 100%)")
         for warning in report.warnings:
-            print(f"   {warning}", flush=True)
+            logger.debug(f"   {warning}")
     else:
-        print("✅ PERFECT: 100% coverage achieved!", flush=True)
+        logger.info("✅ PERFECT: 100% coverage achieved!")
 
     if not chunk_analyses:
-        print("❌ CRITICAL: No chunk analyses succeeded at all!", flush=True)
+        logger.error("❌ CRITICAL: No chunk analyses succeeded at all!")
         return None
 
     if len(chunk_analyses) < len(chunks) * 0.5:
-        print(f"❌ CRITICAL: Too many chunks failed ({len(chunk_analyses)}/{len(chunks)})", flush=True)
+        logger.error(f"❌ CRITICAL: Too many chunks failed ({len(chunk_analyses)}/{len(chunks)})")
 
     if progress_callback:
         if report.coverage_percent == 100:
@@ -1048,8 +1136,8 @@ async def analyze_long_video(
 
     if needs_hierarchical_synthesis(len(chunk_analyses)):
         # ── Synthèse hiérarchique (vidéos ultra-longues 6h+) ──
-        print(
-            f"🏗️ Hierarchical synthesis: {len(chunk_analyses)} chunks > {HIERARCHICAL_GROUP_SIZE} threshold", flush=True
+        logger.info(
+            f"🏗️ Hierarchical synthesis: {len(chunk_analyses)} chunks > {HIERARCHICAL_GROUP_SIZE} threshold"
         )
 
         inter_model, inter_max_tokens = get_optimal_model(
@@ -1061,7 +1149,7 @@ async def analyze_long_video(
         for i in range(0, len(chunk_analyses), HIERARCHICAL_GROUP_SIZE):
             groups.append(chunk_analyses[i : i + HIERARCHICAL_GROUP_SIZE])
 
-        print(f"   └─ {len(groups)} groupes de ~{HIERARCHICAL_GROUP_SIZE} chunks", flush=True)
+        logger.debug(f"   └─ {len(groups)} groupes de ~{HIERARCHICAL_GROUP_SIZE} chunks")
 
         intermediate_analyses = []
         for g_idx, group in enumerate(groups):
@@ -1101,7 +1189,7 @@ async def analyze_long_video(
                         word_count_analyzed=sum(a.word_count_analyzed for a in group),
                     )
                 )
-                print(f"   ✅ Groupe {g_idx + 1}: {len(inter_summary)} chars", flush=True)
+                logger.info(f"   ✅ Groupe {g_idx + 1}: {len(inter_summary)} chars")
 
         # Étape 2 : Synthèse finale des synthèses intermédiaires
         if progress_callback:
@@ -1161,14 +1249,13 @@ async def analyze_long_video(
         else:
             progress_callback(95, "❌ Échec de la synthèse")
 
-    print("", flush=True)
-    print("╔══════════════════════════════════════════════════════════════════╗", flush=True)
-    print("║  📊 ANALYSIS COMPLETE                                            ║", flush=True)
-    print("╚══════════════════════════════════════════════════════════════════╝", flush=True)
-    print(f"✅ Chunks analyzed: {report.chunks_analyzed}/{report.total_chunks}", flush=True)
-    print(f"📊 Coverage: {report.coverage_percent:.1f}%", flush=True)
-    print(f"📝 Final summary: {len(final_summary.split()) if final_summary else 0} words", flush=True)
-    print("", flush=True)
+    logger.info(
+        "📊 LONG VIDEO ANALYSIS COMPLETE",
+        chunks_analyzed=report.chunks_analyzed,
+        total_chunks=report.total_chunks,
+        coverage_percent=round(report.coverage_percent, 1),
+        summary_words=len(final_summary.split()) if final_summary else 0,
+    )
 
     # Retourner le résultat complet avec les chunks pour stockage ultérieur
     return LongVideoResult(
@@ -1246,7 +1333,7 @@ async def store_chunks_in_db(
         stored += 1
 
     await db.flush()
-    print(f"💾 Stored {stored} VideoChunks for summary {summary_id}", flush=True)
+    logger.info(f"💾 Stored {stored} VideoChunks for summary {summary_id}")
     return stored
 
 
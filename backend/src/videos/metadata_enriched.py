@@ -12,6 +12,7 @@ from typing import List, Dict, Any
 from core.config import get_mistral_key
 from core.config import MISTRAL_INTERNAL_MODEL
 from core.http_client import shared_http_client
+from core.logging import logger
 
 from .schemas import (
     VideoMetadataEnriched,
@@ -185,16 +186,17 @@ async def fetch_video_metadata(video_id: str) -> Dict[str, Any]:
 
     Utilise yt-dlp pour une extraction sans API key.
     """
-    import subprocess
     import json
 
+    from core.media_process import run_media_process
+
     try:
         cmd = ["yt-dlp", "--dump-json", "--no-download", f"https://www.youtube.com/watch?v={video_id}"]
 
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        result = await run_media_process(cmd, timeout=30)
 
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
+        if result.ok:
+            data = json.loads(result.text)
             return {
                 "video_id": video_id,
                 "title": data.get("title", ""),
@@ -212,7 +214,7 @@ async def fetch_video_metadata(video_id: str) -> Dict[str, Any]:
                 "thumbnail_url": data.get("thumbnail", ""),
             }
     except Exception as e:
-        print(f"❌ [METADATA] Error fetching metadata: {e}", flush=True)
+        logger.error(f"❌ [METADATA] Error fetching metadata: {e}")
 
     return {"video_id": video_id}
 
@@ -462,7 +464,7 @@ Réponds UNIQUEMENT avec le JSON."""
                 )
 
     except Exception as e:
-        print(f"⚠️ [FIGURES] AI extraction failed: {e}", flush=True)
+        logger.warning(f"⚠️ [FIGURES] AI extraction failed: {e}")
 
     return figures
 
@@ -599,7 +601,7 @@ async def get_enriched_metadata(
     Returns:
         VideoMetadataEnriched avec toutes les analyses
     """
-    print(f"📊 [METADATA] Enriching metadata for {video_id}...", flush=True)
+    logger.info(f"📊 [METADATA] Enriching metadata for {video_id}...")
 
     # Récupérer les métadonnées de base si nécessaire
     if not title:
@@ -657,12 +659,11 @@ async def get_enriched_metadata(
         sources_mentioned=list(set(sources))[:10],
     )
 
-    print(
+    logger.info(
         f"✅ [METADATA] Enrichment complete: "
         f"sponsorship={sponsorship.type.value}, "
         f"figures={len(figures)}, "
-        f"propaganda={'analyzed' if propaganda else 'skipped'}",
-        flush=True,
+        f"propaganda={'analyzed' if propaganda else 'skipped'}"
     )
 
     return enriched
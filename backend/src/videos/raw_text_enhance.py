@@ -341,9 +341,9 @@ def detect_source_type(text: str, source_hint: Optional[str] = None) -> SourceCo
     # Détecter les indices de format
     format_hints = _detect_format_hints(text, source_hint)
 
-    print(f"📚 [SOURCE] Detected: {best_type.value} (confidence: {confidence:.2f})", flush=True)
+    logger.info(f"📚 [SOURCE] Detected: {best_type.value} (confidence: {confidence:.2f})")
     if detected_origin:
-        print(f"   Origin: {detected_origin}", flush=True)
+        logger.debug(f"   Origin: {detected_origin}")
 
     return SourceContext(
         source_type=best_type,
@@ -519,14 +519,14 @@ Réponds UNIQUEMENT avec le titre:"""
             "sans titre",
         ]
         if title.lower() in generic_titles or len(title) < 5:
-            print(f"⚠️ [TITLE] Generic detected: '{title}', using fallback", flush=True)
+            logger.warning(f"⚠️ [TITLE] Generic detected: '{title}', using fallback")
             return _extract_fallback_title(text, source_context)
 
-        print(f"🎯 [TITLE] Generated: {title}", flush=True)
+        logger.info(f"🎯 [TITLE] Generated: {title}")
         return title
 
     except Exception as e:
-        print(f"❌ [TITLE] Error: {e}", flush=True)
+        logger.error(f"❌ [TITLE] Error: {e}")
         return _extract_fallback_title(text, source_context)
 
 
@@ -770,17 +770,17 @@ async def enhance_raw_text(
     generic_titles = ["texte analysé", "text analysis", ""]
     if provided_title and provided_title.strip().lower() not in generic_titles:
         title = provided_title.strip()
-        print(f"📝 [RAW_TEXT] Using provided title: {title}", flush=True)
+        logger.info(f"📝 [RAW_TEXT] Using provided title: {title}")
     else:
         title = await generate_smart_title(text, lang, source_context)
-        print(f"🎯 [RAW_TEXT] Generated title: {title}", flush=True)
+        logger.info(f"🎯 [RAW_TEXT] Generated title: {title}")
 
     # 3. Générer la thumbnail
     thumbnail_url = await generate_thumbnail(
         title=title, category=category, source_type=source_context.source_type, lang=lang
     )
 
-    print(f"🖼️ [RAW_TEXT] Thumbnail: {len(thumbnail_url)} chars", flush=True)
+    logger.info(f"🖼️ [RAW_TEXT] Thumbnail: {len(thumbnail_url)} chars")
 
     return title, thumbnail_url, source_context
 
@@ -21,6 +21,7 @@ from uuid import uuid4
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, UploadFile, File, Form, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.database import get_session, User, Summary
@@ -31,6 +32,7 @@ from auth.dependencies import (
     check_daily_limit,
     require_feature,
     get_current_admin,
+    get_current_user_sse,
 )
 from core.config import CATEGORIES, get_mistral_key
 from billing.plan_config import get_limits
@@ -207,6 +209,9 @@ router = APIRouter()
 # Voir core/task_store.py pour l'implémentation.
 # _task_store se comporte comme un dict normal mais sync vers Redis en background.
 from core.task_store import task_store as _task_store, guest_limiter as _guest_limiter
+from core.task_events import SSE_HEADERS, parse_last_event_id, task_event_stream
+from core.job_queue import get_checkpoint, save_checkpoint
+from .analysis_jobs import cancel_queued_analysis, enqueue_analysis
 
 MAX_GUEST_ANALYSES = 3
 MAX_VIDEO_DURATION_GUEST = 300  # 5 minutes
@@ -1072,9 +1077,9 @@ async def analyze_video(
     # Créer dans la DB aussi
     await create_task(session, task_id, current_user.id, "video_analysis")
 
-    # Lancer l'analyse en background
-    background_tasks.add_task(
-        _analyze_video_background_v6,  # 🆕 Nouvelle version
+    # Mettre l'analyse en file (job durable, repris après un redéploiement)
+    await enqueue_analysis(
+        "video_analysis",
         task_id=task_id,
         video_id=video_id,
         url=request.url,
@@ -1294,9 +1299,9 @@ async def analyze_video_v2(
     if deep_research:
         estimated_duration += 30
 
-    # Lancer l'analyse en background
-    background_tasks.add_task(
-        _analyze_video_background_v2,
+    # Mettre l'analyse en file (job durable, repris après un redéploiement)
+    await enqueue_analysis(
+        "video_analysis_v2",
         task_id=task_id,
         video_id=video_id,
         url=request.url,
@@ -1375,7 +1380,11 @@ async def _analyze_video_background_v2(
             _task_store[task_id]["progress"] = 10
             _task_store[task_id]["message"] = "📺 Récupération des infos vidéo..."
 
-            if platform == "tiktok":
+            # ⏯️ Job repris : infos vidéo + transcript déjà extraits (checkpoint)
+            _ckpt_transcript = get_checkpoint("transcript")
+            if _ckpt_transcript:
+                video_info = _ckpt_transcript["video_info"]
+            elif platform == "tiktok":
                 video_info = await get_tiktok_video_info(url)
             else:
                 video_info = await get_video_info(video_id)
@@ -1386,7 +1395,11 @@ async def _analyze_video_background_v2(
             _task_store[task_id]["progress"] = 20
             _task_store[task_id]["message"] = "📝 Extraction du transcript..."
 
-            if platform == "tiktok" and video_info.get("content_type") == "carousel":
+            if _ckpt_transcript:
+                transcript = _ckpt_transcript["transcript"]
+                transcript_timestamped = _ckpt_transcript["transcript_timestamped"]
+                detected_lang = _ckpt_transcript["detected_lang"]
+            elif platform == "tiktok" and video_info.get("content_type") == "carousel":
                 # 📸 Carousel pipeline: Vision analysis instead of audio transcript
                 _task_store[task_id]["message"] = "📸 Analyse des images du carrousel..."
                 from transcripts.carousel import get_carousel_transcript
@@ -1410,6 +1423,16 @@ async def _analyze_video_background_v2(
                 )
             if not transcript:
                 raise Exception("No transcript available for this video")
+            if not _ckpt_transcript:
+                await save_checkpoint(
+                    "transcript",
+                    {
+                        "video_info": video_info,
+                        "transcript": transcript,
+                        "transcript_timestamped": transcript_timestamped,
+                        "detected_lang": detected_lang,
+                    },
+                )
 
             if not lang or lang == "auto":
                 lang = detected_lang or "fr"
@@ -1501,10 +1524,26 @@ async def _analyze_video_background_v2(
 
             # Variable pour stocker les chunks (remplie si vidéo longue)
             _long_video_result = None
+            _ckpt_chunks = get_checkpoint("chunks")
+            if _ckpt_chunks:
+                _long_video_result = LongVideoResult.from_dict(_ckpt_chunks)
+
+            # ⏯️ Job repris après la synthèse : résumé, catégorie et couche visuelle déjà produits
+            _ckpt_synthesis = get_checkpoint("synthesis")
+            summary_content = None
+            if _ckpt_synthesis:
+                summary_content = _ckpt_synthesis["summary_content"]
+                category, confidence = _ckpt_synthesis["category"], _ckpt_synthesis["confidence"]
 
             # 👁️ Phase 2 visual hook (V2) — enrich full_context + capture pour persist post-save
-            _visual_analysis_data: Optional[Dict[str, Any]] = None
-            if options.get("include_visual_analysis", True) and platform in ("youtube", "tiktok"):
+            _visual_analysis_data: Optional[Dict[str, Any]] = (
+                _ckpt_synthesis.get("visual_analysis") if _ckpt_synthesis else None
+            )
+            if (
+                options.get("include_visual_analysis", True)
+                and platform in ("youtube", "tiktok")
+                and not summary_content
+            ):
                 from .visual_integration import enrich_and_capture_visual
 
                 _visual_flag_on = os.getenv("VISUAL_ANALYSIS_ENABLED", "false").strip().lower() in {
@@ -1524,28 +1563,33 @@ async def _analyze_video_background_v2(
                     duration_hint=float(video_duration) if video_duration else None,
                 )
 
-            if needs_chunk:
+            if summary_content:
+                logger.info(f"⏯️ [JOB] Summary restored from checkpoint for task {task_id[:12]}")
+            elif needs_chunk:
                 _task_store[task_id]["message"] = f"📚 Vidéo longue ({word_count} mots)..."
 
                 def update_progress(progress: int, message: str):
                     _task_store[task_id]["progress"] = progress
                     _task_store[task_id]["message"] = message
 
-                _long_video_result = await analyze_long_video(
-                    title=video_info["title"],
-                    transcript=transcript_to_analyze,
-                    video_duration=video_duration,
-                    category=category,
-                    lang=lang,
-                    mode=mode,
-                    model=model,
-                    web_context=full_context,
-                    progress_callback=update_progress,
-                    transcript_timestamped=transcript_timestamped,
-                    upload_date=video_info.get("upload_date", ""),
-                    view_count=video_info.get("view_count") or 0,
-                    user_plan=user_plan,
-                )
+                if _long_video_result is None:
+                    _long_video_result = await analyze_long_video(
+                        title=video_info["title"],
+                        transcript=transcript_to_analyze,
+                        video_duration=video_duration,
+                        category=category,
+                        lang=lang,
+                        mode=mode,
+                        model=model,
+                        web_context=full_context,
+                        progress_callback=update_progress,
+                        transcript_timestamped=transcript_timestamped,
+                        upload_date=video_info.get("upload_date", ""),
+                        view_count=video_info.get("view_count") or 0,
+                        user_plan=user_plan,
+                    )
+                    if isinstance(_long_video_result, LongVideoResult) and _long_video_result.summary:
+                        await save_checkpoint("chunks", _long_video_result.to_dict())
                 summary_content = (
                     _long_video_result.summary
                     if isinstance(_long_video_result, LongVideoResult)
@@ -1608,6 +1652,16 @@ async def _analyze_video_background_v2(
 
             if not summary_content:
                 raise Exception("AI service temporarily unavailable, please retry")
+            if not _ckpt_synthesis:
+                await save_checkpoint(
+                    "synthesis",
+                    {
+                        "summary_content": summary_content,
+                        "category": category,
+                        "confidence": confidence,
+                        "visual_analysis": _visual_analysis_data,
+                    },
+                )
 
             # 6+7. ⚡ ENTITÉS + FIABILITÉ EN PARALLÈLE (perf v2.0.1)
             _task_store[task_id]["progress"] = 75
@@ -1638,16 +1692,6 @@ async def _analyze_video_background_v2(
             _task_store[task_id]["progress"] = 92
             _task_store[task_id]["message"] = "💾 Sauvegarde des résultats..."
 
-            if SECURITY_AVAILABLE:
-                await consume_reserved_credits(
-                    session, user_id, task_id, f"Video v2: {video_info['title'][:50]} ({model})"
-                )
-            else:
-                await deduct_credit(session, user_id, credit_cost, f"Video v2: {video_info['title'][:50]}")
-
-            _task_store[task_id]["progress"] = 94
-            _task_store[task_id]["message"] = "💾 Enregistrement de l'analyse..."
-
             enrichment_metadata = None
             if enrichment_sources:
                 enrichment_metadata = {
@@ -1665,41 +1709,57 @@ async def _analyze_video_background_v2(
                     "thumbnail_url", f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg"
                 )
 
-            summary_id = await save_summary(
-                session=session,
-                user_id=user_id,
-                video_id=video_id,
-                video_title=video_info["title"],
-                video_channel=video_info.get("channel", "Unknown"),
-                video_duration=video_info.get("duration", 0),
-                video_url=url,
-                thumbnail_url=default_thumbnail,
-                category=category,
-                category_confidence=confidence,
-                lang=lang,
-                mode=mode,
-                model_used=model,
-                summary_content=summary_content,
-                transcript_context=transcript_timestamped or transcript,
-                video_upload_date=video_info.get("upload_date"),
-                entities_extracted=entities,
-                reliability_score=reliability,
-                enrichment_data=enrichment_metadata,
-                platform=platform,
-                # 📊 Engagement metadata
-                view_count=video_info.get("view_count"),
-                like_count=video_info.get("like_count"),
-                comment_count=video_info.get("comment_count"),
-                share_count=video_info.get("share_count"),
-                channel_follower_count=video_info.get("channel_follower_count"),
-                content_type=video_info.get("content_type", "video"),
-                source_tags=video_info.get("tags", []),
-                video_description=video_info.get("description"),
-                channel_id=video_info.get("channel_id"),
-                music_title=video_info.get("music_title"),
-                music_author=video_info.get("music_author"),
-                carousel_images=video_info.get("carousel_images"),
-            )
+            # ⏯️ Job repris après la sauvegarde : crédits déjà consommés
+            _ckpt_extras = get_checkpoint("extras")
+            if _ckpt_extras:
+                summary_id = _ckpt_extras["summary_id"]
+            else:
+                if SECURITY_AVAILABLE:
+                    await consume_reserved_credits(
+                        session, user_id, task_id, f"Video v2: {video_info['title'][:50]} ({model})"
+                    )
+                else:
+                    await deduct_credit(session, user_id, credit_cost, f"Video v2: {video_info['title'][:50]}")
+
+                _task_store[task_id]["progress"] = 94
+                _task_store[task_id]["message"] = "💾 Enregistrement de l'analyse..."
+
+                summary_id = await save_summary(
+                    session=session,
+                    user_id=user_id,
+                    video_id=video_id,
+                    video_title=video_info["title"],
+                    video_channel=video_info.get("channel", "Unknown"),
+                    video_duration=video_info.get("duration", 0),
+                    video_url=url,
+                    thumbnail_url=default_thumbnail,
+                    category=category,
+                    category_confidence=confidence,
+                    lang=lang,
+                    mode=mode,
+                    model_used=model,
+                    summary_content=summary_content,
+                    transcript_context=transcript_timestamped or transcript,
+                    video_upload_date=video_info.get("upload_date"),
+                    entities_extracted=entities,
+                    reliability_score=reliability,
+                    enrichment_data=enrichment_metadata,
+                    platform=platform,
+                    # 📊 Engagement metadata
+                    view_count=video_info.get("view_count"),
+                    like_count=video_info.get("like_count"),
+                    comment_count=video_info.get("comment_count"),
+                    share_count=video_info.get("share_count"),
+                    channel_follower_count=video_info.get("channel_follower_count"),
+                    content_type=video_info.get("content_type", "video"),
+                    source_tags=video_info.get("tags", []),
+                    video_description=video_info.get("description"),
+                    channel_id=video_info.get("channel_id"),
+                    music_title=video_info.get("music_title"),
+                    music_author=video_info.get("music_author"),
+                    carousel_images=video_info.get("carousel_images"),
+                )
+                await save_checkpoint("extras", {"summary_id": summary_id})
 
             # 👁️ Phase 2 plumbing V2 : persist visual_analysis si capturé.
             if _visual_analysis_data is not None:
@@ -2107,9 +2167,9 @@ async def analyze_video_v2_1(
     if customization.detect_propaganda:
         estimated_duration += 10
 
-    # Lancer l'analyse en background
-    background_tasks.add_task(
-        _analyze_video_background_v2_1,
+    # Mettre l'analyse en file (job durable, repris après un redéploiement)
+    await enqueue_analysis(
+        "video_analysis_v2.1",
         task_id=task_id,
         video_id=video_id,
         url=request.url,
@@ -2195,7 +2255,11 @@ async def _analyze_video_background_v2_1(
             _task_store[task_id]["progress"] = 8
             _task_store[task_id]["message"] = "📺 Récupération des infos vidéo..."
 
-            if platform == "tiktok":
+            # ⏯️ Job repris : infos vidéo + transcript déjà extraits (checkpoint)
+            _ckpt_transcript = get_checkpoint("transcript")
+            if _ckpt_transcript:
+                video_info = _ckpt_transcript["video_info"]
+            elif platform == "tiktok":
                 video_info = await get_tiktok_video_info(url)
             else:
                 video_info = await get_video_info(video_id)
@@ -2208,7 +2272,11 @@ async def _analyze_video_background_v2_1(
             _task_store[task_id]["progress"] = 15
             _task_store[task_id]["message"] = "📝 Extraction du transcript..."
 
-            if platform == "tiktok" and video_info.get("content_type") == "carousel":
+            if _ckpt_transcript:
+                transcript = _ckpt_transcript["transcript"]
+                transcript_timestamped = _ckpt_transcript["transcript_timestamped"]
+                detected_lang = _ckpt_transcript["detected_lang"]
+            elif platform == "tiktok" and video_info.get("content_type") == "carousel":
                 # 📸 Carousel pipeline
                 _task_store[task_id]["message"] = "📸 Analyse des images du carrousel..."
                 from transcripts.carousel import get_carousel_transcript
@@ -2232,6 +2300,16 @@ async def _analyze_video_background_v2_1(
                 )
             if not transcript:
                 raise Exception("No transcript available for this video")
+            if not _ckpt_transcript:
+                await save_checkpoint(
+                    "transcript",
+                    {
+                        "video_info": video_info,
+                        "transcript": transcript,
+                        "transcript_timestamped": transcript_timestamped,
+                        "detected_lang": detected_lang,
+                    },
+                )
 
             if not lang or lang == "auto":
                 lang = detected_lang or "fr"
@@ -2438,10 +2516,26 @@ async def _analyze_video_background_v2_1(
 
             # Variable pour stocker les chunks (remplie si vidéo longue)
             _long_video_result2 = None
+            _ckpt_chunks = get_checkpoint("chunks")
+            if _ckpt_chunks:
+                _long_video_result2 = LongVideoResult.from_dict(_ckpt_chunks)
+
+            # ⏯️ Job repris après la synthèse : résumé, catégorie et couche visuelle déjà produits
+            _ckpt_synthesis = get_checkpoint("synthesis")
+            summary_content = None
+            if _ckpt_synthesis:
+                summary_content = _ckpt_synthesis["summary_content"]
+                category, confidence = _ckpt_synthesis["category"], _ckpt_synthesis["confidence"]
 
             # 👁️ Phase 2 visual hook (V2.1) — enrich full_context + capture pour persist post-save
-            _visual_analysis_data: Optional[Dict[str, Any]] = None
-            if options.get("include_visual_analysis", True) and platform in ("youtube", "tiktok"):
+            _visual_analysis_data: Optional[Dict[str, Any]] = (
+                _ckpt_synthesis.get("visual_analysis") if _ckpt_synthesis else None
+            )
+            if (
+                options.get("include_visual_analysis", True)
+                and platform in ("youtube", "tiktok")
+                and not summary_content
+            ):
                 from .visual_integration import enrich_and_capture_visual
 
                 _visual_flag_on = os.getenv("VISUAL_ANALYSIS_ENABLED", "false").strip().lower() in {
@@ -2461,28 +2555,33 @@ async def _analyze_video_background_v2_1(
                     duration_hint=float(video_duration) if video_duration else None,
                 )
 
-            if needs_chunk:
+            if summary_content:
+                logger.info(f"⏯️ [JOB] Summary restored from checkpoint for task {task_id[:12]}")
+            elif needs_chunk:
                 _task_store[task_id]["message"] = f"📚 Vidéo longue ({word_count} mots)..."
 
                 def update_progress(progress: int, message: str):
                     _task_store[task_id]["progress"] = progress
                     _task_store[task_id]["message"] = message
 
-                _long_video_result2 = await analyze_long_video(
-                    title=video_info["title"],
-                    transcript=transcript_to_analyze,
-                    video_duration=video_duration,
-                    category=category,
-                    lang=lang,
-                    mode=mode,
-                    model=model,
-                    web_context=full_context,
-                    progress_callback=update_progress,
-                    transcript_timestamped=transcript_timestamped,
-                    upload_date=video_info.get("upload_date", ""),
-                    view_count=video_info.get("view_count") or 0,
-                    user_plan=user_plan,
-                )
+                if _long_video_result2 is None:
+                    _long_video_result2 = await analyze_long_video(
+                        title=video_info["title"],
+                        transcript=transcript_to_analyze,
+                        video_duration=video_duration,
+                        category=category,
+                        lang=lang,
+                        mode=mode,
+                        model=model,
+                        web_context=full_context,
+                        progress_callback=update_progress,
+                        transcript_timestamped=transcript_timestamped,
+                        upload_date=video_info.get("upload_date", ""),
+                        view_count=video_info.get("view_count") or 0,
+                        user_plan=user_plan,
+                    )
+                    if isinstance(_long_video_result2, LongVideoResult) and _long_video_result2.summary:
+                        await save_checkpoint("chunks", _long_video_result2.to_dict())
                 summary_content = (
                     _long_video_result2.summary
                     if isinstance(_long_video_result2, LongVideoResult)
@@ -2545,6 +2644,16 @@ async def _analyze_video_background_v2_1(
 
             if not summary_content:
                 raise Exception("AI service temporarily unavailable, please retry")
+            if not _ckpt_synthesis:
+                await save_checkpoint(
+                    "synthesis",
+                    {
+                        "summary_content": summary_content,
+                        "category": category,
+                        "confidence": confidence,
+                        "visual_analysis": _visual_analysis_data,
+                    },
+                )
 
             # ═══════════════════════════════════════════════════════════════════
             # 9+10. ⚡ ENTITÉS + FIABILITÉ EN PARALLÈLE (perf v2.1.1)
@@ -2589,13 +2698,6 @@ async def _analyze_video_background_v2_1(
             _task_store[task_id]["progress"] = 90
             _task_store[task_id]["message"] = "💾 Sauvegarde des résultats..."
 
-            if SECURITY_AVAILABLE:
-                await consume_reserved_credits(
-                    session, user_id, task_id, f"Video v2.1: {video_info['title'][:50]} ({model})"
-                )
-            else:
-                await deduct_credit(session, user_id, credit_cost, f"Video v2.1: {video_info['title'][:50]}")
-
             # Préparer les métadonnées d'enrichissement
             enrichment_metadata = {
                 "level": enrichment_level.value,
@@ -2629,45 +2731,58 @@ async def _analyze_video_background_v2_1(
             # (cf orchestrator), ou None si pas généré.
             _external_pages_dict = external_pages_result if isinstance(external_pages_result, dict) else None
 
-            summary_id = await save_summary(
-                session=session,
-                user_id=user_id,
-                video_id=video_id,
-                video_title=video_info["title"],
-                video_channel=video_info.get("channel", "Unknown"),
-                video_duration=video_info.get("duration", 0),
-                video_url=url,
-                thumbnail_url=default_thumbnail,
-                category=category,
-                category_confidence=confidence,
-                lang=lang,
-                mode=mode,
-                model_used=model,
-                summary_content=summary_content,
-                transcript_context=transcript_timestamped or transcript,
-                video_upload_date=video_info.get("upload_date"),
-                entities_extracted=entities,
-                reliability_score=reliability,
-                enrichment_data=enrichment_metadata,
-                platform=platform,
-                # 📊 Engagement metadata
-                view_count=video_info.get("view_count"),
-                like_count=video_info.get("like_count"),
-                comment_count=video_info.get("comment_count"),
-                share_count=video_info.get("share_count"),
-                channel_follower_count=video_info.get("channel_follower_count"),
-                content_type=video_info.get("content_type", "video"),
-                source_tags=video_info.get("tags", []),
-                video_description=video_info.get("description"),
-                channel_id=video_info.get("channel_id"),
-                music_title=video_info.get("music_title"),
-                music_author=video_info.get("music_author"),
-                carousel_images=video_info.get("carousel_images"),
-                # 💬 Community analysis (alembic 029)
-                community_analysis=_community_dict,
-                # 🔗 External pages (alembic 031 — PR3)
-                external_pages=_external_pages_dict,
-            )
+            # ⏯️ Job repris après la sauvegarde : crédits déjà consommés
+            _ckpt_extras = get_checkpoint("extras")
+            if _ckpt_extras:
+                summary_id = _ckpt_extras["summary_id"]
+            else:
+                if SECURITY_AVAILABLE:
+                    await consume_reserved_credits(
+                        session, user_id, task_id, f"Video v2.1: {video_info['title'][:50]} ({model})"
+                    )
+                else:
+                    await deduct_credit(session, user_id, credit_cost, f"Video v2.1: {video_info['title'][:50]}")
+
+                summary_id = await save_summary(
+                    session=session,
+                    user_id=user_id,
+                    video_id=video_id,
+                    video_title=video_info["title"],
+                    video_channel=video_info.get("channel", "Unknown"),
+                    video_duration=video_info.get("duration", 0),
+                    video_url=url,
+                    thumbnail_url=default_thumbnail,
+                    category=category,
+                    category_confidence=confidence,
+                    lang=lang,
+                    mode=mode,
+                    model_used=model,
+                    summary_content=summary_content,
+                    transcript_context=transcript_timestamped or transcript,
+                    video_upload_date=video_info.get("upload_date"),
+                    entities_extracted=entities,
+                    reliability_score=reliability,
+                    enrichment_data=enrichment_metadata,
+                    platform=platform,
+                    # 📊 Engagement metadata
+                    view_count=video_info.get("view_count"),
+                    like_count=video_info.get("like_count"),
+                    comment_count=video_info.get("comment_count"),
+                    share_count=video_info.get("share_count"),
+                    channel_follower_count=video_info.get("channel_follower_count"),
+                    content_type=video_info.get("content_type", "video"),
+                    source_tags=video_info.get("tags", []),
+                    video_description=video_info.get("description"),
+                    channel_id=video_info.get("channel_id"),
+                    music_title=video_info.get("music_title"),
+                    music_author=video_info.get("music_author"),
+                    carousel_images=video_info.get("carousel_images"),
+                    # 💬 Community analysis (alembic 029)
+                    community_analysis=_community_dict,
+                    # 🔗 External pages (alembic 031 — PR3)
+                    external_pages=_external_pages_dict,
+                )
+                await save_checkpoint("extras", {"summary_id": summary_id})
 
             # 👁️ Phase 2 plumbing V2.1 : persist visual_analysis si capturé.
             if _visual_analysis_data is not None:
@@ -2933,8 +3048,12 @@ async def _analyze_video_background_v6(
             _task_store[task_id]["progress"] = 10
             _task_store[task_id]["message"] = "📺 Récupération des infos vidéo..."
 
+            # ⏯️ Job repris : infos vidéo + transcript déjà extraits (checkpoint)
+            _ckpt_transcript = get_checkpoint("transcript")
             logger.info(f"📺 Fetching video info for {video_id} (platform={platform})...")
-            if platform == "tiktok":
+            if _ckpt_transcript:
+                video_info = _ckpt_transcript["video_info"]
+            elif platform == "tiktok":
                 video_info = await get_tiktok_video_info(url)
             else:
                 video_info = await get_video_info(video_id)
@@ -2988,11 +3107,15 @@ async def _analyze_video_background_v6(
             transcript = None
             transcript_timestamped = None
             detected_lang = None
+            if _ckpt_transcript:
+                transcript = _ckpt_transcript["transcript"]
+                transcript_timestamped = _ckpt_transcript["transcript_timestamped"]
+                detected_lang = _ckpt_transcript["detected_lang"]
             try:
                 from main import get_video_cache
 
                 _vcache = get_video_cache()
-                if _vcache is not None:
+                if _vcache is not None and not transcript:
                     _cached_t = await _vcache.get_transcript(platform, video_id)
                     if _cached_t:
                         transcript = _cached_t.get("transcript")
@@ -3110,6 +3233,16 @@ async def _analyze_video_background_v6(
                     raise Exception("No transcript available for this video")
 
             logger.info(f"✅ Transcript: {len(transcript)} chars")
+            if not _ckpt_transcript:
+                await save_checkpoint(
+                    "transcript",
+                    {
+                        "video_info": video_info,
+                        "transcript": transcript,
+                        "transcript_timestamped": transcript_timestamped,
+                        "detected_lang": detected_lang,
+                    },
+                )
 
             # Utiliser la langue détectée si pas spécifiée
             if not lang or lang == "auto":
@@ -3305,13 +3438,26 @@ async def _analyze_video_background_v6(
 
             # Variable pour stocker les chunks (remplie si vidéo longue)
             _long_video_result3 = None
+            _ckpt_chunks = get_checkpoint("chunks")
+            if _ckpt_chunks:
+                _long_video_result3 = LongVideoResult.from_dict(_ckpt_chunks)
+
+            # ⏯️ Job repris après la synthèse : résumé et catégorie déjà produits
+            _ckpt_synthesis = get_checkpoint("synthesis")
+            summary_content = None
+            if _ckpt_synthesis:
+                summary_content = _ckpt_synthesis["summary_content"]
+                category, confidence = _ckpt_synthesis["category"], _ckpt_synthesis["confidence"]
 
             # ═══════════════════════════════════════════════════════════════════
             # 🆕 PHASE 2 — VISUAL ANALYSIS ENRICHMENT (frames + Mistral Vision)
             # Best-effort : si échec, on continue sans la couche visuelle.
             # ═══════════════════════════════════════════════════════════════════
-            _visual_analysis_data: Optional[Dict[str, Any]] = None
-            if include_visual_analysis and platform in ("youtube", "tiktok"):
+            # Restaurée avec la synthèse : la couche visuelle n'est pas recalculée à la reprise
+            _visual_analysis_data: Optional[Dict[str, Any]] = (
+                _ckpt_synthesis.get("visual_analysis") if _ckpt_synthesis else None
+            )
+            if include_visual_analysis and platform in ("youtube", "tiktok") and not summary_content:
                 try:
                     from .visual_integration import (
                         STATUS_OK,
@@ -3361,7 +3507,9 @@ async def _analyze_video_background_v6(
                     # Graceful degradation : aucune erreur visuelle ne bloque l'analyse
                     logger.warning(f"👁️ [VISUAL] enrichment raised (graceful): {_ve}")
 
-            if needs_chunk:
+            if summary_content:
+                logger.info(f"⏯️ [JOB] Summary restored from checkpoint for task {task_id[:12]}")
+            elif needs_chunk:
                 # ════════════════════════════════════════════════════════════
                 # 📚 VIDÉO LONGUE — Analyse par chunks
                 # ════════════════════════════════════════════════════════════
@@ -3373,20 +3521,23 @@ async def _analyze_video_background_v6(
                     _task_store[task_id]["progress"] = progress
                     _task_store[task_id]["message"] = message
 
-                # v3.0: Analyser avec les VRAIS timestamps YouTube + routage intelligent
-                _long_video_result3 = await analyze_long_video(
-                    title=video_info["title"],
-                    transcript=transcript_to_analyze,
-                    video_duration=video_duration,
-                    category=category,
-                    lang=lang,
-                    mode=mode,
-                    model=model,
-                    web_context=web_context,
-                    progress_callback=update_progress,
-                    transcript_timestamped=transcript_timestamped,
-                    user_plan=user_plan,
-                )
+                if _long_video_result3 is None:
+                    # v3.0: Analyser avec les VRAIS timestamps YouTube + routage intelligent
+                    _long_video_result3 = await analyze_long_video(
+                        title=video_info["title"],
+                        transcript=transcript_to_analyze,
+                        video_duration=video_duration,
+                        category=category,
+                        lang=lang,
+                        mode=mode,
+                        model=model,
+                        web_context=web_context,
+                        progress_callback=update_progress,
+                        transcript_timestamped=transcript_timestamped,
+                        user_plan=user_plan,
+                    )
+                    if isinstance(_long_video_result3, LongVideoResult) and _long_video_result3.summary:
+                        await save_checkpoint("chunks", _long_video_result3.to_dict())
                 summary_content = (
                     _long_video_result3.summary
                     if isinstance(_long_video_result3, LongVideoResult)
@@ -3466,6 +3617,16 @@ async def _analyze_video_background_v6(
 
             final_word_count = len(summary_content.split())
             logger.info(f"✅ Summary generated: {final_word_count} words")
+            if not _ckpt_synthesis:
+                await save_checkpoint(
+                    "synthesis",
+                    {
+                        "summary_content": summary_content,
+                        "category": category,
+                        "confidence": confidence,
+                        "visual_analysis": _visual_analysis_data,
+                    },
+                )
 
             # ═══════════════════════════════════════════════════════════════════
             # 6+7. ⚡ ENTITÉS + FIABILITÉ EN PARALLÈLE (optimisation v6.1)
@@ -3509,17 +3670,6 @@ async def _analyze_video_background_v6(
             _task_store[task_id]["progress"] = 92
             _task_store[task_id]["message"] = "💾 Sauvegarde des résultats..."
 
-            # 🔐 CONSOMMER les crédits réservés (succès de l'opération)
-            if SECURITY_AVAILABLE:
-                await consume_reserved_credits(
-                    session, user_id, task_id, f"Video: {video_info['title'][:50]} ({model})"
-                )
-            else:
-                await deduct_credit(session, user_id, credit_cost, f"Video: {video_info['title'][:50]}")
-
-            _task_store[task_id]["progress"] = 94
-            _task_store[task_id]["message"] = "💾 Enregistrement de l'analyse..."
-
             # Préparer les métadonnées d'enrichissement
             enrichment_metadata = None
             if enrichment_sources:
@@ -3544,47 +3694,65 @@ async def _analyze_video_background_v6(
             # (cf orchestrator), ou None si pas généré.
             _external_pages_dict_v6 = external_pages_result if isinstance(external_pages_result, dict) else None
 
-            # Sauvegarder le résumé
-            summary_id = await save_summary(
-                session=session,
-                user_id=user_id,
-                video_id=video_id,
-                video_title=video_info["title"],
-                video_channel=video_info.get("channel", "Unknown"),
-                video_duration=video_info.get("duration", 0),
-                video_url=url,
-                thumbnail_url=default_thumbnail,
-                category=category,
-                category_confidence=confidence,
-                lang=lang,
-                mode=mode,
-                model_used=model,
-                summary_content=summary_content,
-                transcript_context=transcript_timestamped or transcript,
-                video_upload_date=video_info.get("upload_date"),
-                entities_extracted=entities,
-                reliability_score=reliability,
-                # 🆕 Métadonnées d'enrichissement
-                enrichment_data=enrichment_metadata,
-                platform=platform,
-                # 📊 Engagement metadata
-                view_count=video_info.get("view_count"),
-                like_count=video_info.get("like_count"),
-                comment_count=video_info.get("comment_count"),
-                share_count=video_info.get("share_count"),
-                channel_follower_count=video_info.get("channel_follower_count"),
-                content_type=video_info.get("content_type", "video"),
-                source_tags=video_info.get("tags", []),
-                video_description=video_info.get("description"),
-                channel_id=video_info.get("channel_id"),
-                music_title=video_info.get("music_title"),
-                music_author=video_info.get("music_author"),
-                carousel_images=video_info.get("carousel_images"),
-                # 💬 Community analysis (alembic 029)
-                community_analysis=_community_dict_v6,
-                # 🔗 External pages (alembic 031 — PR3)
-                external_pages=_external_pages_dict_v6,
-            )
+            # ⏯️ Job repris après la sauvegarde : crédits déjà consommés, on rejoue les finitions
+            _ckpt_extras = get_checkpoint("extras")
+            if _ckpt_extras:
+                summary_id = _ckpt_extras["summary_id"]
+            else:
+                # 🔐 CONSOMMER les crédits réservés (succès de l'opération)
+                if SECURITY_AVAILABLE:
+                    await consume_reserved_credits(
+                        session, user_id, task_id, f"Video: {video_info['title'][:50]} ({model})"
+                    )
+                else:
+                    await deduct_credit(session, user_id, credit_cost, f"Video: {video_info['title'][:50]}")
+
+                _task_store[task_id]["progress"] = 94
+                _task_store[task_id]["message"] = "💾 Enregistrement de l'analyse..."
+
+                # Sauvegarder le résumé
+                summary_id = await save_summary(
+                    session=session,
+                    user_id=user_id,
+                    video_id=video_id,
+                    video_title=video_info["title"],
+                    video_channel=video_info.get("channel", "Unknown"),
+                    video_duration=video_info.get("duration", 0),
+                    video_url=url,
+                    thumbnail_url=default_thumbnail,
+                    category=category,
+                    category_confidence=confidence,
+                    lang=lang,
+                    mode=mode,
+                    model_used=model,
+                    summary_content=summary_content,
+                    transcript_context=transcript_timestamped or transcript,
+                    video_upload_date=video_info.get("upload_date"),
+                    entities_extracted=entities,
+                    reliability_score=reliability,
+                    # 🆕 Métadonnées d'enrichissement
+                    enrichment_data=enrichment_metadata,
+                    platform=platform,
+                    # 📊 Engagement metadata
+                    view_count=video_info.get("view_count"),
+                    like_count=video_info.get("like_count"),
+                    comment_count=video_info.get("comment_count"),
+                    share_count=video_info.get("share_count"),
+                    channel_follower_count=video_info.get("channel_follower_count"),
+                    content_type=video_info.get("content_type", "video"),
+                    source_tags=video_info.get("tags", []),
+                    video_description=video_info.get("description"),
+                    channel_id=video_info.get("channel_id"),
+                    music_title=video_info.get("music_title"),
+                    music_author=video_info.get("music_author"),
+                    carousel_images=video_info.get("carousel_images"),
+                    # 💬 Community analysis (alembic 029)
+                    community_analysis=_community_dict_v6,
+                    # 🔗 External pages (alembic 031 — PR3)
+                    external_pages=_external_pages_dict_v6,
+                )
+
+                await save_checkpoint("extras", {"summary_id": summary_id})
 
             logger.info(f"💾 Summary saved: id={summary_id}")
 
@@ -3826,6 +3994,8 @@ async def cancel_task(
 
         task["status"] = "cancelled"
         task["message"] = "Analyse annulée par l'utilisateur"
+        # Encore en file : le job n'est jamais lancé (sinon annulation coopérative via le store)
+        await cancel_queued_analysis(task_id)
 
         if SECURITY_AVAILABLE:
             try:
@@ -3917,6 +4087,46 @@ async def get_task_status_endpoint(
     )
 
 
+@router.get("/status/{task_id}/events")
+async def stream_task_events(
+    task_id: str,
+    request: Request,
+    last_event_id: Optional[str] = Query(None, description="Reprise si le header Last-Event-ID est absent"),
+    current_user: User = Depends(get_current_user_sse),
+):
+    """
+    📣 Progression d'une tâche poussée en SSE (remplace le polling de /status/{task_id}).
+
+    Événements `progress` (même contenu que /status, `id` = event id) puis `end`
+    au statut terminal. EventSource renvoie Last-Event-ID à la reconnexion :
+    l'état courant n'est renvoyé que s'il est plus récent.
+    """
+    snapshot, event_id = await _task_store.aget_snapshot(task_id)
+    if snapshot is not None and snapshot.get("user_id") != current_user.id:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    if snapshot is None:
+        # Tâche expirée du store / cache : état final depuis la DB (event id 0)
+        from db.database import async_session_maker
+
+        async with async_session_maker() as session:
+            status_response = await get_task_status_endpoint(task_id, current_user, session)
+        snapshot = status_response.model_dump(exclude={"task_id"})
+
+    return StreamingResponse(
+        task_event_stream(
+            _task_store,
+            task_id,
+            snapshot,
+            event_id,
+            last_event_id=parse_last_event_id(request.headers.get("last-event-id"), last_event_id),
+            is_disconnected=request.is_disconnected,
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # 📋 RÉSUMÉS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -6023,13 +6233,13 @@ async def _extract_slideshow_frames(
     Extract frames from a slideshow video (TikTok/YouTube Short with no speech).
     Returns list of dicts {"data": base64, "mime_type": "image/jpeg"} or None.
     """
-    import subprocess
-    import asyncio
     import tempfile
     import base64
     import os
     import glob as glob_module
 
+    from core.media_process import run_media_process
+
     logger.info(f"🎞️ [SLIDESHOW] Extracting frames from {platform}: {video_url}")
 
     try:
@@ -6049,42 +6259,31 @@ async def _extract_slideshow_frames(
                 video_url,
             ]
 
-            loop = asyncio.get_event_loop()
-
-            def run_dl():
-                try:
-                    r = subprocess.run(download_cmd, capture_output=True, text=True, timeout=60)
-                    return r.returncode == 0
-                except Exception:
-                    return False
-
-            ok = await loop.run_in_executor(None, run_dl)
+            try:
+                ok = (await run_media_process(download_cmd, timeout=60)).ok
+            except Exception:
+                ok = False
             if not ok or not os.path.exists(video_path):
                 logger.error("🎞️ [SLIDESHOW] Download failed")
                 return None
 
-            def get_dur():
-                try:
-                    r = subprocess.run(
-                        [
-                            "ffprobe",
-                            "-v",
-                            "error",
-                            "-show_entries",
-                            "format=duration",
-                            "-of",
-                            "default=noprint_wrappers=1:nokey=1",
-                            video_path,
-                        ],
-                        capture_output=True,
-                        text=True,
-                        timeout=10,
-                    )
-                    return float(r.stdout.strip())
-                except Exception:
-                    return 30.0
-
-            duration = await loop.run_in_executor(None, get_dur)
+            try:
+                r = await run_media_process(
+                    [
+                        "ffprobe",
+                        "-v",
+                        "error",
+                        "-show_entries",
+                        "format=duration",
+                        "-of",
+                        "default=noprint_wrappers=1:nokey=1",
+                        video_path,
+                    ],
+                    timeout=10,
+                )
+                duration = float(r.text.strip())
+            except Exception:
+                duration = 30.0
 
             if duration <= 15:
                 interval = max(duration / (max_frames + 1), 1.0)
@@ -6110,14 +6309,10 @@ async def _extract_slideshow_frames(
                 "error",
             ]
 
-            def do_ff():
-                try:
-                    r = subprocess.run(ff_cmd, capture_output=True, text=True, timeout=30)
-                    return r.returncode == 0
-                except Exception:
-                    return False
-
-            ok = await loop.run_in_executor(None, do_ff)
+            try:
+                ok = (await run_media_process(ff_cmd, timeout=30)).ok
+            except Exception:
+                ok = False
             if not ok:
                 logger.error("🎞️ [SLIDESHOW] ffmpeg extraction failed")
                 return None
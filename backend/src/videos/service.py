@@ -151,7 +151,7 @@ async def save_summary(
     external_pages: Optional[Dict] = None,
 ) -> int:
     """Sauvegarde un nouveau résumé et retourne son ID"""
-    print(f"💾 [save_summary v2] Saving video_id={video_id}, user_id={user_id}", flush=True)
+    logger.info(f"💾 [save_summary v2] Saving video_id={video_id}, user_id={user_id}")
 
     # 🏷️ Extraire automatiquement les concepts [[marqués]] du résumé
     extracted_tags = []
@@ -697,7 +697,7 @@ try:
     ENRICHMENT_AVAILABLE = True
 except ImportError:
     ENRICHMENT_AVAILABLE = False
-    print("⚠️ [CHAT] Web enrichment not available", flush=True)
+    logger.warning("⚠️ [CHAT] Web enrichment not available")
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -851,7 +851,7 @@ try:
     SMART_SEARCH_AVAILABLE = True
 except ImportError:
     SMART_SEARCH_AVAILABLE = False
-    print("⚠️ Smart search not available", flush=True)
+    logger.warning("⚠️ Smart search not available")
 
 
 def build_chat_prompt(
@@ -907,7 +907,7 @@ def build_chat_prompt(
             question=question, transcript=transcript, video_duration=video_duration, max_context_words=max_context
         )
         if smart_search_used:
-            print(f"🔍 [SMART SEARCH] Extracted {num_passages} relevant passages for: {question[:50]}...", flush=True)
+            logger.info(f"🔍 [SMART SEARCH] Extracted {num_passages} relevant passages for: {question[:50]}...")
     else:
         # Fallback: troncature simple
         transcript_context = transcript[:max_context] if transcript else ""
@@ -1045,7 +1045,7 @@ async def generate_chat_response(
     )
     if result:
         if result.fallback_used:
-            print(f"🔄 [CHAT] Used fallback: {result.provider}:{result.model_used}", flush=True)
+            logger.info(f"🔄 [CHAT] Used fallback: {result.provider}:{result.model_used}")
         return result.content
     return None
 
@@ -1134,7 +1134,7 @@ async def generate_chat_response_v4(
     Returns:
         Tuple[response, sources, web_search_used]
     """
-    print(f"💬 [CHAT v5.0] Generating response for plan: {user_plan}", flush=True)
+    logger.info(f"💬 [CHAT v5.0] Generating response for plan: {user_plan}")
 
     # Variables pour l'enrichissement web
     web_context = None
@@ -1154,12 +1154,12 @@ async def generate_chat_response_v4(
                 # L'utilisateur a demandé explicitement une recherche web
                 should_search = True
                 search_reason = "user_requested"
-                print("🌐 [CHAT v5.0] Web search explicitly requested by user", flush=True)
+                logger.info("🌐 [CHAT v5.0] Web search explicitly requested by user")
             else:
                 # Détection INTELLIGENTE: la question nécessite-t-elle des infos récentes?
                 should_search, search_reason = needs_web_search_for_chat(question, video_title)
                 if should_search:
-                    print(f"🔍 [CHAT v5.0] Intelligent detection triggered: {search_reason}", flush=True)
+                    logger.info(f"🔍 [CHAT v5.0] Intelligent detection triggered: {search_reason}")
 
             if should_search:
                 try:
@@ -1175,15 +1175,14 @@ async def generate_chat_response_v4(
 
                     if was_enriched and web_context:
                         web_search_used = True
-                        print(
-                            f"✅ [CHAT v5.0] Got web context: {len(web_context)} chars, {len(sources)} sources",
-                            flush=True,
+                        logger.info(
+                            f"✅ [CHAT v5.0] Got web context: {len(web_context)} chars, {len(sources)} sources"
                         )
                     else:
-                        print("⚠️ [CHAT v5.0] Web search returned no useful context", flush=True)
+                        logger.warning("⚠️ [CHAT v5.0] Web search returned no useful context")
 
                 except Exception as e:
-                    print(f"⚠️ [CHAT v5.0] Web enrichment failed: {e}", flush=True)
+                    logger.warning(f"⚠️ [CHAT v5.0] Web enrichment failed: {e}")
 
     # 2. Générer la réponse avec Mistral (avec contexte web si disponible)
     base_response = await generate_chat_response(
@@ -1201,7 +1200,7 @@ async def generate_chat_response_v4(
     if not base_response:
         return "Désolé, je n'ai pas pu générer de réponse.", [], False
 
-    print(f"✅ [CHAT v5.0] Base response: {len(base_response)} chars", flush=True)
+    logger.info(f"✅ [CHAT v5.0] Base response: {len(base_response)} chars")
 
     # 3. Si on a du contexte web, l'ajouter à la réponse
     if web_search_used and web_context:
@@ -1216,7 +1215,7 @@ async def generate_chat_response_v4(
 
 {web_context}"""
 
-        print("✅ [CHAT v5.0] Added web context to response", flush=True)
+        logger.info("✅ [CHAT v5.0] Added web context to response")
 
     return base_response, sources, web_search_used
 
@@ -1369,7 +1368,7 @@ async def search_with_perplexity(question: str, context: str, lang: str = "fr")
             return result.content
         return None
     except Exception as e:
-        print(f"❌ [WEB_SEARCH] Error: {e}", flush=True)
+        logger.error(f"❌ [WEB_SEARCH] Error: {e}")
         return None
 
 
@@ -10,9 +10,13 @@
 
 import re
 import math
+import bisect
+import hashlib
+import os
+import threading
 from typing import List, Tuple, Dict
-from dataclasses import dataclass
-from collections import Counter
+from dataclasses import dataclass, replace
+from collections import Counter, OrderedDict
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🔧 CONFIGURATION
@@ -28,6 +32,9 @@ MAX_RELEVANT_PASSAGES = 8
 PASSAGE_SIZE_WORDS = 500
 PASSAGE_OVERLAP_WORDS = 100
 
+# Nombre de transcripts dont l'index BM25 reste en mémoire (réutilisé entre les tours de chat)
+BM25_INDEX_CACHE_SIZE = int(os.getenv("BM25_INDEX_CACHE_SIZE", "64"))
+
 # Mots vides à ignorer (stopwords FR + EN)
 STOPWORDS_FR = {
     "le",
@@ -437,6 +444,120 @@ def build_passage_index(passages: List[TranscriptPassage]) -> Dict[str, List[int
     return index
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# 🗂️ INDEX BM25 PRÉCALCULÉ (par transcript)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_TOKEN_RE = re.compile(r"[a-z0-9]{3,}")
+
+
+@dataclass
+class BM25Index:
+    """Index inversé d'un transcript découpé en passages.
+
+    Tokenisé UNE fois : postings ``terme → [(passage, tf)]``, longueurs des
+    passages et longueur moyenne. Une requête ne touche que les postings de ses
+    termes au lieu de re-normaliser tous les passages pour chaque terme.
+
+    Un terme de requête couvre tous les tokens qui le prolongent (vocabulaire
+    trié, recherche par bisection) : « vaccin » matche « vaccins » et
+    « vaccination », comme le ``count()`` par sous-chaîne de l'ancien scorer.
+    """
+
+    passages: List[TranscriptPassage]
+    postings: Dict[str, List[Tuple[int, int]]]
+    doc_lengths: List[int]
+    avg_len: float
+    vocabulary: List[str]
+
+    @classmethod
+    def build(cls, passages: List[TranscriptPassage]) -> "BM25Index":
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        doc_lengths = []
+        for i, passage in enumerate(passages):
+            doc_lengths.append(len(passage.text.split()))
+            for term, tf in Counter(_TOKEN_RE.findall(normalize_text(passage.text))).items():
+                postings.setdefault(term, []).append((i, tf))
+        avg_len = (sum(doc_lengths) / len(doc_lengths)) if doc_lengths else 0.0
+        return cls(
+            passages=passages,
+            postings=postings,
+            doc_lengths=doc_lengths,
+            avg_len=avg_len or 1.0,
+            vocabulary=sorted(postings),
+        )
+
+    def term_frequencies(self, term: str) -> Dict[int, int]:
+        """``{passage: tf}`` du terme, tf cumulé sur les tokens dont il est préfixe."""
+        tfs: Dict[int, int] = {}
+        start = bisect.bisect_left(self.vocabulary, term)
+        for token in self.vocabulary[start:]:
+            if not token.startswith(term):
+                break
+            for i, tf in self.postings[token]:
+                tfs[i] = tfs.get(i, 0) + tf
+        return tfs
+
+    def score(self, query_terms: List[str], k1: float = 1.5, b: float = 0.75) -> Dict[int, Tuple[float, List[str]]]:
+        """Scores BM25 des passages qui matchent au moins un terme : ``{idx: (score, matched_terms)}``."""
+        results: Dict[int, Tuple[float, List[str]]] = {}
+        n = len(self.passages)
+        for term in dict.fromkeys(query_terms):
+            tfs = self.term_frequencies(term)
+            if not tfs:
+                continue
+            idf = math.log((n - len(tfs) + 0.5) / (len(tfs) + 0.5) + 1)
+            for i, tf in tfs.items():
+                norm = k1 * (1 - b + b * (self.doc_lengths[i] / self.avg_len))
+                term_score = idf * (tf * (k1 + 1)) / (tf + norm)
+                score, matched = results.get(i, (0.0, []))
+                matched.append(term)
+                results[i] = (score + term_score, matched)
+        return results
+
+
+_index_cache: "OrderedDict[str, BM25Index]" = OrderedDict()
+_index_cache_lock = threading.Lock()
+_index_cache_stats = {"hits": 0, "misses": 0}
+
+
+def get_transcript_index(transcript: str, video_duration: int = 0) -> BM25Index:
+    """Index BM25 du transcript, mis en cache (LRU) par empreinte du contenu.
+
+    La clé est le hash du texte : tous les appelants (chat, voice, débat) qui
+    travaillent sur le même transcript partagent l'index, quel que soit le
+    chemin par lequel ils l'ont chargé.
+    """
+    digest = hashlib.sha1(transcript.encode("utf-8", "surrogatepass")).hexdigest()
+    key = f"{digest}:{video_duration}:{PASSAGE_SIZE_WORDS}:{PASSAGE_OVERLAP_WORDS}"
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            _index_cache_stats["hits"] += 1
+            return index
+        _index_cache_stats["misses"] += 1
+
+    index = BM25Index.build(split_into_passages(transcript, video_duration))
+    with _index_cache_lock:
+        _index_cache[key] = index
+        _index_cache.move_to_end(key)
+        while len(_index_cache) > BM25_INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
+
+
+def get_index_cache_stats() -> dict:
+    with _index_cache_lock:
+        return {**_index_cache_stats, "size": len(_index_cache), "max_size": BM25_INDEX_CACHE_SIZE}
+
+
+def clear_index_cache() -> None:
+    with _index_cache_lock:
+        _index_cache.clear()
+        _index_cache_stats.update(hits=0, misses=0)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🎯 RECHERCHE DE PASSAGES PERTINENTS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -453,6 +574,10 @@ def calculate_bm25_score(
     Calcule le score BM25 d'un passage pour une requête.
     BM25 est un algorithme de ranking standard en recherche d'information.
 
+    ⚠️ Implémentation de référence, O(termes × passages²) : elle re-normalise
+    tous les passages pour chaque terme. ``search_relevant_passages`` utilise
+    ``BM25Index`` (précalculé et caché) ; celle-ci reste pour le benchmark.
+
     Returns:
         (score, matched_terms)
     """
@@ -495,7 +620,6 @@ def search_relevant_passages(
     transcript: str,
     video_duration: int = 0,
     max_passages: int = MAX_RELEVANT_PASSAGES,
-    min_score: float = 0.5,
 ) -> List[TranscriptPassage]:
     """
     🔍 Recherche les passages les plus pertinents pour une question.
@@ -505,7 +629,6 @@ def search_relevant_passages(
         transcript: Transcript complet
         video_duration: Durée de la vidéo (pour les timecodes)
         max_passages: Nombre max de passages à retourner
-        min_score: Score minimum pour inclure un passage
 
     Returns:
         Liste des passages pertinents, triés par relevance
@@ -547,17 +670,15 @@ def search_relevant_passages(
             ),
         ]
 
-    # Diviser en passages
-    passages = split_into_passages(transcript, video_duration)
-
-    # Calculer les scores pour chaque passage
-    scored_passages = []
-    for passage in passages:
-        score, matched = calculate_bm25_score(query_terms, passage, passages)
-        if score >= min_score or len(matched) > 0:
-            passage.relevance_score = score
-            passage.matched_terms = matched
-            scored_passages.append(passage)
+    # Index BM25 du transcript (construit une fois, réutilisé entre les tours de chat)
+    index = get_transcript_index(transcript, video_duration)
+
+    # Seuls les passages contenant au moins un terme sont scorés ; copies pour
+    # ne pas muter les passages partagés du cache
+    scored_passages = [
+        replace(index.passages[i], relevance_score=score, matched_terms=matched)
+        for i, (score, matched) in index.score(query_terms).items()
+    ]
 
     # Trier par score décroissant
     scored_passages.sort(key=lambda p: p.relevance_score, reverse=True)
@@ -33,6 +33,7 @@ from auth.dependencies import get_current_user_optional
 from core.config import get_mistral_key, get_perplexity_key
 from core.cache import cache, get_cache
 from core.http_client import shared_http_client
+from core.logging import logger
 from transcripts.youtube import get_transcript_with_timestamps, get_video_info
 
 # 🌐 Web enrichment pré-analyse (Perplexity)
@@ -42,7 +43,7 @@ try:
     WEB_ENRICHMENT_AVAILABLE = True
 except ImportError as e:
     WEB_ENRICHMENT_AVAILABLE = False
-    print(f"⚠️ [STREAMING] Web enrichment unavailable: {e}", flush=True)
+    logger.warning(f"⚠️ [STREAMING] Web enrichment unavailable: {e}")
 
     async def get_pre_analysis_context(*args, **kwargs):
         return None, [], None
@@ -55,7 +56,7 @@ try:
     BRAVE_SEARCH_AVAILABLE = True
 except ImportError as e:
     BRAVE_SEARCH_AVAILABLE = False
-    print(f"⚠️ [STREAMING] Brave Search unavailable: {e}", flush=True)
+    logger.warning(f"⚠️ [STREAMING] Brave Search unavailable: {e}")
 
     async def get_brave_factcheck_context(*args, **kwargs):
         return None, []
@@ -91,7 +92,7 @@ try:
     HTTPX_AVAILABLE = True
 except ImportError:
     HTTPX_AVAILABLE = False
-    print("⚠️ [STREAMING] httpx not available", flush=True)
+    logger.warning("⚠️ [STREAMING] httpx not available")
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 📊 TYPES & ENUMS
@@ -219,7 +220,7 @@ async def get_video_metadata(video_id: str) -> Dict[str, Any]:
                 await cache.set(f"metadata:{video_id}", metadata, ttl=86400)
                 return metadata
     except Exception as e:
-        print(f"⚠️ [STREAMING] Metadata fetch error: {e}", flush=True)
+        logger.warning(f"⚠️ [STREAMING] Metadata fetch error: {e}")
 
     return {"title": "", "channel": "", "thumbnail": ""}
 
@@ -372,14 +373,13 @@ Structure your response with:
         # Préparer le transcript adapté au tier
         adapted_transcript = prepare_transcript_for_analysis(profile, transcript, transcript_timestamped, index_entries)
 
-        print(
+        logger.info(
             f"🎬 [STREAMING] Duration router: tier={profile.tier.value}, "
             f"duration={video_duration}s, transcript={len(adapted_transcript)} chars "
-            f"(original: {len(transcript)} chars), index_entries={len(index_entries)}",
-            flush=True,
+            f"(original: {len(transcript)} chars), index_entries={len(index_entries)}"
         )
     except Exception as e:
-        print(f"⚠️ [STREAMING] Duration router fallback: {e}", flush=True)
+        logger.warning(f"⚠️ [STREAMING] Duration router fallback: {e}")
         # Fallback : limitation intelligente basée sur la durée
         if video_duration > 1800:  # >30min
             adapted_transcript = transcript[:80000]
@@ -476,7 +476,7 @@ Génère une analyse complète et rigoureuse en {"français" if lang == "fr" els
                             continue
 
     except Exception as e:
-        print(f"❌ [STREAMING] Mistral error: {e}", flush=True)
+        logger.error(f"❌ [STREAMING] Mistral error: {e}")
         raise
 
 
@@ -500,6 +500,7 @@ async def analysis_stream_generator(
     """
     video_id = session.video_id
     full_text = ""
+    fetch_task: Optional[asyncio.Task] = None
 
     try:
         # ═══════════════════════════════════════════════════════════════════════
@@ -562,7 +563,28 @@ async def analysis_stream_generator(
             transcript = cached_transcript
         else:
             # Fetch transcript (returns tuple: simple_text, timestamped_text, detected_lang)
-            transcript_result = await get_transcript_with_timestamps(video_id)
+            # Audio long (STT découpé) : chaque segment transcrit remonte en progression
+            partials: asyncio.Queue = asyncio.Queue()
+            fetch_task = asyncio.create_task(
+                get_transcript_with_timestamps(video_id, on_partial=partials.put_nowait)
+            )
+            while not fetch_task.done():
+                get_partial = asyncio.ensure_future(partials.get())
+                await asyncio.wait({fetch_task, get_partial}, return_when=asyncio.FIRST_COMPLETED)
+                if not get_partial.done():
+                    get_partial.cancel()
+                    continue
+                partial = get_partial.result()
+                yield format_sse_event(
+                    StreamEventType.TRANSCRIPT,
+                    {
+                        "progress": int(partial.done * 100 / partial.total),
+                        "segments_done": partial.done,
+                        "segments_total": partial.total,
+                        "partial_word_count": len(partial.simple.split()),
+                    },
+                )
+            transcript_result = fetch_task.result()
             if transcript_result and isinstance(transcript_result, tuple):
                 transcript = transcript_result[0] or ""
             elif transcript_result:
@@ -621,7 +643,7 @@ async def analysis_stream_generator(
         # 🔬 PATH A: DEEP RESEARCH (Brave massif + Perplexity sonar-pro)
         # ─────────────────────────────────────────────────────────────────
         if deep_research and user_plan in ("pro", "admin"):
-            print(f"🔬 [DEEP RESEARCH] Pipeline activé pour plan={user_plan}", flush=True)
+            logger.info(f"🔬 [DEEP RESEARCH] Pipeline activé pour plan={user_plan}")
             try:
                 # Étape 1: Brave Search massif (5 queries × 8 résultats)
                 yield format_sse_event(
@@ -682,10 +704,10 @@ async def analysis_stream_generator(
                         web_context = brave_text
                         enrichment_sources_list = brave_sources
                 else:
-                    print("⚠️ [DEEP RESEARCH] Brave returned nothing, fallback to standard", flush=True)
+                    logger.warning("⚠️ [DEEP RESEARCH] Brave returned nothing, fallback to standard")
 
             except Exception as e:
-                print(f"⚠️ [DEEP RESEARCH] Error (non-blocking): {e}", flush=True)
+                logger.warning(f"⚠️ [DEEP RESEARCH] Error (non-blocking): {e}")
 
         # ─────────────────────────────────────────────────────────────────
         # 🌐 PATH B: STANDARD (Perplexity sonar + Brave fact-check)
@@ -724,7 +746,7 @@ async def analysis_stream_generator(
                     for kw in fast_changing_keywords:
                         if kw in title_lower or kw in transcript_start:
                             should_enrich = True
-                            print(f"🌐 [AUTO-ENRICH] Keyword '{kw}' detected", flush=True)
+                            logger.info(f"🌐 [AUTO-ENRICH] Keyword '{kw}' detected")
                             break
 
                 if should_enrich:
@@ -760,7 +782,7 @@ async def analysis_stream_generator(
                         )
 
             except Exception as e:
-                print(f"⚠️ [WEB-ENRICH] Error (non-blocking): {e}", flush=True)
+                logger.warning(f"⚠️ [WEB-ENRICH] Error (non-blocking): {e}")
 
         # 🦁 Brave fact-check standard (si pas de deep research)
         brave_context = None
@@ -817,7 +839,7 @@ async def analysis_stream_generator(
                         )
 
                 except Exception as e:
-                    print(f"⚠️ [BRAVE] Error (non-blocking): {e}", flush=True)
+                    logger.warning(f"⚠️ [BRAVE] Error (non-blocking): {e}")
 
             # Fusionner Perplexity + Brave
             if brave_context and web_context:
@@ -964,7 +986,7 @@ async def analysis_stream_generator(
         )
 
     except Exception as e:
-        print(f"❌ [STREAMING] Error: {e}", flush=True)
+        logger.error(f"❌ [STREAMING] Error: {e}")
         session.status = "error"
 
         yield format_sse_event(
@@ -977,6 +999,9 @@ async def analysis_stream_generator(
         )
 
     finally:
+        # Client déconnecté pendant le transcript : ne pas laisser tourner le STT
+        if fetch_task is not None and not fetch_task.done():
+            fetch_task.cancel()
         # Cleanup session after a delay
         await asyncio.sleep(5)
         session_manager.remove(session.session_id)
@@ -13,6 +13,7 @@ from datetime import datetime
 
 # Import configuration
 from core.llm_provider import llm_complete
+from core.logging import logger
 
 # Message de startup visible
 print("", file=sys.stderr, flush=True)
@@ -22,9 +23,8 @@ print("🎓📚 ═════════════════════
 
 
 def log(msg: str):
-    """Log avec flush immédiat sur stderr pour garantir l'affichage."""
-    print(msg, file=sys.stderr, flush=True)
-    print(msg, flush=True)
+    """Log structuré — écrit par le thread listener de core.logging, hors event loop."""
+    logger.info(msg)
 
 
 def safe_json_parse(text: str, context: str = "JSON") -> Dict[str, Any]:
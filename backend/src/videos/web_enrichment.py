@@ -14,6 +14,7 @@ from enum import Enum
 from dataclasses import dataclass
 from datetime import datetime
 
+from core.logging import logger
 from videos.web_search_provider import web_search_and_synthesize
 
 
@@ -772,7 +773,7 @@ async def call_perplexity(prompt: str, level: EnrichmentLevel) -> EnrichmentResu
     }
     purpose = purpose_map.get(level, "enrichment")
 
-    print(f"🌐 [WEB_SEARCH] Calling Brave+Mistral: level={level.value}, purpose={purpose}", flush=True)
+    logger.info(f"🌐 [WEB_SEARCH] Calling Brave+Mistral: level={level.value}, purpose={purpose}")
 
     try:
         result = await web_search_and_synthesize(
@@ -786,7 +787,7 @@ async def call_perplexity(prompt: str, level: EnrichmentLevel) -> EnrichmentResu
         )
 
         if result.success:
-            print(f"✅ [WEB_SEARCH] Success: {len(result.content)} chars, {len(result.sources)} sources", flush=True)
+            logger.info(f"✅ [WEB_SEARCH] Success: {len(result.content)} chars, {len(result.sources)} sources")
             return EnrichmentResult(
                 success=True,
                 content=result.content,
@@ -796,11 +797,11 @@ async def call_perplexity(prompt: str, level: EnrichmentLevel) -> EnrichmentResu
             )
         else:
             error_msg = result.error or "Unknown error"
-            print(f"❌ [WEB_SEARCH] {error_msg}", flush=True)
+            logger.error(f"❌ [WEB_SEARCH] {error_msg}")
             return EnrichmentResult(success=False, content="", sources=[], level=level, error=error_msg)
     except Exception as e:
         error_msg = str(e)
-        print(f"❌ [WEB_SEARCH] Exception: {error_msg}", flush=True)
+        logger.error(f"❌ [WEB_SEARCH] Exception: {error_msg}")
         return EnrichmentResult(success=False, content="", sources=[], level=level, error=error_msg)
 
 
@@ -831,11 +832,11 @@ async def get_pre_analysis_context(
     """
     level = get_enrichment_level(plan)
 
-    print(f"🌐 [PRE-ANALYSIS] Plan={plan}, Level={level.value}", flush=True)
+    logger.info(f"🌐 [PRE-ANALYSIS] Plan={plan}, Level={level.value}")
 
     # Seuls Pro et Expert ont l'enrichissement
     if level == EnrichmentLevel.NONE:
-        print(f"⏭️ [PRE-ANALYSIS] Skipped (plan={plan})", flush=True)
+        logger.info(f"⏭️ [PRE-ANALYSIS] Skipped (plan={plan})")
         return None, [], level
 
     # 🚀 CACHE: Check Redis for cached web enrichment context
@@ -849,10 +850,10 @@ async def get_pre_analysis_context(
         cache_key = f"web_context:{hashlib.md5(cache_input.encode()).hexdigest()}"
         cached = await cache_service.get(cache_key)
         if cached and isinstance(cached, dict):
-            print(f"✅ [PRE-ANALYSIS] Cache HIT for {video_title[:50]}", flush=True)
+            logger.info(f"✅ [PRE-ANALYSIS] Cache HIT for {video_title[:50]}")
             return cached.get("content"), cached.get("sources", []), level
     except Exception as e:
-        print(f"⚠️ [PRE-ANALYSIS] Cache GET failed: {e}", flush=True)
+        logger.warning(f"⚠️ [PRE-ANALYSIS] Cache GET failed: {e}")
 
     # Construire le prompt
     prompt = build_pre_analysis_prompt(
@@ -872,17 +873,17 @@ async def get_pre_analysis_context(
     result = await call_perplexity(prompt, level)
 
     if not result.success:
-        print(f"⚠️ [PRE-ANALYSIS] Failed: {result.error}", flush=True)
+        logger.warning(f"⚠️ [PRE-ANALYSIS] Failed: {result.error}")
         return None, [], level
 
-    print(f"✅ [PRE-ANALYSIS] Got {len(result.content)} chars of context", flush=True)
+    logger.info(f"✅ [PRE-ANALYSIS] Got {len(result.content)} chars of context")
 
     # 🚀 CACHE: Store in Redis (TTL 1h — web data stays fresh but avoids redundant calls)
     if cache_key:
         try:
             await cache_service.set(cache_key, {"content": result.content, "sources": result.sources}, ttl=3600)
         except Exception as e:
-            print(f"⚠️ [PRE-ANALYSIS] Cache SET failed: {e}", flush=True)
+            logger.warning(f"⚠️ [PRE-ANALYSIS] Cache SET failed: {e}")
 
     return result.content, result.sources, level
 
@@ -908,10 +909,10 @@ async def enrich_chat_if_needed(
     needs_search, reason = needs_web_search_for_chat(question, video_title, video_date=video_date)
 
     if not needs_search:
-        print(f"⏭️ [CHAT ENRICHMENT] Not needed: {reason}", flush=True)
+        logger.info(f"⏭️ [CHAT ENRICHMENT] Not needed: {reason}")
         return None, [], False
 
-    print(f"🔍 [CHAT ENRICHMENT] Triggered: {reason}", flush=True)
+    logger.info(f"🔍 [CHAT ENRICHMENT] Triggered: {reason}")
 
     # Construire et exécuter le prompt
     prompt = build_chat_enrichment_prompt(
@@ -921,10 +922,10 @@ async def enrich_chat_if_needed(
     result = await call_perplexity(prompt, level)
 
     if not result.success:
-        print(f"⚠️ [CHAT ENRICHMENT] Failed: {result.error}", flush=True)
+        logger.warning(f"⚠️ [CHAT ENRICHMENT] Failed: {result.error}")
         return None, [], False
 
-    print(f"✅ [CHAT ENRICHMENT] Got {len(result.content)} chars", flush=True)
+    logger.info(f"✅ [CHAT ENRICHMENT] Got {len(result.content)} chars")
 
     return result.content, result.sources, True
 
@@ -1033,7 +1034,7 @@ async def enrich_chat_response(
     if level == EnrichmentLevel.NONE:
         return base_response, [], level
 
-    print(f"🔍 [ENRICH CHAT v5.0] Starting enrichment for plan={plan}, level={level.value}", flush=True)
+    logger.info(f"🔍 [ENRICH CHAT v5.0] Starting enrichment for plan={plan}, level={level.value}")
 
     # Construire le prompt de fact-checking
     if lang == "fr":
@@ -1087,11 +1088,11 @@ If original response is correct, confirm it. Otherwise, correct with real facts.
     result = await call_perplexity(prompt, level)
 
     if not result.success:
-        print(f"⚠️ [ENRICH CHAT v5.0] Perplexity call failed: {result.error}", flush=True)
+        logger.warning(f"⚠️ [ENRICH CHAT v5.0] Perplexity call failed: {result.error}")
         return base_response, [], level
 
-    print(
-        f"✅ [ENRICH CHAT v5.0] Got enrichment: {len(result.content)} chars, {len(result.sources)} sources", flush=True
+    logger.info(
+        f"✅ [ENRICH CHAT v5.0] Got enrichment: {len(result.content)} chars, {len(result.sources)} sources"
     )
 
     # Formater la réponse enrichie
@@ -1164,11 +1165,11 @@ Factuel, sources citées. Max 800 mots."""
 
 🎯 Verify claims, find contradictions, add context, update data, counter-arguments, reliability /10. Max 800 words."""
 
-    print("🔬 [DEEP_RESEARCH] Calling Perplexity sonar-pro...", flush=True)
+    logger.info("🔬 [DEEP_RESEARCH] Calling Perplexity sonar-pro...")
     result = await call_perplexity(prompt, EnrichmentLevel.DEEP_RESEARCH)
 
     if not result.success:
-        print(f"⚠️ [DEEP_RESEARCH] Failed: {result.error}", flush=True)
+        logger.warning(f"⚠️ [DEEP_RESEARCH] Failed: {result.error}")
         return None, brave_sources
 
     all_sources = list(brave_sources) if brave_sources else []
@@ -1188,5 +1189,5 @@ Factuel, sources citées. Max 800 mots."""
         + f"📚 {len(all_sources)} sources analysées et croisées."
     )
 
-    print(f"✅ [DEEP_RESEARCH] Done: {len(result.content)} chars, {len(all_sources)} sources", flush=True)
+    logger.info(f"✅ [DEEP_RESEARCH] Done: {len(result.content)} chars, {len(all_sources)} sources")
     return context_text, all_sources
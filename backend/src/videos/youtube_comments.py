@@ -11,6 +11,7 @@ from typing import List, Dict, Any, Tuple
 
 from core.config import get_mistral_key
 from core.http_client import shared_http_client
+from core.logging import logger
 
 from .schemas import YouTubeComment, CommentsAnalysis, SentimentType, CommentCategory
 
@@ -143,11 +144,12 @@ async def fetch_youtube_comments(
     Returns:
         Liste des commentaires bruts
     """
-    import subprocess
     import tempfile
     import os
 
-    print(f"💬 [COMMENTS] Fetching up to {limit} comments for video {video_id}...", flush=True)
+    from core.media_process import MediaProcessTimeout, run_media_process
+
+    logger.info(f"💬 [COMMENTS] Fetching up to {limit} comments for video {video_id}...")
 
     try:
         # Créer un fichier temporaire pour la sortie
@@ -168,7 +170,7 @@ async def fetch_youtube_comments(
         ]
 
         # Exécuter yt-dlp
-        subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+        await run_media_process(cmd, timeout=60)
 
         comments_file = temp_path.replace(".json", ".info.json")
 
@@ -179,21 +181,21 @@ async def fetch_youtube_comments(
             raw_comments = data.get("comments", [])
             os.unlink(comments_file)
 
-            print(f"✅ [COMMENTS] Fetched {len(raw_comments)} comments", flush=True)
+            logger.info(f"✅ [COMMENTS] Fetched {len(raw_comments)} comments")
             return raw_comments[:limit]
 
         # Nettoyage
         if os.path.exists(temp_path):
             os.unlink(temp_path)
 
-        print("⚠️ [COMMENTS] No comments found or extraction failed", flush=True)
+        logger.warning("⚠️ [COMMENTS] No comments found or extraction failed")
         return []
 
-    except subprocess.TimeoutExpired:
-        print("⚠️ [COMMENTS] Timeout while fetching comments", flush=True)
+    except MediaProcessTimeout:
+        logger.warning("⚠️ [COMMENTS] Timeout while fetching comments")
         return []
     except Exception as e:
-        print(f"❌ [COMMENTS] Error fetching comments: {e}", flush=True)
+        logger.error(f"❌ [COMMENTS] Error fetching comments: {e}")
         return []
 
 
@@ -244,7 +246,7 @@ async def fetch_comments_via_api(video_id: str, api_key: str, limit: int = 100)
                     break
 
             except Exception as e:
-                print(f"❌ [COMMENTS API] Error: {e}", flush=True)
+                logger.error(f"❌ [COMMENTS API] Error: {e}")
                 break
 
     return comments
@@ -439,7 +441,7 @@ async def analyze_comments_with_ai(
     """
     api_key = get_mistral_key()
     if not api_key:
-        print("⚠️ [COMMENTS AI] No Mistral API key available", flush=True)
+        logger.warning("⚠️ [COMMENTS AI] No Mistral API key available")
         return {}
 
     # Préparer les commentaires pour l'analyse
@@ -491,7 +493,7 @@ Réponds UNIQUEMENT avec le JSON, sans markdown."""
             return json.loads(content)
 
     except Exception as e:
-        print(f"❌ [COMMENTS AI] Error: {e}", flush=True)
+        logger.error(f"❌ [COMMENTS AI] Error: {e}")
         return {}
 
 
@@ -522,13 +524,13 @@ async def analyze_comments(
     Returns:
         CommentsAnalysis avec toutes les métriques
     """
-    print(f"💬 [COMMENTS] Starting full analysis for {video_id}...", flush=True)
+    logger.info(f"💬 [COMMENTS] Starting full analysis for {video_id}...")
 
     # 1. Récupérer les commentaires
     raw_comments = await fetch_youtube_comments(video_id, limit)
 
     if not raw_comments:
-        print(f"⚠️ [COMMENTS] No comments found for {video_id}", flush=True)
+        logger.warning(f"⚠️ [COMMENTS] No comments found for {video_id}")
         return CommentsAnalysis(video_id=video_id, total_comments=0, analyzed_count=0)
 
     # 2. Analyser chaque commentaire
@@ -659,10 +661,9 @@ async def analyze_comments(
         summary=summary,
     )
 
-    print(
+    logger.info(
         f"✅ [COMMENTS] Analysis complete: {n_analyzed} comments, "
-        f"sentiment={avg_sentiment:.2f}, constructive={constructive_ratio:.1%}",
-        flush=True,
+        f"sentiment={avg_sentiment:.2f}, constructive={constructive_ratio:.1%}"
     )
 
     return analysis
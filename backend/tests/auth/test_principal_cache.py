@@ -0,0 +1,147 @@
+"""Cache du principal de ``get_current_user`` (``auth.principal_cache``).
+
+Chaque test a sa base SQLite et un backend ``cache_service`` mémoire neuf : les
+IDs users se répètent d'un test à l'autre.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import uuid
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+# Imports du package auth dans les tests : la chaîne auth ↔ billing casse si
+# elle est importée à la collecte.
+
+
+@pytest.fixture(autouse=True)
+def jwt_secret(monkeypatch):
+    """Clé de signature pour ce module seulement (pas de fuite via ``os.environ``)."""
+    import core.config as _cfg
+
+    monkeypatch.setitem(_cfg.JWT_CONFIG, "SECRET_KEY", "test-secret-key-minimum-32-characters-long!")
+
+
+@pytest_asyncio.fixture
+async def session_factory(monkeypatch):
+    from core.cache import InMemoryCacheBackend, cache_service
+    from db.database import Base
+
+    monkeypatch.setattr(cache_service, "backend", InMemoryCacheBackend())
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def v2_login(session_factory, monkeypatch):
+    """User + UserSession V2 en DB ; retourne ``(user_id, jti, credentials)``."""
+    import core.config as _cfg
+    from auth import dependencies as deps
+    from auth.service import create_access_token_v2, create_session_v2
+    from db.database import User
+
+    monkeypatch.setattr(_cfg, "AUTH_V2_ENABLED", True)
+    monkeypatch.setattr(_cfg, "AUTH_V2_BUCKET_PERCENT", 100)
+    monkeypatch.setattr(_cfg, "AUTH_V2_CUTOVER_DATE", "")
+    monkeypatch.setattr(deps, "SECURITY_AVAILABLE", False, raising=False)
+
+    async with session_factory() as db:
+        user = User(username=f"u_{uuid.uuid4().hex[:8]}", email=f"{uuid.uuid4().hex[:8]}@example.com", password_hash="x")
+        db.add(user)
+        await db.commit()
+        user_session = await create_session_v2(session=db, user_id=user.id, stay_signed_in=True, request=None)
+        await db.commit()
+        token = create_access_token_v2(user_id=user.id, jti=user_session.id)
+    return user.id, user_session.id, HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+async def _current_user(session_factory, credentials):
+    from auth.dependencies import get_current_user
+
+    async with session_factory() as db:
+        return await get_current_user(credentials=credentials, token=None, session=db)
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_user_and_session_queries(session_factory, v2_login, monkeypatch):
+    from auth import dependencies as deps
+
+    user_id, _, credentials = v2_login
+    first = await _current_user(session_factory, credentials)
+
+    monkeypatch.setattr(deps, "get_user_by_id", AsyncMock(side_effect=AssertionError("DB hit")))
+    monkeypatch.setattr(deps, "validate_session_v2", AsyncMock(side_effect=AssertionError("DB hit")))
+    async with session_factory() as db:
+        user = await deps.get_current_user(credentials=credentials, token=None, session=db)
+        assert user in db  # rattaché : les endpoints peuvent le muter et commit
+        assert (user.id, user.email, user.plan) == (user_id, first.email, first.plan)
+        assert isinstance(user.created_at, datetime)
+
+
+@pytest.mark.asyncio
+async def test_session_revocation_invalidates_principal(session_factory, v2_login):
+    from auth.service import revoke_session_v2
+
+    user_id, jti, credentials = v2_login
+    await _current_user(session_factory, credentials)
+
+    async with session_factory() as db:
+        assert await revoke_session_v2(db, jti, user_id)
+        await db.commit()
+    await asyncio.sleep(0)  # invalidation planifiée par after_commit
+
+    with pytest.raises(HTTPException) as exc_info:
+        await _current_user(session_factory, credentials)
+    assert exc_info.value.detail["code"] == "session_expired"
+
+
+@pytest.mark.asyncio
+async def test_plan_change_is_visible_on_next_request(session_factory, v2_login):
+    from db.database import User
+
+    user_id, _, credentials = v2_login
+    assert (await _current_user(session_factory, credentials)).plan == "free"
+
+    async with session_factory() as db:
+        (await db.get(User, user_id)).plan = "pro"
+        await db.commit()
+    await asyncio.sleep(0)
+
+    assert (await _current_user(session_factory, credentials)).plan == "pro"
+
+
+@pytest.mark.asyncio
+async def test_legacy_logout_invalidates_principal(session_factory, monkeypatch):
+    import core.config as _cfg
+    from auth import dependencies as deps
+    from auth.service import create_access_token, create_user_session, invalidate_user_session
+    from db.database import User
+
+    monkeypatch.setattr(_cfg, "AUTH_V2_ENABLED", False)
+    monkeypatch.setattr(deps, "SECURITY_AVAILABLE", False, raising=False)
+    async with session_factory() as db:
+        user = User(username="legacy", email="legacy@example.com", password_hash="x")
+        db.add(user)
+        await db.commit()
+        session_token = await create_user_session(db, user.id)
+    credentials = HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials=create_access_token(user_id=user.id, session_token=session_token)
+    )
+    await _current_user(session_factory, credentials)
+
+    async with session_factory() as db:
+        await invalidate_user_session(db, user.id)
+
+    with pytest.raises(HTTPException):
+        await _current_user(session_factory, credentials)
@@ -0,0 +1,118 @@
+"""Cache du RichContext par résumé + agencement "stable_prefix" du prompt chat.
+
+Le cache vit dans ``core.cache.cache_service`` (backend mémoire en test) ; chaque
+test purge l'entrée de son résumé puisque les IDs SQLite se répètent d'un test
+à l'autre.
+"""
+
+from __future__ import annotations
+
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from db.database import TranscriptCache, TranscriptCacheChunk
+
+# Imports du package chat dans les tests : ``chat/__init__`` charge le router,
+# dont la chaîne auth ↔ billing casse si elle est importée à la collecte.
+
+
+@pytest.fixture
+def count_transcript_loads():
+    from chat import context_builder
+
+    calls = []
+    real = context_builder._get_full_transcript_from_cache
+
+    async def counting(video_id, db):
+        calls.append(video_id)
+        return await real(video_id, db)
+
+    with patch.object(context_builder, "_get_full_transcript_from_cache", counting):
+        yield calls
+
+
+@pytest.mark.asyncio
+async def test_second_build_is_served_from_cache(async_db_session, sample_summary, count_transcript_loads):
+    from chat import context_builder
+    from chat.context_builder import build_rich_context, invalidate_rich_context
+
+    await invalidate_rich_context(sample_summary.id)
+    cache = TranscriptCache(video_id=sample_summary.video_id, video_duration=7200)
+    async_db_session.add(cache)
+    await async_db_session.flush()
+    long_text = "[00:00] " + "phrase " * 5000 * 3  # > 80K chars → stratégie digest_only
+    async_db_session.add(TranscriptCacheChunk(cache_id=cache.id, chunk_index=0, transcript_timestamped=long_text))
+    await async_db_session.commit()
+
+    first = await build_rich_context(sample_summary, async_db_session)
+    assert first.transcript_strategy == "digest_only"
+    assert count_transcript_loads == [sample_summary.video_id]  # une seule lecture pour les deux usages
+
+    before = await context_builder.get_chat_context_metrics()
+    second = await build_rich_context(sample_summary, async_db_session)
+    after = await context_builder.get_chat_context_metrics()
+
+    assert count_transcript_loads == [sample_summary.video_id]
+    assert second == first
+    assert second.format_for_chat("fr") == first.format_for_chat("fr")
+    assert after["cache_hits"] == before["cache_hits"] + 1
+
+
+@pytest.mark.asyncio
+async def test_summary_update_and_invalidation_rebuild(async_db_session, sample_summary, count_transcript_loads):
+    from chat.context_builder import build_rich_context, invalidate_rich_context
+
+    await invalidate_rich_context(sample_summary.id)
+    await build_rich_context(sample_summary, async_db_session)
+
+    # Champ du Summary modifié (ex. nouveau full_digest) → empreinte différente
+    sample_summary.full_digest = f"Digest {uuid.uuid4()}"
+    rebuilt = await build_rich_context(sample_summary, async_db_session)
+    assert rebuilt.full_digest == sample_summary.full_digest
+    assert len(count_transcript_loads) == 2
+
+    await build_rich_context(sample_summary, async_db_session)
+    assert len(count_transcript_loads) == 2
+
+    # Données hors Summary (transcript, papiers) → invalidation explicite
+    await invalidate_rich_context(sample_summary.id)
+    await build_rich_context(sample_summary, async_db_session)
+    assert len(count_transcript_loads) == 3
+
+
+@pytest.mark.asyncio
+async def test_stable_prefix_layout_keeps_system_prompt_identical_across_turns():
+    from chat.context_builder import record_prompt_prefix
+    from chat.service import PROMPT_LAYOUT_STABLE_PREFIX, build_chat_prompt
+
+    context = "## Vidéo analysée\nTitre : T\n\n" + "contexte " * 3000
+    turns = [
+        ("Est-ce que l'auteur cite des sources ?", "passage A", ""),
+        ("Résume les principaux points", "passage B", "\nUtilisateur: Est-ce que...\nAssistant: Oui"),
+    ]
+    prompts = [
+        build_chat_prompt(
+            question,
+            "T",
+            passages,
+            context,
+            lang="fr",
+            video_upload_date="20240101",
+            history_text=history,
+            prompt_layout=PROMPT_LAYOUT_STABLE_PREFIX,
+        )
+        for question, passages, history in turns
+    ]
+
+    (system_1, user_1), (system_2, user_2) = prompts
+    assert system_1 == system_2
+    assert context in system_1  # contexte complet, plus de troncature à 4K
+    assert "Commence par OUI/NON" in user_1 and "Liste à puces" in user_2
+    assert "passage B" in user_2 and user_2.endswith("Question : Résume les principaux points")
+
+    prefix_key = f"test-{uuid.uuid4()}"
+    assert await record_prompt_prefix(prefix_key, system_1) is False
+    assert await record_prompt_prefix(prefix_key, system_2) is True
+    assert await record_prompt_prefix(prefix_key, system_2 + "x") is False
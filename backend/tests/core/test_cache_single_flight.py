@@ -0,0 +1,118 @@
+"""Tests anti-stampede de ``core.cache.CacheService.get_or_set``."""
+
+from __future__ import annotations
+
+import asyncio
+
+import fakeredis.aioredis as fakeredis_async
+import pytest
+
+from core.cache import CacheService, InMemoryCacheBackend, RedisCacheBackend
+
+
+def _service(backend=None) -> CacheService:
+    # CacheService est un singleton : instance isolée pour simuler un worker
+    svc = object.__new__(CacheService)
+    CacheService.__init__(svc)
+    svc.backend = backend or InMemoryCacheBackend()
+    return svc
+
+
+class _Factory:
+    def __init__(self, delay: float = 0.05, fail: bool = False):
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return {"n": self.calls}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_run_factory_once_in_process():
+    svc = _service()
+    factory = _Factory()
+
+    results = await asyncio.gather(*(svc.get_or_set("analysis:v1", factory, ttl=60) for _ in range(20)))
+
+    assert factory.calls == 1
+    assert all(r == {"n": 1} for r in results)
+    stats = svc.get_stats()
+    assert stats["coalesced"] == 19
+    assert stats["refreshes"] == 1
+    assert stats["inflight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_run_factory_once_across_workers():
+    redis = fakeredis_async.FakeRedis(decode_responses=True)
+    worker_a = _service(RedisCacheBackend(redis))
+    worker_b = _service(RedisCacheBackend(redis))
+    factory = _Factory(delay=0.2)
+
+    results = await asyncio.gather(
+        worker_a.get_or_set("transcript:abc", factory, ttl=60),
+        worker_b.get_or_set("transcript:abc", factory, ttl=60),
+    )
+
+    assert factory.calls == 1
+    assert results == [{"n": 1}, {"n": 1}]
+    assert worker_a.stats.lock_waits + worker_b.stats.lock_waits == 1
+    assert await redis.get("deepsight:lock:transcript:abc") is None
+
+
+@pytest.mark.asyncio
+async def test_failed_owner_releases_lock_and_returns_none():
+    redis = fakeredis_async.FakeRedis(decode_responses=True)
+    svc = _service(RedisCacheBackend(redis))
+
+    assert await svc.get_or_set("perplexity:q", _Factory(fail=True), ttl=60) is None
+    assert await redis.get("deepsight:lock:perplexity:q") is None
+
+    assert await svc.get_or_set("perplexity:q", _Factory(), ttl=60) == {"n": 1}
+
+
+@pytest.mark.asyncio
+async def test_stale_value_is_served_while_single_refresh_runs():
+    svc = _service()
+    factory = _Factory(delay=0.05)
+    assert await svc.get_or_set("video_info:x", factory, ttl=60, soft_ttl=0) == {"n": 1}
+
+    # soft TTL dépassé : valeur périmée servie sans attendre, un seul recalcul
+    stale = await asyncio.gather(*(svc.get_or_set("video_info:x", factory, ttl=60, soft_ttl=0) for _ in range(5)))
+    assert stale == [{"n": 1}] * 5
+    assert svc.stats.stale_served == 5
+
+    await svc._inflight["video_info:x"]
+    assert factory.calls == 2
+    assert await svc.get("video_info:x") == {"n": 2}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_computation():
+    svc = _service()
+    factory = _Factory(delay=0.1)
+
+    leader = asyncio.create_task(svc.get_or_set("analysis:c", factory, ttl=60))
+    await asyncio.sleep(0.01)
+    follower = asyncio.create_task(svc.get_or_set("analysis:c", factory, ttl=60))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert await follower == {"n": 1}
+    assert factory.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_factory_returning_coroutine_is_awaited():
+    svc = _service()
+
+    async def fetch():
+        return [1, 2, 3]
+
+    assert await svc.get_or_set("default:k", lambda: fetch()) == [1, 2, 3]
+    assert await svc.get("default:k") == [1, 2, 3]
@@ -0,0 +1,125 @@
+"""Tests du cache deux niveaux (L1 in-process + L2 Redis) de ``core.cache``."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import fakeredis.aioredis as fakeredis_async
+import pytest
+
+from core.cache import CacheService, RedisCacheBackend, TieredCacheBackend
+
+
+def _worker(redis, **kwargs) -> TieredCacheBackend:
+    return TieredCacheBackend(RedisCacheBackend(redis), **kwargs)
+
+
+async def _settle():
+    # Laisse les listeners pub/sub traiter les messages en attente
+    for _ in range(20):
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def redis():
+    return fakeredis_async.FakeRedis(decode_responses=True)
+
+
+@pytest.mark.asyncio
+async def test_hot_reads_are_served_from_l1(redis):
+    tier = _worker(redis)
+    await tier.set("user_quota:1", {"used": 3}, ttl=300)
+
+    await redis.set("deepsight:user_quota:1", '{"used": 99}')  # L2 modifié en direct
+    assert await tier.get("user_quota:1") == {"used": 3}
+
+    stats = tier.get_stats()
+    assert stats["l1"]["hits"] == 1
+    assert stats["l2"]["hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_l2_hit_populates_l1(redis):
+    writer, reader = _worker(redis), _worker(redis)
+    await writer.set("video_info:abc", {"title": "t"}, ttl=300)
+
+    assert await reader.get("video_info:abc") == {"title": "t"}
+    assert await reader.get("video_info:abc") == {"title": "t"}
+    stats = reader.get_stats()
+    assert (stats["l1"]["hits"], stats["l2"]["hits"]) == (1, 1)
+    assert stats["l1"]["size"] == 1
+
+
+@pytest.mark.asyncio
+async def test_l2_hit_caps_l1_ttl_with_remaining_l2_ttl(redis):
+    reader = _worker(redis)
+    await redis.set("deepsight:video_info:abc", '{"title": "t"}', px=400)
+
+    assert await reader.get("video_info:abc") == {"title": "t"}
+    expires_at, _ = reader._l1["video_info:abc"]
+    assert 0 < expires_at - time.monotonic() <= 0.4
+    assert await RedisCacheBackend(redis).get_with_ttl("missing") == (None, 0.0)
+
+
+@pytest.mark.asyncio
+async def test_l1_is_bounded_lru(redis):
+    tier = _worker(redis, maxsize=2)
+    for key in ("a", "b"):
+        await tier.set(key, key, ttl=60)
+    await tier.get("a")
+    await tier.set("c", "c", ttl=60)
+
+    assert list(tier._l1) == ["a", "c"]
+    assert tier.get_stats()["l1"]["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_l1_entries_expire_with_max_ttl(redis):
+    tier = _worker(redis, max_ttl=0.05)
+    await tier.set("video_info:x", 1, ttl=3600)
+    await asyncio.sleep(0.06)
+    assert tier._l1_get("video_info:x") is None
+    assert await tier.get("video_info:x") == 1  # toujours en L2
+
+
+@pytest.mark.asyncio
+async def test_writes_and_prefix_invalidation_propagate_to_other_workers(redis):
+    worker_a, worker_b = _worker(redis), _worker(redis)
+    await worker_a.start()
+    await worker_b.start()
+    await _settle()
+    try:
+        await worker_a.set("video_info:1", "v1", ttl=300)
+        await worker_a.set("analysis:1", "a1", ttl=300)
+        assert await worker_b.get("video_info:1") == "v1"
+        assert await worker_b.get("analysis:1") == "a1"
+
+        await worker_a.set("video_info:1", "v2", ttl=300)
+        await _settle()
+        assert await worker_b.get("video_info:1") == "v2"
+
+        await worker_a.clear_prefix("analysis:")
+        await _settle()
+        assert await worker_b.get("analysis:1") is None
+        assert worker_b.get_stats()["invalidations_received"] >= 2
+        assert worker_a.get_stats()["invalidations_received"] == 0
+    finally:
+        await worker_a.close()
+        await worker_b.close()
+
+
+@pytest.mark.asyncio
+async def test_cache_service_exposes_per_tier_stats(redis):
+    svc = object.__new__(CacheService)
+    CacheService.__init__(svc)
+    svc.backend = _worker(redis)
+
+    await svc.set("user_quota:9", {"n": 1})
+    await svc.get("user_quota:9")
+    assert await svc.get_or_set("user_quota:9", lambda: {"n": 2}) == {"n": 1}
+
+    stats = svc.get_stats()
+    assert stats["hits"] == 2
+    assert stats["tiers"]["l1"]["hits"] == 2
+    assert svc.backend.redis is redis
@@ -0,0 +1,189 @@
+"""Tests du scheduler de hedging (``core.hedging``)."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from core.hedging import HedgeCandidate, HedgingScheduler, LatencyHistogram
+
+
+def _provider(result, delay: float, calls: list, name: str):
+    async def call():
+        calls.append(name)
+        await asyncio.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return call
+
+
+def _scheduler(**kwargs) -> HedgingScheduler:
+    kwargs.setdefault("min_delay_s", 0.01)
+    return HedgingScheduler("test", **kwargs)
+
+
+def _accept(result) -> bool:
+    return bool(result)
+
+
+def test_histogram_quantiles_and_decay():
+    hist = LatencyHistogram(max_samples=100)
+    for _ in range(40):
+        hist.observe(0.5)
+    for _ in range(10):
+        hist.observe(8.0)
+    assert hist.quantile(0.5) == pytest.approx(0.5, rel=0.35)
+    assert hist.quantile(0.9) >= 8.0
+
+    for _ in range(60):
+        hist.observe(0.5)
+    assert hist.total < 100  # décroissance par moitié
+
+
+@pytest.mark.asyncio
+async def test_fast_leader_wins_without_hedging():
+    calls: list = []
+    scheduler = _scheduler()
+    outcome = await scheduler.race(
+        [
+            HedgeCandidate("a", "a", _provider("A", 0.01, calls, "a"), expected_s=0.2),
+            HedgeCandidate("b", "b", _provider("B", 0.01, calls, "b"), expected_s=1.0),
+        ],
+        accept=_accept,
+        budget_s=2,
+    )
+    assert outcome.result == "A"
+    assert calls == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_slow_leader_is_hedged_and_cancelled():
+    calls: list = []
+    cancelled = asyncio.Event()
+
+    async def slow():
+        calls.append("slow")
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    scheduler = _scheduler()
+    started = time.monotonic()
+    outcome = await scheduler.race(
+        [
+            HedgeCandidate("slow", "slow", slow, expected_s=0.05),
+            HedgeCandidate("fast", "fast", _provider("F", 0.01, calls, "fast"), expected_s=1.0),
+        ],
+        accept=_accept,
+        budget_s=2,
+    )
+    assert outcome.candidate.key == "fast"
+    assert time.monotonic() - started < 0.5
+    assert cancelled.is_set()
+    stats = scheduler.get_stats()
+    assert stats["fast"]["hedged"] == 1
+    assert stats["slow"]["cancelled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failure_launches_next_immediately_and_invalid_results_are_rejected():
+    calls: list = []
+    scheduler = _scheduler(max_delay_s=5)
+    outcome = await scheduler.race(
+        [
+            HedgeCandidate("boom", "boom", _provider(RuntimeError("x"), 0, calls, "boom"), expected_s=5),
+            HedgeCandidate("empty", "empty", _provider("", 0, calls, "empty"), expected_s=5),
+            HedgeCandidate("ok", "ok", _provider("OK", 0, calls, "ok"), expected_s=5),
+        ],
+        accept=_accept,
+        budget_s=1,
+    )
+    assert outcome.result == "OK"
+    assert calls == ["boom", "empty", "ok"]
+    assert outcome.elapsed_s < 0.5
+
+
+@pytest.mark.asyncio
+async def test_rejected_result_does_not_count_against_the_circuit(monkeypatch):
+    from core import hedging
+
+    recorded: list = []
+    monkeypatch.setattr(hedging.provider_health, "record", lambda name, ok, latency=None: recorded.append((name, ok)))
+    scheduler = _scheduler(max_delay_s=5, circuit_family="t")
+
+    async def allow(_name):
+        return True
+
+    monkeypatch.setattr(hedging.provider_health, "allow", allow)
+    calls: list = []
+    await scheduler.race(
+        [
+            HedgeCandidate("boom", "boom", _provider(RuntimeError("x"), 0, calls, "boom"), expected_s=5),
+            HedgeCandidate("empty", "empty", _provider("", 0, calls, "empty"), expected_s=5),
+            HedgeCandidate("ok", "ok", _provider("OK", 0, calls, "ok"), expected_s=5),
+        ],
+        accept=_accept,
+        budget_s=1,
+    )
+    assert recorded == [("t:boom", False), ("t:empty", True), ("t:ok", True)]
+    stats = scheduler.get_stats()
+    assert (stats["empty"]["rejected"], stats["empty"]["failures"], stats["boom"]["failures"]) == (1, 0, 1)
+
+
+@pytest.mark.asyncio
+async def test_histograms_reorder_candidates():
+    scheduler = _scheduler()
+    for _ in range(10):
+        scheduler.histogram("declared_first").observe(4.0)
+        scheduler.histogram("declared_second").observe(0.3)
+    ordered = scheduler.order(
+        [
+            HedgeCandidate("1", "declared_first", None, expected_s=0.1),
+            HedgeCandidate("2", "declared_second", None, expected_s=9),
+        ]
+    )
+    assert [c.key for c in ordered] == ["declared_second", "declared_first"]
+
+
+@pytest.mark.asyncio
+async def test_paid_cap_and_patience_before_paid_provider():
+    calls: list = []
+    scheduler = _scheduler(max_paid=1)
+    for _ in range(10):
+        scheduler.histogram("free").observe(0.05)
+        scheduler.histogram("free").observe(0.9)  # p50 bas, p90 haut
+    leader = HedgeCandidate("free", "free", None)
+    assert scheduler.hedge_delay(leader, HedgeCandidate("p", "p", None, paid=True)) > scheduler.hedge_delay(
+        leader, HedgeCandidate("f", "f", None)
+    )
+
+    outcome = await scheduler.race(
+        [
+            HedgeCandidate("paid1", "paid1", _provider(None, 0, calls, "paid1"), paid=True, expected_s=0.1),
+            HedgeCandidate("paid2", "paid2", _provider("P2", 0, calls, "paid2"), paid=True, expected_s=0.2),
+            HedgeCandidate("free2", "free2", _provider("F2", 0, calls, "free2"), expected_s=0.3),
+        ],
+        accept=_accept,
+        budget_s=1,
+    )
+    assert outcome.result == "F2"
+    assert calls == ["paid1", "free2"]
+    assert scheduler.get_stats()["paid2"]["skipped_paid"] == 1
+
+
+@pytest.mark.asyncio
+async def test_budget_exhaustion_returns_none_and_cancels():
+    scheduler = _scheduler()
+    outcome = await scheduler.race(
+        [HedgeCandidate("stuck", "stuck", lambda: asyncio.sleep(10), expected_s=1)],
+        accept=_accept,
+        budget_s=0.05,
+    )
+    assert outcome is None
+    assert scheduler.get_stats()["stuck"]["cancelled"] == 1
@@ -0,0 +1,112 @@
+"""Tests pour les pools HTTP par provider de ``core.http_client``."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from core import http_client
+from core.http_client import (
+    close_http_client,
+    get_pool_stats,
+    get_provider_client,
+    init_http_client,
+    provider_client,
+    release_provider_client,
+)
+
+
+@pytest.fixture(autouse=True)
+async def _reset_pools():
+    await close_http_client()
+    http_client._provider_counters.clear()
+    yield
+    await close_http_client()
+    http_client._provider_counters.clear()
+
+
+def _mock_transport(status_code: int = 200) -> httpx.MockTransport:
+    return httpx.MockTransport(lambda request: httpx.Response(status_code, json={"ok": True}))
+
+
+@pytest.mark.asyncio
+async def test_without_lifespan_falls_back_to_ephemeral_client():
+    client = get_provider_client("mistral", timeout=5.0)
+    assert http_client._provider_clients == {}
+    await release_provider_client(client)
+    assert client.is_closed
+    assert get_pool_stats()["mistral"]["ephemeral_fallbacks"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pooled_client_is_shared_http2_and_not_closed_on_release():
+    await init_http_client()
+    client = get_provider_client("mistral")
+    assert get_provider_client("mistral") is client
+    assert get_provider_client("elevenlabs") is not client
+    assert str(client.base_url).startswith("https://api.mistral.ai")
+    assert client.timeout.read == http_client.PROVIDER_POOLS["mistral"].timeout.read
+
+    await release_provider_client(client)
+    async with provider_client("mistral") as same:
+        assert same is client
+    assert not client.is_closed
+
+    await close_http_client()
+    assert client.is_closed
+    assert http_client._provider_clients == {}
+
+
+@pytest.mark.asyncio
+async def test_unknown_provider_is_never_pooled():
+    await init_http_client()
+    async with provider_client("https://example.invalid/v1", timeout=5.0) as client:
+        assert client not in http_client._provider_clients.values()
+    assert client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_count_requests_and_errors():
+    await init_http_client()
+    client = get_provider_client("mistral")
+    client._transport = _mock_transport(200)
+    await client.post("https://api.mistral.ai/v1/embeddings", json={})
+    client._transport = _mock_transport(503)
+    await client.post("/v1/embeddings", json={})
+
+    stats = get_pool_stats()["mistral"]
+    assert stats["pooled"] is True
+    assert stats["requests"] == 2
+    assert stats["responses"] == 2
+    assert stats["errors_5xx"] == 1
+    assert stats["max_connections"] == http_client.PROVIDER_POOLS["mistral"].limits.max_connections
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_report_httpcore_connections():
+    await init_http_client()
+    get_provider_client("openai")
+    stats = get_pool_stats()["openai"]
+    assert stats["connections"] == 0
+    assert stats["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_llm_call_api_reuses_provider_pool(monkeypatch):
+    from core import llm_provider
+
+    await init_http_client()
+    client = get_provider_client("mistral")
+    client._transport = _mock_transport(200)
+
+    for _ in range(3):
+        response = await llm_provider._call_api(
+            url=llm_provider.MISTRAL_API_URL,
+            api_key="k",
+            model="mistral-small-2603",
+            messages=[{"role": "user", "content": "hi"}],
+        )
+        assert response.status_code == 200
+
+    assert get_provider_client("mistral") is client
+    assert get_pool_stats()["mistral"]["requests"] == 3
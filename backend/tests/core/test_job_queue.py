@@ -0,0 +1,196 @@
+"""Tests de la file de jobs durables (``core.job_queue``) : priorités, checkpoints, reprise."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import fakeredis
+import fakeredis.aioredis as fakeredis_async
+import pytest
+
+import core.job_queue as jq
+from core.job_queue import JobQueue, current_job, get_checkpoint, save_checkpoint
+
+
+async def _drain(queue: JobQueue) -> list:
+    """Exécute les jobs en file un par un, dans l'ordre du claim."""
+    order = []
+    while (job := await queue._claim()) is not None:
+        order.append(job.id)
+        await queue._run(job)
+    return order
+
+
+async def _noop(payload):
+    return None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_redis", [False, True])
+async def test_plan_priority_without_starvation(use_redis):
+    queue = JobQueue(redis=fakeredis_async.FakeRedis() if use_redis else None)
+    queue.register("k", _noop)
+
+    await queue.enqueue("k", {}, job_id="free", plan="free")
+    await queue.enqueue("k", {}, job_id="pro", plan="pro")
+    await queue.enqueue("k", {}, job_id="expert", plan="expert")
+    # Job free en attente depuis plus longtemps que l'avance du plan expert
+    old = await queue.enqueue("k", {}, job_id="old-free", plan="free")
+    if use_redis:
+        await queue.redis.zadd(queue._keys()[0], {old: (time.time() - 600) * 1000})
+    else:
+        queue._local_heap = [(s - 600_000 if i == old else s, n, i) for s, n, i in queue._local_heap]
+        queue._local_heap.sort()
+
+    assert await _drain(queue) == ["old-free", "expert", "pro", "free"]
+
+
+@pytest.mark.asyncio
+async def test_shutdown_requeues_and_resumes_from_checkpoint():
+    server = fakeredis.FakeServer()
+    calls = []
+    gate = asyncio.Event()
+
+    async def handler(payload):
+        transcript = get_checkpoint("transcript")
+        calls.append(("start", transcript, current_job().resumed))
+        if transcript is None:
+            await save_checkpoint("transcript", {"text": payload["url"]})
+            await gate.wait()  # le worker est arrêté ici (redéploiement)
+        calls.append(("done", get_checkpoint("transcript")))
+
+    first = JobQueue(redis=fakeredis_async.FakeRedis(server=server), workers=1)
+    first.register("analysis", handler)
+    await first.start()
+    await first.enqueue("analysis", {"url": "u"}, job_id="t1", plan="pro")
+    for _ in range(100):
+        if calls:
+            break
+        await asyncio.sleep(0.01)
+    await first.close()
+
+    redis = fakeredis_async.FakeRedis(server=server)
+    assert await redis.zscore("deepsight:jobs:queue", "t1") is not None
+    assert await redis.zcard("deepsight:jobs:leases") == 0
+
+    second = JobQueue(redis=redis)
+    second.register("analysis", handler)
+    assert await _drain(second) == ["t1"]
+
+    assert calls == [("start", None, False), ("start", {"text": "u"}, True), ("done", {"text": "u"})]
+    assert await redis.exists("deepsight:jobs:job:t1") == 0
+
+
+@pytest.mark.asyncio
+async def test_reaper_requeues_expired_lease_then_abandons():
+    redis = fakeredis_async.FakeRedis()
+    abandoned = []
+
+    async def on_abandoned(payload):
+        abandoned.append(payload)
+
+    queue = JobQueue(redis=redis)
+    queue.register("k", _noop, on_abandoned=on_abandoned)
+    await queue.enqueue("k", {"task_id": "t1"}, job_id="t1")
+
+    async def _claim_and_die():
+        job = await queue._claim()  # le worker meurt sans heartbeat
+        await redis.zadd(queue._keys()[1], {job.id: 0})
+        return job
+
+    for attempt in range(1, jq.MAX_ATTEMPTS):
+        assert (await _claim_and_die()).attempts == attempt
+        assert await queue.reap() == (["t1"], [])
+
+    await _claim_and_die()
+    assert await queue.reap() == ([], ["t1"])
+    assert abandoned == [{"task_id": "t1"}]
+    assert await redis.exists(queue._job_key("t1")) == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_abandon_hook_is_retried_on_next_reap():
+    redis = fakeredis_async.FakeRedis()
+    calls = []
+
+    async def on_abandoned(payload):
+        calls.append(payload)
+        if len(calls) == 1:
+            raise RuntimeError("db down")
+
+    queue = JobQueue(redis=redis)
+    queue.register("k", _noop, on_abandoned=on_abandoned)
+    await queue.enqueue("k", {"task_id": "t1"}, job_id="t1")
+    await redis.hset(queue._job_key("t1"), "attempts", jq.MAX_ATTEMPTS - 1)
+    await queue._claim()
+    await redis.zadd(queue._keys()[1], {"t1": 0})
+
+    assert await queue.reap() == ([], ["t1"])
+    assert len(calls) == 1
+    assert await redis.exists(queue._job_key("t1")) == 1
+    assert (await queue.stats())["abandoning"] == 1
+
+    assert await queue.reap() == ([], [])
+    assert calls == [{"task_id": "t1"}, {"task_id": "t1"}]
+    assert await redis.exists(queue._job_key("t1")) == 0
+    assert (await queue.stats())["abandoning"] == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_redis", [False, True])
+async def test_stats_report_queue_wait(use_redis, monkeypatch):
+    queue = JobQueue(redis=fakeredis_async.FakeRedis() if use_redis else None)
+    queue.register("k", _noop)
+    assert (await queue.stats())["queue_wait_s"]["samples"] == 0
+
+    now = time.time()
+    monkeypatch.setattr(jq.time, "time", lambda: now)
+    await queue.enqueue("k", {}, job_id="a")
+    await queue.enqueue("k", {}, job_id="b")
+    monkeypatch.setattr(jq.time, "time", lambda: now + 4.0)
+    await _drain(queue)
+
+    wait = (await queue.stats())["queue_wait_s"]
+    assert wait["samples"] == 2
+    assert wait["max"] == pytest.approx(4.0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_redis", [False, True])
+async def test_cancel_removes_queued_job(use_redis):
+    queue = JobQueue(redis=fakeredis_async.FakeRedis() if use_redis else None)
+    ran = []
+
+    async def handler(payload):
+        ran.append(payload["n"])
+
+    queue.register("k", handler)
+    await queue.enqueue("k", {"n": 1}, job_id="a")
+    await queue.enqueue("k", {"n": 2}, job_id="b")
+
+    assert await queue.cancel("a") is True
+    assert await queue.cancel("missing") is False
+    await _drain(queue)
+    assert ran == [2]
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_not_retried_and_checkpoints_are_released():
+    redis = fakeredis_async.FakeRedis()
+    queue = JobQueue(redis=redis)
+
+    async def handler(payload):
+        await save_checkpoint("transcript", "x" * 10)
+        raise RuntimeError("boom")
+
+    queue.register("k", handler)
+    await queue.enqueue("k", {}, job_id="t1")
+    await _drain(queue)
+
+    assert await redis.exists(queue._job_key("t1")) == 0
+    assert await redis.zcard(queue._keys()[1]) == 0
+    stats = await queue.stats()
+    assert stats["queued"] == 0 and stats["mode"] == "redis"
+    json.dumps(stats)
@@ -0,0 +1,100 @@
+"""Tests du limiteur de concurrence adaptatif LLM (``core.llm_limiter``)."""
+
+from __future__ import annotations
+
+import asyncio
+
+import fakeredis.aioredis as fakeredis_async
+import httpx
+import pytest
+
+from core.llm_limiter import AdaptiveLimiter, LimiterPolicy, llm_priority
+
+POLICY = LimiterPolicy(
+    initial_limit=4,
+    min_limit=1,
+    max_limit=6,
+    decrease_cooldown_s=0,
+    shares={"interactive": 1.0, "standard": 1.0, "batch": 0.5},
+    max_wait_s={"interactive": 2.0, "standard": 2.0, "batch": 0.3},
+)
+
+
+def _limiter(redis=None, policy: LimiterPolicy = POLICY) -> AdaptiveLimiter:
+    return AdaptiveLimiter(redis=redis, policy=policy, enabled=True)
+
+
+async def _limit(limiter: AdaptiveLimiter, model: str = "m") -> float:
+    return (await limiter.snapshot())[model]["limit"]
+
+
+@pytest.mark.parametrize("shared", [False, True])
+@pytest.mark.asyncio
+async def test_aimd_grows_on_success_and_halves_on_429(shared):
+    limiter = _limiter(fakeredis_async.FakeRedis() if shared else None)
+
+    for _ in range(4):
+        async with limiter.slot("m") as slot:
+            slot.observe(200)
+    assert await _limit(limiter) == pytest.approx(4.92, abs=0.01)  # +1/limite par succès : ~+1 par "fenêtre"
+
+    async with limiter.slot("m") as slot:
+        slot.observe(429)
+    assert await _limit(limiter) == pytest.approx(2.46, abs=0.01)
+
+    with pytest.raises(httpx.ReadTimeout):
+        async with limiter.slot("m"):
+            raise httpx.ReadTimeout("slow")
+    assert await _limit(limiter) == pytest.approx(1.23, abs=0.01)
+    assert (await limiter.snapshot())["m"]["priorities"]["standard"]["throttled"] == 2
+
+
+@pytest.mark.asyncio
+async def test_limit_is_shared_across_workers():
+    redis = fakeredis_async.FakeRedis()
+    worker_a, worker_b = _limiter(redis), _limiter(redis)
+    tokens = [await worker_a.acquire("m") for _ in range(4)]
+    assert all(tokens)
+
+    # Le worker B voit les 4 baux de A : il attend puis passe outre (fail-open compté)
+    assert await worker_b.acquire("m", "batch") is None
+    assert (await worker_b.snapshot())["m"]["in_flight"] == 4
+
+    await worker_a.release("m", tokens[0], "neutral")
+    assert await worker_b.acquire("m", "standard") is not None
+
+
+@pytest.mark.asyncio
+async def test_interactive_waiter_preempts_batch_admissions():
+    limiter = _limiter()
+    held = [await limiter.acquire("m", "standard") for _ in range(4)]
+    order: list = []
+
+    async def call(priority: str):
+        async with limiter.slot("m", priority):
+            order.append(priority)
+
+    interactive = asyncio.create_task(call("interactive"))
+    await asyncio.sleep(0.01)  # l'appel interactif est en file d'attente
+    batch = asyncio.create_task(call("batch"))
+    await asyncio.sleep(0.01)
+
+    for token in held:
+        await limiter.release("m", token, "neutral")
+    await asyncio.gather(interactive, batch)
+    assert order == ["interactive", "batch"]
+
+
+@pytest.mark.asyncio
+async def test_batch_only_gets_its_share_and_context_priority_applies():
+    limiter = _limiter()
+    token = llm_priority.set("batch")
+    try:
+        async with limiter.slot("m"), limiter.slot("m"):
+            # 2 places batch sur 4 : la troisième attend puis passe outre
+            async with limiter.slot("m"):
+                pass
+    finally:
+        llm_priority.reset(token)
+    stats = (await limiter.snapshot())["m"]["priorities"]["batch"]
+    assert stats["admitted"] == 2 and stats["fail_open"] == 1
@@ -0,0 +1,92 @@
+"""Tests de la file de logs non bloquante (``core.logging``)."""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+import queue
+import threading
+import uuid
+
+from core.logging import (
+    ContextQueueHandler,
+    DebugSamplingFilter,
+    JSONFormatter,
+    _install_queue_handler,
+    flush_logs,
+    request_id_var,
+)
+
+
+class _RecordingStream(io.StringIO):
+    """Flux qui note le thread de chaque écriture."""
+
+    def __init__(self):
+        super().__init__()
+        self.threads: set = set()
+
+    def write(self, text: str) -> int:
+        self.threads.add(threading.current_thread().name)
+        return super().write(text)
+
+
+def _queued_logger() -> tuple:
+    stream = _RecordingStream()
+    target = logging.getLogger(f"deepsight.test.{uuid.uuid4().hex[:8]}")
+    target.setLevel(logging.DEBUG)
+    target.propagate = False
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(JSONFormatter())
+    target.addHandler(handler)
+    _install_queue_handler(target)
+    return target, stream
+
+
+def test_records_are_written_off_thread_with_caller_context():
+    target, stream = _queued_logger()
+    token = request_id_var.set("req-42")
+    try:
+        target.info("chunk %s analysed", 3)
+    finally:
+        request_id_var.reset(token)
+
+    assert flush_logs(timeout=2.0)
+    assert threading.current_thread().name not in stream.threads
+    payload = json.loads(stream.getvalue().splitlines()[-1])
+    assert payload["message"] == "chunk 3 analysed"
+    assert payload["request_id"] == "req-42"  # capturé à l'émission, pas sur le listener
+
+
+def test_exception_info_survives_the_queue():
+    target, stream = _queued_logger()
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        target.exception("failed")
+
+    assert flush_logs(timeout=2.0)
+    payload = json.loads(stream.getvalue().splitlines()[-1])
+    assert payload["exception"]["type"] == "ValueError"
+
+
+def test_debug_sampling_keeps_a_fraction_of_debug_only():
+    sampler = DebugSamplingFilter(rate=0.25)
+    make = lambda level: logging.LogRecord("x", level, __file__, 1, "m", None, None)  # noqa: E731
+
+    kept_debug = sum(sampler.filter(make(logging.DEBUG)) for _ in range(100))
+    kept_info = sum(sampler.filter(make(logging.INFO)) for _ in range(10))
+
+    assert kept_debug == 25 and sampler.sampled_out == 75
+    assert kept_info == 10
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = ContextQueueHandler(queue.Queue(maxsize=1), sink="test")
+    record = lambda: logging.LogRecord("x", logging.INFO, __file__, 1, "m", None, None)  # noqa: E731
+
+    handler.handle(record())
+    handler.handle(record())  # file pleine : put_nowait échoue, l'appelant continue
+
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
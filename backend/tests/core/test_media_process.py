@@ -0,0 +1,90 @@
+"""Tests pour le moteur de sous-process média ``core.media_process``."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+
+import pytest
+
+from core.media_process import MediaProcessEngine, MediaProcessTimeout
+
+PY = sys.executable
+
+
+def _engine(limit: int = 2) -> MediaProcessEngine:
+    # Le nom d'outil est le basename de cmd[0] (ici l'interpréteur Python)
+    return MediaProcessEngine(concurrency={}, default_concurrency=limit)
+
+
+@pytest.mark.asyncio
+async def test_stdin_is_piped_to_stdout():
+    engine = _engine()
+    result = await engine.run(
+        [PY, "-c", "import sys; sys.stdout.buffer.write(sys.stdin.buffer.read()[::-1])"],
+        input=b"abc123",
+        timeout=10,
+    )
+    assert result.ok
+    assert result.stdout == b"321cba"
+
+
+@pytest.mark.asyncio
+async def test_nonzero_exit_is_reported_not_raised():
+    engine = _engine()
+    result = await engine.run([PY, "-c", "import sys; sys.stderr.write('boom'); sys.exit(3)"], timeout=10)
+    assert result.returncode == 3
+    assert result.stderr_text == "boom"
+    assert engine.get_stats()[engine.tool_name([PY])]["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_timeout_kills_process():
+    engine = _engine()
+    started = time.monotonic()
+    with pytest.raises(MediaProcessTimeout):
+        await engine.run([PY, "-c", "import time; time.sleep(30)"], timeout=0.3)
+    assert time.monotonic() - started < 5
+    stats = engine.get_stats()[engine.tool_name([PY])]
+    assert stats["timeouts"] == 1
+    assert stats["running"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancellation_kills_process():
+    engine = _engine()
+    task = asyncio.create_task(engine.run([PY, "-c", "import time; time.sleep(30)"], timeout=60))
+    await asyncio.sleep(0.3)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    stats = engine.get_stats()[engine.tool_name([PY])]
+    assert stats["cancelled"] == 1
+    assert stats["running"] == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded_per_tool():
+    engine = _engine(limit=2)
+    cmd = [PY, "-c", "import time; time.sleep(0.3)"]
+    started = time.monotonic()
+    results = await asyncio.gather(*(engine.run(cmd, timeout=10) for _ in range(4)))
+    elapsed = time.monotonic() - started
+
+    assert all(r.ok for r in results)
+    assert elapsed >= 0.55  # 2 vagues de 2
+    stats = engine.get_stats()[engine.tool_name(cmd)]
+    assert stats["concurrency"] == 2
+    assert stats["max_queue_depth"] == 2
+    assert stats["completed"] == 4
+    assert stats["queue_depth"] == 0
+    assert any(r.wait_s > 0.2 for r in results)
+
+
+@pytest.mark.asyncio
+async def test_missing_binary_raises_file_not_found():
+    engine = _engine()
+    with pytest.raises(FileNotFoundError):
+        await engine.run(["definitely-not-a-real-binary-xyz"], timeout=5)
+    assert engine.get_stats()["definitely-not-a-real-binary-xyz"]["running"] == 0
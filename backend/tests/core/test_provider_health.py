@@ -0,0 +1,138 @@
+"""Tests du registre de santé providers partagé (``core.provider_health``)."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import fakeredis.aioredis as fakeredis_async
+import pytest
+
+from core.provider_health import DEFAULT_POLICY, CircuitState, HealthPolicy, ProviderHealthRegistry
+
+POLICY = HealthPolicy(window_s=60, min_calls=4, failure_rate=0.5, cooldown_s=10, max_cooldown_s=40, probe_timeout_s=5)
+
+
+def _registry(redis=None) -> ProviderHealthRegistry:
+    registry = ProviderHealthRegistry(redis=redis)
+    registry.configure("svc", POLICY)
+    return registry
+
+
+async def _settle(registry: ProviderHealthRegistry):
+    await registry.close()
+
+
+def test_opens_on_failure_rate_not_on_isolated_failures():
+    registry = _registry()
+    cb = registry.circuit("svc:a")
+
+    for _ in range(4):
+        cb.record_success()
+    for _ in range(3):
+        cb.record_failure()
+    assert cb.state == CircuitState.CLOSED  # 3/7 < 50 %
+
+    cb.record_failure()
+    assert cb.state == CircuitState.OPEN
+    assert cb.can_execute() is False
+    assert registry.describe("svc:a")["failure_rate"] == 0.5
+
+
+def test_default_policy_cooldown_grows_with_failed_probes():
+    cooldowns = [DEFAULT_POLICY.cooldown_for(trips) for trips in range(1, 6)]
+    assert cooldowns == sorted(cooldowns) and cooldowns[0] < cooldowns[-1] == DEFAULT_POLICY.max_cooldown_s
+
+
+def test_min_calls_guards_against_cold_start():
+    registry = _registry()
+    cb = registry.circuit("svc:a")
+    for _ in range(3):
+        cb.record_failure()
+    assert cb.can_execute() is True
+
+
+@pytest.mark.asyncio
+async def test_local_half_open_lets_a_single_probe_through():
+    registry = _registry()
+    cb = registry.circuit("svc:a")
+    for _ in range(4):
+        cb.record_failure()
+    registry._state("svc:a").opened_until = time.time() - 1
+
+    assert await cb.allow() is True
+    assert await cb.allow() is False
+    cb.record_failure()  # sonde ratée → cooldown doublé
+    st = registry._state("svc:a")
+    assert st.state == CircuitState.OPEN and st.trips == 2
+    assert st.opened_until - time.time() == pytest.approx(20, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_is_shared_across_workers():
+    redis = fakeredis_async.FakeRedis(decode_responses=True)
+    worker_a, worker_b = _registry(redis), _registry(redis)
+
+    for _ in range(4):
+        worker_a.circuit("svc:mistral").record_failure()
+    await _settle(worker_a)
+
+    # worker_b n'a jamais appelé le provider mais le saute directement
+    assert await worker_b.circuit("svc:mistral").allow() is False
+    assert worker_b.circuit("svc:mistral").state == CircuitState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_only_one_worker_probes_after_cooldown():
+    redis = fakeredis_async.FakeRedis(decode_responses=True)
+    workers = [_registry(redis) for _ in range(5)]
+    for _ in range(4):
+        workers[0].circuit("svc:tts").record_failure()
+    await _settle(workers[0])
+    await redis.hset("deepsight:health:svc:tts", "opened_until", int((time.time() - 1) * 1000))
+
+    verdicts = await asyncio.gather(*(w.circuit("svc:tts").allow() for w in workers))
+    assert sorted(verdicts) == [False, False, False, False, True]
+
+    prober = workers[verdicts.index(True)]
+    prober.circuit("svc:tts").record_success()
+    await _settle(prober)
+    assert not await redis.exists("deepsight:health:svc:tts:probe")
+    assert all(await asyncio.gather(*(w.circuit("svc:tts").allow() for w in workers)))
+
+
+@pytest.mark.asyncio
+async def test_order_puts_fast_healthy_instances_first_and_snapshot_reports_them():
+    redis = fakeredis_async.FakeRedis(decode_responses=True)
+    registry = _registry(redis)
+    group = registry.group("svc")
+    group.record_success("https://slow", latency_s=2.0)
+    group.record_success("https://fast", latency_s=0.1)
+    for _ in range(4):
+        group.record_failure("https://down")
+    await _settle(registry)
+
+    fresh = _registry(redis).group("svc")  # autre worker : tout vient de Redis
+    ordered = await fresh.order(["https://down", "https://slow", "https://fast"], by_latency=True)
+    assert ordered == ["https://fast", "https://slow", "https://down"]
+
+    snapshot = await registry.snapshot()
+    assert snapshot["source"] == "redis"
+    rows = {row["provider"]: row for row in snapshot["providers"]}
+    assert rows["svc:https://down"]["state"] == "open"
+    assert rows["svc:https://down"]["failure_rate"] == 1.0
+    assert rows["svc:https://fast"]["latency_ewma_ms"] == pytest.approx(100, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_local_state():
+    class BrokenRedis:
+        async def eval(self, *args):
+            raise ConnectionError("redis down")
+
+    registry = _registry(BrokenRedis())
+    cb = registry.circuit("svc:a")
+    for _ in range(4):
+        cb.record_failure()
+    await _settle(registry)
+    assert await cb.allow() is False
@@ -0,0 +1,125 @@
+"""Tests du moteur de rate limit partagé (``core.rate_limit_engine``)."""
+
+from __future__ import annotations
+
+import fakeredis.aioredis as fakeredis_async
+import pytest
+
+from core import rate_limit_engine as rle
+from core.rate_limit_engine import RateLimitEngine, RateRule
+
+RULES = (RateRule("burst", 3, 10), RateRule("minute", 5, 60))
+
+
+def _engine(redis=None, prefetch: bool = False) -> RateLimitEngine:
+    # Sans client explicite : cache_service (backend mémoire en tests) → compteurs locaux
+    return RateLimitEngine(redis=redis, prefetch=prefetch)
+
+
+@pytest.fixture(params=["local", "redis"])
+def engine(request):
+    return _engine(fakeredis_async.FakeRedis() if request.param == "redis" else None)
+
+
+@pytest.mark.asyncio
+async def test_denies_past_limit_with_retry_after(engine):
+    decisions = [await engine.hit("k", RULES) for _ in range(4)]
+
+    assert [d.allowed for d in decisions] == [True, True, True, False]
+    assert [d.remaining for d in decisions[:3]] == [2, 1, 0]
+    assert decisions[3].rule == "burst"
+    # Fenêtre pondérée : jusqu'à W·(1 + 1/limite) si les hits sont en fin de fenêtre
+    assert 0 < decisions[3].retry_after <= 10 * (1 + 1 / 3)
+    assert decisions[3].retry_after_s >= 1
+
+
+@pytest.mark.asyncio
+async def test_denied_request_consumes_nothing_on_any_rule(engine):
+    rules = (RateRule("minute", 5, 60), RateRule("tight", 1, 60))
+    assert (await engine.hit("k", rules)).allowed
+    denied = await engine.hit("k", rules)
+
+    assert not denied.allowed and denied.rule == "tight"
+    assert (await engine.peek("k", rules)).remaining_by_rule == {"minute": 4, "tight": 0}
+
+
+@pytest.mark.asyncio
+async def test_peek_reads_and_force_records_past_limit(engine):
+    rules = (RateRule("day", 3, 86400),)
+    assert (await engine.peek("guest", rules)).remaining == 3
+    assert (await engine.peek("guest", rules)).remaining == 3
+
+    for _ in range(4):
+        assert (await engine.hit("guest", rules, force=True)).allowed
+
+    after = await engine.peek("guest", rules)
+    assert not after.allowed and after.remaining == 0
+
+
+@pytest.mark.asyncio
+async def test_previous_window_is_weighted(engine, monkeypatch):
+    rules = (RateRule("minute", 10, 60),)
+    now = [1_000_040.0]  # 20s après le début d'une fenêtre de 60s
+    monkeypatch.setattr(rle.time, "time", lambda: now[0])
+    for _ in range(10):
+        assert (await engine.hit("k", rules)).allowed
+
+    now[0] += 60  # fenêtre suivante, 1/3 écoulé : 10 * 2/3 ≈ 6.67 encore comptées
+    assert (await engine.peek("k", rules)).remaining == 3
+
+
+@pytest.mark.asyncio
+async def test_workers_share_counters_through_redis():
+    redis = fakeredis_async.FakeRedis()
+    worker_a, worker_b = _engine(redis), _engine(redis)
+
+    allowed = [(await (worker_a if i % 2 else worker_b).hit("k", RULES)).allowed for i in range(6)]
+
+    assert allowed.count(True) == 3
+    assert worker_a.counters["shared_calls"] + worker_b.counters["shared_calls"] == 6
+
+
+@pytest.mark.asyncio
+async def test_redis_error_falls_back_to_local_counters():
+    class BrokenRedis:
+        async def eval(self, *args):
+            raise ConnectionError("down")
+
+    engine = _engine(BrokenRedis())
+    decisions = [await engine.hit("k", RULES) for _ in range(4)]
+
+    assert [d.allowed for d in decisions] == [True, True, True, False]
+    assert engine.get_stats()["redis_errors"] == 4
+
+
+@pytest.mark.asyncio
+async def test_hot_key_prefetches_tokens(monkeypatch):
+    monkeypatch.setattr(rle, "PREFETCH_MIN_QPS", 5)
+    monkeypatch.setattr(rle, "PREFETCH_TTL_S", 60)
+    monkeypatch.setattr(rle, "PREFETCH_MAX_BATCH", 8)
+    redis = fakeredis_async.FakeRedis()
+    engine = _engine(redis, prefetch=True)
+    rules = (RateRule("minute", 1000, 60),)
+
+    for _ in range(40):
+        assert (await engine.hit("hot", rules)).allowed
+
+    stats = engine.get_stats()
+    assert stats["prefetch_hits"] > 0
+    assert stats["shared_calls"] < 40
+    # Les jetons réservés sont déjà comptés côté Redis : aucun ne se perd ni ne se double
+    assert stats["prefetch_hits"] + stats["shared_calls"] == 40
+    assert (await _engine(redis).peek("hot", rules)).remaining == 1000 - 40 - engine._leases["hot"].tokens
+
+
+@pytest.mark.asyncio
+async def test_prefetch_batch_is_capped_by_limit_share(monkeypatch):
+    monkeypatch.setattr(rle, "PREFETCH_MIN_QPS", 1)
+    monkeypatch.setattr(rle, "PREFETCH_TTL_S", 60)
+    engine = _engine(fakeredis_async.FakeRedis(), prefetch=True)
+    rules = (RateRule("minute", 20, 60),)  # 10 % de 20 → lots de 2 au plus
+
+    decisions = [await engine.hit("k", rules) for _ in range(25)]
+
+    assert [d.allowed for d in decisions].count(True) == 20
+    assert engine.counters["prefetched_tokens"] <= 20
@@ -0,0 +1,147 @@
+"""Tests de la progression des tâches poussée en SSE (``core.task_events`` + ``TaskStore``)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import fakeredis
+import fakeredis.aioredis as fakeredis_async
+import pytest
+
+from core.task_events import TaskEventBus, format_task_event, parse_last_event_id, task_event_stream
+from core.task_store import TaskStore
+
+
+def _store(bus: TaskEventBus) -> TaskStore:
+    store = TaskStore(events=bus)
+    store.FLUSH_DELAY = 0.001
+    return store
+
+
+async def _worker(server) -> tuple:
+    """Un « worker » : son bus et son store, sur le même Redis que les autres."""
+    bus = TaskEventBus()
+    store = _store(bus)
+    await store.init_redis(fakeredis_async.FakeRedis(server=server))
+    await bus.start()
+    return bus, store
+
+
+def _events(chunks: list) -> list:
+    """Décode les événements `progress` d'un flux SSE : [(id, data)]."""
+    events = []
+    for chunk in chunks:
+        if chunk.startswith("id: "):
+            lines = chunk.strip().split("\n")
+            events.append((int(lines[0][4:]), json.loads(lines[2][6:])))
+    return events
+
+
+async def _collect(stream, timeout: float = 2.0) -> list:
+    async def _run():
+        return [chunk async for chunk in stream]
+
+    return await asyncio.wait_for(_run(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_local_bus_streams_updates_until_terminal_status():
+    bus = TaskEventBus()
+    store = _store(bus)
+    store["t1"] = {"status": "pending", "progress": 0, "user_id": 7}
+    await store.force_flush()
+    snapshot, event_id = await store.aget_snapshot("t1")
+
+    chunks: list = []
+
+    async def consume():
+        async for chunk in task_event_stream(store, "t1", snapshot, event_id, bus=bus):
+            chunks.append(chunk)
+
+    consumer = asyncio.ensure_future(consume())
+    await asyncio.sleep(0.01)
+    store["t1"].update({"status": "processing", "progress": 40})
+    await asyncio.sleep(0.02)
+    store["t1"]["status"] = "completed"
+    await asyncio.wait_for(consumer, 2)
+
+    events = _events(chunks)
+    assert [e[1]["status"] for e in events] == ["pending", "processing", "completed"]
+    assert [e[0] for e in events] == sorted({e[0] for e in events})
+    assert all("user_id" not in data and data["task_id"] == "t1" for _, data in events)
+    assert chunks[0].startswith("retry:") and chunks[-1].startswith("event: end")
+    assert bus.get_stats()["subscribers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_already_seen_state():
+    bus = TaskEventBus()
+    store = _store(bus)
+    store["t1"] = {"status": "completed", "progress": 100}
+    await store.force_flush()
+    snapshot, event_id = await store.aget_snapshot("t1")
+
+    resumed = await _collect(task_event_stream(store, "t1", snapshot, event_id, last_event_id=event_id, bus=bus))
+    fresh = await _collect(task_event_stream(store, "t1", snapshot, event_id, last_event_id=event_id - 1, bus=bus))
+
+    assert _events(resumed) == [] and resumed[-1].startswith("event: end")
+    assert _events(fresh) == [(event_id, {"status": "completed", "progress": 100, "task_id": "t1"})]
+
+
+@pytest.mark.asyncio
+async def test_updates_reach_subscribers_on_another_worker():
+    server = fakeredis.FakeServer()
+    owner_bus, owner = await _worker(server)
+    reader_bus, reader = await _worker(server)
+    try:
+        owner["t1"] = {"status": "processing", "progress": 10, "user_id": 7}
+        await owner.force_flush()
+
+        snapshot, event_id = await reader.aget_snapshot("t1")
+        assert snapshot["progress"] == 10 and event_id > 0
+
+        stream = task_event_stream(reader, "t1", snapshot, event_id, bus=reader_bus)
+        consumer = asyncio.ensure_future(_collect(stream))
+        await asyncio.sleep(0.05)
+        owner["t1"]["progress"] = 60
+        await asyncio.sleep(0.05)
+        owner["t1"].update({"status": "completed", "progress": 100})
+        chunks = await consumer
+
+        assert [data["progress"] for _, data in _events(chunks)] == [10, 60, 100]
+        # Copie locale du worker lecteur rafraîchie en place par le bus
+        assert reader.get("t1")["status"] == "completed"
+    finally:
+        await owner_bus.close()
+        await reader_bus.close()
+
+
+@pytest.mark.asyncio
+async def test_remote_event_refreshes_held_reference_in_place():
+    server = fakeredis.FakeServer()
+    owner_bus, owner = await _worker(server)
+    reader_bus, reader = await _worker(server)
+    try:
+        owner["t1"] = {"status": "processing"}
+        await owner.force_flush()
+        held = await reader.aget("t1")
+
+        owner["t1"]["status"] = "cancelled"
+        await owner.force_flush()
+        await asyncio.sleep(0.05)
+
+        assert held["status"] == "cancelled"
+        assert reader.get("t1") is held
+    finally:
+        await owner_bus.close()
+        await reader_bus.close()
+
+
+def test_sse_helpers():
+    assert parse_last_event_id("42", "7") == 42
+    assert parse_last_event_id(None, "7") == 7
+    assert parse_last_event_id("abc", None) == 0
+    assert format_task_event("t", 3, {"status": "ok", "user_id": 1}) == (
+        'id: 3\nevent: progress\ndata: {"status": "ok", "task_id": "t"}\n\n'
+    )
@@ -26,6 +26,23 @@ import pytest
 import pytest_asyncio
 
 
+@pytest_asyncio.fixture(autouse=True)
+async def _reset_query_embedding_cache():
+    """Vide le cache d'embeddings de queries (L1 + L2) entre chaque test.
+
+    Sans ça, un vecteur mis en cache par un test (même query "test") serait
+    resservi au suivant malgré un mock d'embedding différent.
+    """
+    from core.cache import cache_service
+    from search.query_cache import query_embedding_cache
+
+    query_embedding_cache.clear()
+    await cache_service.invalidate_prefix("query_embed:")
+    yield
+    query_embedding_cache.clear()
+    await cache_service.invalidate_prefix("query_embed:")
+
+
 @pytest.fixture
 def fake_embedding_1024() -> list[float]:
     """Embedding factice de 1024 floats normalisés."""
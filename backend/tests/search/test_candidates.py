@@ -0,0 +1,51 @@
+"""Tests pour le scoring vectorisé unifié ``search.candidates``."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from search.candidates import score_candidates
+from search.vector_codec import encode_embedding
+
+
+def _row(name: str, vec: list[float], binary: bool = True):
+    return SimpleNamespace(
+        name=name,
+        embedding_vec=encode_embedding(vec) if binary else None,
+        embedding_json=None if binary else json.dumps(vec),
+    )
+
+
+def test_scores_sorted_and_filtered_by_min_score():
+    rows = [_row("far", [0.0, 1.0]), _row("best", [1.0, 0.0]), _row("mid", [1.0, 1.0])]
+    scored = score_candidates([1.0, 0.0], rows, min_score=0.3)
+    assert [r.name for r, _ in scored] == ["best", "mid"]
+    assert scored[0][1] == pytest.approx(1.0)
+    assert scored[1][1] == pytest.approx(0.7071, abs=1e-4)
+
+
+def test_limit_selects_top_k():
+    rows = [_row(str(i), [float(i), 10.0 - i]) for i in range(10)]
+    scored = score_candidates([1.0, 0.0], rows, min_score=-1.0, limit=3)
+    assert [r.name for r, _ in scored] == ["9", "8", "7"]
+
+
+def test_mixed_binary_and_legacy_json_rows():
+    rows = [_row("json", [1.0, 0.0], binary=False), _row("bin", [0.0, 1.0])]
+    scored = score_candidates([1.0, 1.0], rows, min_score=0.0)
+    assert {r.name for r, _ in scored} == {"json", "bin"}
+
+
+def test_skips_unusable_rows_and_zero_vectors():
+    rows = [
+        SimpleNamespace(name="empty", embedding_vec=None, embedding_json=None),
+        _row("wrong-dim", [1.0, 0.0, 0.0]),
+        _row("zero", [0.0, 0.0]),
+        _row("ok", [1.0, 0.0]),
+    ]
+    scored = score_candidates([1.0, 0.0], rows, min_score=0.0)
+    assert [(r.name, round(s, 4)) for r, s in scored] == [("ok", 1.0), ("zero", 0.0)]
+    assert score_candidates([0.0, 0.0], rows, min_score=0.0) == []
@@ -164,13 +164,13 @@ async def summary_factory(async_session: AsyncSession, user_factory):
 
 @pytest.fixture
 def patched_embeddings(monkeypatch):
-    """Patche generate_embedding (query side) + generate_embeddings_batch (data
+    """Patche embed_query (query side) + generate_embeddings_batch (data
     side, utilisé par embed_summary).
 
     Cette stratégie évite de patcher `httpx.AsyncClient.post` qui interférerait
     avec le test client lui-même (ASGITransport utilise httpx en interne).
 
-    - generate_embedding → query embedding `[0.5] * 1024` (déterministe)
+    - embed_query → query embedding `[0.5] * 1024` (déterministe)
     - generate_embeddings_batch → N embeddings factices `[0.001 * (i+1) ...]`
       pour rester cohérent avec le seed historique de `fake_embedding_1024`.
     - MIN_SIMILARITY → 0.0 pour que tout match soit accepté.
@@ -184,9 +184,9 @@ def patched_embeddings(monkeypatch):
         return [fake_data_embedding for _ in texts]
 
     # Query side (services search)
-    monkeypatch.setattr("search.global_search.generate_embedding", fake_query_gen)
+    monkeypatch.setattr("search.global_search.embed_query", fake_query_gen)
     monkeypatch.setattr("search.global_search.MIN_SIMILARITY", 0.0)
-    monkeypatch.setattr("search.within_search.generate_embedding", fake_query_gen)
+    monkeypatch.setattr("search.within_search.embed_query", fake_query_gen)
     monkeypatch.setattr("search.within_search.MIN_SIMILARITY", 0.0)
 
     # Data side (helpers embed_*) — patch dans le module embedding_service
@@ -0,0 +1,113 @@
+"""Tests pour la file de micro-batching ``search.embedding_batcher``."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from search.embedding_batcher import EmbeddingBatcher, TokenBucket
+
+
+class _Recorder:
+    """Faux generate_embeddings_batch : enregistre les batches reçus."""
+
+    def __init__(self, fail_on: str | None = None, delay: float = 0.0):
+        self.calls: list[list[str]] = []
+        self.fail_on = fail_on
+        self.delay = delay
+
+    async def __call__(self, texts):
+        self.calls.append(list(texts))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return [None if t == self.fail_on else [float(len(t))] for t in texts]
+
+
+def _batcher(embed_fn, **kwargs) -> EmbeddingBatcher:
+    kwargs.setdefault("bucket", TokenBucket(rate=1000, burst=1000))
+    kwargs.setdefault("linger_ms", 20)
+    return EmbeddingBatcher(embed_fn, enabled=True, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writers_are_coalesced_into_one_request():
+    recorder = _Recorder()
+    batcher = _batcher(recorder, max_items=32)
+
+    results = await asyncio.gather(
+        batcher.embed_many(["a", "bb"]),
+        batcher.embed_many(["ccc"]),
+        batcher.embed_one("dddd"),
+    )
+
+    assert results == [[[1.0], [2.0]], [[3.0]], [4.0]]
+    assert len(recorder.calls) == 1
+    assert sorted(recorder.calls[0]) == ["a", "bb", "ccc", "dddd"]
+    stats = batcher.get_stats()
+    assert stats["batches"] == 1
+    assert stats["embedded"] == 4
+    assert stats["queue_depth"] == 0
+    await batcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_batches_respect_item_and_char_limits():
+    recorder = _Recorder()
+    batcher = _batcher(recorder, max_items=3, max_chars=10)
+
+    texts = ["x" * 4, "y" * 4, "z" * 4, "w", "v"]
+    results = await batcher.embed_many(texts)
+
+    assert [r[0] for r in results] == [4.0, 4.0, 4.0, 1.0, 1.0]
+    assert all(len(call) <= 3 for call in recorder.calls)
+    assert all(sum(len(t) for t in call) <= 10 for call in recorder.calls)
+    assert [t for call in recorder.calls for t in call] == texts
+    await batcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_failures_map_to_none_per_text():
+    batcher = _batcher(_Recorder(fail_on="bad"))
+    assert await batcher.embed_many(["ok", "bad"]) == [[2.0], None]
+    assert batcher.get_stats()["failed"] == 1
+    await batcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_embed_fn_exception_resolves_all_waiters_with_none():
+    async def boom(texts):
+        raise RuntimeError("429")
+
+    batcher = _batcher(boom)
+    assert await batcher.embed_many(["a", "b"]) == [None, None]
+    await batcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_disabled_batcher_calls_embed_fn_directly():
+    recorder = _Recorder()
+    batcher = EmbeddingBatcher(recorder, enabled=False, max_items=2)
+    assert await batcher.embed_many(["a", "b", "c"]) == [[1.0], [1.0], [1.0]]
+    assert recorder.calls == [["a", "b"], ["c"]]
+
+
+def test_token_bucket_enforces_rate():
+    now = [0.0]
+    bucket = TokenBucket(rate=2, burst=2, clock=lambda: now[0])
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+    now[0] = 0.5
+    assert bucket.try_acquire() == 0
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_throttles_requests():
+    recorder = _Recorder()
+    batcher = _batcher(recorder, max_items=1, linger_ms=0, bucket=TokenBucket(rate=50, burst=1))
+    await batcher.embed_many(["a", "b", "c"])
+    assert len(recorder.calls) == 3
+    assert batcher.get_stats()["throttled_seconds"] > 0
+    await batcher.stop()
+
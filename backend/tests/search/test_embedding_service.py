@@ -290,6 +290,31 @@ async def test_embed_summary_returns_false_on_missing_summary(async_session):
     assert result is False
 
 
+@pytest.mark.asyncio
+async def test_embed_summary_sends_all_sections_in_one_batched_request(
+    async_session, summary_factory, patch_httpx_post, monkeypatch
+):
+    """Les sections passent par embedding_batcher → une seule requête pleine."""
+    from search import embedding_service
+
+    calls = []
+    original = embedding_service.generate_embeddings_batch
+
+    async def spy(texts):
+        calls.append(len(texts))
+        return await original(texts)
+
+    monkeypatch.setattr(embedding_service, "generate_embeddings_batch", spy)
+    summary = await summary_factory(full_digest=" ".join(f"mot{i}" for i in range(6000)))
+
+    assert await embedding_service.embed_summary(summary.id) is True
+    assert calls == [12]  # 12 chunks de 500 mots (avant : 2 requêtes de 10 max)
+    rows = (
+        await async_session.execute(select(SummaryEmbedding).where(SummaryEmbedding.summary_id == summary.id))
+    ).scalars().all()
+    assert len(rows) == 12
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🧪 TASK 7 — embed_flashcards
 # ═══════════════════════════════════════════════════════════════════════════════
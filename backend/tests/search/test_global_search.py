@@ -205,10 +205,10 @@ async def flashcard_embedding_factory(async_session: AsyncSession, fake_embeddin
 
 @pytest.fixture
 def patched_query_embedding(monkeypatch, fake_embedding_1024):
-    """Patche generate_embedding pour la query (différent du seed des fixtures)."""
+    """Patche embed_query pour la query (différent du seed des fixtures)."""
     async def fake_gen(text: str):
         return [0.5] * 1024  # query embedding différent
-    monkeypatch.setattr("search.global_search.generate_embedding", fake_gen)
+    monkeypatch.setattr("search.global_search.embed_query", fake_gen)
     monkeypatch.setattr("search.global_search.MIN_SIMILARITY", 0.0)  # pas de filtre score
 
 
@@ -266,3 +266,64 @@ async def test_search_global_filters_by_source_types(
         filters=SearchFilters(limit=10, source_types=["flashcard"]),
     )
     assert all(r.source_type == "flashcard" for r in results)
+
+
+@pytest.mark.asyncio
+async def test_search_global_scores_all_source_types_in_one_pass(
+    async_session, summary_factory, summary_embedding_factory,
+    flashcard_factory, flashcard_embedding_factory, patched_query_embedding,
+):
+    """UNION ALL des 5 sources, top-k trié, chunk transcript dédupliqué, binaire + JSON mélangés."""
+    from db.database import (
+        ChatEmbedding,
+        ChatMessage,
+        QuizEmbedding,
+        QuizQuestion,
+        TranscriptCache,
+        TranscriptEmbedding,
+    )
+    from search.vector_codec import encode_embedding
+
+    summary = await summary_factory(video_id="vid-union")
+    # Deuxième summary du même user sur la même vidéo → transcript joint 2x
+    await summary_factory(user=summary.user, video_id="vid-union")
+    await summary_embedding_factory(summary=summary, text_preview="from summary", embedding=[0.5] * 1024)
+    fc = await flashcard_factory(summary=summary)
+    await flashcard_embedding_factory(flashcard=fc, text_preview="from flashcard", embedding=[0.5] * 512 + [0.0] * 512)
+
+    q = QuizQuestion(
+        summary_id=summary.id, user_id=summary.user_id, position=0,
+        question="?", options_json='["a"]', correct_index=0,
+    )
+    user_msg = ChatMessage(user_id=summary.user_id, summary_id=summary.id, role="user", content="q")
+    agent_msg = ChatMessage(user_id=summary.user_id, summary_id=summary.id, role="assistant", content="a")
+    async_session.add_all([q, user_msg, agent_msg, TranscriptCache(video_id="vid-union", platform="youtube")])
+    await async_session.commit()
+    async_session.add_all([
+        QuizEmbedding(
+            quiz_question_id=q.id, summary_id=summary.id, user_id=summary.user_id,
+            embedding_vec=encode_embedding([0.5] * 256 + [0.0] * 768), text_preview="from quiz",
+        ),
+        ChatEmbedding(
+            summary_id=summary.id, user_id=summary.user_id, turn_index=0,
+            user_message_id=user_msg.id, agent_message_id=agent_msg.id,
+            embedding_vec=encode_embedding([0.5] * 128 + [0.0] * 896), text_preview="from chat",
+        ),
+        TranscriptEmbedding(
+            video_id="vid-union", chunk_index=0,
+            embedding_vec=encode_embedding([0.5] * 64 + [0.0] * 960), text_preview="from transcript",
+        ),
+    ])
+    await async_session.commit()
+
+    from search.global_search import search_global, SearchFilters
+
+    results = await search_global(user_id=summary.user_id, query="test", filters=SearchFilters(limit=10))
+    assert [r.source_type for r in results] == ["summary", "flashcard", "quiz", "chat", "transcript"]
+    assert results[0].score == pytest.approx(1.0, abs=1e-5)
+    assert results[2].source_metadata["quiz_question_id"] == q.id
+    assert results[3].source_metadata["agent_message_id"] == agent_msg.id
+    assert results[4].source_metadata["chunk_index"] == 0
+
+    top2 = await search_global(user_id=summary.user_id, query="test", filters=SearchFilters(limit=2))
+    assert [r.source_type for r in top2] == ["summary", "flashcard"]
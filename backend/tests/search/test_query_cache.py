@@ -0,0 +1,69 @@
+"""Tests pour le cache d'embeddings de requêtes ``search.query_cache``."""
+
+from __future__ import annotations
+
+import pytest
+
+from search import embedding_service
+from search.query_cache import QueryEmbeddingCache, normalize_query
+
+
+@pytest.fixture
+def api_calls(monkeypatch):
+    calls: list[str] = []
+
+    async def fake_generate(text: str):
+        calls.append(text)
+        return [0.25, 0.5, float(len(calls))]
+
+    monkeypatch.setattr(embedding_service, "generate_embedding", fake_generate)
+    return calls
+
+
+def test_normalize_query_is_case_and_whitespace_insensitive():
+    assert normalize_query("  Photo\tSynthèse  ") == normalize_query("photo synthèse")
+    assert normalize_query("ﬁn") == "fin"  # NFKC
+
+
+@pytest.mark.asyncio
+async def test_repeated_query_hits_l1_without_api_call(api_calls):
+    cache = QueryEmbeddingCache()
+    first = await cache.get_embedding("Climat")
+    second = await cache.get_embedding("  climat ")
+    assert first == second == [0.25, 0.5, 1.0]
+    assert api_calls == ["Climat"]
+    stats = cache.get_stats()
+    assert (stats["misses"], stats["l1_hits"], stats["l2_hits"]) == (1, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_l2_shared_between_workers(api_calls):
+    worker_a, worker_b = QueryEmbeddingCache(), QueryEmbeddingCache()
+    await worker_a.get_embedding("énergie")
+    assert await worker_b.get_embedding("énergie") == [0.25, 0.5, 1.0]
+    assert len(api_calls) == 1
+    assert worker_b.get_stats()["l2_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_model_version_bump_invalidates(api_calls, monkeypatch):
+    cache = QueryEmbeddingCache()
+    await cache.get_embedding("q")
+    monkeypatch.setattr(embedding_service, "MODEL_VERSION_TAG", "mistral-embed-next")
+    await cache.get_embedding("q")
+    assert len(api_calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_l1_lru_eviction_and_api_failure_not_cached(api_calls, monkeypatch):
+    cache = QueryEmbeddingCache(maxsize=1)
+    await cache.get_embedding("a")
+    await cache.get_embedding("b")
+    assert cache.get_stats()["l1_size"] == 1
+
+    async def failing(_text):
+        return None
+
+    monkeypatch.setattr(embedding_service, "generate_embedding", failing)
+    assert await cache.get_embedding("c") is None
+    assert cache.get_stats()["api_failures"] == 1
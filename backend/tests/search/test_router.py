@@ -7,7 +7,7 @@ Approach : monter l'app FastAPI complète avec :
   de test (Summary, embeddings, ExplainPassageCache).
 - `dependency_overrides[get_current_user]` pour injecter un User mock en bypass auth.
 - `dependency_overrides[get_session]` pour les autres routers (pas critique ici).
-- `monkeypatch` de `generate_embedding` dans les services pour des embeddings déterministes.
+- `monkeypatch` de `embed_query` dans les services pour des embeddings déterministes.
 - Patch `_call_mistral_chat` dans `search.explain_passage` pour éviter les appels réseau.
 - `recent_queries` utilise le fallback in-memory quand Redis est absent (cf. service).
 
@@ -182,14 +182,14 @@ async def summary_embedding_factory(async_session: AsyncSession, fake_embedding_
 
 @pytest.fixture
 def patched_query_embedding(monkeypatch, fake_embedding_1024):
-    """Patche generate_embedding dans les modules services pour des embeddings stables."""
+    """Patche embed_query dans les modules services pour des embeddings stables."""
 
     async def fake_gen(text: str):
         return [0.5] * 1024  # query embedding différent
 
-    monkeypatch.setattr("search.global_search.generate_embedding", fake_gen)
+    monkeypatch.setattr("search.global_search.embed_query", fake_gen)
     monkeypatch.setattr("search.global_search.MIN_SIMILARITY", 0.0)
-    monkeypatch.setattr("search.within_search.generate_embedding", fake_gen)
+    monkeypatch.setattr("search.within_search.embed_query", fake_gen)
     monkeypatch.setattr("search.within_search.MIN_SIMILARITY", 0.0)
 
 
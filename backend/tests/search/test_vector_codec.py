@@ -0,0 +1,42 @@
+"""Tests pour l'encodage binaire des embeddings ``search.vector_codec``."""
+
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from search import vector_codec
+from search.vector_codec import decode_embedding, embedding_columns, encode_embedding
+
+
+def test_roundtrip_is_float32_and_compact():
+    vec = [0.001 * (i + 1) for i in range(1024)]
+    blob = encode_embedding(vec)
+    assert len(blob) == 4 * 1024
+    decoded = decode_embedding(blob)
+    assert decoded.dtype == np.float32
+    np.testing.assert_allclose(decoded, np.asarray(vec, dtype=np.float32))
+
+
+def test_decode_is_zero_copy_view():
+    blob = encode_embedding([1.0, 2.0, 3.0])
+    decoded = decode_embedding(blob)
+    assert not decoded.flags.owndata
+    assert not decoded.flags.writeable
+
+
+def test_decode_falls_back_to_legacy_json():
+    decoded = decode_embedding(None, json.dumps([0.5, 0.25]))
+    np.testing.assert_allclose(decoded, [0.5, 0.25])
+    assert decode_embedding(None, "not json") is None
+    assert decode_embedding(None, None) is None
+
+
+@pytest.mark.parametrize("dual_write", [False, True])
+def test_embedding_columns_respects_dual_write(monkeypatch, dual_write):
+    monkeypatch.setattr(vector_codec, "EMBEDDING_JSON_DUAL_WRITE", dual_write)
+    cols = embedding_columns([1.0, 2.0])
+    assert decode_embedding(cols["embedding_vec"]).tolist() == [1.0, 2.0]
+    assert (cols["embedding_json"] is not None) is dual_write
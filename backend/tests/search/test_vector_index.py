@@ -0,0 +1,159 @@
+"""Tests pour l'index vectoriel in-memory ``search.vector_index``."""
+
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from db.database import Base, TranscriptCache, TranscriptEmbedding  # noqa: F401
+from search.vector_index import IndexedChunk, TranscriptVectorIndex
+
+DIM = 8
+
+
+def _chunk(row_id: int, video_id: str, chunk_index: int = 0, category: str | None = None) -> IndexedChunk:
+    return IndexedChunk(
+        row_id=row_id,
+        video_id=video_id,
+        chunk_index=chunk_index,
+        text_preview=f"{video_id}#{chunk_index}",
+        video_title=f"Title {video_id}",
+        video_channel="Chan",
+        thumbnail_url=None,
+        category=category,
+    )
+
+
+def _onehot(i: int, scale: float = 1.0) -> list[float]:
+    v = [0.0] * DIM
+    v[i] = scale
+    return v
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# 🧮 Scoring / top-k
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def test_search_matches_bruteforce_cosine():
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((200, DIM)).astype(np.float32)
+    index = TranscriptVectorIndex(dim=DIM, mode="flat")
+    index.add([_chunk(i + 1, f"v{i}") for i in range(200)], vectors)
+
+    query = rng.standard_normal(DIM).astype(np.float32)
+    hits = index.search(query, limit=5, min_score=-1.0)
+
+    expected = (vectors @ query) / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(query))
+    top = np.argsort(-expected)[:5]
+    assert [c.video_id for c, _ in hits] == [f"v{i}" for i in top]
+    assert hits[0][1] == pytest.approx(float(expected[top[0]]), abs=1e-5)
+
+
+def test_search_dedups_by_video_and_applies_min_score():
+    index = TranscriptVectorIndex(dim=DIM, mode="flat")
+    index.add(
+        [_chunk(1, "a", 0), _chunk(2, "a", 1), _chunk(3, "b", 0), _chunk(4, "c", 0)],
+        [_onehot(0), _onehot(0, 2.0), [0.7, 0.7, 0, 0, 0, 0, 0, 0], _onehot(1)],
+    )
+    hits = index.search(_onehot(0), limit=10, min_score=0.3)
+    assert [c.video_id for c, _ in hits] == ["a", "b"]
+    assert hits[0][1] == pytest.approx(1.0)
+
+
+def test_category_filter_uses_mask_and_refreshes_after_add():
+    index = TranscriptVectorIndex(dim=DIM, mode="flat")
+    index.add([_chunk(1, "a", category="science"), _chunk(2, "b", category="music")], [_onehot(0), _onehot(0)])
+    assert [c.video_id for c, _ in index.search(_onehot(0), category="music")] == ["b"]
+    assert index.search(_onehot(0), category="unknown") == []
+
+    index.add([_chunk(3, "c", category="music")], [_onehot(0, 3.0)])
+    assert {c.video_id for c, _ in index.search(_onehot(0), category="music")} == {"b", "c"}
+
+
+def test_add_replaces_existing_chunk():
+    index = TranscriptVectorIndex(dim=DIM, mode="flat")
+    index.add([_chunk(1, "a")], [_onehot(0)])
+    index.add([_chunk(2, "a")], [_onehot(1)])
+    assert len(index) == 1
+    assert index.search(_onehot(0), min_score=0.3) == []
+    assert index.search(_onehot(1))[0][0].row_id == 2
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# 🔄 Synchronisation DB
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+@pytest_asyncio.fixture
+async def async_session(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    SessionMaker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr("db.database.async_session_maker", SessionMaker)
+    async with SessionMaker() as session:
+        yield session
+    await engine.dispose()
+
+
+async def _insert(session, video_id: str, vectors: list[list[float]], category: str = "science"):
+    session.add(TranscriptCache(video_id=video_id, platform="youtube", video_title=video_id, category=category))
+    for i, vec in enumerate(vectors):
+        session.add(TranscriptEmbedding(video_id=video_id, chunk_index=i, embedding_json=json.dumps(vec)))
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_ensure_synced_loads_then_catches_up_incrementally(async_session, monkeypatch):
+    await _insert(async_session, "v1", [[1.0] + [0.0] * 1023])
+    index = TranscriptVectorIndex(dim=1024, mode="flat")
+    await index.ensure_synced()
+    assert len(index) == 1 and index.loaded
+
+    await _insert(async_session, "v2", [[0.0, 1.0] + [0.0] * 1022])
+    monkeypatch.setattr("search.vector_index.VECTOR_INDEX_SYNC_SECONDS", 0.0)
+    await index.ensure_synced()
+    assert len(index) == 2
+    hit = index.search([0.0, 1.0] + [0.0] * 1022, limit=1)[0][0]
+    assert hit.video_id == "v2" and hit.category == "science"
+
+
+@pytest.mark.asyncio
+async def test_search_similar_uses_index(async_session, monkeypatch):
+    from search import embedding_service
+
+    await _insert(async_session, "v1", [[1.0] + [0.0] * 1023, [0.0, 1.0] + [0.0] * 1022])
+    monkeypatch.setattr(embedding_service, "transcript_index", TranscriptVectorIndex(dim=1024, mode="flat"))
+
+    async def fake_embed(_query):
+        return [0.0, 1.0] + [0.0] * 1022
+
+    monkeypatch.setattr(embedding_service, "generate_embedding", fake_embed)
+    results = await embedding_service.search_similar("query", limit=5)
+    assert len(results) == 1
+    assert results[0]["video_id"] == "v1"
+    assert results[0]["chunk_index"] == 1
+    assert results[0]["score"] == pytest.approx(1.0)
+
+
+@pytest.mark.asyncio
+async def test_local_add_does_not_skip_lower_id_rows_from_other_workers(async_session, monkeypatch):
+    await _insert(async_session, "v1", [[1.0] + [0.0] * 1023])
+    index = TranscriptVectorIndex(dim=1024, mode="flat")
+    await index.ensure_synced()
+
+    # Un autre worker committe v2 ; ce worker insère v3 (id supérieur) et le pousse localement
+    await _insert(async_session, "v2", [[0.0, 1.0] + [0.0] * 1022])
+    await _insert(async_session, "v3", [[0.0, 0.0, 1.0] + [0.0] * 1021])
+    index.add([_chunk(3, "v3", category="science")], [[0.0, 0.0, 1.0] + [0.0] * 1021])
+    assert len(index) == 2
+
+    monkeypatch.setattr("search.vector_index.VECTOR_INDEX_SYNC_SECONDS", 0.0)
+    await index.ensure_synced()
+    assert len(index) == 3
+    assert index.search([0.0, 1.0] + [0.0] * 1022, limit=1)[0][0].video_id == "v2"
@@ -141,10 +141,10 @@ async def summary_embedding_factory(async_session: AsyncSession, fake_embedding_
 
 @pytest.fixture
 def patched_query_embedding(monkeypatch, fake_embedding_1024):
-    """Patche generate_embedding dans search.within_search."""
+    """Patche embed_query dans search.within_search."""
     async def fake_gen(text: str):
         return [0.5] * 1024
-    monkeypatch.setattr("search.within_search.generate_embedding", fake_gen)
+    monkeypatch.setattr("search.within_search.embed_query", fake_gen)
     monkeypatch.setattr("search.within_search.MIN_SIMILARITY", 0.0)
 
 
@@ -0,0 +1,82 @@
+"""Tests for the pre-rendered OG image pipeline (share.og_cache).
+
+Rendering goes through core.cpu_pool in thread mode here (no process spawn);
+storage is the local-filesystem fallback of storage.r2 in a tmp dir.
+"""
+import asyncio
+import io
+
+import pytest
+from PIL import Image
+
+from share import og_cache
+
+INPUTS = {"video_title": "Cached Video", "video_thumbnail": None, "verdict_text": "Solide", "channel": "Chan"}
+
+
+@pytest.fixture(autouse=True)
+def _isolated(monkeypatch):
+    import core.cpu_pool as cpu_pool
+
+    monkeypatch.setattr(cpu_pool, "CPU_POOL_WORKERS", 0)
+    monkeypatch.setattr(og_cache, "_memory", og_cache.OrderedDict())
+    monkeypatch.setattr(og_cache, "_counters", dict.fromkeys(og_cache._counters, 0))
+
+
+@pytest.fixture
+def local_storage(tmp_path, monkeypatch):
+    import storage.r2 as r2
+
+    monkeypatch.setattr(r2, "THUMBNAIL_BASE_URL", "https://cdn.test/media")
+    monkeypatch.setattr(r2, "LOCAL_THUMB_DIR", tmp_path)
+    return tmp_path
+
+
+def test_hash_tracks_every_render_input():
+    base = og_cache.og_render_hash(INPUTS)
+    assert base == og_cache.og_render_hash(dict(INPUTS))
+    assert base != og_cache.og_render_hash({**INPUTS, "verdict_text": "Fragile"})
+    assert base != og_cache.og_render_hash({**INPUTS, "channel": None})
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_render_once():
+    pngs = await asyncio.gather(*(og_cache.get_og_image(1, INPUTS) for _ in range(5)))
+
+    assert og_cache._counters["renders"] == 1
+    assert len(set(pngs)) == 1
+    assert Image.open(io.BytesIO(pngs[0])).size == (1200, 630)
+    await og_cache.get_og_image(1, INPUTS)
+    assert (og_cache._counters["renders"], og_cache._counters["memory_hits"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_prerender_stores_and_serving_reads_storage(local_storage, monkeypatch):
+    await og_cache.prerender_og_image(7, INPUTS)
+    key = og_cache.og_image_key(7, og_cache.og_render_hash(INPUTS))
+    stored = (local_storage / key).read_bytes()
+    assert stored[:8] == b"\x89PNG\r\n\x1a\n"
+
+    # Another worker (empty LRU) serves the stored bytes without rendering
+    monkeypatch.setattr(og_cache, "_memory", og_cache.OrderedDict())
+    assert await og_cache.get_og_image(7, INPUTS) == stored
+    assert og_cache._counters["renders"] == 1
+    assert og_cache._counters["storage_hits"] == 1
+
+    # Already stored: a second pre-render is a no-op
+    monkeypatch.setattr(og_cache, "_memory", og_cache.OrderedDict())
+    await og_cache.prerender_og_image(7, INPUTS)
+    assert og_cache._counters["prerenders"] == 1
+
+
+def test_render_runs_in_process_pool(monkeypatch):
+    import core.cpu_pool as cpu_pool
+
+    monkeypatch.setattr(cpu_pool, "CPU_POOL_WORKERS", 1)
+    try:
+        png = asyncio.run(og_cache.get_og_image(1, INPUTS))
+        assert cpu_pool.get_cpu_pool_stats()["kinds"]["og_image"]["completed"] >= 1
+        assert cpu_pool._executor is not None
+    finally:
+        cpu_pool.shutdown_cpu_pool()
+    assert png[:8] == b"\x89PNG\r\n\x1a\n"
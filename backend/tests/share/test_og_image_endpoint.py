@@ -23,3 +23,13 @@ def test_og_image_endpoint_sets_cache_headers(client: TestClient, active_share_t
     resp = client.get(f"/api/share/{active_share_token}/og-image.png")
     cc = resp.headers.get("cache-control", "")
     assert "max-age" in cc
+
+
+def test_og_image_endpoint_revalidates_with_etag(client: TestClient, active_share_token: str):
+    first = client.get(f"/api/share/{active_share_token}/og-image.png")
+    etag = first.headers["etag"]
+
+    resp = client.get(f"/api/share/{active_share_token}/og-image.png", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == etag
+    assert resp.content == b""
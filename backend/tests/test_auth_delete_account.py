@@ -3,7 +3,7 @@ Tests pour DELETE /api/auth/account — RGPD Article 17 (suppression sans délai
 
 Couvre la séquence :
 1. Vérification mot de passe (skip pour comptes Google)
-2. Purge R2 audio summaries par prefix (best-effort, non-blocking)
+2. Purge R2 audio summaries + images OG de partage par prefix (best-effort, non-blocking)
 3. Invalidate session
 4. Audit log
 5. Cascade DELETE PG
@@ -84,6 +84,7 @@ async def test_delete_account_purges_r2_for_each_summary():
         "audio-summaries/101/",
         "audio-summaries/102/",
         "audio-summaries/103/",
+        "share-og/42/",
     ]
     session.delete.assert_called_once_with(user)
     session.commit.assert_called_once()
@@ -0,0 +1,124 @@
+"""Tests du CompressionMiddleware streaming de ``middleware.performance``."""
+
+from __future__ import annotations
+
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from middleware import performance
+from middleware.performance import CompressionMiddleware
+
+BIG = {"items": [{"id": i, "title": f"Analyse {i}", "summary": "lorem ipsum " * 20} for i in range(200)]}
+
+
+def _app(**kwargs) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, **kwargs)
+
+    @app.get("/big")
+    async def big():
+        return JSONResponse(BIG)
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(50):
+                yield (f'{{"row": {i}, "text": "' + "x" * 500 + '"}\n').encode()
+
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    @app.get("/image")
+    async def image():
+        return Response(b"\x89PNG" + b"\x00" * 4096, media_type="image/png")
+
+    @app.get("/encoded")
+    async def encoded():
+        return Response(gzip.compress(b"a" * 4096), media_type="text/plain", headers={"Content-Encoding": "gzip"})
+
+    return app
+
+
+def _raw_get(client: TestClient, path: str, accept: str):
+    # httpx décompresse de lui-même : on lit le flux brut
+    with client.stream("GET", path, headers={"Accept-Encoding": accept}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_large_json_is_gzipped_with_content_length():
+    client = TestClient(_app())
+    response, raw = _raw_get(client, "/big", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == len(raw)
+    assert gzip.decompress(raw) == JSONResponse(BIG).body
+
+
+def test_small_and_unaccepted_responses_are_untouched():
+    client = TestClient(_app())
+    response, raw = _raw_get(client, "/small", "gzip")
+    assert "content-encoding" not in response.headers
+    assert raw == b'{"ok":true}'
+
+    response, _ = _raw_get(client, "/big", "identity, gzip;q=0")
+    assert "content-encoding" not in response.headers
+
+
+def test_streaming_response_is_compressed_incrementally():
+    client = TestClient(_app())
+    response, raw = _raw_get(client, "/stream", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    lines = gzip.decompress(raw).decode().splitlines()
+    assert len(lines) == 50
+
+
+def test_each_chunk_is_flushed_and_decodable():
+    compressor = CompressionMiddleware(app=None).make_compressor("gzip")
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    first = compressor.compress(b"premier chunk ", final=False)
+    assert decoder.decompress(first) == b"premier chunk "
+    last = compressor.compress(b"dernier", final=True)
+    assert decoder.decompress(last) == b"dernier"
+    assert decoder.eof
+
+
+def test_media_and_already_encoded_responses_are_skipped():
+    client = TestClient(_app())
+    response, raw = _raw_get(client, "/image", "gzip, br")
+    assert "content-encoding" not in response.headers
+    assert raw.startswith(b"\x89PNG")
+
+    response, raw = _raw_get(client, "/encoded", "gzip")
+    assert gzip.decompress(raw) == b"a" * 4096
+
+
+def test_large_chunks_are_offloaded_to_thread(monkeypatch):
+    calls = []
+    real = performance.anyio.to_thread.run_sync
+
+    async def spy(fn, *args):
+        calls.append(len(args[0]))
+        return await real(fn, *args)
+
+    monkeypatch.setattr(performance.anyio.to_thread, "run_sync", spy)
+    client = TestClient(_app(offload_threshold=10_000))
+    response, raw = _raw_get(client, "/big", "gzip")
+    assert gzip.decompress(raw) == JSONResponse(BIG).body
+    assert calls and calls[0] >= 10_000
+
+
+def test_brotli_preferred_when_available():
+    brotli = pytest.importorskip("brotli")
+    client = TestClient(_app())
+    response, raw = _raw_get(client, "/big", "gzip, br")
+    assert response.headers["content-encoding"] == "br"
+    assert brotli.decompress(raw) == JSONResponse(BIG).body
@@ -0,0 +1,155 @@
+"""Tests du moteur d'export (rendu hors event loop + cache d'artefacts disque)."""
+
+import asyncio
+import os
+from datetime import datetime
+
+import pytest
+
+from core import cpu_pool
+from exports import engine
+from exports.engine import export_cache_key, purge_user_exports, render_export
+
+EXPORT_KWARGS = dict(
+    title="Vidéo test : énergie & climat",
+    channel="Chaîne",
+    category="science",
+    mode="standard",
+    summary="## Résumé\n\nUn contenu **markdown** assez court.",
+    video_url="https://youtube.com/watch?v=abc",
+    duration=600,
+    thumbnail_url=None,
+    entities=None,
+    reliability_score=80,
+    created_at=datetime(2026, 1, 2, 3, 4, 5),
+    flashcards=None,
+    sources=None,
+    pdf_export_type="full",
+    user_plan="free",
+    user_language="fr",
+)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(cpu_pool, "CPU_POOL_WORKERS", 0)
+    monkeypatch.setattr(engine, "EXPORT_CACHE_DIR", tmp_path / "export-cache")
+    monkeypatch.setattr(engine, "EXPORT_CACHE_MAX_BYTES", 50 * 1024 * 1024)
+    monkeypatch.setattr(engine, "_counters", dict.fromkeys(engine._counters, 0))
+    monkeypatch.setattr(engine, "_inflight", {})
+
+
+def _count_renders(monkeypatch) -> list:
+    calls = []
+    real = engine.export_summary
+
+    def counting(**kwargs):
+        calls.append(kwargs["format"])
+        return real(**kwargs)
+
+    monkeypatch.setattr(engine, "export_summary", counting)
+    return calls
+
+
+def test_cache_key_tracks_watermark_and_language_not_plan_name():
+    key = export_cache_key("pdf", EXPORT_KWARGS)
+
+    assert key == export_cache_key("pdf", {**EXPORT_KWARGS, "user_plan": "free"})
+    assert key != export_cache_key("pdf", {**EXPORT_KWARGS, "user_plan": "pro"})
+    assert key != export_cache_key("pdf", {**EXPORT_KWARGS, "user_language": "en"})
+    assert key != export_cache_key("docx", EXPORT_KWARGS)
+    assert key != export_cache_key("pdf", {**EXPORT_KWARGS, "pdf_export_type": "summary"})
+    assert key != export_cache_key("pdf", {**EXPORT_KWARGS, "summary": "autre contenu"})
+    # Deux plans payants = mêmes octets (pas de watermark) → même artefact
+    assert export_cache_key("pdf", {**EXPORT_KWARGS, "user_plan": "pro"}) == export_cache_key(
+        "pdf", {**EXPORT_KWARGS, "user_plan": "expert"}
+    )
+
+
+@pytest.mark.asyncio
+async def test_second_export_is_served_from_disk(monkeypatch):
+    calls = _count_renders(monkeypatch)
+
+    first = await render_export(user_id=7, format="docx", **EXPORT_KWARGS)
+    second = await render_export(user_id=7, format="docx", **EXPORT_KWARGS)
+
+    assert calls == ["docx"]
+    assert first.content and not first.cached
+    assert second.cached and second.path.read_bytes() == first.content
+    assert second.filename == first.filename
+    assert second.filename.startswith("deepsight_") and second.filename.endswith(".docx")
+    response = second.response()
+    assert response.headers["x-export-cache"] == "hit"
+    assert "attachment" in response.headers["content-disposition"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_exports_render_once(monkeypatch):
+    calls = _count_renders(monkeypatch)
+
+    artifacts = await asyncio.gather(*(render_export(user_id=7, format="xlsx", **EXPORT_KWARGS) for _ in range(5)))
+
+    assert calls == ["xlsx"]
+    assert len({a.content for a in artifacts}) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_exports_of_two_users_each_get_their_own_artifact(monkeypatch):
+    calls = _count_renders(monkeypatch)
+
+    await asyncio.gather(*(render_export(user_id=user_id, format="docx", **EXPORT_KWARGS) for user_id in (1, 2)))
+
+    assert calls == ["docx", "docx"]
+    for user_id in (1, 2):
+        assert len(list((engine.EXPORT_CACHE_DIR / str(user_id)).iterdir())) == 1
+
+
+@pytest.mark.asyncio
+async def test_text_formats_bypass_pool_and_cache(monkeypatch):
+    async def no_pool(*args, **kwargs):
+        raise AssertionError("txt ne doit pas passer par le pool")
+
+    monkeypatch.setattr(engine, "run_cpu", no_pool)
+
+    artifact = await render_export(user_id=7, format="md", **EXPORT_KWARGS)
+
+    assert artifact.mimetype == "text/markdown"
+    assert isinstance(artifact.content, bytes) and artifact.path is None
+    assert not engine.EXPORT_CACHE_DIR.exists()
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_keeps_recently_served_artifacts(monkeypatch):
+    first = await render_export(user_id=1, format="docx", **EXPORT_KWARGS)
+    second = await render_export(user_id=1, format="docx", **{**EXPORT_KWARGS, "summary": "Deuxième"})
+    old_path = engine._cache_path(1, export_cache_key("docx", EXPORT_KWARGS), "docx")
+    os.utime(old_path, (1, 1))  # le premier artefact devient le moins récemment servi
+
+    # Budget = un seul artefact : le suivant évince le plus ancien
+    monkeypatch.setattr(engine, "EXPORT_CACHE_MAX_BYTES", max(len(first.content), len(second.content)) + 1)
+    await render_export(user_id=1, format="docx", **{**EXPORT_KWARGS, "summary": "Troisième"})
+
+    assert not old_path.exists()
+    assert engine.get_export_engine_stats()["evictions"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_render_failure_returns_none(monkeypatch):
+    def broken(**kwargs):
+        raise RuntimeError("reportlab down")
+
+    monkeypatch.setattr(engine, "export_summary", broken)
+
+    assert await render_export(user_id=7, format="pdf", **EXPORT_KWARGS) is None
+    assert engine.get_export_engine_stats()["render_failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_purge_user_exports_removes_only_that_user():
+    await render_export(user_id=1, format="docx", **EXPORT_KWARGS)
+    await render_export(user_id=2, format="docx", **EXPORT_KWARGS)
+
+    assert await purge_user_exports(1) == 1
+
+    assert not (engine.EXPORT_CACHE_DIR / "1").exists()
+    assert any((engine.EXPORT_CACHE_DIR / "2").iterdir())
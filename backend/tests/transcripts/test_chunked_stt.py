@@ -0,0 +1,160 @@
+"""Tests du STT découpé en segments parallèles (``transcripts.chunked_stt``)."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from core.provider_health import provider_health
+from transcripts import chunked_stt
+from transcripts.chunked_stt import (
+    AudioSegment,
+    iter_chunked_transcript,
+    parse_silencedetect,
+    plan_segments,
+    shift_segments,
+    transcribe_chunked,
+)
+
+SILENCEDETECT_STDERR = """
+Input #0, mp3, from 'audio.mp3':
+  Duration: 00:25:00.50, start: 0.000000, bitrate: 32 kb/s
+[silencedetect @ 0x1] silence_start: 300.2
+[silencedetect @ 0x1] silence_end: 301.0 | silence_duration: 0.8
+[silencedetect @ 0x1] silence_start: 589.5
+[silencedetect @ 0x1] silence_end: 590.5 | silence_duration: 1.0
+[silencedetect @ 0x1] silence_start: 1199.0
+[silencedetect @ 0x1] silence_end: 1201.0 | silence_duration: 2.0
+[silencedetect @ 0x1] silence_start: 1499.9
+"""
+
+
+@pytest.fixture(autouse=True)
+def _fake_ffmpeg(monkeypatch):
+    """Pas de ffmpeg : silences fixes, extraction = description textuelle du segment."""
+
+    async def detect(path, source_name="CHUNKED-STT"):
+        return [(589.5, 590.5), (1199.0, 1201.0)], 1500.0
+
+    async def extract(path, segment, timeout=120):
+        return f"{segment.start:.1f}-{segment.end:.1f}".encode()
+
+    monkeypatch.setattr(chunked_stt, "detect_silences", detect)
+    monkeypatch.setattr(chunked_stt, "extract_segment", extract)
+    provider_health.reset()
+    yield
+    provider_health.reset()
+
+
+def _provider(calls: list, name: str, delays: dict | None = None, fail: bool = False):
+    """STT factice : un segment par minute d'audio, horodaté relativement au segment."""
+
+    async def call(audio: bytes, ext: str, label: str):
+        start, end = (float(x) for x in audio.decode().split("-"))
+        calls.append((name, start))
+        await asyncio.sleep((delays or {}).get(start, 0))
+        if fail:
+            return None
+        segments = [{"start": t, "text": f"w{start + t:.1f}"} for t in range(0, int(end - start), 60)]
+        return {"text": " ".join(s["text"] for s in segments), "segments": segments, "language": "fr"}
+
+    return call
+
+
+def test_parse_silencedetect_reads_silences_and_duration():
+    silences, duration = parse_silencedetect(SILENCEDETECT_STDERR)
+    assert silences == [(300.2, 301.0), (589.5, 590.5), (1199.0, 1201.0)]  # silence final non fermé ignoré
+    assert duration == pytest.approx(1500.5)
+
+
+def test_plan_segments_cuts_on_silences_with_overlap():
+    segments = plan_segments(1500.0, [(300.2, 301.0), (589.5, 590.5), (1199.0, 1201.0)], target_s=600, max_s=780)
+    assert [(s.cut_start, s.cut_end) for s in segments] == [(0.0, 590.0), (590.0, 1200.0), (1200.0, 1500.0)]
+    assert segments[1].start == pytest.approx(588.5) and segments[1].end == pytest.approx(1201.5)
+    assert segments[-1].end == 1500.0
+
+
+def test_plan_segments_hard_cut_without_silence():
+    segments = plan_segments(1900.0, [], target_s=600, max_s=780)
+    assert [s.cut_end for s in segments] == [600.0, 1200.0, 1900.0]
+
+
+def test_shift_segments_drops_overlap_owned_by_neighbours():
+    segment = AudioSegment(index=1, cut_start=600.0, cut_end=1200.0, start=598.5, end=1201.5)
+    raw = {
+        "text": "x",
+        "segments": [
+            {"start": 0.5, "text": "avant"},  # 599.0 → segment précédent
+            {"start": 2.0, "text": "dedans"},  # 600.5
+            {"start": 602.0, "text": "après"},  # 1200.5 → segment suivant
+        ],
+    }
+    assert shift_segments(segment, raw) == [{"start": 600.5, "text": "dedans"}]
+
+
+def test_shift_segments_keeps_speech_crossing_a_hard_cut_once():
+    previous = AudioSegment(index=0, cut_start=0.0, cut_end=600.0, start=0.0, end=601.5)
+    current = AudioSegment(index=1, cut_start=600.0, cut_end=1200.0, start=598.5, end=1201.5)
+    # Phrase de 599.0 à 605.0 : tronquée à 601.5 dans le précédent, entière dans le courant
+    assert shift_segments(previous, {"segments": [{"start": 599.0, "end": 601.5, "text": "phrase tronq"}]}) == []
+    kept = shift_segments(current, {"segments": [{"start": 0.5, "end": 6.5, "text": "phrase entière"}]})
+    assert kept == [{"start": 600.0, "text": "phrase entière"}]
+
+
+@pytest.mark.asyncio
+async def test_segments_run_in_parallel_and_partials_stay_in_order():
+    calls: list = []
+    # Le premier segment est le plus lent : aucun partiel avant qu'il revienne
+    provider = _provider(calls, "voxtral", delays={0.0: 0.05})
+    partials = [
+        p async for p in iter_chunked_transcript(b"audio", ".mp3", providers=[("voxtral", provider)], concurrency=3)
+    ]
+    assert len(calls) == 3
+    assert [p.done for p in partials] == [3]  # préfixe contigu : tout arrive d'un coup
+    final = partials[-1]
+    assert final.complete and final.covered_until_s == 1500.0
+    assert final.simple.startswith("w0.0 w60.0")
+    assert "[10:48] w648.5" in final.timestamped
+    assert "w588.5" not in final.simple  # zone de recouvrement laissée au segment 0
+
+
+@pytest.mark.asyncio
+async def test_round_robin_fallback_and_partial_callback():
+    calls: list = []
+    seen: list = []
+    simple, timestamped, lang = await transcribe_chunked(
+        b"audio",
+        providers=[("voxtral", _provider(calls, "voxtral", fail=True)), ("groq", _provider(calls, "groq"))],
+        concurrency=1,
+        on_partial=lambda p: seen.append((p.done, p.providers[-1])),
+    )
+    assert simple and lang == "fr"
+    assert seen[-1] == (3, "groq")
+    assert [done for done, _ in seen] == sorted({done for done, _ in seen})
+    # Répartition tournante : le segment 1 part d'abord sur groq
+    assert [c[0] for c in calls][:3] == ["voxtral", "groq", "groq"]
+
+
+@pytest.mark.asyncio
+async def test_returns_none_when_a_segment_fails_everywhere():
+    calls: list = []
+    result = await transcribe_chunked(b"audio", providers=[("voxtral", _provider(calls, "voxtral", fail=True))])
+    assert result == (None, None, None)
+
+
+@pytest.mark.asyncio
+async def test_silent_segment_is_empty_not_a_provider_failure():
+    calls: list = []
+    speech = _provider(calls, "voxtral")
+
+    async def voxtral(audio: bytes, ext: str, label: str):
+        if audio.startswith(b"588.5"):  # segment 1 : musique, aucun mot
+            calls.append(("voxtral", 588.5))
+            return {"text": "", "segments": [], "language": "fr"}
+        return await speech(audio, ext, label)
+
+    simple, _timestamped, _lang = await transcribe_chunked(b"audio", providers=[("voxtral", voxtral)])
+    assert simple == "w0.0 w60.0 w120.0 w180.0 w240.0 w300.0 w360.0 w420.0 w480.0 w540.0 w1258.5 w1318.5 w1378.5 w1438.5 w1498.5"
+    assert sorted(start for _, start in calls) == [0.0, 588.5, 1198.5]
+    assert await provider_health.allow("stt:voxtral")
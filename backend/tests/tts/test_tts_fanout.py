@@ -0,0 +1,245 @@
+"""
+Tests for the TTS fan-out (tts.fanout) and the streaming audio export.
+
+Tests cover:
+- Chunks synthesized concurrently, bounded per provider, yielded in text order
+- Per-chunk disk cache keyed by (provider, voice, speed, text)
+- Retry then failure propagation
+- export_to_audio returning after the first chunk, file completed in background
+- Progressive streaming of an in-progress export
+- A render failing or cancelled mid-way aborts the stream instead of ending it cleanly
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+# `tts/__init__` pulls its router → auth ↔ billing import cycle when `tts` is the
+# first package imported (isolated run); importing billing first breaks it.
+import billing  # noqa: F401, E402
+from tts import fanout  # noqa: E402
+from tts.fanout import TTSVoice, chunk_cache_key, synthesize_ordered  # noqa: E402
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+class FakeProvider:
+    """Provider whose chunk latency is controlled by the test (``delays[text]``)."""
+
+    name = "elevenlabs"
+
+    def __init__(self, delays=None, fail_times=0):
+        self.delays = delays or {}
+        self.fail_times = fail_times
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    def is_available(self):
+        return True
+
+    async def generate_stream(self, text, voice_id=None, language="fr", gender="female", speed=1.0, model_id=None):
+        self.calls.append(text)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(text, 0.01))
+            if self.fail_times:
+                self.fail_times -= 1
+                raise RuntimeError("ElevenLabs error 503")
+        finally:
+            self.active -= 1
+
+        async def _stream():
+            yield f"<{text}>".encode()
+
+        return _stream(), None, "audio/mpeg"
+
+
+@pytest.fixture(autouse=True)
+def isolated_fanout(tmp_path, monkeypatch):
+    monkeypatch.setattr(fanout, "CHUNK_CACHE_DIR", str(tmp_path / "chunks"))
+    monkeypatch.setattr(fanout, "_semaphores", {})
+    monkeypatch.setattr(fanout, "_counters", dict.fromkeys(fanout._counters, 0))
+    monkeypatch.setattr(fanout, "CHUNK_RETRY_BACKOFF_SECONDS", (0.0,))
+
+
+async def _collect(chunks, provider, voice=TTSVoice()):
+    return [audio async for audio in synthesize_ordered(chunks, voice, provider=provider)]
+
+
+# =============================================================================
+# FAN-OUT
+# =============================================================================
+
+@pytest.mark.asyncio
+async def test_chunks_run_concurrently_but_come_back_in_order(monkeypatch):
+    monkeypatch.setitem(fanout.PROVIDER_CONCURRENCY, "elevenlabs", 3)
+    # The first chunk is the slowest: order must still be preserved
+    provider = FakeProvider(delays={"a": 0.08, "b": 0.01, "c": 0.02, "d": 0.01})
+
+    audio = await _collect(["a", "b", "c", "d"], provider)
+
+    assert audio == [b"<a>", b"<b>", b"<c>", b"<d>"]
+    assert provider.max_active == 3
+
+
+@pytest.mark.asyncio
+async def test_first_chunk_is_yielded_before_later_chunks_finish():
+    provider = FakeProvider(delays={"head": 0.01, "tail": 0.5})
+    parts = synthesize_ordered(["head", "tail"], TTSVoice(), provider=provider)
+
+    first = await asyncio.wait_for(parts.__anext__(), timeout=0.2)
+
+    assert first == b"<head>"
+    await parts.aclose()
+
+
+@pytest.mark.asyncio
+async def test_chunks_are_cached_per_voice_and_speed():
+    provider = FakeProvider()
+
+    await _collect(["intro", "body"], provider)
+    await _collect(["intro", "other"], provider)
+    await _collect(["intro"], provider, TTSVoice(speed=1.25))
+
+    assert provider.calls == ["intro", "body", "other", "intro"]
+    assert fanout.get_tts_fanout_stats()["cache_hits"] == 1
+    assert chunk_cache_key("elevenlabs", "x", TTSVoice()) != chunk_cache_key("openai", "x", TTSVoice())
+
+
+@pytest.mark.asyncio
+async def test_transient_failure_is_retried_then_surfaced():
+    assert await _collect(["a"], FakeProvider(fail_times=fanout.CHUNK_ATTEMPTS - 1)) == [b"<a>"]
+
+    with pytest.raises(RuntimeError):
+        await _collect(["b"], FakeProvider(fail_times=fanout.CHUNK_ATTEMPTS))
+    assert fanout.get_tts_fanout_stats()["failures"] == 1
+
+
+# =============================================================================
+# AUDIO EXPORT
+# =============================================================================
+
+@pytest.fixture
+def audio_export(tmp_path, monkeypatch):
+    from exports import service
+
+    provider = FakeProvider()
+    monkeypatch.setattr(service, "AUDIO_TMP_DIR", str(tmp_path / "audio"))
+    os.makedirs(service.AUDIO_TMP_DIR)
+    monkeypatch.setattr(fanout, "get_tts_provider", lambda: provider)
+    return service, provider
+
+
+@pytest.mark.asyncio
+async def test_export_returns_after_first_chunk_and_streams_the_rest(audio_export, monkeypatch):
+    service, provider = audio_export
+    monkeypatch.setattr(service, "AUDIO_FIRST_CHUNK_CHARS", 40)
+    gate = asyncio.Event()
+    real = provider.generate_stream
+
+    async def gated(text, **kwargs):
+        if provider.calls:  # every chunk after the first waits for the test
+            await gate.wait()
+        return await real(text, **kwargs)
+
+    monkeypatch.setattr(provider, "generate_stream", gated)
+    summary = " ".join(f"Phrase numéro {i} de la synthèse." for i in range(400))
+
+    result = await service.export_to_audio(title="Titre", channel="Chaîne", summary=summary)
+
+    file_id = result["file_id"]
+    assert service.get_audio_file_path(file_id) is None
+    assert service.is_audio_render_in_progress(file_id)
+
+    reader = asyncio.ensure_future(_read_all(service.iter_audio_file(file_id, poll_interval=0.01)))
+    await asyncio.sleep(0.05)
+    gate.set()
+    streamed = await asyncio.wait_for(reader, timeout=5)
+
+    final_path = service.get_audio_file_path(file_id)
+    assert final_path is not None and not service.is_audio_render_in_progress(file_id)
+    with open(final_path, "rb") as f:
+        assert streamed == f.read()
+    chunks = service.chunk_text_for_tts(
+        service.build_narrative_text("Titre", "Chaîne", summary), first_chunk_size=40
+    )
+    assert len(chunks[0]) <= 40 and len(chunks) > 2
+    assert streamed == b"".join(f"<{c}>".encode() for c in chunks)
+
+
+@pytest.mark.asyncio
+async def test_export_fails_fast_when_first_chunk_fails(audio_export):
+    service, provider = audio_export
+    provider.fail_times = 5
+
+    assert await service.export_to_audio(title="Titre", channel="", summary="Un résumé suffisant.") is None
+    assert os.listdir(service.AUDIO_TMP_DIR) == []
+
+
+@pytest.mark.asyncio
+async def test_mid_render_failure_aborts_the_stream(audio_export, monkeypatch):
+    service, provider = audio_export
+    monkeypatch.setattr(service, "AUDIO_FIRST_CHUNK_CHARS", 40)
+    gate = asyncio.Event()
+    real = provider.generate_stream
+
+    async def failing_tail(text, **kwargs):
+        if provider.calls:  # every chunk after the first fails once the test lets it
+            await gate.wait()
+            provider.fail_times = 1
+        return await real(text, **kwargs)
+
+    monkeypatch.setattr(provider, "generate_stream", failing_tail)
+    summary = " ".join(f"Phrase numéro {i} de la synthèse." for i in range(50))
+
+    file_id = (await service.export_to_audio(title="Titre", channel="", summary=summary))["file_id"]
+    reader = asyncio.ensure_future(_read_all(service.iter_audio_file(file_id, poll_interval=0.01)))
+    await asyncio.sleep(0.05)
+    gate.set()
+
+    with pytest.raises(service.AudioRenderFailed):
+        await asyncio.wait_for(reader, timeout=5)
+    assert service.get_audio_file_path(file_id) is None
+    assert not service.is_audio_render_in_progress(file_id)
+    # A reader arriving after the failure is refused too
+    with pytest.raises(service.AudioRenderFailed):
+        await _read_all(service.iter_audio_file(file_id))
+
+
+
+async def test_cancelled_render_aborts_the_stream(audio_export, monkeypatch):
+    service, provider = audio_export
+    monkeypatch.setattr(service, "AUDIO_FIRST_CHUNK_CHARS", 40)
+    gate = asyncio.Event()
+    real = provider.generate_stream
+
+    async def blocked_tail(text, **kwargs):
+        if provider.calls:  # later chunks hang until the render is cancelled
+            await gate.wait()
+        return await real(text, **kwargs)
+
+    monkeypatch.setattr(provider, "generate_stream", blocked_tail)
+    summary = " ".join(f"Phrase numéro {i} de la synthèse." for i in range(50))
+
+    file_id = (await service.export_to_audio(title="Titre", channel="", summary=summary))["file_id"]
+    reader = asyncio.ensure_future(_read_all(service.iter_audio_file(file_id, poll_interval=0.01)))
+    await asyncio.sleep(0.05)
+    for task in list(service._audio_renders):
+        task.cancel()
+    await asyncio.gather(*service._audio_renders, return_exceptions=True)
+
+    with pytest.raises(service.AudioRenderFailed):
+        await asyncio.wait_for(reader, timeout=5)
+    assert service.get_audio_file_path(file_id) is None
+    assert not service.is_audio_render_in_progress(file_id)
+
+async def _read_all(iterator):
+    return b"".join([part async for part in iterator])
@@ -0,0 +1,114 @@
+"""Tests du cache adressé par contenu des analyses par chunk (``videos.chunk_cache``).
+
+Pattern : SQLite in-memory async + monkeypatch de ``db.database.async_session_maker``
+(cf. tests/search/test_explain_passage.py) ; L1 = cache_service in-memory.
+"""
+
+from __future__ import annotations
+
+import uuid
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from core.cache import cache_service
+from db.database import Base, ChunkAnalysisCache as Row  # noqa: F401
+from videos import chunking, long_video_analyzer
+from videos.chunk_cache import ChunkAnalysisCache, ChunkCacheStats, chunk_analysis_cache, chunk_cache_key
+from videos.long_video_analyzer import ChunkAnalysis, TranscriptChunk
+
+
+@pytest_asyncio.fixture
+async def session_maker(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr("db.database.async_session_maker", maker)
+    monkeypatch.setattr(chunk_analysis_cache, "enabled", True)
+    yield maker
+    await engine.dispose()
+
+
+def _chunk(text: str) -> TranscriptChunk:
+    return TranscriptChunk(
+        index=1, total_chunks=3, text=text, word_count=len(text.split()), start_time="10:00", end_time="20:00"
+    )
+
+
+def test_key_depends_on_content_and_prompt_inputs():
+    base = dict(text="bonjour", template_version="v1", model="m", lang="fr", mode=None, context="ctx")
+    key = chunk_cache_key("k", **base)
+    assert key == chunk_cache_key("k", **base)
+    for change in ({"text": "bonsoir"}, {"template_version": "v2"}, {"model": "m2"}, {"lang": "en"}, {"mode": "x"}):
+        assert chunk_cache_key("k", **{**base, **change}) != key
+
+
+@pytest.mark.asyncio
+async def test_l2_hit_warms_l1_and_counts_reuse(session_maker):
+    cache = ChunkAnalysisCache(enabled=True)
+    key = uuid.uuid4().hex
+    stats = ChunkCacheStats()
+
+    assert await cache.get(key, stats) is None
+    await cache.set(key, {"digest": "résumé"}, kind="chunk_digest", model="m", stats=stats)
+    await cache_service.delete(f"chunk_analysis:{key}")  # autre worker : L1 froid
+
+    assert await cache.get(key, stats) == {"digest": "résumé"}
+    assert await cache.get(key, stats) == {"digest": "résumé"}
+    assert (stats.misses, stats.l2_hits, stats.l1_hits, stats.stores) == (1, 1, 1, 1)
+    assert stats.hit_rate == pytest.approx(2 / 3, abs=0.001)
+
+    async with session_maker() as session:
+        assert (await session.get(Row, key)).hit_count == 1
+
+
+@pytest.mark.asyncio
+async def test_reanalysis_in_another_mode_skips_mistral(session_maker, monkeypatch):
+    calls = []
+
+    async def fake_internal(chunk, video_title, category, lang, mode, model, api_key):
+        calls.append(mode)
+        return ChunkAnalysis(chunk_index=chunk.index, summary="S", key_points=["[10:00] p"], time_range="10:00 - 20:00")
+
+    monkeypatch.setattr(long_video_analyzer, "_analyze_chunk_internal", fake_internal)
+    chunk = _chunk(f"texte unique {uuid.uuid4()}")
+
+    first = await long_video_analyzer.analyze_chunk_with_retry(chunk, "Titre", "science", "fr", "standard", api_key="k")
+    stats = ChunkCacheStats()
+    second = await long_video_analyzer.analyze_chunk_with_retry(
+        chunk, "Titre", "science", "fr", "expert", api_key="k", cache_stats=stats
+    )
+    assert calls == ["standard"]
+    assert second == first
+    assert stats.l1_hits == 1
+
+    # Langue différente → prompt différent → nouvel appel
+    await long_video_analyzer.analyze_chunk_with_retry(chunk, "Titre", "science", "en", "expert", api_key="k")
+    assert calls == ["standard", "expert"]
+
+
+@pytest.mark.asyncio
+async def test_digest_chunk_is_cached_but_fallbacks_are_not(session_maker, monkeypatch):
+    calls = []
+
+    class FakeMistral:
+        def __init__(self, api_key=None):
+            self.chat = self
+
+        async def complete_async(self, **kwargs):
+            calls.append(kwargs["model"])
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="[00:00] Digest"))])
+
+    monkeypatch.setattr(chunking, "Mistral", FakeMistral)
+    chunk = chunking.ChunkData(index=0, start_seconds=0, end_seconds=600, text=f"{uuid.uuid4()} " * 200)
+
+    await chunking.digest_chunk(chunk, "Titre")  # échec → résumé extractif, non mis en cache
+    assert await chunking.digest_chunk(chunk, "Titre") == "[00:00] Digest"
+    stats = ChunkCacheStats()
+    assert await chunking.digest_chunk(chunk, "Titre", cache_stats=stats) == "[00:00] Digest"
+    assert len(calls) == 2 and stats.hits == 1
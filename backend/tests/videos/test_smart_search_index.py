@@ -0,0 +1,104 @@
+"""Tests pour l'index BM25 précalculé de ``videos.smart_search``."""
+
+from __future__ import annotations
+
+import pytest
+
+TOPICS = [
+    "photosynthese chlorophylle lumiere plantes feuilles",
+    "inflation banques centrales taux monnaie",
+    "volcan magma eruption lave cratere",
+    "football stade joueurs ballon arbitre",
+]
+
+
+def _long_transcript(words: int = 24000) -> str:
+    sentences = []
+    total = 0
+    i = 0
+    while total < words:
+        sentence = f"Segment {i} parle de {TOPICS[(i // 40) % len(TOPICS)]}."
+        sentences.append(sentence)
+        total += len(sentence.split())
+        i += 1
+    return " ".join(sentences)
+
+
+@pytest.fixture(autouse=True)
+def ss():
+    # `videos/__init__` tire le router → cycle auth ↔ billing si `videos` est
+    # le premier package importé (run isolé) ; importer billing d'abord le casse.
+    import billing  # noqa: F401
+    from videos import smart_search
+
+    smart_search.clear_index_cache()
+    yield smart_search
+    smart_search.clear_index_cache()
+
+
+def test_index_scores_match_reference_bm25(ss):
+    passages = ss.split_into_passages(_long_transcript(8000), video_duration=3600)
+    index = ss.BM25Index.build(passages)
+    query = ["inflation", "magma", "absent"]
+
+    scores = index.score(query)
+    for i, passage in enumerate(passages):
+        expected, matched = ss.calculate_bm25_score(query, passage, passages)
+        if not matched:
+            assert i not in scores
+            continue
+        score, index_matched = scores[i]
+        assert score == pytest.approx(expected)
+        assert index_matched == matched
+
+
+def test_index_is_cached_per_transcript_content(ss):
+    transcript = _long_transcript()
+    first = ss.get_transcript_index(transcript, 7200)
+    assert ss.get_transcript_index(transcript, 7200) is first
+    assert ss.get_transcript_index(transcript + " fin", 7200) is not first
+    stats = ss.get_index_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_search_reuses_index_and_does_not_mutate_cached_passages(ss):
+    transcript = _long_transcript()
+    first = ss.search_relevant_passages("Pourquoi l'inflation des banques ?", transcript, video_duration=7200)
+    second = ss.search_relevant_passages("Et le volcan, le magma ?", transcript, video_duration=7200)
+
+    assert first and second
+    assert all("inflation" in p.matched_terms or "banques" in p.matched_terms for p in first)
+    assert all("magma" in p.matched_terms or "volcan" in p.matched_terms for p in second)
+    assert [p.start_word_index for p in first] == sorted(p.start_word_index for p in first)
+    assert ss.get_index_cache_stats()["misses"] == 1
+
+    cached = ss.get_transcript_index(transcript, 7200).passages
+    assert all(p.relevance_score == 0.0 and p.matched_terms == [] for p in cached)
+
+
+def test_short_transcript_bypasses_index(ss):
+    passages = ss.search_relevant_passages("inflation ?", "Un transcript court sur l'inflation.")
+    assert len(passages) == 1
+    assert ss.get_index_cache_stats()["misses"] == 0
+
+
+def test_query_term_matches_plural_and_derived_forms(ss):
+    passages = [
+        ss.TranscriptPassage(text=text, start_word_index=i * 10, end_word_index=i * 10 + 9, estimated_timecode="")
+        for i, text in enumerate(
+            [
+                "Les vaccins protègent contre les virus.",
+                "La vaccination a commencé en janvier.",
+                "Le vaccin est gratuit.",
+                "Aucun rapport avec le sujet.",
+            ]
+        )
+    ]
+    index = ss.BM25Index.build(passages)
+
+    scores = index.score(["vaccin"])
+    assert set(scores) == {0, 1, 2}
+    for i in scores:
+        expected, matched = ss.calculate_bm25_score(["vaccin"], passages[i], passages)
+        assert scores[i] == (pytest.approx(expected), matched)